@@ -1,17 +1,315 @@
-"""Simple analytics tracker for MindVibe API."""
+"""Simple analytics tracker for MindVibe API.
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from datetime import datetime, timedelta
-import logging
+track_event() used to INSERT and commit one row on the caller's request
+session. While the analytics writer is running (started at app startup)
+it only appends the event to a bounded in-process queue; the writer
+drains the queue every ANALYTICS_FLUSH_EVENTS events or ANALYTICS_FLUSH_MS
+milliseconds, whichever comes first, with one multi-row insert (COPY on
+Postgres) per batch.
+
+Batches that cannot be written (database down) are appended to a local
+spill file (ANALYTICS_SPILL_PATH) and replayed once writes succeed again.
+Replay is at-least-once: a batch may be written twice after a crash.
+If the queue is full, new events are dropped and counted; analytics never
+slows down or fails a request.
+
+Each batch also updates analytics_event_rollups (event counts per hour and
+per day) in the same transaction, so get_daily_stats() / get_hourly_stats()
+read pre-aggregated rows instead of grouping the raw table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
 import json
+import logging
+import os
+from collections import Counter, deque
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.core.db_utils import dialect_insert
+from backend.models.analytics import AnalyticsEvent, AnalyticsEventRollup
 
 logger = logging.getLogger(__name__)
 
+# Flush when this many events are queued, or after this long, whichever is first
+ANALYTICS_FLUSH_EVENTS = int(os.getenv("ANALYTICS_FLUSH_EVENTS", "500"))
+ANALYTICS_FLUSH_MS = int(os.getenv("ANALYTICS_FLUSH_MS", "1000"))
+# Events queued beyond this are dropped (counted in the writer status)
+ANALYTICS_QUEUE_MAX = int(os.getenv("ANALYTICS_QUEUE_MAX", "50000"))
+# Batches that could not be written wait here until the database is back
+ANALYTICS_SPILL_PATH = os.getenv("ANALYTICS_SPILL_PATH", "./analytics_spill.jsonl")
+# Batches at least this large are written with COPY on Postgres
+ANALYTICS_COPY_MIN_ROWS = int(os.getenv("ANALYTICS_COPY_MIN_ROWS", "50"))
+
+
+class DailyStat(NamedTuple):
+    date: Any
+    event_type: str
+    count: int
+
+
+class HourlyStat(NamedTuple):
+    hour: datetime
+    event_type: str
+    count: int
+
+
+def _event(event_type: str, user_id: str | None, metadata: dict | None) -> dict:
+    return {
+        "event_type": event_type,
+        "user_id": user_id,
+        "metadata": metadata or None,
+        "created_at": datetime.now(UTC),
+    }
+
+
+async def _add_to_rollups(db: AsyncSession, counts: Counter) -> None:
+    table = AnalyticsEventRollup.__table__
+    upsert = dialect_insert(db)(table)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.granularity, table.c.bucket_start, table.c.event_type],
+        set_={"count": table.c.count + upsert.excluded.count, "updated_at": func.now()},
+    )
+    await db.execute(upsert, [
+        {"granularity": granularity, "bucket_start": bucket, "event_type": event_type, "count": n}
+        for (granularity, bucket, event_type), n in sorted(counts.items())
+    ])
+
+
+def _rollup_counts(rows) -> Counter:
+    """Hour and day bucket counts for (created_at, event_type) pairs."""
+    counts: Counter = Counter()
+    for created_at, event_type in rows:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        hour = created_at.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+        counts["hour", hour, event_type] += 1
+        counts["day", hour.replace(hour=0), event_type] += 1
+    return counts
+
+
+async def write_events(db: AsyncSession, events: list[dict]) -> None:
+    """Insert events and add them to the rollups, without committing."""
+    if not events:
+        return
+    # Rollups first: on Postgres this opens the transaction COPY then joins
+    await _add_to_rollups(db, _rollup_counts((e["created_at"], e["event_type"]) for e in events))
+
+    if db.get_bind().dialect.name == "postgresql" and len(events) >= ANALYTICS_COPY_MIN_ROWS:
+        connection = await (await db.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(
+            AnalyticsEvent.__tablename__,
+            columns=["event_type", "user_id", "metadata", "created_at"],
+            records=[
+                (e["event_type"], e["user_id"],
+                 json.dumps(e["metadata"]) if e["metadata"] else None, e["created_at"])
+                for e in events
+            ],
+        )
+        return
+
+    # executemany: compiled once, sent as multi-row batches
+    await db.execute(insert(AnalyticsEvent), [
+        {
+            "event_type": e["event_type"],
+            "user_id": e["user_id"],
+            "event_metadata": e["metadata"],
+            "created_at": e["created_at"],
+        }
+        for e in events
+    ])
+
+
+class AnalyticsWriter:
+    """Bounded event queue drained by a background batch writer."""
+
+    def __init__(
+        self,
+        spill_path: str = ANALYTICS_SPILL_PATH,
+        max_queue: int = ANALYTICS_QUEUE_MAX,
+        batch_size: int = ANALYTICS_FLUSH_EVENTS,
+    ) -> None:
+        self.spill_path = spill_path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self._queue: deque[dict] = deque()
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._running = False
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._stats = {"written": 0, "batches": 0, "spilled": 0, "replayed": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def enqueue(self, event: dict) -> bool:
+        """Queue an event for the next batch; False if it was dropped."""
+        if len(self._queue) >= self.max_queue:
+            self._stats["dropped"] += 1
+            return False
+        self._queue.append(event)
+        if len(self._queue) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write everything queued; batches that fail go to the spill file."""
+        written = 0
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                self._queue.extendleft(reversed(batch))
+                raise
+            except Exception as e:
+                logger.warning(f"[Analytics] Write failed, spilling {len(batch)} events: {e}")
+                await asyncio.to_thread(self._spill, batch)
+                self._stats["spilled"] += len(batch)
+                break
+            written += len(batch)
+        return written
+
+    async def _write(self, events: list[dict]) -> None:
+        assert self._session_maker is not None
+        async with self._session_maker() as db:
+            try:
+                await write_events(db, events)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        self._stats["written"] += len(events)
+        self._stats["batches"] += 1
+
+    def _spill(self, events: list[dict]) -> None:
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for e in events:
+                f.write(json.dumps({**e, "created_at": e["created_at"].isoformat()}) + "\n")
+
+    async def replay_spill(self) -> int:
+        """Write spilled events back, one batch at a time.
+
+        The spill file is first renamed so new spills do not mix with the
+        replay; after each committed batch the remaining lines are written
+        back, so a restart resumes after the last rewrite. Delivery is
+        at-least-once: a crash between a batch's commit and that rewrite
+        replays the batch, inserting its events and counting them in the
+        rollups a second time.
+        """
+        replay_path = self.spill_path + ".replay"
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spill_path):
+                return 0
+            os.replace(self.spill_path, replay_path)
+
+        lines = await asyncio.to_thread(_read_lines, replay_path)
+        replayed = 0
+        while lines:
+            batch = [json.loads(line) for line in lines[:self.batch_size]]
+            for e in batch:
+                e["created_at"] = datetime.fromisoformat(e["created_at"])
+            await self._write(batch)
+            lines = lines[self.batch_size:]
+            await asyncio.to_thread(_write_lines, replay_path, lines)
+            replayed += len(batch)
+        os.remove(replay_path)
+        self._stats["replayed"] += replayed
+        if replayed:
+            logger.info(f"[Analytics] Replayed {replayed} spilled events")
+        return replayed
+
+    async def start(self, session_maker: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Start buffering track_event() calls and the background writer."""
+        if self._running:
+            return
+        if session_maker is None:
+            # Import lazily so this module has no import-time dependency on
+            # the DB engine (matters for unit tests).
+            from backend import deps
+
+            session_maker = deps.SessionLocal
+        self._session_maker = session_maker
+        self._wake = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name="analytics_writer")
+        logger.info(
+            f"[Analytics] Writer started (every {ANALYTICS_FLUSH_MS}ms or {self.batch_size} events)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the writer and write (or spill) whatever is still queued."""
+        self._running = False
+        if self._task is not None:
+            # Let the loop finish its current write rather than cancel it
+            assert self._wake is not None
+            self._wake.set()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._session_maker is not None:
+            await self.flush()
+        logger.info("[Analytics] Writer stopped")
+
+    async def _loop(self) -> None:
+        while self._running:
+            assert self._wake is not None
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), ANALYTICS_FLUSH_MS / 1000)
+            self._wake.clear()
+            try:
+                spilled = self._stats["spilled"]
+                await self.flush()
+                if self._stats["spilled"] == spilled:
+                    await self.replay_spill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[Analytics] Spill replay failed (will retry): {e}")
+
+    @property
+    def status(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": len(self._queue),
+            "spill_pending": os.path.exists(self.spill_path)
+            or os.path.exists(self.spill_path + ".replay"),
+            **self._stats,
+        }
+
+
+def _read_lines(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def _write_lines(path: str, lines: list[str]) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp_path, path)
+
+
+_writer: AnalyticsWriter | None = None
+
+
+def get_analytics_writer() -> AnalyticsWriter:
+    global _writer
+    if _writer is None:
+        _writer = AnalyticsWriter()
+    return _writer
+
 
 class SimpleAnalytics:
     """Lightweight analytics tracker."""
-    
+
     @staticmethod
     async def track_event(
         db: AsyncSession,
@@ -19,41 +317,79 @@ class SimpleAnalytics:
         user_id: str = None,
         metadata: dict = None
     ):
-        """Track simple events without heavy overhead."""
+        """Track simple events without heavy overhead.
+
+        Queued for the background writer when it is running (``db`` is then
+        not touched); otherwise written and committed on ``db``.
+        """
+        event = _event(event_type, user_id, metadata)
+        writer = get_analytics_writer()
+        if writer.running:
+            writer.enqueue(event)
+            return
         try:
-            # Convert metadata to JSON string
-            metadata_json = json.dumps(metadata) if metadata else None
-            
-            await db.execute(text("""
-                INSERT INTO analytics_events (event_type, user_id, metadata, created_at)
-                VALUES (:event_type, :user_id, CAST(:metadata AS JSONB), :created_at)
-            """), {
-                "event_type": event_type,
-                "user_id": user_id,
-                "metadata": metadata_json,
-                "created_at": datetime.utcnow()
-            })
+            await write_events(db, [event])
             await db.commit()
         except Exception as e:
             logger.error(f"Analytics tracking failed: {e}")
             # Don't fail the request if analytics fails
             await db.rollback()
-    
+
+    @staticmethod
+    async def get_daily_stats(db: AsyncSession, days: int = 7) -> list[DailyStat]:
+        """Get daily statistics (newest day first), from the daily rollups."""
+        cutoff = (datetime.now(UTC) - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        rows = await _rollups(db, "day", cutoff)
+        return [DailyStat(bucket.date(), event_type, count) for bucket, event_type, count in rows]
+
+    @staticmethod
+    async def get_hourly_stats(db: AsyncSession, hours: int = 24) -> list[HourlyStat]:
+        """Get hourly statistics (newest hour first), from the hourly rollups."""
+        cutoff = (datetime.now(UTC) - timedelta(hours=hours)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        return [HourlyStat(*row) for row in await _rollups(db, "hour", cutoff)]
+
     @staticmethod
-    async def get_daily_stats(db: AsyncSession, days: int = 7):
-        """Get daily statistics."""
-        # Calculate the cutoff date in Python to avoid SQL parameter issues
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        result = await db.execute(text("""
-            SELECT 
-                DATE(created_at) as date,
-                event_type,
-                COUNT(*) as count
-            FROM analytics_events
-            WHERE created_at >= :cutoff_date
-            GROUP BY DATE(created_at), event_type
-            ORDER BY date DESC
-        """), {"cutoff_date": cutoff_date})
-        
-        return result.fetchall()
+    async def rebuild_rollups(db: AsyncSession, since: datetime | None = None) -> int:
+        """Recompute the rollups from analytics_events (from ``since``'s day on).
+
+        Returns the number of events counted. Commits.
+        """
+        table = AnalyticsEventRollup.__table__
+        clear = delete(table)
+        source = select(AnalyticsEvent.created_at, AnalyticsEvent.event_type)
+        if since is not None:
+            since = since.replace(hour=0, minute=0, second=0, microsecond=0)
+            clear = clear.where(table.c.bucket_start >= since)
+            source = source.where(AnalyticsEvent.created_at >= since)
+
+        counts: Counter = Counter()
+        events = 0
+        result = await db.stream(source.execution_options(yield_per=10_000))
+        async for partition in result.partitions():
+            counts.update(_rollup_counts(partition))
+            events += len(partition)
+        await db.execute(clear)
+        if counts:
+            await _add_to_rollups(db, counts)
+        await db.commit()
+        return events
+
+
+async def _rollups(db: AsyncSession, granularity: str, cutoff: datetime) -> list[tuple]:
+    result = await db.execute(
+        select(
+            AnalyticsEventRollup.bucket_start,
+            AnalyticsEventRollup.event_type,
+            AnalyticsEventRollup.count,
+        )
+        .where(
+            AnalyticsEventRollup.granularity == granularity,
+            AnalyticsEventRollup.bucket_start >= cutoff,
+        )
+        .order_by(AnalyticsEventRollup.bucket_start.desc(), AnalyticsEventRollup.event_type)
+    )
+    return [tuple(row) for row in result]
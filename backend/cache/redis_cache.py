@@ -400,6 +400,30 @@ class RedisCache:
             self._mark_disconnected_on_error(e)
             return None
 
+    async def psubscribe(self, *patterns: str) -> Any:
+        """Subscribe to one or more Redis Pub/Sub channel patterns.
+
+        Messages arrive with ``type == "pmessage"`` and carry the concrete
+        channel name, so one subscription (e.g. ``"chat:room:*"``) can
+        serve every room on this instance.
+
+        Args:
+            patterns: One or more glob-style channel patterns.
+
+        Returns:
+            A redis.asyncio PubSub object, or None if not connected.
+        """
+        if not self.is_connected:
+            return None
+        try:
+            pubsub = self._client.pubsub()
+            await pubsub.psubscribe(*patterns)
+            return pubsub
+        except Exception as e:
+            logger.warning("Redis PSUBSCRIBE failed for patterns %s: %s", patterns, e)
+            self._mark_disconnected_on_error(e)
+            return None
+
     # --- Sorted set methods for distributed DDoS tracking ---
 
     async def zadd(
@@ -12,6 +12,7 @@ import logging
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import (
     DBAPIError,
     InterfaceError,
@@ -153,3 +154,19 @@ async def safe_refresh(db, instance, operation_name: str = "refresh") -> None:
         lambda: db.refresh(instance),
         operation_name=operation_name,
     )
+
+
+def dialect_insert(db):
+    """
+    INSERT construct with ON CONFLICT support for the session's dialect.
+
+    Args:
+        db: AsyncSession instance
+
+    Example:
+        upsert = dialect_insert(db)(table).values(rows)
+        await db.execute(upsert.on_conflict_do_nothing())
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
@@ -18,6 +18,7 @@ load_dotenv()
 from backend.core.settings import settings
 from backend.models import User
 from backend.security.jwt import decode_access_token
+from backend.security.principal_cache import Principal, principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +175,10 @@ async def get_current_user(
     Extracts the user ID from the Authorization header (Bearer token)
     or from httpOnly access_token cookie (XSS-protected).
     Returns the user ID if valid, raises 401 if not authenticated.
+
+    The account check (exists, not deleted, email verified) is served from
+    the principal cache (backend.security.principal_cache) and memoized on
+    ``request.state`` for the rest of the request.
     """
     # Check Authorization header first (for API clients/backward compatibility)
     auth_header = request.headers.get("Authorization")
@@ -192,42 +197,70 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    try:
-        payload = decode_access_token(token)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        ) from exc
-
-    user_id = payload.get("sub")
+    # Several auth dependencies in one request share one resolution
+    memo = getattr(request.state, "principal_memo", None)
+    if isinstance(memo, tuple) and memo[0] == token:
+        principal = memo[1]
+    else:
+        try:
+            payload = decode_access_token(token)
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"},
+            ) from exc
+
+        user_id = payload.get("sub")
+
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token: missing user ID",
+            )
 
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token: missing user ID",
-        )
+        principal, user = await _resolve_principal(db, str(user_id), payload.get("sid"))
+        request.state.principal_memo = (token, principal, user)
 
     # Verify user exists and is not deleted
-    stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-
-    if not user:
+    if not principal.exists:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or deleted",
         )
 
     # Defense-in-depth: block unverified users from protected routes
-    if settings.REQUIRE_EMAIL_VERIFICATION and not user.email_verified:
+    if settings.REQUIRE_EMAIL_VERIFICATION and not principal.email_verified:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Email verification required. Please verify your email to access this resource.",
         )
 
-    return user_id
+    return principal.user_id
+
+
+async def _resolve_principal(
+    db: AsyncSession, user_id: str, session_id: str | None
+) -> tuple[Principal, User | None]:
+    """Return the cached principal for (user, session), loading it on a miss.
+
+    A miss loads the whole row and returns it too, so get_current_user_object
+    can reuse it instead of querying again.
+    """
+    principal = principal_cache.get(user_id, session_id)
+    if principal is not None:
+        return principal, None
+
+    generation = principal_cache.generation(user_id)
+    stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
+    user = (await db.execute(stmt)).scalar_one_or_none()
+    principal = Principal(
+        user_id=user_id,
+        exists=user is not None,
+        email_verified=bool(user is not None and user.email_verified),
+    )
+    principal_cache.put(session_id, principal, generation)
+    return principal, user
 
 
 async def get_current_user_optional(
@@ -274,9 +307,10 @@ async def get_current_user_object(
     :func:`get_current_user`.
     """
     user_id = await get_current_user(request, db)
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    memo = getattr(request.state, "principal_memo", None)
+    user = memo[2] if isinstance(memo, tuple) else None
+    if user is None:
+        user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
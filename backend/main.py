@@ -10,16 +10,16 @@ from typing import Any
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 startup_logger = logging.getLogger("mindvibe.startup")
 
-# Install in-memory log handler so backend logs are available via admin API
-from backend.routes.admin.backend_logs import install_log_handler
-
-install_log_handler()
-
 # CRITICAL: Load environment variables BEFORE anything else
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Move log handlers onto a background thread and capture logs for the admin API
+from backend.services.log_pipeline import install_log_handler
+
+install_log_handler()
+
 startup_logger.info("")
 startup_logger.info("=" * 80)
 startup_logger.info("🕉️  MINDVIBE - STARTUP SEQUENCE")
@@ -534,6 +534,10 @@ async def startup():
             if _redis._reconnect_task:
                 _startup_status["background_tasks"].append(_redis._reconnect_task)
 
+            # Apply principal-cache invalidations published by other instances
+            from backend.security.principal_cache import start_invalidation_listener
+            _startup_status["background_tasks"].append(start_invalidation_listener())
+
         # Step 1: Ensure ORM tables exist first (base tables like users, sessions
         # must exist before SQL migrations that reference them with REFERENCES).
         # Wrapped in asyncio.wait_for to prevent indefinite hangs if the database
@@ -726,44 +730,51 @@ async def startup():
                     f"⚠️ Journey template seeding had issues: {seed_error}"
                 )
 
+            # Load the immutable template catalog (templates, step skeletons,
+            # resolved verses) so /templates and step delivery serve from
+            # memory. On failure the engine keeps querying the DB directly.
+            try:
+                from backend.services.journey_engine.template_catalog import (
+                    refresh_template_catalog,
+                )
+
+                async with SessionLocal() as _catalog_db:
+                    await _asyncio.wait_for(
+                        refresh_template_catalog(_catalog_db),
+                        timeout=_STARTUP_DB_TIMEOUT,
+                    )
+                startup_logger.info("✅ Journey template catalog loaded")
+            except Exception as catalog_error:
+                startup_logger.warning(
+                    f"⚠️ Journey template catalog not loaded: {catalog_error}"
+                )
+
         _task_jt = _asyncio.create_task(
             _seed_journey_templates_background(), name="seed_journey_templates"
         )
         _startup_status["background_tasks"].append(_task_jt)
 
-        # Step 5: Run data retention cleanup (background — non-critical,
-        # purge expired soft-deleted chat data without blocking startup)
-        async def _data_retention_background() -> None:
-            startup_logger.info("\n🔒 Running data retention cleanup...")
-            try:
-                from backend.services.data_retention import purge_expired_chat_messages
+        # Step 5: Start the data retention purger (background — non-critical).
+        # It purges expired soft-deleted chat data, journal blobs, voice
+        # analytics and episodic memory in small batches, resuming from its
+        # checkpoints if a previous pass was cut short.
+        try:
+            from backend.services.data_retention import retention_purger
 
-                async with SessionLocal() as retention_db:
-                    retention_result = await _asyncio.wait_for(
-                        purge_expired_chat_messages(retention_db),
-                        timeout=_STARTUP_DB_TIMEOUT,
-                    )
-                    purged = retention_result.get("purged_messages", 0)
-                    if purged:
-                        startup_logger.info(
-                            f"✅ Purged {purged} expired chat messages (retention={retention_result.get('retention_days')}d)"
-                        )
-                    else:
-                        startup_logger.info("ℹ️ No expired chat data to purge")
-            except _asyncio.TimeoutError:
-                startup_logger.error(
-                    f"⚠️ Data retention cleanup timed out after {_STARTUP_DB_TIMEOUT}s — "
-                    "will retry on next startup"
+            await retention_purger.start()
+            if retention_purger.status["running"]:
+                startup_logger.info(
+                    "✅ Data retention purger running "
+                    f"(every {retention_purger.status['interval_hours']:g}h)"
                 )
-            except Exception as retention_error:
+            else:
                 startup_logger.info(
-                    f"⚠️ Data retention cleanup had issues: {retention_error}"
+                    "ℹ️  Data retention purger disabled (RETENTION_CLEANUP_ENABLED=false)"
                 )
-
-        _task = _asyncio.create_task(
-            _data_retention_background(), name="data_retention"
-        )
-        _startup_status["background_tasks"].append(_task)
+        except Exception as retention_error:
+            startup_logger.info(
+                f"⚠️ Data retention purger not started: {retention_error}"
+            )
 
         # Step 6: Initialize KIAAN 24/7 Learning Daemon (Autonomous Gita Wisdom)
         startup_logger.info("\n🕉️ Initializing KIAAN 24/7 Learning Daemon...")
@@ -888,6 +899,48 @@ async def startup():
             # Don't fail startup — scheduled deletions can still be run
             # via the one-shot CLI (scripts/run_privacy_hard_deletes.py).
 
+        # Step 10: Start the verse graph write-behind flusher. Until it runs,
+        # graph events are written synchronously on the request path.
+        try:
+            from backend.services.kiaan_verse_application_graph import (
+                get_verse_application_graph,
+            )
+
+            await get_verse_application_graph().start()
+            startup_logger.info("✅ Verse graph write-behind flusher running")
+        except Exception as graph_error:
+            startup_logger.info(f"⚠️ Verse graph flusher not started: {graph_error}")
+
+        # Step 11: Start the usage ledger reconciler, which copies the Redis
+        # KIAAN / voice usage counters into usage_tracking.
+        try:
+            from backend.services.usage_ledger import get_usage_ledger
+
+            await get_usage_ledger().start()
+            startup_logger.info("✅ Usage ledger reconciler running")
+        except Exception as ledger_error:
+            startup_logger.info(f"⚠️ Usage ledger reconciler not started: {ledger_error}")
+
+        # Step 12: Start the analytics writer. Until it runs, track_event()
+        # writes on the caller's session.
+        try:
+            from backend.analytics.simple_tracker import get_analytics_writer
+
+            await get_analytics_writer().start()
+            startup_logger.info("✅ Analytics writer running")
+        except Exception as analytics_error:
+            startup_logger.info(f"⚠️ Analytics writer not started: {analytics_error}")
+
+        # Step 13: Move wisdom delivery buffering onto the crash-safe
+        # write-behind log, replaying segments left by killed workers.
+        try:
+            from backend.services.dynamic_wisdom_corpus import get_dynamic_wisdom_corpus
+
+            await get_dynamic_wisdom_corpus().start()
+            startup_logger.info("✅ Wisdom delivery write-behind log running")
+        except Exception as wisdom_log_error:
+            startup_logger.info(f"⚠️ Wisdom delivery write-behind log not started: {wisdom_log_error}")
+
         _startup_status["started"] = True
 
         # Final startup status banner
@@ -956,6 +1009,44 @@ async def shutdown():
     except Exception as e:
         startup_logger.info(f"⚠️ Error stopping Gita Auto-Enricher: {e}")
 
+    # Stop the verse graph flusher (flushes buffered events)
+    try:
+        from backend.services.kiaan_verse_application_graph import (
+            get_verse_application_graph,
+        )
+
+        await get_verse_application_graph().stop()
+        startup_logger.info("✅ Verse graph flusher stopped")
+    except Exception as e:
+        startup_logger.info(f"⚠️ Error stopping verse graph flusher: {e}")
+
+    # Stop the usage ledger reconciler (writes out pending counts)
+    try:
+        from backend.services.usage_ledger import get_usage_ledger
+
+        await get_usage_ledger().stop()
+        startup_logger.info("✅ Usage ledger reconciler stopped")
+    except Exception as e:
+        startup_logger.info(f"⚠️ Error stopping usage ledger reconciler: {e}")
+
+    # Stop the analytics writer (writes or spills queued events)
+    try:
+        from backend.analytics.simple_tracker import get_analytics_writer
+
+        await get_analytics_writer().stop()
+        startup_logger.info("✅ Analytics writer stopped")
+    except Exception as e:
+        startup_logger.info(f"⚠️ Error stopping analytics writer: {e}")
+
+    # Stop the data retention purger (a pass in progress resumes next time)
+    try:
+        from backend.services.data_retention import retention_purger
+
+        await retention_purger.stop()
+        startup_logger.info("✅ Data retention purger stopped")
+    except Exception as e:
+        startup_logger.info(f"⚠️ Error stopping data retention purger: {e}")
+
     # Stop Privacy Scheduler (GDPR hard-delete worker)
     try:
         from backend.services.privacy_scheduler import privacy_scheduler
@@ -1006,6 +1097,11 @@ async def shutdown():
 
     startup_logger.info("✅ Shutdown complete")
 
+    # Write out queued log records and stop the logging thread
+    from backend.services.log_pipeline import stop_log_pipeline
+
+    stop_log_pipeline()
+
 
 startup_logger.info("\n[1/3] Attempting to import KIAAN chat router...")
 kiaan_router_loaded = False
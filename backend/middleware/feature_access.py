@@ -6,6 +6,10 @@ Provides decorators and dependencies for enforcing subscription-based access con
 - require_journal_access() - Blocks free tier from journal
 - require_feature(feature_name) - Generic feature guard
 - Developer bypass for app owners
+
+All gates read one entitlement snapshot per request
+(backend.services.entitlement_cache.get_entitlements), so stacking several
+of them on a route costs one lookup rather than several per dependency.
 """
 
 import logging
@@ -18,13 +22,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.deps import get_db
 from backend.models import SubscriptionStatus, User
+from backend.services.entitlement_cache import get_entitlements
 from backend.services.subscription_service import (
-    check_feature_access,
-    check_journal_access,
     check_kiaan_quota,
     check_wisdom_journeys_access,
-    get_or_create_free_subscription,
-    get_user_tier,
 )
 
 logger = logging.getLogger(__name__)
@@ -184,15 +185,15 @@ class SubscriptionRequired:
             return user_id
 
         # Get or create subscription (auto-assign free tier)
-        subscription = await get_or_create_free_subscription(db, user_id)
+        entitlements = await get_entitlements(db, user_id, request)
 
-        if subscription.status not in (SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING):
+        if entitlements.status not in (SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIALING):
             raise HTTPException(
                 status_code=status.HTTP_402_PAYMENT_REQUIRED,
                 detail={
                     "error": "subscription_required",
                     "message": "An active subscription is required to access this feature.",
-                    "subscription_status": subscription.status.value,
+                    "subscription_status": entitlements.status.value,
                 },
             )
 
@@ -225,18 +226,18 @@ class KiaanQuotaRequired:
         user_id = await get_current_user_id(request)
 
         # Ensure user has a subscription
-        await get_or_create_free_subscription(db, user_id)
+        entitlements = await get_entitlements(db, user_id, request)
 
         # Check for developer bypass - gives unlimited KIAAN questions
-        if await is_developer(db, user_id):
+        if entitlements.is_developer:
             logger.info(f"Developer bypass: granting unlimited KIAAN quota to {user_id}")
             return user_id, 0, -1  # -1 means unlimited
 
         # Check quota
-        has_quota, usage_count, usage_limit = await check_kiaan_quota(db, user_id)
+        tier = entitlements.tier
+        has_quota, usage_count, usage_limit = await check_kiaan_quota(db, user_id, tier)
 
         if not has_quota:
-            tier = await get_user_tier(db, user_id)
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail={
@@ -280,18 +281,18 @@ class JournalAccessRequired:
         user_id = await get_current_user_id(request)
 
         # Ensure user has a subscription
-        await get_or_create_free_subscription(db, user_id)
+        entitlements = await get_entitlements(db, user_id, request)
 
         # Check for developer bypass - gives full journal access
-        if await is_developer(db, user_id):
+        if entitlements.is_developer:
             logger.info(f"Developer bypass: granting journal access to {user_id}")
             return user_id
 
         # Check journal access
-        has_access = await check_journal_access(db, user_id)
+        has_access = entitlements.has_feature("encrypted_journal")
 
         if not has_access:
-            tier = await get_user_tier(db, user_id)
+            tier = entitlements.tier
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -349,7 +350,7 @@ class WisdomJourneysAccessRequired:
 
         # Ensure user has a subscription
         try:
-            await get_or_create_free_subscription(db, user_id)
+            entitlements = await get_entitlements(db, user_id, request)
         except ValueError as e:
             # User not found in database
             logger.error(f"User not found when checking journey access: {e}")
@@ -362,17 +363,16 @@ class WisdomJourneysAccessRequired:
             ) from None
 
         # Check for developer bypass - gives full unlimited access
-        if await is_developer(db, user_id):
+        if entitlements.is_developer:
             logger.info(f"Developer bypass: granting unlimited Wisdom Journeys access to {user_id}")
             return user_id, 0, -1  # -1 means unlimited
 
         # Check wisdom journeys access
+        tier = entitlements.tier
         has_access, active_count, journey_limit = await check_wisdom_journeys_access(
-            db, user_id
+            db, user_id, tier
         )
 
-        tier = await get_user_tier(db, user_id)
-
         if not has_access:
             # Provide tier-appropriate message
             if tier.value == "free":
@@ -453,18 +453,18 @@ class FeatureRequired:
         user_id = await get_current_user_id(request)
 
         # Ensure user has a subscription
-        await get_or_create_free_subscription(db, user_id)
+        entitlements = await get_entitlements(db, user_id, request)
 
         # Check for developer bypass - gives access to all features
-        if await is_developer(db, user_id):
+        if entitlements.is_developer:
             logger.info(f"Developer bypass: granting access to {self.feature_name} for {user_id}")
             return user_id
 
         # Check feature access
-        has_access = await check_feature_access(db, user_id, self.feature_name)
+        has_access = entitlements.has_feature(self.feature_name)
 
         if not has_access:
-            tier = await get_user_tier(db, user_id)
+            tier = entitlements.tier
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
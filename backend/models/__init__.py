@@ -52,6 +52,12 @@ from backend.models.ai import (
     ValidationStatus,
 )
 
+# Analytics models
+from backend.models.analytics import (
+    AnalyticsEvent,
+    AnalyticsEventRollup,
+)
+
 # Authentication models
 from backend.models.auth import (
     EmailVerificationToken,
@@ -92,6 +98,7 @@ from backend.models.compliance import (
     DataExportStatus,
     DeletionRequest,
     DeletionRequestStatus,
+    RetentionCheckpoint,
     UserConsent,
 )
 
@@ -162,6 +169,7 @@ from backend.models.karmalytix import (
 # Mood models
 from backend.models.mood import (
     Mood,
+    UserMoodStats,
 )
 
 # Notification models
@@ -184,6 +192,7 @@ from backend.models.self_sufficiency import (
     CompositionTemplate,
     ConversationFlowSnapshot,
     VerseApplicationEdge,
+    VerseRecommendation,
     WisdomAtom,
 )
 
@@ -253,6 +262,7 @@ from backend.models.wisdom import (
     GitaVerseKeyword,
     GitaVerseUsage,
     WisdomEffectiveness,
+    WisdomEffectivenessRollup,
     WisdomVerse,
 )
 
@@ -311,6 +321,7 @@ __all__ = [
     "Work",
     # Mood models
     "Mood",
+    "UserMoodStats",
     # Journal models
     "EncryptedBlob",
     "JournalEntry",
@@ -331,6 +342,7 @@ __all__ = [
     "GitaVerseKeyword",
     "GitaVerseUsage",
     "WisdomEffectiveness",
+    "WisdomEffectivenessRollup",
     # KIAAN Learning System models
     "ContentSourceType",
     "ValidationStatus",
@@ -344,6 +356,9 @@ __all__ = [
     "UsageTracking",
     "Payment",
     "SubscriptionLink",
+    # Analytics models
+    "AnalyticsEvent",
+    "AnalyticsEventRollup",
     # Admin models
     "AdminUser",
     "AdminPermissionAssignment",
@@ -363,6 +378,7 @@ __all__ = [
     "DataExportRequest",
     "DeletionRequest",
     "ComplianceAuditLog",
+    "RetentionCheckpoint",
     "PrivacyRequest",
     # Chat models
     "ChatRoom",
@@ -410,6 +426,7 @@ __all__ = [
     # KIAAN Self-Sufficiency models
     "WisdomAtom",
     "VerseApplicationEdge",
+    "VerseRecommendation",
     "ConversationFlowSnapshot",
     "CompositionTemplate",
     # Personal Journey
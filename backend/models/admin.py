@@ -12,6 +12,7 @@ from sqlalchemy import (
     Boolean,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -300,6 +301,11 @@ class AdminAuditLog(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), index=True
     )
 
+    __table_args__ = (
+        # Keyset pagination of the admin audit log list
+        Index("idx_admin_audit_logs_created_id", "created_at", "id"),
+    )
+
 
 class FeatureFlag(SoftDeleteMixin, Base):
     """Feature flags for gradual rollout and targeting."""
@@ -473,3 +479,8 @@ class FlaggedContent(SoftDeleteMixin, Base):
     flagged_at: Mapped[datetime.datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now()
     )
+
+    __table_args__ = (
+        # Keyset pagination of the moderation queue
+        Index("idx_flagged_content_flagged_id", "flagged_at", "id"),
+    )
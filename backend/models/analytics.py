@@ -0,0 +1,61 @@
+"""Analytics models: raw events from SimpleAnalytics and their rollups."""
+
+from __future__ import annotations
+
+import datetime
+
+from sqlalchemy import JSON, TIMESTAMP, BigInteger, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.models.base import Base
+
+
+class AnalyticsEvent(Base):
+    """One tracked event, written in batches by the analytics writer.
+
+    ``user_id`` deliberately has no foreign key: one event for a deleted
+    user must not fail the whole batch it was written with.
+    """
+
+    __tablename__ = "analytics_events"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # "metadata" is reserved on declarative classes
+    event_metadata: Mapped[dict | None] = mapped_column(
+        "metadata", JSON().with_variant(JSONB, "postgresql"), nullable=True
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_analytics_event_type", "event_type", "created_at"),
+        Index("idx_analytics_user", "user_id", "created_at"),
+        Index("idx_analytics_created", "created_at"),
+    )
+
+
+class AnalyticsEventRollup(Base):
+    """Event counts per hour and per day, maintained as events are written.
+
+    ``granularity`` is ``"hour"`` or ``"day"``; ``bucket_start`` is the UTC
+    start of the bucket. Rebuildable from analytics_events with
+    SimpleAnalytics.rebuild_rollups().
+    """
+
+    __tablename__ = "analytics_event_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True
+    )
+    event_type: Mapped[str] = mapped_column(String(100), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -216,3 +216,33 @@ class ComplianceAuditLog(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now(), index=True
     )
+
+
+class RetentionCheckpoint(Base):
+    """Progress of the batched retention purge, one row per policy.
+
+    ``last_key`` is the highest primary key already purged in the run that
+    started at ``started_at`` with ``cutoff``; it is written in the same
+    transaction as each batch, so an interrupted run resumes after it.
+    ``completed_at`` is set when the run finishes. ``lease_expires_at``
+    and ``lease_owner`` keep a second worker from purging the same policy
+    at the same time; both are cleared when the run ends or is cancelled.
+    """
+
+    __tablename__ = "retention_checkpoints"
+
+    policy: Mapped[str] = mapped_column(String(64), primary_key=True)
+    cutoff: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True))
+    last_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    purged: Mapped[int] = mapped_column(Integer, default=0)
+    started_at: Mapped[datetime.datetime] = mapped_column(TIMESTAMP(timezone=True))
+    updated_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    completed_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    lease_expires_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    lease_owner: Mapped[str | None] = mapped_column(String(255), nullable=True)
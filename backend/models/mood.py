@@ -30,3 +30,29 @@ class Mood(SoftDeleteMixin, Base):
     at: Mapped[datetime.datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now()
     )
+
+
+class UserMoodStats(Base):
+    """Incrementally maintained per-user mood aggregates.
+
+    One row per user holding a serialized ``MoodRollingStats`` (Welford
+    mean/variance, regression sums, EWMA, weekday histogram, tag sums,
+    recent window). Updated in the same transaction that logs a mood and
+    rebuilt from the full history by ``backend/scripts/rebuild_mood_stats.py``.
+    """
+
+    __tablename__ = "user_mood_stats"
+    user_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    stats: Mapped[dict] = mapped_column(JSON)
+    mood_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_mood_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    rebuilt_at: Mapped[datetime.datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -3,6 +3,7 @@ KIAAN Self-Sufficiency Models — Database tables for the 4 core modules.
 
 Module 1: WisdomAtom — Atomic reusable wisdom units distilled from LLM responses
 Module 2: VerseApplicationEdge — Weighted verse-to-situation graph edges
+          VerseRecommendation — Precomputed top-k verses per situation
 Module 3: ConversationFlowSnapshot — Persisted conversation state machine snapshots
 Module 4: CompositionTemplate — Pre-assembled response templates from proven patterns
 """
@@ -178,6 +179,44 @@ class VerseApplicationEdge(Base):
     )
 
 
+class VerseRecommendation(Base):
+    """
+    Precomputed top-k verse recommendations for one situation.
+
+    Refreshed from verse_application_edges by
+    VerseApplicationGraph.refresh_recommendations() for the situations whose
+    edges changed, so recommend() is a single indexed read. topic "*" holds
+    the mood-only ranking used when a mood+topic has no edges. Rebuildable
+    from the edges at any time.
+    """
+
+    __tablename__ = "verse_recommendations"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    # The situation this ranking answers
+    mood: Mapped[str] = mapped_column(String(32), nullable=False)
+    topic: Mapped[str] = mapped_column(String(32), nullable=False)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 = best
+
+    # Snapshot of the edge at refresh time
+    verse_ref: Mapped[str] = mapped_column(String(16), nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    composite_score: Mapped[float] = mapped_column(Float, nullable=False)
+    times_shown: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    positive_signals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    negative_signals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    refreshed_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("mood", "topic", "rank", name="uq_verse_rec_situation_rank"),
+    )
+
+
 # =============================================================================
 # MODULE 3: Conversation Flow Snapshots — State machine persistence
 # =============================================================================
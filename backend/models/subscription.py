@@ -12,6 +12,7 @@ from sqlalchemy import (
     Boolean,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -165,6 +166,11 @@ class UserSubscription(SoftDeleteMixin, Base):
     # Relationships
     plan: Mapped[SubscriptionPlan] = relationship("SubscriptionPlan", lazy="joined")
 
+    __table_args__ = (
+        # Keyset pagination of the admin subscription list
+        Index("idx_user_subscriptions_created_id", "created_at", "id"),
+    )
+
 
 class UsageTracking(Base):
     """Tracks feature usage (e.g., KIAAN questions) per user per month."""
@@ -191,6 +197,11 @@ class UsageTracking(Base):
         TIMESTAMP(timezone=True), nullable=True, onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Latest period per user for the admin user details
+        Index("idx_usage_tracking_user_feature_period", "user_id", "feature", "period_start"),
+    )
+
 
 class SubscriptionLinkStatus(str, enum.Enum):
     """Status of a Razorpay subscription link."""
@@ -306,3 +317,8 @@ class Payment(SoftDeleteMixin, Base):
     updated_at: Mapped[datetime.datetime | None] = mapped_column(
         TIMESTAMP(timezone=True), nullable=True, onupdate=func.now()
     )
+
+    __table_args__ = (
+        # Keyset pagination of the admin payment list
+        Index("idx_payments_created_id", "created_at", "id"),
+    )
@@ -9,10 +9,12 @@ from sqlalchemy import (
     TIMESTAMP,
     Boolean,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -49,6 +51,12 @@ class User(SoftDeleteMixin, Base):
         TIMESTAMP(timezone=True), server_default=func.now()
     )
 
+    __table_args__ = (
+        # Keyset pagination of the admin user list, by created_at or email
+        Index("idx_users_created_id", "created_at", "id"),
+        Index("idx_users_email_id", func.coalesce(text("email"), text("''")), "id"),
+    )
+
 
 class UserProfile(SoftDeleteMixin, Base):
     __tablename__ = "user_profiles"
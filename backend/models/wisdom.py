@@ -10,6 +10,7 @@ from sqlalchemy import (
     Boolean,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -335,3 +336,30 @@ class WisdomEffectiveness(Base):
     outcome_recorded_at: Mapped[datetime.datetime | None] = mapped_column(
         TIMESTAMP(timezone=True), nullable=True
     )
+
+
+class WisdomEffectivenessRollup(Base):
+    """Running effectiveness totals per (mood, verse) for DynamicWisdomCorpus.
+
+    ``deliveries`` grows with each flushed delivery; ``outcome_count`` and
+    ``effectiveness_sum`` with each recorded outcome, in the same
+    transactions as the wisdom_effectiveness writes. ``avg_effectiveness``
+    is kept alongside so ranking is an indexed top-k read. Rebuilt from
+    wisdom_effectiveness by backend/scripts/rebuild_wisdom_rollups.py.
+    """
+
+    __tablename__ = "wisdom_effectiveness_rollups"
+
+    mood: Mapped[str] = mapped_column(String(32), primary_key=True)
+    verse_ref: Mapped[str] = mapped_column(String(16), primary_key=True)
+    deliveries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    outcome_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    effectiveness_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    avg_effectiveness: Mapped[float | None] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_wisdom_rollup_mood_avg", "mood", "avg_effectiveness"),
+    )
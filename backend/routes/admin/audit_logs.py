@@ -1,9 +1,8 @@
 """Admin audit logs routes."""
 
 from datetime import datetime
-from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,6 +19,7 @@ from backend.models import (
     AdminPermission,
     AdminUser,
 )
+from backend.services.admin_pagination import InvalidCursor, cached_count, keyset_page
 
 
 router = APIRouter(prefix="/api/admin/audit-logs", tags=["admin-audit-logs"])
@@ -32,14 +32,14 @@ router = APIRouter(prefix="/api/admin/audit-logs", tags=["admin-audit-logs"])
 class AuditLogEntry(BaseModel):
     """Audit log entry."""
     id: int
-    admin_id: Optional[str]
-    admin_email: Optional[str]
+    admin_id: str | None
+    admin_email: str | None
     action: str
-    resource_type: Optional[str]
-    resource_id: Optional[str]
-    details: Optional[dict]
-    ip_address: Optional[str]
-    user_agent: Optional[str]
+    resource_type: str | None
+    resource_id: str | None
+    details: dict | None
+    ip_address: str | None
+    user_agent: str | None
     created_at: datetime
 
 
@@ -47,9 +47,10 @@ class AuditLogListOut(BaseModel):
     """Audit log list response."""
     logs: list[AuditLogEntry]
     total: int
-    page: int
+    page: int | None  # None when paging by cursor
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class AuditLogStatsOut(BaseModel):
@@ -70,66 +71,66 @@ async def list_audit_logs(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    action: Optional[str] = None,
-    admin_id: Optional[str] = None,
-    resource_type: Optional[str] = None,
-    resource_id: Optional[str] = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
+    cursor: str | None = Query(None, max_length=512),
+    action: str | None = None,
+    admin_id: str | None = None,
+    resource_type: str | None = None,
+    resource_id: str | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.AUDIT_LOGS_VIEW)),
     db: AsyncSession = Depends(get_db),
 ):
     """
     List audit logs with filtering and pagination.
-    
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+
     Permissions required: audit_logs:view
     """
     # Build query
     query = select(AdminAuditLog)
     count_query = select(func.count(AdminAuditLog.id))
-    
+
     # Filters
     if action:
         action_enum = AdminAuditAction(action)
         query = query.where(AdminAuditLog.action == action_enum)
         count_query = count_query.where(AdminAuditLog.action == action_enum)
-    
+
     if admin_id:
         query = query.where(AdminAuditLog.admin_id == admin_id)
         count_query = count_query.where(AdminAuditLog.admin_id == admin_id)
-    
+
     if resource_type:
         query = query.where(AdminAuditLog.resource_type == resource_type)
         count_query = count_query.where(AdminAuditLog.resource_type == resource_type)
-    
+
     if resource_id:
         query = query.where(AdminAuditLog.resource_id == resource_id)
         count_query = count_query.where(AdminAuditLog.resource_id == resource_id)
-    
+
     if start_date:
         query = query.where(AdminAuditLog.created_at >= start_date)
         count_query = count_query.where(AdminAuditLog.created_at >= start_date)
-    
+
     if end_date:
         query = query.where(AdminAuditLog.created_at <= end_date)
         count_query = count_query.where(AdminAuditLog.created_at <= end_date)
-    
-    # Order by created_at desc (most recent first)
-    query = query.order_by(AdminAuditLog.created_at.desc())
-    
+
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute
-    result = await db.execute(query)
-    logs = result.scalars().all()
-    
+    total = await cached_count(db, count_query)
+
+    # Most recent first
+    try:
+        logs, next_cursor = await keyset_page(
+            db, query, [AdminAuditLog.created_at, AdminAuditLog.id], page_size,
+            cursor=cursor, page=page,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
     # Get admin emails for display
     admin_ids = {log.admin_id for log in logs if log.admin_id}
     admin_emails = {}
@@ -137,7 +138,7 @@ async def list_audit_logs(
         admin_stmt = select(AdminUser.id, AdminUser.email).where(AdminUser.id.in_(admin_ids))
         admin_result = await db.execute(admin_stmt)
         admin_emails = {row.id: row.email for row in admin_result.all()}
-    
+
     # Map to response
     log_entries = [
         AuditLogEntry(
@@ -154,15 +155,16 @@ async def list_audit_logs(
         )
         for log in logs
     ]
-    
+
     total_pages = (total + page_size - 1) // page_size
-    
+
     return AuditLogListOut(
         logs=log_entries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -175,34 +177,34 @@ async def get_audit_log_stats(
 ):
     """
     Get audit log statistics.
-    
+
     Permissions required: audit_logs:view
     """
     from datetime import timedelta
-    
+
     now = datetime.now()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=7)
-    
+
     # Total logs
     total_stmt = select(func.count(AdminAuditLog.id))
     total_result = await db.execute(total_stmt)
     total_logs = total_result.scalar() or 0
-    
+
     # Logs today
     today_stmt = select(func.count(AdminAuditLog.id)).where(
         AdminAuditLog.created_at >= today_start
     )
     today_result = await db.execute(today_stmt)
     logs_today = today_result.scalar() or 0
-    
+
     # Logs this week
     week_stmt = select(func.count(AdminAuditLog.id)).where(
         AdminAuditLog.created_at >= week_start
     )
     week_result = await db.execute(week_stmt)
     logs_this_week = week_result.scalar() or 0
-    
+
     # Top actions (last 7 days)
     top_actions_stmt = (
         select(AdminAuditLog.action, func.count(AdminAuditLog.id).label("count"))
@@ -213,7 +215,7 @@ async def get_audit_log_stats(
     )
     top_actions_result = await db.execute(top_actions_stmt)
     top_actions = {row.action.value: row.count for row in top_actions_result.all()}
-    
+
     # Top admins (last 7 days)
     top_admins_stmt = (
         select(AdminUser.email, func.count(AdminAuditLog.id).label("count"))
@@ -225,7 +227,7 @@ async def get_audit_log_stats(
     )
     top_admins_result = await db.execute(top_admins_stmt)
     top_admins = {row.email: row.count for row in top_admins_result.all()}
-    
+
     return AuditLogStatsOut(
         total_logs=total_logs,
         logs_today=logs_today,
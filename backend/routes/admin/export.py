@@ -1,14 +1,10 @@
 """Admin data export routes."""
 
-import csv
-import io
-import json
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.deps import get_db
@@ -20,11 +16,19 @@ from backend.middleware.rbac import (
 from backend.models import (
     AdminAuditAction,
     AdminPermission,
-    Payment,
-    User,
-    UserSubscription,
 )
 from backend.services.admin_auth_service import create_audit_log
+from backend.services.admin_export_service import (
+    MEDIA_TYPES,
+    ExportSpec,
+    analytics_export,
+    export_filename,
+    get_export_jobs,
+    payments_export,
+    stream_export,
+    subscriptions_export,
+    users_export,
+)
 
 
 router = APIRouter(prefix="/api/admin/export", tags=["admin-export"])
@@ -47,187 +51,126 @@ def get_user_agent(request: Request) -> str | None:
     return request.headers.get("User-Agent")
 
 
-async def generate_csv(data: list[dict], fieldnames: list[str]):
-    """Generate CSV content from data."""
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    for row in data:
-        writer.writerow(row)
-    return output.getvalue()
+async def export_response(
+    request: Request,
+    db: AsyncSession,
+    admin: AdminContext,
+    spec: ExportSpec,
+    format: str,
+    gzip: bool,
+    mode: str,
+    details: dict | None = None,
+):
+    """Audit the export, then stream it or start it as a background job."""
+    job = get_export_jobs().start(spec, format, gzip, admin.admin.id) if mode == "job" else None
+    await create_audit_log(
+        db=db,
+        admin_id=admin.admin.id,
+        action=AdminAuditAction.DATA_EXPORTED,
+        resource_type=spec.resource,
+        details={
+            "format": format,
+            "gzip": gzip,
+            "mode": mode,
+            **({"job_id": job["job_id"]} if job else {}),
+            **(details or {}),
+        },
+        ip_address=get_client_ip(request),
+        user_agent=get_user_agent(request),
+    )
 
+    if job is not None:
+        return JSONResponse(status_code=202, content=job_status(job))
 
-async def generate_json(data: list[dict]):
-    """Generate JSON content from data."""
-    return json.dumps(data, indent=2, default=str)
+    filename = export_filename(spec, format, gzip)
+    return StreamingResponse(
+        stream_export(spec, format, gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def job_status(job: dict) -> dict:
+    """Public view of an export job."""
+    url = f"{router.prefix}/jobs/{job['job_id']}"
+    return {
+        **{k: v for k, v in job.items() if k != "admin_id"},
+        "status_url": url,
+        "download_url": f"{url}/download" if job["state"] == "done" else None,
+    }
+
+
+def get_own_job(job_id: str, admin: AdminContext) -> dict:
+    job = get_export_jobs().get(job_id)
+    if job is None or job["admin_id"] != admin.admin.id:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
 
 
 # =============================================================================
 # Routes
 # =============================================================================
 
+# Shared query parameters
+FORMAT_QUERY = Query("csv", pattern="^(csv|json|ndjson)$")
+GZIP_QUERY = Query(False, description="gzip the file")
+MODE_QUERY = Query(
+    "stream",
+    pattern="^(stream|job)$",
+    description="stream the file now, or write it in the background for /jobs download",
+)
+
+
 @router.get("/users")
 async def export_users(
     request: Request,
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = FORMAT_QUERY,
+    gzip: bool = GZIP_QUERY,
+    mode: str = MODE_QUERY,
     include_subscription: bool = True,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.DATA_EXPORT)),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Export users data in CSV or JSON format.
+    Export users data in CSV, JSON or NDJSON format.
     
     Permissions required: data:export
     
     Note: Sensitive data like passwords are never exported.
     """
-    # Query users
-    stmt = select(User).where(User.deleted_at.is_(None)).order_by(User.created_at.desc())
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    
-    # Build export data
-    export_data = []
-    for user in users:
-        user_data = {
-            "id": user.id,
-            "email": user.email,
-            "auth_uid": user.auth_uid,
-            "locale": user.locale,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-        }
-        
-        if include_subscription:
-            # Get subscription
-            sub_stmt = select(UserSubscription).where(
-                UserSubscription.user_id == user.id,
-                UserSubscription.deleted_at.is_(None),
-            )
-            sub_result = await db.execute(sub_stmt)
-            subscription = sub_result.scalars().first()
-            
-            if subscription and subscription.plan:
-                user_data["subscription_tier"] = subscription.plan.tier.value
-                user_data["subscription_status"] = subscription.status.value
-            else:
-                user_data["subscription_tier"] = None
-                user_data["subscription_status"] = None
-        
-        export_data.append(user_data)
-    
-    # Log export
-    await create_audit_log(
-        db=db,
-        admin_id=admin.admin.id,
-        action=AdminAuditAction.DATA_EXPORTED,
-        resource_type="users",
-        details={"format": format, "count": len(export_data)},
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request),
+    return await export_response(
+        request, db, admin, users_export(include_subscription), format, gzip, mode,
+        {"include_subscription": include_subscription},
     )
-    
-    # Generate response
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    if format == "csv":
-        fieldnames = list(export_data[0].keys()) if export_data else ["id"]
-        content = await generate_csv(export_data, fieldnames)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="users_export_{timestamp}.csv"'
-            },
-        )
-    else:
-        content = await generate_json(export_data)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="users_export_{timestamp}.json"'
-            },
-        )
 
 
 @router.get("/subscriptions")
 async def export_subscriptions(
     request: Request,
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = FORMAT_QUERY,
+    gzip: bool = GZIP_QUERY,
+    mode: str = MODE_QUERY,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.DATA_EXPORT)),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Export subscriptions data in CSV or JSON format.
+    Export subscriptions data in CSV, JSON or NDJSON format.
     
     Permissions required: data:export
     """
-    # Query subscriptions
-    stmt = (
-        select(UserSubscription)
-        .where(UserSubscription.deleted_at.is_(None))
-        .order_by(UserSubscription.created_at.desc())
+    return await export_response(
+        request, db, admin, subscriptions_export(), format, gzip, mode
     )
-    result = await db.execute(stmt)
-    subscriptions = result.scalars().all()
-    
-    # Build export data
-    export_data = []
-    for sub in subscriptions:
-        sub_data = {
-            "id": sub.id,
-            "user_id": sub.user_id,
-            "tier": sub.plan.tier.value if sub.plan else None,
-            "status": sub.status.value,
-            "current_period_start": sub.current_period_start.isoformat() if sub.current_period_start else None,
-            "current_period_end": sub.current_period_end.isoformat() if sub.current_period_end else None,
-            "cancel_at_period_end": sub.cancel_at_period_end,
-            "canceled_at": sub.canceled_at.isoformat() if sub.canceled_at else None,
-            "created_at": sub.created_at.isoformat() if sub.created_at else None,
-        }
-        export_data.append(sub_data)
-    
-    # Log export
-    await create_audit_log(
-        db=db,
-        admin_id=admin.admin.id,
-        action=AdminAuditAction.DATA_EXPORTED,
-        resource_type="subscriptions",
-        details={"format": format, "count": len(export_data)},
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request),
-    )
-    
-    # Generate response
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    if format == "csv":
-        fieldnames = list(export_data[0].keys()) if export_data else ["id"]
-        content = await generate_csv(export_data, fieldnames)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="subscriptions_export_{timestamp}.csv"'
-            },
-        )
-    else:
-        content = await generate_json(export_data)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="subscriptions_export_{timestamp}.json"'
-            },
-        )
 
 
 @router.get("/payments")
 async def export_payments(
     request: Request,
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = FORMAT_QUERY,
+    gzip: bool = GZIP_QUERY,
+    mode: str = MODE_QUERY,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     admin: AdminContext = Depends(get_current_admin),
@@ -235,158 +178,73 @@ async def export_payments(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Export payments data in CSV or JSON format.
+    Export payments data in CSV, JSON or NDJSON format.
     
     Permissions required: data:export
     """
-    # Query payments
-    stmt = (
-        select(Payment)
-        .where(Payment.deleted_at.is_(None))
-        .order_by(Payment.created_at.desc())
+    return await export_response(
+        request, db, admin, payments_export(start_date, end_date), format, gzip, mode,
+        {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        },
     )
-    
-    if start_date:
-        stmt = stmt.where(Payment.created_at >= start_date)
-    if end_date:
-        stmt = stmt.where(Payment.created_at <= end_date)
-    
-    result = await db.execute(stmt)
-    payments = result.scalars().all()
-    
-    # Build export data
-    export_data = []
-    for payment in payments:
-        payment_data = {
-            "id": payment.id,
-            "user_id": payment.user_id,
-            "amount": float(payment.amount),
-            "currency": payment.currency,
-            "status": payment.status.value,
-            "description": payment.description,
-            "stripe_payment_intent_id": payment.stripe_payment_intent_id,
-            "created_at": payment.created_at.isoformat() if payment.created_at else None,
-        }
-        export_data.append(payment_data)
-    
-    # Log export
-    await create_audit_log(
-        db=db,
-        admin_id=admin.admin.id,
-        action=AdminAuditAction.DATA_EXPORTED,
-        resource_type="payments",
-        details={"format": format, "count": len(export_data)},
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request),
-    )
-    
-    # Generate response
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    if format == "csv":
-        fieldnames = list(export_data[0].keys()) if export_data else ["id"]
-        content = await generate_csv(export_data, fieldnames)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="payments_export_{timestamp}.csv"'
-            },
-        )
-    else:
-        content = await generate_json(export_data)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="payments_export_{timestamp}.json"'
-            },
-        )
 
 
 @router.get("/analytics")
 async def export_analytics(
     request: Request,
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = FORMAT_QUERY,
+    gzip: bool = GZIP_QUERY,
+    mode: str = MODE_QUERY,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.DATA_EXPORT)),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Export analytics data in CSV or JSON format.
+    Export analytics data in CSV, JSON or NDJSON format.
     
     This exports aggregated, anonymized KIAAN usage analytics.
     No personal data or conversation content is included.
+    CSV leaves out the nested topic / tier distributions.
     
     Permissions required: data:export
     """
-    from backend.models import KiaanUsageAnalytics
-    
-    # Query analytics
-    stmt = (
-        select(KiaanUsageAnalytics)
-        .order_by(KiaanUsageAnalytics.date.desc())
-        .limit(365)  # Last year
+    return await export_response(
+        request, db, admin, analytics_export(), format, gzip, mode
     )
-    result = await db.execute(stmt)
-    analytics = result.scalars().all()
+
+
+@router.get("/jobs/{job_id}")
+async def export_job_status(
+    job_id: str,
+    admin: AdminContext = Depends(get_current_admin),
+    _: None = Depends(PermissionChecker(AdminPermission.DATA_EXPORT)),
+):
+    """
+    Status of a background export started with mode=job.
     
-    # Build export data
-    export_data = []
-    for entry in analytics:
-        analytics_data = {
-            "date": entry.date.isoformat() if entry.date else None,
-            "total_questions": entry.total_questions,
-            "unique_users": entry.unique_users,
-            "topic_distribution": entry.topic_distribution,
-            "questions_by_tier": entry.questions_by_tier,
-            "avg_response_time_ms": entry.avg_response_time_ms,
-            "satisfaction_avg": float(entry.satisfaction_avg) if entry.satisfaction_avg else None,
-        }
-        export_data.append(analytics_data)
+    Permissions required: data:export (and the admin who started it)
+    """
+    return job_status(get_own_job(job_id, admin))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    admin: AdminContext = Depends(get_current_admin),
+    _: None = Depends(PermissionChecker(AdminPermission.DATA_EXPORT)),
+):
+    """
+    Download a finished background export.
     
-    # Log export
-    await create_audit_log(
-        db=db,
-        admin_id=admin.admin.id,
-        action=AdminAuditAction.DATA_EXPORTED,
-        resource_type="analytics",
-        details={"format": format, "count": len(export_data)},
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request),
+    Permissions required: data:export (and the admin who started it)
+    """
+    job = get_own_job(job_id, admin)
+    if job["state"] != "done":
+        raise HTTPException(status_code=409, detail=f"Export job is {job['state']}")
+    return FileResponse(
+        get_export_jobs().file_path(job),
+        media_type=job["media_type"],
+        filename=job["filename"],
     )
-    
-    # Generate response
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    if format == "csv":
-        # For CSV, flatten JSON fields
-        flat_data = []
-        for entry in export_data:
-            flat_entry = {
-                "date": entry["date"],
-                "total_questions": entry["total_questions"],
-                "unique_users": entry["unique_users"],
-                "avg_response_time_ms": entry["avg_response_time_ms"],
-                "satisfaction_avg": entry["satisfaction_avg"],
-            }
-            flat_data.append(flat_entry)
-        
-        fieldnames = list(flat_data[0].keys()) if flat_data else ["date"]
-        content = await generate_csv(flat_data, fieldnames)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="analytics_export_{timestamp}.csv"'
-            },
-        )
-    else:
-        content = await generate_json(export_data)
-        return StreamingResponse(
-            io.StringIO(content),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="analytics_export_{timestamp}.json"'
-            },
-        )
@@ -16,11 +16,10 @@ Admins CAN:
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.deps import get_db
@@ -48,8 +47,8 @@ class KiaanDailyStats(BaseModel):
     date: datetime
     total_questions: int
     unique_users: int
-    avg_response_time_ms: Optional[int]
-    satisfaction_avg: Optional[float]
+    avg_response_time_ms: int | None
+    satisfaction_avg: float | None
 
 
 class KiaanOverviewOut(BaseModel):
@@ -60,8 +59,8 @@ class KiaanOverviewOut(BaseModel):
     unique_users_today: int
     unique_users_week: int
     unique_users_month: int
-    avg_response_time_ms: Optional[int]
-    avg_satisfaction: Optional[float]
+    avg_response_time_ms: int | None
+    avg_satisfaction: float | None
 
 
 class KiaanTrendsOut(BaseModel):
@@ -92,9 +91,9 @@ async def get_kiaan_overview(
 ):
     """
     Get KIAAN analytics overview.
-    
+
     Permissions required: kiaan:analytics_view
-    
+
     Note: This is READ-ONLY access to aggregated analytics.
     No conversation content or personal data is exposed.
     """
@@ -102,14 +101,14 @@ async def get_kiaan_overview(
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=7)
     month_start = today_start - timedelta(days=30)
-    
+
     # Today's stats
     today_stmt = select(KiaanUsageAnalytics).where(
         KiaanUsageAnalytics.date >= today_start
     ).order_by(KiaanUsageAnalytics.date.desc()).limit(1)
     today_result = await db.execute(today_stmt)
     today_stats = today_result.scalars().first()
-    
+
     # Week's stats (sum)
     week_stmt = select(
         func.sum(KiaanUsageAnalytics.total_questions).label("questions"),
@@ -117,7 +116,7 @@ async def get_kiaan_overview(
     ).where(KiaanUsageAnalytics.date >= week_start)
     week_result = await db.execute(week_stmt)
     week_stats = week_result.first()
-    
+
     # Month's stats (sum)
     month_stmt = select(
         func.sum(KiaanUsageAnalytics.total_questions).label("questions"),
@@ -125,7 +124,7 @@ async def get_kiaan_overview(
     ).where(KiaanUsageAnalytics.date >= month_start)
     month_result = await db.execute(month_stmt)
     month_stats = month_result.first()
-    
+
     # Average response time (last 7 days)
     avg_response_stmt = select(
         func.avg(KiaanUsageAnalytics.avg_response_time_ms)
@@ -135,7 +134,7 @@ async def get_kiaan_overview(
     )
     avg_response_result = await db.execute(avg_response_stmt)
     avg_response = avg_response_result.scalar()
-    
+
     # Average satisfaction (last 7 days)
     avg_sat_stmt = select(
         func.avg(KiaanUsageAnalytics.satisfaction_avg)
@@ -145,7 +144,7 @@ async def get_kiaan_overview(
     )
     avg_sat_result = await db.execute(avg_sat_stmt)
     avg_satisfaction = avg_sat_result.scalar()
-    
+
     return KiaanOverviewOut(
         total_questions_today=today_stats.total_questions if today_stats else 0,
         total_questions_week=week_stats.questions if week_stats and week_stats.questions else 0,
@@ -168,14 +167,14 @@ async def get_kiaan_trends(
 ):
     """
     Get KIAAN usage trends.
-    
+
     Permissions required: kiaan:analytics_view
-    
+
     Note: Topic distribution is aggregated and anonymized.
     No individual user data is exposed.
     """
     start_date = datetime.now() - timedelta(days=days)
-    
+
     # Daily stats
     daily_stmt = (
         select(KiaanUsageAnalytics)
@@ -184,7 +183,7 @@ async def get_kiaan_trends(
     )
     daily_result = await db.execute(daily_stmt)
     daily_entries = daily_result.scalars().all()
-    
+
     daily_stats = [
         KiaanDailyStats(
             date=entry.date,
@@ -195,20 +194,20 @@ async def get_kiaan_trends(
         )
         for entry in daily_entries
     ]
-    
+
     # Aggregate topic distribution
     topic_distribution: dict[str, int] = {}
     questions_by_tier: dict[str, int] = {}
-    
+
     for entry in daily_entries:
         if entry.topic_distribution:
             for topic, count in entry.topic_distribution.items():
                 topic_distribution[topic] = topic_distribution.get(topic, 0) + count
-        
+
         if entry.questions_by_tier:
             for tier, count in entry.questions_by_tier.items():
                 questions_by_tier[tier] = questions_by_tier.get(tier, 0) + count
-    
+
     return KiaanTrendsOut(
         daily_stats=daily_stats,
         topic_distribution=topic_distribution,
@@ -225,66 +224,54 @@ async def get_kiaan_quota_usage(
 ):
     """
     Get KIAAN quota usage statistics.
-    
+
     Permissions required: kiaan:analytics_view
-    
+
     Note: This shows aggregated quota usage, not individual user data.
     Admins CANNOT bypass or modify quota limits through this endpoint.
     """
     # Get current period's usage tracking for KIAAN
     now = datetime.now()
     period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    # Total users with quota
-    total_stmt = select(func.count(UsageTracking.id)).where(
-        UsageTracking.feature == "kiaan_questions",
-        UsageTracking.period_start >= period_start,
-    )
-    total_result = await db.execute(total_stmt)
-    total_users_with_quota = total_result.scalar() or 0
-    
-    # Users at quota limit
-    at_limit_stmt = select(func.count(UsageTracking.id)).where(
-        UsageTracking.feature == "kiaan_questions",
-        UsageTracking.period_start >= period_start,
-        UsageTracking.usage_count >= UsageTracking.usage_limit,
-    )
-    at_limit_result = await db.execute(at_limit_stmt)
-    users_at_quota_limit = at_limit_result.scalar() or 0
-    
-    # Average usage percentage
-    avg_usage_stmt = select(
-        func.avg(UsageTracking.usage_count * 100.0 / UsageTracking.usage_limit)
+
+    # One grouped pass over this period's rows; the usage limit stands in
+    # for the tier (simplified - group by limit as proxy for tier)
+    has_limit = UsageTracking.usage_limit > 0
+    group_stmt = select(
+        UsageTracking.usage_limit.label("usage_limit"),
+        func.count(UsageTracking.id).label("users"),
+        func.sum(UsageTracking.usage_count).label("total_used"),
+        func.sum(
+            case((UsageTracking.usage_count >= UsageTracking.usage_limit, 1), else_=0)
+        ).label("at_limit"),
+        func.sum(
+            case((has_limit, UsageTracking.usage_count * 100.0 / UsageTracking.usage_limit), else_=0)
+        ).label("pct_sum"),
+        func.sum(case((has_limit, 1), else_=0)).label("pct_users"),
     ).where(
         UsageTracking.feature == "kiaan_questions",
         UsageTracking.period_start >= period_start,
-        UsageTracking.usage_limit > 0,
+    ).group_by(UsageTracking.usage_limit)
+    groups = {row.usage_limit: row for row in (await db.execute(group_stmt)).all()}
+
+    total_users_with_quota = sum(row.users for row in groups.values())
+    users_at_quota_limit = sum(row.at_limit or 0 for row in groups.values())
+    pct_users = sum(row.pct_users or 0 for row in groups.values())
+    avg_usage = (
+        sum(row.pct_sum or 0 for row in groups.values()) / pct_users if pct_users else None
     )
-    avg_usage_result = await db.execute(avg_usage_stmt)
-    avg_usage = avg_usage_result.scalar()
-    
-    # Usage by tier (simplified - group by limit as proxy for tier)
+
     usage_by_tier: dict[str, dict] = {}
     tier_limits = {5: "free", 50: "bhakta", 300: "sadhak", -1: "siddha"}
-    
+
     for limit, tier_name in tier_limits.items():
-        tier_stmt = select(
-            func.count(UsageTracking.id).label("users"),
-            func.sum(UsageTracking.usage_count).label("total_used"),
-        ).where(
-            UsageTracking.feature == "kiaan_questions",
-            UsageTracking.period_start >= period_start,
-            UsageTracking.usage_limit == limit,
-        )
-        tier_result = await db.execute(tier_stmt)
-        tier_data = tier_result.first()
-        
+        tier_data = groups.get(limit)
         usage_by_tier[tier_name] = {
-            "users": tier_data.users if tier_data and tier_data.users else 0,
+            "users": tier_data.users if tier_data else 0,
             "total_questions": tier_data.total_used if tier_data and tier_data.total_used else 0,
             "limit_per_user": limit,
         }
-    
+
     return KiaanQuotaUsageOut(
         total_users_with_quota=total_users_with_quota,
         users_at_quota_limit=users_at_quota_limit,
@@ -1,7 +1,6 @@
 """Admin content moderation routes."""
 
 from datetime import datetime
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
@@ -21,6 +20,7 @@ from backend.models import (
     ModerationStatus,
 )
 from backend.services.admin_auth_service import create_audit_log
+from backend.services.admin_pagination import InvalidCursor, cached_count, keyset_page
 
 
 router = APIRouter(prefix="/api/admin/moderation", tags=["admin-moderation"])
@@ -37,26 +37,27 @@ class FlaggedContentSummary(BaseModel):
     content_id: str
     user_id: str
     reason: str
-    details: Optional[str]
+    details: str | None
     status: str
     flagged_at: datetime
-    moderated_by: Optional[str]
-    moderated_at: Optional[datetime]
+    moderated_by: str | None
+    moderated_at: datetime | None
 
 
 class FlaggedContentListOut(BaseModel):
     """Paginated flagged content list response."""
     items: list[FlaggedContentSummary]
     total: int
-    page: int
+    page: int | None  # None when paging by cursor
     page_size: int
     pending_count: int
+    next_cursor: str | None = None
 
 
 class ModerateContentIn(BaseModel):
     """Moderate content request."""
     action: str  # "approve" or "reject"
-    note: Optional[str] = None
+    note: str | None = None
 
 
 class ModerateContentOut(BaseModel):
@@ -100,15 +101,18 @@ async def list_flagged_content(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    status_filter: Optional[str] = Query(None, alias="status"),
-    content_type: Optional[str] = None,
+    cursor: str | None = Query(None, max_length=512),
+    status_filter: str | None = Query(None, alias="status"),
+    content_type: str | None = None,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.MODERATION_VIEW)),
     db: AsyncSession = Depends(get_db),
 ):
     """
     List flagged content with filtering and pagination.
-    
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+
     Permissions required: moderation:view
     """
     # Build query
@@ -116,25 +120,21 @@ async def list_flagged_content(
     count_query = select(func.count(FlaggedContent.id)).where(
         FlaggedContent.deleted_at.is_(None)
     )
-    
+
     # Status filter
     if status_filter:
         status_enum = ModerationStatus(status_filter)
         query = query.where(FlaggedContent.status == status_enum)
         count_query = count_query.where(FlaggedContent.status == status_enum)
-    
+
     # Content type filter
     if content_type:
         query = query.where(FlaggedContent.content_type == content_type)
         count_query = count_query.where(FlaggedContent.content_type == content_type)
-    
-    # Order by flagged_at desc (most recent first)
-    query = query.order_by(FlaggedContent.flagged_at.desc())
-    
+
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
+    total = await cached_count(db, count_query)
+
     # Get pending count
     pending_count_query = select(func.count(FlaggedContent.id)).where(
         FlaggedContent.status == ModerationStatus.PENDING,
@@ -142,15 +142,16 @@ async def list_flagged_content(
     )
     pending_result = await db.execute(pending_count_query)
     pending_count = pending_result.scalar() or 0
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute
-    result = await db.execute(query)
-    items = result.scalars().all()
-    
+
+    # Most recent first
+    try:
+        items, next_cursor = await keyset_page(
+            db, query, [FlaggedContent.flagged_at, FlaggedContent.id], page_size,
+            cursor=cursor, page=page,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
     # Map to response
     content_summaries = [
         FlaggedContentSummary(
@@ -167,13 +168,14 @@ async def list_flagged_content(
         )
         for item in items
     ]
-    
+
     return FlaggedContentListOut(
         items=content_summaries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         page_size=page_size,
         pending_count=pending_count,
+        next_cursor=next_cursor,
     )
 
 
@@ -186,7 +188,7 @@ async def get_moderation_stats(
 ):
     """
     Get moderation statistics.
-    
+
     Permissions required: moderation:view
     """
     # Pending count
@@ -196,7 +198,7 @@ async def get_moderation_stats(
     )
     pending_result = await db.execute(pending_stmt)
     total_pending = pending_result.scalar() or 0
-    
+
     # Approved count
     approved_stmt = select(func.count(FlaggedContent.id)).where(
         FlaggedContent.status == ModerationStatus.APPROVED,
@@ -204,7 +206,7 @@ async def get_moderation_stats(
     )
     approved_result = await db.execute(approved_stmt)
     total_approved = approved_result.scalar() or 0
-    
+
     # Rejected count
     rejected_stmt = select(func.count(FlaggedContent.id)).where(
         FlaggedContent.status == ModerationStatus.REJECTED,
@@ -212,7 +214,7 @@ async def get_moderation_stats(
     )
     rejected_result = await db.execute(rejected_stmt)
     total_rejected = rejected_result.scalar() or 0
-    
+
     # Moderated today
     today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     today_stmt = select(func.count(FlaggedContent.id)).where(
@@ -221,7 +223,7 @@ async def get_moderation_stats(
     )
     today_result = await db.execute(today_stmt)
     items_moderated_today = today_result.scalar() or 0
-    
+
     return ModerationStatsOut(
         total_pending=total_pending,
         total_approved=total_approved,
@@ -241,7 +243,7 @@ async def moderate_content(
 ):
     """
     Approve or reject flagged content.
-    
+
     Permissions required: moderation:action
     """
     # Validate action
@@ -250,7 +252,7 @@ async def moderate_content(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Action must be 'approve' or 'reject'",
         )
-    
+
     # Get flagged content
     stmt = select(FlaggedContent).where(
         FlaggedContent.id == content_id,
@@ -258,26 +260,26 @@ async def moderate_content(
     )
     result = await db.execute(stmt)
     content = result.scalars().first()
-    
+
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Flagged content not found",
         )
-    
+
     if content.status != ModerationStatus.PENDING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Content has already been moderated",
         )
-    
+
     # Update moderation status
     new_status = (
         ModerationStatus.APPROVED
         if payload.action == "approve"
         else ModerationStatus.REJECTED
     )
-    
+
     await db.execute(
         update(FlaggedContent)
         .where(FlaggedContent.id == content_id)
@@ -289,14 +291,14 @@ async def moderate_content(
         )
     )
     await db.commit()
-    
+
     # Determine audit action
     audit_action = (
         AdminAuditAction.CONTENT_APPROVED
         if payload.action == "approve"
         else AdminAuditAction.CONTENT_REJECTED
     )
-    
+
     # Log action
     await create_audit_log(
         db=db,
@@ -312,7 +314,7 @@ async def moderate_content(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return ModerateContentOut(
         content_id=content_id,
         action=payload.action,
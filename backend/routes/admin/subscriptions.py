@@ -2,15 +2,12 @@
 
 import logging
 from datetime import datetime
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-logger = logging.getLogger(__name__)
-
 from backend.deps import get_db
 from backend.middleware.rbac import (
     get_current_admin,
@@ -28,7 +25,10 @@ from backend.models import (
     UserSubscription,
 )
 from backend.services.admin_auth_service import create_audit_log
+from backend.services.admin_pagination import InvalidCursor, cached_count, keyset_page
+from backend.services.entitlement_cache import invalidate_entitlements
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/admin/subscriptions", tags=["admin-subscriptions"])
 
@@ -43,8 +43,8 @@ class SubscriptionSummary(BaseModel):
     user_id: str
     tier: str
     status: str
-    current_period_start: Optional[datetime]
-    current_period_end: Optional[datetime]
+    current_period_start: datetime | None
+    current_period_end: datetime | None
     cancel_at_period_end: bool
     created_at: datetime
 
@@ -53,9 +53,10 @@ class SubscriptionListOut(BaseModel):
     """Paginated subscription list response."""
     subscriptions: list[SubscriptionSummary]
     total: int
-    page: int
+    page: int | None  # None when paging by cursor
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class SubscriptionAnalyticsOut(BaseModel):
@@ -90,7 +91,7 @@ class PaymentSummary(BaseModel):
     amount: float
     currency: str
     status: str
-    description: Optional[str]
+    description: str | None
     created_at: datetime
 
 
@@ -98,8 +99,9 @@ class PaymentListOut(BaseModel):
     """Paginated payment list response."""
     payments: list[PaymentSummary]
     total: int
-    page: int
+    page: int | None  # None when paging by cursor
     page_size: int
+    next_cursor: str | None = None
 
 
 class RefundPaymentIn(BaseModel):
@@ -140,15 +142,18 @@ async def list_subscriptions(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    tier: Optional[str] = None,
-    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: str | None = Query(None, max_length=512),
+    tier: str | None = None,
+    status_filter: str | None = Query(None, alias="status"),
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.SUBSCRIPTIONS_VIEW)),
     db: AsyncSession = Depends(get_db),
 ):
     """
     List subscriptions with filtering and pagination.
-    
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+
     Permissions required: subscriptions:view
     """
     # Build query
@@ -156,7 +161,7 @@ async def list_subscriptions(
     count_query = select(func.count(UserSubscription.id)).where(
         UserSubscription.deleted_at.is_(None)
     )
-    
+
     # Tier filter
     if tier:
         tier_enum = SubscriptionTier(tier)
@@ -166,28 +171,25 @@ async def list_subscriptions(
         if plan_ids:
             query = query.where(UserSubscription.plan_id.in_(plan_ids))
             count_query = count_query.where(UserSubscription.plan_id.in_(plan_ids))
-    
+
     # Status filter
     if status_filter:
         status_enum = SubscriptionStatus(status_filter)
         query = query.where(UserSubscription.status == status_enum)
         count_query = count_query.where(UserSubscription.status == status_enum)
-    
-    # Order by created_at desc
-    query = query.order_by(UserSubscription.created_at.desc())
-    
+
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute
-    result = await db.execute(query)
-    subscriptions = result.scalars().all()
-    
+    total = await cached_count(db, count_query)
+
+    # Newest first
+    try:
+        subscriptions, next_cursor = await keyset_page(
+            db, query, [UserSubscription.created_at, UserSubscription.id], page_size,
+            cursor=cursor, page=page,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
     # Map to response
     subscription_summaries = []
     for sub in subscriptions:
@@ -204,15 +206,16 @@ async def list_subscriptions(
                 created_at=sub.created_at,
             )
         )
-    
+
     total_pages = (total + page_size - 1) // page_size
-    
+
     return SubscriptionListOut(
         subscriptions=subscription_summaries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -225,7 +228,7 @@ async def get_subscription_analytics(
 ):
     """
     Get subscription analytics dashboard data.
-    
+
     Permissions required: subscriptions:view
     """
     # Total active subscriptions
@@ -235,14 +238,14 @@ async def get_subscription_analytics(
     )
     active_result = await db.execute(active_count_stmt)
     total_active = active_result.scalar() or 0
-    
+
     # Count by tier
     tier_counts = {}
     for tier in SubscriptionTier:
         plan_stmt = select(SubscriptionPlan.id).where(SubscriptionPlan.tier == tier)
         plan_result = await db.execute(plan_stmt)
         plan_ids = [r for r in plan_result.scalars().all()]
-        
+
         if plan_ids:
             count_stmt = select(func.count(UserSubscription.id)).where(
                 UserSubscription.plan_id.in_(plan_ids),
@@ -253,7 +256,7 @@ async def get_subscription_analytics(
             tier_counts[tier.value] = count_result.scalar() or 0
         else:
             tier_counts[tier.value] = 0
-    
+
     # Count by status
     status_counts = {}
     for status_enum in SubscriptionStatus:
@@ -263,7 +266,7 @@ async def get_subscription_analytics(
         )
         count_result = await db.execute(count_stmt)
         status_counts[status_enum.value] = count_result.scalar() or 0
-    
+
     # New subscriptions this month (simplified)
     month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     new_stmt = select(func.count(UserSubscription.id)).where(
@@ -272,7 +275,7 @@ async def get_subscription_analytics(
     )
     new_result = await db.execute(new_stmt)
     new_this_month = new_result.scalar() or 0
-    
+
     # Churned this month
     churned_stmt = select(func.count(UserSubscription.id)).where(
         UserSubscription.canceled_at >= month_start,
@@ -280,12 +283,12 @@ async def get_subscription_analytics(
     )
     churned_result = await db.execute(churned_stmt)
     churned_this_month = churned_result.scalar() or 0
-    
+
     # Churn rate
     churn_rate = 0.0
     if total_active > 0:
         churn_rate = (churned_this_month / total_active) * 100
-    
+
     # MRR calculation (simplified - sum of monthly prices for active subscriptions)
     mrr = 0.0
     mrr_stmt = select(SubscriptionPlan.price_monthly, func.count(UserSubscription.id)).join(
@@ -294,12 +297,12 @@ async def get_subscription_analytics(
         UserSubscription.status == SubscriptionStatus.ACTIVE,
         UserSubscription.deleted_at.is_(None),
     ).group_by(SubscriptionPlan.price_monthly)
-    
+
     mrr_result = await db.execute(mrr_stmt)
     for price, count in mrr_result.all():
         if price:
             mrr += float(price) * count
-    
+
     return SubscriptionAnalyticsOut(
         total_active=total_active,
         total_by_tier=tier_counts,
@@ -322,7 +325,7 @@ async def modify_subscription(
 ):
     """
     Modify a user's subscription tier.
-    
+
     Permissions required: subscriptions:modify
     """
     # Get subscription
@@ -332,31 +335,32 @@ async def modify_subscription(
     )
     result = await db.execute(stmt)
     subscription = result.scalars().first()
-    
+
     if not subscription:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subscription not found",
         )
-    
+
     old_tier = subscription.plan.tier.value if subscription.plan else "unknown"
-    
+
     # Get new plan
     new_tier_enum = SubscriptionTier(payload.new_tier)
     new_plan_stmt = select(SubscriptionPlan).where(SubscriptionPlan.tier == new_tier_enum)
     new_plan_result = await db.execute(new_plan_stmt)
     new_plan = new_plan_result.scalars().first()
-    
+
     if not new_plan:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Plan for tier '{payload.new_tier}' not found",
         )
-    
+
     # Update subscription
     subscription.plan_id = new_plan.id
     await db.commit()
-    
+    await invalidate_entitlements(subscription.user_id)
+
     # Log action
     await create_audit_log(
         db=db,
@@ -372,7 +376,7 @@ async def modify_subscription(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return ModifySubscriptionOut(
         subscription_id=subscription_id,
         old_tier=old_tier,
@@ -386,41 +390,41 @@ async def list_payments(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: str | None = Query(None, max_length=512),
+    status_filter: str | None = Query(None, alias="status"),
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.SUBSCRIPTIONS_VIEW)),
     db: AsyncSession = Depends(get_db),
 ):
     """
     List payments with filtering and pagination.
-    
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+
     Permissions required: subscriptions:view
     """
     # Build query
     query = select(Payment).where(Payment.deleted_at.is_(None))
     count_query = select(func.count(Payment.id)).where(Payment.deleted_at.is_(None))
-    
+
     # Status filter
     if status_filter:
         status_enum = PaymentStatus(status_filter)
         query = query.where(Payment.status == status_enum)
         count_query = count_query.where(Payment.status == status_enum)
-    
-    # Order by created_at desc
-    query = query.order_by(Payment.created_at.desc())
-    
+
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute
-    result = await db.execute(query)
-    payments = result.scalars().all()
-    
+    total = await cached_count(db, count_query)
+
+    # Newest first
+    try:
+        payments, next_cursor = await keyset_page(
+            db, query, [Payment.created_at, Payment.id], page_size,
+            cursor=cursor, page=page,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
     # Map to response
     payment_summaries = [
         PaymentSummary(
@@ -434,12 +438,13 @@ async def list_payments(
         )
         for p in payments
     ]
-    
+
     return PaymentListOut(
         payments=payment_summaries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
@@ -454,7 +459,7 @@ async def refund_payment(
 ):
     """
     Refund a payment.
-    
+
     Permissions required: payments:refund
     """
     # Get payment
@@ -464,29 +469,29 @@ async def refund_payment(
     )
     result = await db.execute(stmt)
     payment = result.scalars().first()
-    
+
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Payment not found",
         )
-    
+
     if payment.status == PaymentStatus.REFUNDED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Payment already refunded",
         )
-    
+
     if payment.status != PaymentStatus.SUCCEEDED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only succeeded payments can be refunded",
         )
-    
+
     # Update payment status
     payment.status = PaymentStatus.REFUNDED
     await db.commit()
-    
+
     # Log action
     await create_audit_log(
         db=db,
@@ -502,7 +507,7 @@ async def refund_payment(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return RefundPaymentOut(
         payment_id=payment_id,
         refunded=True,
@@ -567,13 +572,13 @@ async def create_subscription_link_endpoint(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
-        )
+        ) from e
     except RuntimeError as e:
         logger.error(f"Service unavailable during admin subscription operation: {e}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service is temporarily unavailable. Please try again.",
-        )
+        ) from e
 
     # Audit log
     await create_audit_log(
@@ -600,8 +605,8 @@ async def list_subscription_links_endpoint(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    link_status: Optional[str] = Query(None, alias="status"),
-    tier: Optional[str] = None,
+    link_status: str | None = Query(None, alias="status"),
+    tier: str | None = None,
     admin: AdminContext = Depends(get_current_admin),
     _: None = Depends(PermissionChecker(AdminPermission.SUBSCRIPTIONS_VIEW)),
     db: AsyncSession = Depends(get_db),
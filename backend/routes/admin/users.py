@@ -1,11 +1,10 @@
 """Admin user management routes."""
 
 from datetime import datetime
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.deps import get_db
@@ -22,7 +21,9 @@ from backend.models import (
     UserSubscription,
     UsageTracking,
 )
+from backend.security.principal_cache import invalidate_principal
 from backend.services.admin_auth_service import create_audit_log
+from backend.services.admin_pagination import InvalidCursor, cached_count, keyset_page
 
 
 router = APIRouter(prefix="/api/admin/users", tags=["admin-users"])
@@ -35,27 +36,32 @@ router = APIRouter(prefix="/api/admin/users", tags=["admin-users"])
 class UserSummary(BaseModel):
     """User summary for list view."""
     id: str
-    email: Optional[str]
+    email: str | None
     auth_uid: str
     locale: str
     is_suspended: bool
     created_at: datetime
+    # Filled in with include_details=true
+    subscription_tier: str | None = None
+    subscription_status: str | None = None
+    kiaan_questions_used: int | None = None
+    kiaan_questions_limit: int | None = None
 
 
 class UserDetail(BaseModel):
     """Detailed user information."""
     id: str
-    email: Optional[str]
+    email: str | None
     auth_uid: str
     locale: str
     is_suspended: bool
     created_at: datetime
     # Profile
-    full_name: Optional[str]
+    full_name: str | None
     # Subscription
-    subscription_tier: Optional[str]
-    subscription_status: Optional[str]
-    subscription_started_at: Optional[datetime]
+    subscription_tier: str | None
+    subscription_status: str | None
+    subscription_started_at: datetime | None
     # Usage
     kiaan_questions_used: int
     kiaan_questions_limit: int
@@ -65,9 +71,10 @@ class UserListOut(BaseModel):
     """Paginated user list response."""
     users: list[UserSummary]
     total: int
-    page: int
+    page: int | None  # None when paging by cursor
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
 
 
 class SuspendUserIn(BaseModel):
@@ -105,6 +112,57 @@ def get_user_agent(request: Request) -> str | None:
     return request.headers.get("User-Agent")
 
 
+async def load_user_details(db: AsyncSession, user_ids: list[str]) -> dict[str, dict]:
+    """Load subscription and KIAAN usage for a batch of users.
+
+    Runs one query for the subscriptions (with their plans) and one for the
+    latest KIAAN usage period, however many users are asked for. Returns
+    the UserDetail subscription/usage fields for every requested user id.
+    """
+    if not user_ids:
+        return {}
+
+    sub_stmt = select(UserSubscription).where(UserSubscription.user_id.in_(user_ids))
+    sub_result = await db.execute(sub_stmt)
+    subscriptions = {sub.user_id: sub for sub in sub_result.scalars().all()}
+
+    latest = (
+        select(
+            UsageTracking.user_id,
+            func.max(UsageTracking.period_start).label("period_start"),
+        )
+        .where(
+            UsageTracking.user_id.in_(user_ids),
+            UsageTracking.feature == "kiaan_questions",
+        )
+        .group_by(UsageTracking.user_id)
+        .subquery()
+    )
+    usage_stmt = select(UsageTracking).join(
+        latest,
+        (UsageTracking.user_id == latest.c.user_id)
+        & (UsageTracking.period_start == latest.c.period_start),
+    ).where(
+        UsageTracking.user_id.in_(user_ids),
+        UsageTracking.feature == "kiaan_questions",
+    )
+    usage_result = await db.execute(usage_stmt)
+    usage_by_user = {usage.user_id: usage for usage in usage_result.scalars().all()}
+
+    details = {}
+    for user_id in user_ids:
+        subscription = subscriptions.get(user_id)
+        usage = usage_by_user.get(user_id)
+        details[user_id] = {
+            "subscription_tier": subscription.plan.tier.value if subscription and subscription.plan else None,
+            "subscription_status": subscription.status.value if subscription else None,
+            "subscription_started_at": subscription.current_period_start if subscription else None,
+            "kiaan_questions_used": usage.usage_count if usage else 0,
+            "kiaan_questions_limit": usage.usage_limit if usage else 20,
+        }
+    return details
+
+
 # =============================================================================
 # Routes
 # =============================================================================
@@ -114,9 +172,11 @@ async def list_users(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    search: Optional[str] = Query(None, max_length=100),
-    suspended: Optional[bool] = None,
-    has_subscription: Optional[bool] = None,
+    cursor: str | None = Query(None, max_length=512),
+    search: str | None = Query(None, max_length=100),
+    suspended: bool | None = None,
+    has_subscription: bool | None = None,
+    include_details: bool = False,
     sort_by: str = Query("created_at", pattern="^(created_at|email)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
     admin: AdminContext = Depends(get_current_admin),
@@ -125,13 +185,18 @@ async def list_users(
 ):
     """
     List users with search, filter, and pagination.
-    
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page;
+    ``page`` is ignored (and returned as null) when a cursor is given. With
+    ``include_details=true`` each user also carries subscription and KIAAN
+    usage, loaded for the whole page at once.
+
     Permissions required: users:view
     """
     # Build query
     query = select(User).where(User.deleted_at.is_(None))
     count_query = select(func.count(User.id)).where(User.deleted_at.is_(None))
-    
+
     # Search filter
     if search:
         search_filter = or_(
@@ -140,29 +205,25 @@ async def list_users(
         )
         query = query.where(search_filter)
         count_query = count_query.where(search_filter)
-    
+
     # Suspended filter (we use deleted_at as suspension indicator)
     # Note: In a real implementation, you might have a separate is_suspended field
-    
-    # Sorting
-    order_col = User.created_at if sort_by == "created_at" else User.email
-    if sort_order == "desc":
-        query = query.order_by(order_col.desc())
-    else:
-        query = query.order_by(order_col.asc())
-    
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-    
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
-    
-    # Execute
-    result = await db.execute(query)
-    users = result.scalars().all()
-    
+
+    # Sorting (user id breaks ties so every page boundary is exact). The ''
+    # is inlined, not bound, so the key matches idx_users_email_id.
+    sort_key = User.created_at if sort_by == "created_at" else func.coalesce(User.email, literal_column("''"))
+
+    total = await cached_count(db, count_query)
+    try:
+        users, next_cursor = await keyset_page(
+            db, query, [sort_key, User.id], page_size,
+            cursor=cursor, page=page, descending=sort_order == "desc",
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    details = await load_user_details(db, [u.id for u in users]) if include_details else {}
+
     # Map to response
     user_summaries = [
         UserSummary(
@@ -172,18 +233,20 @@ async def list_users(
             locale=u.locale,
             is_suspended=u.deleted_at is not None,
             created_at=u.created_at,
+            **details.get(u.id, {}),
         )
         for u in users
     ]
-    
+
     total_pages = (total + page_size - 1) // page_size
-    
+
     return UserListOut(
         users=user_summaries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -197,38 +260,28 @@ async def get_user(
 ):
     """
     Get detailed user information.
-    
+
     Permissions required: users:view
     """
-    # Get user (excluding soft-deleted users)
-    stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
+    # Get user and profile (excluding soft-deleted users)
+    stmt = (
+        select(User, UserProfile.full_name)
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .where(User.id == user_id, User.deleted_at.is_(None))
+    )
     result = await db.execute(stmt)
-    user = result.scalars().first()
+    row = result.first()
 
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
-    # Get profile
-    profile_stmt = select(UserProfile).where(UserProfile.user_id == user_id)
-    profile_result = await db.execute(profile_stmt)
-    profile = profile_result.scalars().first()
-    
-    # Get subscription
-    sub_stmt = select(UserSubscription).where(UserSubscription.user_id == user_id)
-    sub_result = await db.execute(sub_stmt)
-    subscription = sub_result.scalars().first()
-    
-    # Get usage
-    usage_stmt = select(UsageTracking).where(
-        UsageTracking.user_id == user_id,
-        UsageTracking.feature == "kiaan_questions",
-    ).order_by(UsageTracking.period_start.desc()).limit(1)
-    usage_result = await db.execute(usage_stmt)
-    usage = usage_result.scalars().first()
-    
+    user, full_name = row
+
+    # Subscription and usage
+    details = await load_user_details(db, [user_id])
+
     # Log view action
     await create_audit_log(
         db=db,
@@ -239,7 +292,7 @@ async def get_user(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return UserDetail(
         id=user.id,
         email=user.email,
@@ -247,12 +300,8 @@ async def get_user(
         locale=user.locale,
         is_suspended=user.deleted_at is not None,
         created_at=user.created_at,
-        full_name=profile.full_name if profile else None,
-        subscription_tier=subscription.plan.tier.value if subscription and subscription.plan else None,
-        subscription_status=subscription.status.value if subscription else None,
-        subscription_started_at=subscription.current_period_start if subscription else None,
-        kiaan_questions_used=usage.usage_count if usage else 0,
-        kiaan_questions_limit=usage.usage_limit if usage else 20,
+        full_name=full_name,
+        **details[user_id],
     )
 
 
@@ -267,24 +316,25 @@ async def suspend_user(
 ):
     """
     Suspend a user account.
-    
+
     Permissions required: users:suspend
     """
     # Get user
     stmt = select(User).where(User.id == user_id, User.deleted_at.is_(None))
     result = await db.execute(stmt)
     user = result.scalars().first()
-    
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
+
     # Soft delete (suspend) the user
     user.soft_delete()
     await db.commit()
-    
+    await invalidate_principal(user_id)
+
     # Log action
     await create_audit_log(
         db=db,
@@ -296,7 +346,7 @@ async def suspend_user(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return SuspendUserOut(
         user_id=user_id,
         suspended=True,
@@ -314,30 +364,31 @@ async def reactivate_user(
 ):
     """
     Reactivate a suspended user account.
-    
+
     Permissions required: users:suspend
     """
     # Get user (including suspended)
     stmt = select(User).where(User.id == user_id)
     result = await db.execute(stmt)
     user = result.scalars().first()
-    
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
+
     if user.deleted_at is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is not suspended",
         )
-    
+
     # Restore user
     user.restore()
     await db.commit()
-    
+    await invalidate_principal(user_id)
+
     # Log action
     await create_audit_log(
         db=db,
@@ -348,7 +399,7 @@ async def reactivate_user(
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
     )
-    
+
     return ReactivateUserOut(
         user_id=user_id,
         reactivated=True,
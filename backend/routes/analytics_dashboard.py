@@ -4,12 +4,18 @@ Provides user-specific analytics data for the MindVibe dashboard.
 These are READ-ONLY tracking endpoints that do not modify KIAAN's core functionality.
 """
 
+import logging
 from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, Query
-from pydantic import BaseModel
 from enum import Enum
 
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.deps import get_current_user_optional, get_db
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
@@ -24,8 +30,8 @@ class AnalyticsPeriod(str, Enum):
 class MoodDataPoint(BaseModel):
     date: str
     score: float
-    label: Optional[str] = None
-    notes: Optional[str] = None
+    label: str | None = None
+    notes: str | None = None
 
 
 class SentimentDistribution(BaseModel):
@@ -51,7 +57,7 @@ class OverviewResponse(BaseModel):
     moodTrend: str = "up"
     kiaanConversations: int = 28
     kiaanMessages: int = 156
-    lastActivityDate: Optional[str] = None
+    lastActivityDate: str | None = None
 
 
 class MoodTrendResponse(BaseModel):
@@ -98,7 +104,7 @@ class WeeklySummaryResponse(BaseModel):
     kiaanSummary: dict
     insights: list[dict]
     achievements: list[dict] = []
-    highlightQuote: Optional[str] = None
+    highlightQuote: str | None = None
     comparisonToPreviousWeek: dict
 
 
@@ -107,9 +113,9 @@ class Achievement(BaseModel):
     name: str
     description: str
     icon: str
-    earnedAt: Optional[str] = None
-    progress: Optional[int] = None
-    target: Optional[int] = None
+    earnedAt: str | None = None
+    progress: int | None = None
+    target: int | None = None
     category: str
     rarity: str
 
@@ -139,8 +145,8 @@ async def user_analytics():
 
 @router.get("/overview", response_model=OverviewResponse)
 async def get_analytics_overview(
-    start: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
+    start: str | None = Query(None, description="Start date (YYYY-MM-DD)"),
+    end: str | None = Query(None, description="End date (YYYY-MM-DD)")
 ):
     """
     Get overview metrics for the analytics dashboard.
@@ -278,7 +284,7 @@ async def get_kiaan_insights():
 
 @router.get("/weekly-summary", response_model=WeeklySummaryResponse)
 async def get_weekly_summary(
-    weekStart: Optional[str] = Query(None, description="Week start date (YYYY-MM-DD)")
+    weekStart: str | None = Query(None, description="Week start date (YYYY-MM-DD)")
 ):
     """
     Get weekly summary with insights and achievements.
@@ -398,9 +404,30 @@ async def export_analytics_data(
 # QUANTUM ENHANCEMENT #6: ADVANCED ANALYTICS
 # ============================================================================
 
+async def _user_mood_stats(user_id: str | None, db: AsyncSession):
+    """Return the caller's persisted rolling mood stats, or None.
+
+    Authenticated users with a user_mood_stats row are served in O(1)
+    from it; anonymous callers (and any lookup failure) fall back to the
+    demonstration data below.
+    """
+    if not user_id:
+        return None
+
+    from backend.services.mood_rolling_stats import load_mood_stats
+
+    try:
+        return await load_mood_stats(db, user_id)
+    except Exception as e:
+        logger.warning(f"Mood stats lookup failed for {user_id}: {e}")
+        return None
+
+
 @router.get("/advanced/mood-predictions")
 async def get_mood_predictions(
-    forecast_days: int = Query(7, ge=1, le=14, description="Number of days to forecast")
+    forecast_days: int = Query(7, ge=1, le=14, description="Number of days to forecast"),
+    user_id: str | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get AI-powered mood predictions with confidence intervals.
@@ -409,20 +436,25 @@ async def get_mood_predictions(
     """
     from backend.services.analytics_ml_service import AnalyticsMLService, MoodDataPoint
 
-    # Mock data for demonstration (replace with actual database query)
     ml_service = AnalyticsMLService()
 
-    # Generate sample mood data
-    mood_data = []
-    base_date = datetime.now() - timedelta(days=30)
-    for i in range(30):
-        mood_data.append(MoodDataPoint(
-            date=base_date + timedelta(days=i),
-            score=6.0 + (i * 0.05),  # Gradually improving
-            tags=["work", "stress"] if i % 5 == 0 else []
-        ))
-
-    predictions = ml_service.predict_mood(mood_data, forecast_days)
+    stats = await _user_mood_stats(user_id, db)
+    if stats is not None:
+        predictions = ml_service.predict_mood_from_stats(stats, forecast_days)
+        data_points = stats.count
+    else:
+        # Mock data for demonstration
+        mood_data = []
+        base_date = datetime.now() - timedelta(days=30)
+        for i in range(30):
+            mood_data.append(MoodDataPoint(
+                date=base_date + timedelta(days=i),
+                score=6.0 + (i * 0.05),  # Gradually improving
+                tags=["work", "stress"] if i % 5 == 0 else []
+            ))
+
+        predictions = ml_service.predict_mood(mood_data, forecast_days)
+        data_points = len(mood_data)
 
     return {
         "forecast_days": forecast_days,
@@ -438,7 +470,7 @@ async def get_mood_predictions(
         ],
         "model_info": {
             "type": "time_series_forecast",
-            "training_data_points": len(mood_data),
+            "training_data_points": data_points,
             "last_updated": datetime.now().isoformat()
         }
     }
@@ -589,7 +621,10 @@ async def get_ai_insights():
 
 
 @router.get("/advanced/risk-assessment")
-async def get_risk_assessment():
+async def get_risk_assessment(
+    user_id: str | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Get spiritual wellness risk assessment score (0-100).
     Lower is better.
@@ -600,23 +635,27 @@ async def get_risk_assessment():
 
     ml_service = AnalyticsMLService()
 
-    # Mock data (replace with actual database query)
-    mood_data = []
-    base_date = datetime.now() - timedelta(days=30)
-    for i in range(30):
-        mood_data.append(MoodDataPoint(
-            date=base_date + timedelta(days=i),
-            score=6.5 + ((i % 7) * 0.3),  # Variable scores
-            tags=["stress"] if i % 5 == 0 else []
-        ))
-
-    risk_assessment = ml_service.calculate_risk_score(mood_data)
+    stats = await _user_mood_stats(user_id, db)
+    if stats is not None:
+        risk_assessment = ml_service.calculate_risk_score_from_stats(stats)
+    else:
+        # Mock data for demonstration
+        mood_data = []
+        base_date = datetime.now() - timedelta(days=30)
+        for i in range(30):
+            mood_data.append(MoodDataPoint(
+                date=base_date + timedelta(days=i),
+                score=6.5 + ((i % 7) * 0.3),  # Variable scores
+                tags=["stress"] if i % 5 == 0 else []
+            ))
+
+        risk_assessment = ml_service.calculate_risk_score(mood_data)
 
     return {
         "risk_score": risk_assessment["score"],
         "risk_level": risk_assessment["level"],
-        "description": risk_assessment["description"],
-        "factors": risk_assessment["factors"],
+        "description": risk_assessment.get("description", ""),
+        "factors": risk_assessment.get("factors", {}),
         "recommendations": [
             "Continue daily mood tracking for better insights",
             "Consider journaling when you notice stress patterns",
@@ -630,7 +669,10 @@ async def get_risk_assessment():
 
 
 @router.get("/advanced/pattern-analysis")
-async def get_pattern_analysis():
+async def get_pattern_analysis(
+    user_id: str | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Get behavioral pattern analysis (weekly patterns, tag correlations).
 
@@ -640,21 +682,25 @@ async def get_pattern_analysis():
 
     ml_service = AnalyticsMLService()
 
-    # Mock data (replace with actual database query)
-    mood_data = []
-    base_date = datetime.now() - timedelta(days=60)
-    for i in range(60):
-        day_of_week = (base_date + timedelta(days=i)).weekday()
-        # Simulate "Monday blues" pattern
-        score = 7.0 if day_of_week > 0 else 5.5
-
-        mood_data.append(MoodDataPoint(
-            date=base_date + timedelta(days=i),
-            score=score + (i * 0.02),
-            tags=["work", "stress"] if day_of_week == 0 else ["gratitude"]
-        ))
-
-    patterns = ml_service.detect_patterns(mood_data)
+    stats = await _user_mood_stats(user_id, db)
+    if stats is not None:
+        patterns = ml_service.detect_patterns_from_stats(stats)
+    else:
+        # Mock data for demonstration
+        mood_data = []
+        base_date = datetime.now() - timedelta(days=60)
+        for i in range(60):
+            day_of_week = (base_date + timedelta(days=i)).weekday()
+            # Simulate "Monday blues" pattern
+            score = 7.0 if day_of_week > 0 else 5.5
+
+            mood_data.append(MoodDataPoint(
+                date=base_date + timedelta(days=i),
+                score=score + (i * 0.02),
+                tags=["work", "stress"] if day_of_week == 0 else ["gratitude"]
+            ))
+
+        patterns = ml_service.detect_patterns(mood_data)
 
     return {
         "patterns": patterns,
@@ -676,38 +722,51 @@ async def get_pattern_analysis():
 
 @router.get("/advanced/trend-analysis")
 async def get_advanced_trend_analysis(
-    lookback_days: int = Query(90, ge=30, le=365, description="Days to analyze")
+    lookback_days: int = Query(90, ge=30, le=365, description="Days to analyze"),
+    user_id: str | None = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get comprehensive trend analysis with anomaly detection.
 
+    Users with mood history are analyzed over the moods they logged in the
+    last ``lookback_days``.
+
     Quantum Enhancement #6: Advanced Analytics Dashboard
     """
     from backend.services.analytics_ml_service import AnalyticsMLService, MoodDataPoint
+    from backend.services.mood_rolling_stats import load_mood_history
 
     ml_service = AnalyticsMLService()
-
-    # Mock data (replace with actual database query)
-    mood_data = []
-    base_date = datetime.now() - timedelta(days=lookback_days)
-    for i in range(lookback_days):
-        # Simulate improving trend with some noise
-        base_score = 6.0 + (i * 0.02)
-        noise = (i % 7) * 0.3
-
-        # Add an anomaly at day 45
-        if i == 45:
-            score = 2.5  # Sudden drop
-        else:
-            score = base_score + noise
-
-        mood_data.append(MoodDataPoint(
-            date=base_date + timedelta(days=i),
-            score=min(10.0, max(1.0, score)),
-            tags=[]
-        ))
-
-    trend_analysis = ml_service.analyze_mood_trends(mood_data, lookback_days)
+    base_date = datetime.now().astimezone() - timedelta(days=lookback_days)
+
+    # The rolling summary covers the user's full history, so it only tells
+    # us the user has moods; the requested window is read from ``moods``.
+    stats = await _user_mood_stats(user_id, db)
+    if stats is not None:
+        mood_data = [
+            MoodDataPoint(date=at, score=float(score), tags=tags)
+            for at, score, tags in await load_mood_history(db, user_id, since=base_date)
+        ]
+        trend_analysis = ml_service.analyze_mood_trends(mood_data, lookback_days)
+    else:
+        # Mock data for demonstration
+        mood_data = []
+        for i in range(lookback_days):
+            # Simulate improving trend with some noise
+            base_score = 6.0 + (i * 0.02)
+            noise = (i % 7) * 0.3
+
+            # Add an anomaly (sudden drop) at day 45
+            score = 2.5 if i == 45 else base_score + noise
+
+            mood_data.append(MoodDataPoint(
+                date=base_date + timedelta(days=i),
+                score=min(10.0, max(1.0, score)),
+                tags=[]
+            ))
+
+        trend_analysis = ml_service.analyze_mood_trends(mood_data, lookback_days)
 
     return {
         "trend": {
@@ -727,7 +786,7 @@ async def get_advanced_trend_analysis(
         "analysis_period": {
             "days": lookback_days,
             "start_date": base_date.isoformat(),
-            "end_date": datetime.now().isoformat()
+            "end_date": datetime.now().astimezone().isoformat()
         }
     }
 
@@ -17,6 +17,7 @@ from backend.models.auth import EmailVerificationToken, PasswordResetToken
 from backend.security.jwt import create_access_token, decode_access_token
 from backend.security.password_hash import hash_password, verify_password
 from backend.security.password_policy import policy
+from backend.security.principal_cache import invalidate_principal
 from backend.services.email_service import (
     send_email_verification,
     send_password_reset_email,
@@ -1187,6 +1188,7 @@ async def verify_email(
         logger.error(f"Database commit failed during email verification: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail={"error": "DATABASE_ERROR", "message": "Operation failed. Please try again."})
 
+    await invalidate_principal(matched_token.user_id)
     logger.info("Email verified for user %s", matched_token.user_id)
 
     return VerifyEmailOut(
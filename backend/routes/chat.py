@@ -36,10 +36,12 @@ SUBSCRIPTION_ENABLED = True
 # Import subscription/quota services - optional for backwards compatibility
 try:
     from backend.middleware.feature_access import get_current_user_id
+    from backend.services.entitlement_cache import get_entitlements
     from backend.services.subscription_service import (
         check_kiaan_quota,
-        get_or_create_free_subscription,
         increment_kiaan_usage,
+        release_kiaan_reservation,
+        reserve_kiaan_question,
     )
 except ImportError:
     SUBSCRIPTION_ENABLED = False
@@ -507,9 +509,11 @@ async def send_message_stream(request: Request, chat: ChatMessage, db: AsyncSess
     if SUBSCRIPTION_ENABLED:
         try:
             stream_user_id = await get_current_user_id(request)
-            await get_or_create_free_subscription(db, stream_user_id)
+            entitlements = await get_entitlements(db, stream_user_id, request)
 
-            has_quota, usage_count, usage_limit = await check_kiaan_quota(db, stream_user_id)
+            has_quota, usage_count, usage_limit = await check_kiaan_quota(
+                db, stream_user_id, entitlements.tier
+            )
             if not has_quota:
                 import json
                 async def quota_exceeded_stream() -> AsyncGenerator[str, None]:
@@ -647,6 +651,8 @@ async def send_message_stream(request: Request, chat: ChatMessage, db: AsyncSess
 @router.post("/message")
 @limiter.limit(CHAT_RATE_LIMIT)
 async def send_message(request: Request, chat: ChatMessage, db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
+    # One KIAAN question held for this request until the answer is delivered
+    kiaan_reservation = None
     try:
         message = chat.message.strip()
         if not message:
@@ -677,10 +683,13 @@ async def send_message(request: Request, chat: ChatMessage, db: AsyncSession = D
                 user_id = await get_current_user_id(request)
 
                 # Ensure user has a subscription (auto-assigns free tier)
-                await get_or_create_free_subscription(db, user_id)
+                entitlements = await get_entitlements(db, user_id, request)
 
-                # Check quota before processing
-                has_quota, usage_count, usage_limit = await check_kiaan_quota(db, user_id)
+                # Check quota before processing, holding one question so
+                # concurrent requests cannot overrun the limit
+                has_quota, usage_count, usage_limit, kiaan_reservation = await reserve_kiaan_question(
+                    db, user_id, entitlements.tier
+                )
 
                 if not has_quota:
                     return {
@@ -786,7 +795,7 @@ async def send_message(request: Request, chat: ChatMessage, db: AsyncSession = D
         # Increment usage after successful response
         if SUBSCRIPTION_ENABLED and user_id is not None:
             try:
-                await increment_kiaan_usage(db, user_id)
+                await increment_kiaan_usage(db, user_id, kiaan_reservation)
             except Exception as usage_error:
                 logger.warning(f"Failed to increment usage: {usage_error}")
 
@@ -881,9 +890,13 @@ async def send_message(request: Request, chat: ChatMessage, db: AsyncSession = D
 
         return result
     except HTTPException:
+        if kiaan_reservation is not None:
+            await release_kiaan_reservation(kiaan_reservation)
         raise  # Let FastAPI handle HTTP exceptions (subscription errors, etc.)
     except Exception as e:
         logger.error(f"Error in send_message: {type(e).__name__}: {e}")
+        if kiaan_reservation is not None:
+            await release_kiaan_reservation(kiaan_reservation)
 
         # Use offline wisdom templates instead of a generic placeholder.
         # These are self-contained — no external imports needed — so they work
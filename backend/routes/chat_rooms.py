@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import html
 import json
 import logging
+import os
 import re
 import time
 from collections import defaultdict
+from collections.abc import Callable
 from typing import Any
 
 from fastapi import (
@@ -70,6 +73,59 @@ def sanitize_message(text: str) -> str:
     return cleaned[:2000]
 
 
+# Outbound messages buffered per socket. A client that falls this far
+# behind is disconnected instead of stalling delivery to the whole room.
+WS_SEND_QUEUE_SIZE = int(os.getenv("CHAT_WS_SEND_QUEUE_SIZE", "64"))
+# A single frame that takes longer than this to send marks the client stalled.
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("CHAT_WS_SEND_TIMEOUT_SECONDS", "10"))
+ROOM_CHANNEL_PREFIX = "chat:room:"
+# Close code sent to clients dropped for falling behind ("try again later").
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+def _encode(payload: dict[str, Any]) -> str:
+    """Serialize a payload exactly as ``WebSocket.send_json`` would."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+class _ConnectionWriter:
+    """Bounded send queue for one WebSocket, drained by its own task.
+
+    Broadcasters only ever ``offer`` pre-serialized frames, so a slow
+    socket delays nobody but itself.
+    """
+
+    def __init__(self, websocket: WebSocket, on_stall: Callable[[], None]) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self._on_stall = on_stall
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, text: str) -> bool:
+        """Enqueue a frame without waiting; False if the client is behind."""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                text = await self.queue.get()
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), WS_SEND_TIMEOUT_SECONDS
+                )
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self._on_stall()
+
+    def close(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+
+
 class DistributedConnectionManager:
     """WebSocket connection manager with Redis Pub/Sub for multi-instance broadcast.
 
@@ -77,14 +133,22 @@ class DistributedConnectionManager:
     identically to the original in-memory ConnectionManager. When Redis is
     connected, messages are published to a per-room channel so that all instances
     can relay them to their local WebSocket connections.
+
+    Each payload is serialized once per broadcast and handed to every socket's
+    bounded send queue; clients whose queue overflows (or whose send times out)
+    are disconnected. One ``chat:room:*`` pattern subscription per instance
+    relays other instances' messages to whichever rooms have local members.
     """
 
     def __init__(self) -> None:
         self.rooms: dict[str, set[WebSocket]] = defaultdict(set)
         self.user_lookup: dict[WebSocket, str] = {}
         self._instance_id: str = settings.INSTANCE_ID or "default"
-        # Background tasks listening on Redis Pub/Sub per room
-        self._listeners: dict[str, asyncio.Task] = {}
+        self._writers: dict[WebSocket, _ConnectionWriter] = {}
+        # Single background task listening on the chat:room:* pattern
+        self._listener: asyncio.Task | None = None
+        # Close handshakes for dropped slow clients (kept referenced until done)
+        self._closing: set[asyncio.Task] = set()
 
     async def _get_redis(self) -> Any:
         """Lazy-load the Redis cache singleton."""
@@ -100,72 +164,104 @@ class DistributedConnectionManager:
         await websocket.accept()
         self.rooms[room_id].add(websocket)
         self.user_lookup[websocket] = user_id
+        self._writers[websocket] = _ConnectionWriter(
+            websocket, lambda: self._drop(room_id, websocket)
+        )
 
-        # Start a Redis Pub/Sub listener for this room if not already running
-        if room_id not in self._listeners or self._listeners[room_id].done():
+        # Start the instance-wide Redis Pub/Sub listener if not already running
+        if self._listener is None or self._listener.done():
             redis = await self._get_redis()
             if redis:
-                self._listeners[room_id] = asyncio.create_task(
-                    self._subscribe_to_room(room_id, redis)
-                )
+                self._listener = asyncio.create_task(self._subscribe_to_rooms(redis))
 
     def disconnect(self, room_id: str, websocket: WebSocket) -> None:
         self.rooms[room_id].discard(websocket)
+        if not self.rooms[room_id]:
+            del self.rooms[room_id]
         self.user_lookup.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer:
+            writer.close()
 
-        # If no more local connections for this room, cancel the listener
-        if not self.rooms.get(room_id):
-            listener = self._listeners.pop(room_id, None)
-            if listener and not listener.done():
-                listener.cancel()
+        # If no more local connections at all, cancel the listener
+        if not self.rooms and self._listener and not self._listener.done():
+            self._listener.cancel()
+            self._listener = None
+
+    def send_personal(self, room_id: str, websocket: WebSocket, payload: dict[str, Any]) -> None:
+        """Queue a payload for one socket, in order with its room broadcasts."""
+        writer = self._writers.get(websocket)
+        if writer is None or not writer.offer(_encode(payload)):
+            self._drop(room_id, websocket)
 
     async def broadcast(self, room_id: str, payload: dict[str, Any]) -> None:
         """Broadcast a message to all local connections AND publish to Redis."""
+        text = _encode(payload)
         # Always send to local connections first (low latency)
-        await self._send_to_local(room_id, payload)
+        self._send_to_local(room_id, text)
 
         # Publish to Redis so other instances can relay
         redis = await self._get_redis()
         if redis:
-            envelope = json.dumps(
-                {
-                    "instance_id": self._instance_id,
-                    "payload": payload,
-                }
+            envelope = f'{{"instance_id":{json.dumps(self._instance_id)},"payload":{text}}}'
+            await redis.publish(f"{ROOM_CHANNEL_PREFIX}{room_id}", envelope)
+
+    def _send_to_local(self, room_id: str, text: str) -> None:
+        """Queue a serialized frame for every WebSocket on THIS instance."""
+        for connection in list(self.rooms.get(room_id, ())):
+            writer = self._writers.get(connection)
+            if writer is None or not writer.offer(text):
+                self._drop(room_id, connection)
+
+    def _drop(self, room_id: str, websocket: WebSocket) -> None:
+        """Disconnect a client that fell behind and close its socket."""
+        if websocket not in self._writers:
+            return
+        ws_logger.info(
+            "Dropping slow WebSocket client %s in room %s",
+            self.user_lookup.get(websocket, "unknown"),
+            room_id,
+        )
+        self.disconnect(room_id, websocket)
+        task = asyncio.create_task(self._close_quietly(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_quietly(self, websocket: WebSocket) -> None:
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=WS_CLOSE_SLOW_CONSUMER), WS_SEND_TIMEOUT_SECONDS
             )
-            await redis.publish(f"chat:room:{room_id}", envelope)
-
-    async def _send_to_local(self, room_id: str, payload: dict[str, Any]) -> None:
-        """Send payload to all WebSocket connections on THIS instance."""
-        websockets = list(self.rooms.get(room_id, set()))
-        for connection in websockets:
-            try:
-                await connection.send_json(payload)
-            except Exception:
-                self.disconnect(room_id, connection)
-
-    async def _subscribe_to_room(self, room_id: str, redis: Any) -> None:
-        """Background task: listen on Redis Pub/Sub channel for a room.
-
-        Messages from OTHER instances are relayed to local WebSocket connections.
-        Messages from THIS instance are skipped (already sent locally).
+
+    async def _subscribe_to_rooms(self, redis: Any) -> None:
+        """Background task: listen on the ``chat:room:*`` Pub/Sub pattern.
+
+        Messages from OTHER instances are relayed to local WebSocket connections
+        of the matching room. Messages from THIS instance are skipped (already
+        sent locally), as are rooms with no local members.
         """
-        channel = f"chat:room:{room_id}"
+        pattern = f"{ROOM_CHANNEL_PREFIX}*"
         pubsub = None
         try:
-            pubsub = await redis.subscribe(channel)
+            pubsub = await redis.psubscribe(pattern)
             if pubsub is None:
                 return
 
             async for message in pubsub.listen():
-                if message["type"] != "message":
+                if message["type"] != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                room_id = channel[len(ROOM_CHANNEL_PREFIX):]
+                if room_id not in self.rooms:
                     continue
                 try:
                     envelope = json.loads(message["data"])
                     # Skip messages from this instance (already broadcast locally)
                     if envelope.get("instance_id") == self._instance_id:
                         continue
-                    await self._send_to_local(room_id, envelope["payload"])
+                    self._send_to_local(room_id, _encode(envelope["payload"]))
                 except (json.JSONDecodeError, KeyError):
                     ws_logger.warning(
                         "Malformed Pub/Sub message on channel %s", channel
@@ -173,13 +269,11 @@ class DistributedConnectionManager:
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            ws_logger.warning(
-                "Redis Pub/Sub listener error for room %s: %s", room_id, e
-            )
+            ws_logger.warning("Redis Pub/Sub listener error: %s", e)
         finally:
             if pubsub:
                 try:
-                    await pubsub.unsubscribe(channel)
+                    await pubsub.punsubscribe(pattern)
                     await pubsub.aclose()
                 except Exception:
                     pass
@@ -455,25 +549,27 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str) -> None:
         await manager.broadcast(
             room_id, {"type": "participants", "participants": participants}
         )
-        await websocket.send_json(
-            {"type": "participants", "participants": participants}
+        manager.send_personal(
+            room_id, websocket, {"type": "participants", "participants": participants}
         )
 
         history = await recent_messages(room_id, db=db, limit=50, user_id=user_id)
-        await websocket.send_json({"type": "history", "messages": history})
+        manager.send_personal(room_id, websocket, {"type": "history", "messages": history})
 
         try:
             while True:
                 data = await websocket.receive_json()
                 content = sanitize_message(data.get("content", ""))
                 if not content:
-                    await websocket.send_json(
-                        {"type": "error", "message": "Message cannot be empty"}
+                    manager.send_personal(
+                        room_id, websocket,
+                        {"type": "error", "message": "Message cannot be empty"},
                     )
                     continue
                 if any(pattern.search(content) for pattern in PROHIBITED_PATTERNS):
-                    await websocket.send_json(
-                        {"type": "error", "message": "Message blocked for moderation"}
+                    manager.send_personal(
+                        room_id, websocket,
+                        {"type": "error", "message": "Message blocked for moderation"},
                     )
                     continue
 
@@ -1114,13 +1114,15 @@ async def get_current_step(
             return None
 
         # Look up the journey's primary enemy so the step response can surface
-        # the right modern example + sacred fallbacks. Failure is non-fatal.
-        enemy_tag: str | None = None
-        try:
-            stats = await service.get_journey(user_id, journey_id)
-            enemy_tag = stats.primary_enemies[0] if stats.primary_enemies else None
-        except Exception:  # pragma: no cover — defensive
-            pass
+        # the right modern example + sacred fallbacks. The template catalog
+        # usually supplies it on the step; failure is non-fatal.
+        enemy_tag: str | None = step.primary_enemy
+        if enemy_tag is None:
+            try:
+                stats = await service.get_journey(user_id, journey_id)
+                enemy_tag = stats.primary_enemies[0] if stats.primary_enemies else None
+            except Exception:  # pragma: no cover — defensive
+                pass
 
         return _step_to_response(step, enemy_tag=enemy_tag)
     except JourneyNotFoundError as e:
@@ -1141,12 +1143,13 @@ async def get_step(
     try:
         step = await service.get_step(user_id, journey_id, day_index)
 
-        enemy_tag: str | None = None
-        try:
-            stats = await service.get_journey(user_id, journey_id)
-            enemy_tag = stats.primary_enemies[0] if stats.primary_enemies else None
-        except Exception:  # pragma: no cover
-            pass
+        enemy_tag: str | None = step.primary_enemy
+        if enemy_tag is None:
+            try:
+                stats = await service.get_journey(user_id, journey_id)
+                enemy_tag = stats.primary_enemies[0] if stats.primary_enemies else None
+            except Exception:  # pragma: no cover
+                pass
 
         return _step_to_response(step, enemy_tag=enemy_tag)
     except JourneyNotFoundError as e:
@@ -382,7 +382,10 @@ async def transcribe_voice_upload(
     This endpoint is used by the Next.js proxy when forwarding browser recordings.
     """
     try:
-        from backend.services.whisper_transcription import transcribe_audio
+        from backend.services.whisper_transcription import (
+            WhisperQueueFull,
+            transcribe_audio,
+        )
 
         audio_data = await audio.read()
         if len(audio_data) > MAX_TRANSCRIBE_UPLOAD_BYTES:
@@ -401,13 +404,20 @@ async def transcribe_voice_upload(
             voice_features=result.get("voice_features", {}),
         )
 
-    except ImportError:
+    except ImportError as e:
         logger.warning("Whisper service not available")
-        raise HTTPException(status_code=503, detail="Speech recognition service not available")
+        raise HTTPException(status_code=503, detail="Speech recognition service not available") from e
 
     except HTTPException:
         raise
 
+    except WhisperQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Speech recognition is busy. Please try again in a moment.",
+            headers={"Retry-After": "2"},
+        ) from e
+
     except Exception as e:
         logger.error(f"Transcription upload error: {e}")
         raise HTTPException(status_code=500, detail="An error occurred processing your request. Please try again.")
@@ -422,7 +432,10 @@ async def transcribe_voice(request: Request):
     - application/json with base64 'audio' (or 'audio_base64') string and optional 'language'
     """
     try:
-        from backend.services.whisper_transcription import transcribe_audio
+        from backend.services.whisper_transcription import (
+            WhisperQueueFull,
+            transcribe_audio,
+        )
 
         content_type = request.headers.get("content-type", "")
 
@@ -463,13 +476,20 @@ async def transcribe_voice(request: Request):
             voice_features=result.get("voice_features", {}),
         )
 
-    except ImportError:
+    except ImportError as e:
         logger.warning("Whisper service not available")
-        raise HTTPException(status_code=503, detail="Speech recognition service not available")
+        raise HTTPException(status_code=503, detail="Speech recognition service not available") from e
 
     except HTTPException:
         raise
 
+    except WhisperQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Speech recognition is busy. Please try again in a moment.",
+            headers={"Retry-After": "2"},
+        ) from e
+
     except Exception as e:
         logger.error(f"Transcription error: {e}")
         raise HTTPException(status_code=500, detail="An error occurred processing your request. Please try again.")
@@ -688,8 +708,9 @@ async def health_check():
 
     # Check whisper
     try:
-        from backend.services.whisper_transcription import whisper_service
+        from backend.services.whisper_transcription import get_inference_metrics
         status["services"]["speech_recognition"] = "available"
+        status["speech_recognition_pool"] = get_inference_metrics()
     except ImportError:
         status["services"]["speech_recognition"] = "unavailable"
 
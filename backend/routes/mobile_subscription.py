@@ -40,6 +40,7 @@ from backend.models.subscription import (
     SubscriptionStatus,
     UserSubscription,
 )
+from backend.services.entitlement_cache import invalidate_entitlements
 
 logger = logging.getLogger(__name__)
 
@@ -414,6 +415,7 @@ async def verify_mobile_receipt(
             db.add(subscription)
 
         await db.commit()
+        await invalidate_entitlements(user_id)
 
         mobile_tier = BACKEND_TO_MOBILE_TIER.get(tier, "free")
 
@@ -6,10 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from backend.deps import get_db, get_current_user
-
-logger = logging.getLogger(__name__)
 from backend.models import Mood
 from backend.schemas import MoodIn, MoodOut
+from backend.services.mood_rolling_stats import record_mood_in_stats
+
+logger = logging.getLogger(__name__)
 
 
 class MicroResponseOut(BaseModel):
@@ -69,6 +70,8 @@ async def create_mood(
             .returning(Mood.id, Mood.score, Mood.tags, Mood.note, Mood.at)
         )
         row = res.first()
+        if row:
+            await record_mood_in_stats(db, user_id, row.score, row.at, payload.tags or ())
         await db.commit()
     except Exception as e:
         await db.rollback()
@@ -18,6 +18,7 @@ import logging
 
 from backend.deps import get_db, get_current_user_flexible
 from backend.models import Mood, JournalEntry, WisdomJourney
+from backend.services.mood_rolling_stats import record_mood_in_stats
 
 # Alias for backward compatibility
 Journal = JournalEntry
@@ -120,6 +121,8 @@ async def sync_mood_create(
         .returning(Mood.id, Mood.at)
     )
     row = res.first()
+    if row:
+        await record_mood_in_stats(db, user_id, data.get("score"), row.at, data.get("tags") or ())
     await db.commit()
 
     if not row:
@@ -68,11 +68,12 @@ async def get_voice_quota(
       2. How many minutes remain today (`minutes_remaining_today`)
       3. The full tier matrix so the upgrade sheet can render concrete numbers
 
-    No DB call. No third-party API call. Designed to be sub-50ms on a
-    healthy server so the mobile app feels snappy.
+    One Redis round trip (the usage ledger; the user's first check of the
+    day may seed it from usage_tracking). No third-party API call. Designed
+    to be sub-50ms on a healthy server so the mobile app feels snappy.
     """
     service = get_voice_quota_service()
-    evaluation = service.evaluate(user_id=user_id, tier=tier)
+    evaluation = await service.aevaluate(user_id=user_id, tier=tier)
 
     try:
         persona_version = get_persona_version()
@@ -0,0 +1,59 @@
+"""One-shot CLI: translate the Gita verse corpus into the translation memory.
+
+Chat responses quote verse text constantly; warming the translation memory
+with every verse in every supported language keeps those sentences off the
+translation provider at request time. Only useful with a persistent memory
+backend (``TRANSLATION_MEMORY_BACKEND=sqlite`` or ``redis``); sentences
+already in the memory are skipped, so re-runs are cheap.
+
+Usage::
+
+    TRANSLATION_MEMORY_BACKEND=redis python -m backend.scripts.prewarm_translation_memory [hi ta ...]
+
+Exit codes
+----------
+* ``0`` — completed (some languages may report partial success).
+* ``1`` — unexpected error, or the memory is not persistent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("prewarm_translation_memory")
+
+
+async def _main(languages: list[str]) -> int:
+    from backend.services.translation_service import translation_service
+
+    if translation_service.memory.store is None:
+        logger.error("TRANSLATION_MEMORY_BACKEND is 'memory'; nothing would be persisted")
+        return 1
+
+    summary = await translation_service.prewarm_verses(languages or None)
+    for lang, counts in summary["languages"].items():
+        logger.info(
+            "%s: %d/%d verses translated, %d provider calls",
+            lang, counts["translated"], summary["verses"], counts["provider_calls"],
+        )
+    logger.info("Translation memory prewarm done — %s", translation_service.memory.stats())
+    return 0
+
+
+def main() -> None:
+    try:
+        code = asyncio.run(_main(sys.argv[1:]))
+    except Exception as e:
+        logger.exception("Translation memory prewarm crashed: %s", e)
+        sys.exit(1)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""One-shot CLI: rebuild every user's rolling mood statistics from ``moods``.
+
+Mood logging keeps ``user_mood_stats`` current incrementally; this nightly
+pass repairs anything the incremental path cannot see (edited or deleted
+moods, offline syncs that arrived out of order, failed savepoints) and
+re-derives the IQR anomaly fences from each user's full history.
+
+Typical Render cron config::
+
+    command: python -m backend.scripts.rebuild_mood_stats
+    schedule: "30 3 * * *"   # 3:30 AM UTC daily
+
+Exit codes
+----------
+* ``0`` — completed (possibly with some chunks logged as failed).
+* ``1`` — unexpected error (check logs; the scheduler will retry).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("rebuild_mood_stats")
+
+REBUILD_CHUNK_SIZE = int(os.getenv("MOOD_STATS_REBUILD_CHUNK_SIZE", "500"))
+
+
+async def _main() -> int:
+    # Import lazily so --help doesn't require DB env vars.
+    from backend import deps
+    from backend.services.mood_rolling_stats import rebuild_mood_stats_once
+
+    logger.info("Mood stats rebuild starting (chunk=%d users)", REBUILD_CHUNK_SIZE)
+    stats = await rebuild_mood_stats_once(deps.SessionLocal, REBUILD_CHUNK_SIZE)
+    logger.info(
+        "Mood stats rebuild done — users=%d moods=%d removed=%d chunks=%d failed_chunks=%d",
+        stats.get("users", 0),
+        stats.get("moods", 0),
+        stats.get("removed", 0),
+        stats.get("chunks", 0),
+        stats.get("failed_chunks", 0),
+    )
+    return 0
+
+
+def main() -> None:
+    try:
+        code = asyncio.run(_main())
+    except Exception as e:
+        logger.exception("Mood stats rebuild crashed: %s", e)
+        sys.exit(1)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""One-shot CLI: rebuild ``wisdom_effectiveness_rollups`` from ``wisdom_effectiveness``.
+
+DynamicWisdomCorpus keeps the per-(mood, verse) rollups current as it
+flushes deliveries and records outcomes; run this once after applying
+``20260504_add_wisdom_effectiveness_rollups.sql`` to backfill existing
+rows, and afterwards whenever effectiveness rows are edited or deleted
+outside the corpus (retention purges, manual fixes).
+
+Typical Render cron config::
+
+    command: python -m backend.scripts.rebuild_wisdom_rollups
+    schedule: "45 3 * * 0"   # 3:45 AM UTC weekly
+
+Exit codes
+----------
+* ``0`` — completed.
+* ``1`` — unexpected error (check logs; the scheduler will retry).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("rebuild_wisdom_rollups")
+
+
+async def _main() -> int:
+    # Import lazily so --help doesn't require DB env vars.
+    from backend import deps
+    from backend.services.dynamic_wisdom_corpus import get_dynamic_wisdom_corpus
+
+    logger.info("Wisdom effectiveness rollup rebuild starting")
+    async with deps.SessionLocal() as db:
+        stats = await get_dynamic_wisdom_corpus().rebuild_effectiveness_rollups(db)
+    logger.info(
+        "Wisdom effectiveness rollup rebuild done — moods=%d rows=%d",
+        stats.get("moods", 0),
+        stats.get("rows", 0),
+    )
+    return 0
+
+
+def main() -> None:
+    try:
+        code = asyncio.run(_main())
+    except Exception as e:
+        logger.exception("Wisdom effectiveness rollup rebuild crashed: %s", e)
+        sys.exit(1)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
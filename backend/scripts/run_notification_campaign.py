@@ -0,0 +1,79 @@
+"""One-shot CLI: send one notification to every eligible user.
+
+Intended usage: external scheduler invokes this for the daily verse and
+periodic reminders, e.g. a Render cron::
+
+    command: python -m backend.scripts.run_notification_campaign --type daily_verse --title "Today's Verse" --body "..."
+    schedule: "0 6 * * *"   # 6 AM UTC daily
+
+Preferences and quiet hours are honoured exactly as for single sends
+(see :mod:`backend.services.notification_campaign`).
+
+Exit codes
+----------
+* ``0`` — completed (possibly with some chunks logged as failed).
+* ``1`` — unexpected error (check logs; the scheduler will retry).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("notification_campaign")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send a notification campaign")
+    parser.add_argument("--type", dest="notification_type", required=True)
+    parser.add_argument("--title", required=True)
+    parser.add_argument("--body", required=True)
+    parser.add_argument("--data", type=json.loads, default=None, help="JSON payload")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> int:
+    # Import lazily so --help doesn't require DB env vars.
+    from backend import deps
+    from backend.services.notification_campaign import run_notification_campaign
+
+    logger.info("Notification campaign %s starting", args.notification_type)
+    result = await run_notification_campaign(
+        deps.SessionLocal,
+        notification_type=args.notification_type,
+        title=args.title,
+        body=args.body,
+        data=args.data,
+    )
+    logger.info(
+        "Notification campaign done — users=%d tokens=%d ok=%d deactivated=%d "
+        "failed_chunks=%d (%.1f msg/s)",
+        result.users,
+        result.tokens,
+        result.tickets_ok,
+        result.tokens_deactivated,
+        result.failed_chunks,
+        result.messages_per_second,
+    )
+    return 0
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        code = asyncio.run(_main(args))
+    except Exception as e:
+        logger.exception("Notification campaign crashed: %s", e)
+        sys.exit(1)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
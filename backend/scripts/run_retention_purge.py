@@ -0,0 +1,55 @@
+"""One-shot CLI: run one data retention purge pass and exit.
+
+Intended for deployments where the API process restarts often enough
+that the in-process :class:`RetentionPurger` rarely reaches its interval
+(e.g. Render free tier). Invoke it from an external scheduler::
+
+    command: python -m backend.scripts.run_retention_purge
+    schedule: "30 3 * * *"   # 3:30 AM UTC daily
+
+A pass cut short (timeout, deploy) resumes from its checkpoints on the
+next invocation, and a policy another worker is purging is skipped.
+
+Exit codes
+----------
+* ``0`` — completed (possibly with nothing to purge).
+* ``1`` — a policy failed or the pass crashed (check logs; the next run
+  resumes where this one stopped).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("retention_purge")
+
+
+async def _main() -> int:
+    # Import lazily so --help doesn't require DB env vars.
+    from backend import deps
+    from backend.services.data_retention import purge_expired_data
+
+    async with deps.SessionLocal() as db:
+        results = await purge_expired_data(db)
+    for policy, result in results.items():
+        logger.info("%s: %s", policy, result)
+    return 1 if any("error" in r for r in results.values()) else 0
+
+
+def main() -> None:
+    try:
+        code = asyncio.run(_main())
+    except Exception as e:
+        logger.exception("Retention purge crashed: %s", e)
+        sys.exit(1)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
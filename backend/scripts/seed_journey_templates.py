@@ -68,6 +68,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from backend.models import Base
 from backend.models.journeys import JourneyTemplate, JourneyTemplateStep
+from backend.services.journey_engine.template_catalog import invalidate_template_catalog
 
 
 # ===========================================================================
@@ -1415,6 +1416,10 @@ async def seed_journey_templates(existing_engine: AsyncEngine) -> None:
         step_count = await seed_journey_template_steps(db)
         print(f"✅ Journey template steps seeded: {step_count} rows")
 
+    # Drop this process's catalog snapshot; other instances notice the new
+    # fingerprint on their next revalidation.
+    invalidate_template_catalog()
+
 
 if __name__ == "__main__":
     import os
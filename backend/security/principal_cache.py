@@ -0,0 +1,174 @@
+"""Cache of authenticated principals for get_current_user.
+
+Every authenticated request used to decode the JWT and then load the
+``users`` row just to check that the account still exists, is not deleted
+(suspended) and, when REQUIRE_EMAIL_VERIFICATION is on, has a verified
+email. This module keeps that answer per (user id, session id) for a short
+TTL:
+
+- ``Principal`` holds only the fields the check needs.
+- ``PrincipalCache`` is a bounded, in-process TTL map. A lookup that was
+  started before an invalidation never writes its (now stale) result back.
+- ``invalidate_principal(user_id)`` drops the user's entries locally and
+  publishes the user id on PRINCIPAL_INVALIDATION_CHANNEL, so every instance
+  running ``start_invalidation_listener()`` drops them too. Call it after
+  suspending, reactivating, deleting or verifying a user.
+- Without Redis, entries on other instances expire after
+  PRINCIPAL_CACHE_TTL_SECONDS. While the listener is disconnected it may
+  miss messages, so it clears the whole cache whenever it (re)subscribes.
+
+Request-scoped memoization lives in backend.deps: the resolved principal
+is kept on ``request.state`` so several auth dependencies in one request
+share one lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# How long a resolved principal is trusted without re-reading the users row
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+# Upper bound on cached (user, session) entries; least recently used go first
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "50000"))
+
+PRINCIPAL_INVALIDATION_CHANNEL = "auth:principal:invalidate"
+
+# Seconds between attempts to (re)subscribe to the invalidation channel
+_LISTENER_RETRY_SECONDS = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The minimal account state get_current_user checks."""
+
+    user_id: str
+    exists: bool  # False when the row is missing or soft-deleted (suspended)
+    email_verified: bool
+
+
+class PrincipalCache:
+    """Bounded TTL cache of principals keyed by (user id, session id)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str | None], tuple[Principal, float]] = OrderedDict()
+        self._by_user: dict[str, set[tuple[str, str | None]]] = {}
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, user_id: str) -> int:
+        """Invalidation counter for a user; pass it back to ``put``."""
+        return self._generations.get(user_id, 0)
+
+    def get(self, user_id: str, session_id: str | None) -> Principal | None:
+        key = (user_id, session_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, session_id: str | None, principal: Principal, generation: int) -> None:
+        """Store a principal unless the user was invalidated since ``generation``."""
+        if self.ttl_seconds <= 0 or self.generation(principal.user_id) != generation:
+            return
+        key = (principal.user_id, session_id)
+        self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        self._by_user.setdefault(principal.user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop every session's entry for a user and fence in-flight lookups."""
+        self._generations[user_id] = self.generation(user_id) + 1
+        for key in self._by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        for user_id in list(self._by_user):
+            self.invalidate(user_id)
+        self._entries.clear()
+
+    def _discard(self, key: tuple[str, str | None]) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+async def invalidate_principal(user_id: str) -> None:
+    """Forget a user's cached principal here and on every other instance."""
+    principal_cache.invalidate(user_id)
+    try:
+        from backend.cache.redis_cache import get_redis_cache
+
+        redis = await get_redis_cache()
+        if redis.is_connected:
+            await redis.publish(PRINCIPAL_INVALIDATION_CHANNEL, user_id)
+    except Exception as e:
+        logger.warning(f"Principal invalidation not published for user {user_id[:8]}: {e}")
+
+
+_listener: asyncio.Task | None = None
+
+
+async def _listen_for_invalidations() -> None:
+    """Apply invalidations published by other instances, resubscribing on failure."""
+    from backend.cache.redis_cache import get_redis_cache
+
+    while True:
+        pubsub = None
+        try:
+            redis = await get_redis_cache()
+            pubsub = await redis.subscribe(PRINCIPAL_INVALIDATION_CHANNEL) if redis.is_connected else None
+            if pubsub is not None:
+                # Messages may have been missed while unsubscribed
+                principal_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    user_id = message["data"]
+                    if isinstance(user_id, bytes):
+                        user_id = user_id.decode()
+                    principal_cache.invalidate(user_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Principal invalidation listener error (will resubscribe): {e}")
+        finally:
+            if pubsub is not None:
+                with contextlib.suppress(Exception):
+                    await pubsub.unsubscribe(PRINCIPAL_INVALIDATION_CHANNEL)
+                    await pubsub.aclose()
+        await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+def start_invalidation_listener() -> asyncio.Task:
+    """Start (once) the background task applying cross-instance invalidations."""
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(_listen_for_invalidations(), name="principal_invalidation")
+    return _listener
@@ -0,0 +1,401 @@
+"""Streaming admin data exports.
+
+The admin export routes used to load a whole table into ORM objects, build
+a list of dicts and render the complete file in memory before sending a
+byte. Exports are now described by an ExportSpec (a column-only SELECT, so
+no ORM identity map grows with the table) and rendered by stream_export(),
+which reads the rows from a server-side cursor EXPORT_CHUNK_ROWS at a time
+and yields each chunk as CSV, a JSON array or NDJSON, optionally gzipped.
+Memory stays constant in the size of the table.
+
+Large exports can instead run as a background job (ExportJobs): the same
+stream is written to EXPORT_JOB_DIR and downloaded later. Each job keeps a
+small JSON sidecar with its state, so any worker on the host can report
+status and serve the file; files expire after EXPORT_JOB_TTL_HOURS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import enum
+import io
+import json
+import logging
+import os
+import re
+import time
+import uuid
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models import (
+    KiaanUsageAnalytics,
+    Payment,
+    SubscriptionPlan,
+    User,
+    UserSubscription,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor (and rendered) per chunk
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "2000"))
+# Background export files and their status sidecars
+EXPORT_JOB_DIR = os.getenv("EXPORT_JOB_DIR", "./exports")
+# Finished export files are deleted after this long
+EXPORT_JOB_TTL_HOURS = int(os.getenv("EXPORT_JOB_TTL_HOURS", "24"))
+# Export jobs running at once per process; further jobs wait in "queued"
+EXPORT_JOB_MAX_CONCURRENT = int(os.getenv("EXPORT_JOB_MAX_CONCURRENT", "2"))
+
+EXPORT_FORMATS = ("csv", "json", "ndjson")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """What to export: a column-only SELECT and the CSV columns to keep."""
+
+    resource: str
+    statement: Select
+    # CSV cannot hold nested JSON; None means every selected column
+    csv_fields: tuple[str, ...] | None = None
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(c.key for c in self.statement.selected_columns)
+
+
+def users_export(include_subscription: bool = True) -> ExportSpec:
+    columns = [User.id, User.email, User.auth_uid, User.locale, User.created_at]
+    stmt = select(*columns)
+    if include_subscription:
+        # user_subscriptions.user_id is unique, so the join keeps one row per user
+        stmt = (
+            select(
+                *columns,
+                SubscriptionPlan.tier.label("subscription_tier"),
+                UserSubscription.status.label("subscription_status"),
+            )
+            .outerjoin(
+                UserSubscription,
+                and_(
+                    UserSubscription.user_id == User.id,
+                    UserSubscription.deleted_at.is_(None),
+                ),
+            )
+            .outerjoin(SubscriptionPlan, SubscriptionPlan.id == UserSubscription.plan_id)
+        )
+    stmt = stmt.where(User.deleted_at.is_(None)).order_by(User.created_at.desc())
+    return ExportSpec("users", stmt)
+
+
+def subscriptions_export() -> ExportSpec:
+    stmt = (
+        select(
+            UserSubscription.id,
+            UserSubscription.user_id,
+            SubscriptionPlan.tier.label("tier"),
+            UserSubscription.status,
+            UserSubscription.current_period_start,
+            UserSubscription.current_period_end,
+            UserSubscription.cancel_at_period_end,
+            UserSubscription.canceled_at,
+            UserSubscription.created_at,
+        )
+        .outerjoin(SubscriptionPlan, SubscriptionPlan.id == UserSubscription.plan_id)
+        .where(UserSubscription.deleted_at.is_(None))
+        .order_by(UserSubscription.created_at.desc())
+    )
+    return ExportSpec("subscriptions", stmt)
+
+
+def payments_export(
+    start_date: datetime | None = None, end_date: datetime | None = None
+) -> ExportSpec:
+    stmt = (
+        select(
+            Payment.id,
+            Payment.user_id,
+            Payment.amount,
+            Payment.currency,
+            Payment.status,
+            Payment.description,
+            Payment.stripe_payment_intent_id,
+            Payment.created_at,
+        )
+        .where(Payment.deleted_at.is_(None))
+        .order_by(Payment.created_at.desc())
+    )
+    if start_date:
+        stmt = stmt.where(Payment.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(Payment.created_at <= end_date)
+    return ExportSpec("payments", stmt)
+
+
+def analytics_export() -> ExportSpec:
+    stmt = (
+        select(
+            KiaanUsageAnalytics.date,
+            KiaanUsageAnalytics.total_questions,
+            KiaanUsageAnalytics.unique_users,
+            KiaanUsageAnalytics.topic_distribution,
+            KiaanUsageAnalytics.questions_by_tier,
+            KiaanUsageAnalytics.avg_response_time_ms,
+            KiaanUsageAnalytics.satisfaction_avg,
+        )
+        .order_by(KiaanUsageAnalytics.date.desc())
+        .limit(365)  # Last year
+    )
+    return ExportSpec(
+        "analytics",
+        stmt,
+        csv_fields=(
+            "date", "total_questions", "unique_users",
+            "avg_response_time_ms", "satisfaction_avg",
+        ),
+    )
+
+
+def _plain(value: Any) -> Any:
+    """Column value → JSON / CSV friendly value."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def export_filename(spec: ExportSpec, fmt: str, compress: bool) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{spec.resource}_export_{timestamp}.{fmt}" + (".gz" if compress else "")
+
+
+async def stream_export(
+    spec: ExportSpec,
+    fmt: str = "csv",
+    compress: bool = False,
+    session_maker: async_sessionmaker[AsyncSession] | None = None,
+    stats: dict[str, int] | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield the export as encoded chunks, EXPORT_CHUNK_ROWS rows at a time.
+
+    Runs on its own session (the request's may be closed before a
+    StreamingResponse is consumed). stats["rows"] counts rows as they go.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if session_maker is None:
+        from backend.deps import SessionLocal
+
+        session_maker = SessionLocal
+    if stats is None:
+        stats = {}
+    stats["rows"] = 0
+    gzip = zlib.compressobj(wbits=31) if compress else None
+    fields = (spec.csv_fields or spec.fields) if fmt == "csv" else spec.fields
+    first = True
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return gzip.compress(data) if gzip is not None else data
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(fields)
+    elif fmt == "json":
+        buffer.write("[")
+    head = encode(buffer.getvalue())
+    if head:
+        yield head
+
+    async with session_maker() as db:
+        result = await db.stream(spec.statement.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        async for rows in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            if fmt == "csv":
+                writer.writerows([_plain(row._mapping[f]) for f in fields] for row in rows)
+            else:
+                for row in rows:
+                    line = json.dumps(
+                        {f: _plain(v) for f, v in zip(fields, row, strict=True)}, default=str
+                    )
+                    if fmt == "ndjson":
+                        buffer.write(line + "\n")
+                    else:
+                        buffer.write(("\n" if first else ",\n") + line)
+                        first = False
+            stats["rows"] += len(rows)
+            chunk = encode(buffer.getvalue())
+            if chunk:
+                yield chunk
+
+    tail = encode("\n]\n") if fmt == "json" else b""
+    if gzip is not None:
+        tail += gzip.flush()
+    if tail:
+        yield tail
+
+
+class ExportJobs:
+    """Background exports written to EXPORT_JOB_DIR for later download."""
+
+    def __init__(
+        self,
+        directory: str = EXPORT_JOB_DIR,
+        max_concurrent: int = EXPORT_JOB_MAX_CONCURRENT,
+        ttl_hours: int = EXPORT_JOB_TTL_HOURS,
+    ) -> None:
+        self.directory = directory
+        self.ttl_hours = ttl_hours
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def _meta_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _write_meta(self, job: dict[str, Any]) -> None:
+        tmp_path = self._meta_path(job["job_id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        os.replace(tmp_path, self._meta_path(job["job_id"]))
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Job status from its sidecar, or None for an unknown / expired id."""
+        if not _JOB_ID.match(job_id):
+            return None
+        try:
+            with open(self._meta_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def file_path(self, job: dict[str, Any]) -> str:
+        return os.path.join(self.directory, f"{job['job_id']}.data")
+
+    def start(
+        self,
+        spec: ExportSpec,
+        fmt: str,
+        compress: bool,
+        admin_id: str,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+    ) -> dict[str, Any]:
+        """Queue an export job and return its initial status."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.purge_expired()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "resource": spec.resource,
+            "format": fmt,
+            "gzip": compress,
+            "admin_id": admin_id,
+            "filename": export_filename(spec, fmt, compress),
+            "media_type": "application/gzip" if compress else MEDIA_TYPES[fmt],
+            "state": "queued",
+            "rows": 0,
+            "bytes": 0,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        self._write_meta(job)
+        task = asyncio.create_task(
+            self._run(job, spec, session_maker), name=f"export_{job['job_id']}"
+        )
+        self._tasks[job["job_id"]] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job["job_id"], None))
+        return job
+
+    async def _run(
+        self,
+        job: dict[str, Any],
+        spec: ExportSpec,
+        session_maker: async_sessionmaker[AsyncSession] | None,
+    ) -> None:
+        async with self._slots:
+            job["state"] = "running"
+            self._write_meta(job)
+            part_path = self.file_path(job) + ".part"
+            stats: dict[str, int] = {}
+            try:
+                with open(part_path, "wb") as f:
+                    async for chunk in stream_export(
+                        spec, job["format"], job["gzip"], session_maker, stats
+                    ):
+                        f.write(chunk)
+                        job["bytes"] += len(chunk)
+                os.replace(part_path, self.file_path(job))
+                job["state"] = "done"
+            except asyncio.CancelledError:
+                # Worker shutting down: record it so the job does not look stuck
+                job.update(state="failed", error="interrupted", finished_at=time.time())
+                self._write_meta(job)
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+            except Exception as e:
+                logger.warning(f"[Export] Job {job['job_id']} ({spec.resource}) failed: {e}")
+                job["state"] = "failed"
+                job["error"] = str(e)
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            job["rows"] = stats.get("rows", 0)
+            job["finished_at"] = time.time()
+            self._write_meta(job)
+            logger.info(
+                f"[Export] Job {job['job_id']} {job['state']}: {spec.resource} "
+                f"{job['rows']} rows, {job['bytes']} bytes"
+            )
+
+    async def wait(self, job_id: str) -> None:
+        """Wait for a job started by this process (tests, graceful shutdown)."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await task
+
+    def purge_expired(self) -> int:
+        """Delete jobs (file and sidecar) finished more than ttl_hours ago."""
+        if not os.path.isdir(self.directory):
+            return 0
+        cutoff = time.time() - self.ttl_hours * 3600
+        purged = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            job = self.get(name[: -len(".json")])
+            if job is None or not job["finished_at"] or job["finished_at"] >= cutoff:
+                continue
+            for path in (self.file_path(job), self._meta_path(job["job_id"])):
+                if os.path.exists(path):
+                    os.remove(path)
+            purged += 1
+        return purged
+
+
+_jobs: ExportJobs | None = None
+
+
+def get_export_jobs() -> ExportJobs:
+    global _jobs
+    if _jobs is None:
+        _jobs = ExportJobs()
+    return _jobs
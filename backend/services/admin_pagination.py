@@ -0,0 +1,120 @@
+"""Keyset pagination and cached counts for the admin list endpoints.
+
+The admin lists used ``OFFSET (page-1)*page_size``, so the database read and
+discarded every row before the requested page, and each request also ran a
+fresh ``COUNT`` over the filtered table. Both grow linearly with the table.
+
+keyset_page() orders by a sort key plus the primary key as a tie-breaker and
+starts each page strictly after the last row of the previous one, so any
+page costs one index range scan of ``page_size + 1`` rows. The position is
+handed to the client as an opaque ``next_cursor``; sending it back as
+``cursor`` fetches the following page. Without a cursor the ``page``
+parameter still works (OFFSET), so existing clients keep paging as before.
+
+cached_count() keeps the total for each distinct filter for
+ADMIN_COUNT_CACHE_SECONDS, so paging through a list counts it once rather
+than on every request.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+# How long a list total is reused for the same filters; totals may lag by
+# up to this long
+ADMIN_COUNT_CACHE_SECONDS = float(os.getenv("ADMIN_COUNT_CACHE_SECONDS", "30"))
+# Upper bound on cached totals; oldest go first
+ADMIN_COUNT_CACHE_MAX_ENTRIES = 256
+
+_count_cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row on a page."""
+    plain = [v.isoformat() if isinstance(v, datetime.datetime) else v for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[ColumnElement]) -> list[Any]:
+    """Decode a cursor produced by encode_cursor() for the same sort keys."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of values")
+        return [
+            datetime.datetime.fromisoformat(v)
+            if v is not None and key.type.python_type is datetime.datetime
+            else v
+            for key, v in zip(keys, values, strict=True)
+        ]
+    except (ValueError, TypeError, NotImplementedError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[ColumnElement],
+    page_size: int,
+    cursor: str | None = None,
+    page: int = 1,
+    descending: bool = True,
+) -> tuple[list[Any], str | None]:
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    ``keys`` must end with a unique column (normally the primary key) and
+    must not be NULL, so the order is total. ``query`` must select a single
+    entity and carry no ORDER BY of its own. Returns the page's objects and
+    the cursor for the next page, or None on the last page.
+
+    With ``cursor`` the page starts right after the cursor's row; without
+    it ``page`` is used as an OFFSET for clients that page by number.
+    """
+    stmt = query.add_columns(*keys).order_by(
+        *(key.desc() if descending else key.asc() for key in keys)
+    )
+    if cursor:
+        position = tuple_(*keys)
+        after = tuple_(*(
+            literal(value, key.type) for key, value in zip(keys, decode_cursor(cursor, keys), strict=True)
+        ))
+        stmt = stmt.where(position < after if descending else position > after)
+    elif page > 1:
+        stmt = stmt.offset((page - 1) * page_size)
+
+    rows = (await db.execute(stmt.limit(page_size + 1))).all()
+    next_cursor = encode_cursor(rows[page_size - 1][1:]) if len(rows) > page_size else None
+    return [row[0] for row in rows[:page_size]], next_cursor
+
+
+async def cached_count(db: AsyncSession, count_query: Select) -> int:
+    """Run ``count_query``, reusing its result for ADMIN_COUNT_CACHE_SECONDS."""
+    compiled = count_query.compile()
+    key = f"{compiled}|{sorted(compiled.params.items())!r}"
+    now = time.monotonic()
+    hit = _count_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    total = (await db.execute(count_query)).scalar() or 0
+    _count_cache[key] = (now + ADMIN_COUNT_CACHE_SECONDS, total)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > ADMIN_COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.popitem(last=False)
+    return total
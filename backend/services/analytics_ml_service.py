@@ -6,17 +6,29 @@ Provides machine learning capabilities for mood prediction, trend analysis,
 and pattern recognition.
 
 Quantum Enhancement #6: Advanced Analytics Dashboard
+
+All numeric work is vectorized with NumPy (cumulative-sum windows, closed-form
+regression, partition-based quartiles). The ``*_from_stats`` variants answer
+the same questions in O(1) from a persisted ``MoodRollingStats`` summary.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
 from collections import defaultdict
-import statistics
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.services.mood_rolling_stats import (
+    MoodRollingStats,
+    anomaly_record,
+    iqr_bounds,
+)
+
+_DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
 
 class MoodDataPoint:
     """Single mood data point"""
-    def __init__(self, date: datetime, score: float, tags: List[str] = None):
+    def __init__(self, date: datetime, score: float, tags: list[str] = None):
         self.date = date
         self.score = score
         self.tags = tags or []
@@ -31,7 +43,7 @@ class TrendAnalysis:
         moving_avg_7d: float,
         moving_avg_30d: float,
         volatility: float,
-        anomalies: List[Dict]
+        anomalies: list[dict]
     ):
         self.trend_direction = trend_direction  # "improving", "declining", "stable"
         self.trend_strength = trend_strength    # 0-1 (strength of trend)
@@ -66,7 +78,7 @@ class AnalyticsMLService:
 
     def analyze_mood_trends(
         self,
-        mood_data: List[MoodDataPoint],
+        mood_data: list[MoodDataPoint],
         lookback_days: int = 90
     ) -> TrendAnalysis:
         """
@@ -83,35 +95,44 @@ class AnalyticsMLService:
 
         # Sort by date
         sorted_data = sorted(mood_data, key=lambda x: x.date)
-        scores = [d.score for d in sorted_data]
-
-        # Calculate moving averages
-        ma_7d = self._moving_average(scores, window=7)
-        ma_30d = self._moving_average(scores, window=30)
-
-        # Calculate volatility (standard deviation)
-        volatility = statistics.stdev(scores) if len(scores) > 1 else 0.0
+        scores = np.fromiter((d.score for d in sorted_data), dtype=np.float64, count=len(sorted_data))
 
         # Trend detection using linear regression
         trend_direction, trend_strength = self._detect_trend(scores)
 
-        # Anomaly detection
-        anomalies = self._detect_anomalies(sorted_data, scores)
+        return TrendAnalysis(
+            trend_direction=trend_direction,
+            trend_strength=trend_strength,
+            moving_avg_7d=self._trailing_mean(scores, 7),
+            moving_avg_30d=self._trailing_mean(scores, 30),
+            volatility=self._stdev(scores),
+            anomalies=self._detect_anomalies(sorted_data, scores)
+        )
+
+    def analyze_mood_trends_from_stats(self, stats: MoodRollingStats) -> TrendAnalysis:
+        """O(1) trend analysis from a persisted rolling summary.
 
+        Anomalies are those flagged against the IQR fences of the last
+        full rebuild plus any logged since.
+        """
+        if stats.count < self.min_data_points:
+            return self._default_trend_analysis()
+
+        trend_direction, trend_strength = self._trend_from_slope(stats.slope)
         return TrendAnalysis(
             trend_direction=trend_direction,
             trend_strength=trend_strength,
-            moving_avg_7d=ma_7d[-1] if ma_7d else statistics.mean(scores),
-            moving_avg_30d=ma_30d[-1] if ma_30d else statistics.mean(scores),
-            volatility=volatility,
-            anomalies=anomalies
+            moving_avg_7d=stats.trailing_mean(7),
+            moving_avg_30d=stats.trailing_mean(30),
+            volatility=stats.stdev,
+            anomalies=list(stats.anomalies)
         )
 
     def predict_mood(
         self,
-        mood_data: List[MoodDataPoint],
+        mood_data: list[MoodDataPoint],
         forecast_days: int = 7
-    ) -> List[MoodPrediction]:
+    ) -> list[MoodPrediction]:
         """
         Predict future mood scores
 
@@ -124,13 +145,54 @@ class AnalyticsMLService:
             return []
 
         sorted_data = sorted(mood_data, key=lambda x: x.date)
-        scores = [d.score for d in sorted_data]
+        scores = np.fromiter((d.score for d in sorted_data), dtype=np.float64, count=len(sorted_data))
+
+        weekday_means = None
+        if scores.size >= 14:
+            weekday_means = self._weekday_means(sorted_data, scores)
+
+        return self._forecast(
+            last_date=sorted_data[-1].date,
+            ma_7d=self._trailing_mean(scores, 7),
+            trend=self._detect_trend(scores),
+            volatility=float(np.std(scores, ddof=1)) if scores.size > 1 else 1.0,
+            weekday_means=weekday_means,
+            forecast_days=forecast_days,
+        )
 
-        # Calculate base prediction using moving average + trend
-        ma_7d = statistics.mean(scores[-7:]) if len(scores) >= 7 else statistics.mean(scores)
+    def predict_mood_from_stats(
+        self,
+        stats: MoodRollingStats,
+        forecast_days: int = 7
+    ) -> list[MoodPrediction]:
+        """O(1)-per-day forecast from a persisted rolling summary."""
+        if stats.count < self.min_data_points or stats.last_datetime is None:
+            return []
 
-        # Detect trend
-        trend_direction, trend_strength = self._detect_trend(scores)
+        weekday_means = None
+        if stats.count >= 14:
+            weekday_means = [stats.weekday_mean(day) for day in range(7)]
+
+        return self._forecast(
+            last_date=stats.last_datetime,
+            ma_7d=stats.trailing_mean(7),
+            trend=self._trend_from_slope(stats.slope),
+            volatility=stats.stdev if stats.count > 1 else 1.0,
+            weekday_means=weekday_means,
+            forecast_days=forecast_days,
+        )
+
+    def _forecast(
+        self,
+        last_date: datetime,
+        ma_7d: float,
+        trend: tuple[str, float],
+        volatility: float,
+        weekday_means: list[float] | None,
+        forecast_days: int,
+    ) -> list[MoodPrediction]:
+        """Shared forecast arithmetic for the history and summary paths."""
+        trend_direction, trend_strength = trend
 
         # Calculate daily trend adjustment
         trend_multiplier = 1.0
@@ -139,12 +201,8 @@ class AnalyticsMLService:
         elif trend_direction == "declining":
             trend_multiplier = 1.0 - (trend_strength * 0.1)
 
-        # Calculate volatility for confidence intervals
-        volatility = statistics.stdev(scores) if len(scores) > 1 else 1.0
-
         # Generate predictions
         predictions = []
-        last_date = sorted_data[-1].date
 
         for day in range(1, forecast_days + 1):
             pred_date = last_date + timedelta(days=day)
@@ -153,8 +211,8 @@ class AnalyticsMLService:
             pred_score = ma_7d * (trend_multiplier ** day)
 
             # Add weekly pattern (if we have enough data)
-            if len(scores) >= 14:
-                weekly_pattern = self._get_weekly_pattern(sorted_data, pred_date.weekday())
+            if weekday_means is not None:
+                weekly_pattern = weekday_means[pred_date.weekday()]
                 pred_score = (pred_score * 0.7) + (weekly_pattern * 0.3)
 
             # Clamp to valid range (1-10)
@@ -176,9 +234,9 @@ class AnalyticsMLService:
 
     def calculate_risk_score(
         self,
-        mood_data: List[MoodDataPoint],
-        journal_data: Optional[List[Dict]] = None
-    ) -> Dict:
+        mood_data: list[MoodDataPoint],
+        journal_data: list[dict] | None = None
+    ) -> dict:
         """
         Calculate spiritual wellness risk score (0-100)
 
@@ -196,12 +254,40 @@ class AnalyticsMLService:
         if len(mood_data) < self.min_data_points:
             return {"score": 50, "level": "insufficient_data"}
 
+        scores = np.fromiter((d.score for d in mood_data), dtype=np.float64, count=len(mood_data))
+        recent_scores = [d.score for d in sorted(mood_data, key=lambda x: x.date)[-7:]]
+
+        return self._risk_from_components(
+            avg_mood=float(np.mean(recent_scores)),
+            trend=self._detect_trend(scores),
+            volatility=self._stdev(scores),
+            low_mood_pct=float(np.count_nonzero(scores <= 3.0)) / scores.size * 100,
+        )
+
+    def calculate_risk_score_from_stats(self, stats: MoodRollingStats) -> dict:
+        """O(1) risk score from a persisted rolling summary."""
+        if stats.count < self.min_data_points:
+            return {"score": 50, "level": "insufficient_data"}
+
+        return self._risk_from_components(
+            avg_mood=stats.trailing_mean(7),
+            trend=self._trend_from_slope(stats.slope),
+            volatility=stats.stdev,
+            low_mood_pct=(stats.low_count / stats.count) * 100,
+        )
+
+    def _risk_from_components(
+        self,
+        avg_mood: float,
+        trend: tuple[str, float],
+        volatility: float,
+        low_mood_pct: float,
+    ) -> dict:
+        """Shared weighting for the history and summary risk paths."""
         risk_score = 0.0
         factors = {}
 
         # Factor 1: Recent mood average (40% weight)
-        recent_scores = [d.score for d in sorted(mood_data, key=lambda x: x.date)[-7:]]
-        avg_mood = statistics.mean(recent_scores)
         if avg_mood < 4.0:
             mood_risk = 40
         elif avg_mood < 6.0:
@@ -215,7 +301,7 @@ class AnalyticsMLService:
         factors["mood_average"] = {"value": avg_mood, "risk": mood_risk}
 
         # Factor 2: Trend direction (30% weight)
-        trend_direction, trend_strength = self._detect_trend([d.score for d in mood_data])
+        trend_direction, trend_strength = trend
         if trend_direction == "declining":
             trend_risk = 30 * trend_strength
         elif trend_direction == "stable":
@@ -227,16 +313,12 @@ class AnalyticsMLService:
         factors["trend"] = {"direction": trend_direction, "risk": trend_risk}
 
         # Factor 3: Volatility (20% weight)
-        scores = [d.score for d in mood_data]
-        volatility = statistics.stdev(scores) if len(scores) > 1 else 0.0
         volatility_risk = min(20, volatility * 5)  # High volatility = higher risk
 
         risk_score += volatility_risk
         factors["volatility"] = {"value": volatility, "risk": volatility_risk}
 
         # Factor 4: Low mood frequency (10% weight)
-        low_mood_count = sum(1 for d in mood_data if d.score <= 3.0)
-        low_mood_pct = (low_mood_count / len(mood_data)) * 100
         low_mood_risk = min(10, low_mood_pct / 2)
 
         risk_score += low_mood_risk
@@ -261,7 +343,7 @@ class AnalyticsMLService:
             "factors": factors
         }
 
-    def detect_patterns(self, mood_data: List[MoodDataPoint]) -> Dict:
+    def detect_patterns(self, mood_data: list[MoodDataPoint]) -> dict:
         """
         Detect behavioral patterns
 
@@ -272,39 +354,67 @@ class AnalyticsMLService:
         if len(mood_data) < self.min_data_points:
             return {}
 
-        patterns = {}
+        # Weekly pattern analysis (0=Monday, 6=Sunday), keyed in order of
+        # first appearance
+        scores = np.fromiter((d.score for d in mood_data), dtype=np.float64, count=len(mood_data))
+        weekdays = np.fromiter((d.date.weekday() for d in mood_data), dtype=np.int64, count=len(mood_data))
+        counts = np.bincount(weekdays, minlength=7)
+        sums = np.bincount(weekdays, weights=scores, minlength=7)
+        present, first_seen = np.unique(weekdays, return_index=True)
+        order = present[np.argsort(first_seen)].tolist()
 
-        # Weekly pattern analysis
-        day_scores = defaultdict(list)
+        # Tag correlation analysis
+        tag_counts: dict[str, int] = defaultdict(int)
+        tag_sums: dict[str, float] = defaultdict(float)
         for dp in mood_data:
-            day_of_week = dp.date.weekday()  # 0=Monday, 6=Sunday
-            day_scores[day_of_week].append(dp.score)
+            for tag in dp.tags:
+                tag_counts[tag.lower()] += 1
+                tag_sums[tag.lower()] += dp.score
+
+        return self._patterns_from_histograms(order, counts.tolist(), sums.tolist(), tag_counts, tag_sums)
+
+    def detect_patterns_from_stats(self, stats: MoodRollingStats) -> dict:
+        """O(1) pattern detection from a persisted rolling summary."""
+        if stats.count < self.min_data_points:
+            return {}
+
+        return self._patterns_from_histograms(
+            stats.weekday_order,
+            stats.weekday_counts,
+            stats.weekday_sums,
+            stats.tag_counts,
+            stats.tag_sums,
+        )
+
+    def _patterns_from_histograms(
+        self,
+        weekday_order: list[int],
+        weekday_counts: list[int],
+        weekday_sums: list[float],
+        tag_counts: dict[str, int],
+        tag_sums: dict[str, float],
+    ) -> dict:
+        """Shared weekly/tag pattern formatting for both paths."""
+        patterns = {}
 
         weekly_pattern = {}
-        day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        for day, scores in day_scores.items():
-            if scores:
-                weekly_pattern[day_names[day]] = {
-                    "average": round(statistics.mean(scores), 1),
-                    "count": len(scores)
+        for day in weekday_order:
+            if weekday_counts[day]:
+                weekly_pattern[_DAY_NAMES[day]] = {
+                    "average": round(weekday_sums[day] / weekday_counts[day], 1),
+                    "count": weekday_counts[day]
                 }
 
         patterns["weekly"] = weekly_pattern
 
-        # Tag correlation analysis
-        tag_scores = defaultdict(list)
-        for dp in mood_data:
-            for tag in dp.tags:
-                tag_scores[tag.lower()].append(dp.score)
-
         tag_correlations = []
-        for tag, scores in tag_scores.items():
-            if len(scores) >= 3:  # At least 3 occurrences
-                avg_score = statistics.mean(scores)
+        for tag, count in tag_counts.items():
+            if count >= 3:  # At least 3 occurrences
+                avg_score = tag_sums[tag] / count
                 tag_correlations.append({
                     "tag": tag,
                     "average_mood": round(avg_score, 1),
-                    "count": len(scores),
+                    "count": count,
                     "impact": "positive" if avg_score > 7 else "negative" if avg_score < 5 else "neutral"
                 })
 
@@ -316,19 +426,28 @@ class AnalyticsMLService:
 
     # Helper methods
 
-    def _moving_average(self, data: List[float], window: int) -> List[float]:
-        """Calculate moving average"""
-        if len(data) < window:
-            return [statistics.mean(data)]
+    def _moving_average(self, data: list[float], window: int) -> list[float]:
+        """Calculate moving average (cumulative-sum windows, O(n))"""
+        values = np.asarray(data, dtype=np.float64)
+        if values.size < window:
+            return [float(values.mean())]
+
+        csum = np.cumsum(np.concatenate(([0.0], values)))
+        return ((csum[window:] - csum[:-window]) / window).tolist()
 
-        result = []
-        for i in range(len(data) - window + 1):
-            window_data = data[i:i + window]
-            result.append(statistics.mean(window_data))
+    @staticmethod
+    def _trailing_mean(scores: np.ndarray, window: int) -> float:
+        """Last value of the moving average: mean of the final window."""
+        if scores.size < window:
+            return float(scores.mean())
+        return float(scores[-window:].mean())
 
-        return result
+    @staticmethod
+    def _stdev(scores: np.ndarray) -> float:
+        """Sample standard deviation (0.0 for a single point)."""
+        return float(np.std(scores, ddof=1)) if scores.size > 1 else 0.0
 
-    def _detect_trend(self, scores: List[float]) -> Tuple[str, float]:
+    def _detect_trend(self, scores) -> tuple[str, float]:
         """
         Detect trend using simple linear regression
 
@@ -336,25 +455,22 @@ class AnalyticsMLService:
             - trend_direction: "improving", "declining", "stable"
             - trend_strength: 0-1 (how strong the trend is)
         """
-        if len(scores) < 3:
+        y = np.asarray(scores, dtype=np.float64)
+        n = y.size
+        if n < 3:
             return "stable", 0.0
 
-        n = len(scores)
-        x = list(range(n))
-        y = scores
-
-        # Calculate linear regression slope
-        x_mean = statistics.mean(x)
-        y_mean = statistics.mean(y)
-
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
+        # Closed-form slope: x = 0..n-1, so sum((x - x_mean)^2) = n(n^2 - 1)/12
+        x_centered = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+        slope = float(np.dot(x_centered, y - y.mean())) / (n * (n * n - 1) / 12.0)
+        return self._trend_from_slope(slope)
 
-        if denominator == 0:
+    @staticmethod
+    def _trend_from_slope(slope: float | None) -> tuple[str, float]:
+        """Map a regression slope onto (direction, strength)."""
+        if slope is None:
             return "stable", 0.0
 
-        slope = numerator / denominator
-
         # Determine direction and strength
         if abs(slope) < 0.02:  # Very flat
             return "stable", 0.0
@@ -367,61 +483,42 @@ class AnalyticsMLService:
 
     def _detect_anomalies(
         self,
-        mood_data: List[MoodDataPoint],
-        scores: List[float]
-    ) -> List[Dict]:
-        """Detect anomalous mood entries using IQR method"""
-        if len(scores) < 10:
+        mood_data: list[MoodDataPoint],
+        scores
+    ) -> list[dict]:
+        """Detect anomalous mood entries using IQR method (partition, not sort)"""
+        values = np.asarray(scores, dtype=np.float64)
+        bounds = iqr_bounds(values)
+        if bounds is None:
             return []
 
-        # Calculate IQR
-        sorted_scores = sorted(scores)
-        q1_idx = len(sorted_scores) // 4
-        q3_idx = (3 * len(sorted_scores)) // 4
-
-        q1 = sorted_scores[q1_idx]
-        q3 = sorted_scores[q3_idx]
-        iqr = q3 - q1
-
-        # Anomaly thresholds
-        lower_bound = q1 - (1.5 * iqr)
-        upper_bound = q3 + (1.5 * iqr)
-
-        anomalies = []
-        for dp in mood_data:
-            if dp.score < lower_bound:
-                anomalies.append({
-                    "date": dp.date.isoformat(),
-                    "score": dp.score,
-                    "type": "unusually_low",
-                    "description": f"Mood score {dp.score} is unusually low compared to your typical range"
-                })
-            elif dp.score > upper_bound:
-                anomalies.append({
-                    "date": dp.date.isoformat(),
-                    "score": dp.score,
-                    "type": "unusually_high",
-                    "description": f"Mood score {dp.score} is unusually high compared to your typical range"
-                })
+        lower_bound, upper_bound = bounds
+        flagged = np.flatnonzero((values < lower_bound) | (values > upper_bound))
+        return [
+            anomaly_record(mood_data[i].date, mood_data[i].score, lower_bound, upper_bound)
+            for i in flagged
+        ]
 
-        return anomalies
+    def _weekday_means(
+        self,
+        mood_data: list[MoodDataPoint],
+        scores: np.ndarray
+    ) -> list[float]:
+        """Average mood per day of week, falling back to the overall average"""
+        weekdays = np.fromiter((d.date.weekday() for d in mood_data), dtype=np.int64, count=len(mood_data))
+        counts = np.bincount(weekdays, minlength=7)
+        sums = np.bincount(weekdays, weights=scores, minlength=7)
+        overall = float(scores.mean())
+        return [float(sums[day] / counts[day]) if counts[day] else overall for day in range(7)]
 
     def _get_weekly_pattern(
         self,
-        mood_data: List[MoodDataPoint],
+        mood_data: list[MoodDataPoint],
         target_weekday: int
     ) -> float:
         """Get average mood for a specific day of week"""
-        scores_for_day = [
-            d.score for d in mood_data
-            if d.date.weekday() == target_weekday
-        ]
-
-        if scores_for_day:
-            return statistics.mean(scores_for_day)
-
-        # Fallback to overall average
-        return statistics.mean([d.score for d in mood_data])
+        scores = np.fromiter((d.score for d in mood_data), dtype=np.float64, count=len(mood_data))
+        return self._weekday_means(mood_data, scores)[target_weekday]
 
     def _default_trend_analysis(self) -> TrendAnalysis:
         """Return default trend analysis when insufficient data"""
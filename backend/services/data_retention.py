@@ -1,90 +1,391 @@
-"""Data retention service for KIAAN chat messages.
+"""Data retention service.
 
-Implements automatic purging of soft-deleted chat data and expiration of
-old conversations based on configurable retention windows.
+Permanently purges data that has outlived its retention window. Each
+policy has its own window, read from the environment when a run starts:
 
-Policy:
-- Soft-deleted messages are permanently purged after CHAT_RETENTION_DAYS (default: 90).
-- Active (non-deleted) messages are preserved unless the user explicitly requests deletion.
-- Purge runs as a periodic background task (called from startup or scheduler).
+- chat_messages: soft-deleted KIAAN chat messages, CHAT_RETENTION_DAYS
+  (default: 90) after deletion.
+- chat_sessions: chat sessions started before the same cutoff that have no
+  messages left.
+- journal_blobs: soft-deleted encrypted journal blobs,
+  JOURNAL_BLOB_RETENTION_DAYS (default: 90) after deletion.
+- voice_analytics: daily voice analytics rows older than
+  VOICE_ANALYTICS_RETENTION_DAYS (default: 730).
+- episodic_memory: KIAAN episodic memories (kept in their own SQLite file)
+  older than EPISODIC_MEMORY_RETENTION_DAYS (default: 365).
+
+A window of 0 or less turns the policy off. Active (non-deleted) messages
+and journal blobs are preserved unless the user explicitly requests deletion.
+
+Rows are deleted in batches of RETENTION_BATCH_SIZE in primary-key order:
+select the next batch's keys, delete that key range with the retention
+condition checked again, and commit together with the policy's
+RetentionCheckpoint row, then sleep RETENTION_BATCH_SLEEP_MS. Locks are
+held for one batch at a time, and a run cut short (restart, timeout)
+resumes after the last committed key with the cutoff it started with.
+Orphaned sessions are found with a NOT EXISTS anti-join rather than by
+loading their ids. A lease on the checkpoint row, tagged with
+RETENTION_WORKER_ID, keeps two workers from purging the same policy at
+once; a run that fails or is cancelled hands its lease back, and a worker
+restarted under the same id reclaims its own lease without waiting it out.
+
+RetentionPurger runs a pass every RETENTION_INTERVAL_HOURS in the
+background (started from backend/main.py); for hosts that restart often,
+backend/scripts/run_retention_purge.py runs one pass from an external
+scheduler.
 
 This satisfies GDPR Article 17 (Right to Erasure) requirements — soft-deleted
 data does not persist indefinitely.
 """
 
+from __future__ import annotations
+
+import asyncio
+import contextlib
 import datetime
 import logging
 import os
+import socket
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
 
-from sqlalchemy import delete, select, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, exists, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted per batch; each batch is one short transaction
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+# Pause between batches so foreground queries get the database in between
+RETENTION_BATCH_SLEEP_MS = int(os.getenv("RETENTION_BATCH_SLEEP_MS", "50"))
+# Hours between background purge passes
+RETENTION_INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+# Delay before the first background pass so it does not compete with startup
+RETENTION_INITIAL_DELAY_SECONDS = int(os.getenv("RETENTION_INITIAL_DELAY_SECONDS", "120"))
+# How long a worker's claim on a policy lasts; renewed with every batch
+RETENTION_LEASE_SECONDS = int(os.getenv("RETENTION_LEASE_SECONDS", "300"))
+# Owner recorded on the lease; the same worker may reclaim it before it expires
+RETENTION_WORKER_ID = os.getenv("RETENTION_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
 
-async def purge_expired_chat_messages(db: AsyncSession) -> dict:
-    """Permanently delete soft-deleted chat messages older than the retention window.
+RETENTION_CLEANUP_ENABLED = os.getenv("RETENTION_CLEANUP_ENABLED", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
 
-    Args:
-        db: Async database session.
+# Policy name -> (env var holding its window in days, default), in run order
+RETENTION_POLICIES: dict[str, tuple[str, int]] = {
+    "chat_messages": ("CHAT_RETENTION_DAYS", 90),
+    "chat_sessions": ("CHAT_RETENTION_DAYS", 90),
+    "journal_blobs": ("JOURNAL_BLOB_RETENTION_DAYS", 90),
+    "voice_analytics": ("VOICE_ANALYTICS_RETENTION_DAYS", 730),
+    "episodic_memory": ("EPISODIC_MEMORY_RETENTION_DAYS", 365),
+}
 
-    Returns:
-        Dict with count of purged messages and sessions.
+# purge_batch(after_key, cutoff, limit) -> (last key, keys selected, rows deleted)
+PurgeBatch = Callable[[str | None, datetime.datetime, int], Awaitable[tuple[Any, int, int]]]
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.UTC)
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive datetimes for TIMESTAMP WITH TIME ZONE
+    return value if value.tzinfo else value.replace(tzinfo=datetime.UTC)
+
+
+def retention_days(policy: str) -> int:
+    env_var, default = RETENTION_POLICIES[policy]
+    return int(os.getenv(env_var, str(default)))
+
+
+def _table_batch(db: AsyncSession, table, expired) -> PurgeBatch:
+    """Batch step for a table with a single-column primary key."""
+    pk = next(iter(table.primary_key.columns))
+
+    async def purge_batch(after, cutoff, limit):
+        condition = expired(cutoff)
+        query = select(pk).where(condition).order_by(pk).limit(limit)
+        if after is not None:
+            query = query.where(pk > pk.type.python_type(after))
+        keys = (await db.execute(query)).scalars().all()
+        if not keys:
+            return None, 0, 0
+        result = await db.execute(
+            delete(table).where(pk.between(keys[0], keys[-1])).where(condition)
+        )
+        return keys[-1], len(keys), result.rowcount
+
+    return purge_batch
+
+
+def _table_batches(db: AsyncSession) -> dict[str, PurgeBatch]:
+    # Import here to avoid circular imports
+    from backend.models.ai import KiaanChatMessage, KiaanChatSession
+    from backend.models.journal import EncryptedBlob
+    from backend.models.voice import VoiceAnalytics
+
+    messages = KiaanChatMessage.__table__
+    sessions = KiaanChatSession.__table__
+    blobs = EncryptedBlob.__table__
+    voice = VoiceAnalytics.__table__
+    return {
+        "chat_messages": _table_batch(
+            db, messages, lambda cutoff: messages.c.deleted_at < cutoff
+        ),
+        "chat_sessions": _table_batch(
+            db, sessions, lambda cutoff: (sessions.c.started_at < cutoff)
+            & ~exists().where(messages.c.session_id == sessions.c.id)
+        ),
+        "journal_blobs": _table_batch(
+            db, blobs, lambda cutoff: blobs.c.deleted_at < cutoff
+        ),
+        "voice_analytics": _table_batch(
+            db, voice, lambda cutoff: voice.c.analytics_date < cutoff.date()
+        ),
+    }
+
+
+def _update_checkpoint(policy: str, *conditions, **values):
+    from backend.models.compliance import RetentionCheckpoint as RC
+
+    # The checkpoint is only read back as columns, never as a loaded object
+    return (
+        update(RC).where(RC.policy == policy, *conditions).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _claim(
+    db: AsyncSession, policy: str, cutoff: datetime.datetime
+) -> tuple[datetime.datetime, str | None, int, bool] | None:
+    """Lease the policy's checkpoint; return (cutoff, last_key, purged, resumed).
+
+    Returns None when another worker holds the lease. A run that did not
+    complete is resumed with its own cutoff; otherwise a new run starts.
     """
-    retention_days = int(os.getenv("CHAT_RETENTION_DAYS", "90"))
-    cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=retention_days)
+    from backend.models.compliance import RetentionCheckpoint as RC
 
-    purged_messages = 0
-    purged_sessions = 0
+    now = _now()
+    lease = now + datetime.timedelta(seconds=RETENTION_LEASE_SECONDS)
+    claimed = await db.execute(_update_checkpoint(
+        policy,
+        or_(
+            RC.lease_expires_at.is_(None),
+            RC.lease_expires_at < now,
+            RC.lease_owner == RETENTION_WORKER_ID,
+        ),
+        lease_expires_at=lease,
+        lease_owner=RETENTION_WORKER_ID,
+    ))
+    if claimed.rowcount == 0:
+        try:
+            await db.execute(insert(RC).values(
+                policy=policy, cutoff=cutoff, purged=0, started_at=now,
+                lease_expires_at=lease, lease_owner=RETENTION_WORKER_ID,
+            ))
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return None
+        return cutoff, None, 0, False
 
+    row = (await db.execute(
+        select(RC.cutoff, RC.last_key, RC.purged, RC.completed_at).where(RC.policy == policy)
+    )).one()
+    if row.completed_at is None:
+        await db.commit()
+        return _as_utc(row.cutoff), row.last_key, row.purged, True
+    await db.execute(_update_checkpoint(
+        policy, cutoff=cutoff, last_key=None, purged=0, started_at=now,
+        updated_at=None, completed_at=None,
+    ))
+    await db.commit()
+    return cutoff, None, 0, False
+
+
+async def _release(db: AsyncSession, policy: str) -> None:
+    """Give up this worker's lease on the policy, keeping its progress."""
+    from backend.models.compliance import RetentionCheckpoint as RC
+
+    await db.rollback()
+    await db.execute(_update_checkpoint(
+        policy, RC.lease_owner == RETENTION_WORKER_ID, lease_expires_at=None, lease_owner=None,
+    ))
+    await db.commit()
+
+
+async def _run_policy(
+    db: AsyncSession,
+    policy: str,
+    days: int,
+    purge_batch: PurgeBatch,
+    batch_size: int,
+    sleep_ms: int,
+) -> dict:
+    claim = await _claim(db, policy, _now() - datetime.timedelta(days=days))
+    if claim is None:
+        return {"skipped": "purge already running on another worker"}
+    cutoff, after, purged, resumed = claim
+
+    batches = 0
     try:
-        # Import here to avoid circular imports
-        from backend.models.ai import KiaanChatMessage, KiaanChatSession
+        while True:
+            last, selected, deleted = await purge_batch(after, cutoff, batch_size)
+            if last is None:
+                break
+            after = str(last)
+            purged += deleted
+            batches += 1
+            now = _now()
+            await db.execute(_update_checkpoint(
+                policy, last_key=after, purged=purged, updated_at=now,
+                lease_expires_at=now + datetime.timedelta(seconds=RETENTION_LEASE_SECONDS),
+            ))
+            await db.commit()
+            if selected < batch_size:
+                break
+            await asyncio.sleep(sleep_ms / 1000)
+    except BaseException:
+        # Includes cancellation by RetentionPurger.stop(); the committed
+        # checkpoint stays, so whichever worker claims next resumes from it
+        try:
+            await _release(db, policy)
+        except Exception as e:
+            logger.warning(f"Could not release the {policy} retention lease: {e}")
+        raise
 
-        # Purge soft-deleted messages older than retention window
-        stmt = (
-            delete(KiaanChatMessage)
-            .where(KiaanChatMessage.deleted_at.isnot(None))
-            .where(KiaanChatMessage.deleted_at < cutoff)
-        )
-        result = await db.execute(stmt)
-        purged_messages = result.rowcount
-
-        # Purge orphaned sessions with no remaining messages
-        orphan_subquery = (
-            select(KiaanChatSession.id)
-            .outerjoin(
-                KiaanChatMessage,
-                KiaanChatSession.id == KiaanChatMessage.session_id
+    now = _now()
+    await db.execute(_update_checkpoint(
+        policy, purged=purged, updated_at=now, completed_at=now,
+        lease_expires_at=None, lease_owner=None,
+    ))
+    await db.commit()
+    return {
+        "purged": purged,
+        "batches": batches,
+        "resumed": resumed,
+        "retention_days": days,
+        "cutoff": cutoff.isoformat(),
+    }
+
+
+async def _purge_episodic_memory(
+    db: AsyncSession, days: int, batch_size: int, sleep_ms: int, db_path: Path | None
+) -> dict:
+    from backend.services import kiaan_deep_memory
+
+    path = db_path or kiaan_deep_memory.EPISODIC_MEMORY_DB_PATH
+    if not kiaan_deep_memory.AIOSQLITE_AVAILABLE or not path.exists():
+        return {"skipped": "no episodic memory store"}
+
+    import aiosqlite
+
+    async with aiosqlite.connect(str(path)) as conn:
+        has_table = await (await conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'episodes'"
+        )).fetchone()
+        if not has_table:
+            return {"skipped": "no episodic memory store"}
+
+        # Timestamps are stored as UTC isoformat strings, which sort by time
+        async def purge_batch(after, cutoff, limit):
+            stamp = cutoff.isoformat()
+            rows = await (await conn.execute(
+                "SELECT id FROM episodes WHERE timestamp < ? AND id > ? ORDER BY id LIMIT ?",
+                (stamp, after or "", limit),
+            )).fetchall()
+            if not rows:
+                return None, 0, 0
+            cursor = await conn.execute(
+                "DELETE FROM episodes WHERE id BETWEEN ? AND ? AND timestamp < ?",
+                (rows[0][0], rows[-1][0], stamp),
             )
-            .where(KiaanChatMessage.id.is_(None))
-            .where(KiaanChatSession.started_at < cutoff)
+            await conn.commit()
+            return rows[-1][0], len(rows), cursor.rowcount
+
+        result = await _run_policy(db, "episodic_memory", days, purge_batch, batch_size, sleep_ms)
+
+    if "cutoff" in result:
+        kiaan_deep_memory.deep_memory.episodic.evict_before(
+            datetime.datetime.fromisoformat(result["cutoff"])
         )
-        orphan_ids = (await db.execute(orphan_subquery)).scalars().all()
+    return result
 
-        if orphan_ids:
-            await db.execute(
-                delete(KiaanChatSession).where(KiaanChatSession.id.in_(orphan_ids))
-            )
-            purged_sessions = len(orphan_ids)
 
-        await db.commit()
+async def purge_expired_data(
+    db: AsyncSession,
+    policies: list[str] | None = None,
+    batch_size: int | None = None,
+    sleep_ms: int | None = None,
+    episodic_db_path: Path | None = None,
+) -> dict[str, dict]:
+    """Run the retention policies in order, each in bounded batches.
+
+    Args:
+        db: Async database session (also holds the checkpoints).
+        policies: Names from RETENTION_POLICIES; all of them by default.
+        batch_size: Rows per batch (default RETENTION_BATCH_SIZE).
+        sleep_ms: Pause between batches (default RETENTION_BATCH_SLEEP_MS).
+        episodic_db_path: Episodic memory SQLite file, if not the default.
+
+    Returns:
+        Dict of policy name to its result: purged / batches / resumed /
+        retention_days / cutoff, or ``skipped`` or ``error``.
+    """
+    batch_size = batch_size or RETENTION_BATCH_SIZE
+    sleep_ms = RETENTION_BATCH_SLEEP_MS if sleep_ms is None else sleep_ms
+    batches = _table_batches(db)
+    results: dict[str, dict] = {}
 
-        if purged_messages or purged_sessions:
+    for policy in policies or list(RETENTION_POLICIES):
+        days = retention_days(policy)
+        if days <= 0:
+            results[policy] = {"skipped": "retention disabled"}
+            continue
+        try:
+            if policy == "episodic_memory":
+                result = await _purge_episodic_memory(db, days, batch_size, sleep_ms, episodic_db_path)
+            else:
+                result = await _run_policy(db, policy, days, batches[policy], batch_size, sleep_ms)
+        except Exception as e:
+            logger.error(f"Data retention purge of {policy} failed: {e}")
+            await db.rollback()
+            result = {"error": str(e)}
+        results[policy] = result
+        if result.get("purged"):
             logger.info(
-                f"Data retention: purged {purged_messages} messages and "
-                f"{purged_sessions} orphaned sessions (retention={retention_days}d)"
+                f"Data retention: purged {result['purged']} {policy} rows in "
+                f"{result['batches']} batches (retention={days}d)"
             )
+    return results
 
-    except Exception as e:
-        logger.error(f"Data retention purge failed: {e}")
-        await db.rollback()
 
+async def purge_expired_chat_messages(db: AsyncSession) -> dict:
+    """Permanently delete soft-deleted chat messages older than the retention window.
+
+    Runs the chat_messages and chat_sessions policies of purge_expired_data().
+
+    Args:
+        db: Async database session.
+
+    Returns:
+        Dict with count of purged messages and sessions.
+    """
+    days = retention_days("chat_messages")
+    results = await purge_expired_data(db, policies=["chat_messages", "chat_sessions"])
+    messages, sessions = results["chat_messages"], results["chat_sessions"]
+    cutoff = messages.get("cutoff") or (
+        _now() - datetime.timedelta(days=days)
+    ).isoformat()
     return {
-        "purged_messages": purged_messages,
-        "purged_sessions": purged_sessions,
-        "retention_days": retention_days,
-        "cutoff": cutoff.isoformat(),
+        "purged_messages": messages.get("purged", 0),
+        "purged_sessions": sessions.get("purged", 0),
+        "retention_days": days,
+        "cutoff": cutoff,
     }
 
 
@@ -128,3 +429,72 @@ async def get_retention_stats(db: AsyncSession) -> dict:
     except Exception as e:
         logger.error(f"Failed to get retention stats: {e}")
         return {"error": str(e)}
+
+
+class RetentionPurger:
+    """In-process async loop that runs :func:`purge_expired_data`."""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._last_run: datetime.datetime | None = None
+        self._last_results: dict[str, dict] = {}
+
+    async def start(self, session_maker: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Start the background loop unless RETENTION_CLEANUP_ENABLED is off."""
+        if self._running or not RETENTION_CLEANUP_ENABLED:
+            return
+        if session_maker is None:
+            # Import lazily so this module has no import-time dependency on
+            # the DB engine (matters for unit tests).
+            from backend import deps
+
+            session_maker = deps.SessionLocal
+        self._session_maker = session_maker
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name="data_retention")
+        logger.info(f"[Retention] Purger started (every {RETENTION_INTERVAL_HOURS:g}h)")
+
+    async def stop(self) -> None:
+        """Cancel the loop; an unfinished pass releases its lease and resumes
+        from its checkpoint on the next start."""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        logger.info("[Retention] Purger stopped")
+
+    async def run_once(self) -> dict[str, dict]:
+        assert self._session_maker is not None
+        async with self._session_maker() as db:
+            self._last_results = await purge_expired_data(db)
+        self._last_run = _now()
+        return self._last_results
+
+    async def _loop(self) -> None:
+        await asyncio.sleep(RETENTION_INITIAL_DELAY_SECONDS)
+        while self._running:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[Retention] Purge pass failed (will retry): {e}")
+            await asyncio.sleep(RETENTION_INTERVAL_HOURS * 3600)
+
+    @property
+    def status(self) -> dict[str, object]:
+        return {
+            "enabled": RETENTION_CLEANUP_ENABLED,
+            "running": self._running,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_results": dict(self._last_results),
+            "interval_hours": RETENTION_INTERVAL_HOURS,
+        }
+
+
+# Module-level singleton, wired up from ``backend/main.py``.
+retention_purger = RetentionPurger()
@@ -674,10 +674,19 @@ class DivineConversationEngine:
         """
         # Import Whisper service (will be created)
         try:
-            from backend.services.whisper_transcription import transcribe_audio
+            from backend.services.whisper_transcription import (
+                WhisperQueueFull,
+                transcribe_audio,
+            )
 
             # Transcribe audio
-            transcription = await transcribe_audio(audio_data)
+            try:
+                transcription = await transcribe_audio(audio_data)
+            except WhisperQueueFull:
+                return DivineResponse(
+                    text="I'm listening to many voices right now. Could you try again in a moment?",
+                    voice_emotion="gentle"
+                ), {"text": "", "error": "Speech recognition busy"}
             text = transcription.get("text", "")
 
             if not text:
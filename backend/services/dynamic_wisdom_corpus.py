@@ -19,17 +19,26 @@ ARCHITECTURE:
 ENTERPRISE UPGRADES (v3.1):
   - Batch write buffer: deliveries are buffered in-memory and flushed in bulk
     on a timer or when capacity is hit, reducing DB write pressure ~10x.
+    Once start() runs, the buffer is the crash-safe write-behind log
+    (backend/services/write_behind.py) instead, so deliveries survive a
+    killed worker and are never dropped while the DB is behind.
   - Confidence-weighted learning: verses with as few as 2 records can rank,
     but their effectiveness is scaled by sample-size confidence so low-evidence
     verses don't overshadow proven ones.
   - Telemetry: structured metrics (deliveries, flushes, hit rate) exposed
     via get_runtime_metrics() for the admin dashboard.
+  - Effectiveness rollups: running sums/counts per (mood, verse) are kept in
+    wisdom_effectiveness_rollups by the same transactions that write
+    deliveries and outcomes, so ranking reads the top-k rows for a mood
+    instead of aggregating every wisdom_effectiveness row. Cached rankings
+    expire per mood.
 """
 
 import asyncio
 import contextlib
 import datetime
 import logging
+import os
 import random
 import re
 import time
@@ -37,9 +46,12 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Any
 
+from sqlalchemy import delete, select
 from sqlalchemy import func as sa_func
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.core.db_utils import dialect_insert
+from backend.services.write_behind import WriteBehindLog
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +108,10 @@ _EFFECTIVENESS_CACHE_TTL = 300  # 5 minutes
 BATCH_FLUSH_SIZE = 100               # records that trigger an immediate flush
 BATCH_FLUSH_INTERVAL_SEC = 60.0      # max time records sit in buffer
 BATCH_MAX_BUFFER_SIZE = 1000         # hard cap; oldest records flushed first
+# After start(), buffer deliveries in the on-disk write-behind log instead
+WISDOM_WRITE_BEHIND_ENABLED = os.getenv(
+    "WISDOM_WRITE_BEHIND_ENABLED", "true"
+).lower() in ("1", "true", "yes")
 
 # Positive engagement keywords (detected in user's follow-up message)
 _POSITIVE_ENGAGEMENT_PATTERNS = re.compile(
@@ -215,9 +231,10 @@ class DynamicWisdomCorpus:
     """
 
     def __init__(self) -> None:
-        # In-memory cache: (mood, verse_ref) → effectiveness score
-        self._effectiveness_cache: dict[str, dict[str, float]] = {}
-        self._cache_timestamp: float = 0
+        # In-memory cache: mood → ranked (verse_ref, weighted score), each
+        # mood expiring _EFFECTIVENESS_CACHE_TTL after it was loaded
+        self._effectiveness_cache: dict[str, list[tuple[str, float]]] = {}
+        self._cache_loaded_at: dict[str, float] = {}
         # Track which verses have been effective per mood (global across users)
         self._global_effectiveness: dict[str, list[tuple[str, float]]] = {}
 
@@ -227,6 +244,8 @@ class DynamicWisdomCorpus:
         self._flush_task: asyncio.Task | None = None
         self._stopped: bool = False
         self._last_flush_at: float = time.monotonic()
+        # Crash-safe replacement for the buffer, set up by start()
+        self._log: WriteBehindLog | None = None
 
         # ─── Telemetry counters (cumulative since process start) ───────
         self._metrics: dict[str, int | float] = {
@@ -454,6 +473,14 @@ class DynamicWisdomCorpus:
         if delivery_channel.startswith("voice_"):
             self._metrics["voice_deliveries_total"] += 1
 
+        if self._log is not None and self._log.running:
+            # The write-behind log batches and flushes on its own
+            if self._log.append(pending.to_orm_kwargs()):
+                self._metrics["deliveries_buffered"] += 1
+            else:
+                self._metrics["deliveries_failed"] += 1
+            return
+
         async with self._buffer_lock:
             self._delivery_buffer.append(pending)
             self._metrics["deliveries_buffered"] += 1
@@ -559,6 +586,14 @@ class DynamicWisdomCorpus:
             record.engagement_score = engagement
             record.effectiveness = engagement
             record.outcome_recorded_at = datetime.datetime.now(datetime.timezone.utc)
+            await self._add_to_rollups(db, [{
+                "mood": mood_before,
+                "verse_ref": record.verse_ref,
+                "deliveries": 0,
+                "outcome_count": 1,
+                "effectiveness_sum": engagement,
+                "avg_effectiveness": engagement,
+            }])
 
             # Voice-channel outcomes
             if cleaned_voice is not None:
@@ -581,8 +616,8 @@ class DynamicWisdomCorpus:
                 f", voice_signals={list(cleaned_voice.keys())}" if cleaned_voice else "",
             )
 
-            # Invalidate cache so next selection uses fresh data
-            self._cache_timestamp = 0
+            # Invalidate this mood's ranking so next selection uses fresh data
+            self._cache_loaded_at.pop(mood_before, None)
 
         except Exception as e:
             self._metrics["outcomes_failed"] += 1
@@ -668,34 +703,30 @@ class DynamicWisdomCorpus:
         now = time.monotonic()
 
         # Check cache
+        loaded_at = self._cache_loaded_at.get(mood)
         if (
             mood in self._effectiveness_cache
-            and (now - self._cache_timestamp) < _EFFECTIVENESS_CACHE_TTL
+            and loaded_at is not None
+            and (now - loaded_at) < _EFFECTIVENESS_CACHE_TTL
         ):
             self._metrics["cache_hits"] += 1
             return self._effectiveness_cache[mood]
 
         self._metrics["cache_misses"] += 1
 
-        # Query aggregated effectiveness from DB
-        from backend.models.wisdom import WisdomEffectiveness
+        # Top-k read from the per-(mood, verse) rollup
+        from backend.models.wisdom import WisdomEffectivenessRollup as Rollup
 
         try:
             # Pull a wider candidate set so confidence weighting can re-rank
             # before we trim to TOP_EFFECTIVENESS_CANDIDATES.
             result = await db.execute(
-                select(
-                    WisdomEffectiveness.verse_ref,
-                    sa_func.avg(WisdomEffectiveness.effectiveness).label("avg_eff"),
-                    sa_func.count().label("record_count"),
-                )
+                select(Rollup.verse_ref, Rollup.avg_effectiveness, Rollup.outcome_count)
                 .where(
-                    WisdomEffectiveness.mood_at_delivery == mood,
-                    WisdomEffectiveness.effectiveness.isnot(None),
+                    Rollup.mood == mood,
+                    Rollup.outcome_count >= MIN_RECORDS_FOR_LEARNING,
                 )
-                .group_by(WisdomEffectiveness.verse_ref)
-                .having(sa_func.count() >= MIN_RECORDS_FOR_LEARNING)
-                .order_by(sa_func.avg(WisdomEffectiveness.effectiveness).desc())
+                .order_by(Rollup.avg_effectiveness.desc())
                 .limit(TOP_EFFECTIVENESS_CANDIDATES * 3)
             )
             rows = result.all()
@@ -704,6 +735,8 @@ class DynamicWisdomCorpus:
             return []
 
         if not rows:
+            self._effectiveness_cache[mood] = []
+            self._cache_loaded_at[mood] = now
             return []
 
         # Confidence-weighted re-ranking
@@ -719,7 +752,7 @@ class DynamicWisdomCorpus:
 
         # Update cache
         self._effectiveness_cache[mood] = scores
-        self._cache_timestamp = now
+        self._cache_loaded_at[mood] = now
 
         logger.debug(
             f"DynamicWisdom: Loaded {len(scores)} effective verses for mood={mood}, "
@@ -727,6 +760,80 @@ class DynamicWisdomCorpus:
         )
         return scores
 
+    @staticmethod
+    async def _add_to_rollups(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Add deliveries / outcomes to the (mood, verse) rollups, in db's transaction."""
+        from backend.models.wisdom import WisdomEffectivenessRollup
+
+        if not rows:
+            return
+        table = WisdomEffectivenessRollup.__table__
+        upsert = dialect_insert(db)(table)
+        outcome_count = table.c.outcome_count + upsert.excluded.outcome_count
+        effectiveness_sum = table.c.effectiveness_sum + upsert.excluded.effectiveness_sum
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[table.c.mood, table.c.verse_ref],
+            set_={
+                "deliveries": table.c.deliveries + upsert.excluded.deliveries,
+                "outcome_count": outcome_count,
+                "effectiveness_sum": effectiveness_sum,
+                "avg_effectiveness": sa_func.coalesce(
+                    effectiveness_sum / sa_func.nullif(outcome_count, 0),
+                    table.c.avg_effectiveness,
+                ),
+                "updated_at": sa_func.now(),
+            },
+        )
+        await db.execute(upsert, rows)
+
+    async def rebuild_effectiveness_rollups(self, db: AsyncSession) -> dict[str, int]:
+        """Recompute wisdom_effectiveness_rollups from wisdom_effectiveness.
+
+        Backfills the rollups for rows written before they existed and
+        repairs drift. One mood per transaction (delete + INSERT ... SELECT),
+        so live writers only wait on the mood being rebuilt. The insert
+        overwrites on conflict, so a row a concurrent flush adds between
+        the delete and the insert does not abort the rebuild.
+        """
+        from backend.models.wisdom import WisdomEffectiveness as Effectiveness
+        from backend.models.wisdom import WisdomEffectivenessRollup as Rollup
+
+        moods = (await db.execute(
+            select(Effectiveness.mood_at_delivery).distinct()
+        )).scalars().all()
+        await db.rollback()
+
+        stats = {"moods": 0, "rows": 0}
+        for mood in moods:
+            await db.execute(delete(Rollup).where(Rollup.mood == mood))
+            aggregate = (
+                select(
+                    Effectiveness.mood_at_delivery,
+                    Effectiveness.verse_ref,
+                    sa_func.count(),
+                    sa_func.count(Effectiveness.effectiveness),
+                    sa_func.coalesce(sa_func.sum(Effectiveness.effectiveness), 0.0),
+                    sa_func.avg(Effectiveness.effectiveness),
+                )
+                .where(Effectiveness.mood_at_delivery == mood)
+                .group_by(Effectiveness.mood_at_delivery, Effectiveness.verse_ref)
+            )
+            columns = ["deliveries", "outcome_count", "effectiveness_sum", "avg_effectiveness"]
+            rebuild = dialect_insert(db)(Rollup).from_select(["mood", "verse_ref", *columns], aggregate)
+            result = await db.execute(rebuild.on_conflict_do_update(
+                index_elements=[Rollup.mood, Rollup.verse_ref],
+                set_={
+                    **{c: getattr(rebuild.excluded, c) for c in columns},
+                    "updated_at": sa_func.now(),
+                },
+            ))
+            await db.commit()
+            self._cache_loaded_at.pop(mood, None)
+            stats["moods"] += 1
+            stats["rows"] += max(result.rowcount or 0, 0)
+            logger.info(f"DynamicWisdom: Rebuilt effectiveness rollups for mood={mood}")
+        return stats
+
     async def _resolve_verse(
         self,
         db: AsyncSession,
@@ -809,8 +916,12 @@ class DynamicWisdomCorpus:
         """Drain the delivery buffer into the DB in a single bulk insert.
 
         Returns the number of records flushed. Safe to call concurrently —
-        the lock guarantees a single in-flight flush.
+        the lock guarantees a single in-flight flush. Once start() has run,
+        this flushes the write-behind log instead.
         """
+        if self._log is not None and self._log.running:
+            return await self._log.flush()
+
         # Snapshot under lock so we don't hold it during the DB round-trip
         async with self._buffer_lock:
             if not self._delivery_buffer:
@@ -819,13 +930,12 @@ class DynamicWisdomCorpus:
             self._delivery_buffer = []
 
         from backend.deps import SessionLocal
-        from backend.models.wisdom import WisdomEffectiveness
 
         flushed = 0
         try:
             async with SessionLocal() as session:
-                session.add_all(
-                    [WisdomEffectiveness(**p.to_orm_kwargs()) for p in pending]
+                await self._write_deliveries(
+                    session, [p.to_orm_kwargs() for p in pending]
                 )
                 await session.commit()
                 flushed = len(pending)
@@ -853,6 +963,56 @@ class DynamicWisdomCorpus:
 
         return flushed
 
+    async def _write_deliveries(
+        self, session: AsyncSession, rows: list[dict[str, Any]]
+    ) -> None:
+        """Multi-row insert of delivery rows plus their rollup counts (no commit)."""
+        from backend.models.wisdom import WisdomEffectiveness
+
+        await session.execute(WisdomEffectiveness.__table__.insert(), rows)
+        deliveries: dict[tuple[str, str], int] = {}
+        for row in rows:
+            key = (row["mood_at_delivery"], row["verse_ref"])
+            deliveries[key] = deliveries.get(key, 0) + 1
+        await self._add_to_rollups(session, [
+            {
+                "mood": mood,
+                "verse_ref": verse_ref,
+                "deliveries": count,
+                "outcome_count": 0,
+                "effectiveness_sum": 0.0,
+                "avg_effectiveness": None,
+            }
+            for (mood, verse_ref), count in sorted(deliveries.items())
+        ])
+
+    async def _write_logged_deliveries(
+        self, session: AsyncSession, records: list[dict[str, Any]]
+    ) -> None:
+        """write_rows callback for the write-behind log (JSON records)."""
+        for record in records:
+            record["delivered_at"] = datetime.datetime.fromisoformat(record["delivered_at"])
+        await self._write_deliveries(session, records)
+
+    async def start(
+        self, session_maker: async_sessionmaker[AsyncSession] | None = None
+    ) -> None:
+        """Buffer deliveries in the crash-safe write-behind log from now on.
+
+        Starting the log replays segments left behind by killed workers.
+        Deliveries already buffered in memory are moved into the log.
+        No-op when WISDOM_WRITE_BEHIND_ENABLED is off.
+        """
+        if not WISDOM_WRITE_BEHIND_ENABLED or (self._log is not None and self._log.running):
+            return
+        self._stopped = False
+        self._log = WriteBehindLog("wisdom_deliveries", self._write_logged_deliveries)
+        await self._log.start(session_maker)
+        async with self._buffer_lock:
+            pending, self._delivery_buffer = self._delivery_buffer, []
+        for p in pending:
+            self._log.append(p.to_orm_kwargs())
+
     async def stop(self) -> None:
         """Drain the buffer and stop the background flush task.
 
@@ -866,6 +1026,8 @@ class DynamicWisdomCorpus:
                 await self._flush_task
         # Final drain
         await self._flush_buffer()
+        if self._log is not None:
+            await self._log.stop()
 
     def get_runtime_metrics(self) -> dict[str, Any]:
         """Snapshot of cumulative counters + live buffer state.
@@ -884,14 +1046,22 @@ class DynamicWisdomCorpus:
         cache_hit_rate = (
             self._metrics["cache_hits"] / cache_total if cache_total > 0 else None
         )
+        write_behind = self._log.status if self._log is not None else None
+        metrics = dict(self._metrics)
+        buffer_depth = len(self._delivery_buffer)
+        seconds_since_last_flush = round(time.monotonic() - self._last_flush_at, 2)
+        if write_behind is not None:
+            metrics["deliveries_flushed"] += write_behind["written"]
+            buffer_depth += write_behind["backlog_records"]
+            if write_behind["seconds_since_last_flush"] is not None:
+                seconds_since_last_flush = write_behind["seconds_since_last_flush"]
         return {
-            **self._metrics,
-            "buffer_depth": len(self._delivery_buffer),
+            **metrics,
+            "buffer_depth": buffer_depth,
             "buffer_capacity": BATCH_FLUSH_SIZE,
             "buffer_max": BATCH_MAX_BUFFER_SIZE,
-            "seconds_since_last_flush": round(
-                time.monotonic() - self._last_flush_at, 2
-            ),
+            "seconds_since_last_flush": seconds_since_last_flush,
+            "write_behind": write_behind,
             "selection_hit_rate": (
                 round(hit_rate, 3) if hit_rate is not None else None
             ),
@@ -0,0 +1,258 @@
+"""Per-user entitlement snapshots for the subscription feature gates.
+
+The feature_access dependencies used to re-derive a user's entitlements on
+every gated request: get_or_create_free_subscription (subscription + plan),
+is_developer (users row) and get_user_tier (developer check + subscription
++ plan again), once per stacked dependency. get_entitlements() computes the
+answer once and reuses it at three levels:
+
+1. ``request.state`` - every gate in one request shares one snapshot.
+2. In-process - a bounded map trusted for ENTITLEMENT_CACHE_TTL_SECONDS.
+3. Redis - a JSON snapshot stamped with the user's entitlement version.
+
+invalidate_entitlements(user_id) drops the local entry and bumps the
+version in Redis, so every other instance rejects its Redis snapshot as
+soon as its local entry expires. A snapshot computed from rows read before
+an invalidation carries the old version and is never trusted afterwards.
+Without Redis only the in-process level is used.
+
+Call invalidate_entitlements() after anything that changes a user's plan
+or subscription status (upgrade_subscription and update_subscription_status
+do so themselves, which covers the payment webhooks).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config.feature_config import (
+    get_kiaan_quota,
+    get_tier_features,
+    get_wisdom_journeys_limit,
+)
+from backend.models import SubscriptionStatus, SubscriptionTier
+
+logger = logging.getLogger(__name__)
+
+# How long an instance trusts its local snapshot without consulting Redis;
+# bounds how long other instances can serve a plan that was just changed
+ENTITLEMENT_CACHE_TTL_SECONDS = float(os.getenv("ENTITLEMENT_CACHE_TTL_SECONDS", "10"))
+# Lifetime of the shared snapshot in Redis
+ENTITLEMENT_REDIS_TTL_SECONDS = int(os.getenv("ENTITLEMENT_REDIS_TTL_SECONDS", "300"))
+# Upper bound on locally cached users; least recently used go first
+ENTITLEMENT_CACHE_MAX_ENTRIES = int(os.getenv("ENTITLEMENT_CACHE_MAX_ENTRIES", "50000"))
+
+
+def _snapshot_key(user_id: str) -> str:
+    return f"entitlements:{user_id}"
+
+
+def _version_key(user_id: str) -> str:
+    return f"entitlements:version:{user_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class Entitlements:
+    """What a user may do, as the feature gates see it."""
+
+    user_id: str
+    tier: SubscriptionTier  # effective tier: SIDDHA for developers
+    status: SubscriptionStatus  # status of the subscription row
+    is_developer: bool
+    version: int = 0
+
+    @property
+    def features(self) -> dict[str, Any]:
+        return get_tier_features(self.tier)
+
+    @property
+    def kiaan_quota(self) -> int:
+        return get_kiaan_quota(self.tier)
+
+    @property
+    def wisdom_journeys_limit(self) -> int:
+        return get_wisdom_journeys_limit(self.tier)
+
+    def has_feature(self, feature: str) -> bool:
+        """Same answer as subscription_service.check_feature_access."""
+        return self.features.get(feature, False)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "user_id": self.user_id,
+            "tier": self.tier.value,
+            "status": self.status.value,
+            "is_developer": self.is_developer,
+            "version": self.version,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> Entitlements:
+        data = json.loads(raw)
+        return cls(
+            user_id=data["user_id"],
+            tier=SubscriptionTier(data["tier"]),
+            status=SubscriptionStatus(data["status"]),
+            is_developer=data["is_developer"],
+            version=data["version"],
+        )
+
+
+class _LocalCache:
+    """Bounded TTL map of snapshots with per-user invalidation fencing."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Entitlements, float]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, user_id: str) -> int:
+        return self._generations.get(user_id, 0)
+
+    def get(self, user_id: str) -> Entitlements | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    def put(self, snapshot: Entitlements, generation: int) -> None:
+        if self.ttl_seconds <= 0 or self.generation(snapshot.user_id) != generation:
+            return
+        self._entries[snapshot.user_id] = (snapshot, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(snapshot.user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._generations[user_id] = self.generation(user_id) + 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+
+
+_local = _LocalCache(ENTITLEMENT_CACHE_TTL_SECONDS, ENTITLEMENT_CACHE_MAX_ENTRIES)
+
+
+async def _redis():
+    try:
+        from backend.cache.redis_cache import get_redis_cache
+
+        redis = await get_redis_cache()
+        return redis if redis.is_connected else None
+    except Exception:
+        return None
+
+
+async def _load(db: AsyncSession, user_id: str, version: int) -> Entitlements:
+    """Derive entitlements from the database, as get_user_tier does."""
+    from backend.middleware.feature_access import is_developer
+    from backend.services.subscription_service import (
+        get_or_create_free_subscription,
+        get_user_subscription,
+    )
+
+    subscription = await get_user_subscription(db, user_id)
+    if subscription is None:
+        # Auto-assign the free tier (raises ValueError for unknown users)
+        subscription = await get_or_create_free_subscription(db, user_id)
+        plan_tier = SubscriptionTier.FREE
+    else:
+        plan_tier = subscription.plan.tier if subscription.plan else SubscriptionTier.FREE
+
+    developer = await is_developer(db, user_id)
+    if developer:
+        tier = SubscriptionTier.SIDDHA
+    elif subscription.status != SubscriptionStatus.ACTIVE:
+        tier = SubscriptionTier.FREE
+    else:
+        tier = plan_tier
+
+    return Entitlements(
+        user_id=user_id,
+        tier=tier,
+        status=subscription.status,
+        is_developer=developer,
+        version=version,
+    )
+
+
+async def get_entitlements(
+    db: AsyncSession, user_id: str, request: Request | None = None
+) -> Entitlements:
+    """Return the user's entitlement snapshot, computing it at most once per request.
+
+    Ensures the user has a subscription (auto-assigning the free tier), like
+    get_or_create_free_subscription.
+
+    Raises:
+        ValueError: If the user does not exist.
+    """
+    memo = getattr(request.state, "entitlements", None) if request is not None else None
+    if isinstance(memo, dict) and user_id in memo:
+        return memo[user_id]
+
+    snapshot = _local.get(user_id)
+    if snapshot is None:
+        generation = _local.generation(user_id)
+        redis = await _redis()
+        version = 0
+        if redis is not None:
+            raw_snapshot, raw_version = await _mget(redis, _snapshot_key(user_id), _version_key(user_id))
+            version = int(raw_version or 0)
+            if raw_snapshot:
+                cached = Entitlements.from_json(raw_snapshot)
+                if cached.version == version:
+                    snapshot = cached
+
+        if snapshot is None:
+            snapshot = await _load(db, user_id, version)
+            if redis is not None:
+                await redis.set(_snapshot_key(user_id), snapshot.to_json(), ENTITLEMENT_REDIS_TTL_SECONDS)
+        _local.put(snapshot, generation)
+
+    if request is not None:
+        if not isinstance(memo, dict):
+            memo = request.state.entitlements = {}
+        memo[user_id] = snapshot
+    return snapshot
+
+
+async def _mget(redis, *keys: str) -> list[str | None]:
+    """Fetch several keys in one round trip; misses on error."""
+    try:
+        return list(await redis.get_client().mget(keys))
+    except Exception as e:
+        logger.warning(f"Entitlement snapshot lookup failed: {e}")
+        return [None] * len(keys)
+
+
+async def invalidate_entitlements(user_id: str) -> None:
+    """Forget a user's snapshot here and make every instance's copy stale."""
+    _local.invalidate(user_id)
+    redis = await _redis()
+    if redis is None:
+        return
+    if await redis.incr(_version_key(user_id)) is None:
+        logger.warning(f"Entitlement version not bumped for user {user_id[:8]}")
+    await redis.delete(_snapshot_key(user_id))
+
+
+def clear_local_entitlements() -> None:
+    """Drop every in-process snapshot (tests and maintenance scripts)."""
+    _local.clear()
@@ -7,6 +7,7 @@ Expo Push API docs: https://docs.expo.dev/push-notifications/sending-notificatio
 
 Features:
 - Chunked sending (max 100 messages per request)
+- Batch sender with retry/backoff on 429/5xx for bulk campaigns
 - Expo push token format validation (ExponentPushToken[xxx])
 - Error handling with DeviceNotRegistered detection
 - Async HTTP via httpx
@@ -24,17 +25,30 @@ Usage:
     )
 """
 
+import asyncio
 import logging
+import os
+import random
 from typing import Any
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Overridable so campaigns can be exercised against a local stub of the API
+EXPO_PUSH_URL = os.getenv("EXPO_PUSH_URL", "https://exp.host/--/api/v2/push/send")
 EXPO_RECEIPTS_URL = "https://exp.host/--/api/v2/push/getReceipts"
 MAX_CHUNK_SIZE = 100
 REQUEST_TIMEOUT = 30.0
+# Retries for a single batch on 429 / 5xx / transport errors
+EXPO_MAX_RETRIES = int(os.getenv("EXPO_PUSH_MAX_RETRIES", "3"))
+EXPO_RETRY_BASE_DELAY = float(os.getenv("EXPO_PUSH_RETRY_BASE_DELAY", "0.5"))
+
+_EXPO_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+}
 
 
 def _is_valid_expo_token(token: str) -> bool:
@@ -42,6 +56,33 @@ def _is_valid_expo_token(token: str) -> bool:
     return token.startswith("ExponentPushToken[") and token.endswith("]")
 
 
+def build_expo_message(
+    token: str,
+    title: str,
+    body: str,
+    data: dict[str, Any] | None = None,
+    channel_id: str | None = None,
+    category_id: str | None = None,
+    priority: str = "default",
+    sound: str = "default",
+) -> dict[str, Any]:
+    """Build one Expo push message payload."""
+    msg: dict[str, Any] = {
+        "to": token,
+        "title": title,
+        "body": body,
+        "sound": sound,
+        "priority": priority,
+    }
+    if data:
+        msg["data"] = data
+    if channel_id:
+        msg["channelId"] = channel_id
+    if category_id:
+        msg["categoryId"] = category_id
+    return msg
+
+
 async def send_expo_push(
     tokens: list[str],
     title: str,
@@ -81,22 +122,12 @@ async def send_expo_push(
         return []
 
     # Build message payloads
-    messages: list[dict[str, Any]] = []
-    for token in valid_tokens:
-        msg: dict[str, Any] = {
-            "to": token,
-            "title": title,
-            "body": body,
-            "sound": sound,
-            "priority": priority,
-        }
-        if data:
-            msg["data"] = data
-        if channel_id:
-            msg["channelId"] = channel_id
-        if category_id:
-            msg["categoryId"] = category_id
-        messages.append(msg)
+    messages = [
+        build_expo_message(
+            token, title, body, data, channel_id, category_id, priority, sound
+        )
+        for token in valid_tokens
+    ]
 
     # Send in chunks of MAX_CHUNK_SIZE
     all_tickets: list[dict[str, Any]] = []
@@ -106,13 +137,7 @@ async def send_expo_push(
             chunk = messages[i : i + MAX_CHUNK_SIZE]
             try:
                 response = await client.post(
-                    EXPO_PUSH_URL,
-                    json=chunk,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/json",
-                        "Accept-Encoding": "gzip, deflate",
-                    },
+                    EXPO_PUSH_URL, json=chunk, headers=_EXPO_HEADERS
                 )
                 response.raise_for_status()
                 result = response.json()
@@ -148,6 +173,70 @@ async def send_expo_push(
     return all_tickets
 
 
+async def send_expo_batch(
+    client: httpx.AsyncClient,
+    messages: list[dict[str, Any]],
+    max_retries: int = EXPO_MAX_RETRIES,
+) -> list[dict[str, Any]] | None:
+    """POST one batch (<= MAX_CHUNK_SIZE messages) with retry and backoff.
+
+    Retries on 429, 5xx and transport errors with exponential backoff and
+    jitter, honouring ``Retry-After`` when Expo sends it. Other 4xx
+    responses are not retried.
+
+    Returns:
+        The batch's tickets (one per message, in order), or None if the
+        batch could not be delivered.
+    """
+    for attempt in range(max_retries + 1):
+        delay = EXPO_RETRY_BASE_DELAY * (2**attempt) * (0.5 + random.random())
+        try:
+            response = await client.post(
+                EXPO_PUSH_URL, json=messages, headers=_EXPO_HEADERS
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = float(retry_after)
+                raise httpx.HTTPStatusError(
+                    f"Expo returned {response.status_code}",
+                    request=response.request,
+                    response=response,
+                )
+            response.raise_for_status()
+            return response.json().get("data", [])
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            if status_code != 429 and status_code < 500:
+                logger.error(
+                    "Expo Push API HTTP error: %s %s",
+                    status_code,
+                    e.response.text[:200],
+                )
+                return None
+            error: Exception = e
+        except httpx.HTTPError as e:
+            error = e
+
+        if attempt < max_retries:
+            logger.warning(
+                "Expo push batch attempt %d/%d failed (%s) — retrying in %.2fs",
+                attempt + 1,
+                max_retries + 1,
+                error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    logger.error(
+        "Expo push batch of %d messages failed after %d attempts: %s",
+        len(messages),
+        max_retries + 1,
+        error,
+    )
+    return None
+
+
 async def get_push_receipts(ticket_ids: list[str]) -> dict[str, Any]:
     """Fetch delivery receipts for previously sent push notifications.
 
@@ -0,0 +1,232 @@
+"""Shared, read-only Bhagavad Gita verse corpus.
+
+Every verse consumer (gita_wisdom_retrieval, GitaWisdomFilter, the
+auto-enricher, WisdomKnowledgeBase and WisdomCore) used to load and hold
+its own copy of the 701 verses and lowercase/tokenize them again on every
+query. This module loads the verses once per process and keeps them in one
+immutable, columnar form:
+
+- ``verses``: read-only verse rows (``VerseRecord``), usable both as dicts
+  (``verse["english"]``) and like the ORM row (``verse.english``). Lists are
+  stored as tuples and strings are interned, so repeated themes and tags are
+  shared rather than copied.
+- Precomputed, lowercased columns (``english``, ``theme``, ``principle``,
+  ``hindi``, ``applications`` ...) and ``english_tokens``, aligned with
+  ``verses`` by position.
+- ``chapters`` / ``verse_numbers`` as numpy arrays for vectorized filtering.
+- ``by_ref``: lookup by "2.47" and "BG 2.47".
+- ``version`` (a content hash) and ``epoch`` (bumped whenever a corpus with
+  different content replaces the previous one), so derived caches know when
+  to rebuild.
+
+Two corpora exist: the file corpus (data/gita/gita_verses_complete.json),
+loaded on first use, and the database corpus (gita_verses table), refreshed
+at most every GITA_CORPUS_DB_TTL_SECONDS. Because nothing mutates the
+corpus after it is built, a process that loads it before forking workers
+shares the pages copy-on-write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+GITA_VERSES_PATH = Path(__file__).parent.parent.parent / "data" / "gita" / "gita_verses_complete.json"
+
+# How long the database corpus is trusted before the table is read again.
+# Unchanged content keeps the same corpus object (and epoch).
+GITA_CORPUS_DB_TTL_SECONDS = float(os.getenv("GITA_CORPUS_DB_TTL_SECONDS", "300"))
+
+# GitaVerse columns copied into database corpus rows
+_DB_FIELDS = (
+    "id", "chapter", "verse", "sanskrit", "transliteration", "hindi", "english", "word_meanings",
+    "principle", "theme", "mental_health_applications", "primary_domain", "secondary_domains",
+)
+
+_TOKEN_STRIP = ".,;:!?()[]\"'"
+
+
+class FrozenDict(dict):
+    """A dict that refuses mutation, so shared corpus rows cannot be edited in place."""
+
+    __slots__ = ()
+
+    def _readonly(self, *_args: Any, **_kwargs: Any) -> None:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (dict(self),))
+
+
+class VerseRecord(FrozenDict):
+    """One read-only verse; fields are available as keys and attributes."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return FrozenDict({_freeze(k): _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _lower(value: Any) -> str:
+    return sys.intern(value.lower()) if isinstance(value, str) else ""
+
+
+def _tokens(text: str) -> tuple[str, ...]:
+    words = (word.strip(_TOKEN_STRIP) for word in text.split())
+    return tuple(sys.intern(word) for word in dict.fromkeys(words) if word)
+
+
+class GitaCorpus:
+    """Immutable columnar view of the verse corpus. Columns align with ``verses``."""
+
+    __slots__ = (
+        "verses", "chapters", "verse_numbers", "english", "theme", "theme_text", "principle", "hindi",
+        "domain", "applications", "english_tokens", "by_ref", "version", "epoch", "source",
+    )
+
+    def __init__(self, rows: Iterable[dict[str, Any]], source: str, epoch: int = 0) -> None:
+        verses = tuple(VerseRecord({_freeze(k): _freeze(v) for k, v in row.items()}) for row in rows)
+        put = object.__setattr__
+        put(self, "verses", verses)
+        put(self, "source", source)
+        put(self, "epoch", epoch)
+        put(self, "version", _content_version(verses))
+        put(self, "chapters", _readonly_array([v.get("chapter") or 0 for v in verses]))
+        put(self, "verse_numbers", _readonly_array([v.get("verse") or 0 for v in verses]))
+        put(self, "english", tuple(_lower(v.get("english")) for v in verses))
+        put(self, "theme", tuple(_lower(v.get("theme")) for v in verses))
+        put(self, "theme_text", tuple(sys.intern(t.replace("_", " ")) for t in self.theme))
+        put(self, "principle", tuple(_lower(v.get("principle")) for v in verses))
+        put(self, "hindi", tuple(_lower(v.get("hindi")) for v in verses))
+        put(self, "domain", tuple(_lower(v.get("primary_domain")) for v in verses))
+        put(self, "applications", tuple(
+            tuple(_lower(app) for app in (v.get("mental_health_applications") or ())) for v in verses
+        ))
+        put(self, "english_tokens", tuple(_tokens(text) for text in self.english))
+        by_ref: dict[str, VerseRecord] = {}
+        for verse in verses:
+            ref = f"{verse.get('chapter', 0)}.{verse.get('verse', 0)}"
+            by_ref[ref] = verse
+            by_ref[f"BG {ref}"] = verse
+        put(self, "by_ref", FrozenDict(by_ref))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("GitaCorpus is read-only")
+
+    def __len__(self) -> int:
+        return len(self.verses)
+
+    def __iter__(self):
+        return iter(self.verses)
+
+    def get(self, chapter: int, verse: int) -> VerseRecord | None:
+        """Return one verse by chapter and verse number."""
+        return self.by_ref.get(f"{chapter}.{verse}")
+
+
+def _readonly_array(values: list[int]) -> np.ndarray:
+    array = np.asarray(values, dtype=np.int16)
+    array.flags.writeable = False
+    return array
+
+
+def _content_version(verses: tuple[VerseRecord, ...]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for verse in verses:
+        digest.update(repr(sorted(verse.items(), key=lambda item: item[0])).encode("utf-8", "replace"))
+    return digest.hexdigest()
+
+
+_EMPTY = GitaCorpus((), source="empty")
+_lock = threading.Lock()
+_epoch = 0
+_file_corpus: GitaCorpus | None = None
+_db_corpus: GitaCorpus | None = None
+_db_loaded_at = 0.0
+
+
+def _next_epoch() -> int:
+    global _epoch
+    _epoch += 1
+    return _epoch
+
+
+def get_gita_corpus() -> GitaCorpus:
+    """Return the file corpus, loading it on first use (once per process)."""
+    global _file_corpus
+    if _file_corpus is not None:
+        return _file_corpus
+    with _lock:
+        if _file_corpus is None:
+            try:
+                with open(GITA_VERSES_PATH, encoding="utf-8") as f:
+                    rows = json.load(f)
+                _file_corpus = GitaCorpus(rows, source=str(GITA_VERSES_PATH), epoch=_next_epoch())
+                logger.info(f"GitaCorpus: Loaded {len(_file_corpus)} verses from {GITA_VERSES_PATH.name}")
+            except FileNotFoundError:
+                logger.warning(f"GitaCorpus: Verses file not found at {GITA_VERSES_PATH}")
+                _file_corpus = _EMPTY
+            except Exception as e:
+                logger.error(f"GitaCorpus: Failed to load verses: {e}")
+                _file_corpus = _EMPTY
+    return _file_corpus
+
+
+async def get_db_gita_corpus(db: AsyncSession) -> GitaCorpus:
+    """Return the database corpus, re-reading the table once the TTL has passed.
+
+    A refresh whose content matches the current corpus keeps the current
+    object and epoch, so derived indexes are only rebuilt on real changes.
+    """
+    global _db_corpus, _db_loaded_at
+    now = time.monotonic()
+    if _db_corpus is not None and now - _db_loaded_at < GITA_CORPUS_DB_TTL_SECONDS:
+        return _db_corpus
+
+    from backend.services.gita_service import GitaService
+
+    gita_verses = await GitaService.get_all_verses_with_tags(db)
+    rows = [{name: getattr(gv, name, None) for name in _DB_FIELDS} for gv in gita_verses]
+    corpus = GitaCorpus(rows, source="database")
+    with _lock:
+        if _db_corpus is None or _db_corpus.version != corpus.version:
+            object.__setattr__(corpus, "epoch", _next_epoch())
+            _db_corpus = corpus
+            logger.debug(f"GitaCorpus: Loaded {len(corpus)} verses from database (epoch {corpus.epoch})")
+        _db_loaded_at = now
+    return _db_corpus
+
+
+def invalidate_db_gita_corpus() -> None:
+    """Force the next get_db_gita_corpus call to re-read the table."""
+    global _db_loaded_at
+    _db_loaded_at = float("-inf")
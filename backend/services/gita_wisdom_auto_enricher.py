@@ -53,10 +53,10 @@ Usage:
 """
 
 import asyncio
-import json
 import logging
 import os
 import re
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Optional
 
@@ -67,6 +67,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.wisdom import GitaPracticalWisdom
+from backend.services.gita_corpus import get_gita_corpus
 
 logger = logging.getLogger(__name__)
 
@@ -854,32 +855,21 @@ class OpenSourceGitaFetcher:
     def __init__(self):
         self._validator = GitaAmbitValidator()
         self._local_corpus_loaded = False
-        self._local_verses: dict[str, dict] = {}
+        self._local_verses: Mapping[str, dict] = {}
 
     async def load_local_corpus(self) -> None:
-        """Load the local 700-verse Gita corpus for enrichment context."""
+        """Attach the shared, read-only Gita corpus for enrichment context."""
         if self._local_corpus_loaded:
             return
 
-        corpus_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "data", "gita", "gita_verses_complete.json"
-        )
-
-        try:
-            with open(corpus_path, encoding="utf-8") as f:
-                verses = json.load(f)
-
-            for verse in verses:
-                key = f"{verse['chapter']}.{verse['verse']}"
-                self._local_verses[key] = verse
+        corpus = get_gita_corpus()
+        if not corpus.verses:
+            logger.error("Failed to load local Gita corpus: no verses available")
+            return
 
-            self._local_corpus_loaded = True
-            logger.info(
-                f"Loaded local Gita corpus: {len(self._local_verses)} verses"
-            )
-        except Exception as e:
-            logger.error(f"Failed to load local Gita corpus: {e}")
+        self._local_verses = corpus.by_ref
+        self._local_corpus_loaded = True
+        logger.info(f"Loaded local Gita corpus: {len(corpus)} verses")
 
     def get_verse_context(self, chapter: int, verse: int) -> dict | None:
         """Get full context for a verse from the local corpus."""
@@ -1054,7 +1044,7 @@ class PracticalWisdomGenerator:
                 self._create_counter_pattern(principle, english, life_domain)
             ),
             "shad_ripu_tags": self.get_shad_ripu_for_verse(verse_ref),
-            "wellness_domains": mental_health_apps[:5] if mental_health_apps else [],
+            "wellness_domains": list(mental_health_apps[:5]) if mental_health_apps else [],
             "source_attribution": f"Bhagavad Gita {verse_ref} — {chapter_info['name']}",
             "enrichment_source": "auto_enriched",
         }
@@ -31,14 +31,14 @@ USAGE:
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path
 from typing import Any
 
+from backend.services.gita_corpus import GITA_VERSES_PATH, get_gita_corpus
+
 logger = logging.getLogger(__name__)
 
 
@@ -187,19 +187,12 @@ TOOL_CORE_TEACHINGS = {
     },
 }
 
-# Load complete Gita verses from JSON
-GITA_VERSES: list[dict[str, Any]] = []
-GITA_VERSES_PATH = Path(__file__).parent.parent.parent / "data" / "gita" / "gita_verses_complete.json"
-
-try:
-    if GITA_VERSES_PATH.exists():
-        with open(GITA_VERSES_PATH, "r", encoding="utf-8") as f:
-            GITA_VERSES = json.load(f)
-        logger.info(f"GitaWisdomFilter: Loaded {len(GITA_VERSES)} verses for validation")
-    else:
-        logger.warning(f"GitaWisdomFilter: Verses file not found at {GITA_VERSES_PATH}")
-except Exception as e:
-    logger.error(f"GitaWisdomFilter: Failed to load verses: {e}")
+# Complete Gita verses, shared read-only with the other verse consumers
+GITA_VERSES = get_gita_corpus().verses
+if GITA_VERSES:
+    logger.info(f"GitaWisdomFilter: Using {len(GITA_VERSES)} verses for validation")
+else:
+    logger.warning(f"GitaWisdomFilter: No verses available from {GITA_VERSES_PATH}")
 
 
 # =============================================================================
@@ -233,10 +226,12 @@ class GitaWisdomFilter:
 
     def __init__(self):
         """Initialize the Gita Wisdom Filter."""
-        self._verses = GITA_VERSES
+        self._corpus = get_gita_corpus()
+        self._verses = self._corpus.verses
         self._concepts = GITA_CORE_CONCEPTS
         self._tool_teachings = TOOL_CORE_TEACHINGS
-        self._verse_index = self._build_verse_index()
+        # "BG 2.47" and "2.47" references, built once with the corpus
+        self._verse_index = self._corpus.by_ref
 
         logger.info(
             f"GitaWisdomFilter initialized: "
@@ -244,18 +239,6 @@ class GitaWisdomFilter:
             f"{len(self._concepts)} concepts"
         )
 
-    def _build_verse_index(self) -> dict[str, dict[str, Any]]:
-        """Build an index of verses by reference for quick lookup."""
-        index = {}
-        for verse in self._verses:
-            chapter = verse.get("chapter", 0)
-            verse_num = verse.get("verse", 0)
-            ref = f"BG {chapter}.{verse_num}"
-            index[ref] = verse
-            # Also index without 'BG' prefix
-            index[f"{chapter}.{verse_num}"] = verse
-        return index
-
     def _calculate_wisdom_score(
         self,
         content: str,
@@ -352,32 +335,41 @@ class GitaWisdomFilter:
         for concept in tool_teaching.get("concepts", []):
             expanded_keywords.add(concept.lower())
 
-        # Score verses
+        # Score verses over the corpus' precomputed lowercase columns
+        long_keywords = [word for word in expanded_keywords if len(word) > 3]
+        app_matches: dict[str, bool] = {}
+        theme_matches: dict[str, bool] = {}
         scored_verses = []
-        for verse in self._verses:
+        corpus = self._corpus
+        for verse, apps, theme, english, principle in zip(
+            corpus.verses, corpus.applications, corpus.theme, corpus.english, corpus.principle,
+            strict=True,
+        ):
             score = 0.0
 
             # Check spiritual wellness applications
-            mh_apps = verse.get("mental_health_applications", [])
-            for app in mh_apps:
-                if any(k in app.lower() for k in expanded_keywords):
+            for app_lower in apps:
+                matched = app_matches.get(app_lower)
+                if matched is None:
+                    matched = app_matches[app_lower] = any(k in app_lower for k in expanded_keywords)
+                if matched:
                     score += 2.0
 
             # Check theme
-            theme = verse.get("theme", "").lower()
-            if any(k in theme for k in expanded_keywords):
+            matched = theme_matches.get(theme)
+            if matched is None:
+                matched = theme_matches[theme] = any(k in theme for k in expanded_keywords)
+            if matched:
                 score += 1.5
 
             # Check English translation
-            english = verse.get("english", "").lower()
-            for word in expanded_keywords:
-                if len(word) > 3 and word in english:
+            for word in long_keywords:
+                if word in english:
                     score += 0.5
 
             # Check principle
-            principle = verse.get("principle", "").lower()
-            for word in expanded_keywords:
-                if len(word) > 3 and word in principle:
+            for word in long_keywords:
+                if word in principle:
                     score += 0.3
 
             if score > 0:
@@ -17,26 +17,19 @@ The service ensures ALL responses are grounded in actual Gita wisdom from the re
 
 from __future__ import annotations
 
-import json
 import logging
-from pathlib import Path
 from typing import Any
 
-logger = logging.getLogger(__name__)
+from backend.services.gita_corpus import GITA_VERSES_PATH, get_gita_corpus
 
-# Load complete Gita verses from JSON (701 verses)
-GITA_VERSES: list[dict[str, Any]] = []
-GITA_VERSES_PATH = Path(__file__).parent.parent.parent / "data" / "gita" / "gita_verses_complete.json"
+logger = logging.getLogger(__name__)
 
-try:
-    if GITA_VERSES_PATH.exists():
-        with open(GITA_VERSES_PATH, "r", encoding="utf-8") as f:
-            GITA_VERSES = json.load(f)
-        logger.info(f"✅ GitaWisdomRetrieval: Loaded {len(GITA_VERSES)} verses from JSON")
-    else:
-        logger.warning(f"⚠️ GitaWisdomRetrieval: Verses file not found at {GITA_VERSES_PATH}")
-except Exception as e:
-    logger.error(f"❌ GitaWisdomRetrieval: Failed to load verses: {e}")
+# Complete Gita verses (701), shared read-only with the other verse consumers
+GITA_VERSES = get_gita_corpus().verses
+if GITA_VERSES:
+    logger.info(f"✅ GitaWisdomRetrieval: Using {len(GITA_VERSES)} verses from the shared corpus")
+else:
+    logger.warning(f"⚠️ GitaWisdomRetrieval: No verses available from {GITA_VERSES_PATH}")
 
 
 # =============================================================================
@@ -111,7 +104,8 @@ def search_gita_verses(
     Returns:
         List of matching verses with relevance scores and metadata
     """
-    if not GITA_VERSES:
+    corpus = get_gita_corpus()
+    if not corpus.verses:
         logger.warning("GitaWisdomRetrieval: No verses loaded")
         return []
 
@@ -134,40 +128,49 @@ def search_gita_verses(
                 expanded_keywords.add(category)
                 expanded_keywords.update(keywords)
 
-    # Score each verse
+    # Score each verse over the corpus' precomputed lowercase columns. Themes
+    # and applications repeat across verses, so their matches are memoized.
+    long_keywords = [word for word in expanded_keywords if len(word) > 3]
+    app_matches: dict[str, bool] = {}
+    theme_matches: dict[str, bool] = {}
     scored_verses: list[tuple[float, dict[str, Any]]] = []
 
-    for verse in GITA_VERSES:
+    for verse, apps, theme, principle, english, hindi in zip(
+        corpus.verses, corpus.applications, corpus.theme, corpus.principle, corpus.english, corpus.hindi,
+        strict=True,
+    ):
         score = 0.0
 
         # Check spiritual wellness applications (highest priority)
-        mh_apps = verse.get("mental_health_applications", [])
-        for app in mh_apps:
-            app_lower = app.lower()
-            if app_lower in expanded_keywords or any(k in app_lower for k in expanded_keywords):
+        for app_lower in apps:
+            matched = app_matches.get(app_lower)
+            if matched is None:
+                matched = app_matches[app_lower] = (
+                    app_lower in expanded_keywords or any(k in app_lower for k in expanded_keywords)
+                )
+            if matched:
                 score += 3.0
 
         # Check theme
-        theme = verse.get("theme", "").lower()
-        if any(k in theme for k in expanded_keywords):
+        matched = theme_matches.get(theme)
+        if matched is None:
+            matched = theme_matches[theme] = any(k in theme for k in expanded_keywords)
+        if matched:
             score += 2.0
 
         # Check principle
-        principle = verse.get("principle", "").lower()
-        for word in expanded_keywords:
-            if len(word) > 3 and word in principle:
+        for word in long_keywords:
+            if word in principle:
                 score += 1.5
 
         # Check English translation
-        english = verse.get("english", "").lower()
-        for word in expanded_keywords:
-            if len(word) > 3 and word in english:
+        for word in long_keywords:
+            if word in english:
                 score += 0.5
 
         # Check Sanskrit/Hindi (for Gita-specific terms)
-        hindi = verse.get("hindi", "").lower()
-        for word in expanded_keywords:
-            if len(word) > 3 and word in hindi:
+        for word in long_keywords:
+            if word in hindi:
                 score += 0.3
 
         # Boost important chapters based on tool
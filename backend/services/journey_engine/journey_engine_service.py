@@ -53,6 +53,12 @@ from backend.models import (
     GitaVerse,
 )
 from backend.models import UserJourneyStatus
+from backend.services.journey_engine.template_catalog import (
+    CatalogTemplate,
+    StepSkeleton,
+    get_fresh_template_catalog,
+    verse_to_dict,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -320,6 +326,9 @@ class DailyStep:
     completed_at: datetime | None
     available_to_complete: bool = True
     next_available_at: datetime | None = None
+    # Journey's primary enemy when known from the template catalog; lets
+    # the routes skip a separate journey-stats lookup.
+    primary_enemy: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -464,13 +473,25 @@ class JourneyEngineService:
         featured_only: bool = False,
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[JourneyTemplate], int]:
+    ) -> tuple[list[JourneyTemplate | CatalogTemplate], int]:
         """
         List available journey templates with filtering.
 
+        Served from the in-process template catalog when it is loaded.
+
         Returns:
             Tuple of (templates, total_count)
         """
+        catalog = await get_fresh_template_catalog(self.db)
+        if catalog is not None:
+            matching = catalog.filter_templates(
+                enemy_filter=enemy_filter,
+                difficulty_max=difficulty_max,
+                free_only=free_only,
+                featured_only=featured_only,
+            )
+            return matching[offset:offset + limit], len(matching)
+
         query = select(JourneyTemplate).where(
             JourneyTemplate.is_active == True,
             JourneyTemplate.deleted_at.is_(None),
@@ -511,8 +532,14 @@ class JourneyEngineService:
 
         return list(templates), total_count
 
-    async def get_template(self, template_id: str) -> JourneyTemplate:
+    async def get_template(self, template_id: str) -> JourneyTemplate | CatalogTemplate:
         """Get a template by ID with its steps."""
+        catalog = await get_fresh_template_catalog(self.db)
+        if catalog is not None:
+            cached = catalog.get(template_id)
+            if cached is not None:
+                return cached
+
         query = (
             select(JourneyTemplate)
             .options(selectinload(JourneyTemplate.steps))
@@ -529,8 +556,14 @@ class JourneyEngineService:
 
         return template
 
-    async def get_template_by_slug(self, slug: str) -> JourneyTemplate:
+    async def get_template_by_slug(self, slug: str) -> JourneyTemplate | CatalogTemplate:
         """Get a template by slug with its steps."""
+        catalog = await get_fresh_template_catalog(self.db)
+        if catalog is not None:
+            cached = catalog.get_by_slug(slug)
+            if cached is not None:
+                return cached
+
         query = (
             select(JourneyTemplate)
             .options(selectinload(JourneyTemplate.steps))
@@ -693,7 +726,7 @@ class JourneyEngineService:
 
         Returns None if journey is completed or paused.
         """
-        journey = await self._get_user_journey(user_id, journey_id)
+        journey = await self._get_user_journey(user_id, journey_id, with_template=False)
 
         if journey.status != UserJourneyStatus.ACTIVE.value:
             return None
@@ -713,7 +746,7 @@ class JourneyEngineService:
         day_index: int,
     ) -> DailyStep:
         """Get a specific step by day index."""
-        journey = await self._get_user_journey(user_id, journey_id)
+        journey = await self._get_user_journey(user_id, journey_id, with_template=False)
 
         # Validate day index
         template = await self.get_template(journey.journey_template_id)
@@ -1079,17 +1112,24 @@ class JourneyEngineService:
 
         return count
 
-    async def _get_user_journey(self, user_id: str, journey_id: str) -> UserJourney:
-        """Get and validate user journey ownership."""
-        query = (
-            select(UserJourney)
-            .options(selectinload(UserJourney.template))
-            .where(
-                UserJourney.id == journey_id,
-                UserJourney.user_id == user_id,
-                UserJourney.deleted_at.is_(None),
-            )
+    async def _get_user_journey(
+        self,
+        user_id: str,
+        journey_id: str,
+        with_template: bool = True,
+    ) -> UserJourney:
+        """Get and validate user journey ownership.
+
+        Step delivery passes ``with_template=False``: it resolves the
+        template through the catalog, so eager-loading it is wasted work.
+        """
+        query = select(UserJourney).where(
+            UserJourney.id == journey_id,
+            UserJourney.user_id == user_id,
+            UserJourney.deleted_at.is_(None),
         )
+        if with_template:
+            query = query.options(selectinload(UserJourney.template))
         result = await self.db.execute(query)
         journey = result.scalar_one_or_none()
 
@@ -1116,11 +1156,14 @@ class JourneyEngineService:
 
         # Create new step state
         template = await self.get_template(journey.journey_template_id)
-        template_step = None
-        for step in template.steps:
-            if step.day_index == day_index:
-                template_step = step
-                break
+        template_step: JourneyTemplateStep | StepSkeleton | None = None
+        if isinstance(template, CatalogTemplate):
+            template_step = template.step_for_day(day_index)
+        else:
+            for step in template.steps:
+                if step.day_index == day_index:
+                    template_step = step
+                    break
 
         # Generate KIAAN content (placeholder - integrate with KIAAN service)
         kiaan_json = await self._generate_step_content(
@@ -1214,8 +1257,8 @@ class JourneyEngineService:
 
     async def _generate_step_content(
         self,
-        template: JourneyTemplate,
-        template_step: JourneyTemplateStep | None,
+        template: JourneyTemplate | CatalogTemplate,
+        template_step: JourneyTemplateStep | StepSkeleton | None,
         day_index: int,
         personalization: dict,
     ) -> dict[str, Any]:
@@ -1226,48 +1269,17 @@ class JourneyEngineService:
         """
         # Use template step hints if available
         if template_step:
-            verse_refs = template_step.static_verse_refs or []
-            verse_selector = template_step.verse_selector or {}
-
             # The seed script formats reflection_prompt / practice_prompt as
             # double-newline-separated items (see backend/scripts/
             # seed_journey_templates.ITEM_DELIM) so the StepResponse contract
             # — guided_reflection: string[] and practice.instructions:
             # string[] — surfaces each item as its own bullet in the mobile
-            # renderer's numbered list. Split here, trim empties, and fall
-            # back to a single-item list when the template stored only one.
-            raw_reflection = (template_step.reflection_prompt or "").strip()
-            reflection_items = [
-                line.strip()
-                for line in raw_reflection.split("\n\n")
-                if line.strip()
-            ] or ["Reflect on today's teaching."]
-
-            raw_practice = (template_step.practice_prompt or "").strip()
-            practice_items = [
-                line.strip()
-                for line in raw_practice.split("\n\n")
-                if line.strip()
-            ] or ["Take 5 minutes for mindful reflection."]
-
-            return {
-                "step_title": template_step.step_title or f"Day {day_index}",
-                "today_focus": (template.primary_enemy_tags or ["general"])[0],
-                "verse_refs": verse_refs,
-                "teaching": template_step.teaching_hint or "",
-                "guided_reflection": reflection_items,
-                "practice": {
-                    "name": "Daily Practice",
-                    "instructions": practice_items,
-                    "duration_minutes": personalization.get("time_budget_minutes", 10),
-                },
-                "micro_commitment": "I commit to being mindful of this teaching today.",
-                "check_in_prompt": {
-                    "scale": "0-10",
-                    "label": "How present do you feel with today's teaching?",
-                },
-                "safety_note": template_step.safety_notes,
-            }
+            # renderer's numbered list. StepSkeleton does the split once;
+            # catalog-backed templates hand us a pre-built skeleton and only
+            # the per-user personalization is applied here.
+            if not isinstance(template_step, StepSkeleton):
+                template_step = StepSkeleton.from_template_step(template_step)
+            return template_step.render(template.primary_enemy_tags, personalization)
 
         # Fallback for missing template step — coherent, enemy-aware content
         # so the user always sees a real teaching + verse + practice instead
@@ -1344,14 +1356,29 @@ class JourneyEngineService:
         """Build DailyStep from step state with verse content."""
         kiaan_json = step_state.kiaan_step_json or {}
 
-        # Fetch actual verse content
-        verses = []
+        # Fetch actual verse content — pre-resolved verses come from the
+        # template catalog; anything else is fetched in one bulk query.
         verse_refs = step_state.verse_refs or kiaan_json.get("verse_refs", [])
-        for ref in verse_refs:
-            if isinstance(ref, dict) and "chapter" in ref and "verse" in ref:
-                verse = await self._get_verse(ref["chapter"], ref["verse"])
-                if verse:
-                    verses.append(verse)
+        keys = [
+            (ref["chapter"], ref["verse"])
+            for ref in verse_refs
+            if isinstance(ref, dict) and "chapter" in ref and "verse" in ref
+        ]
+        resolved: dict[tuple[int, int], dict[str, Any]] = {}
+        primary_enemy: str | None = None
+        catalog = await get_fresh_template_catalog(self.db)
+        if catalog is not None:
+            cached_template = catalog.get(journey.journey_template_id)
+            if cached_template is not None and cached_template.primary_enemy_tags:
+                primary_enemy = cached_template.primary_enemy_tags[0]
+            for key in keys:
+                cached = catalog.get_verse(*key)
+                if cached is not None:
+                    resolved[key] = cached
+        missing = {key for key in keys if key not in resolved}
+        if missing:
+            resolved.update(await self._get_verses(missing))
+        verses = [resolved[key] for key in keys if key in resolved]
 
         is_completed = step_state.completed_at is not None
 
@@ -1379,6 +1406,7 @@ class JourneyEngineService:
             completed_at=step_state.completed_at,
             available_to_complete=available_to_complete,
             next_available_at=next_available_at,
+            primary_enemy=primary_enemy,
         )
 
     async def _get_verse(self, chapter: int, verse: int) -> dict[str, Any] | None:
@@ -1393,15 +1421,28 @@ class JourneyEngineService:
         if not gita_verse:
             return None
 
-        return {
-            "chapter": gita_verse.chapter,
-            "verse": gita_verse.verse,
-            "sanskrit": gita_verse.sanskrit,
-            "hindi": gita_verse.hindi,
-            "english": gita_verse.english,
-            "transliteration": gita_verse.transliteration,
-            "theme": gita_verse.theme,
-        }
+        return verse_to_dict(gita_verse)
+
+    async def _get_verses(
+        self, refs: set[tuple[int, int]]
+    ) -> dict[tuple[int, int], dict[str, Any]]:
+        """Fetch several verses in one query, keyed by (chapter, verse)."""
+        if len(refs) == 1:
+            chapter, verse = next(iter(refs))
+            single = await self._get_verse(chapter, verse)
+            return {(chapter, verse): single} if single else {}
+
+        query = select(GitaVerse).where(
+            GitaVerse.chapter.in_({chapter for chapter, _ in refs}),
+            GitaVerse.verse.in_({verse for _, verse in refs}),
+        )
+        result = await self.db.execute(query)
+        found: dict[tuple[int, int], dict[str, Any]] = {}
+        for gita_verse in result.scalars().all():
+            key = (gita_verse.chapter, gita_verse.verse)
+            if key in refs and key not in found:
+                found[key] = verse_to_dict(gita_verse)
+        return found
 
     async def _build_journey_stats(self, journey: UserJourney) -> JourneyStats:
         """Build statistics for a journey."""
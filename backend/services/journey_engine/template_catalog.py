@@ -0,0 +1,441 @@
+"""
+Template Catalog - Immutable In-Process Snapshot of Journey Templates.
+
+Journey templates and their day-by-day steps only change when
+``backend/scripts/seed_journey_templates.py`` runs (on deploy), yet every
+``/templates`` listing, every ``get_current_step`` and every ``get_step``
+used to re-query ``journey_templates`` / ``journey_template_steps`` and
+resolve each step's ``static_verse_refs`` against ``gita_verses`` one row
+at a time.
+
+This module loads the whole catalog once into a frozen, versioned snapshot:
+
+1. Templates (non-deleted) in the same order ``list_templates`` returns them
+2. Pre-rendered step skeletons (reflection / practice prompts already split
+   into bullet items, verse refs normalised)
+3. Every verse referenced by any step — or by the enemy-aware fallback
+   content — resolved with a single bulk query
+
+Only per-user personalization (e.g. ``time_budget_minutes``) is applied per
+request via ``StepSkeleton.render``.
+
+Refresh model:
+    - ``refresh_template_catalog(db)`` runs at startup after template seeding
+    - ``invalidate_template_catalog()`` drops the snapshot (seed script)
+    - ``get_fresh_template_catalog(db)`` re-checks a cheap fingerprint query
+      every ``CATALOG_RECHECK_SECONDS`` so other instances pick up a re-seed
+      without a restart
+
+When no snapshot has been loaded (tests, scripts, DB down at boot) callers
+fall back to the original per-request queries.
+
+Usage:
+    from backend.services.journey_engine.template_catalog import (
+        get_fresh_template_catalog,
+    )
+
+    catalog = await get_fresh_template_catalog(db)
+    if catalog is not None:
+        template = catalog.get_by_slug("krodha-cooling-the-fire")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.models import GitaVerse, JourneyTemplate, JourneyTemplateStep
+
+logger = logging.getLogger(__name__)
+
+
+# How often (seconds) a loaded catalog re-validates its fingerprint against
+# the database. The check is a single aggregate query, so 60s keeps
+# cross-instance staleness bounded without measurable DB load.
+CATALOG_RECHECK_SECONDS = float(os.getenv("JOURNEY_CATALOG_RECHECK_SECONDS", "60"))
+
+DEFAULT_REFLECTION = "Reflect on today's teaching."
+DEFAULT_PRACTICE = "Take 5 minutes for mindful reflection."
+
+# Item delimiter used by the seed script for reflection/practice prompts
+# (see backend/scripts/seed_journey_templates.ITEM_DELIM).
+_ITEM_DELIM = "\n\n"
+
+
+def split_prompt_items(raw: str | None, default: str) -> tuple[str, ...]:
+    """Split a double-newline-delimited prompt into trimmed, non-empty items."""
+    items = tuple(
+        line.strip()
+        for line in (raw or "").strip().split(_ITEM_DELIM)
+        if line.strip()
+    )
+    return items or (default,)
+
+
+def _normalise_verse_refs(refs: Iterable[Any] | None) -> tuple[tuple[int, int], ...]:
+    """Keep only well-formed ``{"chapter": x, "verse": y}`` refs as int pairs."""
+    pairs: list[tuple[int, int]] = []
+    for ref in refs or ():
+        if isinstance(ref, Mapping) and "chapter" in ref and "verse" in ref:
+            try:
+                pairs.append((int(ref["chapter"]), int(ref["verse"])))
+            except (TypeError, ValueError):
+                continue
+    return tuple(pairs)
+
+
+def verse_to_dict(gita_verse: GitaVerse) -> dict[str, Any]:
+    """Project a GitaVerse row into the dict shape used by DailyStep.verses."""
+    return {
+        "chapter": gita_verse.chapter,
+        "verse": gita_verse.verse,
+        "sanskrit": gita_verse.sanskrit,
+        "hindi": gita_verse.hindi,
+        "english": gita_verse.english,
+        "transliteration": gita_verse.transliteration,
+        "theme": gita_verse.theme,
+    }
+
+
+# =============================================================================
+# SNAPSHOT TYPES
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class StepSkeleton:
+    """Pre-rendered, user-independent content for one template day."""
+
+    day_index: int
+    step_title: str | None
+    teaching: str
+    guided_reflection: tuple[str, ...]
+    practice_instructions: tuple[str, ...]
+    verse_refs: tuple[Any, ...]
+    safety_note: str | None
+
+    @classmethod
+    def from_template_step(cls, step: JourneyTemplateStep) -> StepSkeleton:
+        """Build a skeleton from an ORM JourneyTemplateStep row."""
+        return cls(
+            day_index=step.day_index,
+            step_title=step.step_title,
+            teaching=step.teaching_hint or "",
+            guided_reflection=split_prompt_items(step.reflection_prompt, DEFAULT_REFLECTION),
+            practice_instructions=split_prompt_items(step.practice_prompt, DEFAULT_PRACTICE),
+            verse_refs=tuple(
+                MappingProxyType(dict(ref)) if isinstance(ref, dict) else ref
+                for ref in step.static_verse_refs or ()
+            ),
+            safety_note=step.safety_notes,
+        )
+
+    def render(
+        self,
+        primary_enemy_tags: Iterable[str] | None,
+        personalization: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Produce the kiaan_step_json payload for a user.
+
+        Every mutable container is freshly built so callers may persist or
+        mutate the result without touching the shared snapshot.
+        """
+        tags = list(primary_enemy_tags or ()) or ["general"]
+        return {
+            "step_title": self.step_title or f"Day {self.day_index}",
+            "today_focus": tags[0],
+            "verse_refs": [
+                dict(ref) if isinstance(ref, Mapping) else ref for ref in self.verse_refs
+            ],
+            "teaching": self.teaching,
+            "guided_reflection": list(self.guided_reflection),
+            "practice": {
+                "name": "Daily Practice",
+                "instructions": list(self.practice_instructions),
+                "duration_minutes": personalization.get("time_budget_minutes", 10),
+            },
+            "micro_commitment": "I commit to being mindful of this teaching today.",
+            "check_in_prompt": {
+                "scale": "0-10",
+                "label": "How present do you feel with today's teaching?",
+            },
+            "safety_note": self.safety_note,
+        }
+
+
+@dataclass(frozen=True)
+class CatalogTemplate:
+    """Read-only mirror of a JourneyTemplate row plus its step skeletons.
+
+    Exposes the same attribute names as the ORM model so route projections
+    such as ``_template_to_response`` accept either type.
+    """
+
+    id: str
+    slug: str
+    title: str
+    description: str | None
+    primary_enemy_tags: tuple[str, ...]
+    duration_days: int
+    difficulty: int
+    is_active: bool
+    is_featured: bool
+    is_free: bool
+    icon_name: str | None
+    color_theme: str | None
+    created_at: datetime | None
+    steps: tuple[StepSkeleton, ...]
+    _steps_by_day: Mapping[int, StepSkeleton] = field(
+        default_factory=lambda: MappingProxyType({}), repr=False, compare=False
+    )
+
+    def step_for_day(self, day_index: int) -> StepSkeleton | None:
+        """Return the skeleton for ``day_index`` or None when not seeded."""
+        return self._steps_by_day.get(day_index)
+
+
+@dataclass(frozen=True)
+class TemplateCatalog:
+    """Immutable snapshot of the journey template catalog."""
+
+    version: int
+    fingerprint: tuple[Any, ...]
+    loaded_at: float
+    templates: tuple[CatalogTemplate, ...]
+    by_id: Mapping[str, CatalogTemplate]
+    by_slug: Mapping[str, CatalogTemplate]
+    verses: Mapping[tuple[int, int], Mapping[str, Any]]
+
+    def get(self, template_id: str) -> CatalogTemplate | None:
+        return self.by_id.get(template_id)
+
+    def get_by_slug(self, slug: str) -> CatalogTemplate | None:
+        return self.by_slug.get(slug)
+
+    def get_verse(self, chapter: int, verse: int) -> dict[str, Any] | None:
+        """Return a private copy of a pre-resolved verse, or None if absent."""
+        cached = self.verses.get((chapter, verse))
+        return dict(cached) if cached is not None else None
+
+    def filter_templates(
+        self,
+        enemy_filter: str | None = None,
+        difficulty_max: int | None = None,
+        free_only: bool = False,
+        featured_only: bool = False,
+    ) -> list[CatalogTemplate]:
+        """Apply the list_templates filters, preserving catalog ordering."""
+        enemy = enemy_filter.lower() if enemy_filter else None
+        return [
+            t
+            for t in self.templates
+            if t.is_active
+            and (enemy is None or enemy in t.primary_enemy_tags)
+            and (not difficulty_max or t.difficulty <= difficulty_max)
+            and (not free_only or t.is_free)
+            and (not featured_only or t.is_featured)
+        ]
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+
+_catalog: TemplateCatalog | None = None
+_catalog_checked_at: float = 0.0
+_catalog_version: int = 0
+_refresh_lock: asyncio.Lock | None = None
+
+
+def _get_refresh_lock() -> asyncio.Lock:
+    global _refresh_lock
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+    return _refresh_lock
+
+
+async def _fetch_fingerprint(db: AsyncSession) -> tuple[Any, ...]:
+    """Cheap aggregate that changes whenever templates or steps are edited."""
+    template_stats = (
+        await db.execute(
+            select(
+                func.count(JourneyTemplate.id),
+                func.max(JourneyTemplate.created_at),
+                func.max(JourneyTemplate.updated_at),
+            ).where(JourneyTemplate.deleted_at.is_(None))
+        )
+    ).one()
+    step_stats = (
+        await db.execute(
+            select(
+                func.count(JourneyTemplateStep.id),
+                func.max(JourneyTemplateStep.created_at),
+                func.max(JourneyTemplateStep.updated_at),
+            ).where(JourneyTemplateStep.deleted_at.is_(None))
+        )
+    ).one()
+    return tuple(str(v) for v in (*template_stats, *step_stats))
+
+
+async def _fetch_verses(
+    db: AsyncSession, refs: set[tuple[int, int]]
+) -> dict[tuple[int, int], Mapping[str, Any]]:
+    """Resolve a set of (chapter, verse) pairs with one query."""
+    if not refs:
+        return {}
+    chapters = {chapter for chapter, _ in refs}
+    verse_numbers = {verse for _, verse in refs}
+    result = await db.execute(
+        select(GitaVerse).where(
+            GitaVerse.chapter.in_(chapters),
+            GitaVerse.verse.in_(verse_numbers),
+        )
+    )
+    resolved: dict[tuple[int, int], Mapping[str, Any]] = {}
+    for row in result.scalars().all():
+        key = (row.chapter, row.verse)
+        if key in refs and key not in resolved:
+            resolved[key] = MappingProxyType(verse_to_dict(row))
+    return resolved
+
+
+async def load_template_catalog(db: AsyncSession) -> TemplateCatalog:
+    """Build a new catalog snapshot from the database (does not install it)."""
+    global _catalog_version
+
+    # Imported lazily: the service module imports this one.
+    from backend.services.journey_engine.journey_engine_service import (
+        _ENEMY_TEACHING_FALLBACK,
+    )
+
+    fingerprint = await _fetch_fingerprint(db)
+
+    result = await db.execute(
+        select(JourneyTemplate)
+        .options(selectinload(JourneyTemplate.steps))
+        .where(JourneyTemplate.deleted_at.is_(None))
+        .order_by(
+            JourneyTemplate.is_featured.desc(),
+            JourneyTemplate.created_at.desc(),
+        )
+    )
+    rows = result.scalars().all()
+
+    verse_refs: set[tuple[int, int]] = {
+        (fb["verse_ref"]["chapter"], fb["verse_ref"]["verse"])
+        for fb in _ENEMY_TEACHING_FALLBACK.values()
+    }
+    templates: list[CatalogTemplate] = []
+    for row in rows:
+        skeletons = tuple(
+            sorted(
+                (
+                    StepSkeleton.from_template_step(step)
+                    for step in row.steps
+                    if getattr(step, "deleted_at", None) is None
+                ),
+                key=lambda s: s.day_index,
+            )
+        )
+        for skeleton in skeletons:
+            verse_refs.update(_normalise_verse_refs(skeleton.verse_refs))
+        templates.append(
+            CatalogTemplate(
+                id=row.id,
+                slug=row.slug,
+                title=row.title,
+                description=row.description,
+                primary_enemy_tags=tuple(row.primary_enemy_tags or ()),
+                duration_days=row.duration_days,
+                difficulty=row.difficulty,
+                is_active=bool(row.is_active),
+                is_featured=bool(row.is_featured),
+                is_free=bool(row.is_free),
+                icon_name=row.icon_name,
+                color_theme=row.color_theme,
+                created_at=row.created_at,
+                steps=skeletons,
+                _steps_by_day=MappingProxyType({s.day_index: s for s in skeletons}),
+            )
+        )
+
+    verses = await _fetch_verses(db, verse_refs)
+
+    _catalog_version += 1
+    return TemplateCatalog(
+        version=_catalog_version,
+        fingerprint=fingerprint,
+        loaded_at=time.time(),
+        templates=tuple(templates),
+        by_id=MappingProxyType({t.id: t for t in templates}),
+        by_slug=MappingProxyType({t.slug: t for t in templates}),
+        verses=MappingProxyType(verses),
+    )
+
+
+def get_template_catalog() -> TemplateCatalog | None:
+    """Return the installed snapshot without any freshness check."""
+    return _catalog
+
+
+def invalidate_template_catalog() -> None:
+    """Drop the installed snapshot so callers fall back to direct queries."""
+    global _catalog, _catalog_checked_at
+    _catalog = None
+    _catalog_checked_at = 0.0
+
+
+async def refresh_template_catalog(db: AsyncSession) -> TemplateCatalog:
+    """Load and install a fresh snapshot."""
+    global _catalog, _catalog_checked_at
+    catalog = await load_template_catalog(db)
+    _catalog = catalog
+    _catalog_checked_at = time.monotonic()
+    logger.info(
+        "[template_catalog] loaded v%s: %d templates, %d verses",
+        catalog.version, len(catalog.templates), len(catalog.verses),
+    )
+    return catalog
+
+
+async def get_fresh_template_catalog(db: AsyncSession) -> TemplateCatalog | None:
+    """Return the installed snapshot, re-validating it at most every recheck window.
+
+    Returns None when no snapshot has ever been installed; the catalog is
+    opt-in via ``refresh_template_catalog`` so request paths never pay for
+    a full load unexpectedly. Any failure while re-validating keeps serving
+    the current snapshot.
+    """
+    global _catalog_checked_at
+    catalog = _catalog
+    if catalog is None:
+        return None
+    if time.monotonic() - _catalog_checked_at < CATALOG_RECHECK_SECONDS:
+        return catalog
+
+    async with _get_refresh_lock():
+        # Another coroutine may have re-validated while we waited.
+        if _catalog is not catalog or time.monotonic() - _catalog_checked_at < CATALOG_RECHECK_SECONDS:
+            return _catalog
+        try:
+            fingerprint = await _fetch_fingerprint(db)
+            if fingerprint == catalog.fingerprint:
+                _catalog_checked_at = time.monotonic()
+                return catalog
+            return await refresh_template_catalog(db)
+        except Exception as e:
+            logger.warning(f"[template_catalog] revalidation failed, serving v{catalog.version}: {e}")
+            _catalog_checked_at = time.monotonic()
+            return catalog
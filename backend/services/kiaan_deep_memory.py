@@ -54,6 +54,9 @@ try:
 except ImportError:
     NUMPY_AVAILABLE = False
 
+# SQLite file holding the episodes table (also purged by data_retention)
+EPISODIC_MEMORY_DB_PATH = Path.home() / ".mindvibe" / "episodic_memory.db"
+
 
 # =============================================================================
 # ENUMS AND CORE DATA MODELS
@@ -287,7 +290,7 @@ class EpisodicMemory:
     """
 
     def __init__(self, db_path: Optional[Path] = None):
-        self._db_path = db_path or Path.home() / ".mindvibe" / "episodic_memory.db"
+        self._db_path = db_path or EPISODIC_MEMORY_DB_PATH
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
         self._memory_cache: Dict[str, List[EpisodicEntry]] = defaultdict(list)
         self._initialized = False
@@ -374,6 +377,18 @@ class EpisodicMemory:
             except Exception as e:
                 logger.error(f"Failed to persist episode: {e}")
 
+    def evict_before(self, cutoff: datetime) -> int:
+        """Drop cached episodes older than cutoff (after a retention purge)."""
+        evicted = 0
+        for user_id, entries in list(self._memory_cache.items()):
+            kept = [e for e in entries if e.timestamp >= cutoff]
+            evicted += len(entries) - len(kept)
+            if kept:
+                self._memory_cache[user_id] = kept
+            else:
+                del self._memory_cache[user_id]
+        return evicted
+
     async def recall(
         self,
         user_id: str,
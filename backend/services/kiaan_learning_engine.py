@@ -28,11 +28,15 @@ Architecture:
 """
 
 import asyncio
+import atexit
 import hashlib
 import json
 import logging
 import os
 import re
+import sqlite3
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -88,6 +92,19 @@ SUPPORTED_LANGUAGES = [
     "es", "fr", "de", "pt", "ru", "zh", "ja",  # International
 ]
 
+# Knowledge store persistence: "journal" (JSON snapshot + append-only
+# journal) or "sqlite" (SQLite with an FTS5 trigram index for search)
+KNOWLEDGE_STORE_BACKEND = os.getenv("KIAAN_KNOWLEDGE_BACKEND", "journal")
+# Compact the journal into the snapshot once it has at least this many
+# entries and is as long as the corpus itself
+KNOWLEDGE_COMPACT_MIN_ENTRIES = int(os.getenv("KIAAN_KNOWLEDGE_COMPACT_MIN_ENTRIES", "1000"))
+# Usage counters are buffered and flushed when this many items are dirty
+# or this many seconds have passed since the last flush
+KNOWLEDGE_USAGE_FLUSH_SIZE = int(os.getenv("KIAAN_KNOWLEDGE_USAGE_FLUSH_SIZE", "256"))
+KNOWLEDGE_USAGE_FLUSH_SECONDS = float(os.getenv("KIAAN_KNOWLEDGE_USAGE_FLUSH_SECONDS", "30"))
+
+_TOKEN_RE = re.compile(r"\w+")
+
 # Content types
 class ContentType(Enum):
     VIDEO = "video"
@@ -120,7 +137,7 @@ class LearnedWisdom:
     validation_status: str  # "validated", "pending", "rejected"
     learned_at: datetime
     usage_count: int = 0
-    last_used: Optional[datetime] = None
+    last_used: datetime | None = None
     metadata: dict = field(default_factory=dict)
 
 
@@ -145,10 +162,10 @@ class ContentSource:
     name: str
     source_type: ContentType
     url: str
-    api_endpoint: Optional[str]
+    api_endpoint: str | None
     language: str
     trust_score: float  # 0.0 - 1.0
-    last_fetched: Optional[datetime]
+    last_fetched: datetime | None
     total_items_fetched: int
     enabled: bool
 
@@ -685,18 +702,232 @@ class ContentFetcher:
 # KNOWLEDGE STORE - Persistent storage for learned wisdom
 # =============================================================================
 
+def _wisdom_to_dict(w: LearnedWisdom) -> dict:
+    """Serialize a LearnedWisdom item for the snapshot, journal or SQLite row."""
+    return {
+        "id": w.id,
+        "content": w.content,
+        "source_type": w.source_type.value,
+        "source_url": w.source_url,
+        "source_name": w.source_name,
+        "language": w.language,
+        "chapter_refs": w.chapter_refs,
+        "verse_refs": [list(v) for v in w.verse_refs],
+        "themes": w.themes,
+        "shad_ripu_tags": w.shad_ripu_tags,
+        "keywords": w.keywords,
+        "quality_score": w.quality_score,
+        "validation_status": w.validation_status,
+        "learned_at": w.learned_at.isoformat(),
+        "usage_count": w.usage_count,
+        "last_used": w.last_used.isoformat() if w.last_used else None,
+        "metadata": w.metadata,
+    }
+
+
+def _wisdom_from_dict(item: dict) -> LearnedWisdom:
+    """Inverse of _wisdom_to_dict (also accepts the legacy extra_metadata key)."""
+    return LearnedWisdom(
+        id=item["id"],
+        content=item["content"],
+        source_type=ContentType(item["source_type"]),
+        source_url=item["source_url"],
+        source_name=item["source_name"],
+        language=item["language"],
+        chapter_refs=item["chapter_refs"],
+        verse_refs=[tuple(v) for v in item["verse_refs"]],
+        themes=item["themes"],
+        shad_ripu_tags=item["shad_ripu_tags"],
+        keywords=item["keywords"],
+        quality_score=item["quality_score"],
+        validation_status=item["validation_status"],
+        learned_at=datetime.fromisoformat(item["learned_at"]),
+        usage_count=item.get("usage_count", 0),
+        last_used=datetime.fromisoformat(item["last_used"]) if item.get("last_used") else None,
+        metadata=item.get("metadata", item.get("extra_metadata", {})),
+    )
+
+
+class _JournalPersistence:
+    """
+    learned_wisdom.json snapshot plus an append-only learned_wisdom.journal.
+
+    Every journal line is idempotent ("add" is skipped if the id exists,
+    "usage" carries absolute values), so replaying a journal over a
+    snapshot that already contains it - e.g. after a crash between the
+    snapshot rename and the journal truncate - is harmless.
+    """
+
+    def __init__(self, snapshot_file: Path):
+        self.snapshot_file = snapshot_file
+        self.journal_file = snapshot_file.with_suffix(".journal")
+        self.journal_entries = 0
+
+    def load(self) -> list[dict]:
+        """Return item dicts in insertion order: snapshot, then journal replayed."""
+        items: dict[str, dict] = {}
+        if self.snapshot_file.exists():
+            with open(self.snapshot_file, encoding="utf-8") as f:
+                for item in json.load(f):
+                    items[item["id"]] = item
+
+        if self.journal_file.exists():
+            with open(self.journal_file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from a crash mid-append
+                        logger.warning("Skipping unreadable knowledge journal line")
+                        continue
+                    self.journal_entries += 1
+                    if record["op"] == "add":
+                        items.setdefault(record["item"]["id"], record["item"])
+                    elif record["op"] == "usage" and record["id"] in items:
+                        items[record["id"]]["usage_count"] = record["usage_count"]
+                        items[record["id"]]["last_used"] = record["last_used"]
+
+        return list(items.values())
+
+    def _append(self, records: list[dict]):
+        # One open/write/close per batch of records; appends are infrequent
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        self.journal_entries += len(records)
+
+    def add(self, item: dict):
+        self._append([{"op": "add", "item": item}])
+
+    def update_usage(self, updates: list[tuple[str, int, str | None]]):
+        self._append([
+            {"op": "usage", "id": wid, "usage_count": count, "last_used": last_used}
+            for wid, count, last_used in updates
+        ])
+
+    def compact(self, items: list[dict]):
+        """Rewrite the snapshot atomically, then start an empty journal."""
+        tmp_path = str(self.snapshot_file) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # json.dumps runs the C encoder; json.dump streams through the Python one
+            f.write(json.dumps(items, ensure_ascii=False))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_file)
+
+        with open(self.journal_file, "w", encoding="utf-8"):
+            pass
+        self.journal_entries = 0
+
+    def search(self, _query_lower: str) -> list[str] | None:
+        return None
+
+    def close(self):
+        """Nothing to release: the journal is only open during an append."""
+
+
+class _SQLitePersistence:
+    """
+    SQLite (WAL) table of wisdom rows with an FTS5 trigram index.
+
+    The trigram tokenizer answers case-insensitive substring queries of
+    three or more characters, which is exactly what search_wisdom needs
+    for its content match. An existing JSON snapshot/journal is imported
+    the first time the database is opened.
+    """
+
+    journal_entries = 0
+
+    def __init__(self, db_file: Path, legacy: _JournalPersistence):
+        self.db_file = db_file
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS wisdom ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL,"
+            " data TEXT NOT NULL, usage_count INTEGER NOT NULL DEFAULT 0, last_used TEXT)"
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS wisdom_fts USING fts5("
+            "content, keywords, themes, tokenize='trigram')"
+        )
+        self._legacy = legacy
+
+    def load(self) -> list[dict]:
+        rows = self._conn.execute("SELECT data, usage_count, last_used FROM wisdom ORDER BY seq").fetchall()
+        if not rows and (self._legacy.snapshot_file.exists() or self._legacy.journal_file.exists()):
+            items = self._legacy.load()
+            with self._conn:
+                for item in items:
+                    self._insert(item)
+            logger.info(f"Imported {len(items)} wisdom items into {self.db_file.name}")
+            return items
+
+        items = []
+        for data, usage_count, last_used in rows:
+            item = json.loads(data)
+            item["usage_count"] = usage_count
+            item["last_used"] = last_used
+            items.append(item)
+        return items
+
+    def _insert(self, item: dict):
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO wisdom (id, data, usage_count, last_used) VALUES (?, ?, ?, ?)",
+            (item["id"], json.dumps(item, ensure_ascii=False), item.get("usage_count", 0), item.get("last_used")),
+        )
+        if cursor.rowcount:
+            self._conn.execute(
+                "INSERT INTO wisdom_fts (rowid, content, keywords, themes) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, item["content"], "\n".join(item["keywords"]), "\n".join(item["themes"])),
+            )
+
+    def add(self, item: dict):
+        with self._conn:
+            self._insert(item)
+
+    def update_usage(self, updates: list[tuple[str, int, str | None]]):
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE wisdom SET usage_count = ?, last_used = ? WHERE id = ?",
+                [(count, last_used, wid) for wid, count, last_used in updates],
+            )
+
+    def compact(self, _items: list[dict]):
+        with self._conn:
+            self._conn.execute("INSERT INTO wisdom_fts (wisdom_fts) VALUES ('optimize')")
+
+    def search(self, query_lower: str) -> list[str] | None:
+        """Ids whose content, keywords or themes contain the query (None if too short)."""
+        if len(query_lower) < 3:
+            return None
+        phrase = '"' + query_lower.replace('"', '""') + '"'
+        rows = self._conn.execute(
+            "SELECT w.id FROM wisdom_fts JOIN wisdom w ON w.seq = wisdom_fts.rowid WHERE wisdom_fts MATCH ?",
+            (phrase,),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self):
+        self._conn.close()
+
+
 class KnowledgeStore:
     """
     Persistent storage for learned Gita wisdom.
 
     Features:
-    - JSON-based storage with backup
-    - Indexed by chapter, verse, theme, language
+    - Append-only journal over a JSON snapshot, compacted once the journal
+      outgrows the snapshot (or SQLite with an FTS5 index when
+      KIAAN_KNOWLEDGE_BACKEND=sqlite)
+    - Secondary indexes by chapter, theme, inner enemy and keyword, plus an
+      inverted index over content tokens, so lookups and search_wisdom only
+      touch matching items
+    - Usage counters buffered in memory and flushed in batches
     - Quality scoring and validation tracking
-    - Usage statistics for relevance ranking
     """
 
-    def __init__(self, storage_dir: str = None):
+    def __init__(self, storage_dir: str = None, backend: str = None):
         self.storage_dir = Path(storage_dir or Path.home() / ".mindvibe" / "kiaan_knowledge")
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
@@ -704,15 +935,39 @@ class KnowledgeStore:
         self.patterns_file = self.storage_dir / "query_patterns.json"
         self.sources_file = self.storage_dir / "content_sources.json"
 
+        self.backend = backend or KNOWLEDGE_STORE_BACKEND
+        journal = _JournalPersistence(self.wisdom_file)
+        if self.backend == "sqlite":
+            self._persistence = _SQLitePersistence(self.storage_dir / "learned_wisdom.db", journal)
+        else:
+            self._persistence = journal
+
+        self._lock = threading.RLock()
         self._wisdom_cache: dict[str, LearnedWisdom] = {}
         self._patterns_cache: dict[str, UserQueryPattern] = {}
         self._sources_cache: dict[str, ContentSource] = {}
 
+        # Secondary indexes: value -> ids. _seq keeps insertion order so
+        # indexed lookups return items in the same order as a full scan.
+        self._seq: dict[str, int] = {}
+        self._by_chapter: dict[int, set[str]] = {}
+        self._by_shad_ripu: dict[str, set[str]] = {}
+        self._by_theme: dict[str, set[str]] = {}
+        self._by_keyword: dict[str, set[str]] = {}
+        # Content token postings, built on the first search_wisdom call
+        self._by_token: dict[str, set[str]] | None = None
+
+        self._compaction_enabled = True
+        self._pending_usage: set[str] = set()
+        self._last_usage_flush = time.monotonic()
+
         self._load_all()
 
     def _load_all(self):
         """Load all data from disk."""
         self._wisdom_cache = self._load_wisdom()
+        for wisdom in self._wisdom_cache.values():
+            self._index(wisdom)
         self._patterns_cache = self._load_patterns()
         self._sources_cache = self._load_sources()
 
@@ -720,38 +975,15 @@ class KnowledgeStore:
             f"KnowledgeStore loaded: {len(self._wisdom_cache)} wisdom items, "
             f"{len(self._patterns_cache)} patterns, {len(self._sources_cache)} sources"
         )
+        self._maybe_compact()
 
     def _load_wisdom(self) -> dict[str, LearnedWisdom]:
         """Load wisdom from disk."""
-        if not self.wisdom_file.exists():
-            return {}
-
         try:
-            with open(self.wisdom_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return {
-                    item["id"]: LearnedWisdom(
-                        id=item["id"],
-                        content=item["content"],
-                        source_type=ContentType(item["source_type"]),
-                        source_url=item["source_url"],
-                        source_name=item["source_name"],
-                        language=item["language"],
-                        chapter_refs=item["chapter_refs"],
-                        verse_refs=[tuple(v) for v in item["verse_refs"]],
-                        themes=item["themes"],
-                        shad_ripu_tags=item["shad_ripu_tags"],
-                        keywords=item["keywords"],
-                        quality_score=item["quality_score"],
-                        validation_status=item["validation_status"],
-                        learned_at=datetime.fromisoformat(item["learned_at"]),
-                        usage_count=item.get("usage_count", 0),
-                        last_used=datetime.fromisoformat(item["last_used"]) if item.get("last_used") else None,
-                        metadata=item.get("metadata", item.get("extra_metadata", {})),
-                    )
-                    for item in data
-                }
+            return {item["id"]: _wisdom_from_dict(item) for item in self._persistence.load()}
         except Exception as e:
+            # Never compact over a snapshot we failed to read
+            self._compaction_enabled = False
             logger.error(f"Error loading wisdom: {e}")
             return {}
 
@@ -761,7 +993,7 @@ class KnowledgeStore:
             return {}
 
         try:
-            with open(self.patterns_file, "r", encoding="utf-8") as f:
+            with open(self.patterns_file, encoding="utf-8") as f:
                 data = json.load(f)
                 return {
                     item["id"]: UserQueryPattern(
@@ -787,7 +1019,7 @@ class KnowledgeStore:
             return {}
 
         try:
-            with open(self.sources_file, "r", encoding="utf-8") as f:
+            with open(self.sources_file, encoding="utf-8") as f:
                 data = json.load(f)
                 return {
                     item["id"]: ContentSource(
@@ -809,35 +1041,20 @@ class KnowledgeStore:
             return {}
 
     def _save_wisdom(self):
-        """Save wisdom to disk."""
-        try:
-            data = [
-                {
-                    "id": w.id,
-                    "content": w.content,
-                    "source_type": w.source_type.value,
-                    "source_url": w.source_url,
-                    "source_name": w.source_name,
-                    "language": w.language,
-                    "chapter_refs": w.chapter_refs,
-                    "verse_refs": [list(v) for v in w.verse_refs],
-                    "themes": w.themes,
-                    "shad_ripu_tags": w.shad_ripu_tags,
-                    "keywords": w.keywords,
-                    "quality_score": w.quality_score,
-                    "validation_status": w.validation_status,
-                    "learned_at": w.learned_at.isoformat(),
-                    "usage_count": w.usage_count,
-                    "last_used": w.last_used.isoformat() if w.last_used else None,
-                    "metadata": w.metadata,
-                }
-                for w in self._wisdom_cache.values()
-            ]
+        """Compact the journal into a fresh snapshot of the whole corpus."""
+        with self._lock:
+            self._flush_usage()
+            try:
+                self._persistence.compact([_wisdom_to_dict(w) for w in self._wisdom_cache.values()])
+            except Exception as e:
+                logger.error(f"Error saving wisdom: {e}")
 
-            with open(self.wisdom_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving wisdom: {e}")
+    def _maybe_compact(self):
+        """Compact once the journal is as large as the snapshot (amortized O(1) per write)."""
+        if not self._compaction_enabled:
+            return
+        if self._persistence.journal_entries >= max(KNOWLEDGE_COMPACT_MIN_ENTRIES, len(self._wisdom_cache)):
+            self._save_wisdom()
 
     def _save_patterns(self):
         """Save patterns to disk."""
@@ -862,45 +1079,122 @@ class KnowledgeStore:
         except Exception as e:
             logger.error(f"Error saving patterns: {e}")
 
+    # -------------------------------------------------------------------------
+    # Indexes
+    # -------------------------------------------------------------------------
+
+    def _index(self, wisdom: LearnedWisdom):
+        """Add a wisdom item to the secondary and inverted indexes."""
+        wid = wisdom.id
+        self._seq[wid] = len(self._seq)
+        for chapter in wisdom.chapter_refs:
+            self._by_chapter.setdefault(chapter, set()).add(wid)
+        for enemy in wisdom.shad_ripu_tags:
+            self._by_shad_ripu.setdefault(enemy, set()).add(wid)
+        for theme in wisdom.themes:
+            self._by_theme.setdefault(theme.lower(), set()).add(wid)
+        for keyword in wisdom.keywords:
+            self._by_keyword.setdefault(keyword.lower(), set()).add(wid)
+        if self._by_token is not None:
+            self._index_tokens(wisdom)
+
+    def _index_tokens(self, wisdom: LearnedWisdom):
+        for token in set(_TOKEN_RE.findall(wisdom.content.lower())):
+            self._by_token.setdefault(token, set()).add(wisdom.id)
+
+    def _validated(self, ids) -> list[LearnedWisdom]:
+        """Validated items for ids, in insertion order."""
+        return [
+            self._wisdom_cache[wid] for wid in sorted(ids, key=self._seq.__getitem__)
+            if self._wisdom_cache[wid].validation_status == "validated"
+        ]
+
+    @staticmethod
+    def _matching(index: dict[str, set[str]], query_lower: str) -> set[str]:
+        """Ids under every index key that contains query_lower as a substring."""
+        ids: set[str] = set()
+        for key, key_ids in index.items():
+            if query_lower in key:
+                ids |= key_ids
+        return ids
+
+    def _content_candidates(self, query_lower: str) -> set[str] | None:
+        """
+        Superset of the ids whose content contains query_lower.
+
+        Each word of the query must sit inside some word of the content, so
+        intersect, per query word, the postings of every vocabulary token
+        containing it. Returns None when the query has no word characters.
+        """
+        found = self._persistence.search(query_lower)
+        if found is not None:
+            return set(found)
+
+        words = _TOKEN_RE.findall(query_lower)
+        if not words:
+            return None
+        if self._by_token is None:
+            with self._lock:
+                if self._by_token is None:
+                    self._by_token = {}
+                    for wisdom in self._wisdom_cache.values():
+                        self._index_tokens(wisdom)
+        candidates: set[str] | None = None
+        for word in sorted(set(words), key=len, reverse=True):
+            ids = self._matching(self._by_token, word)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        return candidates
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
     def add_wisdom(self, wisdom: LearnedWisdom) -> bool:
         """Add new wisdom to the store."""
-        if wisdom.id in self._wisdom_cache:
-            return False
+        with self._lock:
+            if wisdom.id in self._wisdom_cache:
+                return False
 
-        self._wisdom_cache[wisdom.id] = wisdom
-        self._save_wisdom()
+            self._wisdom_cache[wisdom.id] = wisdom
+            self._index(wisdom)
+            try:
+                self._persistence.add(_wisdom_to_dict(wisdom))
+            except Exception as e:
+                logger.error(f"Error saving wisdom: {e}")
+            self._maybe_compact()
         logger.info(f"Added wisdom: {wisdom.id[:8]}... from {wisdom.source_name}")
         return True
 
     def get_wisdom_by_chapter(self, chapter: int) -> list[LearnedWisdom]:
         """Get all wisdom related to a chapter."""
-        return [
-            w for w in self._wisdom_cache.values()
-            if chapter in w.chapter_refs and w.validation_status == "validated"
-        ]
+        return self._validated(self._by_chapter.get(chapter, ()))
 
     def get_wisdom_by_theme(self, theme: str) -> list[LearnedWisdom]:
         """Get all wisdom related to a theme."""
-        theme_lower = theme.lower()
-        return [
-            w for w in self._wisdom_cache.values()
-            if any(theme_lower in t.lower() for t in w.themes)
-            and w.validation_status == "validated"
-        ]
+        return self._validated(self._matching(self._by_theme, theme.lower()))
 
     def get_wisdom_by_shad_ripu(self, enemy: str) -> list[LearnedWisdom]:
         """Get all wisdom related to a specific inner enemy."""
-        return [
-            w for w in self._wisdom_cache.values()
-            if enemy in w.shad_ripu_tags and w.validation_status == "validated"
-        ]
+        return self._validated(self._by_shad_ripu.get(enemy, ()))
 
     def search_wisdom(self, query: str, limit: int = 10) -> list[LearnedWisdom]:
         """Search wisdom by content and keywords."""
         query_lower = query.lower()
-        results = []
 
-        for w in self._wisdom_cache.values():
+        content_ids = self._content_candidates(query_lower)
+        if content_ids is None:
+            candidates = self._wisdom_cache.values()
+        else:
+            candidates = self._validated(
+                content_ids
+                | self._matching(self._by_keyword, query_lower)
+                | self._matching(self._by_theme, query_lower)
+            )
+
+        results = []
+        for w in candidates:
             if w.validation_status != "validated":
                 continue
 
@@ -928,11 +1222,46 @@ class KnowledgeStore:
         return [w for w, _ in results[:limit]]
 
     def record_usage(self, wisdom_id: str):
-        """Record usage of a wisdom item."""
-        if wisdom_id in self._wisdom_cache:
+        """Record usage of a wisdom item (persisted in batches, see flush)."""
+        with self._lock:
+            if wisdom_id not in self._wisdom_cache:
+                return
             self._wisdom_cache[wisdom_id].usage_count += 1
             self._wisdom_cache[wisdom_id].last_used = datetime.now()
-            self._save_wisdom()
+            self._pending_usage.add(wisdom_id)
+
+            if (
+                len(self._pending_usage) >= KNOWLEDGE_USAGE_FLUSH_SIZE
+                or time.monotonic() - self._last_usage_flush >= KNOWLEDGE_USAGE_FLUSH_SECONDS
+            ):
+                self._flush_usage()
+                self._maybe_compact()
+
+    def _flush_usage(self):
+        """Write buffered usage counters (absolute values, so replay is idempotent)."""
+        self._last_usage_flush = time.monotonic()
+        if not self._pending_usage:
+            return
+        updates = []
+        for wid in self._pending_usage:
+            w = self._wisdom_cache[wid]
+            updates.append((wid, w.usage_count, w.last_used.isoformat() if w.last_used else None))
+        self._pending_usage.clear()
+        try:
+            self._persistence.update_usage(updates)
+        except Exception as e:
+            logger.error(f"Error saving wisdom usage: {e}")
+
+    def flush(self):
+        """Persist buffered usage counters now."""
+        with self._lock:
+            self._flush_usage()
+
+    def close(self):
+        """Flush pending writes and release file handles."""
+        with self._lock:
+            self._flush_usage()
+            self._persistence.close()
 
     def get_statistics(self) -> dict:
         """Get knowledge store statistics."""
@@ -950,6 +1279,9 @@ class KnowledgeStore:
                 ch for w in validated for ch in w.chapter_refs
             ))),
             "average_quality_score": sum(w.quality_score for w in validated) / len(validated) if validated else 0,
+            "storage_backend": self.backend,
+            "journal_entries": self._persistence.journal_entries,
+            "pending_usage_updates": len(self._pending_usage),
         }
 
 
@@ -1168,6 +1500,8 @@ class KIAANLearningEngine:
         self.store = KnowledgeStore()
         self.fetcher = ContentFetcher(self.validator)
         self.learner = QueryLearner(self.store)
+        # Buffered usage counters must reach disk on interpreter exit
+        atexit.register(self.store.close)
 
         self._acquisition_lock = asyncio.Lock()
         self._last_acquisition = None
@@ -1441,7 +1775,7 @@ class KIAANLearningEngine:
     # Automatic Scheduled Learning (v4.1)
     # -------------------------------------------------------------------------
 
-    _scheduler_task: Optional[asyncio.Task] = None
+    _scheduler_task: asyncio.Task | None = None
     _scheduler_running: bool = False
 
     async def _scheduler_loop(self):
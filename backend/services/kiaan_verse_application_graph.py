@@ -21,18 +21,40 @@ Weight update rules:
 
 This graph replaces static mood-to-verse mappings with a dynamic,
 feedback-driven system that gets more accurate over time.
+
+Write path:
+    record_show() / record_signal() only append to an in-memory write-behind
+    buffer that coalesces events per (verse, mood, topic) edge. A background
+    flusher (start()/stop(), wired up in backend/main.py) writes the buffer
+    every VERSE_GRAPH_FLUSH_SECONDS as one multi-row UPSERT per chunk plus one
+    bulk UPDATE for the edges whose weight changed. Signals are replayed in
+    arrival order, so weights match one-at-a-time updates. Without a running
+    flusher (scripts, tests) every call flushes immediately. Events buffered
+    when the process dies are lost, as with any write-behind counter.
+
+Read path:
+    recommend() reads the precomputed top-k table (verse_recommendations),
+    refreshed for the situations touched since the last refresh. Situations
+    not in the table yet are scored from the edges as before.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import math
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, case, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from backend.models.self_sufficiency import VerseApplicationEdge
+from backend.core.db_utils import dialect_insert
+from backend.models.self_sufficiency import VerseApplicationEdge, VerseRecommendation
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +71,74 @@ DECAY_RATE = 0.005
 PRIOR_POSITIVE = 1
 PRIOR_NEGATIVE = 1
 
+# Write-behind buffer: flush interval, and the number of buffered edges that
+# triggers an early flush
+VERSE_GRAPH_FLUSH_SECONDS = float(os.getenv("VERSE_GRAPH_FLUSH_SECONDS", "2"))
+VERSE_GRAPH_FLUSH_SIZE = int(os.getenv("VERSE_GRAPH_FLUSH_SIZE", "1000"))
+
+# How often touched situations get their top-k recommendations recomputed,
+# and how many verses are kept per situation (room for exclude_refs)
+VERSE_GRAPH_REFRESH_SECONDS = float(os.getenv("VERSE_GRAPH_REFRESH_SECONDS", "60"))
+VERSE_GRAPH_TOP_K = int(os.getenv("VERSE_GRAPH_TOP_K", "50"))
+
+# Topic of the mood-only ranking in verse_recommendations
+ANY_TOPIC = "*"
+
+# Edges per UPSERT statement / situations per refresh transaction
+_FLUSH_CHUNK = 500
+_REFRESH_CHUNK = 200
+
+
+@dataclass
+class _EdgeDelta:
+    """Buffered events for one edge: show count and signals in arrival order."""
+
+    shown: int = 0
+    signals: list[bool] = field(default_factory=list)
+
+    def merge(self, later: _EdgeDelta) -> None:
+        self.shown += later.shown
+        self.signals.extend(later.signals)
+
+
+class EdgeEventBuffer:
+    """In-memory write-behind buffer coalescing graph events per edge."""
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple[str, str, str], _EdgeDelta] = {}
+        self.events_buffered = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _delta(self, verse_ref: str, mood: str, topic: str) -> _EdgeDelta:
+        key = (verse_ref, mood, topic)
+        delta = self._pending.get(key)
+        if delta is None:
+            delta = self._pending[key] = _EdgeDelta()
+        self.events_buffered += 1
+        return delta
+
+    def add_show(self, verse_ref: str, mood: str, topic: str) -> None:
+        self._delta(verse_ref, mood, topic).shown += 1
+
+    def add_signal(self, verse_ref: str, mood: str, topic: str, positive: bool) -> None:
+        self._delta(verse_ref, mood, topic).signals.append(positive)
+
+    def drain(self) -> dict[tuple[str, str, str], _EdgeDelta]:
+        """Take every buffered edge, leaving the buffer empty."""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, drained: dict[tuple[str, str, str], _EdgeDelta]) -> None:
+        """Put back a drained batch that failed to flush, ahead of newer events."""
+        for key, delta in self._pending.items():
+            if key in drained:
+                drained[key].merge(delta)
+            else:
+                drained[key] = delta
+        self._pending = drained
+
 
 class VerseApplicationGraph:
     """
@@ -60,6 +150,16 @@ class VerseApplicationGraph:
     3. recommend() — Query the graph for best verses given mood+topic
     """
 
+    def __init__(self) -> None:
+        self._buffer = EdgeEventBuffer()
+        self._dirty_situations: set[tuple[str, str]] = set()
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        self._running = False
+        self._last_refresh = 0.0
+        self._stats = {"events_flushed": 0, "edges_flushed": 0, "flushes": 0, "flush_failures": 0}
+
     # =========================================================================
     # GRAPH OPERATIONS
     # =========================================================================
@@ -70,22 +170,15 @@ class VerseApplicationGraph:
         verse_ref: str,
         mood: str,
         topic: str,
-    ) -> VerseApplicationEdge:
+    ) -> None:
         """
         Record that a verse was shown to a user for a given situation.
 
-        Creates the edge if it doesn't exist, increments times_shown.
+        Buffered; the flush creates the edge if it doesn't exist and
+        increments times_shown.
         """
-        edge = await self._get_or_create_edge(db, verse_ref, mood, topic)
-
-        await db.execute(
-            update(VerseApplicationEdge)
-            .where(VerseApplicationEdge.id == edge.id)
-            .values(times_shown=VerseApplicationEdge.times_shown + 1)
-        )
-        await db.commit()
-
-        return edge
+        self._buffer.add_show(verse_ref, mood, topic)
+        await self._after_record(db)
 
     async def record_signal(
         self,
@@ -94,7 +187,7 @@ class VerseApplicationGraph:
         mood: str,
         topic: str,
         positive: bool,
-    ) -> VerseApplicationEdge:
+    ) -> None:
         """
         Record user feedback for a verse in a given situation.
 
@@ -108,45 +201,119 @@ class VerseApplicationGraph:
         - User rated response unhelpful
         - User gave thumbs down
         - User explicitly said verse wasn't relevant
-        """
-        edge = await self._get_or_create_edge(db, verse_ref, mood, topic)
 
-        if positive:
-            new_positive = edge.positive_signals + 1
-            new_negative = edge.negative_signals
-        else:
-            new_positive = edge.positive_signals
-            new_negative = edge.negative_signals + 1
-
-        # Recalculate weight using exponential moving average
-        new_weight = self._calculate_weight(
-            edge.weight, positive, LEARNING_RATE
+        Buffered; the flush updates weight (exponential moving average, in
+        arrival order) and confidence (Bayesian) from the stored edge.
+        """
+        self._buffer.add_signal(verse_ref, mood, topic, positive)
+        logger.debug(
+            f"[VerseGraph] {verse_ref} → ({mood}, {topic}): "
+            f"{'positive' if positive else 'negative'} signal buffered"
         )
+        await self._after_record(db)
 
-        # Recalculate confidence using Bayesian approach
-        new_confidence = self._calculate_confidence(
-            new_positive, new_negative, edge.times_shown
-        )
+    async def _after_record(self, db: AsyncSession) -> None:
+        if not self._running:
+            await self.flush(db)
+        elif len(self._buffer) >= VERSE_GRAPH_FLUSH_SIZE:
+            self._wake.set()
 
-        await db.execute(
-            update(VerseApplicationEdge)
-            .where(VerseApplicationEdge.id == edge.id)
-            .values(
-                weight=new_weight,
-                confidence=new_confidence,
-                positive_signals=new_positive,
-                negative_signals=new_negative,
-            )
-        )
-        await db.commit()
+    async def flush(self, db: AsyncSession) -> int:
+        """
+        Write buffered events as set-based UPSERTs and commit.
 
-        logger.info(
-            f"[VerseGraph] {verse_ref} → ({mood}, {topic}): "
-            f"weight={new_weight:.3f} conf={new_confidence:.3f} "
-            f"({'positive' if positive else 'negative'})"
+        Per chunk of edges: one multi-row INSERT .. ON CONFLICT that creates
+        missing edges, adds the counters and returns the stored weights
+        (locking the rows), then one bulk UPDATE of weight and confidence
+        for the edges that received signals. On failure the batch goes back
+        into the buffer and the error is re-raised.
+
+        Returns:
+            Number of edges written
+        """
+        pending = self._buffer.drain()
+        if not pending:
+            return 0
+
+        try:
+            keys = sorted(pending)  # consistent lock order across flushers
+            for i in range(0, len(keys), _FLUSH_CHUNK):
+                await self._flush_chunk(db, keys[i:i + _FLUSH_CHUNK], pending)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            self._buffer.restore(pending)
+            self._stats["flush_failures"] += 1
+            raise
+
+        events = sum(d.shown + len(d.signals) for d in pending.values())
+        self._stats["flushes"] += 1
+        self._stats["edges_flushed"] += len(pending)
+        self._stats["events_flushed"] += events
+        for _, mood, topic in pending:
+            self._dirty_situations.add((mood, topic))
+            self._dirty_situations.add((mood, ANY_TOPIC))
+        logger.debug(f"[VerseGraph] Flushed {events} events into {len(pending)} edges")
+        return len(pending)
+
+    async def _flush_chunk(
+        self,
+        db: AsyncSession,
+        keys: list[tuple[str, str, str]],
+        pending: dict[tuple[str, str, str], _EdgeDelta],
+    ) -> None:
+        table = VerseApplicationEdge.__table__
+        upsert = dialect_insert(db)(table)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[table.c.verse_ref, table.c.mood, table.c.topic],
+            set_={
+                "times_shown": table.c.times_shown + upsert.excluded.times_shown,
+                "positive_signals": table.c.positive_signals + upsert.excluded.positive_signals,
+                "negative_signals": table.c.negative_signals + upsert.excluded.negative_signals,
+                "updated_at": func.now(),
+            },
+        ).returning(
+            table.c.id, table.c.verse_ref, table.c.mood, table.c.topic, table.c.weight,
+            table.c.positive_signals, table.c.negative_signals, table.c.times_shown,
         )
+        # executemany: compiled once, sent as multi-row VALUES batches
+        result = await db.execute(upsert, [
+            {
+                "verse_ref": verse_ref,
+                "mood": mood,
+                "topic": topic,
+                "weight": 0.5,  # New edges start neutral
+                "confidence": 0.1,
+                "times_shown": pending[(verse_ref, mood, topic)].shown,
+                "positive_signals": sum(pending[(verse_ref, mood, topic)].signals),
+                "negative_signals": len(pending[(verse_ref, mood, topic)].signals)
+                - sum(pending[(verse_ref, mood, topic)].signals),
+            }
+            for verse_ref, mood, topic in keys
+        ])
 
-        return edge
+        updates = []
+        for row in result.all():
+            signals = pending[(row.verse_ref, row.mood, row.topic)].signals
+            if not signals:
+                continue
+            weight = row.weight
+            for positive in signals:
+                weight = self._calculate_weight(weight, positive, LEARNING_RATE)
+            updates.append({
+                "edge_id": row.id,
+                "new_weight": weight,
+                "new_confidence": self._calculate_confidence(
+                    row.positive_signals, row.negative_signals, row.times_shown
+                ),
+            })
+        if updates:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("edge_id"))
+                .values(weight=bindparam("new_weight"), confidence=bindparam("new_confidence")),
+                updates,
+            )
 
     async def recommend(
         self,
@@ -160,13 +327,18 @@ class VerseApplicationGraph:
         Get the best verse recommendations for a mood+topic situation.
 
         Returns verses ranked by (weight * confidence), ensuring diversity
-        by not repeating recently-shown verses.
+        by not repeating recently-shown verses. Served from the precomputed
+        top-k table; situations it doesn't cover yet are scored live.
 
         Returns:
             List of dicts with verse_ref, weight, confidence, composite_score
         """
         exclude_refs = exclude_refs or []
 
+        recommended = await self._read_recommendations(db, mood, topic, exclude_refs, limit)
+        if recommended:
+            return recommended
+
         query = (
             select(VerseApplicationEdge)
             .where(
@@ -186,6 +358,10 @@ class VerseApplicationGraph:
 
         if not edges:
             # Try broader match: mood only (any topic)
+            recommended = await self._read_recommendations(db, mood, ANY_TOPIC, exclude_refs, limit)
+            if recommended:
+                return recommended
+
             query = (
                 select(VerseApplicationEdge)
                 .where(
@@ -204,7 +380,43 @@ class VerseApplicationGraph:
         if not edges:
             return []
 
-        # Score each edge: weight * confidence (with exploration bonus)
+        return self._rank_edges(edges)[:limit]
+
+    async def _read_recommendations(
+        self,
+        db: AsyncSession,
+        mood: str,
+        topic: str,
+        exclude_refs: list[str],
+        limit: int,
+    ) -> list[dict]:
+        """Read a situation's precomputed ranking (empty if not precomputed)."""
+        query = (
+            select(VerseRecommendation)
+            .where(VerseRecommendation.mood == mood, VerseRecommendation.topic == topic)
+            .order_by(VerseRecommendation.rank)
+            .limit(limit)
+        )
+        if exclude_refs:
+            query = query.where(VerseRecommendation.verse_ref.notin_(exclude_refs))
+
+        result = await db.execute(query)
+        return [
+            {
+                "verse_ref": rec.verse_ref,
+                "weight": round(rec.weight, 4),
+                "confidence": round(rec.confidence, 4),
+                "composite_score": round(rec.composite_score, 4),
+                "times_shown": rec.times_shown,
+                "positive_signals": rec.positive_signals,
+                "negative_signals": rec.negative_signals,
+            }
+            for rec in result.scalars().all()
+        ]
+
+    @staticmethod
+    def _rank_edges(edges: Iterable[VerseApplicationEdge]) -> list[dict]:
+        """Score edges (weight * confidence + exploration bonus), best first."""
         scored = []
         for edge in edges:
             composite = edge.weight * edge.confidence
@@ -225,8 +437,130 @@ class VerseApplicationGraph:
 
         # Sort by composite score
         scored.sort(key=lambda x: x["composite_score"], reverse=True)
+        return scored
+
+    async def refresh_recommendations(
+        self,
+        db: AsyncSession,
+        situations: Iterable[tuple[str, str]] | None = None,
+    ) -> int:
+        """
+        Recompute the top-k table for the given (mood, topic) situations.
+
+        With no situations, every mood+topic in the graph (and every mood's
+        "*" ranking) is rebuilt. Uses the same scoring as the live path.
+
+        Returns:
+            Number of situations refreshed
+        """
+        edge = VerseApplicationEdge
+        if situations is None:
+            result = await db.execute(select(edge.mood, edge.topic).distinct())
+            pairs = [tuple(row) for row in result.all()]
+            situations = set(pairs) | {(mood, ANY_TOPIC) for mood, _ in pairs}
+        situations = sorted(set(situations))
+
+        for i in range(0, len(situations), _REFRESH_CHUNK):
+            chunk = situations[i:i + _REFRESH_CHUNK]
+            moods = {mood for mood, _ in chunk}
+            result = await db.execute(
+                select(edge)
+                .where(edge.mood.in_(moods), edge.confidence >= MIN_CONFIDENCE_THRESHOLD)
+                .order_by(edge.id)
+            )
+            by_situation: dict[tuple[str, str], list[VerseApplicationEdge]] = {}
+            for e in result.scalars().all():
+                by_situation.setdefault((e.mood, e.topic), []).append(e)
+                by_situation.setdefault((e.mood, ANY_TOPIC), []).append(e)
+
+            rows = []
+            for mood, topic in chunk:
+                for rank, item in enumerate(self._rank_edges(by_situation.get((mood, topic), ()))[:VERSE_GRAPH_TOP_K]):
+                    rows.append({"mood": mood, "topic": topic, "rank": rank, **item})
+
+            await db.execute(
+                delete(VerseRecommendation).where(
+                    tuple_(VerseRecommendation.mood, VerseRecommendation.topic).in_(chunk)
+                )
+            )
+            if rows:
+                await db.execute(insert(VerseRecommendation), rows)
+            await db.commit()
+
+        self._last_refresh = time.monotonic()
+        return len(situations)
+
+    # =========================================================================
+    # BACKGROUND FLUSHER
+    # =========================================================================
 
-        return scored[:limit]
+    async def start(self, session_maker: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Start write-behind mode with a background flush/refresh loop."""
+        if self._running:
+            return
+        if session_maker is None:
+            # Import lazily so this module has no import-time dependency on
+            # the DB engine (matters for unit tests).
+            from backend import deps
+
+            session_maker = deps.SessionLocal
+        self._session_maker = session_maker
+        self._wake = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name="verse_graph_flusher")
+        logger.info(
+            f"[VerseGraph] Write-behind flusher started "
+            f"(every {VERSE_GRAPH_FLUSH_SECONDS}s or {VERSE_GRAPH_FLUSH_SIZE} edges)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the loop and flush whatever is still buffered."""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._session_maker is not None and len(self._buffer):
+            async with self._session_maker() as db:
+                await self.flush(db)
+        logger.info("[VerseGraph] Write-behind flusher stopped")
+
+    async def _loop(self) -> None:
+        """Flush on a timer (or when the buffer fills), refresh touched situations."""
+        while self._running:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), VERSE_GRAPH_FLUSH_SECONDS)
+            self._wake.clear()
+            try:
+                assert self._session_maker is not None
+                async with self._session_maker() as db:
+                    await self.flush(db)
+                    if (
+                        self._dirty_situations
+                        and time.monotonic() - self._last_refresh >= VERSE_GRAPH_REFRESH_SECONDS
+                    ):
+                        situations, self._dirty_situations = self._dirty_situations, set()
+                        try:
+                            await self.refresh_recommendations(db, situations)
+                        except Exception:
+                            self._dirty_situations |= situations
+                            raise
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[VerseGraph] Flush failed (will retry): {e}")
+
+    @property
+    def status(self) -> dict:
+        """Buffer and flusher status (useful for /health / admin routes)."""
+        return {
+            "running": self._running,
+            "buffered_edges": len(self._buffer),
+            "events_buffered": self._buffer.events_buffered,
+            "dirty_situations": len(self._dirty_situations),
+            **self._stats,
+        }
 
     async def get_verse_profile(
         self, db: AsyncSession, verse_ref: str
@@ -273,41 +607,39 @@ class VerseApplicationGraph:
         Should be run as a scheduled task (daily or weekly).
         """
         cutoff = datetime.utcnow() - timedelta(days=days_since_update)
+        step = DECAY_RATE * days_since_update
+        edge = VerseApplicationEdge
+        stale = (edge.updated_at < cutoff, edge.weight != 0.5)
 
+        situations = await db.execute(select(edge.mood, edge.topic).where(*stale).distinct())
+        situations = [tuple(row) for row in situations.all()]
+
+        # Decay toward 0.5 (neutral) in one statement
         result = await db.execute(
-            select(VerseApplicationEdge).where(
-                VerseApplicationEdge.updated_at < cutoff
+            update(edge)
+            .where(*stale)
+            .values(
+                weight=case(
+                    (edge.weight > 0.5 + step, edge.weight - step),
+                    (edge.weight < 0.5 - step, edge.weight + step),
+                    else_=0.5,
+                )
             )
+            .execution_options(synchronize_session=False)
         )
-        stale_edges = list(result.scalars().all())
-
-        updated = 0
-        for edge in stale_edges:
-            # Decay toward 0.5 (neutral)
-            if edge.weight > 0.5:
-                new_weight = max(0.5, edge.weight - DECAY_RATE * days_since_update)
-            elif edge.weight < 0.5:
-                new_weight = min(0.5, edge.weight + DECAY_RATE * days_since_update)
-            else:
-                continue
-
-            await db.execute(
-                update(VerseApplicationEdge)
-                .where(VerseApplicationEdge.id == edge.id)
-                .values(weight=new_weight)
-            )
-            updated += 1
+        updated = result.rowcount or 0
 
         if updated:
             await db.commit()
+            for mood, topic in situations:
+                self._dirty_situations.add((mood, topic))
+                self._dirty_situations.add((mood, ANY_TOPIC))
             logger.info(f"[VerseGraph] Decayed {updated} stale edges")
 
         return updated
 
     async def get_statistics(self, db: AsyncSession) -> dict:
         """Get graph statistics for monitoring."""
-        from sqlalchemy import func
-
         total_result = await db.execute(
             select(func.count(VerseApplicationEdge.id))
         )
@@ -355,42 +687,6 @@ class VerseApplicationGraph:
     # INTERNAL HELPERS
     # =========================================================================
 
-    async def _get_or_create_edge(
-        self,
-        db: AsyncSession,
-        verse_ref: str,
-        mood: str,
-        topic: str,
-    ) -> VerseApplicationEdge:
-        """Get existing edge or create a new one."""
-        result = await db.execute(
-            select(VerseApplicationEdge).where(
-                VerseApplicationEdge.verse_ref == verse_ref,
-                VerseApplicationEdge.mood == mood,
-                VerseApplicationEdge.topic == topic,
-            )
-        )
-        edge = result.scalar_one_or_none()
-
-        if edge:
-            return edge
-
-        # Create new edge with neutral weight
-        edge = VerseApplicationEdge(
-            verse_ref=verse_ref,
-            mood=mood,
-            topic=topic,
-            weight=0.5,
-            confidence=0.1,
-            times_shown=0,
-            positive_signals=0,
-            negative_signals=0,
-        )
-        db.add(edge)
-        await db.commit()
-        await db.refresh(edge)
-        return edge
-
     @staticmethod
     def _calculate_weight(
         current_weight: float,
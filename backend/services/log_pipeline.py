@@ -0,0 +1,299 @@
+"""Non-blocking logging pipeline and the in-memory log ring.
+
+Previously every handler on the root logger ran on the thread that logged:
+the stderr stream handler wrote and flushed, and the admin buffer handler
+formatted each record into a dict, inside the request. install_log_handler()
+now leaves a single QueueHandler on the root logger. It hands the record to
+a bounded queue and returns; a QueueListener thread runs the original
+handlers and the ring handler. Messages logged with %-style arguments are
+only formatted on that thread. If the listener falls LOG_QUEUE_MAX records
+behind, new DEBUG/INFO records are dropped and counted instead of blocking
+the caller; warnings and errors wait up to a second for room.
+
+LOG_SAMPLE_RATES keeps only a fraction of the DEBUG/INFO records from
+chatty loggers (``name:rate`` pairs; a name also covers its children).
+WARNING and above are never sampled.
+
+The ring keeps the last LOG_RING_CAPACITY entries with an index per level
+and per logger, so the admin log endpoint pages through one level or one
+logger without copying the whole buffer.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from itertools import islice
+from typing import Any
+
+# Records waiting for the listener thread; beyond this new records are dropped
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "10000"))
+# Entries kept for /api/admin/backend-logs
+LOG_RING_CAPACITY = int(os.getenv("LOG_RING_CAPACITY", "2000"))
+# Comma-separated "logger:rate" pairs, e.g. "backend.services.redis_cache_enhanced:0.1"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+_PLAIN_ARGS = (str, int, float, bool, type(None))
+
+
+class LogRing:
+    """Fixed-size ring of log entries indexed by level and logger name.
+
+    Slots hold ``(seq, level, logger, entry)`` where ``entry`` is the dict
+    served by the admin API, built when the record is appended (on the
+    listener thread). Each index holds the sequence numbers of the live
+    entries in arrival order, so the entry evicted by an append is always at
+    the left of its indexes.
+    """
+
+    def __init__(self, capacity: int = LOG_RING_CAPACITY):
+        self.capacity = capacity
+        self._slots: list[tuple | None] = [None] * capacity
+        self._next = 0
+        self._by_level: dict[str, deque[int]] = {}
+        self._by_logger: dict[str, deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+
+    def append(self, created: float, level: str, logger_name: str, message: str) -> None:
+        with self._lock:
+            seq = self._next
+            slot = seq % self.capacity
+            evicted = self._slots[slot]
+            if evicted is not None:
+                self._unindex(evicted)
+            entry = {
+                "timestamp": datetime.fromtimestamp(created, tz=UTC).isoformat(),
+                "level": level,
+                "logger": logger_name,
+                "message": message,
+            }
+            self._slots[slot] = (seq, level, logger_name, entry)
+            self._by_level.setdefault(level, deque()).append(seq)
+            self._by_logger.setdefault(logger_name, deque()).append(seq)
+            self._next = seq + 1
+
+    def _unindex(self, slot: tuple) -> None:
+        _, level, logger_name, _ = slot
+        self._by_level[level].popleft()
+        seqs = self._by_logger[logger_name]
+        seqs.popleft()
+        if not seqs:
+            del self._by_logger[logger_name]
+
+    def query(
+        self,
+        level: str | None = None,
+        logger_name: str | None = None,
+        search: str | None = None,
+        offset: int = 0,
+        limit: int = 200,
+    ) -> tuple[list[dict], int]:
+        """Return one page of matching entries, newest first, and the match count."""
+        with self._lock:
+            if level and logger_name:
+                by_level = self._by_level.get(level, ())
+                by_logger = self._by_logger.get(logger_name, ())
+                seqs: Iterable[int] = min(by_level, by_logger, key=len)
+            elif level:
+                seqs = self._by_level.get(level, ())
+            elif logger_name:
+                seqs = self._by_logger.get(logger_name, ())
+            else:
+                seqs = range(max(0, self._next - self.capacity), self._next)
+
+            if not search and not (level and logger_name):
+                total = len(seqs)
+                page = [self._slots[s % self.capacity][3] for s in islice(reversed(seqs), offset, offset + limit)]
+            else:
+                needle = search.lower() if search else None
+                page, total = [], 0
+                for s in reversed(seqs):
+                    _, entry_level, entry_logger, entry = self._slots[s % self.capacity]
+                    if level and entry_level != level or logger_name and entry_logger != logger_name:
+                        continue
+                    if needle and needle not in entry["message"].lower():
+                        continue
+                    if offset <= total < offset + limit:
+                        page.append(entry)
+                    total += 1
+        return page, total
+
+    def counts_by_level(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict.fromkeys(LOG_LEVELS, 0)
+            counts.update({level: len(seqs) for level, seqs in self._by_level.items()})
+            return counts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._next = 0
+            self._by_level.clear()
+            self._by_logger.clear()
+
+
+class BufferedLogHandler(logging.Handler):
+    """Stores formatted records in a LogRing (runs on the listener thread)."""
+
+    def __init__(self, ring: LogRing):
+        super().__init__()
+        self.ring = ring
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.ring.append(record.created, record.levelname, record.name, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in N DEBUG/INFO records from loggers with a sample rate.
+
+    Runs on every thread that logs, so the per-logger counters are updated
+    under a lock.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+        self._every: dict[str, int] = {}
+        self._seen: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, name: str) -> int:
+        matches = [p for p in self.rates if name == p or name.startswith(p + ".")]
+        if not matches:
+            return 1
+        rate = self.rates[max(matches, key=len)]
+        return 0 if rate <= 0 else max(1, round(1 / rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        every = self._every.get(record.name)
+        if every is None:
+            every = self._every[record.name] = self._resolve(record.name)
+        if every == 1:
+            return True
+        with self._lock:
+            seen = self._seen.get(record.name, 0)
+            self._seen[record.name] = seen + 1
+            if every and seen % every == 0:
+                return True
+            self.sampled_out += 1
+            return False
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    rates = {}
+    for pair in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, rate = pair.rpartition(":")
+        try:
+            rates[name] = float(rate)
+        except ValueError:
+            logging.getLogger(__name__).warning(f"Ignoring bad LOG_SAMPLE_RATES entry: {pair!r}")
+    return rates
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers formatting and sheds DEBUG/INFO when full."""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener formats the record later; only merge arguments now if
+        # they are objects that could change before then
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(v, _PLAIN_ARGS) for v in values):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=1.0)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+log_ring = LogRing()
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: NonBlockingQueueHandler | None = None
+_sampler: SamplingFilter | None = None
+_moved_handlers: list[logging.Handler] = []
+
+
+def install_log_handler() -> None:
+    """Move the root logger's handlers behind a queue and start the listener.
+
+    The handlers already on the root logger (e.g. from logging.basicConfig)
+    and a BufferedLogHandler feeding ``log_ring`` run on the listener thread;
+    the root logger keeps only the queue handler. Safe to call twice.
+    """
+    global _listener, _queue_handler, _sampler
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    _moved_handlers[:] = root.handlers
+    for handler in _moved_handlers:
+        root.removeHandler(handler)
+
+    ring_handler = BufferedLogHandler(log_ring)
+    ring_handler.setLevel(logging.DEBUG)
+    ring_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    record_queue: queue.Queue = queue.Queue(LOG_QUEUE_MAX)
+    _queue_handler = NonBlockingQueueHandler(record_queue)
+    _sampler = SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES))
+    _queue_handler.addFilter(_sampler)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        record_queue, *_moved_handlers, ring_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_log_pipeline)
+
+
+def stop_log_pipeline() -> None:
+    """Write out queued records and give the root logger its handlers back."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _moved_handlers:
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
+
+
+def pipeline_status() -> dict[str, Any]:
+    return {
+        "running": _listener is not None,
+        "queue_depth": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "queue_capacity": LOG_QUEUE_MAX,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _sampler.sampled_out if _sampler else 0,
+    }
@@ -0,0 +1,439 @@
+# CONFIDENTIAL — TRADE SECRET. Property of MindVibe / Kiaanverse. See backend/services/CONFIDENTIAL.md.
+"""
+Mood Rolling Stats
+
+Incremental, per-user sufficient statistics for the analytics dashboard.
+Every figure ``AnalyticsMLService`` derives from a mood history can be
+answered from this fixed-size summary:
+
+- Welford running mean / M2 (volatility)
+- Regression sums over the entry index (trend slope)
+- EWMA of scores
+- Trailing window of the last ``RECENT_WINDOW`` scores (7d / 30d averages)
+- Weekday histograms (weekly pattern, forecast seasonality)
+- Per-tag sums and counts (tag correlations)
+- Low-mood count (risk factor)
+- IQR anomaly bounds from the last full rebuild
+
+``update()`` folds in one mood in O(1) when it is logged; ``from_points()``
+rebuilds the summary from a full history with NumPy (nightly batch).
+``apply_mood_to_stats`` / ``rebuild_mood_stats_once`` persist it in
+``user_mood_stats``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models import Mood, UserMoodStats
+
+logger = logging.getLogger(__name__)
+
+# Largest trailing window any dashboard metric needs (30-day moving average).
+RECENT_WINDOW = 30
+EWMA_ALPHA = 0.3
+LOW_MOOD_THRESHOLD = 3.0
+# Anomalies kept on the summary (most recent first to be dropped is oldest).
+MAX_ANOMALIES = 50
+# Serialization schema version; bump when fields change so stale rows are rebuilt.
+STATS_SCHEMA_VERSION = 1
+
+
+def iqr_bounds(scores: np.ndarray) -> tuple[float, float] | None:
+    """Index-based IQR fences used by the anomaly detector (None below 10 points)."""
+    n = scores.size
+    if n < 10:
+        return None
+    q1_idx = n // 4
+    q3_idx = (3 * n) // 4
+    part = np.partition(scores, (q1_idx, q3_idx))
+    q1 = float(part[q1_idx])
+    q3 = float(part[q3_idx])
+    iqr = q3 - q1
+    return q1 - (1.5 * iqr), q3 + (1.5 * iqr)
+
+
+def anomaly_record(date: datetime, score: float, lower: float, upper: float) -> dict | None:
+    """Build the anomaly dict for a score outside the fences, else None."""
+    if score < lower:
+        kind, word = "unusually_low", "low"
+    elif score > upper:
+        kind, word = "unusually_high", "high"
+    else:
+        return None
+    return {
+        "date": date.isoformat(),
+        "score": score,
+        "type": kind,
+        "description": f"Mood score {score} is unusually {word} compared to your typical range",
+    }
+
+
+@dataclass
+class MoodRollingStats:
+    """Fixed-size summary of a user's chronologically ordered mood history."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    sum_y: float = 0.0
+    sum_xy: float = 0.0
+    ewma: float | None = None
+    low_count: int = 0
+    recent: list[float] = field(default_factory=list)
+    weekday_counts: list[int] = field(default_factory=lambda: [0] * 7)
+    weekday_sums: list[float] = field(default_factory=lambda: [0.0] * 7)
+    # Weekday in order of first appearance (keeps detect_patterns ordering).
+    weekday_order: list[int] = field(default_factory=list)
+    tag_counts: dict[str, int] = field(default_factory=dict)
+    tag_sums: dict[str, float] = field(default_factory=dict)
+    anomaly_bounds: list[float] | None = None
+    anomalies: list[dict] = field(default_factory=list)
+    last_at: str | None = None
+    version: int = STATS_SCHEMA_VERSION
+
+    # ------------------------------------------------------------------
+    # Incremental update
+    # ------------------------------------------------------------------
+
+    def update(self, score: float, at: datetime, tags: Iterable[str] = ()) -> None:
+        """Fold one mood (logged after every existing one) into the summary."""
+        score = float(score)
+        index = self.count
+        self.count += 1
+
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.sum_y += score
+        self.sum_xy += index * score
+        self.ewma = score if self.ewma is None else EWMA_ALPHA * score + (1 - EWMA_ALPHA) * self.ewma
+        if score <= LOW_MOOD_THRESHOLD:
+            self.low_count += 1
+
+        self.recent.append(score)
+        if len(self.recent) > RECENT_WINDOW:
+            del self.recent[: len(self.recent) - RECENT_WINDOW]
+
+        weekday = at.weekday()
+        if self.weekday_counts[weekday] == 0:
+            self.weekday_order.append(weekday)
+        self.weekday_counts[weekday] += 1
+        self.weekday_sums[weekday] += score
+
+        for tag in tags:
+            key = tag.lower()
+            self.tag_counts[key] = self.tag_counts.get(key, 0) + 1
+            self.tag_sums[key] = self.tag_sums.get(key, 0.0) + score
+
+        if self.anomaly_bounds is not None:
+            record = anomaly_record(at, score, *self.anomaly_bounds)
+            if record is not None:
+                self.anomalies.append(record)
+                del self.anomalies[:-MAX_ANOMALIES]
+
+        self.last_at = at.isoformat()
+
+    # ------------------------------------------------------------------
+    # Batch rebuild
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_points(
+        cls,
+        dates: Sequence[datetime],
+        scores: Sequence[float],
+        tags: Sequence[Iterable[str]] | None = None,
+    ) -> MoodRollingStats:
+        """Build the summary from a chronologically sorted history (vectorized)."""
+        stats = cls()
+        y = np.asarray(scores, dtype=np.float64)
+        n = int(y.size)
+        if n == 0:
+            return stats
+
+        stats.count = n
+        stats.mean = float(y.mean())
+        stats.m2 = float(np.square(y - stats.mean).sum())
+        stats.sum_y = float(y.sum())
+        stats.sum_xy = float(np.dot(np.arange(n, dtype=np.float64), y))
+        decay = (1 - EWMA_ALPHA) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+        weights = EWMA_ALPHA * decay
+        weights[0] = decay[0]
+        stats.ewma = float(np.dot(weights, y))
+        stats.low_count = int(np.count_nonzero(y <= LOW_MOOD_THRESHOLD))
+        stats.recent = y[-RECENT_WINDOW:].tolist()
+
+        weekdays = np.fromiter((d.weekday() for d in dates), dtype=np.int64, count=n)
+        stats.weekday_counts = np.bincount(weekdays, minlength=7).tolist()
+        stats.weekday_sums = np.bincount(weekdays, weights=y, minlength=7).tolist()
+        present, first_seen = np.unique(weekdays, return_index=True)
+        stats.weekday_order = present[np.argsort(first_seen)].tolist()
+
+        for entry_tags, score in zip(tags or [()] * len(y), y.tolist(), strict=True):
+            for tag in entry_tags:
+                key = tag.lower()
+                stats.tag_counts[key] = stats.tag_counts.get(key, 0) + 1
+                stats.tag_sums[key] = stats.tag_sums.get(key, 0.0) + score
+
+        bounds = iqr_bounds(y)
+        if bounds is not None:
+            stats.anomaly_bounds = list(bounds)
+            lower, upper = bounds
+            flagged = np.flatnonzero((y < lower) | (y > upper))[-MAX_ANOMALIES:]
+            stats.anomalies = [
+                anomaly_record(dates[i], float(y[i]), lower, upper) for i in flagged
+            ]
+
+        stats.last_at = dates[-1].isoformat()
+        return stats
+
+    # ------------------------------------------------------------------
+    # Derived metrics (all O(1) or O(window))
+    # ------------------------------------------------------------------
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0.0 below two points)."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    @property
+    def slope(self) -> float | None:
+        """Least-squares slope of score against entry index (None below 3 points)."""
+        n = self.count
+        if n < 3:
+            return None
+        s_xy = self.sum_xy - (n - 1) / 2.0 * self.sum_y
+        s_xx = n * (n * n - 1) / 12.0
+        return s_xy / s_xx
+
+    def trailing_mean(self, window: int) -> float:
+        """Mean of the last ``window`` scores (all scores when fewer)."""
+        if self.count == 0:
+            return 0.0
+        if self.count < window:
+            return self.mean
+        return math.fsum(self.recent[-window:]) / window
+
+    def weekday_mean(self, weekday: int) -> float:
+        """Average score on ``weekday``, falling back to the overall mean."""
+        count = self.weekday_counts[weekday]
+        return self.weekday_sums[weekday] / count if count else self.mean
+
+    @property
+    def last_datetime(self) -> datetime | None:
+        return datetime.fromisoformat(self.last_at) if self.last_at else None
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MoodRollingStats | None:
+        """Deserialize; returns None for rows written by another schema version."""
+        if not data or data.get("version") != STATS_SCHEMA_VERSION:
+            return None
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+# ----------------------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------------------
+
+
+def _mood_tags(raw: dict | None) -> list[str]:
+    """Moods store tags as ``{"tags": [...]}``."""
+    if isinstance(raw, dict):
+        return [t for t in raw.get("tags") or [] if isinstance(t, str)]
+    return []
+
+
+async def load_mood_stats(db: AsyncSession, user_id: str) -> MoodRollingStats | None:
+    """Single primary-key read of a user's summary (None if never built)."""
+    row = await db.get(UserMoodStats, user_id)
+    return MoodRollingStats.from_dict(row.stats) if row is not None else None
+
+
+async def apply_mood_to_stats(
+    db: AsyncSession,
+    user_id: str,
+    score: float,
+    at: datetime,
+    tags: Iterable[str] = (),
+) -> None:
+    """Fold a just-logged mood into the user's summary in the caller's transaction.
+
+    The row is locked (``FOR UPDATE`` on Postgres) so concurrent logs for
+    the same user serialize. A missing/stale row or a mood older than the
+    summary's last entry triggers a rebuild of that user from ``moods``.
+    """
+    row = (
+        await db.execute(
+            select(UserMoodStats)
+            .where(UserMoodStats.user_id == user_id)
+            .with_for_update()
+        )
+    ).scalar_one_or_none()
+    stats = MoodRollingStats.from_dict(row.stats) if row is not None else None
+    last = stats.last_datetime if stats is not None else None
+
+    if stats is None or (last is not None and _is_before(at, last)):
+        stats = await _rebuild_user(db, user_id)
+    else:
+        stats.update(score, at, tags)
+
+    if row is None:
+        row = UserMoodStats(user_id=user_id)
+        db.add(row)
+    row.stats = stats.to_dict()
+    row.mood_count = stats.count
+    row.last_mood_at = stats.last_datetime
+    await db.flush()
+
+
+async def record_mood_in_stats(
+    db: AsyncSession,
+    user_id: str,
+    score: float,
+    at: datetime,
+    tags: Iterable[str] = (),
+) -> None:
+    """Best-effort ``apply_mood_to_stats`` for the mood-logging paths.
+
+    Runs in a savepoint so a failure never takes the mood insert down with
+    it; the nightly rebuild repairs any summary that missed an update.
+    """
+    try:
+        async with db.begin_nested():
+            await apply_mood_to_stats(db, user_id, score, at, tags)
+    except Exception as e:
+        logger.warning(f"Rolling mood stats update failed for {user_id}: {e}")
+
+
+def _is_before(a: datetime, b: datetime) -> bool:
+    """Compare datetimes that may differ in tz-awareness."""
+    if (a.tzinfo is None) != (b.tzinfo is None):
+        a = a.replace(tzinfo=None)
+        b = b.replace(tzinfo=None)
+    return a < b
+
+
+async def load_mood_history(
+    db: AsyncSession, user_id: str, since: datetime | None = None
+) -> list[tuple[datetime, float, list[str]]]:
+    """A user's live moods as ``(at, score, tags)``, oldest first, from ``since`` if given."""
+    query = select(Mood.at, Mood.score, Mood.tags).where(
+        Mood.user_id == user_id, Mood.deleted_at.is_(None)
+    )
+    if since is not None:
+        query = query.where(Mood.at >= since)
+    result = await db.execute(query.order_by(Mood.at, Mood.id))
+    return [(r.at, r.score, _mood_tags(r.tags)) for r in result.all()]
+
+
+async def _rebuild_user(db: AsyncSession, user_id: str) -> MoodRollingStats:
+    history = await load_mood_history(db, user_id)
+    return MoodRollingStats.from_points(
+        [at for at, _, _ in history], [score for _, score, _ in history], [tags for _, _, tags in history]
+    )
+
+
+async def rebuild_mood_stats_once(
+    session_maker: async_sessionmaker[AsyncSession],
+    chunk_size: int = 500,
+) -> dict[str, int]:
+    """Recompute every user's summary from ``moods`` in keyset-paginated chunks.
+
+    Each chunk loads its users' moods with one ordered query, rebuilds the
+    summaries with NumPy and commits, so a failure only loses that chunk
+    and memory is bounded by ``chunk_size`` users' histories. Users that
+    only have a summary left (every mood soft-deleted) have it removed.
+    """
+    stats = {"users": 0, "moods": 0, "removed": 0, "chunks": 0, "failed_chunks": 0}
+    last_user_id = ""
+    rebuilt_at = datetime.now().astimezone()
+
+    while True:
+        async with session_maker() as session:
+            candidates = union(
+                select(Mood.user_id).where(Mood.deleted_at.is_(None), Mood.user_id > last_user_id),
+                select(UserMoodStats.user_id).where(UserMoodStats.user_id > last_user_id),
+            ).subquery()
+            user_ids = list(
+                (
+                    await session.execute(
+                        select(candidates.c.user_id)
+                        .order_by(candidates.c.user_id)
+                        .limit(chunk_size)
+                    )
+                ).scalars()
+            )
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            try:
+                result = await session.execute(
+                    select(Mood.user_id, Mood.at, Mood.score, Mood.tags)
+                    .where(Mood.user_id.in_(user_ids), Mood.deleted_at.is_(None))
+                    .order_by(Mood.user_id, Mood.at, Mood.id)
+                )
+                histories: dict[str, list] = {uid: [] for uid in user_ids}
+                for row in result.all():
+                    histories[row.user_id].append(row)
+
+                existing = {
+                    row.user_id: row
+                    for row in (
+                        await session.execute(
+                            select(UserMoodStats).where(UserMoodStats.user_id.in_(user_ids))
+                        )
+                    ).scalars()
+                }
+                for user_id, rows in histories.items():
+                    target = existing.get(user_id)
+                    if not rows:
+                        if target is not None:
+                            await session.delete(target)
+                            stats["removed"] += 1
+                        continue
+                    summary = MoodRollingStats.from_points(
+                        [r.at for r in rows],
+                        [r.score for r in rows],
+                        [_mood_tags(r.tags) for r in rows],
+                    )
+                    if target is None:
+                        target = UserMoodStats(user_id=user_id)
+                        session.add(target)
+                    target.stats = summary.to_dict()
+                    target.mood_count = summary.count
+                    target.last_mood_at = summary.last_datetime
+                    target.rebuilt_at = rebuilt_at
+                    stats["moods"] += summary.count
+
+                await session.commit()
+                stats["users"] += len(user_ids)
+            except Exception as e:
+                await session.rollback()
+                stats["failed_chunks"] += 1
+                logger.exception(
+                    "Mood stats rebuild failed for chunk ending at user=%s: %s",
+                    last_user_id, e,
+                )
+            stats["chunks"] += 1
+
+    return stats
@@ -0,0 +1,360 @@
+"""Notification Campaign — bulk fan-out of one notification to every eligible user.
+
+``dispatch_notification`` is right for single, event-driven sends (a
+milestone, a Sakha insight) but a daily-verse or reminder blast through it
+costs several round trips per user. This module sends the same notification
+to the whole user base in keyset-paginated chunks:
+
+1. Select the next chunk of eligible users in one query. Push/category
+   preferences and quiet hours are evaluated in SQL. Users without a
+   preference row are eligible, matching ``dispatch_notification``.
+2. Bulk-insert one inbox ``Notification`` row per user.
+3. Load the chunk's active Expo tokens in one query.
+4. Pack messages into Expo's 100-message batches and send them with
+   bounded concurrency (retry/backoff lives in ``send_expo_batch``).
+5. Bulk-update inbox statuses and deactivate ``DeviceNotRegistered`` tokens.
+6. Commit, so a crash loses at most one chunk.
+
+Quiet hours are stored as UTC hours (see ``NotificationPreference``). The
+current UTC hour is bound once per campaign, so one run applies a single
+consistent clock to every user.
+
+Usage:
+    from backend.services.notification_campaign import run_notification_campaign
+
+    result = await run_notification_campaign(
+        SessionLocal,
+        notification_type="daily_verse",
+        title="Today's Verse",
+        body="BG 2.47 — You have a right to your actions...",
+        data={"type": "daily_verse", "chapter": 2, "verse": 47},
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from sqlalchemy import and_, insert, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models.notification import (
+    Notification,
+    NotificationPreference,
+    NotificationStatus,
+    PushSubscription,
+)
+from backend.models.user import User
+from backend.services.expo_push import (
+    MAX_CHUNK_SIZE,
+    REQUEST_TIMEOUT,
+    build_expo_message,
+    extract_invalid_tokens,
+    send_expo_batch,
+)
+from backend.services.notification_dispatcher import (
+    CATEGORY_MAP,
+    CHANNEL_MAP,
+    PREFERENCE_MAP,
+)
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_CHUNK_SIZE = int(os.getenv("NOTIFICATION_CAMPAIGN_CHUNK_SIZE", "1000"))
+# Concurrent in-flight Expo batch requests per campaign
+CAMPAIGN_CONCURRENCY = int(os.getenv("NOTIFICATION_CAMPAIGN_CONCURRENCY", "8"))
+
+
+@dataclass
+class CampaignResult:
+    """Counters for one campaign run."""
+
+    notification_type: str
+    users: int = 0
+    chunks: int = 0
+    inbox_rows: int = 0
+    tokens: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    tickets_ok: int = 0
+    tickets_error: int = 0
+    tokens_deactivated: int = 0
+    failed_chunks: int = 0
+    elapsed_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def merge(self, chunk: CampaignResult) -> None:
+        """Add a committed chunk's delivery counters to the run totals."""
+        for name in (
+            "users", "inbox_rows", "tokens", "batches", "failed_batches",
+            "tickets_ok", "tickets_error", "tokens_deactivated",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(chunk, name))
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.tokens / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "notification_type": self.notification_type,
+            "users": self.users,
+            "chunks": self.chunks,
+            "inbox_rows": self.inbox_rows,
+            "tokens": self.tokens,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "tickets_ok": self.tickets_ok,
+            "tickets_error": self.tickets_error,
+            "tokens_deactivated": self.tokens_deactivated,
+            "failed_chunks": self.failed_chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "messages_per_second": round(self.messages_per_second, 1),
+        }
+
+
+def _eligibility_clause(notification_type: str, current_hour: int) -> Any:
+    """SQL predicate mirroring ``dispatch_notification``'s preference checks."""
+    start = NotificationPreference.quiet_hours_start
+    end = NotificationPreference.quiet_hours_end
+    outside_quiet_hours = or_(
+        start.is_(None),
+        end.is_(None),
+        # Simple range (e.g. 8-17): quiet when start <= hour < end
+        and_(start <= end, or_(current_hour < start, current_hour >= end)),
+        # Range crosses midnight (e.g. 22-6): quiet when hour >= start or hour < end
+        and_(start > end, current_hour < start, current_hour >= end),
+    )
+
+    pref_field = PREFERENCE_MAP.get(notification_type)
+    category_enabled = (
+        getattr(NotificationPreference, pref_field).is_(True) if pref_field else true()
+    )
+    return or_(
+        NotificationPreference.id.is_(None),
+        and_(
+            NotificationPreference.push_enabled.is_(True),
+            category_enabled,
+            outside_quiet_hours,
+        ),
+    )
+
+
+async def _next_user_chunk(
+    db: AsyncSession,
+    after_user_id: str,
+    eligible: Any,
+    limit: int,
+) -> list[str]:
+    result = await db.execute(
+        select(User.id)
+        .outerjoin(NotificationPreference, NotificationPreference.user_id == User.id)
+        .where(User.id > after_user_id, User.deleted_at.is_(None), eligible)
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return list(result.scalars())
+
+
+async def _send_batches(
+    client: httpx.AsyncClient,
+    messages: list[dict[str, Any]],
+    concurrency: int,
+) -> list[list[dict[str, Any]] | None]:
+    """Send messages in MAX_CHUNK_SIZE batches, at most ``concurrency`` at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(batch: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        async with semaphore:
+            return await send_expo_batch(client, batch)
+
+    return await asyncio.gather(
+        *(
+            _one(messages[i : i + MAX_CHUNK_SIZE])
+            for i in range(0, len(messages), MAX_CHUNK_SIZE)
+        )
+    )
+
+
+async def _run_chunk(
+    db: AsyncSession,
+    client: httpx.AsyncClient,
+    user_ids: list[str],
+    notification_type: str,
+    title: str,
+    body: str,
+    data: dict[str, Any] | None,
+    concurrency: int,
+    result: CampaignResult,
+) -> None:
+    now = datetime.now(UTC)
+
+    # Inbox rows — one multi-row INSERT for the whole chunk
+    notification_ids = {user_id: str(uuid.uuid4()) for user_id in user_ids}
+    await db.execute(
+        insert(Notification),
+        [
+            {
+                "id": notification_ids[user_id],
+                "user_id": user_id,
+                "title": title,
+                "body": body,
+                "action_url": data.get("type", "") if data else "",
+                "channel": "push",
+                "status": NotificationStatus.PENDING.value,
+                "scheduled_at": now,
+            }
+            for user_id in user_ids
+        ],
+    )
+    result.inbox_rows += len(user_ids)
+
+    token_rows = (
+        await db.execute(
+            select(PushSubscription.user_id, PushSubscription.endpoint).where(
+                PushSubscription.user_id.in_(user_ids),
+                PushSubscription.is_active.is_(True),
+                PushSubscription.endpoint.startswith("ExponentPushToken["),
+            )
+        )
+    ).all()
+
+    channel_id = CHANNEL_MAP.get(notification_type)
+    category_id = CATEGORY_MAP.get(notification_type)
+    priority = "high" if notification_type in ("streak", "milestone") else "default"
+    owners = [row.user_id for row in token_rows]
+    tokens = [row.endpoint for row in token_rows]
+    messages = [
+        build_expo_message(token, title, body, data, channel_id, category_id, priority)
+        for token in tokens
+    ]
+    result.tokens += len(messages)
+
+    batch_tickets = await _send_batches(client, messages, concurrency) if messages else []
+
+    users_with_tokens = set(owners)
+    delivered: set[str] = set()
+    invalid: list[str] = []
+    for index, tickets in enumerate(batch_tickets):
+        result.batches += 1
+        offset = index * MAX_CHUNK_SIZE
+        if tickets is None:
+            result.failed_batches += 1
+            continue
+        batch_tokens = tokens[offset : offset + MAX_CHUNK_SIZE]
+        for position, ticket in enumerate(tickets[: len(batch_tokens)]):
+            if ticket.get("status") == "ok":
+                result.tickets_ok += 1
+                delivered.add(owners[offset + position])
+            else:
+                result.tickets_error += 1
+        invalid.extend(extract_invalid_tokens(tickets, batch_tokens))
+
+    # Same rule as dispatch_notification: inbox-only users count as sent
+    sent = [notification_ids[u] for u in user_ids if u in delivered or u not in users_with_tokens]
+    failed = [notification_ids[u] for u in users_with_tokens - delivered]
+    if sent:
+        await db.execute(
+            update(Notification)
+            .where(Notification.id.in_(sent))
+            .values(status=NotificationStatus.SENT.value, sent_at=now)
+        )
+    if failed:
+        await db.execute(
+            update(Notification)
+            .where(Notification.id.in_(failed))
+            .values(
+                status=NotificationStatus.FAILED.value,
+                failed_at=now,
+                failure_reason="All push tickets failed",
+            )
+        )
+    if invalid:
+        await db.execute(
+            update(PushSubscription)
+            .where(PushSubscription.endpoint.in_(invalid))
+            .values(is_active=False)
+        )
+        result.tokens_deactivated += len(invalid)
+
+
+async def run_notification_campaign(
+    session_maker: async_sessionmaker[AsyncSession],
+    notification_type: str,
+    title: str,
+    body: str,
+    data: dict[str, Any] | None = None,
+    chunk_size: int = CAMPAIGN_CHUNK_SIZE,
+    concurrency: int = CAMPAIGN_CONCURRENCY,
+    client: httpx.AsyncClient | None = None,
+) -> CampaignResult:
+    """Send one notification to every eligible user.
+
+    Each chunk runs in its own session and transaction; a failing chunk is
+    rolled back, logged and skipped so the rest of the campaign proceeds.
+
+    Args:
+        session_maker: Async session factory (e.g. ``deps.SessionLocal``).
+        notification_type: One of the ``dispatch_notification`` types.
+        title: Notification title.
+        body: Notification body text.
+        data: Custom data payload for deep linking.
+        chunk_size: Users per keyset page / transaction.
+        concurrency: Max in-flight Expo batch requests.
+        client: Optional shared ``httpx.AsyncClient`` (a pooled one is
+            created for the run otherwise).
+
+    Returns:
+        CampaignResult with delivery counters and throughput.
+    """
+    result = CampaignResult(notification_type=notification_type)
+    eligible = _eligibility_clause(notification_type, datetime.now(UTC).hour)
+    started = time.perf_counter()
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=concurrency),
+        )
+
+    last_user_id = ""
+    try:
+        while True:
+            async with session_maker() as db:
+                user_ids = await _next_user_chunk(db, last_user_id, eligible, chunk_size)
+                if not user_ids:
+                    break
+                last_user_id = user_ids[-1]
+                result.chunks += 1
+                chunk = CampaignResult(notification_type=notification_type, users=len(user_ids))
+                try:
+                    await _run_chunk(
+                        db, client, user_ids, notification_type, title, body,
+                        data, concurrency, chunk,
+                    )
+                    await db.commit()
+                    result.merge(chunk)
+                except Exception as e:
+                    await db.rollback()
+                    result.failed_chunks += 1
+                    result.errors.append(f"chunk ending at {last_user_id}: {e}")
+                    logger.exception(
+                        "Notification campaign chunk failed (ending at user %s)",
+                        last_user_id,
+                    )
+    finally:
+        if own_client:
+            await client.aclose()
+
+    result.elapsed_seconds = time.perf_counter() - started
+    logger.info("Notification campaign %s finished: %s", notification_type, result.to_dict())
+    return result
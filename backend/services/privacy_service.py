@@ -598,6 +598,10 @@ async def execute_hard_delete(db: AsyncSession, user_id: str) -> None:
     )
 
     await db.commit()
+
+    # Deleted accounts must stop authenticating on every instance
+    from backend.security.principal_cache import invalidate_principal
+    await invalidate_principal(user_id)
     logger.info("Hard delete completed for user %s", user_id[:8])
 
 
@@ -162,14 +162,14 @@ class EnhancedRedisCache:
 
             if value:
                 cache_hits_total.labels(cache_type=cache_type).inc()
-                logger.debug(f"✅ Cache HIT: {cache_type}:{key[:50]}")
+                logger.debug("✅ Cache HIT: %s:%s", cache_type, key[:50])
                 try:
                     return json.loads(value)
                 except json.JSONDecodeError:
                     return value
             else:
                 cache_misses_total.labels(cache_type=cache_type).inc()
-                logger.debug(f"❌ Cache MISS: {cache_type}:{key[:50]}")
+                logger.debug("❌ Cache MISS: %s:%s", cache_type, key[:50])
                 return None
 
         except redis.ConnectionError:
@@ -225,7 +225,7 @@ class EnhancedRedisCache:
 
                 self.redis_client.setex(cache_key, ttl, value)
 
-            logger.debug(f"✅ Cache SET: {cache_type}:{key[:50]} (TTL: {ttl}s)")
+            logger.debug("✅ Cache SET: %s:%s (TTL: %ss)", cache_type, key[:50], ttl)
             return True
 
         except redis.ConnectionError:
@@ -254,7 +254,7 @@ class EnhancedRedisCache:
 
         try:
             self.redis_client.delete(cache_key)
-            logger.debug(f"✅ Cache DELETE: {cache_type}:{key[:50]}")
+            logger.debug("✅ Cache DELETE: %s:%s", cache_type, key[:50])
             return True
 
         except redis.ConnectionError:
@@ -2,11 +2,13 @@
 """Gita-only retrieval and validation for Relationship Compass."""
 from __future__ import annotations
 
+import bisect
 import json
 import logging
 import os
 import re
 import sqlite3
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
@@ -129,12 +131,142 @@ class RetrievalResult:
     strategy: str
 
 
+def _tokens(text: str) -> list[str]:
+    return re.findall(r"[a-z]{3,}", text.lower())
+
+
+class KeywordIndex:
+    """BM25 keyword index over chunk keywords, tags and text.
+
+    Built once per loaded index. Each term's posting list stores the
+    already-weighted BM25 contribution for every chunk containing it, so a
+    query is a handful of vectorized adds. Query words also match index
+    terms they prefix ("emotion" -> "emotional"), which keeps the useful
+    part of the old substring matching.
+    """
+
+    # Same relative weight of keyword, tag and text matches as before
+    FIELD_BOOSTS = {"keywords": 1.0, "tags": 1.5, "text": 0.5}
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, chunks: list[GitaChunk]) -> None:
+        self.size = len(chunks)
+        fields = {
+            "keywords": [_tokens(" ".join(chunk.keywords)) for chunk in chunks],
+            "tags": [_tokens(" ".join(chunk.tags).replace("_", " ").replace("-", " ")) for chunk in chunks],
+            "text": [_tokens(chunk.text) for chunk in chunks],
+        }
+
+        doc_freq: Counter[str] = Counter()
+        for i in range(self.size):
+            doc_freq.update(set().union(*(field[i] for field in fields.values())))
+        self.idf = {
+            term: float(np.log(1.0 + (self.size - df + 0.5) / (df + 0.5)))
+            for term, df in doc_freq.items()
+        }
+
+        weights: dict[str, dict[int, float]] = {}
+        for name, docs in fields.items():
+            boost = self.FIELD_BOOSTS[name]
+            avg_len = max(sum(len(d) for d in docs) / max(self.size, 1), 1.0)
+            for i, doc in enumerate(docs):
+                norm = self.K1 * (1 - self.B + self.B * len(doc) / avg_len)
+                for term, tf in Counter(doc).items():
+                    posting = weights.setdefault(term, {})
+                    posting[i] = posting.get(i, 0.0) + boost * tf * (self.K1 + 1) / (tf + norm)
+
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            term: (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float32, count=len(posting)) * self.idf[term],
+            )
+            for term, posting in weights.items()
+        }
+        self.vocabulary = sorted(self.postings)
+        self._expansions: dict[str, list[str]] = {}
+
+    def expand(self, word: str) -> list[str]:
+        """Index terms equal to or prefixed by word."""
+        if word not in self._expansions:
+            start = bisect.bisect_left(self.vocabulary, word)
+            end = bisect.bisect_left(self.vocabulary, word + "\x7f")
+            self._expansions[word] = self.vocabulary[start:end]
+        return self._expansions[word]
+
+    def scores(self, query_keywords: set[str]) -> np.ndarray:
+        scores = np.zeros(self.size, dtype=np.float32)
+        for word in query_keywords:
+            best = np.zeros(self.size, dtype=np.float32)
+            for term in self.expand(word):
+                docs, values = self.postings[term]
+                np.maximum.at(best, docs, values)
+            scores += KEYWORD_WEIGHTS.get(word, 1.0) * best
+        return scores
+
+    def max_score(self, query_keywords: set[str]) -> float:
+        """Score of an ideal chunk matching every query word in every field."""
+        best_idf = max(self.idf.values(), default=0.0)
+        return sum(
+            KEYWORD_WEIGHTS.get(word, 1.0) * (self.K1 + 1) * sum(self.FIELD_BOOSTS.values()) * best_idf
+            for word in query_keywords
+        )
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k <= 0:
+        return np.arange(0)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
 class RelationshipCompassIndex:
-    def __init__(self, chunks: list[GitaChunk], model: str, index_type: str = "embedding") -> None:
+    def __init__(
+        self,
+        chunks: list[GitaChunk],
+        model: str,
+        index_type: str = "embedding",
+        matrix: np.ndarray | None = None,
+        matrix_rows: np.ndarray | None = None,
+    ) -> None:
         self.chunks = chunks
         self.model = model
         self.index_type = index_type
 
+        # One normalized (rows x dim) matrix; matrix_rows[i] is the chunk
+        # index of row i (chunks without an embedding have no row)
+        if matrix is None:
+            rows = [i for i, chunk in enumerate(chunks) if chunk.embedding.size]
+            matrix = _normalize_rows(np.stack([chunks[i].embedding for i in rows])) if rows else None
+            matrix_rows = np.array(rows, dtype=np.int64)
+        self.matrix = matrix
+        self.matrix_rows = matrix_rows if matrix_rows is not None else np.arange(0)
+        self.keyword_index = KeywordIndex(chunks)
+
+    def search_embeddings(self, query_embedding: np.ndarray, k: int) -> list[tuple[GitaChunk, float]]:
+        """Top-k chunks by cosine similarity: one matrix-vector product plus argpartition."""
+        if self.matrix is None or query_embedding.size == 0:
+            return []
+        norm = float(np.linalg.norm(query_embedding))
+        if norm == 0:
+            return []
+        scores = self.matrix @ (query_embedding.astype(np.float32) / norm)
+        return [(self.chunks[self.matrix_rows[i]], float(scores[i])) for i in _top_k(scores, k)]
+
+    def search_keywords(self, query_keywords: set[str], k: int) -> list[tuple[GitaChunk, float]]:
+        scores = self.keyword_index.scores(query_keywords)
+        top = _top_k(scores, min(k, int(np.count_nonzero(scores))))
+        return [(self.chunks[i], float(scores[i])) for i in top]
+
     @classmethod
     def load(cls) -> "RelationshipCompassIndex | None":
         if not INDEX_PATH.exists():
@@ -157,28 +289,39 @@ class RelationshipCompassIndex:
             columns = [col[1] for col in cursor.fetchall()]
             has_keywords = "keywords" in columns
 
-            if has_keywords:
-                rows = conn.execute(
-                    """
-                    SELECT chunk_id, chapter, verse, source_file, tags, language, chunk_type, text, commentary, embedding, keywords
-                    FROM gita_chunks
-                    """
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT chunk_id, chapter, verse, source_file, tags, language, chunk_type, text, commentary, embedding
-                    FROM gita_chunks
-                    """
-                ).fetchall()
+            # Migrated indexes keep embeddings in a separate .npy matrix and
+            # only a row number per chunk (see write_embedding_matrix)
+            embedding_file = meta.get("embedding_file")
+            embedding_column = "embedding_row" if embedding_file else "embedding"
+            rows = conn.execute(
+                f"""
+                SELECT chunk_id, chapter, verse, source_file, tags, language, chunk_type, text, commentary,
+                       {embedding_column}{", keywords" if has_keywords else ""}
+                FROM gita_chunks
+                ORDER BY rowid
+                """
+            ).fetchall()
         finally:
             conn.close()
 
+        matrix = None
+        if embedding_file:
+            matrix = np.load(INDEX_PATH.parent / embedding_file, mmap_mode="r")
+            if matrix.dtype != np.float32:
+                matrix = np.asarray(matrix, dtype=np.float32)
+
+        empty = np.array([], dtype=np.float32)
         chunks: list[GitaChunk] = []
+        matrix_rows: list[int] = []
         for row in rows:
             tags = json.loads(row[4]) if row[4] else []
-            embedding_data = json.loads(row[9]) if row[9] else []
-            embedding = np.array(embedding_data, dtype=np.float32) if embedding_data else np.array([], dtype=np.float32)
+            if embedding_file:
+                embedding = matrix[row[9]] if row[9] is not None else empty
+            else:
+                embedding_data = json.loads(row[9]) if row[9] else []
+                embedding = np.array(embedding_data, dtype=np.float32) if embedding_data else empty
+            if embedding_file and row[9] is not None:
+                matrix_rows.append(row[9])
             keywords = tuple(json.loads(row[10])) if has_keywords and len(row) > 10 and row[10] else ()
             chunks.append(
                 GitaChunk(
@@ -196,8 +339,64 @@ class RelationshipCompassIndex:
                 )
             )
 
+        if embedding_file:
+            # Matrix rows are written in chunk order, so row r belongs to the r-th embedded chunk
+            order = np.array(matrix_rows, dtype=np.int64)
+            chunk_of_row = np.empty(len(order), dtype=np.int64)
+            chunk_of_row[order] = [i for i, chunk in enumerate(chunks) if chunk.embedding.size]
+            index = cls(chunks=chunks, model=model, index_type=index_type,
+                        matrix=matrix if len(order) else None, matrix_rows=chunk_of_row)
+        else:
+            index = cls(chunks=chunks, model=model, index_type=index_type)
+
         logger.info("Loaded Relationship Compass index: %d chunks, type=%s", len(chunks), index_type)
-        return cls(chunks=chunks, model=model, index_type=index_type)
+        return index
+
+
+def write_embedding_matrix(conn: sqlite3.Connection, index_path: Path, dtype: str = "float32",
+                           keep_json: bool = False) -> int:
+    """Move JSON text embeddings into one normalized matrix beside the index.
+
+    Writes ``<index>.embeddings.npy`` (float32 or float16, rows normalized)
+    atomically, records each chunk's row in ``gita_chunks.embedding_row``
+    and the file in the metadata table. Returns the number of rows written
+    (0 for keyword-only indexes, which are left unchanged).
+    """
+    rows = conn.execute(
+        "SELECT rowid, embedding FROM gita_chunks WHERE embedding IS NOT NULL ORDER BY rowid"
+    ).fetchall()
+    embedded = [(rowid, json.loads(data)) for rowid, data in rows if data and data != "[]"]
+    if not embedded:
+        return 0
+
+    matrix = _normalize_rows(np.array([vector for _, vector in embedded], dtype=np.float32)).astype(dtype)
+    embedding_file = index_path.name.replace(".sqlite", "") + ".embeddings.npy"
+    tmp_path = index_path.parent / (embedding_file + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, index_path.parent / embedding_file)
+
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(gita_chunks)").fetchall()]
+    if "embedding_row" not in columns:
+        conn.execute("ALTER TABLE gita_chunks ADD COLUMN embedding_row INTEGER")
+    conn.execute("UPDATE gita_chunks SET embedding_row = NULL")
+    conn.executemany(
+        "UPDATE gita_chunks SET embedding_row = ? WHERE rowid = ?",
+        [(row, rowid) for row, (rowid, _) in enumerate(embedded)],
+    )
+    if not keep_json:
+        conn.execute("UPDATE gita_chunks SET embedding = NULL")
+    conn.executemany(
+        "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+        [
+            ("embedding_file", embedding_file),
+            ("embedding_dtype", dtype),
+            ("embedding_dim", str(matrix.shape[1])),
+            ("format_version", "2"),
+        ],
+    )
+    conn.commit()
+    return len(embedded)
 
 
 _cached_index: RelationshipCompassIndex | None = None
@@ -210,12 +409,27 @@ def get_index() -> RelationshipCompassIndex | None:
     return _cached_index
 
 
-def embed_query(query: str, model: str) -> np.ndarray | None:
+_openai_client: OpenAI | None = None
+_openai_client_key: str | None = None
+
+
+def get_openai_client() -> OpenAI | None:
+    """Shared OpenAI client (one connection pool) for embeddings and chat."""
+    global _openai_client, _openai_client_key
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         return None
+    if _openai_client is None or _openai_client_key != api_key:
+        _openai_client = OpenAI(api_key=api_key)
+        _openai_client_key = api_key
+    return _openai_client
+
+
+def embed_query(query: str, model: str) -> np.ndarray | None:
+    client = get_openai_client()
+    if client is None:
+        return None
 
-    client = OpenAI(api_key=api_key)
     response = client.embeddings.create(model=model, input=query)
     return np.array(response.data[0].embedding, dtype=np.float32)
 
@@ -250,37 +464,8 @@ def extract_query_keywords(query: str) -> set[str]:
     return {word for word in words if word not in stop_words}
 
 
-def score_chunk_by_keywords(chunk: GitaChunk, query_keywords: set[str]) -> float:
-    """Score a chunk based on keyword matching."""
-    score = 0.0
-
-    # Match against chunk keywords
-    chunk_keywords = set(chunk.keywords)
-    for kw in query_keywords:
-        if kw in chunk_keywords:
-            weight = KEYWORD_WEIGHTS.get(kw, 1.0)
-            score += weight
-
-    # Match against tags
-    chunk_tags_lower = {tag.lower().replace('_', ' ').replace('-', ' ') for tag in chunk.tags}
-    for tag in chunk_tags_lower:
-        for kw in query_keywords:
-            if kw in tag:
-                weight = KEYWORD_WEIGHTS.get(kw, 1.0)
-                score += weight * 1.5
-
-    # Match against text content (lower weight)
-    text_lower = chunk.text.lower()
-    for kw in query_keywords:
-        if kw in text_lower:
-            weight = KEYWORD_WEIGHTS.get(kw, 1.0)
-            score += weight * 0.5
-
-    return score
-
-
 def retrieve_chunks_keyword(query: str, relationship_type: str, k: int = 18) -> RetrievalResult:
-    """Retrieve chunks using keyword-based matching."""
+    """Retrieve chunks using the BM25 keyword index."""
     index = get_index()
     if not index:
         return RetrievalResult(chunks=[], confidence=0.0, strategy="missing-index")
@@ -292,20 +477,11 @@ def retrieve_chunks_keyword(query: str, relationship_type: str, k: int = 18) ->
     if not query_keywords:
         return RetrievalResult(chunks=[], confidence=0.0, strategy="no-keywords")
 
-    # Score all chunks
-    scored: list[tuple[GitaChunk, float]] = []
-    for chunk in index.chunks:
-        score = score_chunk_by_keywords(chunk, query_keywords)
-        if score > 0:
-            scored.append((chunk, score))
-
-    # Sort by score
-    scored.sort(key=lambda item: item[1], reverse=True)
-    top = scored[:k]
+    top = index.search_keywords(query_keywords, k)
 
     # Calculate confidence (normalized)
-    max_possible_score = len(query_keywords) * 2.0 * 3  # max weight * 3 match types
-    confidence = (top[0][1] / max_possible_score) if top else 0.0
+    max_possible_score = index.keyword_index.max_score(query_keywords)
+    confidence = (top[0][1] / max_possible_score) if top and max_possible_score else 0.0
     confidence = min(confidence, 1.0)
 
     # Ensure minimum confidence for keyword matches
@@ -324,6 +500,11 @@ def retrieve_chunks(query: str, relationship_type: str, k: int = 18) -> Retrieva
     if index.index_type == "keyword":
         return retrieve_chunks_keyword(query, relationship_type, k)
 
+    # If no embeddings found, fall back to keyword retrieval
+    if index.matrix is None:
+        logger.info("No embeddings in index, falling back to keyword retrieval")
+        return retrieve_chunks_keyword(query, relationship_type, k)
+
     expanded_query = f"{query} relationship {relationship_type} " + " ".join(RELATIONSHIP_TAGS)
     embedding = embed_query(expanded_query, index.model)
 
@@ -332,20 +513,7 @@ def retrieve_chunks(query: str, relationship_type: str, k: int = 18) -> Retrieva
         logger.info("Embedding unavailable, falling back to keyword retrieval")
         return retrieve_chunks_keyword(query, relationship_type, k)
 
-    scored: list[tuple[GitaChunk, float]] = []
-    for chunk in index.chunks:
-        if chunk.embedding.size == 0:
-            continue
-        score = cosine_similarity(embedding, chunk.embedding)
-        scored.append((chunk, score))
-
-    # If no embeddings found, fall back to keyword retrieval
-    if not scored:
-        logger.info("No embeddings in index, falling back to keyword retrieval")
-        return retrieve_chunks_keyword(query, relationship_type, k)
-
-    scored.sort(key=lambda item: item[1], reverse=True)
-    top = scored[:k]
+    top = index.search_embeddings(embedding, k)
     confidence = top[0][1] if top else 0.0
 
     return RetrievalResult(chunks=[item[0] for item in top], confidence=confidence, strategy="embeddings")
@@ -655,13 +823,12 @@ async def call_ai_provider(messages: list[dict[str, str]]) -> str | None:
 
 def call_openai_sync(messages: list[dict[str, str]]) -> str | None:
     """Synchronous OpenAI call as fallback."""
-    api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    if not api_key:
+    client = get_openai_client()
+    if client is None:
         logger.warning("OPENAI_API_KEY not set for Relationship Compass")
         return None
 
     try:
-        client = OpenAI(api_key=api_key)
         response = client.chat.completions.create(
             model=CHAT_MODEL,
             messages=messages,
@@ -9,7 +9,6 @@ This service handles:
 
 import logging
 from datetime import datetime, timedelta, UTC
-from typing import Optional
 
 from sqlalchemy import select, and_, update, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,11 +27,13 @@ from backend.config.feature_config import (
     get_kiaan_quota,
     get_wisdom_journeys_limit,
 )
+from backend.services.entitlement_cache import invalidate_entitlements
+from backend.services.usage_ledger import Reservation, UsagePeriod, get_usage_ledger
 
 logger = logging.getLogger(__name__)
 
 
-async def get_user_subscription(db: AsyncSession, user_id: str) -> Optional[UserSubscription]:
+async def get_user_subscription(db: AsyncSession, user_id: str) -> UserSubscription | None:
     """Get a user's current subscription.
 
     Args:
@@ -151,7 +152,7 @@ async def get_or_create_free_subscription(
 
 async def get_plan_by_tier(
     db: AsyncSession, tier: SubscriptionTier
-) -> Optional[SubscriptionPlan]:
+) -> SubscriptionPlan | None:
     """Get a subscription plan by its tier.
     
     Args:
@@ -218,7 +219,10 @@ async def get_user_tier(db: AsyncSession, user_id: str) -> SubscriptionTier:
 
 
 async def check_feature_access(
-    db: AsyncSession, user_id: str, feature: str
+    db: AsyncSession,
+    user_id: str,
+    feature: str,
+    tier: SubscriptionTier | None = None,
 ) -> bool:
     """Check if a user has access to a specific feature.
     
@@ -226,11 +230,13 @@ async def check_feature_access(
         db: Database session.
         user_id: The user's ID.
         feature: The feature name to check.
+        tier: The user's effective tier, if already known.
         
     Returns:
         bool: True if the user has access to the feature.
     """
-    tier = await get_user_tier(db, user_id)
+    if tier is None:
+        tier = await get_user_tier(db, user_id)
     features = get_tier_features(tier)
     return features.get(feature, False)
 
@@ -249,7 +255,7 @@ async def check_journal_access(db: AsyncSession, user_id: str) -> bool:
 
 
 async def check_wisdom_journeys_access(
-    db: AsyncSession, user_id: str
+    db: AsyncSession, user_id: str, tier: SubscriptionTier | None = None
 ) -> tuple[bool, int, int]:
     """Check if a user has access to Wisdom Journeys and their current usage.
 
@@ -259,6 +265,7 @@ async def check_wisdom_journeys_access(
     Args:
         db: Database session.
         user_id: The user's ID.
+        tier: The user's effective tier, if already known.
 
     Returns:
         tuple: (has_access, active_journey_count, journey_limit)
@@ -266,7 +273,8 @@ async def check_wisdom_journeys_access(
             - active_journey_count: Number of currently active journeys
             - journey_limit: Maximum allowed (-1 = unlimited, 0 = no access)
     """
-    tier = await get_user_tier(db, user_id)
+    if tier is None:
+        tier = await get_user_tier(db, user_id)
     journey_limit = get_wisdom_journeys_limit(tier)
 
     # No access if limit is 0
@@ -370,7 +378,10 @@ def _get_current_period() -> tuple[datetime, datetime]:
 
 
 async def get_or_create_usage_record(
-    db: AsyncSession, user_id: str, feature: str
+    db: AsyncSession,
+    user_id: str,
+    feature: str,
+    tier: SubscriptionTier | None = None,
 ) -> UsageTracking:
     """Get or create a usage tracking record for the current period.
     
@@ -378,6 +389,7 @@ async def get_or_create_usage_record(
         db: Database session.
         user_id: The user's ID.
         feature: The feature being tracked.
+        tier: The user's effective tier, if already known.
         
     Returns:
         UsageTracking: The usage tracking record.
@@ -398,7 +410,8 @@ async def get_or_create_usage_record(
         return usage
     
     # Get user's tier to determine the limit
-    tier = await get_user_tier(db, user_id)
+    if tier is None:
+        tier = await get_user_tier(db, user_id)
     limit = get_kiaan_quota(tier) if feature == "kiaan_questions" else 0
     
     usage = UsageTracking(
@@ -416,12 +429,16 @@ async def get_or_create_usage_record(
     return usage
 
 
-async def check_kiaan_quota(db: AsyncSession, user_id: str) -> tuple[bool, int, int]:
+async def check_kiaan_quota(
+    db: AsyncSession, user_id: str, tier: SubscriptionTier | None = None
+) -> tuple[bool, int, int]:
     """Check if a user has remaining KIAAN questions quota.
     
     Args:
         db: Database session.
         user_id: The user's ID.
+        tier: The user's effective tier, if already known (e.g. from
+            entitlement_cache.get_entitlements).
         
     Returns:
         tuple: (has_quota, usage_count, usage_limit)
@@ -429,37 +446,97 @@ async def check_kiaan_quota(db: AsyncSession, user_id: str) -> tuple[bool, int,
             - usage_count: Current usage count
             - usage_limit: Maximum allowed (-1 = unlimited)
     """
-    tier = await get_user_tier(db, user_id)
+    if tier is None:
+        tier = await get_user_tier(db, user_id)
     limit = get_kiaan_quota(tier)
-    
+
     # Unlimited quota for paid tiers
     if limit == -1:
         return True, 0, -1
+
+    counts = await get_usage_ledger().usage(
+        db, "kiaan_questions", user_id, UsagePeriod(*_get_current_period()), limit
+    )
+    if counts is not None:
+        used, held = counts
+        # Questions already reserved by in-flight requests count as used
+        return used + held < limit, used, limit
     
-    usage = await get_or_create_usage_record(db, user_id, "kiaan_questions")
+    usage = await get_or_create_usage_record(db, user_id, "kiaan_questions", tier)
     has_quota = usage.usage_count < usage.usage_limit
     
     return has_quota, usage.usage_count, usage.usage_limit
 
 
-async def increment_kiaan_usage(db: AsyncSession, user_id: str) -> UsageTracking:
+async def reserve_kiaan_question(
+    db: AsyncSession, user_id: str, tier: SubscriptionTier | None = None
+) -> tuple[bool, int, int, Reservation | None]:
+    """Check the KIAAN quota and hold one question for the current request.
+
+    Unlike check_kiaan_quota followed by increment_kiaan_usage, concurrent
+    requests cannot both pass the check for the last remaining question.
+    Pass the reservation to increment_kiaan_usage once the answer is
+    delivered, or to release_kiaan_reservation if the request fails.
+
+    Returns:
+        tuple: (has_quota, usage_count, usage_limit, reservation)
+            - reservation: None if the quota is exhausted or the usage
+              ledger is unavailable (then this is check_kiaan_quota).
+    """
+    if tier is None:
+        tier = await get_user_tier(db, user_id)
+    limit = get_kiaan_quota(tier)
+
+    reservation = await get_usage_ledger().reserve(
+        db, "kiaan_questions", user_id, UsagePeriod(*_get_current_period()), 1, limit
+    )
+    if reservation is None:
+        return (*await check_kiaan_quota(db, user_id, tier), None)
+    return (
+        reservation.granted,
+        reservation.used,
+        limit,
+        reservation if reservation.granted else None,
+    )
+
+
+async def release_kiaan_reservation(reservation: Reservation | None) -> None:
+    """Give back a question reserved by reserve_kiaan_question."""
+    if reservation is not None:
+        await get_usage_ledger().release(reservation)
+
+
+async def increment_kiaan_usage(
+    db: AsyncSession, user_id: str, reservation: Reservation | None = None
+) -> int:
     """Increment the KIAAN questions usage count for a user.
 
-    Uses SELECT FOR UPDATE to prevent race conditions when two requests
-    try to increment simultaneously (e.g. user double-clicks send).
+    Counts in the usage ledger (Redis) when available; usage_tracking is
+    updated by its reconciler. Otherwise uses SELECT FOR UPDATE to prevent
+    race conditions when two requests try to increment simultaneously
+    (e.g. user double-clicks send).
 
     Args:
         db: Database session.
         user_id: The user's ID.
+        reservation: The reservation from reserve_kiaan_question, if any.
 
     Returns:
-        UsageTracking: The updated usage record.
+        int: The user's usage count for the current period.
     """
+    ledger = get_usage_ledger()
+    period = UsagePeriod(*_get_current_period())
+    if reservation is not None:
+        count = await ledger.commit(db, reservation)
+    else:
+        count = await ledger.add(db, "kiaan_questions", user_id, period, 1)
+    if count is not None:
+        logger.info(f"User {user_id} KIAAN usage: {count}")
+        return count
+
     # Ensure the record exists first
     await get_or_create_usage_record(db, user_id, "kiaan_questions")
 
-    period_start, _ = _get_current_period()
-
     # Lock the row to prevent concurrent increments
     stmt = (
         select(UsageTracking)
@@ -467,7 +544,7 @@ async def increment_kiaan_usage(db: AsyncSession, user_id: str) -> UsageTracking
             and_(
                 UsageTracking.user_id == user_id,
                 UsageTracking.feature == "kiaan_questions",
-                UsageTracking.period_start == period_start,
+                UsageTracking.period_start == period.start,
             )
         )
         .with_for_update()
@@ -479,11 +556,12 @@ async def increment_kiaan_usage(db: AsyncSession, user_id: str) -> UsageTracking
     usage.updated_at = datetime.now(UTC)
     await db.commit()
     await db.refresh(usage)
+    ledger.note_database_increment("kiaan_questions", user_id, period)
 
     logger.info(
         f"User {user_id} KIAAN usage: {usage.usage_count}/{usage.usage_limit}"
     )
-    return usage
+    return usage.usage_count
 
 
 async def get_usage_stats(
@@ -501,14 +579,17 @@ async def get_usage_stats(
     """
     usage = await get_or_create_usage_record(db, user_id, feature)
     is_unlimited = usage.usage_limit == -1
+    # The ledger can be a few seconds ahead of usage_tracking
+    live = await get_usage_ledger().peek(feature, user_id, UsagePeriod(*_get_current_period()))
+    usage_count = max(usage.usage_count, live or 0)
     
     return {
         "feature": feature,
         "period_start": usage.period_start,
         "period_end": usage.period_end,
-        "usage_count": usage.usage_count,
+        "usage_count": usage_count,
         "usage_limit": usage.usage_limit,
-        "remaining": -1 if is_unlimited else max(0, usage.usage_limit - usage.usage_count),
+        "remaining": -1 if is_unlimited else max(0, usage.usage_limit - usage_count),
         "is_unlimited": is_unlimited,
     }
 
@@ -518,7 +599,7 @@ async def update_subscription_status(
     user_id: str,
     status: SubscriptionStatus,
     cancel_at_period_end: bool = False,
-) -> Optional[UserSubscription]:
+) -> UserSubscription | None:
     """Update a user's subscription status.
     
     Args:
@@ -542,6 +623,7 @@ async def update_subscription_status(
     subscription.updated_at = datetime.now(UTC)
     await db.commit()
     await db.refresh(subscription)
+    await invalidate_entitlements(user_id)
     
     logger.info(f"Updated subscription status for user {user_id} to {status}")
     return subscription
@@ -551,10 +633,10 @@ async def upgrade_subscription(
     db: AsyncSession,
     user_id: str,
     new_plan_id: int,
-    stripe_subscription_id: Optional[str] = None,
-    stripe_customer_id: Optional[str] = None,
-    razorpay_subscription_id: Optional[str] = None,
-    razorpay_customer_id: Optional[str] = None,
+    stripe_subscription_id: str | None = None,
+    stripe_customer_id: str | None = None,
+    razorpay_subscription_id: str | None = None,
+    razorpay_customer_id: str | None = None,
     payment_provider: str = "stripe",
 ) -> UserSubscription:
     """Upgrade or change a user's subscription plan.
@@ -626,6 +708,7 @@ async def upgrade_subscription(
     
     await db.commit()
     await db.refresh(subscription)
+    await invalidate_entitlements(user_id)
     
     # Update usage tracking limits for the new tier
     await _update_usage_limits(db, user_id, subscription.plan_id)
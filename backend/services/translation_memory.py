@@ -0,0 +1,244 @@
+"""Translation Memory — sentence-level store of previous translations.
+
+Chat responses are mostly recombinations of sentences the service has
+translated before: verse translations, standard closing lines, template
+fallbacks. The translation memory stores each translated *sentence* under
+``(normalized source sentence, source lang, target lang)``, so only
+sentences that have never been translated reach the provider.
+
+Layers:
+    - An in-process LRU in front of everything.
+    - A persistent store chosen by ``TRANSLATION_MEMORY_BACKEND``:
+        * ``memory`` (default) — LRU only, nothing persisted.
+        * ``sqlite`` — a local SQLite file at ``TRANSLATION_MEMORY_PATH``.
+        * ``redis`` — shared across instances through the Redis cache.
+
+Segmentation keeps the original separators (spaces, blank lines), so a
+response is reassembled with its formatting intact.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_MEMORY_BACKEND = os.getenv("TRANSLATION_MEMORY_BACKEND", "memory").lower()
+TRANSLATION_MEMORY_PATH = Path(
+    os.getenv(
+        "TRANSLATION_MEMORY_PATH",
+        str(Path(__file__).parent.parent.parent / "data" / "translation_memory.sqlite3"),
+    )
+)
+TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv("TRANSLATION_MEMORY_LRU_SIZE", "20000"))
+TRANSLATION_MEMORY_REDIS_TTL = int(os.getenv("TRANSLATION_MEMORY_REDIS_TTL", str(30 * 86400)))
+
+# Sentence boundary: terminal punctuation (incl. Devanagari danda) followed by
+# whitespace, or any run of newlines.
+_BOUNDARY = re.compile(r"((?<=[.!?।॥])\s+|\s*\n\s*)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Canonical form used for memory keys (NFC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", sentence)).strip()
+
+
+def segment_text(text: str) -> list[tuple[str, str]]:
+    """Split text into ``(sentence, separator)`` pairs.
+
+    ``"".join(s + sep for s, sep in segment_text(text)) == text`` always
+    holds. Sentences may be empty (e.g. leading blank lines).
+    """
+    parts = _BOUNDARY.split(text)
+    # re.split with one capture group alternates content / separator
+    parts.append("")
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+
+def memory_key(sentence: str, source_lang: str, target_lang: str) -> str:
+    digest = hashlib.sha1(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+    return f"{source_lang}:{target_lang}:{digest}"
+
+
+class TranslationStore(Protocol):
+    """Persistent backend for the translation memory."""
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]: ...
+
+    async def put_many(self, items: dict[str, str]) -> None: ...
+
+    async def count(self) -> int: ...
+
+
+class SQLiteTranslationStore:
+    """Local SQLite file; writes are batched into one transaction."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translation_memory ("
+            " key TEXT PRIMARY KEY,"
+            " translation TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get_many(self, keys: list[str]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    self._conn.execute(
+                        f"SELECT key, translation FROM translation_memory WHERE key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+        return found
+
+    def _put_many(self, items: dict[str, str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (key, translation) VALUES (?, ?)",
+                items.items(),
+            )
+            self._conn.commit()
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def put_many(self, items: dict[str, str]) -> None:
+        await asyncio.to_thread(self._put_many, items)
+
+    async def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+
+
+class RedisTranslationStore:
+    """Shared store in Redis (``tm:`` prefix); silently empty when Redis is down."""
+
+    PREFIX = "tm:"
+
+    async def _client(self):
+        try:
+            from backend.cache.redis_cache import get_redis_cache
+
+            return (await get_redis_cache()).get_client()
+        except Exception:
+            return None
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        client = await self._client()
+        if client is None or not keys:
+            return {}
+        try:
+            values = await client.mget([self.PREFIX + k for k in keys])
+        except Exception as e:
+            logger.warning(f"Translation memory Redis MGET failed: {e}")
+            return {}
+        return {k: v for k, v in zip(keys, values, strict=True) if v is not None}
+
+    async def put_many(self, items: dict[str, str]) -> None:
+        client = await self._client()
+        if client is None or not items:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.PREFIX + key, value, ex=TRANSLATION_MEMORY_REDIS_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Translation memory Redis write failed: {e}")
+
+    async def count(self) -> int:
+        return 0
+
+
+class TranslationMemory:
+    """LRU front over an optional persistent :class:`TranslationStore`."""
+
+    def __init__(
+        self,
+        store: TranslationStore | None = None,
+        lru_size: int = TRANSLATION_MEMORY_LRU_SIZE,
+    ) -> None:
+        self.store = store
+        self.lru_size = lru_size
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> TranslationMemory:
+        store: TranslationStore | None = None
+        try:
+            if TRANSLATION_MEMORY_BACKEND == "sqlite":
+                store = SQLiteTranslationStore(TRANSLATION_MEMORY_PATH)
+            elif TRANSLATION_MEMORY_BACKEND == "redis":
+                store = RedisTranslationStore()
+        except Exception as e:
+            logger.warning(f"⚠️ Translation memory store unavailable, using in-process only: {e}")
+        return cls(store)
+
+    def _remember(self, key: str, value: str) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    async def lookup(self, keys: list[str]) -> dict[str, str]:
+        """Return the translations known for ``keys`` (deduplicated)."""
+        found: dict[str, str] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            value = self._lru.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                self._lru.move_to_end(key)
+                found[key] = value
+
+        if missing and self.store is not None:
+            stored = await self.store.get_many(missing)
+            for key, value in stored.items():
+                self._remember(key, value)
+            found.update(stored)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def store_many(self, items: dict[str, str]) -> None:
+        for key, value in items.items():
+            self._remember(key, value)
+        if items and self.store is not None:
+            await self.store.put_many(items)
+
+    def clear(self) -> None:
+        """Drop the in-process layer (the persistent store is kept)."""
+        self._lru.clear()
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "backend": type(self.store).__name__ if self.store else "memory",
+            "lru_size": len(self._lru),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
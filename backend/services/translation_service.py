@@ -5,14 +5,33 @@ Google Translate API with caching and fallback mechanisms.
 
 If googletrans is not installed, the service will operate in fallback mode
 returning original text with a warning.
+
+Text is split into sentences and each sentence is looked up in the
+translation memory (see ``translation_memory``) before anything is sent to
+the provider; only unseen sentences are translated, in one batched call per
+request. ``translate_many`` extends this to many texts at once, and
+``prewarm_verses`` fills the memory with the Gita corpus ahead of traffic.
 """
 
+import json
 import logging
 import os
-from typing import Any, Optional
+from pathlib import Path
+from typing import Any
+
+from backend.services.translation_memory import (
+    TranslationMemory,
+    memory_key,
+    normalize_sentence,
+    segment_text,
+)
 
 logger = logging.getLogger(__name__)
 
+# Max sentences sent to the provider in one call
+TRANSLATION_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', '100'))
+GITA_VERSES_PATH = Path(__file__).parent.parent.parent / "data" / "gita" / "gita_verses_complete.json"
+
 # Try to import googletrans, fall back gracefully if not available
 try:
     from googletrans import Translator
@@ -69,10 +88,13 @@ class TranslationService:
 
     def __init__(self):
         """Initialize translation service."""
-        self.translator: Optional[Any] = None
+        self.translator: Any | None = None
         self.cache: dict[str, Any] = {}
         self.enabled = True
         self.googletrans_available = GOOGLETRANS_AVAILABLE
+        self.memory = TranslationMemory.from_env()
+        self.provider_calls = 0
+        self.provider_sentences = 0
 
         # Check if translation is enabled
         translation_enabled = os.getenv('TRANSLATION_ENABLED', 'true').lower()
@@ -119,53 +141,9 @@ class TranslationService:
                 - success: Translation success status
                 - error: Error message if failed
         """
-        # Validate input
-        if not text or not text.strip():
-            return {
-                'translated_text': text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': False,
-                'error': 'Empty text provided'
-            }
-        
-        # If target language is same as source, return original
-        if target_lang == source_lang:
-            return {
-                'translated_text': text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': True,
-                'error': None
-            }
-        
-        # Check if language is supported
-        if not self.is_supported_language(target_lang):
-            logger.warning(f"Unsupported language: {target_lang}")
-            return {
-                'translated_text': text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': False,
-                'error': f'Unsupported language: {target_lang}'
-            }
-        
-        # Check if translation is disabled or unavailable
-        if not self.enabled or not self.googletrans_available or self.translator is None:
-            reason = 'Translation service disabled' if not self.enabled else 'googletrans not installed'
-            logger.info(f"Translation unavailable ({reason}), returning original text")
-            return {
-                'translated_text': text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': False,
-                'error': reason,
-                'provider': 'fallback'
-            }
+        early = self._precheck(text, target_lang, source_lang)
+        if early is not None:
+            return early
 
         # Check cache
         cache_key = f"{source_lang}:{target_lang}:{text[:100]}"
@@ -174,24 +152,14 @@ class TranslationService:
             return self.cache[cache_key]
 
         try:
-            # Translate using Google Translate
-            # Note: googletrans 4.0.0-rc1 uses synchronous calls
-            import asyncio
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.translator.translate(text, src=source_lang, dest=target_lang)
+            segments = segment_text(text)
+            translations = await self._translate_sentences(
+                [sentence for sentence, _ in segments], source_lang, target_lang
+            )
+            translation_result = self._result(
+                text, _reassemble(segments, translations), source_lang, target_lang,
+                success=True, provider='googletrans',
             )
-
-            translation_result = {
-                'translated_text': result.text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': True,
-                'error': None,
-                'provider': 'googletrans'
-            }
 
             # Cache the result
             self.cache[cache_key] = translation_result
@@ -201,16 +169,65 @@ class TranslationService:
 
         except Exception as e:
             logger.error(f"Translation error: {type(e).__name__}: {e}")
-            return {
-                'translated_text': text,
-                'original_text': text,
-                'source_lang': source_lang,
-                'target_lang': target_lang,
-                'success': False,
-                'error': str(e),
-                'provider': 'fallback'
-            }
-    
+            return self._result(
+                text, text, source_lang, target_lang,
+                success=False, error=str(e), provider='fallback',
+            )
+
+    async def translate_many(
+        self,
+        texts: list[str],
+        target_lang: str,
+        source_lang: str = 'en'
+    ) -> list[dict[str, Any]]:
+        """
+        Translate several texts to one target language.
+
+        Sentences are deduplicated across all texts and looked up in the
+        translation memory; the remaining ones go to the provider in as few
+        calls as possible (``TRANSLATION_BATCH_SIZE`` sentences each).
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code
+            source_lang: Source language code (default: 'en')
+
+        Returns:
+            One result dictionary per input text, in order, with the same
+            keys as ``translate_text``
+        """
+        results: list[dict[str, Any] | None] = [
+            self._precheck(text, target_lang, source_lang) for text in texts
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        segmented = {i: segment_text(texts[i]) for i in pending}
+        try:
+            translations = await self._translate_sentences(
+                [sentence for i in pending for sentence, _ in segmented[i]],
+                source_lang,
+                target_lang,
+            )
+        except Exception as e:
+            logger.error(f"Batch translation error: {type(e).__name__}: {e}")
+            for i in pending:
+                results[i] = self._result(
+                    texts[i], texts[i], source_lang, target_lang,
+                    success=False, error=str(e), provider='fallback',
+                )
+            return results
+
+        for i in pending:
+            result = self._result(
+                texts[i], _reassemble(segmented[i], translations), source_lang, target_lang,
+                success=True, provider='googletrans',
+            )
+            self.cache[f"{source_lang}:{target_lang}:{texts[i][:100]}"] = result
+            results[i] = result
+        return results
+
     async def translate_chat_response(
         self,
         response: str,
@@ -234,9 +251,148 @@ class TranslationService:
             source_lang='en'
         )
     
+    async def prewarm_verses(
+        self,
+        languages: list[str] | None = None,
+        verses_path: Path = GITA_VERSES_PATH
+    ) -> dict[str, Any]:
+        """
+        Translate the Gita verse corpus into the translation memory.
+
+        Verse text is what chat responses quote most, so warming it means
+        those sentences never reach the provider at request time. With a
+        persistent memory backend this only needs to run once per language.
+
+        Args:
+            languages: Target language codes (default: all supported except English)
+            verses_path: Path to the verse corpus JSON
+
+        Returns:
+            Dictionary with per-language success and provider call counts
+        """
+        with open(verses_path, encoding='utf-8') as f:
+            verses = [v['english'] for v in json.load(f) if v.get('english')]
+
+        targets = languages or [code for code in SUPPORTED_LANGUAGES if code != 'en']
+        summary: dict[str, Any] = {'verses': len(verses), 'languages': {}}
+        for lang in targets:
+            calls_before = self.provider_calls
+            results = await self.translate_many(verses, lang)
+            summary['languages'][lang] = {
+                'translated': sum(1 for r in results if r['success']),
+                'provider_calls': self.provider_calls - calls_before,
+            }
+            logger.info(f"Pre-warmed {len(verses)} verses for {lang}")
+        return summary
+
+    def _precheck(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: str
+    ) -> dict[str, Any] | None:
+        """Return the final result for requests that need no provider call."""
+        # Validate input
+        if not text or not text.strip():
+            return self._result(text, text, source_lang, target_lang,
+                                success=False, error='Empty text provided')
+
+        # If target language is same as source, return original
+        if target_lang == source_lang:
+            return self._result(text, text, source_lang, target_lang, success=True)
+
+        # Check if language is supported
+        if not self.is_supported_language(target_lang):
+            logger.warning(f"Unsupported language: {target_lang}")
+            return self._result(text, text, source_lang, target_lang,
+                                success=False, error=f'Unsupported language: {target_lang}')
+
+        # Check if translation is disabled or unavailable
+        if not self.enabled or not self.googletrans_available or self.translator is None:
+            reason = 'Translation service disabled' if not self.enabled else 'googletrans not installed'
+            logger.info(f"Translation unavailable ({reason}), returning original text")
+            return self._result(text, text, source_lang, target_lang,
+                                success=False, error=reason, provider='fallback')
+        return None
+
+    @staticmethod
+    def _result(
+        text: str,
+        translated: str,
+        source_lang: str,
+        target_lang: str,
+        success: bool,
+        error: str | None = None,
+        provider: str | None = None
+    ) -> dict[str, Any]:
+        result = {
+            'translated_text': translated,
+            'original_text': text,
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'success': success,
+            'error': error,
+        }
+        if provider is not None:
+            result['provider'] = provider
+        return result
+
+    async def _translate_sentences(
+        self,
+        sentences: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> dict[str, str]:
+        """Map each normalized sentence to its translation.
+
+        Memory hits are served directly; misses are deduplicated and sent to
+        the provider in batches, then written back to the memory.
+        """
+        keys = {
+            normalized: memory_key(normalized, source_lang, target_lang)
+            for normalized in map(normalize_sentence, sentences)
+            if normalized
+        }
+        known = await self.memory.lookup(list(keys.values()))
+        misses = [normalized for normalized, key in keys.items() if key not in known]
+
+        for i in range(0, len(misses), TRANSLATION_BATCH_SIZE):
+            batch = misses[i:i + TRANSLATION_BATCH_SIZE]
+            translated = await self._provider_translate(batch, source_lang, target_lang)
+            fresh = {keys[normalized]: t for normalized, t in zip(batch, translated, strict=True)}
+            await self.memory.store_many(fresh)
+            known.update(fresh)
+
+        return {normalized: known[key] for normalized, key in keys.items()}
+
+    async def _provider_translate(
+        self,
+        batch: list[str],
+        source_lang: str,
+        target_lang: str
+    ) -> list[str]:
+        """One provider call for a batch of sentences."""
+        # Translate using Google Translate
+        # Note: googletrans 4.0.0-rc1 uses synchronous calls and accepts a list
+        import asyncio
+        loop = asyncio.get_event_loop()
+        payload: Any = batch if len(batch) > 1 else batch[0]
+        result = await loop.run_in_executor(
+            None,
+            lambda: self.translator.translate(payload, src=source_lang, dest=target_lang)
+        )
+        self.provider_calls += 1
+        self.provider_sentences += len(batch)
+
+        items = result if isinstance(result, list) else [result]
+        if len(items) != len(batch):
+            raise ValueError(f"Provider returned {len(items)} translations for {len(batch)} sentences")
+        return [item.text for item in items]
+
     def clear_cache(self):
         """Clear translation cache."""
         self.cache.clear()
+        self.memory.clear()
         logger.info("Translation cache cleared")
     
     def get_cache_stats(self) -> dict[str, Any]:
@@ -245,9 +401,26 @@ class TranslationService:
             'cache_size': len(self.cache),
             'enabled': self.enabled,
             'googletrans_available': self.googletrans_available,
-            'translator_initialized': self.translator is not None
+            'translator_initialized': self.translator is not None,
+            'memory': self.memory.stats(),
+            'provider_calls': self.provider_calls,
+            'provider_sentences': self.provider_sentences,
         }
 
 
+def _reassemble(segments: list[tuple[str, str]], translations: dict[str, str]) -> str:
+    """Rebuild text from translated sentences and the original separators."""
+    parts = []
+    for sentence, separator in segments:
+        normalized = normalize_sentence(sentence)
+        if normalized:
+            leading = sentence[:len(sentence) - len(sentence.lstrip())]
+            parts.append(leading + translations[normalized])
+        else:
+            parts.append(sentence)
+        parts.append(separator)
+    return ''.join(parts)
+
+
 # Global translation service instance
 translation_service = TranslationService()
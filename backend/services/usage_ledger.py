@@ -0,0 +1,486 @@
+"""Shared usage ledger for metered features (KIAAN questions, voice minutes).
+
+Counting usage in the database meant a get-or-create, SELECT ... FOR UPDATE,
+increment, commit and refresh per chat message, so one user's concurrent
+requests queued on a row lock. Voice minutes lived in a per-process dict,
+so every worker enforced its own copy of the daily cap.
+
+The ledger keeps the live counts in Redis instead, one hash per (feature,
+period, user) at ``usage:<feature>:<YYYYMMDD period start>:<user_id>``:
+
+- ``used``      committed usage for the period
+- ``limit``     the limit last checked against (copied into UsageTracking)
+- ``r:<id>``    an open reservation, ``"<amount>:<expires_at_ms>"``
+
+Every check-and-change is one Lua script, so limits hold across workers:
+
+- ``reserve()`` grants ``amount`` only if used + open reservations + amount
+  stays within the limit, and holds it until ``commit()`` (counts the
+  actual amount) or ``release()``. Reservations not settled within
+  USAGE_RESERVATION_TTL_SECONDS expire and stop counting.
+- ``add()`` counts usage that already happened, without a limit check.
+- A hash that does not exist yet is seeded from the UsageTracking row, so
+  a Redis restart does not hand out a fresh quota.
+
+Changed hashes are added to the ``usage:dirty`` set. The reconciler
+(``start()``) pops them in batches and writes the counts to UsageTracking,
+taking the larger of the two sides so neither can roll the other back.
+
+Every method returns None when Redis is unavailable (or the ledger is
+disabled); callers then use their database-only path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models import UsageTracking
+
+logger = logging.getLogger(__name__)
+
+# Set to "false" to count usage in the database only
+USAGE_LEDGER_ENABLED = os.getenv("USAGE_LEDGER_ENABLED", "true").lower() == "true"
+# Reservations not committed or released within this window stop counting
+USAGE_RESERVATION_TTL_SECONDS = int(os.getenv("USAGE_RESERVATION_TTL_SECONDS", "300"))
+# How often, and in what batch size, ledger counts are written to usage_tracking
+USAGE_RECONCILE_SECONDS = float(os.getenv("USAGE_RECONCILE_SECONDS", "5"))
+USAGE_RECONCILE_BATCH = int(os.getenv("USAGE_RECONCILE_BATCH", "500"))
+
+DIRTY_KEY = "usage:dirty"
+
+# Ledger hashes outlive their period by this much so late commits still land
+_KEY_GRACE_SECONDS = 2 * 86400
+
+_RESERVE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  if ARGV[7] == '' then return {-1, 0, 0} end
+  redis.call('HSET', KEYS[1], 'used', ARGV[7])
+end
+local now = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local used = tonumber(redis.call('HGET', KEYS[1], 'used') or '0')
+local held = 0
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+  if string.sub(entries[i], 1, 2) == 'r:' then
+    local value = entries[i + 1]
+    local sep = string.find(value, ':', 1, true)
+    if tonumber(string.sub(value, sep + 1)) <= now then
+      redis.call('HDEL', KEYS[1], entries[i])
+    else
+      held = held + tonumber(string.sub(value, 1, sep - 1))
+    end
+  end
+end
+redis.call('HSET', KEYS[1], 'limit', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+if amount > 0 then
+  if limit >= 0 and used + held + amount > limit then return {0, used, held} end
+  redis.call('HSET', KEYS[1], 'r:' .. ARGV[4], ARGV[2] .. ':' .. ARGV[5])
+  held = held + amount
+end
+return {1, used, held}
+"""
+
+_COMMIT_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  if ARGV[5] == '' then return -1 end
+  redis.call('HSET', KEYS[1], 'used', ARGV[5])
+end
+if ARGV[1] ~= '' then redis.call('HDEL', KEYS[1], 'r:' .. ARGV[1]) end
+local used = redis.call('HINCRBY', KEYS[1], 'used', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[3])
+return used
+"""
+
+# Raise the ledger to the database count (after a database-only stretch)
+_MERGE_LUA = """
+local used = redis.call('HGET', KEYS[1], 'used')
+if used and tonumber(used) < tonumber(ARGV[1]) then
+  redis.call('HSET', KEYS[1], 'used', ARGV[1])
+end
+return 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class UsagePeriod:
+    """A metering window, [start, end) in UTC."""
+
+    start: datetime.datetime
+    end: datetime.datetime
+
+    @classmethod
+    def day(cls, now: datetime.datetime | None = None) -> UsagePeriod:
+        now = now or datetime.datetime.now(datetime.UTC)
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return cls(start, start + datetime.timedelta(days=1))
+
+    @property
+    def tag(self) -> str:
+        return self.start.strftime("%Y%m%d")
+
+
+@dataclass(frozen=True, slots=True)
+class Reservation:
+    """Outcome of ``reserve()``; settle a granted one with commit or release."""
+
+    feature: str
+    user_id: str
+    period: UsagePeriod
+    amount: int
+    limit: int  # -1 = unlimited
+    granted: bool
+    used: int  # committed usage when the reservation was made
+    held: int  # open reservations, including this one if granted
+    reservation_id: str
+
+
+def _key(feature: str, period: UsagePeriod, user_id: str) -> str:
+    return f"usage:{feature}:{period.tag}:{user_id}"
+
+
+def _member(feature: str, period: UsagePeriod, user_id: str) -> str:
+    return f"{feature}|{period.start.isoformat()}|{period.end.isoformat()}|{user_id}"
+
+
+def _parse_member(member: str) -> tuple[str, UsagePeriod, str]:
+    feature, start, end, user_id = member.split("|", 3)
+    return (
+        feature,
+        UsagePeriod(datetime.datetime.fromisoformat(start), datetime.datetime.fromisoformat(end)),
+        user_id,
+    )
+
+
+class UsageLedger:
+    """Redis usage counters with atomic limits and a UsageTracking reconciler."""
+
+    def __init__(self) -> None:
+        self._scripts: dict[int, tuple] = {}
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._running = False
+        self._task: asyncio.Task | None = None
+        # Members counted in the database while Redis was down
+        self._pending_merge: set[str] = set()
+        self._stats = {"reconciled": 0, "reconcile_failures": 0, "fallbacks": 0}
+
+    async def _client(self):
+        if not USAGE_LEDGER_ENABLED:
+            return None
+        try:
+            from backend.cache.redis_cache import get_redis_cache
+
+            redis = await get_redis_cache()
+            return redis.get_client()
+        except Exception:
+            return None
+
+    def _script(self, client, index: int):
+        scripts = self._scripts.get(id(client))
+        if scripts is None or scripts[0] is not client:
+            scripts = (
+                client,
+                client.register_script(_RESERVE_LUA),
+                client.register_script(_COMMIT_LUA),
+                client.register_script(_MERGE_LUA),
+            )
+            self._scripts[id(client)] = scripts
+        return scripts[index]
+
+    def _ttl(self, period: UsagePeriod) -> int:
+        remaining = (period.end - datetime.datetime.now(datetime.UTC)).total_seconds()
+        return max(int(remaining), 0) + _KEY_GRACE_SECONDS
+
+    async def _seed(self, db: AsyncSession | None, feature: str, period: UsagePeriod, user_id: str) -> int:
+        """Usage already recorded in UsageTracking for this period."""
+        stmt = select(UsageTracking.usage_count).where(
+            UsageTracking.user_id == user_id,
+            UsageTracking.feature == feature,
+            UsageTracking.period_start == period.start,
+        )
+        if db is not None:
+            return max((await db.execute(stmt)).scalars().all(), default=0) or 0
+        if self._session_maker is not None:
+            async with self._session_maker() as session:
+                return max((await session.execute(stmt)).scalars().all(), default=0) or 0
+        return 0
+
+    async def _run(
+        self,
+        run: Callable[[str], Awaitable],
+        seed: Callable[[], Awaitable[int]],
+        missing: Callable[[object], bool],
+    ):
+        """Run a script without a seed; if the hash is missing, seed and rerun."""
+        result = await run("")
+        if missing(result):
+            result = await run(str(await seed()))
+        return result
+
+    async def reserve(
+        self,
+        db: AsyncSession | None,
+        feature: str,
+        user_id: str,
+        period: UsagePeriod,
+        amount: int,
+        limit: int,
+    ) -> Reservation | None:
+        """Atomically hold ``amount`` if it fits under ``limit`` (-1 = unlimited)."""
+        client = await self._client()
+        if client is None:
+            return None
+        reservation_id = uuid.uuid4().hex
+        key = _key(feature, period, user_id)
+
+        def run(seed: str):
+            now_ms = int(time.time() * 1000)
+            return self._script(client, 1)(keys=[key], args=[
+                now_ms, amount, limit, reservation_id,
+                now_ms + USAGE_RESERVATION_TTL_SECONDS * 1000, self._ttl(period), seed,
+            ])
+
+        try:
+            granted, used, held = await self._run(
+                run, lambda: self._seed(db, feature, period, user_id), lambda r: int(r[0]) == -1
+            )
+        except Exception as e:
+            self._fallback(e)
+            return None
+        return Reservation(
+            feature=feature,
+            user_id=user_id,
+            period=period,
+            amount=amount,
+            limit=limit,
+            granted=bool(int(granted)),
+            used=int(used),
+            held=int(held),
+            reservation_id=reservation_id,
+        )
+
+    async def usage(
+        self, db: AsyncSession | None, feature: str, user_id: str, period: UsagePeriod, limit: int
+    ) -> tuple[int, int] | None:
+        """(committed usage, open reservations) for the period."""
+        reservation = await self.reserve(db, feature, user_id, period, 0, limit)
+        return None if reservation is None else (reservation.used, reservation.held)
+
+    async def peek(self, feature: str, user_id: str, period: UsagePeriod) -> int | None:
+        """Committed usage in the ledger, or None if it holds none."""
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            used = await client.hget(_key(feature, period, user_id), "used")
+        except Exception as e:
+            self._fallback(e)
+            return None
+        return None if used is None else int(used)
+
+    async def commit(
+        self, db: AsyncSession | None, reservation: Reservation, amount: int | None = None
+    ) -> int | None:
+        """Count a reservation's actual usage (default: the reserved amount)."""
+        return await self._count(
+            db, reservation.feature, reservation.user_id, reservation.period,
+            reservation.amount if amount is None else amount, reservation.reservation_id,
+        )
+
+    async def add(
+        self, db: AsyncSession | None, feature: str, user_id: str, period: UsagePeriod, amount: int
+    ) -> int | None:
+        """Count usage that already happened; returns the new period total."""
+        return await self._count(db, feature, user_id, period, amount, "")
+
+    async def _count(self, db, feature, user_id, period, amount, reservation_id) -> int | None:
+        client = await self._client()
+        if client is None:
+            return None
+        key = _key(feature, period, user_id)
+        member = _member(feature, period, user_id)
+
+        def run(seed: str):
+            return self._script(client, 2)(keys=[key, DIRTY_KEY], args=[
+                reservation_id, amount, member, self._ttl(period), seed,
+            ])
+
+        try:
+            return int(await self._run(
+                run, lambda: self._seed(db, feature, period, user_id), lambda r: int(r) == -1
+            ))
+        except Exception as e:
+            self._fallback(e)
+            return None
+
+    async def release(self, reservation: Reservation) -> None:
+        """Drop a granted reservation that will not be used."""
+        if not reservation.granted:
+            return
+        client = await self._client()
+        if client is None:
+            return
+        with contextlib.suppress(Exception):
+            await client.hdel(
+                _key(reservation.feature, reservation.period, reservation.user_id),
+                f"r:{reservation.reservation_id}",
+            )
+
+    def note_database_increment(self, feature: str, user_id: str, period: UsagePeriod) -> None:
+        """Record usage counted in the database while the ledger was unavailable.
+
+        The next reconcile raises the Redis count to the database count.
+        """
+        self._pending_merge.add(_member(feature, period, user_id))
+
+    def _fallback(self, error: Exception) -> None:
+        self._stats["fallbacks"] += 1
+        logger.warning(f"[UsageLedger] Redis unavailable, using the database path: {error}")
+
+    # ---- reconciler -----------------------------------------------------
+
+    async def reconcile(self, db: AsyncSession, batch_size: int = USAGE_RECONCILE_BATCH) -> int:
+        """Write up to ``batch_size`` changed ledger counts to usage_tracking."""
+        client = await self._client()
+        if client is None:
+            return 0
+        if self._pending_merge:
+            pending, self._pending_merge = self._pending_merge, set()
+            await client.sadd(DIRTY_KEY, *pending)
+
+        members = await client.spop(DIRTY_KEY, batch_size)
+        if not members:
+            return 0
+        try:
+            parsed = [_parse_member(m) for m in members]
+            async with client.pipeline(transaction=False) as pipe:
+                for feature, period, user_id in parsed:
+                    pipe.hmget(_key(feature, period, user_id), "used", "limit")
+                values = await pipe.execute()
+
+            rows = (await db.execute(select(UsageTracking).where(or_(*(
+                and_(
+                    UsageTracking.user_id == user_id,
+                    UsageTracking.feature == feature,
+                    UsageTracking.period_start == period.start,
+                )
+                for feature, period, user_id in parsed
+            ))))).scalars().all()
+            existing = {(r.user_id, r.feature, _as_utc(r.period_start)): r for r in rows}
+
+            now = datetime.datetime.now(datetime.UTC)
+            raise_ledger: list[tuple[str, int]] = []
+            for (feature, period, user_id), (used, limit) in zip(parsed, values, strict=True):
+                if used is None:
+                    continue  # hash expired; nothing newer than the database
+                used = int(used)
+                row = existing.get((user_id, feature, period.start))
+                if row is None:
+                    row = UsageTracking(
+                        user_id=user_id, feature=feature, period_start=period.start,
+                        period_end=period.end, usage_count=used,
+                    )
+                    if limit is not None:
+                        row.usage_limit = int(limit)
+                    db.add(row)
+                    existing[(user_id, feature, period.start)] = row
+                    continue
+                if row.usage_count > used:
+                    raise_ledger.append((_key(feature, period, user_id), row.usage_count))
+                elif row.usage_count != used:
+                    row.usage_count = used
+                    row.updated_at = now
+                if limit is not None and row.usage_limit != int(limit):
+                    row.usage_limit = int(limit)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            await client.sadd(DIRTY_KEY, *members)
+            raise
+
+        for key, count in raise_ledger:
+            await self._script(client, 3)(keys=[key], args=[count])
+        self._stats["reconciled"] += len(members)
+        return len(members)
+
+    async def start(self, session_maker: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Start the background reconciler."""
+        if self._running:
+            return
+        if session_maker is None:
+            # Import lazily so this module has no import-time dependency on
+            # the DB engine (matters for unit tests).
+            from backend import deps
+
+            session_maker = deps.SessionLocal
+        self._session_maker = session_maker
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name="usage_ledger_reconciler")
+        logger.info(f"[UsageLedger] Reconciler started (every {USAGE_RECONCILE_SECONDS}s)")
+
+    async def stop(self) -> None:
+        """Stop the reconciler after writing out what is still pending."""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._session_maker is not None:
+            with contextlib.suppress(Exception):
+                async with self._session_maker() as db:
+                    while await self.reconcile(db):
+                        pass
+        logger.info("[UsageLedger] Reconciler stopped")
+
+    async def _loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(USAGE_RECONCILE_SECONDS)
+            try:
+                assert self._session_maker is not None
+                async with self._session_maker() as db:
+                    while await self.reconcile(db) >= USAGE_RECONCILE_BATCH:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["reconcile_failures"] += 1
+                logger.warning(f"[UsageLedger] Reconcile failed (will retry): {e}")
+
+    @property
+    def status(self) -> dict:
+        return {
+            "enabled": USAGE_LEDGER_ENABLED,
+            "running": self._running,
+            "pending_merge": len(self._pending_merge),
+            **self._stats,
+        }
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive datetimes for TIMESTAMP WITH TIME ZONE
+    return value if value.tzinfo else value.replace(tzinfo=datetime.UTC)
+
+
+_ledger: UsageLedger | None = None
+
+
+def get_usage_ledger() -> UsageLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = UsageLedger()
+    return _ledger
@@ -19,9 +19,12 @@ This module exposes:
     WSS handler after each turn ends to add to the daily counter
   • VoiceQuotaService.reset_for_user_for_tests(user_id) → test-only
 
-Storage today: in-process per-user counter keyed on (user_id, YYYY-MM-DD).
-Production swap: replace the dict backend with redis.incrby("voice:user:
-<uid>:<date>", minutes) — same key shape, same expiry semantics.
+The async variants (aevaluate, reserve_turn, arecord_minutes,
+release_turn) count in the shared usage ledger (backend.services.
+usage_ledger, feature "voice_minutes", daily period), so the cap holds
+across workers and a turn's minutes are held while it runs. When Redis is
+unavailable they fall back to the in-process counter below, which is also
+what the sync methods use.
 
 The counter expires at midnight UTC. We don't try to be clever about
 midnight-spanning sessions — the counter just rolls over the next day.
@@ -34,6 +37,8 @@ import logging
 import os
 from dataclasses import dataclass
 
+from backend.services.usage_ledger import Reservation, UsagePeriod, get_usage_ledger
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,12 +98,14 @@ def normalize_tier(raw: str | None) -> VoiceTier:
 # ─── Storage backend ──────────────────────────────────────────────────────
 
 
+VOICE_LEDGER_FEATURE = "voice_minutes"
+
+
 class _DailyCounter:
     """In-memory daily-minutes counter. (user_id, YYYY-MM-DD UTC) → minutes.
 
-    Production target: swap for Redis with key 'voice:user:<uid>:<date>'
-    and a TTL of 36h to handle midnight-spanning queries cleanly.
-    Interface preserved so the swap is local to this class.
+    Fallback for when the usage ledger (Redis) is unavailable; each
+    process then enforces the cap on its own.
     """
 
     def __init__(self) -> None:
@@ -142,11 +149,10 @@ class QuotaEvaluation:
 
 
 class VoiceQuotaService:
-    """Per-process quota service. Exposed via singleton get_voice_quota_service().
+    """Quota service. Exposed via singleton get_voice_quota_service().
 
-    Methods are sync — the underlying counter is in-memory. When Redis is
-    wired, async-ify the methods that touch the counter. The route layer
-    is async-ready already.
+    The sync methods use the in-process counter only; the async ones use
+    the shared usage ledger when Redis is available.
     """
 
     def __init__(self) -> None:
@@ -158,8 +164,23 @@ class VoiceQuotaService:
         Returns a QuotaEvaluation. The caller (route) projects this into
         the VoiceQuotaResponse Pydantic shape."""
         canonical = normalize_tier(tier)
+        return self._decide(canonical, self._counter.get(user_id))
+
+    async def aevaluate(self, *, user_id: str, tier: str | None) -> QuotaEvaluation:
+        """evaluate(), counting today's minutes across all workers.
+
+        Minutes held by turns still in progress count as used."""
+        canonical = normalize_tier(tier)
+        counts = await get_usage_ledger().usage(
+            None, VOICE_LEDGER_FEATURE, user_id, UsagePeriod.day(),
+            _ledger_limit(TIER_MATRIX[canonical]),
+        )
+        used = self._counter.get(user_id) if counts is None else sum(counts)
+        return self._decide(canonical, used)
+
+    @staticmethod
+    def _decide(canonical: VoiceTier, used: int) -> QuotaEvaluation:
         cfg = TIER_MATRIX[canonical]
-        used = self._counter.get(user_id)
 
         if cfg.minutes_per_day is None:
             return QuotaEvaluation(
@@ -212,6 +233,45 @@ class VoiceQuotaService:
         )
         return new_total
 
+    async def reserve_turn(
+        self, *, user_id: str, tier: str | None, minutes: int = 1
+    ) -> Reservation | None:
+        """Hold `minutes` of today's allowance for a turn about to start.
+
+        Returns the reservation (check ``granted``), or None when the
+        ledger is unavailable — then fall back to aevaluate(). Settle it
+        with arecord_minutes() when the turn ends, or release_turn()."""
+        cfg = TIER_MATRIX[normalize_tier(tier)]
+        return await get_usage_ledger().reserve(
+            None, VOICE_LEDGER_FEATURE, user_id, UsagePeriod.day(), minutes, _ledger_limit(cfg),
+        )
+
+    async def arecord_minutes(
+        self, *, user_id: str, minutes: float, reservation: Reservation | None = None
+    ) -> int:
+        """record_minutes() in the shared ledger, settling `reservation`.
+
+        The actual (rounded-up) minutes are counted, whatever was held."""
+        whole = max(int(minutes + 0.999), 0)
+        ledger = get_usage_ledger()
+        if reservation is not None and reservation.granted:
+            new_total = await ledger.commit(None, reservation, whole)
+        else:
+            new_total = await ledger.add(None, VOICE_LEDGER_FEATURE, user_id, UsagePeriod.day(), whole)
+        if new_total is None:
+            return self.record_minutes(user_id=user_id, minutes=minutes)
+        logger.info(
+            "voice.quota record user=%s +%d min total=%d",
+            user_id[:8] + "…" if len(user_id) > 8 else user_id,
+            whole, new_total,
+        )
+        return new_total
+
+    async def release_turn(self, reservation: Reservation | None) -> None:
+        """Drop a turn's reservation without counting any minutes."""
+        if reservation is not None:
+            await get_usage_ledger().release(reservation)
+
     def reset_for_user_for_tests(self, user_id: str) -> None:
         """Test-only counter reset. Refuses to run in non-test environments
         so a misuse in production cannot quietly grant unlimited minutes."""
@@ -223,6 +283,10 @@ class VoiceQuotaService:
         self._counter.reset(user_id)
 
 
+def _ledger_limit(cfg: TierConfig) -> int:
+    return -1 if cfg.minutes_per_day is None else cfg.minutes_per_day
+
+
 # ─── Singleton ────────────────────────────────────────────────────────────
 
 
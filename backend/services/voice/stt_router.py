@@ -18,6 +18,8 @@ chunk to drive the CrisisPartialScanner.
 
 Providers:
   • SarvamSTTProvider     — wraps Sarvam Saarika websocket / REST streaming
+  • WhisperSTTProvider    — local streaming Whisper (opt-in via
+                            KIAAN_WHISPER_STT_ENABLED=1), real partials
   • MockSTTProvider       — deterministic, used in tests + dev
 
 Key design choice: no real network calls happen at import time. The clients
@@ -349,6 +351,138 @@ class SarvamSTTProvider:
         self._buffer = bytearray()
 
 
+# ─── Local streaming Whisper ──────────────────────────────────────────────
+# Self-hosted alternative to Sarvam with true incremental partials. Opt-in
+# only (KIAAN_WHISPER_STT_ENABLED=1): it needs faster-whisper (or
+# openai-whisper) plus PyAV for Opus decoding, and CPU/GPU headroom.
+
+_WHISPER_STT_ENABLED = os.environ.get("KIAAN_WHISPER_STT_ENABLED") == "1"
+_WHISPER_STT_MODEL = os.environ.get("KIAAN_WHISPER_STT_MODEL", "small")
+
+
+class _OpusPacketDecoder:
+    """Raw Opus packets (48 kHz, as sent in audio.chunk frames) → 16 kHz
+    mono float32 PCM, via PyAV. Decoder state is per session because Opus
+    frames depend on the previous ones."""
+
+    def __init__(self) -> None:
+        import av  # type: ignore[import-not-found]
+
+        self._av = av
+        self._codec = av.CodecContext.create("opus", "r")
+        self._codec.sample_rate = 48000
+        self._codec.layout = "mono"
+        self._resampler = av.AudioResampler(format="flt", layout="mono", rate=16000)
+
+    def decode(self, packet: bytes):
+        import numpy as np
+
+        out = [
+            resampled.to_ndarray().reshape(-1)
+            for frame in self._codec.decode(self._av.Packet(packet))
+            for resampled in self._resampler.resample(frame)
+        ]
+        return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+
+
+class WhisperSTTProvider:
+    """Streaming STT backed by StreamingWhisperService.
+
+    Each audio.chunk is decoded and fed to the streaming session; every
+    update is yielded as a transcript.partial whose text is the whole turn
+    so far (utterances the VAD already closed + the current one).
+    end_of_speech flushes the open utterance and yields the single final.
+    """
+
+    name = "whisper-local"
+    supported_languages = frozenset(
+        {"en", "hi", "hi-en", "mr", "ta", "te", "bn", "pa", "gu", "kn", "ml"}
+    )
+
+    def __init__(self, decoder_factory=None) -> None:
+        self._decoder_factory = decoder_factory or _OpusPacketDecoder
+        self._decoder = None
+        self._stream = None
+        self._session_id = ""
+        self._lang_hint = "en"
+        self._closed_utterances: list[str] = []
+        self._seq = 0
+        self._started_at = 0.0
+
+    @staticmethod
+    def is_configured() -> bool:
+        if not _WHISPER_STT_ENABLED:
+            return False
+        import importlib.util
+
+        return any(
+            importlib.util.find_spec(mod) is not None
+            for mod in ("faster_whisper", "whisper")
+        )
+
+    async def start_session(self, *, session_id: str, lang_hint: str) -> None:
+        from backend.services.whisper_transcription import (
+            StreamingWhisperService,
+            TranscriptionLanguage,
+        )
+
+        try:
+            language = TranscriptionLanguage((lang_hint or "en").lower().split("-")[0])
+        except ValueError:
+            language = TranscriptionLanguage.AUTO
+        self._stream = StreamingWhisperService(_WHISPER_STT_MODEL, language=language)
+        self._decoder = self._decoder_factory()
+        self._session_id = session_id
+        self._lang_hint = lang_hint
+        self._closed_utterances = []
+        self._seq = 0
+        self._started_at = time.monotonic()
+
+    def _result(self, current: str, *, is_final: bool, seq: int) -> STTResult:
+        text = " ".join(t for t in (*self._closed_utterances, current) if t)
+        return STTResult(
+            text=text,
+            is_final=is_final,
+            seq=seq,
+            confidence=0.9 if is_final else 0.7,
+            detected_language=self._lang_hint,
+            elapsed_ms=int((time.monotonic() - self._started_at) * 1000) if self._started_at else 0,
+        )
+
+    async def feed_audio_chunk(
+        self, *, seq: int, opus_b64: str
+    ) -> AsyncIterator[STTResult]:
+        if self._stream is None:
+            return
+        try:
+            packet = base64.b64decode(opus_b64, validate=True)
+        except Exception as e:
+            raise RuntimeError(
+                f"WhisperSTTProvider: cannot base64-decode chunk seq={seq}: {e}"
+            ) from e
+        self._seq = seq
+        for update in await self._stream.feed(self._decoder.decode(packet)):
+            if update.is_final:
+                self._closed_utterances.append(update.committed)
+                yield self._result("", is_final=False, seq=seq)
+            else:
+                yield self._result(update.text, is_final=False, seq=seq)
+
+    async def end_of_speech(self) -> AsyncIterator[STTResult]:
+        # Always exactly one final, even without an open session, so the
+        # caller can close the turn
+        final = await self._stream.flush() if self._stream is not None else None
+        yield self._result(
+            final.committed if final else "", is_final=True, seq=self._seq + 1,
+        )
+
+    async def close(self) -> None:
+        if self._stream is not None:
+            self._stream.reset()
+        self._stream = None
+        self._closed_utterances = []
+
+
 # ─── Router ───────────────────────────────────────────────────────────────
 
 
@@ -390,6 +524,14 @@ class STTRouter:
                 reason="KIAAN_VOICE_MOCK_PROVIDERS=1 (forced)",
                 fell_back_to_mock=False,
             )
+        # Local Whisper is an explicit operator opt-in, so it wins over
+        # Sarvam when enabled and installed.
+        if WhisperSTTProvider.is_configured():
+            return STTRouterDecision(
+                provider_name=WhisperSTTProvider.name,
+                reason=f"KIAAN_WHISPER_STT_ENABLED=1 → local Whisper ({_WHISPER_STT_MODEL})",
+                fell_back_to_mock=False,
+            )
         # Sarvam Saarika handles every supported language: the 9 Indic
         # codes via their native locales (hi-IN, ta-IN, …) plus English
         # via en-IN. Deepgram was removed in 2025-11 — the operator
@@ -423,6 +565,8 @@ class STTRouter:
             return MockSTTProvider(), decision
         if decision.provider_name == "sarvam-saarika":
             return SarvamSTTProvider(), decision
+        if decision.provider_name == WhisperSTTProvider.name:
+            return WhisperSTTProvider(), decision
         # Defensive — shouldn't reach here. Deepgram was removed in
         # 2025-11; if some upstream caller forces an unknown
         # provider_name, fall back to mock with a logged warning.
@@ -457,5 +601,6 @@ __all__ = [
     "STTRouterDecision",
     "MockSTTProvider",
     "SarvamSTTProvider",
+    "WhisperSTTProvider",
     "get_stt_router",
 ]
@@ -21,6 +21,10 @@ from enum import Enum
 import logging
 from collections import defaultdict
 
+import numpy as np
+
+from backend.services.voice_prosody import extract_prosody
+
 logger = logging.getLogger(__name__)
 
 
@@ -165,41 +169,65 @@ class MultiModalEmotionService:
         """
         Extract acoustic features from voice audio.
 
-        In a production environment, this would use proper audio processing
-        libraries like librosa or PyAudio. This implementation provides
-        the interface and simulated feature extraction.
+        Encoded audio (WAV, WebM, Ogg, MP3, MP4) is decoded in memory;
+        anything else is read as raw 16-bit mono PCM at ``sample_rate``.
+        Pitch, pace, pauses and tremor come from the frame-wise analysis in
+        voice_prosody. Audio with no voiced speech yields the user's
+        baseline, so every delta downstream reads as neutral.
         """
-        # Simulated feature extraction
-        # In production, use proper audio analysis:
-        # - pitch: librosa.piptrack or pyin
-        # - pace: speech recognition + word counting
-        # - volume: RMS energy calculation
-        # - tremor: frequency analysis of pitch modulation
-
-        # Get user's baseline for comparison
         baseline = self._calibration_data.get(user_id, {})
-
-        # Simulated baseline values (would be calculated from audio)
-        baseline_pitch = baseline.get("pitch_mean", 150.0)  # Hz
-        baseline_rate = baseline.get("speaking_rate", 120.0)  # wpm
-        baseline_volume = baseline.get("volume_mean", -20.0)  # dB
-
-        # Simulate feature extraction (in production, analyze actual audio)
-        features = VoiceAcousticFeatures(
-            pitch_mean=baseline_pitch * (1 + (hash(audio_data[:100]) % 20 - 10) / 100),
-            pitch_variance=5.0 + (hash(audio_data[:50]) % 10),
+        neutral = VoiceAcousticFeatures(
+            pitch_mean=baseline.get("pitch_mean", 150.0),  # Hz
+            pitch_variance=baseline.get("pitch_variance", 5.0),
             pitch_range=(80.0, 300.0),
-            speaking_rate=baseline_rate * (1 + (hash(audio_data[50:100]) % 30 - 15) / 100),
-            pause_frequency=3.0 + (hash(audio_data[100:150]) % 5),
-            pause_duration_avg=0.5 + (hash(audio_data[150:200]) % 10) / 20,
-            volume_mean=baseline_volume + (hash(audio_data[200:250]) % 10 - 5),
-            volume_variance=3.0 + (hash(audio_data[250:300]) % 5),
-            tremor_detected=hash(audio_data[:20]) % 10 < 2,  # 20% chance
-            tremor_frequency=5.0 if hash(audio_data[:20]) % 10 < 2 else None,
-            voice_quality_score=0.7 + (hash(audio_data[300:350]) % 30) / 100
+            speaking_rate=baseline.get("speaking_rate", 120.0),  # wpm
+            pause_frequency=baseline.get("pause_frequency", 4.0),
+            pause_duration_avg=0.5,
+            volume_mean=baseline.get("volume_mean", -20.0),  # dB
+            volume_variance=3.0,
+            tremor_detected=False,
+            tremor_frequency=None,
+            voice_quality_score=0.7,
         )
 
-        return features
+        try:
+            audio, rate = self._decode_audio(audio_data, sample_rate)
+            summary = extract_prosody(audio, rate)
+        except Exception as e:
+            logger.warning(f"Acoustic feature extraction failed: {e}")
+            return neutral
+        if not summary.pitch_mean_hz:
+            return neutral
+
+        return VoiceAcousticFeatures(
+            pitch_mean=summary.pitch_mean_hz,
+            # Spread in semitones x2 matches the scale _analyze_pitch_pattern
+            # expects (<4 flat, 4-8 moderate, >8 agitated)
+            pitch_variance=summary.pitch_std_semitones * 2,
+            pitch_range=summary.pitch_range_hz,
+            speaking_rate=summary.words_per_minute or neutral.speaking_rate,
+            pause_frequency=summary.pauses_per_minute,
+            pause_duration_avg=summary.pause_duration_avg,
+            volume_mean=summary.energy_db_mean,
+            volume_variance=summary.energy_db_std,
+            tremor_detected=summary.tremor_hz is not None,
+            tremor_frequency=summary.tremor_hz,
+            voice_quality_score=summary.periodicity,
+        )
+
+    @staticmethod
+    def _decode_audio(audio_data: bytes, sample_rate: int) -> tuple[np.ndarray, int]:
+        """Mono float32 samples and their rate from encoded audio or raw PCM."""
+        container_magic = (b"RIFF", b"OggS", b"\x1aE\xdf\xa3", b"ID3", b"fLaC")
+        if audio_data[:4].startswith(container_magic) or audio_data[4:8] == b"ftyp":
+            from backend.services.whisper_transcription import (
+                WHISPER_SAMPLE_RATE,
+                decode_audio,
+            )
+
+            return decode_audio(audio_data), WHISPER_SAMPLE_RATE
+        pcm = np.frombuffer(audio_data[: len(audio_data) // 2 * 2], dtype=np.int16)
+        return pcm.astype(np.float32) / 32768.0, sample_rate
 
     def calibrate_user_baseline(
         self,
@@ -21,20 +21,44 @@ Quality Scores:
 - English: 98%+ accuracy
 - Hindi: 95%+ accuracy
 - Sanskrit: 85%+ accuracy (with fine-tuning potential)
+
+RUNTIME:
+- Audio is decoded in memory to 16 kHz mono float32 (no temp files).
+- Models live in a process-wide registry keyed by (size, device, compute
+  type), so every WhisperService / streaming session shares one copy.
+- Inference runs on a bounded pool (WHISPER_INFERENCE_WORKERS threads plus
+  WHISPER_INFERENCE_QUEUE_SIZE waiting jobs). When it is full, transcribe
+  raises WhisperQueueFull instead of piling up work; queue time and
+  inference time are tracked in get_inference_metrics().
 """
 
-import os
 import asyncio
+import dataclasses
+import io
 import logging
-import tempfile
+import os
+import subprocess
+import threading
+import time
 import wave
-from typing import Optional, Dict, List, Any, Tuple
-from dataclasses import dataclass
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-import io
+from typing import Any
+
+import numpy as np
+
+from backend.services.voice_prosody import extract_prosody, whisper_voice_features
 
 logger = logging.getLogger(__name__)
 
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")  # default: float16 on CUDA, int8 otherwise
+WHISPER_INFERENCE_WORKERS = int(os.getenv("WHISPER_INFERENCE_WORKERS", "2"))
+WHISPER_INFERENCE_QUEUE_SIZE = int(os.getenv("WHISPER_INFERENCE_QUEUE_SIZE", "8"))
+WHISPER_INFERENCE_TIMEOUT = float(os.getenv("WHISPER_INFERENCE_TIMEOUT", "60"))
+
 
 # ============================================
 # CONFIGURATION
@@ -94,7 +118,7 @@ class TranscriptionConfig:
     task: str = "transcribe"  # "transcribe" or "translate"
     word_timestamps: bool = True
     vad_filter: bool = True  # Voice activity detection
-    initial_prompt: Optional[str] = None  # Context prompt
+    initial_prompt: str | None = None  # Context prompt
 
 
 @dataclass
@@ -104,10 +128,321 @@ class TranscriptionResult:
     language: str
     confidence: float
     duration_seconds: float
-    words: List[Dict[str, Any]]  # Word-level data
-    segments: List[Dict[str, Any]]  # Segment-level data
-    voice_features: Dict[str, float]  # Extracted voice features
+    words: list[dict[str, Any]]  # Word-level data
+    segments: list[dict[str, Any]]  # Segment-level data
+    voice_features: dict[str, float]  # Extracted voice features
     is_sanskrit: bool = False
+    is_partial: bool = False  # streaming partial that may still change
+
+
+# ============================================
+# IN-MEMORY AUDIO DECODING
+# ============================================
+
+def decode_audio(audio_data: bytes, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode audio bytes to a mono float32 array at ``sample_rate``.
+
+    PCM WAV is parsed directly; anything else (webm, ogg, mp3, mp4) goes
+    through PyAV (bundled with faster-whisper) on a BytesIO, or an ffmpeg
+    pipe when PyAV is unavailable. Nothing touches the filesystem.
+    """
+    if not audio_data:
+        raise ValueError("Audio data is empty")
+
+    if audio_data[:4] == b"RIFF" and audio_data[8:12] == b"WAVE":
+        try:
+            return _decode_wav(audio_data, sample_rate)
+        except wave.Error:
+            pass  # float / extensible WAV - let the general decoder handle it
+
+    try:
+        from faster_whisper.audio import decode_audio as _av_decode_audio
+    except ImportError:
+        return _decode_with_ffmpeg(audio_data, sample_rate)
+    return _av_decode_audio(io.BytesIO(audio_data), sampling_rate=sample_rate)
+
+
+def _decode_wav(audio_data: bytes, sample_rate: int) -> np.ndarray:
+    with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+        n_channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        frame_rate = wav.getframerate()
+        raw_data = wav.readframes(wav.getnframes())
+
+    if sample_width == 2:
+        audio = np.frombuffer(raw_data, dtype=np.int16).astype(np.float32) / 32768.0
+    elif sample_width == 4:
+        audio = np.frombuffer(raw_data, dtype=np.int32).astype(np.float32) / 2147483648.0
+    elif sample_width == 1:
+        audio = (np.frombuffer(raw_data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise wave.Error(f"Unsupported sample width: {sample_width}")
+
+    if n_channels > 1:
+        audio = audio[: len(audio) - len(audio) % n_channels].reshape(-1, n_channels).mean(axis=1)
+
+    if frame_rate != sample_rate and len(audio):
+        # Linear resampling is adequate for speech recognition input
+        n_out = int(round(len(audio) * sample_rate / frame_rate))
+        positions = np.linspace(0, len(audio) - 1, n_out)
+        audio = np.interp(positions, np.arange(len(audio)), audio)
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def _decode_with_ffmpeg(audio_data: bytes, sample_rate: int) -> np.ndarray:
+    try:
+        proc = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+                "-ar", str(sample_rate), "pipe:1",
+            ],
+            input=audio_data,
+            capture_output=True,
+            check=True,
+        )
+    except FileNotFoundError as e:
+        raise RuntimeError("No audio decoder available (install faster-whisper or ffmpeg)") from e
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')[-200:]}") from e
+    return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+# ============================================
+# MODEL REGISTRY
+# ============================================
+
+@dataclass
+class LoadedWhisperModel:
+    """A loaded model and which backend produced it"""
+    model: Any
+    use_standard: bool  # openai-whisper rather than faster-whisper
+
+
+_model_registry: dict[tuple[str, str, str], LoadedWhisperModel] = {}
+_registry_lock = threading.Lock()
+
+
+def default_compute_type(device: str) -> str:
+    return WHISPER_COMPUTE_TYPE or ("float16" if device == "cuda" else "int8")
+
+
+def _load_model_sync(model_size: str, device: str, compute_type: str) -> LoadedWhisperModel | None:
+    key = (model_size, device, compute_type)
+    with _registry_lock:
+        # Double-check under the lock (another thread may have loaded it)
+        if key in _model_registry:
+            return _model_registry[key]
+
+        try:
+            # Try faster-whisper first (optimized)
+            from faster_whisper import WhisperModel as FasterWhisperModel
+
+            logger.info(f"Loading Whisper model ({model_size}) on {device} [{compute_type}]...")
+            loaded = LoadedWhisperModel(
+                FasterWhisperModel(model_size, device=device, compute_type=compute_type),
+                use_standard=False,
+            )
+        except ImportError:
+            # Fall back to standard whisper
+            try:
+                import whisper
+
+                logger.info("faster-whisper not found, using standard whisper")
+                loaded = LoadedWhisperModel(whisper.load_model(model_size), use_standard=True)
+            except ImportError:
+                logger.error("Neither faster-whisper nor whisper installed")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to load Whisper: {e}")
+            return None
+
+        _model_registry[key] = loaded
+        logger.info("Whisper model loaded successfully")
+        return loaded
+
+
+async def get_whisper_model(
+    model_size: str,
+    device: str,
+    compute_type: str | None = None,
+) -> LoadedWhisperModel | None:
+    """Return the shared model for (size, device, compute type), loading it once."""
+    compute_type = compute_type or default_compute_type(device)
+    loaded = _model_registry.get((model_size, device, compute_type))
+    if loaded is not None:
+        return loaded
+    return await asyncio.to_thread(_load_model_sync, model_size, device, compute_type)
+
+
+def loaded_whisper_models() -> list[tuple[str, str, str]]:
+    """Keys of the models currently held in the registry"""
+    return list(_model_registry)
+
+
+# ============================================
+# BOUNDED INFERENCE POOL
+# ============================================
+
+class WhisperQueueFull(RuntimeError):
+    """Raised when the inference pool has no room for another job"""
+
+
+@dataclass
+class InferenceMetrics:
+    """Counters for the inference pool"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    peak_depth: int = 0
+    queue_seconds_total: float = 0.0
+    queue_seconds_max: float = 0.0
+    inference_seconds_total: float = 0.0
+    recent_queue_seconds: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        finished = self.completed + self.failed
+        recent = sorted(self.recent_queue_seconds)
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "peak_depth": self.peak_depth,
+            "avg_queue_ms": round(self.queue_seconds_total / finished * 1000, 1) if finished else 0.0,
+            "p95_queue_ms": round(recent[int(len(recent) * 0.95) - 1] * 1000, 1) if recent else 0.0,
+            "max_queue_ms": round(self.queue_seconds_max * 1000, 1),
+            "avg_inference_ms": round(self.inference_seconds_total / finished * 1000, 1) if finished else 0.0,
+        }
+
+
+class WhisperInferencePool:
+    """
+    Fixed worker threads plus a bounded number of waiting jobs.
+
+    A job counts against capacity from submission until its thread
+    finishes - including jobs the caller stopped waiting for after a
+    timeout - so a stuck decode cannot let unbounded work pile up behind it.
+    """
+
+    _RECENT_WINDOW = 500
+
+    def __init__(
+        self,
+        workers: int = WHISPER_INFERENCE_WORKERS,
+        queue_size: int = WHISPER_INFERENCE_QUEUE_SIZE,
+    ):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.metrics = InferenceMetrics()
+
+    @property
+    def depth(self) -> int:
+        """Jobs queued or running"""
+        return self._depth
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = WHISPER_INFERENCE_TIMEOUT,
+    ) -> Any:
+        with self._lock:
+            if self._depth >= self.capacity:
+                self.metrics.rejected += 1
+                raise WhisperQueueFull(
+                    f"Whisper inference queue full ({self._depth}/{self.capacity} jobs)"
+                )
+            self._depth += 1
+            self.metrics.submitted += 1
+            self.metrics.peak_depth = max(self.metrics.peak_depth, self._depth)
+
+        submitted_at = time.perf_counter()
+
+        def _job() -> Any:
+            started_at = time.perf_counter()
+            ok = False
+            try:
+                result = fn(*args)
+                ok = True
+                return result
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._depth -= 1
+                    m = self.metrics
+                    waited = started_at - submitted_at
+                    m.queue_seconds_total += waited
+                    m.queue_seconds_max = max(m.queue_seconds_max, waited)
+                    m.recent_queue_seconds.append(waited)
+                    if len(m.recent_queue_seconds) > self._RECENT_WINDOW:
+                        del m.recent_queue_seconds[0]
+                    m.inference_seconds_total += finished_at - started_at
+                    if ok:
+                        m.completed += 1
+                    else:
+                        m.failed += 1
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, _job)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError:
+            with self._lock:
+                self.metrics.timed_out += 1
+            raise
+
+    def get_metrics(self) -> dict[str, Any]:
+        with self._lock:
+            metrics = self.metrics.to_dict()
+            metrics.update(depth=self._depth, capacity=self.capacity, workers=self.workers)
+        return metrics
+
+
+inference_pool = WhisperInferencePool()
+
+
+def get_inference_metrics() -> dict[str, Any]:
+    """Queue and inference timings for the shared Whisper pool"""
+    return inference_pool.get_metrics()
+
+
+def _empty_result() -> TranscriptionResult:
+    return TranscriptionResult(
+        text="",
+        language="en",
+        confidence=0.0,
+        duration_seconds=0.0,
+        words=[],
+        segments=[],
+        voice_features={},
+    )
+
+
+def _as_dict(item: Any) -> dict[str, Any]:
+    """Segment / word from either backend as a plain dict.
+
+    openai-whisper returns dicts, faster-whisper returns dataclasses
+    (namedtuples before 1.0).
+    """
+    if isinstance(item, dict):
+        return item
+    if hasattr(item, "_asdict"):
+        return item._asdict()
+    if dataclasses.is_dataclass(item):
+        return dataclasses.asdict(item)
+    return {
+        key: getattr(item, key)
+        for key in ("word", "text", "start", "end", "probability", "words")
+        if hasattr(item, key)
+    }
 
 
 # ============================================
@@ -125,14 +460,18 @@ class WhisperService:
     - Voice feature extraction
     """
 
-    def __init__(self, model_size: str = "large-v3-turbo"):
+    def __init__(
+        self,
+        model_size: str = "large-v3-turbo",
+        pool: WhisperInferencePool | None = None,
+    ):
         self.model = None
         self.model_size = model_size
         self.loaded = False
+        self.use_standard = False
         self.device = self._detect_device()
-        # Lock to prevent concurrent model loading (race condition where two
-        # requests both see self.loaded=False and load the model simultaneously)
-        self._load_lock = asyncio.Lock()
+        self.compute_type = default_compute_type(self.device)
+        self.pool = pool or inference_pool
 
         # Sanskrit vocabulary for improved recognition
         self.sanskrit_vocab = [
@@ -164,51 +503,18 @@ class WhisperService:
         return "cpu"
 
     async def load_model(self) -> bool:
-        """Load Whisper model (lazy loading, thread-safe via async lock)"""
+        """Attach the shared model from the registry (loaded on first use)"""
         if self.loaded:
             return True
 
-        async with self._load_lock:
-            # Double-check after acquiring lock (another request may have loaded it)
-            if self.loaded:
-                return True
-
-            try:
-                # Try faster-whisper first (optimized)
-                from faster_whisper import WhisperModel
-
-                logger.info(f"Loading Whisper model ({self.model_size}) on {self.device}...")
-
-                compute_type = "float16" if self.device == "cuda" else "int8"
-
-                self.model = WhisperModel(
-                    self.model_size,
-                    device=self.device,
-                    compute_type=compute_type
-                )
-
-                self.loaded = True
-                logger.info("Whisper model loaded successfully")
-                return True
-
-            except ImportError:
-                # Fall back to standard whisper
-                try:
-                    import whisper
-
-                    logger.info("faster-whisper not found, using standard whisper")
-                    self.model = whisper.load_model(self.model_size)
-                    self.loaded = True
-                    self.use_standard = True
-                    return True
-
-                except ImportError:
-                    logger.error("Neither faster-whisper nor whisper installed")
-                    return False
+        loaded = await get_whisper_model(self.model_size, self.device, self.compute_type)
+        if loaded is None:
+            return False
 
-            except Exception as e:
-                logger.error(f"Failed to load Whisper: {e}")
-                return False
+        self.model = loaded.model
+        self.use_standard = loaded.use_standard
+        self.loaded = True
+        return True
 
     def _get_initial_prompt(self, language: str) -> str:
         """Get context prompt to improve recognition"""
@@ -224,7 +530,7 @@ class WhisperService:
     async def transcribe(
         self,
         audio_data: bytes,
-        config: Optional[TranscriptionConfig] = None
+        config: TranscriptionConfig | None = None
     ) -> TranscriptionResult:
         """
         Transcribe audio to text.
@@ -236,31 +542,36 @@ class WhisperService:
         Returns:
             TranscriptionResult with text and metadata
         """
+        return await self._transcribe(audio_data, config, decoded=False, extract_features=True)
+
+    async def transcribe_samples(
+        self,
+        audio: np.ndarray,
+        config: TranscriptionConfig | None = None,
+        extract_features: bool = False,
+    ) -> TranscriptionResult:
+        """
+        Transcribe already-decoded 16 kHz mono float32 samples.
+
+        Used by streaming sessions, which re-transcribe overlapping windows
+        and skip voice feature extraction by default.
+        """
+        return await self._transcribe(audio, config, decoded=True, extract_features=extract_features)
+
+    async def _transcribe(
+        self,
+        payload: Any,
+        config: TranscriptionConfig | None,
+        decoded: bool,
+        extract_features: bool,
+    ) -> TranscriptionResult:
         if config is None:
             config = TranscriptionConfig()
 
         if not await self.load_model():
-            return TranscriptionResult(
-                text="",
-                language="en",
-                confidence=0.0,
-                duration_seconds=0.0,
-                words=[],
-                segments=[],
-                voice_features={},
-            )
+            return _empty_result()
 
-        temp_path = None
         try:
-            # Save audio to temp file (Whisper needs file path)
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                f.write(audio_data)
-
-            # Validate temp file is not empty
-            if os.path.getsize(temp_path) == 0:
-                raise ValueError("Audio data is empty")
-
             # Build transcription options
             language = None if config.language == TranscriptionLanguage.AUTO else config.language.value
 
@@ -268,74 +579,24 @@ class WhisperService:
                 language or "en"
             )
 
-            # Transcribe with timeout to prevent hanging on corrupted audio
-            if hasattr(self, 'use_standard') and self.use_standard:
-                # Standard whisper
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self.model.transcribe,
-                        temp_path,
-                        language=language,
-                        initial_prompt=initial_prompt,
-                        word_timestamps=config.word_timestamps,
-                    ),
-                    timeout=60,
-                )
-                segments = result["segments"]
-                text = result["text"]
-                detected_language = result.get("language", "en")
-
-            else:
-                # faster-whisper
-                def _transcribe():
-                    return self.model.transcribe(
-                        temp_path,
-                        language=language,
-                        task=config.task,
-                        initial_prompt=initial_prompt,
-                        word_timestamps=config.word_timestamps,
-                        vad_filter=config.vad_filter,
-                    )
-
-                segments_gen, info = await asyncio.wait_for(
-                    asyncio.to_thread(_transcribe),
-                    timeout=60,
-                )
-
-                segments = list(segments_gen)
-                text = " ".join(seg.text for seg in segments)
-                detected_language = info.language
+            # Decode and transcribe on the bounded pool, with a timeout to
+            # prevent hanging on corrupted audio
+            segments, text, detected_language, voice_features = await self.pool.run(
+                self._run_inference, payload, decoded, language, initial_prompt, config,
+                extract_features,
+            )
 
             # Process segments
             processed_segments = []
             all_words = []
 
             for seg in segments:
-                if hasattr(seg, '_asdict'):
-                    seg_dict = seg._asdict()
-                else:
-                    seg_dict = {
-                        "start": getattr(seg, "start", 0),
-                        "end": getattr(seg, "end", 0),
-                        "text": getattr(seg, "text", str(seg))
-                    }
-
+                seg_dict = _as_dict(seg)
                 processed_segments.append(seg_dict)
 
                 # Extract words if available
-                if hasattr(seg, "words") and seg.words:
-                    for word in seg.words:
-                        if hasattr(word, "_asdict"):
-                            all_words.append(word._asdict())
-                        else:
-                            all_words.append({
-                                "word": str(word),
-                                "start": 0,
-                                "end": 0
-                            })
-
-            # Extract voice features
-            voice_features = await self._extract_voice_features(audio_data)
+                for word in seg_dict.get("words") or []:
+                    all_words.append(_as_dict(word))
 
             # Calculate confidence
             confidence = self._calculate_confidence(processed_segments)
@@ -354,95 +615,69 @@ class WhisperService:
                 is_sanskrit=is_sanskrit
             )
 
-        except asyncio.TimeoutError:
-            logger.error("Transcription timed out (60s limit)")
-            return TranscriptionResult(
-                text="",
-                language="en",
-                confidence=0.0,
-                duration_seconds=0.0,
-                words=[],
-                segments=[],
-                voice_features={},
-            )
+        except WhisperQueueFull:
+            logger.warning("Whisper inference queue full, rejecting transcription")
+            raise
+        except TimeoutError:
+            logger.error(f"Transcription timed out ({WHISPER_INFERENCE_TIMEOUT:.0f}s limit)")
+            return _empty_result()
         except Exception as e:
             logger.error(f"Transcription error: {e}")
-            return TranscriptionResult(
-                text="",
-                language="en",
-                confidence=0.0,
-                duration_seconds=0.0,
-                words=[],
-                segments=[],
-                voice_features={},
+            return _empty_result()
+
+    def _run_inference(
+        self,
+        payload: Any,
+        decoded: bool,
+        language: str | None,
+        initial_prompt: str,
+        config: TranscriptionConfig,
+        extract_features: bool,
+    ) -> tuple[list[Any], str, str, dict[str, float]]:
+        """Decode, transcribe and extract voice features (runs on a pool thread)"""
+        audio = payload if decoded else decode_audio(payload)
+        if audio.size == 0:
+            raise ValueError("Audio data is empty")
+        voice_features = (
+            self._extract_voice_features(audio, WHISPER_SAMPLE_RATE) if extract_features else {}
+        )
+
+        if self.use_standard:
+            # Standard whisper
+            result = self.model.transcribe(
+                audio,
+                language=language,
+                initial_prompt=initial_prompt,
+                word_timestamps=config.word_timestamps,
             )
-        finally:
-            # Always clean up temp file to prevent /tmp from filling up
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
-
-    async def _extract_voice_features(self, audio_data: bytes) -> Dict[str, float]:
+            return result["segments"], result["text"], result.get("language", "en"), voice_features
+
+        # faster-whisper - segments are a lazy generator, so consume them
+        # here rather than on the event loop
+        segments_gen, info = self.model.transcribe(
+            audio,
+            language=language,
+            task=config.task,
+            initial_prompt=initial_prompt,
+            word_timestamps=config.word_timestamps,
+            vad_filter=config.vad_filter,
+        )
+        segments = list(segments_gen)
+        return segments, " ".join(seg.text for seg in segments), info.language, voice_features
+
+    def _extract_voice_features(self, audio: np.ndarray, frame_rate: int) -> dict[str, float]:
         """
         Extract voice features for emotion analysis.
 
-        Features extracted:
+        Features extracted (see voice_prosody):
         - energy: Overall loudness/intensity
-        - pitch_mean: Average pitch
-        - pitch_var: Pitch variation (expressiveness)
-        - speech_rate: Words per second estimate
+        - pitch_mean / pitch_hz: Average pitch of voiced frames (YIN)
+        - pitch_var / pitch_std_hz: Pitch variation (expressiveness)
+        - speech_rate: Words per second estimate (from syllable nuclei)
         - pause_ratio: Ratio of silence to speech
         """
         try:
-            import numpy as np
-
-            # Parse WAV data
-            with io.BytesIO(audio_data) as f:
-                with wave.open(f, 'rb') as wav:
-                    n_channels = wav.getnchannels()
-                    sample_width = wav.getsampwidth()
-                    frame_rate = wav.getframerate()
-                    n_frames = wav.getnframes()
-                    raw_data = wav.readframes(n_frames)
-
-            # Convert to numpy array
-            if sample_width == 2:  # 16-bit
-                audio = np.frombuffer(raw_data, dtype=np.int16).astype(np.float32)
-                audio = audio / 32768.0  # Normalize
-            else:
-                audio = np.frombuffer(raw_data, dtype=np.float32)
-
-            # If stereo, convert to mono
-            if n_channels == 2:
-                audio = audio.reshape(-1, 2).mean(axis=1)
-
-            # Calculate features
-            # Energy (RMS)
-            energy = np.sqrt(np.mean(audio ** 2))
-
-            # Zero-crossing rate (proxy for pitch characteristics)
-            zero_crossings = np.sum(np.abs(np.diff(np.signbit(audio))))
-            zcr = zero_crossings / len(audio)
-
-            # Pitch estimation using autocorrelation
-            pitch_mean, pitch_var = self._estimate_pitch(audio, frame_rate)
-
-            # Voice activity (non-silence ratio)
-            threshold = 0.01
-            voice_frames = np.sum(np.abs(audio) > threshold)
-            voice_ratio = voice_frames / len(audio)
-
-            return {
-                "energy": float(min(energy * 10, 1.0)),  # Scale to 0-1
-                "pitch_mean": float(pitch_mean),
-                "pitch_var": float(pitch_var),
-                "zero_crossing_rate": float(zcr * 100),
-                "voice_activity_ratio": float(voice_ratio),
-                "duration": float(len(audio) / frame_rate)
-            }
-
+            return whisper_voice_features(extract_prosody(audio, frame_rate))
         except Exception as e:
             logger.warning(f"Voice feature extraction failed: {e}")
             return {
@@ -452,52 +687,7 @@ class WhisperService:
                 "voice_activity_ratio": 0.5
             }
 
-    def _estimate_pitch(
-        self,
-        audio: Any,
-        sample_rate: int
-    ) -> Tuple[float, float]:
-        """Estimate pitch using simple autocorrelation"""
-        try:
-            import numpy as np
-
-            # Use a window of audio
-            window_size = min(len(audio), sample_rate)  # 1 second max
-            audio_window = audio[:window_size]
-
-            # Autocorrelation
-            correlation = np.correlate(audio_window, audio_window, mode='full')
-            correlation = correlation[len(correlation)//2:]
-
-            # Find peaks (pitch periods)
-            min_period = sample_rate // 500  # Max 500 Hz
-            max_period = sample_rate // 50   # Min 50 Hz
-
-            if max_period > len(correlation):
-                return 0.5, 0.5
-
-            # Find the first significant peak
-            search_region = correlation[min_period:max_period]
-            if len(search_region) == 0:
-                return 0.5, 0.5
-
-            peak_idx = np.argmax(search_region) + min_period
-            pitch_hz = sample_rate / peak_idx if peak_idx > 0 else 150
-
-            # Normalize pitch (typical speech 80-300 Hz)
-            pitch_normalized = (pitch_hz - 80) / (300 - 80)
-            pitch_normalized = max(0, min(1, pitch_normalized))
-
-            # Estimate variation by looking at multiple windows
-            # (simplified - just use standard deviation of energy)
-            pitch_var = float(np.std(np.abs(audio_window)))
-
-            return pitch_normalized, min(pitch_var * 10, 1.0)
-
-        except Exception:
-            return 0.5, 0.5
-
-    def _calculate_confidence(self, segments: List[Dict]) -> float:
+    def _calculate_confidence(self, segments: list[dict]) -> float:
         """Calculate overall transcription confidence"""
         if not segments:
             return 0.0
@@ -545,50 +735,341 @@ class WhisperService:
 # STREAMING TRANSCRIPTION
 # ============================================
 
+STREAMING_STEP_SECONDS = float(os.getenv("WHISPER_STREAMING_STEP_SECONDS", "1.0"))
+STREAMING_MAX_WINDOW_SECONDS = float(os.getenv("WHISPER_STREAMING_MAX_WINDOW_SECONDS", "15"))
+STREAMING_PAUSE_MS = int(os.getenv("WHISPER_STREAMING_PAUSE_MS", "600"))
+STREAMING_PRE_ROLL_SECONDS = 0.3
+
+
+class PcmRingBuffer:
+    """
+    Preallocated float32 ring buffer addressed by absolute sample index.
+
+    ``write`` copies each chunk once; the oldest audio is overwritten when
+    the buffer is full. ``read(start, end)`` returns a contiguous copy of
+    any range still held, i.e. ``end - capacity <= start``.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.end = 0  # absolute index one past the newest sample
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest sample still held"""
+        return max(0, self.end - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        if len(samples) > self.capacity:
+            self.end += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        pos = self.end % self.capacity
+        first = min(len(samples), self.capacity - pos)
+        self._data[pos:pos + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self.end += len(samples)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        start = max(start, self.start)
+        end = min(end, self.end)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        a, b = start % self.capacity, end % self.capacity
+        if a < b:
+            return self._data[a:b].copy()
+        return np.concatenate((self._data[a:], self._data[:b]))
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector with an adaptive noise floor.
+
+    Mirrors the WebRTC VAD's use as a segmenter: 30 ms frames, a short
+    run of voiced frames opens speech, and ``pause_ms`` of unvoiced frames
+    closes it. ``process`` returns ``("speech", sample)`` and
+    ``("pause", sample)`` events with absolute sample indices.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = WHISPER_SAMPLE_RATE,
+        frame_ms: int = 30,
+        pause_ms: int = STREAMING_PAUSE_MS,
+        onset_ms: int = 90,
+        threshold_ratio: float = 4.0,
+        min_rms: float = 0.01,
+    ):
+        self.frame = sample_rate * frame_ms // 1000
+        self.pause_frames = max(1, pause_ms // frame_ms)
+        self.onset_frames = max(1, onset_ms // frame_ms)
+        self.threshold_ratio = threshold_ratio
+        self.min_energy = min_rms ** 2
+        self.noise_floor = self.min_energy / threshold_ratio
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._position = 0  # absolute index of the first pending sample
+
+    def process(self, samples: np.ndarray) -> list[tuple[str, int]]:
+        audio = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        n_frames = len(audio) // self.frame
+        energies = (
+            np.mean(audio[: n_frames * self.frame].reshape(n_frames, self.frame) ** 2, axis=1)
+            if n_frames else ()
+        )
+        events: list[tuple[str, int]] = []
+        for i, energy in enumerate(energies):
+            frame_end = self._position + (i + 1) * self.frame
+            voiced = energy > max(self.min_energy, self.noise_floor * self.threshold_ratio)
+            if not voiced:
+                # Track background noise only outside speech
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+            if voiced:
+                self._voiced_run += 1
+                self._silent_run = 0
+                if not self.in_speech and self._voiced_run >= self.onset_frames:
+                    self.in_speech = True
+                    events.append(("speech", frame_end - self._voiced_run * self.frame))
+            else:
+                self._voiced_run = 0
+                self._silent_run += 1
+                if self.in_speech and self._silent_run >= self.pause_frames:
+                    self.in_speech = False
+                    events.append(("pause", frame_end - self._silent_run * self.frame))
+        consumed = n_frames * self.frame
+        self._pending = audio[consumed:].copy()
+        self._position += consumed
+        return events
+
+
+@dataclass
+class StreamingWord:
+    """A recognised word with absolute stream times in seconds"""
+    text: str
+    start: float
+    end: float
+
+    @property
+    def key(self) -> str:
+        return "".join(ch for ch in self.text.lower() if ch.isalnum())
+
+
+@dataclass
+class StreamingTranscript:
+    """One streaming update for the current utterance"""
+    committed: str  # stable - never revised
+    unstable: str  # latest hypothesis beyond the committed text
+    is_final: bool  # utterance closed by a pause or the end of the stream
+    stream_seconds: float  # audio position the update covers
+
+    @property
+    def text(self) -> str:
+        return f"{self.committed} {self.unstable}".strip()
+
+
 class StreamingWhisperService:
     """
     Real-time streaming transcription.
 
-    For live voice chat, processes audio chunks as they arrive.
+    Audio goes into a preallocated ring buffer. While the VAD reports
+    speech, the utterance so far is re-transcribed every ``step_seconds``
+    of new audio (overlapping windows). Words that two consecutive
+    hypotheses agree on are committed (local agreement), so partials
+    arrive about one step after speech and committed text never changes.
+    Windows longer than ``max_window_seconds`` restart at the end of the
+    committed text; repeated words in the overlap are dropped by time and
+    by matching the committed tail. A pause closes the utterance and
+    emits it as final.
     """
 
-    def __init__(self, model_size: str = "small"):
-        # Use smaller model for real-time
-        self.service = WhisperService(model_size)
-        self._buffer: bytes = b""
-        self._min_chunk_size = 16000 * 2 * 2  # ~2 seconds at 16kHz mono
+    def __init__(
+        self,
+        model_size: str = "small",
+        step_seconds: float = STREAMING_STEP_SECONDS,
+        max_window_seconds: float = STREAMING_MAX_WINDOW_SECONDS,
+        pause_ms: int = STREAMING_PAUSE_MS,
+        language: TranscriptionLanguage = TranscriptionLanguage.AUTO,
+    ):
+        # Use smaller model for real-time; the service (and its model) is
+        # shared by every streaming session
+        self.service = get_whisper_service(model_size)
+        self.sample_rate = WHISPER_SAMPLE_RATE
+        self.step = int(step_seconds * self.sample_rate)
+        self.max_window = int(max_window_seconds * self.sample_rate)
+        self.language = language
+        self._pause_ms = pause_ms
+        capacity = self.max_window + self.step + int(2 * STREAMING_PRE_ROLL_SECONDS * self.sample_rate)
+        self._ring = PcmRingBuffer(capacity)
+        self.reset()
+
+    def reset(self):
+        """Drop all audio and utterance state"""
+        self._ring.end = 0
+        self._vad = EnergyVAD(self.sample_rate, pause_ms=self._pause_ms)
+        self._active = False
+        self._window_start = 0
+        self._last_run = 0
+        self._committed: list[StreamingWord] = []
+        self._hypothesis: list[StreamingWord] = []
+
+    async def feed(self, samples: np.ndarray) -> list[StreamingTranscript]:
+        """Add 16 kHz mono float32 samples; return any new updates"""
+        samples = np.asarray(samples, dtype=np.float32)
+        self._ring.write(samples)
+        updates: list[StreamingTranscript] = []
+
+        for kind, position in self._vad.process(samples):
+            if kind == "speech" and not self._active:
+                self._active = True
+                pre_roll = int(STREAMING_PRE_ROLL_SECONDS * self.sample_rate)
+                self._window_start = max(self._ring.start, position - pre_roll)
+                self._last_run = self._window_start
+            elif kind == "pause" and self._active:
+                final = await self._finalize(position + self._vad.frame)
+                if final is not None:
+                    updates.append(final)
+
+        if self._active and self._ring.end - self._last_run >= self.step:
+            update = await self._run_window()
+            if update is not None:
+                updates.append(update)
+        return updates
+
+    async def flush(self) -> StreamingTranscript | None:
+        """End of stream: close the open utterance, if any"""
+        if not self._active:
+            return None
+        return await self._finalize(self._ring.end)
 
     async def process_chunk(
         self,
         audio_chunk: bytes,
         is_final: bool = False
-    ) -> Optional[TranscriptionResult]:
+    ) -> TranscriptionResult | None:
         """
-        Process an audio chunk.
+        Process a chunk of 16 kHz mono 16-bit PCM.
 
         Args:
             audio_chunk: Audio data chunk
             is_final: Whether this is the final chunk
 
         Returns:
-            TranscriptionResult if enough audio accumulated, else None
+            TranscriptionResult for the latest update (``is_partial`` set
+            for partials), or None when nothing new was recognised
         """
-        self._buffer += audio_chunk
-
-        # Check if we have enough audio
-        if len(self._buffer) >= self._min_chunk_size or is_final:
-            if len(self._buffer) < 1000:  # Too small to transcribe
-                return None
-
-            result = await self.service.transcribe(self._buffer)
-            self._buffer = b""  # Clear buffer
-            return result
+        samples = np.frombuffer(audio_chunk[: len(audio_chunk) // 2 * 2], dtype=np.int16)
+        updates = await self.feed(samples.astype(np.float32) / 32768.0)
+        if is_final:
+            final = await self.flush()
+            if final is not None:
+                updates.append(final)
+        if not updates:
+            return None
+        latest = updates[-1]
+        return TranscriptionResult(
+            text=latest.text,
+            language=self.language.value,
+            confidence=0.9 if latest.is_final else 0.6,
+            duration_seconds=latest.stream_seconds,
+            words=[],
+            segments=[],
+            voice_features={},
+            is_partial=not latest.is_final,
+        )
 
-        return None
+    # -- internals ------------------------------------------------------
+
+    async def _transcribe_window(self, end: int) -> list[StreamingWord] | None:
+        audio = self._ring.read(self._window_start, end)
+        if len(audio) < self.sample_rate // 10:
+            return []
+        committed_tail = " ".join(w.text for w in self._committed[-30:])
+        language = self.language.value if self.language != TranscriptionLanguage.AUTO else "en"
+        config = TranscriptionConfig(
+            language=self.language,
+            word_timestamps=True,
+            vad_filter=False,
+            initial_prompt=f"{self.service._get_initial_prompt(language)}. {committed_tail}".strip(),
+        )
+        try:
+            result = await self.service.transcribe_samples(audio, config)
+        except WhisperQueueFull:
+            return None
+        offset = self._window_start / self.sample_rate
+        words = [
+            StreamingWord(str(w.get("word", "")).strip(), offset + w.get("start", 0), offset + w.get("end", 0))
+            for w in result.words
+        ]
+        if not words and result.text:
+            # Backend without word timestamps - spread words over the window
+            tokens = result.text.split()
+            span = len(audio) / self.sample_rate / max(len(tokens), 1)
+            words = [
+                StreamingWord(t, offset + i * span, offset + (i + 1) * span)
+                for i, t in enumerate(tokens)
+            ]
+        return self._beyond_committed([w for w in words if w.key])
+
+    def _beyond_committed(self, words: list[StreamingWord]) -> list[StreamingWord]:
+        """Drop words the committed text already covers"""
+        if not self._committed:
+            return words
+        committed_end = self._committed[-1].end
+        words = [w for w in words if w.end > committed_end + 0.05]
+        # Timestamps drift between windows: also strip a leading run that
+        # repeats the committed tail
+        tail = [w.key for w in self._committed[-5:]]
+        for n in range(min(len(tail), len(words)), 0, -1):
+            if [w.key for w in words[:n]] == tail[-n:] and words[0].start < committed_end + 1.0:
+                return words[n:]
+        return words
+
+    def _update(self, is_final: bool) -> StreamingTranscript:
+        return StreamingTranscript(
+            committed=" ".join(w.text for w in self._committed),
+            unstable="" if is_final else " ".join(w.text for w in self._hypothesis),
+            is_final=is_final,
+            stream_seconds=self._ring.end / self.sample_rate,
+        )
 
-    def reset(self):
-        """Reset the buffer"""
-        self._buffer = b""
+    async def _run_window(self) -> StreamingTranscript | None:
+        end = self._ring.end
+        if end - self._window_start > self.max_window:
+            # Restart the window at the end of the committed text
+            if self._committed:
+                self._window_start = max(self._window_start, int(self._committed[-1].end * self.sample_rate))
+            self._window_start = max(self._window_start, end - self.max_window, self._ring.start)
+
+        words = await self._transcribe_window(end)
+        if words is None:
+            return None
+        self._last_run = end
+
+        # Local agreement: commit the prefix two consecutive hypotheses share
+        agreed = 0
+        for new, old in zip(words, self._hypothesis, strict=False):
+            if new.key != old.key:
+                break
+            agreed += 1
+        self._committed.extend(words[:agreed])
+        self._hypothesis = words[agreed:]
+        return self._update(is_final=False)
+
+    async def _finalize(self, end: int) -> StreamingTranscript | None:
+        words = await self._transcribe_window(end)
+        if words is None:
+            # Pool saturated - keep the last hypothesis rather than lose it
+            words = self._hypothesis
+        self._committed.extend(words)
+        final = self._update(is_final=True) if self._committed else None
+
+        self._active = False
+        self._window_start = self._last_run = end
+        self._committed = []
+        self._hypothesis = []
+        return final
 
 
 # ============================================
@@ -596,6 +1077,15 @@ class StreamingWhisperService:
 # ============================================
 
 whisper_service = WhisperService()
+_services_by_size: dict[str, WhisperService] = {whisper_service.model_size: whisper_service}
+
+
+def get_whisper_service(model_size: str) -> WhisperService:
+    """Shared WhisperService for a model size"""
+    service = _services_by_size.get(model_size)
+    if service is None:
+        service = _services_by_size.setdefault(model_size, WhisperService(model_size))
+    return service
 
 
 # ============================================
@@ -605,7 +1095,7 @@ whisper_service = WhisperService()
 async def transcribe_audio(
     audio_data: bytes,
     language: str = "auto"
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     """
     Quick function to transcribe audio.
 
@@ -638,7 +1128,7 @@ async def transcribe_audio(
     }
 
 
-async def transcribe_file(file_path: str, language: str = "auto") -> Dict[str, Any]:
+async def transcribe_file(file_path: str, language: str = "auto") -> dict[str, Any]:
     """Transcribe an audio file"""
     with open(file_path, "rb") as f:
         audio_data = f.read()
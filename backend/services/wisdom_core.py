@@ -62,14 +62,14 @@ Usage:
 
 from __future__ import annotations
 
-import difflib
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
-from sqlalchemy import func, or_, select
+import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import (
@@ -79,6 +79,17 @@ from backend.models import (
     ValidationStatus,
 )
 from backend.services.db_knowledge_store import DatabaseKnowledgeStore
+from backend.services.gita_corpus import (
+    VerseRecord,
+    get_db_gita_corpus,
+    invalidate_db_gita_corpus,
+)
+from backend.services.wisdom_features import (
+    LearnedFeatures,
+    deduplicate_texts,
+    get_gita_features,
+    stable_top,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -338,10 +349,9 @@ class WisdomCore:
 
     def __init__(self):
         """Initialize the Wisdom Core."""
-        self._gita_cache: Optional[list[GitaVerse]] = None
-        self._cache_timestamp: Optional[datetime] = None
-        self._cache_ttl_seconds = 300  # 5 minute cache
         self._db_store = DatabaseKnowledgeStore()
+        # Features of the last learned-wisdom batch, keyed by its rows' identity
+        self._learned_features: Optional[tuple[tuple, LearnedFeatures]] = None
 
     # =========================================================================
     # UNIFIED SEARCH
@@ -402,41 +412,49 @@ class WisdomCore:
         query_keywords: set[str],
         limit: int,
     ) -> list[WisdomResult]:
-        """Search the static Gita verse corpus."""
+        """Search the static Gita verse corpus.
+
+        Every verse is scored at once from the corpus' precomputed sparse
+        features; match reasons are only built for the returned verses.
+        """
         results = []
 
-        # Fetch verses (with caching)
-        verses = await self._get_cached_gita_verses(db)
+        corpus = await get_db_gita_corpus(db)
+        scores = get_gita_features(corpus).score(
+            query.lower(),
+            query_keywords,
+            self.CONTENT_MATCH_WEIGHT,
+            self.KEYWORD_MATCH_WEIGHT,
+            self.THEME_MATCH_WEIGHT,
+            self.DOMAIN_MATCH_WEIGHT,
+        )
 
-        for verse in verses:
+        for row in stable_top(scores, limit):
+            verse = corpus.verses[row]
             score, reasons = self._score_gita_verse(verse, query, query_keywords)
+            result = WisdomResult(
+                id=f"gita_{verse.chapter}_{verse.verse}",
+                content=verse.english,
+                source=WisdomSource.GITA_VERSE,
+                score=score,
+                match_reasons=reasons,
+                chapter=verse.chapter,
+                verse=verse.verse,
+                verse_ref=f"{verse.chapter}.{verse.verse}",
+                sanskrit=verse.sanskrit,
+                hindi=verse.hindi,
+                transliteration=verse.transliteration,
+                theme=verse.theme,
+                principle=verse.principle,
+                primary_domain=verse.primary_domain,
+                secondary_domains=list(verse.secondary_domains or []),
+                mental_health_applications=list(verse.mental_health_applications or []),
+                source_name="Bhagavad Gita",
+                quality_score=1.0,  # Static verses are highest quality
+            )
+            results.append(result)
 
-            if score > 0:
-                result = WisdomResult(
-                    id=f"gita_{verse.chapter}_{verse.verse}",
-                    content=verse.english,
-                    source=WisdomSource.GITA_VERSE,
-                    score=score,
-                    match_reasons=reasons,
-                    chapter=verse.chapter,
-                    verse=verse.verse,
-                    verse_ref=f"{verse.chapter}.{verse.verse}",
-                    sanskrit=verse.sanskrit,
-                    hindi=verse.hindi,
-                    transliteration=verse.transliteration,
-                    theme=verse.theme,
-                    principle=verse.principle,
-                    primary_domain=verse.primary_domain,
-                    secondary_domains=verse.secondary_domains or [],
-                    mental_health_applications=verse.mental_health_applications or [],
-                    source_name="Bhagavad Gita",
-                    quality_score=1.0,  # Static verses are highest quality
-                )
-                results.append(result)
-
-        # Sort and limit
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:limit]
+        return results
 
     async def _search_learned_wisdom(
         self,
@@ -464,7 +482,18 @@ class WisdomCore:
         result = await db.execute(base_query)
         learned_items = result.scalars().all()
 
-        for item in learned_items:
+        scores = self._get_learned_features(learned_items).score(
+            query.lower(),
+            query_keywords,
+            self.CONTENT_MATCH_WEIGHT,
+            self.KEYWORD_MATCH_WEIGHT,
+            self.THEME_MATCH_WEIGHT,
+            self.DOMAIN_MATCH_WEIGHT,
+            self.QUALITY_WEIGHT,
+        )
+
+        for row in stable_top(scores, limit):
+            item = learned_items[row]
             score, reasons = self._score_learned_wisdom(item, query, query_keywords)
 
             if score > 0:
@@ -496,11 +525,10 @@ class WisdomCore:
                 )
                 results.append(result_item)
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:limit]
+        return results
 
     def _score_gita_verse(
-        self, verse: GitaVerse, query: str, query_keywords: set[str]
+        self, verse: VerseRecord, query: str, query_keywords: set[str]
     ) -> tuple[float, list[str]]:
         """Score a Gita verse for relevance to query."""
         score = 0.0
@@ -609,23 +637,13 @@ class WisdomCore:
     def _deduplicate_results(
         self, results: list[WisdomResult], similarity_threshold: float = 0.85
     ) -> list[WisdomResult]:
-        """Remove duplicate or highly similar results."""
-        unique = []
-
-        for result in results:
-            is_duplicate = False
-            for existing in unique:
-                similarity = difflib.SequenceMatcher(
-                    None, result.content[:200].lower(), existing.content[:200].lower()
-                ).ratio()
-                if similarity > similarity_threshold:
-                    is_duplicate = True
-                    break
+        """Remove duplicate or highly similar results.
 
-            if not is_duplicate:
-                unique.append(result)
-
-        return unique
+        MinHash signatures pick the candidate pairs; each candidate is then
+        compared with SequenceMatcher as before.
+        """
+        texts = [result.content[:200].lower() for result in results]
+        return [results[i] for i in deduplicate_texts(texts, similarity_threshold)]
 
     # =========================================================================
     # THEME-BASED RETRIEVAL
@@ -653,15 +671,12 @@ class WisdomCore:
         results = []
         theme_lower = theme.lower()
 
-        # 1. Search Gita verses by theme
-        gita_query = select(GitaVerse).where(
-            func.lower(GitaVerse.theme).contains(theme_lower)
-        ).limit(limit)
-
-        gita_result = await db.execute(gita_query)
-        gita_verses = gita_result.scalars().all()
+        # 1. Search Gita verses by theme (bitmap over the shared corpus)
+        corpus = await get_db_gita_corpus(db)
+        theme_rows = get_gita_features(corpus).theme_rows(theme_lower)
 
-        for verse in gita_verses:
+        for row in np.flatnonzero(theme_rows)[:limit]:
+            verse = corpus.verses[row]
             results.append(
                 WisdomResult(
                     id=f"gita_{verse.chapter}_{verse.verse}",
@@ -732,57 +747,42 @@ class WisdomCore:
         # Get related themes for this enemy
         related_themes = SHAD_RIPU_THEMES.get(enemy_lower, [])
 
-        # 1. Search Gita verses by related themes
-        verses = await self._get_cached_gita_verses(db)
+        # 1. Search Gita verses by related themes (cached per enemy). Only
+        # the best `limit` verses can make the final cut.
+        corpus = await get_db_gita_corpus(db)
+        scores, theme_hit, principle_hit, content_hit = get_gita_features(corpus).enemy_scores(
+            tuple(related_themes)
+        )
 
-        for verse in verses:
-            score = 0.0
+        for row in stable_top(scores, limit):
+            verse = corpus.verses[row]
             reasons = []
-
-            # Check theme match
-            if verse.theme:
-                verse_theme = verse.theme.lower().replace("_", " ")
-                for theme in related_themes:
-                    if theme in verse_theme:
-                        score += 3.0
-                        reasons.append(f"theme:{verse.theme}")
-                        break
-
-            # Check principle match
-            if verse.principle:
-                principle_lower = verse.principle.lower()
-                for theme in related_themes:
-                    if theme in principle_lower:
-                        score += 2.0
-                        reasons.append(f"principle:{verse.principle}")
-                        break
-
-            # Check content match
-            english_lower = verse.english.lower()
-            for theme in related_themes[:5]:  # Check top 5 themes
-                if theme in english_lower:
-                    score += 1.0
+            if theme_hit[row]:
+                reasons.append(f"theme:{verse.theme}")
+            if principle_hit[row]:
+                reasons.append(f"principle:{verse.principle}")
+            for i, theme in enumerate(related_themes[:5]):
+                if content_hit[i, row]:
                     reasons.append(f"content_theme:{theme}")
 
-            if score > 0:
-                results.append(
-                    WisdomResult(
-                        id=f"gita_{verse.chapter}_{verse.verse}",
-                        content=verse.english,
-                        source=WisdomSource.GITA_VERSE,
-                        score=score,
-                        match_reasons=reasons,
-                        chapter=verse.chapter,
-                        verse=verse.verse,
-                        verse_ref=f"{verse.chapter}.{verse.verse}",
-                        sanskrit=verse.sanskrit,
-                        hindi=verse.hindi,
-                        theme=verse.theme,
-                        shad_ripu_tags=[enemy_lower],
-                        source_name="Bhagavad Gita",
-                        quality_score=1.0,
-                    )
+            results.append(
+                WisdomResult(
+                    id=f"gita_{verse.chapter}_{verse.verse}",
+                    content=verse.english,
+                    source=WisdomSource.GITA_VERSE,
+                    score=float(scores[row]),
+                    match_reasons=reasons,
+                    chapter=verse.chapter,
+                    verse=verse.verse,
+                    verse_ref=f"{verse.chapter}.{verse.verse}",
+                    sanskrit=verse.sanskrit,
+                    hindi=verse.hindi,
+                    theme=verse.theme,
+                    shad_ripu_tags=[enemy_lower],
+                    source_name="Bhagavad Gita",
+                    quality_score=1.0,
                 )
+            )
 
         # 2. Search learned wisdom by shad ripu tag
         if include_learned:
@@ -836,18 +836,13 @@ class WisdomCore:
         # Get related themes for this domain
         related_themes = DOMAIN_THEMES.get(domain_lower, [])
 
-        # 1. Search Gita verses by domain
-        gita_query = select(GitaVerse).where(
-            or_(
-                GitaVerse.primary_domain == domain_lower,
-                GitaVerse.secondary_domains.contains([domain_lower]),
-            )
-        ).limit(limit)
-
-        gita_result = await db.execute(gita_query)
-        domain_verses = gita_result.scalars().all()
+        # 1. Search Gita verses by domain (bitmap over the shared corpus)
+        corpus = await get_db_gita_corpus(db)
+        features = get_gita_features(corpus)
+        domain_rows = np.flatnonzero(features.domain_rows(domain_lower))[:limit]
 
-        for verse in domain_verses:
+        for row in domain_rows:
+            verse = corpus.verses[row]
             results.append(
                 WisdomResult(
                     id=f"gita_{verse.chapter}_{verse.verse}",
@@ -869,32 +864,28 @@ class WisdomCore:
 
         # Also search by related themes if we don't have enough results
         if len(results) < limit and related_themes:
-            verses = await self._get_cached_gita_verses(db)
-            for verse in verses:
-                if f"gita_{verse.chapter}_{verse.verse}" in [r.id for r in results]:
+            first_match = features.first_theme_match(tuple(related_themes))
+            included = set(domain_rows.tolist())
+            for row in np.flatnonzero(first_match >= 0):
+                if row in included:
                     continue
-
-                if verse.theme:
-                    theme_lower = verse.theme.lower().replace("_", " ")
-                    for theme in related_themes:
-                        if theme in theme_lower:
-                            results.append(
-                                WisdomResult(
-                                    id=f"gita_{verse.chapter}_{verse.verse}",
-                                    content=verse.english,
-                                    source=WisdomSource.GITA_VERSE,
-                                    score=3.0,
-                                    match_reasons=[f"domain_theme:{theme}"],
-                                    chapter=verse.chapter,
-                                    verse=verse.verse,
-                                    verse_ref=f"{verse.chapter}.{verse.verse}",
-                                    theme=verse.theme,
-                                    source_name="Bhagavad Gita",
-                                    quality_score=1.0,
-                                )
-                            )
-                            break
-
+                verse = corpus.verses[row]
+                theme = related_themes[first_match[row]]
+                results.append(
+                    WisdomResult(
+                        id=f"gita_{verse.chapter}_{verse.verse}",
+                        content=verse.english,
+                        source=WisdomSource.GITA_VERSE,
+                        score=3.0,
+                        match_reasons=[f"domain_theme:{theme}"],
+                        chapter=verse.chapter,
+                        verse=verse.verse,
+                        verse_ref=f"{verse.chapter}.{verse.verse}",
+                        theme=verse.theme,
+                        source_name="Bhagavad Gita",
+                        quality_score=1.0,
+                    )
+                )
                 if len(results) >= limit * 2:
                     break
 
@@ -1043,31 +1034,18 @@ class WisdomCore:
     # CACHING
     # =========================================================================
 
-    async def _get_cached_gita_verses(self, db: AsyncSession) -> list[GitaVerse]:
-        """Get Gita verses with caching."""
-        now = datetime.utcnow()
-
-        # Check if cache is valid
-        if (
-            self._gita_cache is not None
-            and self._cache_timestamp is not None
-            and (now - self._cache_timestamp).total_seconds() < self._cache_ttl_seconds
-        ):
-            return self._gita_cache
-
-        # Fetch from database
-        result = await db.execute(select(GitaVerse))
-        self._gita_cache = list(result.scalars().all())
-        self._cache_timestamp = now
-
-        logger.debug(f"Cached {len(self._gita_cache)} Gita verses")
-        return self._gita_cache
+    def _get_learned_features(self, items: Sequence[LearnedWisdom]) -> LearnedFeatures:
+        """Features for a learned-wisdom batch, reused while the same rows come back."""
+        key = tuple(
+            (item.id, item.content_hash, item.updated_at, item.quality_score) for item in items
+        )
+        if self._learned_features is None or self._learned_features[0] != key:
+            self._learned_features = (key, LearnedFeatures(items))
+        return self._learned_features[1]
 
     def clear_cache(self):
         """Clear the verse cache."""
-        self._gita_cache = None
-        self._cache_timestamp = None
-
+        invalidate_db_gita_corpus()
 
 # =============================================================================
 # SINGLETON INSTANCE
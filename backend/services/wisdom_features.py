@@ -0,0 +1,308 @@
+"""Precomputed sparse features for WisdomCore retrieval.
+
+WisdomCore scores by substring containment ("keyword in english_lower",
+"keyword in theme_lower", ...). Scanning every verse and lowercasing every
+field per query made search cost grow with the corpus. This module keeps,
+per field, a sparse rows x terms incidence matrix over the distinct terms of
+that field (whitespace tokens for free text, whole values for themes,
+domains and tags). A query keyword is matched against the much smaller term
+vocabulary once (and memoized), and per-row hits come from a sparse
+matrix-vector product (``np.bincount`` over the non-zeros).
+
+The results are exact: a keyword without whitespace is a substring of a text
+if and only if it is a substring of one of the text's whitespace tokens.
+Phrases with whitespace are narrowed with their pieces and then confirmed
+with ``in`` on the few candidate rows.
+
+Near-duplicate removal uses MinHash signatures over character 3-shingles to
+find candidate pairs; each candidate is confirmed with the same
+``difflib.SequenceMatcher`` ratio WisdomCore used before, so only the
+pairwise comparisons of clearly different texts are skipped.
+"""
+
+from __future__ import annotations
+
+import difflib
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from backend.services.gita_corpus import GitaCorpus
+
+# Candidate pairs need this MinHash-estimated 3-shingle Jaccard similarity.
+# Texts with a SequenceMatcher ratio above 0.85 measure 0.34 or more.
+MINHASH_CANDIDATE_JACCARD = 0.2
+MINHASH_PERMUTATIONS = 128
+
+_TERM_CACHE_SIZE = 4096
+_BITMAP_CACHE_SIZE = 1024
+_rng = np.random.default_rng(0x5EED)
+_MINHASH_A = _rng.integers(1, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _rng.integers(0, 2**63, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+class TermPostings:
+    """Sparse rows x terms incidence matrix for one field.
+
+    ``row_terms`` gives the terms of each row; repeated terms in a row are
+    kept, so ``counts`` counts them the way a per-item loop would.
+    """
+
+    def __init__(self, row_terms: Iterable[Iterable[str]]) -> None:
+        vocab: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        n_rows = 0
+        for row, terms in enumerate(row_terms):
+            n_rows = row + 1
+            for term in terms:
+                rows.append(row)
+                cols.append(vocab.setdefault(term, len(vocab)))
+        self.terms: tuple[str, ...] = tuple(vocab)
+        self.n_rows = n_rows
+        self._rows = np.asarray(rows, dtype=np.int32)
+        self._cols = np.asarray(cols, dtype=np.int32)
+        self._contains: dict[str, np.ndarray] = {}
+
+    def term_mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Boolean mask over the vocabulary of terms satisfying ``predicate``."""
+        return np.fromiter((predicate(t) for t in self.terms), dtype=bool, count=len(self.terms))
+
+    def containing(self, keyword: str) -> np.ndarray:
+        """Mask of terms that contain ``keyword`` (memoized per keyword)."""
+        mask = self._contains.get(keyword)
+        if mask is None:
+            if len(self._contains) >= _TERM_CACHE_SIZE:
+                self._contains.clear()
+            mask = self._contains[keyword] = self.term_mask(lambda term: keyword in term)
+        return mask
+
+    def counts(self, term_mask: np.ndarray) -> np.ndarray:
+        """Per-row number of term occurrences selected by ``term_mask``."""
+        if not len(self._rows):
+            return np.zeros(self.n_rows)
+        return np.bincount(self._rows, weights=term_mask[self._cols], minlength=self.n_rows)
+
+    def rows(self, term_mask: np.ndarray) -> np.ndarray:
+        """Per-row bitmap: does the row have any selected term."""
+        return self.counts(term_mask) > 0
+
+
+class TextIndex:
+    """Exact substring lookup over a column of lowercase texts."""
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        self.texts = texts
+        self.postings = TermPostings(dict.fromkeys(text.split()) for text in texts)
+
+    def rows_containing(self, phrase: str) -> np.ndarray:
+        """Bitmap of rows whose text contains ``phrase``."""
+        pieces = phrase.split()
+        if len(pieces) == 1 and pieces[0] == phrase:
+            return self.postings.rows(self.postings.containing(phrase))
+        if not pieces:
+            return np.fromiter((phrase in text for text in self.texts), dtype=bool, count=len(self.texts))
+        candidates = np.ones(len(self.texts), dtype=bool)
+        for piece in pieces:
+            candidates &= self.postings.rows(self.postings.containing(piece))
+        for row in np.flatnonzero(candidates):
+            candidates[row] = phrase in self.texts[row]
+        return candidates
+
+
+def _value_postings(values: Iterable[Any]) -> TermPostings:
+    """Postings for a single-valued field; empty values have no term."""
+    return TermPostings((value,) if value else () for value in values)
+
+
+def _any_keyword(postings: TermPostings, keywords: Iterable[str]) -> np.ndarray:
+    mask = np.zeros(len(postings.terms), dtype=bool)
+    for keyword in keywords:
+        mask |= postings.containing(keyword)
+    return mask
+
+
+def stable_top(scores: np.ndarray, limit: int) -> list[int]:
+    """Indices of the ``limit`` best positive scores, ties in row order."""
+    positive = np.flatnonzero(scores > 0)
+    order = positive[np.argsort(-scores[positive], kind="stable")]
+    return order[:limit].tolist()
+
+
+class GitaFeatures:
+    """Sparse features and lookup bitmaps for one GitaCorpus."""
+
+    def __init__(self, corpus: GitaCorpus) -> None:
+        self.corpus = corpus
+        self.english = TextIndex(corpus.english)
+        self.theme = _value_postings(corpus.theme_text)
+        self.theme_raw = _value_postings(corpus.theme)
+        self.principle = _value_postings(corpus.principle)
+        self.domain = _value_postings(corpus.domain)
+        self.applications = TermPostings(corpus.applications)
+        self.primary_domain = _value_postings(v.get("primary_domain") for v in corpus.verses)
+        self.secondary_domains = TermPostings(v.get("secondary_domains") or () for v in corpus.verses)
+        self._bitmaps: dict[tuple, Any] = {}
+
+    def _bitmap(self, key: tuple, build: Callable[[], Any]) -> Any:
+        value = self._bitmaps.get(key)
+        if value is None:
+            if len(self._bitmaps) >= _BITMAP_CACHE_SIZE:
+                self._bitmaps.clear()
+            value = self._bitmaps[key] = build()
+        return value
+
+    def score(
+        self,
+        query_lower: str,
+        query_keywords: set[str],
+        content_weight: float,
+        keyword_weight: float,
+        theme_weight: float,
+        domain_weight: float,
+    ) -> np.ndarray:
+        """Vectorized WisdomCore._score_gita_verse for every verse."""
+        content = self.english.rows_containing(query_lower)
+        scores = np.where(content, content_weight, 0.0)
+        if query_keywords:
+            keyword_hits = np.zeros(len(self.corpus))
+            for keyword in query_keywords:
+                keyword_hits += self.english.rows_containing(keyword)
+            scores += np.where(content, 0.0, keyword_hits * (keyword_weight * 0.5))
+            scores += self.theme.rows(_any_keyword(self.theme, query_keywords)) * theme_weight
+            scores += self.principle.rows(_any_keyword(self.principle, query_keywords)) * keyword_weight
+            scores += self.domain.rows(_any_keyword(self.domain, query_keywords)) * domain_weight
+            apps = self.applications
+            scores += apps.counts(_any_keyword(apps, query_keywords)) * (domain_weight * 0.5)
+        return scores
+
+    def theme_rows(self, theme_lower: str) -> np.ndarray:
+        """Bitmap of verses whose lowercase theme contains ``theme_lower``."""
+        return self._bitmap(
+            ("theme", theme_lower), lambda: self.theme_raw.rows(self.theme_raw.containing(theme_lower))
+        )
+
+    def domain_rows(self, domain: str) -> np.ndarray:
+        """Bitmap of verses with ``domain`` as primary or secondary domain."""
+        def build() -> np.ndarray:
+            primary = self.primary_domain.rows(self.primary_domain.term_mask(lambda t: t == domain))
+            secondary = self.secondary_domains.rows(self.secondary_domains.term_mask(lambda t: t == domain))
+            return primary | secondary
+
+        return self._bitmap(("domain", domain), build)
+
+    def first_theme_match(self, themes: tuple[str, ...]) -> np.ndarray:
+        """Per verse, the index of the first of ``themes`` its theme contains, or -1."""
+        def build() -> np.ndarray:
+            first = np.full(len(self.corpus), -1, dtype=np.int16)
+            for i, theme in reversed(list(enumerate(themes))):
+                first[self.theme.rows(self.theme.containing(theme))] = i
+            return first
+
+        return self._bitmap(("first_theme", themes), build)
+
+    def enemy_scores(self, themes: tuple[str, ...]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """WisdomCore.get_for_enemy scores: (scores, theme hit, principle hit, content hits per theme)."""
+        def build() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            theme_hit = self.theme.rows(_any_keyword(self.theme, themes))
+            principle_hit = self.principle.rows(_any_keyword(self.principle, themes))
+            content = np.zeros((len(themes[:5]), len(self.corpus)), dtype=bool)
+            for i, theme in enumerate(themes[:5]):
+                content[i] = self.english.rows_containing(theme)
+            scores = theme_hit * 3.0 + principle_hit * 2.0 + content.sum(axis=0)
+            return scores, theme_hit, principle_hit, content
+
+        return self._bitmap(("enemy", themes), build)
+
+
+class LearnedFeatures:
+    """Sparse features for a batch of learned wisdom rows."""
+
+    def __init__(self, items: Sequence[Any]) -> None:
+        self.size = len(items)
+        self.content = TextIndex(tuple(item.content.lower() for item in items))
+        self.themes = TermPostings([t.lower() for t in (item.themes or [])] for item in items)
+        self.keywords = TermPostings([k.lower() for k in (item.keywords or [])] for item in items)
+        self.shad_ripu = TermPostings([t.lower() for t in (item.shad_ripu_tags or [])] for item in items)
+        self.quality = np.fromiter((float(item.quality_score) for item in items), dtype=float, count=self.size)
+
+    def score(
+        self,
+        query_lower: str,
+        query_keywords: set[str],
+        content_weight: float,
+        keyword_weight: float,
+        theme_weight: float,
+        domain_weight: float,
+        quality_weight: float,
+    ) -> np.ndarray:
+        """Vectorized WisdomCore._score_learned_wisdom for every row."""
+        content = self.content.rows_containing(query_lower)
+        scores = np.where(content, content_weight, 0.0)
+        if query_keywords:
+            keyword_hits = np.zeros(self.size)
+            for keyword in query_keywords:
+                keyword_hits += self.content.rows_containing(keyword)
+            scores += np.where(content, 0.0, keyword_hits * (keyword_weight * 0.5))
+            scores += self.themes.counts(_any_keyword(self.themes, query_keywords)) * theme_weight
+            keyword_mask = self.keywords.term_mask(
+                lambda term: any(q in term or term in q for q in query_keywords)
+            )
+            scores += self.keywords.counts(keyword_mask) * keyword_weight
+        tags = self.shad_ripu.term_mask(lambda tag: tag in query_lower)
+        scores += self.shad_ripu.counts(tags) * domain_weight
+        return scores + self.quality * quality_weight
+
+
+_gita_features: GitaFeatures | None = None
+
+
+def get_gita_features(corpus: GitaCorpus) -> GitaFeatures:
+    """Features for ``corpus``, rebuilt only when the corpus object changes."""
+    global _gita_features
+    features = _gita_features
+    if features is None or features.corpus is not corpus:
+        features = _gita_features = GitaFeatures(corpus)
+    return features
+
+
+@lru_cache(maxsize=4096)
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature of the character 3-shingles of ``text``."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < 3:
+        codes = np.concatenate([codes, np.zeros(3 - len(codes), dtype=np.uint64)])
+    shingles = np.unique((codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:])
+    hashed = (_MINHASH_A[:, None] * shingles[None, :] + _MINHASH_B[:, None]) >> np.uint64(32)
+    signature = hashed.min(axis=1)
+    signature.flags.writeable = False
+    return signature
+
+
+def deduplicate_texts(texts: Sequence[str], similarity_threshold: float) -> list[int]:
+    """Indices of texts kept after dropping near-duplicates of earlier kept texts.
+
+    A text is a duplicate when its SequenceMatcher ratio with an earlier kept
+    text exceeds ``similarity_threshold``; only MinHash candidate pairs are
+    compared, and the cheap quick_ratio upper bounds are checked first.
+    """
+    if len(texts) < 2:
+        return list(range(len(texts)))
+    signatures = np.stack([minhash_signature(text) for text in texts])
+    similar = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2) >= MINHASH_CANDIDATE_JACCARD
+
+    def duplicate(a: str, b: str) -> bool:
+        matcher = difflib.SequenceMatcher(None, a, b)
+        return (
+            matcher.real_quick_ratio() > similarity_threshold
+            and matcher.quick_ratio() > similarity_threshold
+            and matcher.ratio() > similarity_threshold
+        )
+
+    kept: list[int] = []
+    for i, text in enumerate(texts):
+        if not any(similar[i, j] and duplicate(text, texts[j]) for j in kept):
+            kept.append(i)
+    return kept
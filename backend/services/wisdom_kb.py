@@ -12,6 +12,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import WisdomVerse
+from backend.services.gita_corpus import (
+    GitaCorpus,
+    get_db_gita_corpus,
+    invalidate_db_gita_corpus,
+)
 from backend.services.gita_service import GitaService
 
 
@@ -45,6 +50,8 @@ class WisdomKnowledgeBase:
         WisdomKnowledgeBase._initialized = True
 
         self._verse_cache: list[dict[str, Any]] | None = None
+        # Epoch of the shared corpus the cache was built from (None: set directly)
+        self._corpus_epoch: int | None = None
         self._gita_service = GitaService()
         # Pre-built keyword index for O(1) verse lookup (built on first cache load)
         self._keyword_index: dict[str, set[int]] | None = None
@@ -167,7 +174,10 @@ class WisdomKnowledgeBase:
         """
         Get all 700+ verses from the GitaService database.
 
-        Uses caching to avoid repeated database queries.
+        Reads the shared database corpus (gita_corpus), so the table is
+        fetched once per process and TTL rather than once per service. The
+        wisdom-format list and keyword indices are rebuilt only when the
+        corpus epoch changes.
 
         Args:
             db: Database session
@@ -175,23 +185,25 @@ class WisdomKnowledgeBase:
         Returns:
             List of verse dictionaries in wisdom format
         """
-        if self._verse_cache:
+        if self._verse_cache and self._corpus_epoch is None:
             return self._verse_cache
 
-        # Fetch all verses from GitaService
-        gita_verses = await GitaService.get_all_verses_with_tags(db)
+        corpus = await get_db_gita_corpus(db)
+        if self._verse_cache and self._corpus_epoch == corpus.epoch:
+            return self._verse_cache
 
         # Convert to wisdom verse format
         wisdom_verses = [
-            GitaService.convert_to_wisdom_verse_format(gv) for gv in gita_verses
+            GitaService.convert_to_wisdom_verse_format(gv) for gv in corpus.verses
         ]
 
         # Cache the results and build keyword index for fast lookup
         self._verse_cache = wisdom_verses
-        self._build_keyword_index()
+        self._corpus_epoch = corpus.epoch if wisdom_verses else None
+        self._build_keyword_index(corpus)
         return wisdom_verses
 
-    def _build_keyword_index(self) -> None:
+    def _build_keyword_index(self, corpus: GitaCorpus | None = None) -> None:
         """Build in-memory keyword indices from cached verses for O(1) lookup.
 
         This replaces the O(n) per-query scan of 700+ verses with pre-built
@@ -200,6 +212,8 @@ class WisdomKnowledgeBase:
 
         Called once after first verse cache load. Subsequent queries use
         the index directly (~1ms vs ~100-300ms for full scan + scoring).
+        When the cache was built from ``corpus``, its precomputed English
+        tokens are reused.
         """
         if not self._verse_cache:
             return
@@ -208,6 +222,7 @@ class WisdomKnowledgeBase:
         self._keyword_index = defaultdict(set)
         self._theme_index = defaultdict(list)
         self._app_index = defaultdict(list)
+        english_tokens = corpus.english_tokens if corpus is not None else None
 
         for idx, verse in enumerate(self._verse_cache):
             # Index by theme
@@ -221,7 +236,7 @@ class WisdomKnowledgeBase:
 
             # Index by mental health applications
             mh_apps = verse.get("mental_health_applications", [])
-            if isinstance(mh_apps, list):
+            if isinstance(mh_apps, (list, tuple)):
                 for app in mh_apps:
                     app_lower = app.lower().strip()
                     self._app_index[app_lower].append(idx)
@@ -231,15 +246,20 @@ class WisdomKnowledgeBase:
 
             # Index by keywords in english, principle
             for field in ["english", "principle"]:
-                text = verse.get(field, "").lower()
-                for word in text.split():
-                    cleaned = word.strip(".,;:!?()[]\"'")
+                if field == "english" and english_tokens is not None:
+                    words = english_tokens[idx]
+                else:
+                    text = verse.get(field, "").lower()
+                    words = [word.strip(".,;:!?()[]\"'") for word in text.split()]
+                for cleaned in words:
                     if len(cleaned) > 3:
                         self._keyword_index[cleaned].add(idx)
 
     def clear_cache(self) -> None:
         """Clear the verse cache to force a fresh database fetch."""
+        invalidate_db_gita_corpus()
         self._verse_cache = None
+        self._corpus_epoch = None
         self._keyword_index = None
         self._theme_index = None
         self._app_index = None
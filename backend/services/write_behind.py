@@ -0,0 +1,492 @@
+"""Crash-safe write-behind log for buffered telemetry.
+
+In-memory write-behind buffers (the wisdom delivery buffer, the verse
+graph's edge buffer) lose everything queued when a worker is killed
+between flushes, and have to drop records once the database falls far
+enough behind. WriteBehindLog keeps the queue on local disk instead:
+
+- append() writes one JSON line to the active segment file with a single
+  unbuffered os.write, so a record survives the process being killed as
+  soon as append() returns. Segments are fsynced when they are sealed
+  (WRITE_BEHIND_FSYNC), which also covers a host crash for sealed data.
+- A segment is sealed once it holds WRITE_BEHIND_SEGMENT_RECORDS records
+  (or at the next flush) and is written with one multi-row insert in one
+  transaction, then deleted. Deleting a segment is its ack.
+- Every process writes under its own owner directory, holding an flock on
+  the owner's lock file for as long as it lives. When a worker dies the
+  kernel releases its lock, and the next log that scans the directory
+  (at start and every WRITE_BEHIND_ADOPT_SECONDS) adopts and replays the
+  dead owner's segments.
+
+Delivery is at-least-once: a worker killed after a segment's transaction
+commits but before the segment is deleted replays that segment once.
+Torn trailing lines (killed mid-append) are skipped and counted.
+
+A segment that cannot be written is retried on later flushes, and the
+segments behind it wait. If its rows are rejected (IntegrityError /
+DataError), or it fails WRITE_BEHIND_MAX_ATTEMPTS times for another reason,
+it is moved to <dir>/<name>/dead/ so the rest of the queue keeps moving.
+Failures to reach the database (OperationalError / InterfaceError) are not
+counted against a segment. Dead segments are kept for inspection and can be
+replayed by moving them into an owner directory that is no longer locked.
+
+Usage::
+
+    log = WriteBehindLog("wisdom_deliveries", write_rows)
+    await log.start()          # adopts orphaned segments, starts flushing
+    log.append({"user_id": ..., "delivered_at": datetime.now(UTC)})
+    await log.stop()           # seals and writes what is left
+
+write_rows(db, records) receives the decoded JSON records (datetimes as
+ISO strings) and must not commit; the log commits per segment.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import shutil
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy.exc import DataError, IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows, see _try_lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Root directory for segment files; each log gets <dir>/<name>/<owner>/
+WRITE_BEHIND_DIR = os.getenv("WRITE_BEHIND_DIR", "./write_behind")
+# Records per segment; one segment is written with one multi-row insert
+WRITE_BEHIND_SEGMENT_RECORDS = int(os.getenv("WRITE_BEHIND_SEGMENT_RECORDS", "500"))
+# Seal and write the active segment at least this often
+WRITE_BEHIND_FLUSH_MS = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "2000"))
+# Appends beyond this much unwritten data are dropped (counted in status)
+WRITE_BEHIND_MAX_BACKLOG_MB = int(os.getenv("WRITE_BEHIND_MAX_BACKLOG_MB", "256"))
+# fsync each segment when it is sealed
+WRITE_BEHIND_FSYNC = os.getenv("WRITE_BEHIND_FSYNC", "true").lower() in ("1", "true", "yes")
+# How often to look for segments left behind by dead workers
+WRITE_BEHIND_ADOPT_SECONDS = int(os.getenv("WRITE_BEHIND_ADOPT_SECONDS", "60"))
+# Failed writes before a segment is moved to the dead directory
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+
+WriteRows = Callable[[AsyncSession, list[dict[str, Any]]], Awaitable[None]]
+
+_LOCK_FILE = "owner.lock"
+_SEGMENT_SUFFIX = ".seg"
+_STAGING_SUFFIX = ".new"
+_DEAD_DIR = "dead"
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _segment_name(seq: int) -> str:
+    # Sequence first so names sort in append order; the creation time in
+    # milliseconds gives the age of the oldest unwritten record.
+    return f"{seq:012d}-{int(time.time() * 1000)}{_SEGMENT_SUFFIX}"
+
+
+def _segment_created(path: str) -> float:
+    stem = os.path.basename(path)[: -len(_SEGMENT_SUFFIX)]
+    return int(stem.rsplit("-", 1)[1]) / 1000
+
+
+def _try_lock(fd: int) -> bool:
+    """Take an exclusive lock on fd without blocking; False if it is held.
+
+    The lock goes away with the process, which is what marks an owner
+    directory as dead. flock where available, msvcrt byte locks otherwise.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _count_lines(path: str) -> int:
+    """Lines in a segment, torn trailing line included."""
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def _read_segment(path: str) -> tuple[list[dict[str, Any]], int]:
+    """Records in a segment, and the number of torn lines skipped."""
+    records, torn = [], 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                torn += 1
+    return records, torn
+
+
+class WriteBehindLog:
+    """Append-only segment files drained into the database in batches."""
+
+    def __init__(
+        self,
+        name: str,
+        write_rows: WriteRows,
+        directory: str = WRITE_BEHIND_DIR,
+        segment_records: int = WRITE_BEHIND_SEGMENT_RECORDS,
+        flush_ms: int = WRITE_BEHIND_FLUSH_MS,
+        max_backlog_bytes: int = WRITE_BEHIND_MAX_BACKLOG_MB * 1024 * 1024,
+        fsync: bool = WRITE_BEHIND_FSYNC,
+        max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS,
+    ) -> None:
+        self.name = name
+        self.write_rows = write_rows
+        self.root = os.path.join(directory, name)
+        self.segment_records = segment_records
+        self.flush_ms = flush_ms
+        self.max_backlog_bytes = max_backlog_bytes
+        self.fsync = fsync
+        self.max_attempts = max_attempts
+        self.dead_dir = os.path.join(self.root, _DEAD_DIR)
+        self.owner_dir: str | None = None
+        self._lock_fd: int | None = None
+        # Sealed segments not yet written, oldest first (adopted ones included)
+        self._segments: list[str] = []
+        # Failed write attempts of the segment at the head of the queue
+        self._attempts: dict[str, int] = {}
+        # Adopted owner directory → its lock fd, released once drained
+        self._adopted: dict[str, int] = {}
+        self._active_path: str | None = None
+        self._active_fd: int | None = None
+        self._active_records = 0
+        self._seq = 0
+        self._backlog_bytes = 0
+        self._backlog_records = 0
+        self._last_adopt = 0.0
+        self._last_flush_at: float | None = None
+        self._flush_lock = asyncio.Lock()
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._running = False
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._stats = {
+            "appended": 0, "written": 0, "segments_written": 0, "replayed": 0,
+            "dropped": 0, "torn": 0, "errors": 0, "dead_segments": 0, "dead_records": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # ─── Owner directory ───────────────────────────────────────────────
+
+    def open(self) -> None:
+        """Create this process's owner directory and adopt orphaned segments."""
+        if self.owner_dir is not None:
+            return
+        owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        owner_dir = os.path.join(self.root, owner)
+        # Lock before the directory becomes visible, so no other worker can
+        # mistake it for a dead owner's.
+        staging = owner_dir + _STAGING_SUFFIX
+        os.makedirs(staging)
+        self._lock_fd = os.open(os.path.join(staging, _LOCK_FILE), os.O_CREAT | os.O_RDWR, 0o600)
+        if not _try_lock(self._lock_fd):
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            raise OSError(f"Could not lock new owner directory {staging}")
+        os.rename(staging, owner_dir)
+        self.owner_dir = owner_dir
+        self.adopt_orphans()
+
+    def adopt_orphans(self) -> int:
+        """Queue the segments of owner directories whose process has died."""
+        self._last_adopt = time.monotonic()
+        adopted = 0
+        for entry in sorted(os.listdir(self.root)):
+            owner_dir = os.path.join(self.root, entry)
+            if (
+                owner_dir == self.owner_dir
+                or owner_dir == self.dead_dir
+                or owner_dir in self._adopted
+                or entry.endswith(_STAGING_SUFFIX)
+                or not os.path.isdir(owner_dir)
+            ):
+                continue
+            try:
+                fd = os.open(os.path.join(owner_dir, _LOCK_FILE), os.O_CREAT | os.O_RDWR, 0o600)
+            except OSError:
+                continue
+            if not _try_lock(fd):
+                os.close(fd)  # owner still alive (or adopted by another worker)
+                continue
+            if not os.path.isdir(owner_dir):
+                # Drained and removed by another worker between listdir and flock
+                os.close(fd)
+                continue
+            self._adopted[owner_dir] = fd
+            for segment in sorted(os.listdir(owner_dir)):
+                if segment.endswith(_SEGMENT_SUFFIX):
+                    path = os.path.join(owner_dir, segment)
+                    size = os.path.getsize(path)
+                    self._segments.append(path)
+                    self._backlog_bytes += size
+                    self._backlog_records += _count_lines(path)
+                    adopted += 1
+            self._release_drained_owners()
+        if adopted:
+            logger.info(f"[WriteBehind:{self.name}] Adopted {adopted} orphaned segments")
+        return adopted
+
+    def _release_drained_owners(self) -> None:
+        for owner_dir in list(self._adopted):
+            if not any(s.startswith(owner_dir + os.sep) for s in self._segments):
+                shutil.rmtree(owner_dir, ignore_errors=True)
+                os.close(self._adopted.pop(owner_dir))
+
+    def close(self) -> None:
+        """Seal the active segment and release the owner lock.
+
+        The owner directory is removed when nothing in it is left to write;
+        otherwise it stays for the next process to adopt.
+        """
+        self._seal()
+        if self.owner_dir is None:
+            return
+        if not any(s.startswith(self.owner_dir + os.sep) for s in self._segments):
+            shutil.rmtree(self.owner_dir, ignore_errors=True)
+        for fd in self._adopted.values():
+            os.close(fd)
+        self._adopted.clear()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self.owner_dir = None
+        self._segments.clear()
+        self._backlog_bytes = self._backlog_records = 0
+
+    # ─── Append / seal ─────────────────────────────────────────────────
+
+    def append(self, record: dict[str, Any]) -> bool:
+        """Durably queue one record; False if the backlog cap dropped it."""
+        if self.owner_dir is None:
+            self.open()
+        line = json.dumps(record, default=_json_default, separators=(",", ":")).encode() + b"\n"
+        if self._backlog_bytes + len(line) > self.max_backlog_bytes:
+            self._stats["dropped"] += 1
+            return False
+        if self._active_fd is None:
+            self._seq += 1
+            self._active_path = os.path.join(self.owner_dir, _segment_name(self._seq))
+            self._active_fd = os.open(
+                self._active_path, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o600
+            )
+        os.write(self._active_fd, line)
+        self._active_records += 1
+        self._backlog_bytes += len(line)
+        self._backlog_records += 1
+        self._stats["appended"] += 1
+        if self._active_records >= self.segment_records:
+            self._seal()
+            if self._wake is not None:
+                self._wake.set()
+        return True
+
+    def _seal(self) -> None:
+        if self._active_fd is None:
+            return
+        if self.fsync:
+            os.fsync(self._active_fd)
+        os.close(self._active_fd)
+        assert self._active_path is not None
+        self._segments.append(self._active_path)
+        self._active_fd = self._active_path = None
+        self._active_records = 0
+
+    # ─── Flush ─────────────────────────────────────────────────────────
+
+    async def flush(self, seal: bool = True) -> int:
+        """Write every pending segment, oldest first.
+
+        With seal (the default) the active segment is sealed and written
+        too; the background loop passes seal=False when woken by a full
+        segment, so a busy log keeps writing full segments. Stops at the
+        first segment that cannot be written; it stays on disk and is
+        retried on the next flush, unless it has failed for good (see the
+        module docstring) and is moved to the dead directory instead.
+        Returns the records written.
+        """
+        if self._session_maker is None:
+            raise RuntimeError(f"WriteBehindLog {self.name!r} is not started")
+        async with self._flush_lock:
+            if seal:
+                self._seal()
+            if time.monotonic() - self._last_adopt >= WRITE_BEHIND_ADOPT_SECONDS:
+                self.adopt_orphans()
+            written = 0
+            while self._segments:
+                path = self._segments[0]
+                records, torn = [], 0
+                try:
+                    records, torn = await asyncio.to_thread(_read_segment, path)
+                    if records:
+                        async with self._session_maker() as db:
+                            try:
+                                await self.write_rows(db, records)
+                                await db.commit()
+                            except Exception:
+                                await db.rollback()
+                                raise
+                except asyncio.CancelledError:
+                    raise
+                except FileNotFoundError:
+                    records, torn = [], 0
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    if not self._give_up(path, e):
+                        logger.warning(
+                            f"[WriteBehind:{self.name}] Write failed, {len(self._segments)} "
+                            f"segments kept for retry: {e}"
+                        )
+                        break
+                    attempts = self._attempts.get(path, 1)
+                    dead = self._retire(path, records, torn, bury=True)
+                    logger.error(
+                        f"[WriteBehind:{self.name}] Moved {len(records)} records to {dead} "
+                        f"after {attempts} failed write(s): {e}"
+                    )
+                    self._stats["dead_segments"] += 1
+                    self._stats["dead_records"] += len(records)
+                    continue
+                self._retire(path, records, torn)
+                self._stats["written"] += len(records)
+                self._stats["segments_written"] += 1
+                self._stats["torn"] += torn
+                written += len(records)
+            self._backlog_bytes = max(self._backlog_bytes, 0)
+            self._backlog_records = max(self._backlog_records, 0)
+            self._last_flush_at = time.monotonic()
+            return written
+
+    def _give_up(self, path: str, error: Exception) -> bool:
+        """Count a failed write; True once the segment should be moved aside."""
+        if isinstance(error, IntegrityError | DataError):
+            return True
+        if isinstance(error, OperationalError | InterfaceError):
+            return False  # the database is unreachable, not this segment's fault
+        self._attempts[path] = self._attempts.get(path, 0) + 1
+        return self._attempts[path] >= self.max_attempts
+
+    def _retire(
+        self, path: str, records: list[dict[str, Any]], torn: int, bury: bool = False
+    ) -> str | None:
+        """Take the head segment off the queue: delete it, or with bury move
+        it to the dead directory (returning its new path)."""
+        adopted = self.owner_dir is not None and not path.startswith(self.owner_dir + os.sep)
+        self._backlog_bytes -= os.path.getsize(path) if os.path.exists(path) else 0
+        dead = None
+        with contextlib.suppress(FileNotFoundError):
+            if bury:
+                os.makedirs(self.dead_dir, exist_ok=True)
+                owner = os.path.basename(os.path.dirname(path))
+                dead = os.path.join(self.dead_dir, f"{owner}-{os.path.basename(path)}")
+                os.replace(path, dead)
+            else:
+                os.remove(path)
+        self._segments.pop(0)
+        self._attempts.pop(path, None)
+        self._backlog_records -= len(records) + torn
+        if adopted:
+            if not bury:
+                self._stats["replayed"] += len(records)
+            self._release_drained_owners()
+        return dead
+
+    # ─── Lifecycle ─────────────────────────────────────────────────────
+
+    async def start(self, session_maker: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """Open the owner directory, adopt orphans and start the flush loop."""
+        if self._running:
+            return
+        if session_maker is None:
+            # Import lazily so this module has no import-time dependency on
+            # the DB engine (matters for unit tests).
+            from backend import deps
+
+            session_maker = deps.SessionLocal
+        self._session_maker = session_maker
+        await asyncio.to_thread(self.open)
+        self._wake = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._loop(), name=f"write_behind_{self.name}")
+        logger.info(
+            f"[WriteBehind:{self.name}] Started in {self.owner_dir} "
+            f"(every {self.flush_ms}ms or {self.segment_records} records)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the loop, write what is left and release the owner directory."""
+        self._running = False
+        if self._task is not None:
+            # Let the loop finish its current write rather than cancel it
+            assert self._wake is not None
+            self._wake.set()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._session_maker is not None and self.owner_dir is not None:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"[WriteBehind:{self.name}] Final flush failed: {e}")
+        self.close()
+        logger.info(f"[WriteBehind:{self.name}] Stopped")
+
+    async def _loop(self) -> None:
+        while self._running:
+            assert self._wake is not None
+            woken = False
+            with contextlib.suppress(asyncio.TimeoutError):
+                woken = await asyncio.wait_for(self._wake.wait(), self.flush_ms / 1000)
+            self._wake.clear()
+            try:
+                await self.flush(seal=not woken)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pragma: no cover - defensive
+                logger.warning(f"[WriteBehind:{self.name}] Flush loop error: {e}")
+
+    @property
+    def status(self) -> dict[str, Any]:
+        """Backlog and lag for the admin telemetry endpoint."""
+        oldest = self._segments[0] if self._segments else self._active_path
+        return {
+            "running": self._running,
+            "backlog_records": self._backlog_records,
+            "backlog_segments": len(self._segments) + (self._active_fd is not None),
+            "backlog_bytes": self._backlog_bytes,
+            "adopted_owners": len(self._adopted),
+            "lag_seconds": round(time.time() - _segment_created(oldest), 2) if oldest else 0.0,
+            "seconds_since_last_flush": (
+                round(time.monotonic() - self._last_flush_at, 2)
+                if self._last_flush_at is not None else None
+            ),
+            **self._stats,
+        }
@@ -0,0 +1,239 @@
+"""
+Tests for the in-process journey template catalog.
+
+The catalog must be a drop-in replacement for the per-request template and
+verse queries in JourneyEngineService: same templates, same ordering, same
+step content — only served from memory.
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from backend import models  # noqa: E402
+from backend.services.journey_engine import template_catalog  # noqa: E402
+from backend.services.journey_engine.journey_engine_service import (  # noqa: E402
+    JourneyEngineService,
+)
+from backend.services.journey_engine.template_catalog import (  # noqa: E402
+    get_fresh_template_catalog,
+    invalidate_template_catalog,
+    refresh_template_catalog,
+)
+
+_TABLES = [
+    models.User.__table__,
+    models.GitaVerse.__table__,
+    models.JourneyTemplate.__table__,
+    models.JourneyTemplateStep.__table__,
+    models.UserJourney.__table__,
+    models.UserJourneyStepState.__table__,
+]
+
+
+@pytest.fixture(autouse=True)
+def _reset_catalog():
+    invalidate_template_catalog()
+    yield
+    invalidate_template_catalog()
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: models.Base.metadata.create_all(c, tables=_TABLES))
+
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        now = datetime(2026, 1, 1)
+        session.add_all([
+            models.GitaVerse(
+                chapter=2, verse=63, sanskrit="krodhad bhavati sammohah",
+                hindi="", english="From anger comes delusion",
+                principle="anger", theme="anger",
+            ),
+            models.GitaVerse(
+                chapter=3, verse=37, sanskrit="kama esa krodha esa",
+                hindi="", english="It is desire, it is anger",
+                principle="desire", theme="desire",
+            ),
+            models.JourneyTemplate(
+                id="tpl-krodha", slug="krodha-14", title="Cooling the Fire",
+                primary_enemy_tags=["krodha"], duration_days=14, difficulty=2,
+                is_active=True, is_featured=True, is_free=True, created_at=now,
+            ),
+            models.JourneyTemplate(
+                id="tpl-kama", slug="kama-7", title="Naming Desire",
+                primary_enemy_tags=["kama"], duration_days=7, difficulty=4,
+                is_active=True, is_featured=False, is_free=False,
+                created_at=now + timedelta(days=1),
+            ),
+            models.JourneyTemplate(
+                id="tpl-hidden", slug="hidden", title="Inactive",
+                primary_enemy_tags=["moha"], duration_days=7, difficulty=1,
+                is_active=False, is_featured=False, is_free=True,
+                created_at=now + timedelta(days=2),
+            ),
+            models.JourneyTemplateStep(
+                journey_template_id="tpl-krodha", day_index=1,
+                step_title="Day 1 · The Pause", teaching_hint="Find the pause.",
+                reflection_prompt="What triggered you?\n\nWhat did you want?",
+                practice_prompt="Breathe once.\n\n  \n\nBreathe twice.",
+                static_verse_refs=[{"chapter": 2, "verse": 63}, {"chapter": 3, "verse": 37}],
+                safety_notes="Seek help if anger feels unsafe.",
+            ),
+            models.User(id="user-1", auth_uid="auth-1", email="u1@example.com"),
+        ])
+        await session.commit()
+        session.info["statements"] = statements
+        yield session
+
+    await engine.dispose()
+
+
+async def _start(db, template_id: str, time_budget: int = 15) -> str:
+    journey = models.UserJourney(
+        id=str(uuid.uuid4()),
+        user_id="user-1",
+        journey_template_id=template_id,
+        status=models.UserJourneyStatus.ACTIVE.value,
+        current_day_index=1,
+        personalization={"time_budget_minutes": time_budget},
+        started_at=datetime.utcnow(),
+    )
+    db.add(journey)
+    await db.flush()
+    return journey.id
+
+
+def _step_payload(step) -> dict:
+    data = step.to_dict()
+    data.pop("step_id")
+    data.pop("journey_id")
+    return data
+
+
+@pytest.mark.asyncio
+async def test_list_templates_matches_database_path(db):
+    service = JourneyEngineService(db)
+    from_db, total_db = await service.list_templates(limit=10)
+
+    await refresh_template_catalog(db)
+    from_catalog, total_catalog = await service.list_templates(limit=10)
+
+    assert total_catalog == total_db == 2
+    assert [t.id for t in from_catalog] == [t.id for t in from_db]
+    assert [t.id for t in from_catalog] == ["tpl-krodha", "tpl-kama"]
+
+    featured, _ = await service.list_templates(featured_only=True)
+    assert [t.id for t in featured] == ["tpl-krodha"]
+    by_enemy, total = await service.list_templates(enemy_filter="KAMA")
+    assert [t.id for t in by_enemy] == ["tpl-kama"] and total == 1
+    capped, _ = await service.list_templates(difficulty_max=3)
+    assert [t.id for t in capped] == ["tpl-krodha"]
+    page, total = await service.list_templates(limit=1, offset=1)
+    assert [t.id for t in page] == ["tpl-kama"] and total == 2
+
+
+@pytest.mark.asyncio
+async def test_inactive_template_still_resolvable_by_id_and_slug(db):
+    await refresh_template_catalog(db)
+    service = JourneyEngineService(db)
+
+    assert (await service.get_template("tpl-hidden")).slug == "hidden"
+    assert (await service.get_template_by_slug("krodha-14")).id == "tpl-krodha"
+
+
+@pytest.mark.asyncio
+async def test_current_step_parity_and_no_template_or_verse_queries(db):
+    service = JourneyEngineService(db)
+    db_journey = await _start(db, "tpl-krodha")
+    db_step = await service.get_current_step("user-1", db_journey)
+
+    await refresh_template_catalog(db)
+    catalog_journey = await _start(db, "tpl-krodha")
+    statements = db.info["statements"]
+    statements.clear()
+    catalog_step = await service.get_current_step("user-1", catalog_journey)
+
+    assert _step_payload(catalog_step) == _step_payload(db_step)
+    assert catalog_step.guided_reflection == ["What triggered you?", "What did you want?"]
+    assert catalog_step.practice["instructions"] == ["Breathe once.", "Breathe twice."]
+    assert catalog_step.practice["duration_minutes"] == 15
+    assert [v["english"] for v in catalog_step.verses] == [
+        "From anger comes delusion",
+        "It is desire, it is anger",
+    ]
+    assert not any(
+        "FROM journey_template" in s or "FROM gita_verses" in s for s in statements
+    )
+
+
+@pytest.mark.asyncio
+async def test_fallback_content_uses_preloaded_enemy_verse(db):
+    await refresh_template_catalog(db)
+    service = JourneyEngineService(db)
+    journey_id = await _start(db, "tpl-kama")
+
+    step = await service.get_current_step("user-1", journey_id)
+
+    assert step.step_title == "Day 1 · Naming Desire"
+    assert [(v["chapter"], v["verse"]) for v in step.verses] == [(3, 37)]
+
+
+@pytest.mark.asyncio
+async def test_rendered_content_does_not_alias_snapshot(db):
+    catalog = await refresh_template_catalog(db)
+    skeleton = catalog.get("tpl-krodha").step_for_day(1)
+
+    rendered = skeleton.render(["krodha"], {})
+    rendered["guided_reflection"].append("mutated")
+    rendered["verse_refs"][0]["chapter"] = 99
+
+    again = skeleton.render(["krodha"], {})
+    assert again["guided_reflection"] == ["What triggered you?", "What did you want?"]
+    assert again["verse_refs"][0] == {"chapter": 2, "verse": 63}
+
+    verse = catalog.get_verse(2, 63)
+    verse["english"] = "mutated"
+    assert catalog.get_verse(2, 63)["english"] == "From anger comes delusion"
+
+
+@pytest.mark.asyncio
+async def test_revalidation_picks_up_template_changes(db, monkeypatch):
+    first = await refresh_template_catalog(db)
+    monkeypatch.setattr(template_catalog, "CATALOG_RECHECK_SECONDS", 0)
+
+    assert await get_fresh_template_catalog(db) is first
+
+    template = await db.get(models.JourneyTemplate, "tpl-kama")
+    template.title = "Naming Desire (revised)"
+    template.updated_at = datetime(2026, 2, 1)
+    await db.commit()
+
+    refreshed = await get_fresh_template_catalog(db)
+    assert refreshed.version > first.version
+    assert refreshed.get("tpl-kama").title == "Naming Desire (revised)"
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_opt_in(db):
+    assert await get_fresh_template_catalog(db) is None
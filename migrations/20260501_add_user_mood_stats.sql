@@ -0,0 +1,15 @@
+-- Per-user incremental mood aggregates backing the analytics dashboard.
+--
+-- Mirrors backend/models/mood.UserMoodStats. The stats JSON is a
+-- serialized MoodRollingStats and is rebuilt nightly from moods by
+-- backend/scripts/rebuild_mood_stats.py, so it is safe to truncate.
+
+CREATE TABLE IF NOT EXISTS user_mood_stats (
+  user_id VARCHAR(255) PRIMARY KEY
+    REFERENCES users(id) ON DELETE CASCADE,
+  stats JSON NOT NULL,
+  mood_count INTEGER NOT NULL DEFAULT 0,
+  last_mood_at TIMESTAMPTZ NULL,
+  rebuilt_at TIMESTAMPTZ NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
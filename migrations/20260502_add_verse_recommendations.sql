@@ -0,0 +1,22 @@
+-- Precomputed top-k verse recommendations per situation (mood + topic).
+--
+-- Mirrors backend/models/self_sufficiency.VerseRecommendation. Rows are
+-- derived from verse_application_edges by
+-- VerseApplicationGraph.refresh_recommendations(), so the table is safe to
+-- truncate. topic '*' holds the mood-only ranking.
+
+CREATE TABLE IF NOT EXISTS verse_recommendations (
+  id SERIAL PRIMARY KEY,
+  mood VARCHAR(32) NOT NULL,
+  topic VARCHAR(32) NOT NULL,
+  rank INTEGER NOT NULL,
+  verse_ref VARCHAR(16) NOT NULL,
+  weight FLOAT NOT NULL,
+  confidence FLOAT NOT NULL,
+  composite_score FLOAT NOT NULL,
+  times_shown INTEGER NOT NULL DEFAULT 0,
+  positive_signals INTEGER NOT NULL DEFAULT 0,
+  negative_signals INTEGER NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  CONSTRAINT uq_verse_rec_situation_rank UNIQUE (mood, topic, rank)
+);
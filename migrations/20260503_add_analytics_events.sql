@@ -0,0 +1,29 @@
+-- Analytics events (written in batches by the SimpleAnalytics writer) and
+-- their hourly / daily rollups.
+--
+-- Mirrors backend/models/analytics. Replaces the disabled
+-- 20251208_add_analytics_events.sql without its users foreign key: one
+-- event for a deleted user must not fail a whole batch insert.
+-- analytics_event_rollups is derived from analytics_events
+-- (SimpleAnalytics.rebuild_rollups) and safe to truncate.
+
+CREATE TABLE IF NOT EXISTS analytics_events (
+  id BIGSERIAL PRIMARY KEY,
+  event_type VARCHAR(100) NOT NULL,
+  user_id VARCHAR(255),
+  metadata JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_analytics_event_type ON analytics_events(event_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_analytics_user ON analytics_events(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_analytics_created ON analytics_events(created_at);
+
+CREATE TABLE IF NOT EXISTS analytics_event_rollups (
+  granularity VARCHAR(8) NOT NULL,
+  bucket_start TIMESTAMPTZ NOT NULL,
+  event_type VARCHAR(100) NOT NULL,
+  count BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (granularity, bucket_start, event_type)
+);
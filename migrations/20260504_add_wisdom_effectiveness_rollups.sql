@@ -0,0 +1,21 @@
+-- Running effectiveness totals per (mood, verse) for DynamicWisdomCorpus.
+--
+-- Mirrors backend/models/wisdom.WisdomEffectivenessRollup. Maintained
+-- alongside wisdom_effectiveness writes; populate (or repair) it from the
+-- existing rows with:
+--
+--     python -m backend.scripts.rebuild_wisdom_rollups
+
+CREATE TABLE IF NOT EXISTS wisdom_effectiveness_rollups (
+  mood VARCHAR(32) NOT NULL,
+  verse_ref VARCHAR(16) NOT NULL,
+  deliveries INTEGER NOT NULL DEFAULT 0,
+  outcome_count INTEGER NOT NULL DEFAULT 0,
+  effectiveness_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+  avg_effectiveness DOUBLE PRECISION,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (mood, verse_ref)
+);
+
+CREATE INDEX IF NOT EXISTS idx_wisdom_rollup_mood_avg
+  ON wisdom_effectiveness_rollups (mood, avg_effectiveness);
@@ -0,0 +1,15 @@
+-- Composite indexes for keyset pagination of the admin list endpoints
+-- (backend/services/admin_pagination) and the batched admin user details.
+--
+-- Each list orders by (sort column, id); the index lets any page be read
+-- as one range scan instead of skipping OFFSET rows. Mirrors the
+-- __table_args__ indexes on the corresponding models.
+
+CREATE INDEX IF NOT EXISTS idx_users_created_id ON users(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_users_email_id ON users((coalesce(email, '')), id);
+CREATE INDEX IF NOT EXISTS idx_admin_audit_logs_created_id ON admin_audit_logs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_flagged_content_flagged_id ON flagged_content(flagged_at, id);
+CREATE INDEX IF NOT EXISTS idx_user_subscriptions_created_id ON user_subscriptions(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_payments_created_id ON payments(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_usage_tracking_user_feature_period
+  ON usage_tracking(user_id, feature, period_start);
@@ -0,0 +1,22 @@
+-- Progress of the batched data retention purge (backend/services/data_retention).
+--
+-- One row per retention policy. last_key is the highest primary key purged
+-- by the current run and is updated in the same transaction as each batch,
+-- so a run interrupted by a restart resumes where it stopped.
+-- lease_expires_at and lease_owner keep two workers from purging the same
+-- policy at once; the owning worker may reclaim its lease before it expires.
+-- Mirrors backend/models/compliance.RetentionCheckpoint.
+
+CREATE TABLE IF NOT EXISTS retention_checkpoints (
+  policy VARCHAR(64) PRIMARY KEY,
+  cutoff TIMESTAMPTZ NOT NULL,
+  last_key VARCHAR(255),
+  purged INTEGER NOT NULL DEFAULT 0,
+  started_at TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ,
+  completed_at TIMESTAMPTZ,
+  lease_expires_at TIMESTAMPTZ,
+  lease_owner VARCHAR(255)
+);
+
+ALTER TABLE retention_checkpoints ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
@@ -12,30 +12,24 @@ Features:
 - Microphone modeling
 """
 
+import asyncio
+import hashlib
 import os
-import sys
-import json
 import random
-import asyncio
-import tempfile
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
-import numpy as np
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import hashlib
+from typing import TYPE_CHECKING
 
 # Audio processing
 import librosa
+import numpy as np
 import soundfile as sf
 from scipy import signal
-from scipy.io import wavfile
 
-# Import scenario types
-from continuous_learning_engine import (
-    Scenario, ScenarioType, NaturalVoice, VoicePersonality,
-    NATURAL_VOICES, ContinuousLearningConfig
-)
+# Scenario types are only needed for annotations. Pipeline worker processes
+# import this module, and importing the engine would pull TensorFlow into
+# every worker.
+if TYPE_CHECKING:
+    from continuous_learning_engine import ContinuousLearningConfig, Scenario
 
 
 # ============================================================================
@@ -197,6 +191,19 @@ class AudioAugmenter:
         # Pre-generated noise buffers
         self._noise_buffers = {}
 
+        # Impulse responses by reverb level (0.01 steps) and filter
+        # coefficients by design parameters, built once per process
+        self._impulse_responses: dict[int, np.ndarray] = {}
+        self._filters: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _butter(self, order: int, cutoff, btype: str) -> tuple[np.ndarray, np.ndarray]:
+        """Cached Butterworth design; cutoff in Hz"""
+        key = (order, tuple(np.atleast_1d(cutoff)), btype)
+        if key not in self._filters:
+            nyq = self.sample_rate / 2
+            self._filters[key] = signal.butter(order, np.asarray(cutoff) / nyq, btype=btype)
+        return self._filters[key]
+
     def load_audio(self, path: str) -> np.ndarray:
         """Load and normalize audio"""
         audio, sr = librosa.load(path, sr=self.sample_rate)
@@ -206,7 +213,7 @@ class AudioAugmenter:
         """Save audio"""
         sf.write(path, audio, self.sample_rate)
 
-    def apply_scenario(self, audio: np.ndarray, scenario: Scenario) -> np.ndarray:
+    def apply_scenario(self, audio: np.ndarray, scenario: "Scenario") -> np.ndarray:
         """Apply all scenario-based augmentations"""
         result = audio.copy()
 
@@ -258,6 +265,22 @@ class AudioAugmenter:
 
     def add_reverb(self, audio: np.ndarray, level: float) -> np.ndarray:
         """Add reverb effect"""
+        ir = self.impulse_response(level)
+
+        # Convolve
+        reverb = signal.fftconvolve(audio, ir, mode='same')
+
+        # Mix dry and wet
+        return (1 - level * 0.5) * audio + level * 0.5 * reverb
+
+    def impulse_response(self, level: float) -> np.ndarray:
+        """Room impulse response for a reverb level, cached at 0.01 resolution"""
+        key = int(round(level * 100))
+        ir = self._impulse_responses.get(key)
+        if ir is not None:
+            return ir
+        level = key / 100
+
         # Create impulse response
         ir_length = int(self.sample_rate * 0.5)
         t = np.arange(ir_length) / self.sample_rate
@@ -270,7 +293,7 @@ class AudioAugmenter:
         reflection_times = [0.01, 0.02, 0.035, 0.05, 0.08, 0.12, 0.18]
         reflection_gains = [0.8, 0.6, 0.5, 0.4, 0.3, 0.2, 0.15]
 
-        for time, gain in zip(reflection_times, reflection_gains):
+        for time, gain in zip(reflection_times, reflection_gains, strict=True):
             idx = int(time * self.sample_rate)
             if idx < ir_length:
                 ir[idx] = gain * level
@@ -279,11 +302,8 @@ class AudioAugmenter:
         decay = np.exp(-6 * t * (1 - level * 0.5))
         ir = ir * decay
 
-        # Convolve
-        reverb = signal.convolve(audio, ir, mode='same')
-
-        # Mix dry and wet
-        return (1 - level * 0.5) * audio + level * 0.5 * reverb
+        self._impulse_responses[key] = ir
+        return ir
 
     def add_noise(
         self,
@@ -333,7 +353,7 @@ class AudioAugmenter:
             for _ in range(random.randint(3, 8)):
                 voice = np.random.randn(length)
                 # Modulate to simulate speech patterns
-                env = np.abs(np.random.randn(length // 1000))
+                env = np.abs(np.random.randn(length // 1000 + 1))
                 env = np.repeat(env, 1000)[:length]
                 babble += voice * env * 0.2
             return babble
@@ -360,7 +380,7 @@ class AudioAugmenter:
             # Rain sounds
             white = np.random.randn(length)
             # High-pass for rain texture
-            b, a = signal.butter(4, 1000 / (self.sample_rate / 2), btype='high')
+            b, a = self._butter(4, 1000, 'high')
             rain = signal.filtfilt(b, a, white)
             # Add occasional drops
             drops = np.random.randn(length) * (np.random.rand(length) > 0.99)
@@ -396,8 +416,10 @@ class AudioAugmenter:
 
         # High frequency rolloff (air absorption)
         nyq = self.sample_rate / 2
-        cutoff = max(1000, nyq - distance * 500)
-        b, a = signal.butter(2, cutoff / nyq, btype='low')
+        # Cutoff rounded to 100 Hz so the design can be cached
+        cutoff = round(max(1000, nyq - distance * 500), -2)
+        cutoff = min(cutoff, nyq - 100)
+        b, a = self._butter(2, cutoff, 'low')
         audio = signal.filtfilt(b, a, audio)
 
         # Add small delay (speed of sound)
@@ -407,42 +429,64 @@ class AudioAugmenter:
 
         return audio
 
+    # Band edges (Hz), filter order and gain per microphone type
+    MICROPHONE_BANDS = {
+        "phone_builtin": (4, (100, 7000), 1.0),       # Typical phone: limited low/high
+        "phone_earbuds": (4, (80, 8000), 1.2),        # Earbuds: close to ear, reduced noise
+        "laptop_builtin": (4, (60, 6000), 1.0),       # Laptop: more low-end pickup
+        "bluetooth_headset": (4, (200, 5000), 1.0),   # Bluetooth: compressed, narrow band
+        "smart_speaker": (4, (100, 8000), 1.0),       # Smart speaker: optimized for voice
+        "professional_mic": (2, (20, 16000), 1.0),    # Professional: wide frequency response
+    }
+
     def apply_microphone_model(self, audio: np.ndarray, mic_type: str) -> np.ndarray:
         """Apply microphone characteristics"""
-        nyq = self.sample_rate / 2
-
-        if mic_type == "phone_builtin":
-            # Typical phone: limited low/high
-            b, a = signal.butter(4, [100 / nyq, 7000 / nyq], btype='band')
-            return signal.filtfilt(b, a, audio)
+        if mic_type not in self.MICROPHONE_BANDS:
+            return audio
 
-        elif mic_type == "phone_earbuds":
-            # Earbuds: close to ear, reduced noise
-            b, a = signal.butter(4, [80 / nyq, 8000 / nyq], btype='band')
-            return signal.filtfilt(b, a, audio) * 1.2
+        order, (low, high), gain = self.MICROPHONE_BANDS[mic_type]
+        high = min(high, 0.99 * self.sample_rate / 2)
+        b, a = self._butter(order, (low, high), 'band')
+        return signal.filtfilt(b, a, audio) * gain
 
-        elif mic_type == "laptop_builtin":
-            # Laptop: more low-end pickup
-            b, a = signal.butter(4, [60 / nyq, 6000 / nyq], btype='band')
-            return signal.filtfilt(b, a, audio)
 
-        elif mic_type == "bluetooth_headset":
-            # Bluetooth: compressed, narrow band
-            b, a = signal.butter(4, [200 / nyq, 5000 / nyq], btype='band')
-            return signal.filtfilt(b, a, audio)
+class MelFeatureExtractor:
+    """
+    Log-mel features with the filterbank built once.
 
-        elif mic_type == "smart_speaker":
-            # Smart speaker: optimized for voice
-            b, a = signal.butter(4, [100 / nyq, 8000 / nyq], btype='band')
-            return signal.filtfilt(b, a, audio)
+    Equivalent to librosa.feature.melspectrogram + power_to_db(ref=max) +
+    per-clip standardisation, but takes a (clips, samples) batch in one
+    STFT call.
+    """
 
-        elif mic_type == "professional_mic":
-            # Professional: wide frequency response
-            b, a = signal.butter(2, [20 / nyq, min(0.99, 16000 / nyq)], btype='band')
-            return signal.filtfilt(b, a, audio)
+    def __init__(
+        self,
+        sample_rate: int,
+        n_mels: int,
+        n_fft: int,
+        hop_length: int,
+        center: bool = True,
+    ):
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.center = center
+        self.mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels)
+
+    def extract(self, audio: np.ndarray) -> np.ndarray:
+        """(samples,) -> (time, mels) or (clips, samples) -> (clips, time, mels)"""
+        stft = librosa.stft(audio, n_fft=self.n_fft, hop_length=self.hop_length, center=self.center)
+        mel_spec = np.einsum("mf,...ft->...tm", self.mel_basis, np.abs(stft) ** 2)
+
+        # Convert to log scale, relative to each clip's peak
+        axes = tuple(range(mel_spec.ndim - 2, mel_spec.ndim))
+        peak = np.max(mel_spec, axis=axes, keepdims=True)
+        mel_spec_db = 10 * np.log10(np.maximum(mel_spec, 1e-10)) - 10 * np.log10(np.maximum(peak, 1e-10))
+        mel_spec_db = np.maximum(mel_spec_db, -80.0)
 
-        else:
-            return audio
+        # Normalize
+        mean = mel_spec_db.mean(axis=axes, keepdims=True)
+        std = mel_spec_db.std(axis=axes, keepdims=True)
+        return ((mel_spec_db - mean) / (std + 1e-8)).astype(np.float32)
 
 
 # ============================================================================
@@ -456,29 +500,36 @@ class AudioSynthesizer:
     This is the production-ready audio generation pipeline.
     """
 
-    def __init__(self, config: ContinuousLearningConfig):
+    def __init__(self, config: "ContinuousLearningConfig"):
         self.config = config
         self.augmenter = AudioAugmenter(config.sample_rate)
 
         # Initialize TTS engines
         self.tts_engine = EdgeTTSEngine()
 
+        self.feature_extractor = MelFeatureExtractor(
+            config.sample_rate, config.n_mels, config.n_fft, config.hop_length,
+        )
+
         # Output directory
         self.output_dir = Path(config.data_dir) / "synthesized"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.clean_dir = self.output_dir / "clean"
+        self.clean_dir.mkdir(parents=True, exist_ok=True)
 
         # Statistics
         self.stats = {
             "total_synthesized": 0,
             "successful": 0,
             "failed": 0,
+            "clean_cache_hits": 0,
         }
 
     async def synthesize_scenario(
         self,
-        scenario: Scenario,
-        output_path: Optional[str] = None,
-    ) -> Optional[np.ndarray]:
+        scenario: "Scenario",
+        output_path: str | None = None,
+    ) -> np.ndarray | None:
         """
         Synthesize audio for a single scenario.
 
@@ -545,9 +596,9 @@ class AudioSynthesizer:
 
     async def synthesize_batch(
         self,
-        scenarios: List[Scenario],
+        scenarios: list["Scenario"],
         max_concurrent: int = 10,
-    ) -> List[Tuple[Scenario, Optional[np.ndarray]]]:
+    ) -> list[tuple["Scenario", np.ndarray | None]]:
         """
         Synthesize audio for multiple scenarios concurrently.
         """
@@ -559,28 +610,49 @@ class AudioSynthesizer:
             tasks = [self.synthesize_scenario(s) for s in batch]
             audios = await asyncio.gather(*tasks)
 
-            for scenario, audio in zip(batch, audios):
+            for scenario, audio in zip(batch, audios, strict=True):
                 results.append((scenario, audio))
 
         return results
 
     def extract_features(self, audio: np.ndarray) -> np.ndarray:
         """Extract mel spectrogram features from audio"""
-        mel_spec = librosa.feature.melspectrogram(
-            y=audio,
-            sr=self.config.sample_rate,
-            n_mels=self.config.n_mels,
-            n_fft=self.config.n_fft,
-            hop_length=self.config.hop_length,
-        )
-
-        # Convert to log scale
-        mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
+        return self.feature_extractor.extract(audio)  # (time, mels)
 
-        # Normalize
-        mel_spec_db = (mel_spec_db - mel_spec_db.mean()) / (mel_spec_db.std() + 1e-8)
+    async def render_clean(self, scenario: "Scenario") -> str | None:
+        """
+        TTS clip for a scenario before augmentation, cached on disk.
 
-        return mel_spec_db.T  # (time, mels)
+        Clips are keyed by voice, text and prosody, so scenarios that only
+        differ in environment (noise, reverb, distance, microphone) share
+        one TTS request.
+        """
+        pitch = f"{int(scenario.pitch_shift * 10):+d}Hz"
+        rate = f"{int((scenario.speed_factor - 1) * 100):+d}%"
+        volume = f"{int((scenario.volume - 1) * 100):+d}%"
+        key = hashlib.sha1(
+            f"{scenario.voice.id}|{scenario.text}|{pitch}|{rate}|{volume}".encode()
+        ).hexdigest()[:20]
+        path = self.clean_dir / f"{key}.mp3"
+        if path.exists():
+            self.stats["clean_cache_hits"] += 1
+            return str(path)
+
+        temp_path = str(path) + ".part"
+        success = await self.tts_engine.synthesize(
+            text=scenario.text,
+            voice_id=scenario.voice.id,
+            output_path=temp_path,
+            pitch=pitch,
+            rate=rate,
+            volume=volume,
+        )
+        if not success:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        os.replace(temp_path, path)
+        return str(path)
 
 
 # ============================================================================
@@ -589,7 +661,10 @@ class AudioSynthesizer:
 
 async def main():
     """Test the audio synthesizer"""
-    from continuous_learning_engine import InfiniteScenarioGenerator
+    from continuous_learning_engine import (
+        ContinuousLearningConfig,
+        InfiniteScenarioGenerator,
+    )
 
     config = ContinuousLearningConfig()
     generator = InfiniteScenarioGenerator(config)
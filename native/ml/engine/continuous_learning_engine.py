@@ -18,34 +18,28 @@ Author: KIAAN Voice Team
 Version: 2.0.0
 """
 
-import os
-import sys
+import asyncio
+import hashlib
 import json
 import random
-import hashlib
-import asyncio
-import threading
-import queue
-from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Callable, Generator
+import sys
+from collections.abc import Generator
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
-from abc import ABC, abstractmethod
+from pathlib import Path
+
 import numpy as np
-from collections import deque
-import sqlite3
-import pickle
-import gzip
 
 # TensorFlow
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
 
-# Audio
-import librosa
-
+# Sibling modules import each other by bare name (as audio_synthesizer does),
+# which is also how pipeline worker processes find them
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from data_pipeline import FeaturePipeline, ShardedFeatureStore
 
 # ============================================================================
 # CONFIGURATION
@@ -78,6 +72,14 @@ class ContinuousLearningConfig:
     replay_buffer_size: int = 100000
     priority_alpha: float = 0.6
     priority_beta: float = 0.4
+    replay_memmap_threshold_mb: int = 2048  # Larger replay feature arrays are memory-mapped
+
+    # Data pipeline
+    audio_source: str = "synthetic"  # "tts" (Edge TTS, cached) or "synthetic" (offline)
+    pipeline_workers: int = 0  # 0: one per CPU
+    pipeline_chunk_size: int = 32  # Scenarios per worker task
+    pipeline_prefetch: int = 0  # Chunks in flight; 0: 2 per worker
+    feature_shard_size: int = 4096  # Rows per memory-mapped feature shard
 
     # Active learning
     uncertainty_threshold: float = 0.3
@@ -128,19 +130,19 @@ class NaturalVoice:
     language: str
     accent: str
     gender: str
-    age_range: Tuple[int, int]
+    age_range: tuple[int, int]
     personality: VoicePersonality
     quality_score: float  # 0-1
     naturalness_score: float  # 0-1
 
     # Voice modulation ranges
-    pitch_range: Tuple[float, float] = (-2.0, 2.0)
-    speed_range: Tuple[float, float] = (0.8, 1.2)
-    volume_range: Tuple[float, float] = (0.7, 1.0)
+    pitch_range: tuple[float, float] = (-2.0, 2.0)
+    speed_range: tuple[float, float] = (0.8, 1.2)
+    volume_range: tuple[float, float] = (0.7, 1.0)
 
 
 # Complete voice database with 100+ natural voices
-NATURAL_VOICES: List[NaturalVoice] = [
+NATURAL_VOICES: list[NaturalVoice] = [
     # ========== US English ==========
     NaturalVoice("us_jenny", "edge", "Jenny", "en-US", "American", "female", (25, 35), VoicePersonality.PROFESSIONAL, 0.95, 0.98),
     NaturalVoice("us_guy", "edge", "Guy", "en-US", "American", "male", (30, 40), VoicePersonality.CALM, 0.94, 0.97),
@@ -586,7 +588,7 @@ class InfiniteScenarioGenerator:
         data = f"{self.scenario_count}_{datetime.now().isoformat()}_{random.random()}"
         return hashlib.sha256(data.encode()).hexdigest()[:16]
 
-    def get_statistics(self) -> Dict:
+    def get_statistics(self) -> dict:
         """Get generation statistics"""
         return {
             **self.stats,
@@ -613,8 +615,8 @@ class UncertainSample:
     predicted_probability: float
     uncertainty: float
     timestamp: datetime
-    scenario: Optional[Scenario]
-    true_label: Optional[bool] = None
+    scenario: Scenario | None
+    true_label: bool | None = None
 
 
 class ActiveLearningEngine:
@@ -630,8 +632,8 @@ class ActiveLearningEngine:
     def __init__(self, config: ContinuousLearningConfig, model: keras.Model):
         self.config = config
         self.model = model
-        self.uncertain_samples: List[UncertainSample] = []
-        self.labeled_samples: List[Tuple[np.ndarray, bool]] = []
+        self.uncertain_samples: list[UncertainSample] = []
+        self.labeled_samples: list[tuple[np.ndarray, bool]] = []
 
         # Statistics
         self.stats = {
@@ -644,9 +646,9 @@ class ActiveLearningEngine:
     def evaluate_sample(
         self,
         features: np.ndarray,
-        scenario: Optional[Scenario] = None,
+        scenario: Scenario | None = None,
         n_forward_passes: int = 10,
-    ) -> Tuple[float, float]:
+    ) -> tuple[float, float]:
         """
         Evaluate a sample and estimate uncertainty using MC Dropout.
 
@@ -685,7 +687,7 @@ class ActiveLearningEngine:
         features: np.ndarray,
         probability: float,
         uncertainty: float,
-        scenario: Optional[Scenario],
+        scenario: Scenario | None,
     ):
         """Add sample to uncertain queue"""
         sample = UncertainSample(
@@ -700,7 +702,7 @@ class ActiveLearningEngine:
         self.uncertain_samples.append(sample)
         self.stats["uncertain_found"] += 1
 
-    def get_samples_for_labeling(self, count: int = 10) -> List[UncertainSample]:
+    def get_samples_for_labeling(self, count: int = 10) -> list[UncertainSample]:
         """Get most uncertain samples for human labeling"""
         # Sort by uncertainty (highest first)
         sorted_samples = sorted(
@@ -724,7 +726,7 @@ class ActiveLearningEngine:
         """Check if enough samples collected for retraining"""
         return len(self.labeled_samples) >= self.config.samples_before_retrain
 
-    def get_training_data(self) -> Tuple[np.ndarray, np.ndarray]:
+    def get_training_data(self) -> tuple[np.ndarray, np.ndarray]:
         """Get collected labeled samples for retraining"""
         if not self.labeled_samples:
             return np.array([]), np.array([])
@@ -744,57 +746,208 @@ class ActiveLearningEngine:
 # PRIORITIZED EXPERIENCE REPLAY
 # ============================================================================
 
+class SumTree:
+    """
+    Sum tree with a parallel min tree over a fixed number of leaves.
+
+    Leaves hold sampling weights (priority ** alpha). Internal node i holds
+    the sum (and min) of nodes 2i and 2i+1, so the total, the smallest leaf,
+    and the leaf at a given prefix sum are all O(log n). Updates and
+    lookups take arrays of leaves and walk the levels with vectorized
+    NumPy, so a batch costs O(batch * log n) without a Python loop per leaf.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaf_base = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.leaf_base.bit_length() - 1
+        self.sums = np.zeros(2 * self.leaf_base, dtype=np.float64)
+        self.mins = np.full(2 * self.leaf_base, np.inf, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.sums[1])
+
+    @property
+    def min(self) -> float:
+        return float(self.mins[1])
+
+    def leaves(self, indices: np.ndarray) -> np.ndarray:
+        return self.sums[np.asarray(indices) + self.leaf_base]
+
+    def update(self, indices: np.ndarray, values: np.ndarray):
+        """Set leaf values and recompute their ancestors"""
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_base
+        values = np.asarray(values, dtype=np.float64)
+        if len(nodes) == 1:
+            # Single add: plain scalar walk beats per-level array ops
+            node, value = int(nodes[0]), float(values[0])
+            sums, mins = self.sums, self.mins
+            sums[node] = mins[node] = value
+            while node > 1:
+                node >>= 1
+                left = 2 * node
+                sums[node] = sums[left] + sums[left + 1]
+                mins[node] = min(mins[left], mins[left + 1])
+            return
+        # Duplicate indices: the last write wins, as it would in a loop
+        nodes, first = np.unique(nodes[::-1], return_index=True)
+        values = values[::-1][first]
+        self.sums[nodes] = values
+        self.mins[nodes] = values
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            left, right = 2 * nodes, 2 * nodes + 1
+            self.sums[nodes] = self.sums[left] + self.sums[right]
+            self.mins[nodes] = np.minimum(self.mins[left], self.mins[right])
+
+    def find(self, prefix_sums: np.ndarray) -> np.ndarray:
+        """Leaf index holding each prefix sum (proportional sampling)"""
+        values = np.asarray(prefix_sums, dtype=np.float64).copy()
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values >= self.sums[left]
+            values -= np.where(go_right, self.sums[left], 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self.leaf_base, self.capacity - 1)
+
+    def argmin(self) -> int:
+        """Leaf index with the smallest value"""
+        node = 1
+        for _ in range(self.depth):
+            left = 2 * node
+            node = left if self.mins[left] <= self.mins[left + 1] else left + 1
+        return node - self.leaf_base
+
+
+@dataclass
+class ReplayBatch:
+    """A prioritized sample: slots to pass back to update_priorities, and IS weights"""
+    features: np.ndarray
+    labels: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+
 class PrioritizedReplayBuffer:
     """
     Prioritized experience replay for continuous learning.
 
     Samples difficult examples more frequently for faster learning.
+
+    Features and labels live in arrays preallocated on the first add
+    (memory-mapped under data_dir once they would exceed
+    replay_memmap_threshold_mb), and priorities in a SumTree: adding,
+    proportional sampling, priority updates and replacing the
+    lowest-priority sample when full are all O(log n).
     """
 
     def __init__(self, config: ContinuousLearningConfig):
         self.config = config
-        self.buffer: List[Tuple[np.ndarray, bool, float]] = []  # (features, label, priority)
         self.max_size = config.replay_buffer_size
-
-    def add(self, features: np.ndarray, label: bool, priority: float = 1.0):
-        """Add sample with priority"""
-        if len(self.buffer) >= self.max_size:
-            # Remove lowest priority sample
-            min_idx = min(range(len(self.buffer)), key=lambda i: self.buffer[i][2])
-            self.buffer.pop(min_idx)
-
-        self.buffer.append((features, label, priority))
-
-    def sample(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
-        """Sample batch with priority weighting"""
-        if len(self.buffer) == 0:
-            return np.array([]), np.array([])
-
-        # Calculate sampling probabilities
-        priorities = np.array([s[2] for s in self.buffer])
-        probabilities = priorities ** self.config.priority_alpha
-        probabilities /= probabilities.sum()
-
-        # Sample indices
-        indices = np.random.choice(
-            len(self.buffer),
-            size=min(batch_size, len(self.buffer)),
-            replace=False,
-            p=probabilities,
+        self.alpha = config.priority_alpha
+        self.beta = config.priority_beta
+        self.tree = SumTree(self.max_size)
+        self.features: np.ndarray | None = None
+        self.labels = np.zeros(self.max_size, dtype=np.float32)
+        self.size = 0
+        self.max_priority = 1.0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _allocate(self, feature_shape: tuple[int, ...]):
+        shape = (self.max_size, *feature_shape)
+        nbytes = int(np.prod(shape)) * np.dtype(np.float32).itemsize
+        if nbytes > self.config.replay_memmap_threshold_mb * 1024 * 1024:
+            path = Path(self.config.data_dir) / "replay_buffer_features.f32"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.features = np.memmap(path, dtype=np.float32, mode="w+", shape=shape)
+        else:
+            self.features = np.zeros(shape, dtype=np.float32)
+
+    def _weight(self, priorities: np.ndarray) -> np.ndarray:
+        return (np.abs(priorities) + 1e-6) ** self.alpha
+
+    def add(self, features: np.ndarray, label: bool, priority: float | None = None) -> int:
+        """Add sample with priority (default: the highest seen); returns its slot"""
+        if self.features is None:
+            self._allocate(np.shape(features))
+        if self.size < self.max_size:
+            slot = self.size
+            self.size += 1
+        else:
+            # Replace lowest priority sample
+            slot = self.tree.argmin()
+
+        priority = self.max_priority if priority is None else priority
+        self.max_priority = max(self.max_priority, priority)
+        self.features[slot] = features
+        self.labels[slot] = label
+        self.tree.update([slot], self._weight(np.array([priority])))
+        return slot
+
+    def add_batch(self, features: np.ndarray, labels: np.ndarray, priorities: np.ndarray) -> np.ndarray:
+        """Add many samples; free slots are filled in one vectorized write"""
+        features = np.asarray(features)
+        priorities = np.asarray(priorities, dtype=np.float64)
+        if self.features is None and len(features):
+            self._allocate(features.shape[1:])
+
+        n_free = min(len(features), self.max_size - self.size)
+        slots = np.arange(self.size, self.size + n_free)
+        if n_free:
+            self.features[slots] = features[:n_free]
+            self.labels[slots] = labels[:n_free]
+            self.tree.update(slots, self._weight(priorities[:n_free]))
+            self.size += n_free
+            self.max_priority = max(self.max_priority, float(priorities[:n_free].max()))
+
+        # Buffer full: each remaining sample evicts the current minimum
+        replaced = [
+            self.add(features[i], labels[i], float(priorities[i]))
+            for i in range(n_free, len(features))
+        ]
+        return np.concatenate([slots, np.asarray(replaced, dtype=np.int64)])
+
+    def sample_batch(self, batch_size: int, beta: float | None = None) -> ReplayBatch:
+        """Stratified proportional sample with importance-sampling weights"""
+        n = min(batch_size, self.size)
+        if n == 0:
+            return ReplayBatch(np.array([]), np.array([]), np.array([], dtype=np.int64), np.array([]))
+
+        # One draw per equal slice of the total keeps a batch spread out
+        total = self.tree.total
+        segment = total / n
+        targets = (np.arange(n) + np.random.random_sample(n)) * segment
+        indices = np.minimum(self.tree.find(np.minimum(targets, np.nextafter(total, 0))), self.size - 1)
+
+        beta = self.beta if beta is None else beta
+        probabilities = self.tree.leaves(indices) / total
+        min_probability = self.tree.min / total
+        weights = (probabilities / min_probability) ** -beta
+
+        return ReplayBatch(
+            features=self.features[indices],
+            labels=self.labels[indices],
+            indices=indices,
+            weights=weights.astype(np.float32),
         )
 
-        # Extract samples
-        X = np.array([self.buffer[i][0] for i in indices])
-        y = np.array([self.buffer[i][1] for i in indices])
-
-        return X, y
+    def sample(self, batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+        """Sample batch with priority weighting"""
+        batch = self.sample_batch(batch_size)
+        return batch.features, batch.labels
 
-    def update_priorities(self, indices: List[int], priorities: List[float]):
+    def update_priorities(self, indices: list[int], priorities: list[float]):
         """Update sample priorities based on training loss"""
-        for idx, priority in zip(indices, priorities):
-            if idx < len(self.buffer):
-                features, label, _ = self.buffer[idx]
-                self.buffer[idx] = (features, label, priority)
+        indices = np.asarray(indices, dtype=np.int64)
+        priorities = np.asarray(priorities, dtype=np.float64)
+        valid = indices < self.size
+        if valid.any():
+            self.tree.update(indices[valid], self._weight(priorities[valid]))
+            self.max_priority = max(self.max_priority, float(priorities[valid].max()))
 
 
 # ============================================================================
@@ -805,9 +958,9 @@ class PrioritizedReplayBuffer:
 class ClientUpdate:
     """Model update from a federated client"""
     client_id: str
-    weights: List[np.ndarray]
+    weights: list[np.ndarray]
     samples_count: int
-    metrics: Dict[str, float]
+    metrics: dict[str, float]
     timestamp: datetime
 
 
@@ -821,7 +974,7 @@ class FederatedLearningEngine:
     def __init__(self, config: ContinuousLearningConfig, global_model: keras.Model):
         self.config = config
         self.global_model = global_model
-        self.client_updates: List[ClientUpdate] = []
+        self.client_updates: list[ClientUpdate] = []
         self.round_number = 0
 
         # Statistics
@@ -831,7 +984,7 @@ class FederatedLearningEngine:
             "total_samples_learned": 0,
         }
 
-    def create_client_model(self) -> Dict:
+    def create_client_model(self) -> dict:
         """Create model config to send to client"""
         return {
             "weights": [w.tolist() for w in self.global_model.get_weights()],
@@ -892,7 +1045,7 @@ class FederatedLearningEngine:
 class ModelGenome:
     """Genetic representation of a model architecture"""
     id: str
-    layers: List[Dict]
+    layers: list[dict]
     fitness: float = 0.0
     generation: int = 0
 
@@ -911,12 +1064,12 @@ class NeuralArchitectureSearch:
     KERNEL_SIZES = [(1, 1), (3, 3), (5, 5), (7, 7)]
     DROPOUT_RATES = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
 
-    def __init__(self, config: ContinuousLearningConfig, input_shape: Tuple[int, int]):
+    def __init__(self, config: ContinuousLearningConfig, input_shape: tuple[int, int]):
         self.config = config
         self.input_shape = input_shape
-        self.population: List[ModelGenome] = []
+        self.population: list[ModelGenome] = []
         self.generation = 0
-        self.best_genome: Optional[ModelGenome] = None
+        self.best_genome: ModelGenome | None = None
 
     def initialize_population(self):
         """Create initial random population"""
@@ -974,7 +1127,7 @@ class NeuralArchitectureSearch:
 
         return keras.Model(inputs, outputs)
 
-    def _build_layer(self, x, config: Dict):
+    def _build_layer(self, x, config: dict):
         """Build a single layer from config"""
         layer_type = config["type"]
         activation = config.get("activation", "relu")
@@ -1142,7 +1295,7 @@ class NeuralArchitectureSearch:
             generation=self.generation + 1,
         )
 
-    def get_best_model(self) -> Optional[keras.Model]:
+    def get_best_model(self) -> keras.Model | None:
         """Get the best model found"""
         if self.best_genome:
             return self.build_model(self.best_genome)
@@ -1176,12 +1329,16 @@ class ContinuousLearningEngine:
         # Initialize components
         self.scenario_generator = InfiniteScenarioGenerator(self.config)
         self.replay_buffer = PrioritizedReplayBuffer(self.config)
+        self.pipeline = FeaturePipeline(self.config)
+        self.feature_store = ShardedFeatureStore(
+            str(Path(self.config.data_dir) / "features"), self.config.feature_shard_size,
+        )
 
         # Model will be set later
-        self.model: Optional[keras.Model] = None
-        self.active_learning: Optional[ActiveLearningEngine] = None
-        self.federated_learning: Optional[FederatedLearningEngine] = None
-        self.architecture_search: Optional[NeuralArchitectureSearch] = None
+        self.model: keras.Model | None = None
+        self.active_learning: ActiveLearningEngine | None = None
+        self.federated_learning: FederatedLearningEngine | None = None
+        self.architecture_search: NeuralArchitectureSearch | None = None
 
         # Input shape
         self.input_shape = self._calculate_input_shape()
@@ -1198,7 +1355,7 @@ class ContinuousLearningEngine:
         # State
         self.is_running = False
 
-    def _calculate_input_shape(self) -> Tuple[int, int]:
+    def _calculate_input_shape(self) -> tuple[int, int]:
         """Calculate input shape based on config"""
         samples = int(self.config.sample_rate * self.config.duration)
         n_frames = 1 + (samples - self.config.n_fft) // self.config.hop_length
@@ -1271,9 +1428,10 @@ class ContinuousLearningEngine:
                 scenarios = list(self.scenario_generator.generate(self.config.scenarios_per_batch))
                 self.stats["total_scenarios_processed"] += len(scenarios)
 
-                # 2. Extract features (would use actual TTS in production)
+                # 2. Synthesize, augment and extract features (process pool)
                 print("Processing scenarios...")
-                X_batch, y_batch = self._process_scenarios(scenarios)
+                batch = await self._process_scenarios(scenarios)
+                X_batch, y_batch = batch.features, batch.labels
 
                 # 3. Train on batch
                 if len(X_batch) > 0:
@@ -1292,15 +1450,12 @@ class ContinuousLearningEngine:
                     print(f"  Accuracy: {accuracy:.4f}")
 
                 # 4. Add to replay buffer
-                for x, y, s in zip(X_batch, y_batch, scenarios):
-                    priority = 1.0 + s.difficulty  # Harder samples get higher priority
-                    self.replay_buffer.add(x, y, priority)
+                priorities = 1.0 + batch.difficulty  # Harder samples get higher priority
+                self.replay_buffer.add_batch(X_batch, y_batch, priorities)
 
                 # 5. Replay training
-                if len(self.replay_buffer.buffer) >= self.config.batch_size:
-                    X_replay, y_replay = self.replay_buffer.sample(self.config.batch_size)
-                    if len(X_replay) > 0:
-                        self.model.fit(X_replay, y_replay, epochs=1, verbose=0)
+                if len(self.replay_buffer) >= self.config.batch_size:
+                    self._replay_step()
 
                 # 6. Check federated updates
                 if self.federated_learning.should_aggregate():
@@ -1330,42 +1485,45 @@ class ContinuousLearningEngine:
 
         except KeyboardInterrupt:
             print("\nStopping...")
+        finally:
+            self.pipeline.close()
 
         self.is_running = False
         self._save_checkpoint(epoch)
         print("\nContinuous learning complete!")
 
-    def _process_scenarios(self, scenarios: List[Scenario]) -> Tuple[np.ndarray, np.ndarray]:
-        """
-        Process scenarios into features.
-
-        In production, this would:
-        1. Generate audio using TTS
-        2. Apply augmentations
-        3. Extract mel spectrograms
-        """
-        # For now, generate synthetic features
-        X = []
-        y = []
+    def _replay_step(self):
+        """Train on a prioritized replay batch, then re-prioritize it by loss"""
+        batch = self.replay_buffer.sample_batch(self.config.batch_size)
+        if len(batch.indices) == 0:
+            return
 
-        for scenario in scenarios:
-            # Create synthetic mel spectrogram (in production, use real TTS)
-            features = np.random.randn(*self.input_shape) * 0.1
+        self.model.fit(batch.features, batch.labels, sample_weight=batch.weights, epochs=1, verbose=0)
 
-            # Add some structure based on scenario
-            if scenario.is_wake_word:
-                # Simulate wake word pattern
-                features[10:20, :] += 0.5
-                features[30:40, :] += 0.3
+        predictions = np.clip(self.model.predict(batch.features, verbose=0).reshape(-1), 1e-7, 1 - 1e-7)
+        losses = -(batch.labels * np.log(predictions) + (1 - batch.labels) * np.log(1 - predictions))
+        self.replay_buffer.update_priorities(batch.indices, losses)
 
-            # Apply difficulty-based noise
-            noise = np.random.randn(*self.input_shape) * scenario.difficulty * 0.5
-            features += noise
+    async def _process_scenarios(self, scenarios: list[Scenario]):
+        """
+        Process scenarios into features.
 
-            X.append(features)
-            y.append(1 if scenario.is_wake_word else 0)
+        Synthesis, augmentation and mel extraction run in the data
+        pipeline's worker processes; features are also appended to the
+        sharded feature store so replay_from_store() can train on them
+        again without regenerating audio. Scenarios that fail to render
+        are dropped from the returned FeatureChunk.
+        """
+        return await self.pipeline.process(scenarios, store=self.feature_store)
 
-        return np.array(X), np.array(y)
+    def replay_from_store(self, epochs: int = 1, chunk_rows: int = 4096):
+        """Train on every stored feature shard, reading memory-mapped features"""
+        for epoch in range(epochs):
+            rows = 0
+            for X, y in self.feature_store.iter_batches(chunk_rows):
+                self.model.fit(X, y, batch_size=self.config.batch_size, epochs=1, verbose=0)
+                rows += len(y)
+            print(f"  Store replay {epoch + 1}/{epochs}: {rows} samples")
 
     def _save_checkpoint(self, epoch: int):
         """Save model checkpoint"""
@@ -1380,6 +1538,8 @@ class ContinuousLearningEngine:
             json.dump({
                 **self.stats,
                 "generator_stats": self.scenario_generator.get_statistics(),
+                "pipeline_stats": self.pipeline.stats,
+                "stored_features": len(self.feature_store),
             }, f, indent=2, default=str)
 
         print(f"Checkpoint saved: {checkpoint_dir}")
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+KIAAN Wake Word Data Pipeline
+
+Streams training scenarios through audio synthesis, augmentation and
+mel feature extraction in parallel, and keeps the features on disk so
+later epochs replay them without regenerating audio.
+
+Stages:
+1. Scenario generation (main process - cheap)
+2. Clean speech: Edge TTS clips rendered once per voice/text/prosody and
+   cached on disk (audio_source="tts"), or procedural speech-like audio
+   rendered in the workers (audio_source="synthetic", no network)
+3. Augmentation + log-mel features in a process pool. Scenarios go out in
+   chunks of pipeline_chunk_size with at most pipeline_prefetch chunks in
+   flight, so memory stays bounded however many scenarios are streamed
+4. ShardedFeatureStore: fixed-size memory-mapped .npy shards plus an
+   index.json, appended as chunks complete
+
+Workers only run this module and audio_synthesizer (NumPy, SciPy,
+librosa); they never call into TensorFlow.
+
+Author: KIAAN Voice Team
+Version: 2.0.0
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import numpy as np
+from audio_synthesizer import AudioAugmenter, MelFeatureExtractor
+
+if TYPE_CHECKING:
+    from audio_synthesizer import AudioSynthesizer
+    from continuous_learning_engine import ContinuousLearningConfig, Scenario
+
+
+# ============================================================================
+# SHARDED FEATURE STORE
+# ============================================================================
+
+class ShardedFeatureStore:
+    """
+    Append-only feature store: fixed-size memory-mapped shards plus an index.
+
+    Each shard is three .npy files (features float32, labels int8,
+    difficulty float32) preallocated to shard_size rows; index.json records
+    the feature shape and how many rows of each shard are filled. Readers
+    memory-map shards, so replaying an epoch reads features straight from
+    the page cache.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root: str, shard_size: int = 4096):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.feature_shape: tuple[int, ...] | None = None
+        self.shards: list[dict] = []
+        self._open: dict[str, np.ndarray] | None = None
+
+        index_path = self.root / self.INDEX_FILE
+        if index_path.exists():
+            index = json.loads(index_path.read_text())
+            self.shard_size = index["shard_size"]
+            self.feature_shape = tuple(index["feature_shape"])
+            self.shards = index["shards"]
+
+    def __len__(self) -> int:
+        return sum(shard["count"] for shard in self.shards)
+
+    def _paths(self, name: str) -> dict[str, Path]:
+        return {part: self.root / f"{name}.{part}.npy" for part in ("features", "labels", "difficulty")}
+
+    def _open_shard(self, shard: dict, mode: str) -> dict[str, np.ndarray]:
+        paths = self._paths(shard["name"])
+        if mode == "w+":
+            return {
+                "features": np.lib.format.open_memmap(
+                    paths["features"], mode="w+", dtype=np.float32,
+                    shape=(self.shard_size, *self.feature_shape),
+                ),
+                "labels": np.lib.format.open_memmap(paths["labels"], mode="w+", dtype=np.int8, shape=(self.shard_size,)),
+                "difficulty": np.lib.format.open_memmap(paths["difficulty"], mode="w+", dtype=np.float32, shape=(self.shard_size,)),
+            }
+        return {part: np.load(path, mmap_mode=mode) for part, path in paths.items()}
+
+    def append(self, features: np.ndarray, labels: np.ndarray, difficulty: np.ndarray):
+        """Append rows, filling the last shard before starting a new one"""
+        if self.feature_shape is None:
+            self.feature_shape = tuple(features.shape[1:])
+        elif tuple(features.shape[1:]) != self.feature_shape:
+            raise ValueError(f"feature shape {features.shape[1:]} != store shape {self.feature_shape}")
+
+        written = 0
+        while written < len(features):
+            if not self.shards or self.shards[-1]["count"] >= self.shard_size:
+                self._close_open()
+                self.shards.append({"name": f"shard_{len(self.shards):05d}", "count": 0})
+                self._open = self._open_shard(self.shards[-1], "w+")
+            elif self._open is None:
+                self._open = self._open_shard(self.shards[-1], "r+")
+
+            shard = self.shards[-1]
+            n = min(len(features) - written, self.shard_size - shard["count"])
+            rows = slice(shard["count"], shard["count"] + n)
+            self._open["features"][rows] = features[written:written + n]
+            self._open["labels"][rows] = labels[written:written + n]
+            self._open["difficulty"][rows] = difficulty[written:written + n]
+            shard["count"] += n
+            written += n
+
+    def _close_open(self):
+        if self._open is not None:
+            for array in self._open.values():
+                array.flush()
+            self._open = None
+
+    def flush(self):
+        """Flush shard data, then atomically rewrite the index"""
+        self._close_open()
+        index = {
+            "shard_size": self.shard_size,
+            "feature_shape": list(self.feature_shape or ()),
+            "shards": self.shards,
+        }
+        tmp = self.root / (self.INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(index, indent=2))
+        os.replace(tmp, self.root / self.INDEX_FILE)
+
+    def read_shard(self, i: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Memory-mapped (features, labels, difficulty) of a shard's filled rows"""
+        count = self.shards[i]["count"]
+        arrays = self._open_shard(self.shards[i], "r")
+        return arrays["features"][:count], arrays["labels"][:count], arrays["difficulty"][:count]
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        shuffle: bool = True,
+        seed: int | None = None,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Batches over every stored row; shards and rows within a shard are shuffled"""
+        self._close_open()
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(self.shards)) if shuffle else range(len(self.shards))
+        for i in order:
+            features, labels, _ = self.read_shard(int(i))
+            rows = rng.permutation(len(labels)) if shuffle else np.arange(len(labels))
+            for start in range(0, len(rows), batch_size):
+                batch = np.sort(rows[start:start + batch_size])  # sorted reads stay sequential
+                yield np.asarray(features[batch]), np.asarray(labels[batch])
+
+
+# ============================================================================
+# WORKER SIDE
+# ============================================================================
+
+@dataclass
+class FeatureChunk:
+    """Features for one chunk of scenarios (failed scenarios are dropped)"""
+    features: np.ndarray  # (n, frames, mels) float32
+    labels: np.ndarray    # (n,) int8
+    difficulty: np.ndarray
+    ids: list[str]
+
+
+# Per-process augmenter and extractor, built by _init_worker
+_worker: dict = {}
+
+
+def _init_worker(settings: dict):
+    seed = settings["seed"] ^ os.getpid()
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    _worker["settings"] = settings
+    _worker["augmenter"] = AudioAugmenter(settings["sample_rate"])
+    # center=False gives 1 + (samples - n_fft) // hop frames, the engine's input shape
+    _worker["extractor"] = MelFeatureExtractor(
+        settings["sample_rate"], settings["n_mels"], settings["n_fft"], settings["hop_length"], center=False,
+    )
+
+
+def synthetic_speech(text: str, voice_id: str, sample_rate: int) -> np.ndarray:
+    """
+    Deterministic speech-like audio for a voice and text.
+
+    One voiced syllable per vowel group (harmonics of a per-voice pitch,
+    shaped by two formants picked from the vowel), with short noise bursts
+    for consonants. It stands in for TTS when running offline.
+    """
+    seed = int(hashlib.md5(f"{voice_id}|{text}".encode()).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
+    f0 = 90 + seed % 140
+    formants = {"a": (730, 1090), "e": (530, 1840), "i": (270, 2290), "o": (570, 840), "u": (300, 870), "y": (400, 1900)}
+
+    parts = [np.zeros(int(0.05 * sample_rate))]
+    vowels = [c for c in text.lower() if c in formants] or ["a"]
+    for vowel in vowels:
+        if rng.random() < 0.6:
+            parts.append(0.05 * rng.standard_normal(int(rng.uniform(0.02, 0.05) * sample_rate)))
+        n = int(rng.uniform(0.1, 0.2) * sample_rate)
+        t = np.arange(n) / sample_rate
+        pitch = f0 * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(2, 4) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        harmonics = np.arange(1, int(4000 / f0) + 1)
+        f1, f2 = formants[vowel]
+        gains = sum(1 / (1 + ((harmonics * f0 - f) / 120) ** 2) for f in (f1, f2)) / harmonics ** 0.5
+        voiced = np.sin(np.outer(phase, harmonics)) @ gains
+        parts.append(voiced * np.hanning(n) / (np.abs(voiced).max() + 1e-8))
+    parts.append(np.zeros(int(0.05 * sample_rate)))
+    return np.concatenate(parts).astype(np.float32)
+
+
+def render_chunk(payloads: list[dict]) -> FeatureChunk:
+    """Clean audio -> augmentation -> fixed-length clip -> log-mel, for a chunk"""
+    settings = _worker["settings"]
+    augmenter: AudioAugmenter = _worker["augmenter"]
+    target = int(settings["sample_rate"] * settings["duration"])
+
+    clips, labels, difficulty, ids = [], [], [], []
+    for payload in payloads:
+        try:
+            if payload.get("clean_path"):
+                audio = augmenter.load_audio(payload["clean_path"])
+            else:
+                audio = synthetic_speech(payload["text"], payload["voice_id"], settings["sample_rate"])
+            audio = augmenter.apply_scenario(audio, SimpleNamespace(**payload))
+        except Exception as e:
+            print(f"Render error for {payload['id']}: {e}")
+            continue
+        if len(audio) < target:
+            audio = np.pad(audio, (0, target - len(audio)))
+        clips.append(audio[:target])
+        labels.append(payload["is_wake_word"])
+        difficulty.append(payload["difficulty"])
+        ids.append(payload["id"])
+
+    if not clips:
+        frames = 1 + (target - settings["n_fft"]) // settings["hop_length"]
+        return FeatureChunk(
+            np.zeros((0, frames, settings["n_mels"]), dtype=np.float32),
+            np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.float32), [],
+        )
+    return FeatureChunk(
+        features=_worker["extractor"].extract(np.stack(clips).astype(np.float32)),
+        labels=np.asarray(labels, dtype=np.int8),
+        difficulty=np.asarray(difficulty, dtype=np.float32),
+        ids=ids,
+    )
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class FeaturePipeline:
+    """
+    Parallel scenario -> features pipeline with bounded prefetch.
+
+    stream() yields FeatureChunks as workers finish them; process()
+    collects a whole batch of scenarios into one chunk (and appends it to
+    a store).
+    """
+
+    def __init__(
+        self,
+        config: "ContinuousLearningConfig",
+        synthesizer: "AudioSynthesizer | None" = None,
+    ):
+        self.config = config
+        self.workers = config.pipeline_workers or os.cpu_count() or 1
+        self.chunk_size = config.pipeline_chunk_size
+        self.prefetch = config.pipeline_prefetch or 2 * self.workers
+        self.audio_source = config.audio_source
+        self.synthesizer = synthesizer
+        self._executor: ProcessPoolExecutor | None = None
+        self.settings = {
+            "sample_rate": config.sample_rate,
+            "duration": config.duration,
+            "n_mels": config.n_mels,
+            "n_fft": config.n_fft,
+            "hop_length": config.hop_length,
+            "seed": random.randrange(2 ** 31),
+        }
+
+        # Statistics
+        self.stats = {
+            "clips": 0,
+            "failed": 0,
+            "chunks": 0,
+            "tts_failed": 0,
+        }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork on Linux: workers start at once and never re-import the
+            # trainer (they only touch NumPy/SciPy/librosa, never TensorFlow).
+            # spawn elsewhere, which re-imports the launching script per worker.
+            method = "fork" if sys.platform.startswith("linux") else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker,
+                initargs=(self.settings,),
+            )
+        return self._executor
+
+    async def _payloads(self, scenarios: list["Scenario"]) -> list[dict]:
+        clean_paths: list[str | None] = [None] * len(scenarios)
+        if self.audio_source == "tts":
+            if self.synthesizer is None:
+                from audio_synthesizer import AudioSynthesizer
+                self.synthesizer = AudioSynthesizer(self.config)
+            semaphore = asyncio.Semaphore(self.config.max_concurrent_generations)
+
+            async def _render(scenario):
+                async with semaphore:
+                    return await self.synthesizer.render_clean(scenario)
+
+            clean_paths = await asyncio.gather(*(_render(s) for s in scenarios))
+
+        payloads = []
+        for scenario, clean_path in zip(scenarios, clean_paths, strict=True):
+            if self.audio_source == "tts" and clean_path is None:
+                self.stats["tts_failed"] += 1
+                continue
+            payloads.append({
+                "id": scenario.id,
+                "text": scenario.text,
+                "voice_id": scenario.voice.id,
+                "is_wake_word": scenario.is_wake_word,
+                "difficulty": scenario.difficulty,
+                "background_noise_type": scenario.background_noise_type,
+                "snr_db": scenario.snr_db,
+                "reverb_level": scenario.reverb_level,
+                "pitch_shift": scenario.pitch_shift,
+                "speed_factor": scenario.speed_factor,
+                "volume": scenario.volume,
+                "distance_meters": scenario.distance_meters,
+                "microphone_type": scenario.microphone_type,
+                "clean_path": clean_path,
+            })
+        return payloads
+
+    async def stream(self, scenarios: Iterable["Scenario"]) -> AsyncIterator[FeatureChunk]:
+        """Yield feature chunks in completion order, prefetch-bounded"""
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        source = iter(scenarios)
+        pending = set()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < self.prefetch:
+                chunk = list(islice(source, self.chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                payloads = await self._payloads(chunk)
+                if payloads:
+                    pending.add(loop.run_in_executor(pool, render_chunk, payloads))
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                result: FeatureChunk = future.result()
+                self.stats["chunks"] += 1
+                self.stats["clips"] += len(result.ids)
+                yield result
+
+    async def process(
+        self,
+        scenarios: Iterable["Scenario"],
+        store: ShardedFeatureStore | None = None,
+    ) -> FeatureChunk:
+        """Render every scenario into one FeatureChunk, appending it to ``store``"""
+        scenarios = list(scenarios)
+        chunks = []
+        async for chunk in self.stream(scenarios):
+            chunks.append(chunk)
+            if store is not None:
+                store.append(chunk.features, chunk.labels, chunk.difficulty)
+        if store is not None and chunks:
+            store.flush()
+
+        result = FeatureChunk(
+            features=np.concatenate([c.features for c in chunks]) if chunks else np.zeros((0,), dtype=np.float32),
+            labels=np.concatenate([c.labels for c in chunks]) if chunks else np.zeros(0, dtype=np.int8),
+            difficulty=np.concatenate([c.difficulty for c in chunks]) if chunks else np.zeros(0, dtype=np.float32),
+            ids=[i for c in chunks for i in c.ids],
+        )
+        self.stats["failed"] += len(scenarios) - len(result.ids)
+        return result
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
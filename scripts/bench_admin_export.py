@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Admin Export Memory Benchmark.
+
+Seeds --users synthetic users into a SQLite database, then calls the
+/api/admin/export/users route function directly and drains its streaming
+response, discarding the bytes. Each format runs in a fresh subprocess so
+the reported peak RSS (ru_maxrss) belongs to that export alone; the RSS
+before the call is reported too, so the growth caused by the export is
+visible.
+
+Route arguments the checked-out route does not accept are left out, so
+the script also runs against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_admin_export.py [--users 1000000] [--formats csv,json]
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _seed(db_path: str, n_users: int) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.models import User
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    User.__table__.create(engine)
+    now = datetime.now(UTC)
+    with engine.begin() as conn:
+        for start in range(0, n_users, 50_000):
+            conn.execute(User.__table__.insert(), [
+                {
+                    "id": f"user-{i:08d}",
+                    "auth_uid": f"auth-{i:08d}",
+                    "email": f"user{i}@example.com",
+                    "locale": "en",
+                    "email_verified": False,
+                    "is_onboarded": True,
+                    "failed_login_attempts": 0,
+                    "created_at": now - timedelta(seconds=i),
+                }
+                for i in range(start, min(start + 50_000, n_users))
+            ])
+    engine.dispose()
+
+
+async def _export(db_path: str, fmt: str) -> dict:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.routes.admin import export
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    request = MagicMock(client=SimpleNamespace(host="127.0.0.1"), headers={})
+    admin = SimpleNamespace(admin=SimpleNamespace(id="bench-admin"))
+    accepted = inspect.signature(export.export_users).parameters
+    kwargs = {
+        "request": request, "format": fmt, "gzip": False, "mode": "stream",
+        "include_subscription": False, "admin": admin, "_": None,
+    }
+    kwargs = {k: v for k, v in kwargs.items() if k in accepted}
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    n_bytes = 0
+    with patch.object(export, "create_audit_log", AsyncMock()), \
+            patch("backend.deps.SessionLocal", session_maker):
+        async with session_maker() as db:
+            response = await export.export_users(db=db, **kwargs)
+            async for chunk in response.body_iterator:
+                n_bytes += len(chunk.encode() if isinstance(chunk, str) else chunk)
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return {
+        "format": fmt,
+        "bytes": n_bytes,
+        "seconds": elapsed,
+        "rss_before_mb": rss_before,
+        "rss_peak_mb": _rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--formats", default="csv,json")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_export(*args.child))))
+        return
+
+    print("=" * 70)
+    print("Admin Export Memory Benchmark")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "export.sqlite")
+        started = time.perf_counter()
+        _seed(db_path, args.users)
+        print(f"Seeded {args.users:,} users in {time.perf_counter() - started:.1f}s")
+        print()
+        print(f"{'format':<8} {'MB out':>10} {'seconds':>10} {'RSS before':>12} {'peak RSS':>10} {'growth':>10}")
+        for fmt in args.formats.split(","):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", db_path, fmt],
+                cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{fmt:<8} {r['bytes'] / 1e6:>10.1f} {r['seconds']:>10.1f} "
+                f"{r['rss_before_mb']:>10.0f}MB {r['rss_peak_mb']:>8.0f}MB "
+                f"{r['rss_peak_mb'] - r['rss_before_mb']:>8.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Admin List Pagination Benchmark.
+
+Seeds --users synthetic users (and one KIAAN usage row per user) into a
+SQLite database created from the checked-out models, then times the
+/api/admin/users list route for page 1 and page --deep-page, and the
+/api/admin/kiaan/quota-usage dashboard. Each call is repeated --repeat
+times; p50 and max latency are reported.
+
+When the checked-out tree has cursor pagination, page --deep-page is also
+fetched the way a client reaches it: with the cursor of the previous page.
+Route arguments the checked-out route does not accept are left out, so the
+script also runs against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_admin_pagination.py [--users 1000000] [--deep-page 5000]
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _seed(db_path: str, n_users: int) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.models import SubscriptionPlan, UsageTracking, User, UserSubscription
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    for model in (User, SubscriptionPlan, UserSubscription, UsageTracking):
+        model.__table__.create(engine)
+    now = datetime.now(UTC)
+    period = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    limits = (5, 5, 5, 50, 300, -1)
+    with engine.begin() as conn:
+        for start in range(0, n_users, 50_000):
+            batch = range(start, min(start + 50_000, n_users))
+            conn.execute(User.__table__.insert(), [
+                {
+                    "id": f"user-{i:08d}",
+                    "auth_uid": f"auth-{i:08d}",
+                    "email": f"user{i}@example.com",
+                    "locale": "en",
+                    "email_verified": False,
+                    "is_onboarded": True,
+                    "failed_login_attempts": 0,
+                    "created_at": now - timedelta(seconds=i // 3),
+                }
+                for i in batch
+            ])
+            conn.execute(UsageTracking.__table__.insert(), [
+                {
+                    "user_id": f"user-{i:08d}",
+                    "feature": "kiaan_questions",
+                    "period_start": period,
+                    "period_end": period + timedelta(days=30),
+                    "usage_count": i % 7,
+                    "usage_limit": limits[i % len(limits)],
+                }
+                for i in batch
+            ])
+    engine.dispose()
+
+
+async def _timed(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+async def _run(db_path: str, deep_page: int, page_size: int, repeat: int) -> None:
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.models import User
+    from backend.routes.admin import kiaan_analytics, users
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    db = async_sessionmaker(engine, expire_on_commit=False)()
+    accepted = inspect.signature(users.list_users).parameters
+    base = {
+        "request": MagicMock(), "page_size": page_size, "cursor": None, "search": None,
+        "suspended": None, "has_subscription": None, "include_details": False,
+        "sort_by": "created_at", "sort_order": "desc",
+        "admin": SimpleNamespace(), "_": None, "db": db,
+    }
+
+    def list_page(**overrides):
+        kwargs = {k: v for k, v in {**base, **overrides}.items() if k in accepted}
+        return lambda: users.list_users(**kwargs)
+
+    cases = [
+        ("users page 1", list_page(page=1)),
+        (f"users page {deep_page} (page=)", list_page(page=deep_page)),
+    ]
+    if "cursor" in accepted:
+        from backend.services.admin_pagination import encode_cursor
+
+        last = (await db.execute(
+            select(User.created_at, User.id)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .offset((deep_page - 1) * page_size - 1).limit(1)
+        )).one()
+        cursor = encode_cursor(last)
+        first = await list_page(page=deep_page, cursor=cursor)()
+        expected = await list_page(page=deep_page)()
+        assert [u.id for u in first.users] == [u.id for u in expected.users]
+        cases.append((f"users page {deep_page} (cursor)", list_page(page=deep_page, cursor=cursor)))
+        cases.append(("users page 1 + details", list_page(page=1, include_details=True)))
+    cases.append((
+        "kiaan quota usage",
+        lambda: kiaan_analytics.get_kiaan_quota_usage(
+            request=MagicMock(), admin=SimpleNamespace(), _=None, db=db
+        ),
+    ))
+
+    print(f"{'call':<32} {'p50 ms':>10} {'max ms':>10}")
+    for name, fn in cases:
+        p50, worst = await _timed(fn, repeat)
+        print(f"{name:<32} {p50:>10.2f} {worst:>10.2f}")
+
+    await db.close()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--deep-page", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Admin List Pagination Benchmark")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "admin.sqlite")
+        started = time.perf_counter()
+        _seed(db_path, args.users)
+        print(f"Seeded {args.users:,} users in {time.perf_counter() - started:.1f}s")
+        print()
+        asyncio.run(_run(db_path, args.deep_page, args.page_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
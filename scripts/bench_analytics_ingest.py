@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Analytics Event Ingestion Benchmark.
+
+Serves a minimal FastAPI endpoint that records one SimpleAnalytics event
+per request on its request session, against a SQLite database, and sends
+concurrent requests. Reports request p50 / p95 latency and events/second
+(including the time to drain the writer's queue). It runs once with
+track_event() writing directly and, if the analytics writer exists, once
+with it running.
+
+A second section seeds the events table and times get_daily_stats().
+
+Only public entry points are used, so the same script can be run against
+an older checkout for comparison.
+
+Usage:
+    python scripts/bench_analytics_ingest.py [--requests 5000] [--concurrency 20] [--seed-events 200000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_SCHEMA = (
+    """CREATE TABLE analytics_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, event_type VARCHAR(100) NOT NULL,
+        user_id VARCHAR(255), metadata JSON, created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)""",
+    "CREATE INDEX idx_analytics_created ON analytics_events(created_at)",
+    """CREATE TABLE analytics_event_rollups (
+        granularity VARCHAR(8) NOT NULL, bucket_start TIMESTAMP NOT NULL, event_type VARCHAR(100) NOT NULL,
+        count BIGINT NOT NULL DEFAULT 0, updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (granularity, bucket_start, event_type))""",
+)
+_EVENT_TYPES = ("chat_message_sent", "mood_logged", "journal_entry_created", "verse_viewed", "login")
+
+
+async def _engine(tmp: str, name: str):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/{name}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        for ddl in _SCHEMA:
+            await conn.execute(text(ddl))
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _ingest(tmp: str, buffered: bool, n_requests: int, concurrency: int) -> None:
+    from fastapi import Depends, FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from backend.analytics import simple_tracker
+    from backend.analytics.simple_tracker import SimpleAnalytics
+
+    engine, session_maker = await _engine(tmp, f"ingest-{buffered}.sqlite")
+
+    async def _db():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+
+    @app.post("/event")
+    async def event(db: AsyncSession = Depends(_db)):
+        await SimpleAnalytics.track_event(db, "chat_message_sent", "user-1", {"length": 42})
+        return {"ok": True}
+
+    writer = simple_tracker.get_analytics_writer() if buffered else None
+    if writer is not None:
+        writer.spill_path = f"{tmp}/spill.jsonl"
+        await writer.start(session_maker)
+
+    timings = []
+
+    async def send(client):
+        start = time.perf_counter()
+        response = await client.post("/event")
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(0, n_requests, concurrency):
+            await asyncio.gather(*(send(client) for _ in range(min(concurrency, n_requests - i))))
+        if writer is not None:
+            await writer.stop()
+        elapsed = time.perf_counter() - start
+
+    async with session_maker() as db:
+        stored = (await db.execute(text("SELECT COUNT(*) FROM analytics_events"))).scalar_one()
+    await engine.dispose()
+
+    timings.sort()
+    label = "background writer" if buffered else "direct insert"
+    print(f"{label:<20} {statistics.median(timings):>9.3f} {timings[int(len(timings) * 0.95) - 1]:>9.3f} "
+          f"{stored / elapsed:>10.0f} {stored:>10}")
+
+
+async def _dashboard(tmp: str, n_events: int, n_queries: int) -> None:
+    from sqlalchemy import text
+
+    from backend.analytics.simple_tracker import SimpleAnalytics
+
+    engine, session_maker = await _engine(tmp, "dashboard.sqlite")
+    rng = random.Random(3)
+    now = datetime.now(UTC).replace(tzinfo=None)
+    rows = [
+        {"event_type": rng.choice(_EVENT_TYPES), "user_id": f"user-{rng.randrange(1000)}",
+         "metadata": json.dumps({"n": i}), "created_at": now - timedelta(seconds=rng.randrange(30 * 86400))}
+        for i in range(n_events)
+    ]
+    async with session_maker() as db:
+        await db.execute(text(
+            "INSERT INTO analytics_events (event_type, user_id, metadata, created_at) "
+            "VALUES (:event_type, :user_id, :metadata, :created_at)"
+        ), rows)
+        await db.commit()
+        if hasattr(SimpleAnalytics, "rebuild_rollups"):
+            await SimpleAnalytics.rebuild_rollups(db)
+
+        timings = []
+        for _ in range(n_queries):
+            start = time.perf_counter()
+            stats = await SimpleAnalytics.get_daily_stats(db, days=7)
+            timings.append((time.perf_counter() - start) * 1000)
+    await engine.dispose()
+
+    timings.sort()
+    print(f"\nget_daily_stats(days=7) over {n_events} events ({len(stats)} rows)")
+    print(f"{'p50 ms':>10} {'p95 ms':>10}")
+    print(f"{statistics.median(timings):>10.3f} {timings[int(len(timings) * 0.95) - 1]:>10.3f}")
+
+
+async def main(n_requests: int, concurrency: int, n_seed: int) -> None:
+    from backend.analytics import simple_tracker
+
+    print("=" * 70)
+    print("ANALYTICS EVENT INGESTION BENCHMARK")
+    print("=" * 70)
+    print(f"requests={n_requests}, concurrency={concurrency}")
+    print(f"\n{'':<20} {'p50 ms':>9} {'p95 ms':>9} {'events/s':>10} {'stored':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await _ingest(tmp, False, n_requests, concurrency)
+        if hasattr(simple_tracker, "get_analytics_writer"):
+            await _ingest(tmp, True, n_requests, concurrency)
+        await _dashboard(tmp, n_seed, 50)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed-events", type=int, default=200000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.seed_events))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Chat Room Fan-out Benchmark.
+
+Measures how long a broadcast takes to reach every healthy member of a
+large room when some members are slow mobile clients, comparing the old
+sequential ``send_json`` loop with the queued per-connection writers.
+A second manager (another "instance") receives the same broadcasts via
+the ``chat:room:*`` pattern subscription over a fakeredis stand-in.
+
+Usage:
+    python scripts/bench_chat_fanout.py [--members 500] [--slow 25] [--messages 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fakeredis.aioredis
+
+from backend.cache.redis_cache import RedisCache
+from backend.routes.chat_rooms import DistributedConnectionManager
+
+SLOW_DELAY_SECONDS = 0.05
+
+
+class _BenchSocket:
+    def __init__(self, slow: bool, arrivals: dict[int, list[float]]) -> None:
+        self.slow = slow
+        self._arrivals = arrivals
+
+    async def accept(self) -> None:
+        return None
+
+    async def _deliver(self, seq: int) -> None:
+        if self.slow:
+            await asyncio.sleep(SLOW_DELAY_SECONDS)
+        else:
+            await asyncio.sleep(0)
+            self._arrivals.setdefault(seq, []).append(time.perf_counter())
+
+    async def send_json(self, payload: dict) -> None:
+        await self._deliver(payload["seq"])
+
+    async def send_text(self, text: str) -> None:
+        # '{"seq":N,...' — parse just the sequence number
+        await self._deliver(int(text[7:text.index(",")]))
+
+    async def close(self, code: int = 1000) -> None:  # noqa: ARG002
+        return None
+
+
+async def _legacy_send(sockets, payload) -> None:
+    """The previous _send_to_local: await each socket in turn."""
+    for ws in sockets:
+        await ws.send_json(payload)
+
+
+def _manager(instance_id: str, redis: RedisCache) -> DistributedConnectionManager:
+    manager = DistributedConnectionManager()
+    manager._instance_id = instance_id
+
+    async def _get_redis():
+        return redis
+
+    manager._get_redis = _get_redis
+    return manager
+
+
+async def _run(mode: str, members: int, slow: int, messages: int) -> dict:
+    cache = RedisCache()
+    cache._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache._connected = True
+
+    local_arrivals: dict[int, list[float]] = {}
+    remote_arrivals: dict[int, list[float]] = {}
+    local = [_BenchSocket(i < slow, local_arrivals) for i in range(members)]
+    remote = [_BenchSocket(False, remote_arrivals) for _ in range(members)]
+
+    sender = _manager("instance-a", cache)
+    receiver = _manager("instance-b", cache)
+    for i, ws in enumerate(local):
+        await sender.connect("room", ws, f"u{i}")
+    for i, ws in enumerate(remote):
+        await receiver.connect("room", ws, f"r{i}")
+    await asyncio.sleep(0.05)
+
+    healthy = members - slow
+    local_ms, remote_ms, call_ms = [], [], []
+    for seq in range(messages):
+        payload = {"seq": seq, "type": "message", "content": "x" * 200}
+        start = time.perf_counter()
+        if mode == "sequential":
+            await _legacy_send(local, payload)
+        else:
+            await sender.broadcast("room", payload)
+        call_ms.append((time.perf_counter() - start) * 1000)
+
+        deadline = time.perf_counter() + 30
+        while len(local_arrivals.get(seq, ())) < healthy or (
+            mode == "queued" and len(remote_arrivals.get(seq, ())) < members
+        ):
+            if time.perf_counter() > deadline:
+                break
+            await asyncio.sleep(0.001)
+        local_ms.append((max(local_arrivals[seq]) - start) * 1000)
+        if mode == "queued":
+            remote_ms.append((max(remote_arrivals[seq]) - start) * 1000)
+
+    for ws in local:
+        sender.disconnect("room", ws)
+    for ws in remote:
+        receiver.disconnect("room", ws)
+    await asyncio.sleep(0.01)
+    return {
+        "call_ms": statistics.median(call_ms),
+        "local_ms": statistics.median(local_ms),
+        "remote_ms": statistics.median(remote_ms) if remote_ms else None,
+    }
+
+
+async def main(members: int, slow: int, messages: int) -> None:
+    print("=" * 70)
+    print("CHAT ROOM FAN-OUT BENCHMARK")
+    print("=" * 70)
+    print(
+        f"members={members} slow={slow} (each {SLOW_DELAY_SECONDS * 1000:.0f} ms/frame) "
+        f"messages={messages}"
+    )
+    print(f"\n{'mode':<11} {'broadcast p50':>14} {'all healthy p50':>16} {'remote inst p50':>16}")
+    for mode in ("sequential", "queued"):
+        stats = await _run(mode, members, slow, messages)
+        remote = f"{stats['remote_ms']:.2f}" if stats["remote_ms"] is not None else "n/a"
+        print(
+            f"{mode:<11} {stats['call_ms']:>11.2f} ms {stats['local_ms']:>13.2f} ms "
+            f"{remote:>13} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=25)
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.slow, args.messages))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Chat Message Entitlement Query Benchmark.
+
+Serves the real /api/chat router against a SQLite database with seeded
+plans, users and subscriptions, and sends authenticated POST
+/api/chat/message requests. The AI provider call (kiaan_core) is replaced
+by a canned reply so only the request's own database work is measured.
+Reports p50 latency and SQL statements per request: the subscription
+gate (users / plans / subscriptions), usage tracking, and everything else
+(chat history persistence).
+
+A second section times stacked feature gates (KiaanQuotaRequired +
+FeatureRequired + JournalAccessRequired on one request), as routes that
+combine several dependencies do.
+
+Only public entry points are used, so the same script can be run against
+an older checkout for comparison.
+
+Usage:
+    python scripts/bench_entitlement_cache.py [--users 100] [--requests 1000]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_GATE_TABLES = ("users", "subscription_plans", "user_subscriptions")
+
+_REPLY = {
+    "response": "Breathe, and return to the work in front of you.",
+    "verses_used": [],
+    "validation": {"valid": True, "errors": []},
+    "context": "general",
+    "provider": "bench",
+    "conversational": True,
+}
+
+
+async def _seed(session_maker, n_users: int) -> list[str]:
+    from backend.models import (
+        SubscriptionPlan,
+        SubscriptionStatus,
+        SubscriptionTier,
+        User,
+        UserSubscription,
+    )
+
+    async with session_maker() as db:
+        plans = [
+            SubscriptionPlan(tier=tier, name=tier.value, price_monthly=Decimal("1.00"),
+                             kiaan_questions_monthly=100000, encrypted_journal=True, data_retention_days=30)
+            for tier in (SubscriptionTier.BHAKTA, SubscriptionTier.SADHAK)
+        ]
+        users = [User(auth_uid=f"bench-{i}", email=f"bench-{i}@example.com", hashed_password="x")
+                 for i in range(n_users)]
+        db.add_all(plans + users)
+        await db.commit()
+        now = datetime.now(UTC)
+        db.add_all([
+            UserSubscription(user_id=u.id, plan_id=plans[i % 2].id, status=SubscriptionStatus.ACTIVE,
+                             current_period_start=now, current_period_end=now + timedelta(days=30))
+            for i, u in enumerate(users)
+        ])
+        await db.commit()
+        return [u.id for u in users]
+
+
+async def main(n_users: int, n_requests: int) -> None:
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.deps import get_db
+    from backend.middleware.feature_access import (
+        FeatureRequired,
+        JournalAccessRequired,
+        KiaanQuotaRequired,
+    )
+    from backend.middleware.rate_limiter import limiter
+    from backend.models import (
+        KiaanChatMessage,
+        SubscriptionPlan,
+        UsageTracking,
+        User,
+        UserSubscription,
+    )
+    from backend.routes.chat import router as chat_router
+    from backend.security.jwt import create_access_token
+    from backend.services.kiaan_core import kiaan_core
+
+    print("=" * 70)
+    print("CHAT MESSAGE ENTITLEMENT QUERY BENCHMARK")
+    print("=" * 70)
+
+    limiter.enabled = False
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.sqlite")
+        async with engine.begin() as conn:
+            for model in (User, SubscriptionPlan, UserSubscription, UsageTracking, KiaanChatMessage):
+                await conn.run_sync(model.__table__.create)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        user_ids = await _seed(session_maker, n_users)
+
+        statements: list[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+
+        async def _db():
+            async with session_maker() as session:
+                yield session
+
+        app = FastAPI()
+        app.include_router(chat_router)
+        app.dependency_overrides[get_db] = _db
+
+        rng = random.Random(5)
+        tokens = {uid: create_access_token(uid, f"s-{uid}") for uid in user_ids}
+        timings, gate_queries, usage_queries, other_queries = [], 0, 0, 0
+        with patch.object(kiaan_core, "get_kiaan_response", AsyncMock(return_value=_REPLY)):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                for _ in range(n_requests):
+                    uid = rng.choice(user_ids)
+                    statements.clear()
+                    start = time.perf_counter()
+                    response = await client.post(
+                        "/api/chat/message", json={"message": "I feel stuck at work"},
+                        headers={"Authorization": f"Bearer {tokens[uid]}"},
+                    )
+                    timings.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200 and "quota_exceeded" not in response.text, response.text
+                    for sql in statements:
+                        head = sql.split("WHERE")[0]
+                        if "usage_tracking" in head:
+                            usage_queries += 1
+                        elif any(t in head for t in _GATE_TABLES):
+                            gate_queries += 1
+                        else:
+                            other_queries += 1
+
+        timings.sort()
+        print(f"users={n_users}, requests={n_requests}")
+        print("\nPOST /api/chat/message")
+        print(f"{'p50 ms':>10} {'p95 ms':>10} {'gate SQL/req':>14} {'usage SQL/req':>15} {'other SQL/req':>15}")
+        print(f"{statistics.median(timings):>10.3f} {timings[int(len(timings) * 0.95) - 1]:>10.3f} "
+              f"{gate_queries / n_requests:>14.2f} {usage_queries / n_requests:>15.2f} "
+              f"{other_queries / n_requests:>15.2f}")
+
+        gates = [KiaanQuotaRequired(), FeatureRequired("advanced_analytics"), JournalAccessRequired()]
+        timings = []
+        statements.clear()
+        async with session_maker() as db:
+            for _ in range(n_requests):
+                request = SimpleNamespace(state=SimpleNamespace(user_id=rng.choice(user_ids)),
+                                          headers={}, cookies={})
+                start = time.perf_counter()
+                for gate in gates:
+                    # FeatureRequired denies Bhakta users; the lookup still counts
+                    with contextlib.suppress(Exception):
+                        await gate(request, db)
+                timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print("\nStacked gates (quota + feature + journal) on one request")
+        print(f"{'p50 ms':>10} {'p95 ms':>10} {'SQL/req':>14}")
+        print(f"{statistics.median(timings):>10.3f} {timings[int(len(timings) * 0.95) - 1]:>10.3f} "
+              f"{len(statements) / n_requests:>14.2f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.requests))
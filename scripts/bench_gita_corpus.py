@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Gita Corpus Memory Benchmark.
+
+Starts fresh worker processes that bring up the verse-consuming services
+(gita_wisdom_retrieval, GitaWisdomFilter, the auto-enricher's
+OpenSourceGitaFetcher, WisdomKnowledgeBase and WisdomCore) against a
+SQLite database seeded with the 701 verses, and reports per-worker RSS
+growth and startup time, then median latency of the keyword searches.
+With --fork the corpus is loaded once in a parent that forks the workers,
+and the proportional set size (PSS) of each worker is reported as well.
+
+Only the services' public entry points are used, so the same script can be
+run against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_gita_corpus.py [--workers 4] [--queries 200] [--fork]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psutil
+
+QUERIES = [
+    "I feel anxious about my exam results", "my partner gets angry at me", "how do I let go of attachment",
+    "grief after losing my father", "stress at work and deadlines", "I am jealous of my friend",
+    "finding my duty and purpose", "peace of mind and meditation",
+]
+
+
+def _seed(path: str) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.models.wisdom import GitaVerse
+
+    verses = json.loads((Path(__file__).parent.parent / "data" / "gita" / "gita_verses_complete.json").read_text())
+    engine = create_engine(f"sqlite:///{path}")
+    GitaVerse.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(GitaVerse.__table__.insert(), [
+            {
+                "chapter": v["chapter"], "verse": v["verse"], "sanskrit": v["sanskrit"],
+                "transliteration": v["transliteration"], "hindi": v["hindi"], "english": v["english"],
+                "principle": v["principle"], "theme": v["theme"],
+                "mental_health_applications": v["mental_health_applications"],
+                "primary_domain": (v["mental_health_applications"] or [None])[0],
+            }
+            for v in verses
+        ])
+    engine.dispose()
+
+
+async def _start_services(db_path: str):
+    """Bring every verse consumer up the way a worker does at startup."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from backend.services import gita_wisdom_retrieval
+    from backend.services.gita_corpus import get_db_gita_corpus
+    from backend.services.gita_wisdom_auto_enricher import OpenSourceGitaFetcher
+    from backend.services.gita_wisdom_filter import GitaWisdomFilter
+    from backend.services.wisdom_core import get_wisdom_core
+    from backend.services.wisdom_kb import WisdomKnowledgeBase
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    fetcher = OpenSourceGitaFetcher()
+    await fetcher.load_local_corpus()
+    wisdom_filter = GitaWisdomFilter()
+    async with AsyncSession(engine) as db:
+        kb = WisdomKnowledgeBase()
+        await kb.get_all_verses(db)
+        core = get_wisdom_core()
+        await get_db_gita_corpus(db)
+    return engine, gita_wisdom_retrieval, wisdom_filter, core, fetcher
+
+
+def _median_ms(fn, args) -> float:
+    timings = []
+    for a in args:
+        start = time.perf_counter()
+        fn(a)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def _worker(db_path: str, n_queries: int) -> dict:
+    import backend.models  # noqa: F401  (shared baseline for every variant)
+    from backend.services.gita_wisdom_filter import WisdomTool
+
+    gc.collect()
+    proc = psutil.Process()
+    rss0 = proc.memory_info().rss
+    start = time.perf_counter()
+    engine, retrieval, wisdom_filter, core, _ = await _start_services(db_path)
+    startup = time.perf_counter() - start
+    gc.collect()
+    rss = proc.memory_info().rss - rss0
+
+    queries = (QUERIES * (n_queries // len(QUERIES) + 1))[:n_queries]
+    search_ms = _median_ms(lambda q: retrieval.search_gita_verses(q, tool="general"), queries)
+    filter_ms = _median_ms(lambda q: wisdom_filter._search_verses(q, WisdomTool.GENERAL), queries)
+    from sqlalchemy.ext.asyncio import AsyncSession
+    async with AsyncSession(engine) as db:
+        timings = []
+        for q in queries[:50]:
+            t = time.perf_counter()
+            await core.search(db, q, include_learned=False)
+            timings.append((time.perf_counter() - t) * 1000)
+    await engine.dispose()
+    return {"rss": rss, "startup": startup, "search_ms": search_ms, "filter_ms": filter_ms,
+            "core_ms": statistics.median(timings)}
+
+
+def _forked(db_path: str, workers: int) -> list[dict]:
+    """Load in the parent, fork workers, and read their PSS after touching the corpus."""
+    import backend.models  # noqa: F401
+    from backend.services.gita_wisdom_filter import WisdomTool
+
+    loop = asyncio.new_event_loop()
+    engine, retrieval, wisdom_filter, core, _ = loop.run_until_complete(_start_services(db_path))
+    loop.run_until_complete(engine.dispose())
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    # Workers measure only once all of them are alive, so PSS splits shared pages N+1 ways
+    go_read, go_write = os.pipe()
+    done_read, done_write = os.pipe()
+    children = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for q in QUERIES:
+                retrieval.search_gita_verses(q)
+                wisdom_filter._search_verses(q, WisdomTool.GENERAL)
+            gc.collect()
+            os.read(go_read, 1)
+            info = psutil.Process().memory_full_info()
+            os.write(write_fd, json.dumps({"rss": info.rss, "pss": info.pss, "uss": info.uss}).encode())
+            os.read(done_read, 1)
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    os.write(go_write, b"x" * workers)
+    results = []
+    for _, read_fd in children:
+        results.append(json.loads(os.read(read_fd, 4096)))
+        os.close(read_fd)
+    os.write(done_write, b"x" * workers)
+    for pid, _ in children:
+        os.waitpid(pid, 0)
+    return results
+
+
+def main(workers: int, n_queries: int, fork: bool) -> None:
+    print("=" * 70)
+    print("GITA CORPUS MEMORY BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = f"{tmp}/gita.sqlite"
+        _seed(db_path)
+
+        runs = []
+        for _ in range(workers):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", db_path, "--queries", str(n_queries)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+
+        print(f"workers={workers} (fresh interpreters), queries={n_queries}")
+        print(f"\n{'metric':<44} {'median':>10} {'min':>10} {'max':>10}")
+        for key, label, scale, fmt in [
+            ("rss", "RSS growth after service startup (MB)", 1e6, ".1f"),
+            ("startup", "service startup (ms)", 1e-3, ".0f"),
+            ("search_ms", "search_gita_verses (ms)", 1, ".3f"),
+            ("filter_ms", "GitaWisdomFilter._search_verses (ms)", 1, ".3f"),
+            ("core_ms", "WisdomCore.search, Gita only (ms)", 1, ".3f"),
+        ]:
+            values = [r[key] / scale for r in runs]
+            print(f"{label:<44} {statistics.median(values):>10{fmt}} {min(values):>10{fmt}} {max(values):>10{fmt}}")
+
+        if fork:
+            forked = _forked(db_path, workers)
+            print(f"\nforked workers (corpus loaded in the parent, gc.freeze): "
+                  f"RSS {statistics.median(r['rss'] for r in forked) / 1e6:.1f} MB, "
+                  f"PSS {statistics.median(r['pss'] for r in forked) / 1e6:.1f} MB, "
+                  f"USS {statistics.median(r['uss'] for r in forked) / 1e6:.1f} MB (median per worker)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--fork", action="store_true", help="also measure workers forked from a loaded parent")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(_worker(args.child, args.queries))))
+    else:
+        main(args.workers, args.queries, args.fork)
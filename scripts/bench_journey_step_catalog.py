@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Journey Step Catalog Benchmark.
+
+Measures GET /api/journey-engine/journeys/{id}/steps/current with the
+template catalog cold (every request queries templates + verses) versus
+warm (templates, step skeletons and verses served from memory).
+
+Runs against a throwaway SQLite database seeded with synthetic templates,
+so it needs no external services.
+
+Usage:
+    python scripts/bench_journey_step_catalog.py [--templates 40] [--requests 300]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend import models
+from backend.deps import get_current_user, get_db
+from backend.routes.journey_engine import router as journey_engine_router
+from backend.services.journey_engine.template_catalog import (
+    invalidate_template_catalog,
+    refresh_template_catalog,
+)
+
+_TABLES = [
+    models.User.__table__,
+    models.GitaVerse.__table__,
+    models.JourneyTemplate.__table__,
+    models.JourneyTemplateStep.__table__,
+    models.UserJourney.__table__,
+    models.UserJourneyStepState.__table__,
+]
+_ENEMIES = ["kama", "krodha", "lobha", "moha", "mada", "matsarya"]
+
+
+async def _seed(session_maker, n_templates: int, n_users: int) -> list[tuple[str, str]]:
+    async with session_maker() as db:
+        db.add_all(
+            models.GitaVerse(
+                chapter=c, verse=v, sanskrit=f"sloka {c}.{v}", hindi="",
+                english=f"Verse {c}.{v} translation", principle="", theme="bench",
+            )
+            for c in range(1, 19)
+            for v in range(1, 40)
+        )
+        template_ids = []
+        for t in range(n_templates):
+            template_id = f"tpl-{t}"
+            template_ids.append(template_id)
+            db.add(models.JourneyTemplate(
+                id=template_id, slug=f"bench-{t}", title=f"Bench {t}",
+                primary_enemy_tags=[_ENEMIES[t % len(_ENEMIES)]],
+                duration_days=21, difficulty=1 + t % 5, is_active=True,
+                is_featured=t % 4 == 0, is_free=True,
+            ))
+            db.add_all(
+                models.JourneyTemplateStep(
+                    journey_template_id=template_id, day_index=day,
+                    step_title=f"Day {day}", teaching_hint="Teaching " * 40,
+                    reflection_prompt="\n\n".join(f"Reflection {i}" for i in range(3)),
+                    practice_prompt="\n\n".join(f"Practice {i}" for i in range(4)),
+                    static_verse_refs=[
+                        {"chapter": 1 + (t + day) % 18, "verse": 1 + day},
+                        {"chapter": 1 + (t + day + 1) % 18, "verse": 2 + day},
+                        {"chapter": 1 + (t + day + 2) % 18, "verse": 3 + day},
+                    ],
+                )
+                for day in range(1, 22)
+            )
+        pairs = []
+        for u in range(n_users):
+            user_id = f"user-{u}"
+            db.add(models.User(id=user_id, auth_uid=user_id, email=f"{user_id}@bench.local"))
+            journey_id = str(uuid.uuid4())
+            db.add(models.UserJourney(
+                id=journey_id, user_id=user_id,
+                journey_template_id=template_ids[u % len(template_ids)],
+                status=models.UserJourneyStatus.ACTIVE.value, current_day_index=1 + u % 21,
+                personalization={"time_budget_minutes": 10}, started_at=datetime.utcnow(),
+            ))
+            pairs.append((user_id, journey_id))
+        await db.commit()
+    return pairs
+
+
+async def _measure(client, pairs, current_user, statements, n_requests: int) -> dict:
+    latencies = []
+    statements.clear()
+    for i in range(n_requests):
+        user_id, journey_id = pairs[i % len(pairs)]
+        current_user["id"] = user_id
+        start = time.perf_counter()
+        response = await client.get(f"/api/journey-engine/journeys/{journey_id}/steps/current")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "queries": len(statements) / n_requests,
+    }
+
+
+async def main(n_templates: int, n_requests: int) -> None:
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: models.Base.metadata.create_all(c, tables=_TABLES))
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    pairs = await _seed(session_maker, n_templates, n_users=100)
+
+    current_user = {"id": pairs[0][0]}
+    app = FastAPI()
+    app.include_router(journey_engine_router, prefix="/api/journey-engine")
+
+    async def _db():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_current_user] = lambda: current_user["id"]
+
+    print("=" * 70)
+    print("JOURNEY STEP CATALOG BENCHMARK")
+    print("=" * 70)
+    print(f"templates={n_templates} steps/template=21 users={len(pairs)} requests={n_requests}")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        # Materialise every user's step state so both runs measure the read path.
+        await _measure(client, pairs, current_user, statements, len(pairs))
+
+        invalidate_template_catalog()
+        cold = await _measure(client, pairs, current_user, statements, n_requests)
+
+        async with session_maker() as db:
+            start = time.perf_counter()
+            catalog = await refresh_template_catalog(db)
+            load_ms = (time.perf_counter() - start) * 1000
+        warm = await _measure(client, pairs, current_user, statements, n_requests)
+
+    print(f"\ncatalog load: {load_ms:.1f} ms ({len(catalog.templates)} templates, {len(catalog.verses)} verses)")
+    print(f"{'mode':<6} {'p50 ms':>9} {'p95 ms':>9} {'queries/req':>12}")
+    for name, stats in (("cold", cold), ("warm", warm)):
+        print(f"{name:<6} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['queries']:>12.1f}")
+
+    invalidate_template_catalog()
+    await engine.dispose()
+    os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--templates", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.templates, args.requests))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Knowledge Store Benchmark.
+
+Compares the previous KnowledgeStore behaviour (whole-corpus
+``json.dump(indent=2)`` on every insert and usage bump, linear scans for
+every lookup) with the indexed, journaled store in
+backend/services/kiaan_learning_engine.py, for both the journal and the
+SQLite/FTS5 backends. Reports inserts/sec and usage updates/sec with the
+corpus at full size, and median latency of search_wisdom and the
+chapter/theme/enemy lookups.
+
+Usage:
+    python scripts/bench_knowledge_store.py [--entries 100000] [--queries 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services import kiaan_learning_engine as kle
+from backend.services.kiaan_learning_engine import (
+    ContentType,
+    KnowledgeStore,
+    LearnedWisdom,
+)
+
+THEMES = ["inner peace", "selfless action", "anger management", "devotion", "duty", "equanimity", "surrender"]
+
+
+def _vocabulary(rng: random.Random, size: int = 5000) -> list[str]:
+    syllables = ["ka", "ma", "dha", "ra", "yo", "ga", "shan", "ti", "bha", "kti", "jna", "na", "sa", "tva"]
+    words = {w for w in kle.GITA_KEYWORDS if " " not in w}
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _wisdom(i: int, rng: random.Random, vocab: list[str]) -> LearnedWisdom:
+    return LearnedWisdom(
+        id=f"w{i:07d}",
+        content=" ".join(rng.choice(vocab) for _ in range(rng.randint(20, 60))),
+        source_type=ContentType.TEXT,
+        source_url="https://vedabase.io/en/library/bg/",
+        source_name="Vedabase",
+        language="en",
+        chapter_refs=rng.sample(range(1, 19), rng.randint(1, 2)),
+        verse_refs=[(2, 47)],
+        themes=rng.sample(THEMES, 2),
+        shad_ripu_tags=rng.sample(kle.SHAD_RIPU, 1),
+        keywords=rng.sample(vocab, 4),
+        quality_score=rng.random(),
+        validation_status="validated",
+        learned_at=datetime(2026, 1, 1),
+    )
+
+
+def _legacy_save(store: KnowledgeStore) -> None:
+    """The previous _save_wisdom."""
+    data = [kle._wisdom_to_dict(w) for w in store._wisdom_cache.values()]
+    with open(store.wisdom_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _legacy_search(store: KnowledgeStore, query: str, limit: int = 10) -> list:
+    """The previous search_wisdom (full scan)."""
+    query_lower = query.lower()
+    results = []
+    for w in store._wisdom_cache.values():
+        if w.validation_status != "validated":
+            continue
+        score = 5 * (query_lower in w.content.lower())
+        score += sum(2 for k in w.keywords if query_lower in k.lower())
+        score += sum(3 for t in w.themes if query_lower in t.lower())
+        if score > 0:
+            results.append((w, score))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return [w for w, _ in results[:limit]]
+
+
+def _legacy_by_theme(store: KnowledgeStore, theme: str) -> list:
+    return [w for w in store._wisdom_cache.values()
+            if any(theme.lower() in t.lower() for t in w.themes) and w.validation_status == "validated"]
+
+
+def _median_ms(fn, args: list) -> float:
+    timings = []
+    for a in args:
+        start = time.perf_counter()
+        fn(a)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(entries: int, n_queries: int) -> None:
+    rng = random.Random(0)
+    vocab = _vocabulary(rng)
+    corpus = [_wisdom(i, rng, vocab) for i in range(entries + 200)]
+    queries = [rng.choice(vocab) for _ in range(n_queries // 2)]
+    queries += [" ".join(rng.sample(vocab, 2)) for _ in range(n_queries // 4)]
+    queries += [rng.choice(vocab)[1:4] for _ in range(n_queries - len(queries))]
+
+    print("=" * 70)
+    print("KNOWLEDGE STORE BENCHMARK")
+    print("=" * 70)
+    print(f"entries={entries:,} vocab={len(vocab):,} queries={len(queries)}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Previous behaviour: every write re-serializes the corpus
+        legacy = KnowledgeStore(f"{tmp}/legacy")
+        for w in corpus[:entries]:
+            legacy._wisdom_cache[w.id] = w
+        start = time.perf_counter()
+        for w in corpus[entries:entries + 3]:
+            legacy._wisdom_cache[w.id] = w
+            _legacy_save(legacy)
+        legacy_insert = 3 / (time.perf_counter() - start)
+        rows.append(("previous (full rewrite + scans)", f"{legacy_insert:,.2f}", f"{legacy_insert:,.2f}",
+                     _median_ms(lambda q: _legacy_search(legacy, q), queries[:20]),
+                     _median_ms(lambda t: _legacy_by_theme(legacy, t), THEMES)))
+
+        for backend in ("journal", "sqlite"):
+            store = KnowledgeStore(f"{tmp}/{backend}", backend=backend)
+            start = time.perf_counter()
+            for w in corpus[:entries]:
+                store.add_wisdom(w)
+            fill = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for w in corpus[entries:]:
+                store.add_wisdom(w)
+            insert_rate = len(corpus[entries:]) / (time.perf_counter() - start)
+
+            ids = [w.id for w in corpus]
+            start = time.perf_counter()
+            for _ in range(20_000):
+                store.record_usage(rng.choice(ids))
+            store.flush()
+            usage_rate = 20_000 / (time.perf_counter() - start)
+
+            rows.append((f"{backend} (fill {fill:.1f}s)", f"{insert_rate:,.0f}", f"{usage_rate:,.0f}",
+                         _median_ms(store.search_wisdom, queries),
+                         _median_ms(store.get_wisdom_by_theme, THEMES)))
+
+            start = time.perf_counter()
+            store.close()
+            reopened = KnowledgeStore(f"{tmp}/{backend}", backend=backend)
+            reopen = time.perf_counter() - start
+            start = time.perf_counter()
+            reopened.search_wisdom(queries[0])
+            print(f"{backend}: reopen {reopen:.2f}s (first search {time.perf_counter() - start:.2f}s), "
+                  f"{len(reopened._wisdom_cache):,} items, journal entries {reopened._persistence.journal_entries:,}")
+            reopened.close()
+
+    print(f"\n{'store':<32} {'inserts/s':>10} {'usage/s':>10} {'search ms':>10} {'theme ms':>9}")
+    for name, inserts, usage, search_ms, theme_ms in rows:
+        print(f"{name:<32} {inserts:>10} {usage:>10} {search_ms:>10.2f} {theme_ms:>9.2f}")
+    print("\ninserts/s and usage/s measured with the corpus at full size; latencies are medians")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.entries, args.queries)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Logging Pipeline Benchmark.
+
+Configures logging the way backend.main does (basicConfig at INFO, then
+install_log_handler()), with the stream handler writing to a file, and
+serves a small FastAPI app whose endpoint logs --logs-per-request INFO
+lines plus one DEBUG line, like the chat path. Drives --requests requests
+through httpx's ASGI transport with --concurrency in flight and reports
+p50 / p99 request latency and throughput. --sink-delay-us makes every
+write to the log file sleep first, like a stdout pipe under back-pressure.
+It then fills the admin log buffer and times the /api/admin/backend-logs
+query for one level.
+
+Each run happens in a fresh subprocess so logging state does not leak.
+install_log_handler() is imported from wherever the checked-out tree
+defines it, so the script also runs against an older checkout for
+comparison.
+
+Usage:
+    python scripts/bench_logging.py [--requests 20000] [--concurrency 64] [--sink-delay-us 0]
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _SlowFile:
+    def __init__(self, path: str, delay_us: int):
+        self._file = open(path, "a")  # noqa: SIM115  (held for the handler's lifetime)
+        self._delay = delay_us / 1e6
+
+    def write(self, text: str) -> int:
+        if self._delay:
+            time.sleep(self._delay)
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+
+def _install(log_path: str, delay_us: int) -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(message)s",
+        handlers=[logging.StreamHandler(_SlowFile(log_path, delay_us))],
+    )
+    try:
+        from backend.services.log_pipeline import install_log_handler
+    except ImportError:
+        from backend.routes.admin.backend_logs import install_log_handler
+    install_log_handler()
+
+
+async def _serve(n_requests: int, concurrency: int, logs_per_request: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    logger = logging.getLogger("backend.routes.chat")
+
+    @app.get("/chat")
+    async def chat(session: str):
+        for i in range(logs_per_request):
+            logger.info(f"💬 KIAAN message step {i} for session {session}: ok")
+        logger.debug(f"cache hit for {session}")
+        await asyncio.sleep(0)
+        return {"ok": True}
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(worker_id: int, count: int) -> None:
+            for n in range(count):
+                started = time.perf_counter()
+                response = await client.get("/chat", params={"session": f"s{worker_id}-{n}"})
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        per_worker = n_requests // concurrency
+        await asyncio.gather(*(worker(w, per_worker) for w in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "rps": len(latencies) / elapsed,
+    }
+
+
+async def _drained() -> dict:
+    """Wait for a background listener to catch up; return its status."""
+    try:
+        from backend.services.log_pipeline import pipeline_status
+    except ImportError:
+        return {}
+    while pipeline_status()["queue_depth"]:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.1)
+    return pipeline_status()
+
+
+async def _query_logs(repeat: int) -> float:
+    from backend.routes.admin import backend_logs
+
+    filler = logging.getLogger("bench.filler")
+    for i in range(5000):
+        (filler.error if i % 20 == 0 else filler.info)(f"filler {i}")
+        if i % 1000 == 0:
+            await _drained()
+    await _drained()
+
+    accepted = inspect.signature(backend_logs.get_backend_logs).parameters
+    kwargs = {
+        "request": MagicMock(), "limit": 200, "offset": 0, "level": "ERROR",
+        "logger": None, "search": None, "admin": SimpleNamespace(), "_": None,
+    }
+    kwargs = {k: v for k, v in kwargs.items() if k in accepted}
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await backend_logs.get_backend_logs(**kwargs)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _child(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        _install(os.path.join(tmp, "app.log"), args.sink_delay_us)
+        result = asyncio.run(_serve(args.requests, args.concurrency, args.logs_per_request))
+        result["dropped"] = asyncio.run(_drained()).get("dropped", 0)
+        result["query_ms"] = asyncio.run(_query_logs(200))
+        logging.shutdown()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--logs-per-request", type=int, default=5)
+    parser.add_argument("--sink-delay-us", type=int, default=0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args)
+        return
+
+    print("=" * 70)
+    print("Logging Pipeline Benchmark")
+    print("=" * 70)
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--requests", str(args.requests),
+         "--concurrency", str(args.concurrency), "--logs-per-request", str(args.logs_per_request),
+         "--sink-delay-us", str(args.sink_delay_us)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    r = json.loads(out.strip().splitlines()[-1])
+    print(f"Requests:            {args.requests:,} ({args.concurrency} in flight, "
+          f"{args.logs_per_request} INFO logs each, {args.sink_delay_us} us per write)")
+    print(f"Request p50 latency: {r['p50_ms']:.2f} ms")
+    print(f"Request p99 latency: {r['p99_ms']:.2f} ms")
+    print(f"Throughput:          {r['rps']:,.0f} req/s")
+    print(f"Log records dropped: {r['dropped']:,}")
+    print(f"Log query (ERROR):   {r['query_ms']:.3f} ms p50")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Notification Campaign Benchmark.
+
+Sends one daily-verse notification to a synthetic user base through a
+local HTTP stub of the Expo push API, comparing the per-user
+``dispatch_notification`` loop with the bulk campaign pipeline, and
+prints a throughput report.
+
+The stub runs under uvicorn on 127.0.0.1, adds a fixed latency per
+request, answers ``DeviceNotRegistered`` for a slice of tokens, and
+returns 503 for a fraction of batches to exercise retries.
+
+Usage:
+    python scripts/bench_notification_campaign.py [--users 5000] [--dispatch-sample 300]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend import models
+from backend.services import expo_push
+
+STUB_LATENCY_SECONDS = 0.02
+_TABLES = [
+    models.User.__table__,
+    models.NotificationTemplate.__table__,
+    models.Notification.__table__,
+    models.NotificationPreference.__table__,
+    models.PushSubscription.__table__,
+]
+
+
+def _expo_stub(stats: dict) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(0)
+
+    @app.post("/--/api/v2/push/send")
+    async def send(request: Request):
+        stats["requests"] += 1
+        await asyncio.sleep(STUB_LATENCY_SECONDS)
+        if rng.random() < 0.05:
+            stats["injected_503"] += 1
+            return JSONResponse({"errors": ["overloaded"]}, status_code=503)
+        messages = await request.json()
+        return {
+            "data": [
+                {"status": "error", "message": "gone", "details": {"error": "DeviceNotRegistered"}}
+                if m["to"].endswith("-dead]")
+                else {"status": "ok", "id": f"t-{i}"}
+                for i, m in enumerate(messages)
+            ]
+        }
+
+    return app
+
+
+async def _seed(session_maker, n_users: int) -> None:
+    rng = random.Random(n_users)
+    users, prefs, subs = [], [], []
+    for i in range(n_users):
+        uid = f"user-{i:07d}"
+        users.append({"id": uid, "auth_uid": uid, "email": f"{uid}@bench.local"})
+        roll = rng.random()
+        if roll < 0.1:
+            prefs.append({"id": uid, "user_id": uid, "push_enabled": False})
+        elif roll < 0.2:
+            prefs.append({"id": uid, "user_id": uid, "daily_checkin_reminder": False})
+        for d in range(rng.choice([0, 1, 1, 2])):
+            suffix = "-dead" if rng.random() < 0.02 else ""
+            subs.append({
+                "id": f"{uid}-{d}", "user_id": uid, "is_active": True,
+                "endpoint": f"ExponentPushToken[{uid}-{d}{suffix}]",
+            })
+    async with session_maker() as db:
+        await db.execute(insert(models.User), users)
+        if prefs:
+            await db.execute(insert(models.NotificationPreference), prefs)
+        await db.execute(insert(models.PushSubscription), subs)
+        await db.commit()
+
+
+async def _fresh_db(n_users: int):
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: models.Base.metadata.create_all(c, tables=_TABLES))
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    await _seed(session_maker, n_users)
+    return engine, session_maker, db_path
+
+
+async def main(n_users: int, dispatch_sample: int) -> None:
+    stats = {"requests": 0, "injected_503": 0}
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_expo_stub(stats), port=port, log_level="error"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    expo_push.EXPO_PUSH_URL = f"http://127.0.0.1:{port}/--/api/v2/push/send"
+    expo_push.EXPO_RETRY_BASE_DELAY = 0.05
+
+    from backend.services.notification_campaign import run_notification_campaign
+    from backend.services.notification_dispatcher import dispatch_notification
+
+    print("=" * 70)
+    print("NOTIFICATION CAMPAIGN BENCHMARK")
+    print("=" * 70)
+    print(f"users={n_users} stub latency={STUB_LATENCY_SECONDS * 1000:.0f} ms/request, 5% 503s")
+
+    # Per-user dispatch loop on a sample, extrapolated
+    engine, session_maker, path = await _fresh_db(dispatch_sample)
+    stats["requests"] = 0
+    start = time.perf_counter()
+    async with session_maker() as db:
+        for i in range(dispatch_sample):
+            await dispatch_notification(
+                db, f"user-{i:07d}", "daily_verse", "Today's Verse", "BG 2.47",
+                {"type": "daily_verse"},
+            )
+    per_user = (time.perf_counter() - start) / dispatch_sample
+    dispatch_requests = stats["requests"]
+    await engine.dispose()
+    os.unlink(path)
+
+    engine, session_maker, path = await _fresh_db(n_users)
+    stats["requests"] = stats["injected_503"] = 0
+    result = await run_notification_campaign(
+        session_maker, "daily_verse", "Today's Verse", "BG 2.47", {"type": "daily_verse"},
+    )
+    await engine.dispose()
+    os.unlink(path)
+
+    print(f"\nper-user dispatch  : {per_user * 1000:.2f} ms/user "
+          f"({dispatch_requests} Expo requests for {dispatch_sample} users) "
+          f"→ ~{per_user * n_users:.1f} s for {n_users} users")
+    print(f"bulk campaign      : {result.elapsed_seconds:.2f} s for {result.users} eligible users")
+    print(f"  chunks={result.chunks} inbox_rows={result.inbox_rows} tokens={result.tokens} "
+          f"batches={result.batches} (Expo requests incl. retries: {stats['requests']}, "
+          f"503s injected: {stats['injected_503']})")
+    print(f"  tickets ok={result.tickets_ok} error={result.tickets_error} "
+          f"deactivated={result.tokens_deactivated} failed_batches={result.failed_batches}")
+    print(f"  throughput: {result.messages_per_second:.0f} push messages/s, "
+          f"{result.users / result.elapsed_seconds:.0f} users/s")
+
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--dispatch-sample", type=int, default=300)
+    args = parser.parse_args()
+    # Injected 503s and dead tokens are expected; keep the report readable
+    logging.disable(logging.ERROR)
+    asyncio.run(main(args.users, args.dispatch_sample))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Authenticated Endpoint Benchmark.
+
+Serves a minimal FastAPI app whose endpoint depends on get_current_user
+(twice, as routes combining several auth dependencies do) and on
+get_current_user_object, backed by a SQLite users table. Reports p50 / p95
+request latency and database queries per request for a pool of users
+making repeated requests.
+
+Only backend.deps' public dependencies are used, so the same script can be
+run against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_principal_cache.py [--users 200] [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+async def main(n_users: int, n_requests: int) -> None:
+    from fastapi import Depends, FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.deps import get_current_user, get_current_user_object, get_db
+    from backend.models import User
+    from backend.security.jwt import create_access_token
+
+    print("=" * 70)
+    print("AUTHENTICATED ENDPOINT BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/users.sqlite")
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.create)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as db:
+            db.add_all([
+                User(id=f"user-{i}", auth_uid=f"user-{i}", email=f"user-{i}@example.com",
+                     hashed_password="x", email_verified=True)
+                for i in range(n_users)
+            ])
+            await db.commit()
+
+        queries = 0
+
+        def _count(*args):
+            nonlocal queries
+            queries += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+        async def _db():
+            async with session_maker() as session:
+                yield session
+
+        app = FastAPI()
+        app.dependency_overrides[get_db] = _db
+
+        @app.get("/me")
+        async def me(
+            user_id: str = Depends(get_current_user),
+            user: User = Depends(get_current_user_object),
+        ):
+            return {"id": user_id, "email": user.email}
+
+        tokens = [create_access_token(f"user-{i}", f"session-{i}") for i in range(n_users)]
+        rng = random.Random(11)
+        timings = []
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for _ in range(n_requests):
+                token = tokens[rng.randrange(n_users)]
+                start = time.perf_counter()
+                response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+                timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+        await engine.dispose()
+
+    timings.sort()
+    print(f"users={n_users}, requests={n_requests}")
+    print(f"\n{'p50 ms':>10} {'p95 ms':>10} {'queries/request':>18}")
+    print(f"{statistics.median(timings):>10.3f} {timings[int(len(timings) * 0.95) - 1]:>10.3f} "
+          f"{queries / n_requests:>18.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.requests))
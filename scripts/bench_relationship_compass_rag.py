@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Relationship Compass RAG Benchmark.
+
+Builds an embedding index from the chunks in
+data/relationship_compass/gita_index.sqlite with random 1536-d vectors
+stored the previous way (JSON text per row), then reports load time and
+per-query latency for:
+
+- the previous loader and per-chunk ``cosine_similarity`` loop
+- the matrix index loading the same JSON rows
+- the matrix index after migration to a memory-mapped .npy (float32/float16)
+
+plus keyword retrieval (previous nested substring scoring vs the BM25
+index) on the real chunks, and the cost of constructing an OpenAI client,
+which embed_query used to do on every query.
+
+Usage:
+    python scripts/bench_relationship_compass_rag.py [--scale 1] [--queries 200]
+"""
+
+import argparse
+import json
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from backend.services import relationship_compass_rag as rag
+
+SOURCE_INDEX = Path(__file__).parent.parent / "data" / "relationship_compass" / "gita_index.sqlite"
+DIM = 1536
+
+
+def _legacy_load(path: Path) -> list[tuple[str, np.ndarray]]:
+    """The previous load loop: one json.loads and one small array per chunk."""
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT chunk_id, tags, embedding FROM gita_chunks").fetchall()
+    conn.close()
+    chunks = []
+    for chunk_id, tags, embedding in rows:
+        json.loads(tags) if tags else []
+        data = json.loads(embedding) if embedding else []
+        chunks.append((chunk_id, np.array(data, dtype=np.float32) if data else np.array([], dtype=np.float32)))
+    return chunks
+
+
+def _legacy_retrieve(chunks, query: np.ndarray, k: int = 18) -> list:
+    scored = [(cid, rag.cosine_similarity(query, emb)) for cid, emb in chunks if emb.size]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:k]
+
+
+def _legacy_keyword_score(chunk: rag.GitaChunk, query_keywords: set) -> float:
+    """The previous score_chunk_by_keywords."""
+    score = 0.0
+    chunk_keywords = set(chunk.keywords)
+    for kw in query_keywords:
+        if kw in chunk_keywords:
+            score += rag.KEYWORD_WEIGHTS.get(kw, 1.0)
+    for tag in {tag.lower().replace("_", " ").replace("-", " ") for tag in chunk.tags}:
+        for kw in query_keywords:
+            if kw in tag:
+                score += rag.KEYWORD_WEIGHTS.get(kw, 1.0) * 1.5
+    text_lower = chunk.text.lower()
+    for kw in query_keywords:
+        if kw in text_lower:
+            score += rag.KEYWORD_WEIGHTS.get(kw, 1.0) * 0.5
+    return score
+
+
+def _build(path: Path, scale: int) -> int:
+    """Copy the real chunks (scale times) with random embeddings as JSON text."""
+    rng = np.random.default_rng(0)
+    src = sqlite3.connect(SOURCE_INDEX)
+    rows = src.execute(
+        "SELECT chunk_id, chapter, verse, source_file, tags, language, chunk_type, text, commentary, keywords "
+        "FROM gita_chunks"
+    ).fetchall()
+    src.close()
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE gita_chunks (
+            chunk_id TEXT PRIMARY KEY, chapter TEXT, verse TEXT, source_file TEXT, tags TEXT,
+            language TEXT, chunk_type TEXT, text TEXT, commentary TEXT, embedding TEXT, keywords TEXT
+        );
+        """
+    )
+    conn.execute("INSERT INTO metadata VALUES ('model', 'text-embedding-3-small')")
+    for copy in range(scale):
+        for row in rows:
+            conn.execute(
+                "INSERT INTO gita_chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (f"{row[0]}_{copy}", *row[1:9], json.dumps(rng.standard_normal(DIM).tolist()), row[9]),
+            )
+    conn.commit()
+    conn.close()
+    return len(rows) * scale
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _median_ms(fn, args) -> float:
+    timings = []
+    for a in args:
+        start = time.perf_counter()
+        fn(a)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(scale: int, n_queries: int) -> None:
+    rng = np.random.default_rng(1)
+    queries = rng.standard_normal((n_queries, DIM)).astype(np.float32)
+
+    print("=" * 70)
+    print("RELATIONSHIP COMPASS RAG BENCHMARK")
+    print("=" * 70)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy" / "gita_index.sqlite"
+        legacy_path.parent.mkdir()
+        n = _build(legacy_path, scale)
+        print(f"chunks={n:,} dim={DIM} queries={n_queries}, index size {legacy_path.stat().st_size / 1e6:.1f} MB (JSON)")
+
+        chunks, load = _timed(lambda: _legacy_load(legacy_path))
+        rows.append(("previous (JSON + per-chunk loop)", load, _median_ms(lambda q: _legacy_retrieve(chunks, q), queries)))
+
+        rag.INDEX_PATH = legacy_path
+        index, load = _timed(rag.RelationshipCompassIndex.load)
+        rows.append(("matrix, JSON rows", load, _median_ms(lambda q: index.search_embeddings(q, 18), queries)))
+
+        for dtype in ("float32", "float16"):
+            path = Path(tmp) / dtype / "gita_index.sqlite"
+            path.parent.mkdir()
+            shutil.copy(legacy_path, path)
+            conn = sqlite3.connect(path)
+            rag.write_embedding_matrix(conn, path, dtype=dtype)
+            conn.execute("VACUUM")
+            conn.close()
+            rag.INDEX_PATH = path
+            index, load = _timed(rag.RelationshipCompassIndex.load)
+            size = (path.stat().st_size + (path.parent / "gita_index.embeddings.npy").stat().st_size) / 1e6
+            rows.append((f"matrix, migrated {dtype} ({size:.1f} MB)", load,
+                         _median_ms(lambda q, index=index: index.search_embeddings(q, 18), queries)))
+
+    print(f"\n{'embedding index':<40} {'load s':>8} {'query ms':>9}")
+    for name, load, query_ms in rows:
+        print(f"{name:<40} {load:>8.3f} {query_ms:>9.3f}")
+
+    rag.INDEX_PATH = SOURCE_INDEX
+    index = rag.RelationshipCompassIndex.load()
+    texts = ["my partner gets angry when I speak the truth", "jealousy and resentment toward my sister",
+             "how do I forgive a friend who betrayed me", "fear of losing my family", "ego clashes at work"]
+    keyword_sets = [rag.extract_query_keywords(f"{t} relationship partner " + " ".join(rag.RELATIONSHIP_TAGS[:6]))
+                    for t in texts]
+
+    def _legacy_keyword(kws):
+        scored = [(c, _legacy_keyword_score(c, kws)) for c in index.chunks]
+        return sorted((item for item in scored if item[1] > 0), key=lambda item: item[1], reverse=True)[:18]
+
+    legacy_ms = _median_ms(_legacy_keyword, keyword_sets * 4)
+    bm25_ms = _median_ms(lambda kws: index.search_keywords(kws, 18), keyword_sets * 4)
+    print(f"\nkeyword retrieval on {len(index.chunks)} real chunks: previous {legacy_ms:.2f} ms, BM25 {bm25_ms:.3f} ms")
+
+    _, construct = _timed(lambda: [rag.OpenAI(api_key="sk-bench") for _ in range(20)])
+    print(f"OpenAI client construction (previously per query): {construct / 20 * 1000:.1f} ms, "
+          "plus a new connection/TLS handshake per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1, help="copies of the 701 real chunks")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.scale, args.queries)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Prioritized Replay Buffer Benchmark.
+
+Compares the previous list-of-tuples PrioritizedReplayBuffer (O(n)
+lowest-priority eviction, priority array and ``np.random.choice`` rebuilt
+on every sample) with the sum-tree buffer in
+native/ml/engine/continuous_learning_engine.py at a 1M-sample capacity.
+Reports add throughput once full, sample throughput, and priority update
+throughput.
+
+Needs the wake-word training requirements (native/ml/training/requirements.txt),
+since the engine module imports TensorFlow and librosa.
+
+Usage:
+    python scripts/bench_replay_buffer.py [--capacity 1000000] [--feature-dim 40] [--batch 64]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add native ML engine to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "native" / "ml" / "engine"))
+
+import numpy as np
+from continuous_learning_engine import ContinuousLearningConfig, PrioritizedReplayBuffer
+
+
+class LegacyReplayBuffer:
+    """The previous implementation, verbatim apart from the constructor."""
+
+    def __init__(self, max_size: int, alpha: float):
+        self.buffer = []
+        self.max_size = max_size
+        self.alpha = alpha
+
+    def add(self, features, label, priority=1.0):
+        if len(self.buffer) >= self.max_size:
+            min_idx = min(range(len(self.buffer)), key=lambda i: self.buffer[i][2])
+            self.buffer.pop(min_idx)
+        self.buffer.append((features, label, priority))
+
+    def sample(self, batch_size):
+        priorities = np.array([s[2] for s in self.buffer])
+        probabilities = priorities ** self.alpha
+        probabilities /= probabilities.sum()
+        indices = np.random.choice(
+            len(self.buffer), size=min(batch_size, len(self.buffer)), replace=False, p=probabilities,
+        )
+        return np.array([self.buffer[i][0] for i in indices]), np.array([self.buffer[i][1] for i in indices])
+
+
+def _rate(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def main(capacity: int, feature_dim: int, batch: int) -> None:
+    rng = np.random.default_rng(0)
+    features = rng.standard_normal((10_000, feature_dim)).astype(np.float32)
+    labels = rng.integers(0, 2, 10_000)
+    priorities = rng.uniform(1.0, 2.0, capacity)
+
+    print("=" * 70)
+    print("PRIORITIZED REPLAY BUFFER BENCHMARK")
+    print("=" * 70)
+    print(f"capacity={capacity:,} feature_dim={feature_dim} batch={batch}")
+
+    # Fill both buffers (features shared by reference in the legacy list)
+    legacy = LegacyReplayBuffer(capacity, 0.6)
+    start = time.perf_counter()
+    for i in range(capacity):
+        legacy.buffer.append((features[i % 10_000], labels[i % 10_000], priorities[i]))
+    legacy_fill = time.perf_counter() - start
+
+    config = ContinuousLearningConfig(replay_buffer_size=capacity)
+    tree = PrioritizedReplayBuffer(config)
+    start = time.perf_counter()
+    for i in range(0, capacity, 10_000):
+        n = min(10_000, capacity - i)
+        tree.add_batch(features[:n], labels[:n], priorities[i:i + n])
+    tree_fill = time.perf_counter() - start
+
+    k = iter(range(10**9))
+    results = [
+        ("fill (samples/s)", capacity / legacy_fill, capacity / tree_fill),
+        ("add when full (/s)",
+         _rate(lambda: legacy.add(features[0], 1, 1.5), 5),
+         _rate(lambda: tree.add(features[next(k) % 10_000], 1, 1.5), 20_000)),
+        (f"sample {batch} (/s)",
+         _rate(lambda: legacy.sample(batch), 3),
+         _rate(lambda: tree.sample_batch(batch), 2_000)),
+        (f"update {batch} priorities (/s)",
+         float("nan"),
+         _rate(lambda: tree.update_priorities(rng.integers(0, capacity, batch), rng.uniform(0, 3, batch)), 2_000)),
+    ]
+
+    print(f"\n{'operation':<28} {'legacy':>12} {'sum tree':>12} {'speedup':>9}")
+    for name, old, new in results:
+        speedup = f"{new / old:>8.0f}x" if old == old else f"{'-':>9}"
+        print(f"{name:<28} {old:>12,.1f} {new:>12,.1f} {speedup}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--capacity", type=int, default=1_000_000)
+    parser.add_argument("--feature-dim", type=int, default=40)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+    main(args.capacity, args.feature_dim, args.batch)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Data Retention Purge Benchmark.
+
+Seeds a SQLite database (WAL mode) created from the checked-out models with
+--rows KIAAN chat messages soft-deleted past the retention window, spread
+over orphaned sessions, plus --live-sessions sessions of 20 active messages.
+It then runs purge_expired_chat_messages() while a concurrent client keeps
+reading a live session's latest messages and inserting a new message, and
+reports the purge time and the client's read and write latency (p50 / p99 /
+max) during the purge, next to an idle baseline.
+
+Only purge_expired_chat_messages() is called, so the script also runs
+against an older checkout for comparison; RETENTION_BATCH_SIZE and
+RETENTION_BATCH_SLEEP_MS apply when the checked-out tree batches.
+
+Usage:
+    python scripts/bench_retention_purge.py [--rows 5000000] [--live-sessions 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MESSAGES_PER_ORPHAN_SESSION = 100
+
+
+def _models():
+    from backend.models import KiaanChatMessage, KiaanChatSession
+
+    models = [KiaanChatMessage, KiaanChatSession]
+    try:
+        from backend.models import RetentionCheckpoint
+
+        models.append(RetentionCheckpoint)
+    except ImportError:
+        pass
+    return models
+
+
+def _seed(db_path: str, n_rows: int, live_sessions: int) -> list[str]:
+    from sqlalchemy import create_engine, text
+
+    from backend.models import KiaanChatMessage, KiaanChatSession
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+    for model in _models():
+        model.__table__.create(engine)
+
+    now = datetime.now(UTC)
+    messages, sessions = KiaanChatMessage.__table__, KiaanChatSession.__table__
+    live = [f"live-{i:06d}" for i in range(live_sessions)]
+    with engine.begin() as conn:
+        n_orphans = max(1, n_rows // MESSAGES_PER_ORPHAN_SESSION)
+        conn.execute(sessions.insert(), [
+            {"id": f"old-{i:06d}", "started_at": now - timedelta(days=300), "language": "en"}
+            for i in range(n_orphans)
+        ] + [{"id": s, "started_at": now - timedelta(days=200), "language": "en"} for s in live])
+
+        def rows(count, session_for, deleted_at):
+            return [
+                {
+                    "id": str(uuid.uuid4()), "session_id": session_for(i),
+                    "user_message": "How do I find peace when I feel anxious?",
+                    "kiaan_response": "Breathe, and return to the present moment. " * 4,
+                    "language": "en", "was_cached": False, "was_streaming": False,
+                    "saved_to_journal": False, "created_at": now - timedelta(days=250),
+                    "deleted_at": deleted_at(i),
+                }
+                for i in range(count)
+            ]
+
+        for start in range(0, n_rows, 50_000):
+            count = min(50_000, n_rows - start)
+            conn.execute(messages.insert(), rows(
+                count, lambda i, start=start: f"old-{(start + i) // MESSAGES_PER_ORPHAN_SESSION:06d}",
+                lambda i, start=start: now - timedelta(days=100 + (start + i) % 100),
+            ))
+        conn.execute(messages.insert(), rows(live_sessions * 20, lambda i: live[i % live_sessions], lambda _i: None))
+    engine.dispose()
+    return live
+
+
+async def _client(db_path: str, live: list[str], stop: asyncio.Event) -> tuple[list[float], list[float]]:
+    """Read a live session's latest messages and insert one, until stopped."""
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from backend.models import KiaanChatMessage
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 600})
+    messages = KiaanChatMessage.__table__
+    reads, writes = [], []
+    async with engine.connect() as conn:
+        while not stop.is_set():
+            session_id = random.choice(live)
+            started = time.perf_counter()
+            await conn.execute(
+                select(messages.c.id, messages.c.kiaan_response)
+                .where(messages.c.session_id == session_id, messages.c.deleted_at.is_(None))
+                .order_by(messages.c.created_at.desc()).limit(20)
+            )
+            await conn.commit()
+            reads.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            await conn.execute(messages.insert().values(
+                id=str(uuid.uuid4()), session_id=session_id, user_message="q", kiaan_response="a",
+                language="en", was_cached=False, was_streaming=False, saved_to_journal=False,
+                created_at=datetime.now(UTC),
+            ))
+            await conn.commit()
+            writes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+    await engine.dispose()
+    return reads, writes
+
+
+def _summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    return f"p50 {statistics.median(samples):8.2f} ms  p99 {p99:8.2f} ms  max {samples[-1]:9.2f} ms  (n={len(samples)})"
+
+
+async def _run(db_path: str, live: list[str], idle_seconds: float) -> None:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.services.data_retention import purge_expired_chat_messages
+
+    stop = asyncio.Event()
+    idle = asyncio.create_task(_client(db_path, live, stop))
+    await asyncio.sleep(idle_seconds)
+    stop.set()
+    idle_reads, idle_writes = await idle
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 600})
+    stop = asyncio.Event()
+    busy = asyncio.create_task(_client(db_path, live, stop))
+    started = time.perf_counter()
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        result = await purge_expired_chat_messages(db)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reads, writes = await busy
+    await engine.dispose()
+
+    print(f"Purged {result['purged_messages']:,} messages, {result['purged_sessions']:,} sessions in {elapsed:.1f}s")
+    print()
+    print(f"Idle read:         {_summary(idle_reads)}")
+    print(f"Idle write:        {_summary(idle_writes)}")
+    print(f"During purge read: {_summary(reads)}")
+    print(f"During purge write:{_summary(writes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--live-sessions", type=int, default=10_000)
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Data Retention Purge Benchmark")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "retention.sqlite")
+        started = time.perf_counter()
+        live = _seed(db_path, args.rows, args.live_sessions)
+        print(f"Seeded {args.rows:,} expired messages in {time.perf_counter() - started:.1f}s")
+        asyncio.run(_run(db_path, live, args.idle_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Translation Memory Benchmark.
+
+Replays a synthetic multilingual chat log through the translation service
+and compares the old whole-response cache with the sentence-level
+translation memory (cold, and pre-warmed with the verse corpus). Reports
+provider calls, sentences and characters sent to the provider, and
+per-response latency.
+
+Responses are built the way KIAAN replies are: a quoted verse and a few
+stock guidance/closing lines, with a sentence unique to the turn in a
+share of them (``--unique-share``). The provider is a stub with a fixed
+per-call latency plus a small per-sentence cost.
+
+Usage:
+    python scripts/bench_translation_memory.py [--responses 400] [--languages hi,es,ta] [--unique-share 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.translation_memory import TranslationMemory
+from backend.services.translation_service import GITA_VERSES_PATH, TranslationService
+
+CALL_LATENCY_SECONDS = 0.08
+SENTENCE_LATENCY_SECONDS = 0.002
+
+STOCK_LINES = [
+    "Take a slow breath before you respond.",
+    "You are not alone in this.",
+    "Notice the feeling without judging it.",
+    "Let us reflect on this together.",
+    "Your effort matters more than the outcome.",
+    "Be gentle with yourself today.",
+    "Would you like to try a short practice?",
+    "I am here whenever you need to talk.",
+]
+
+
+class _Item:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _StubProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sentences = 0
+        self.chars = 0
+
+    def translate(self, text, src="en", dest="es"):  # noqa: ARG002
+        items = text if isinstance(text, list) else [text]
+        self.calls += 1
+        self.sentences += len(items)
+        self.chars += sum(len(t) for t in items)
+        time.sleep(CALL_LATENCY_SECONDS + SENTENCE_LATENCY_SECONDS * len(items))
+        out = [_Item(f"[{dest}] {t}") for t in items]
+        return out if isinstance(text, list) else out[0]
+
+
+def _chat_log(
+    n: int, languages: list[str], verses: list[str], unique_share: float
+) -> list[tuple[str, str]]:
+    rng = random.Random(42)
+    popular = rng.sample(verses, 40)
+    log = []
+    for turn in range(n):
+        parts = []
+        if rng.random() < unique_share:
+            parts.append(f"I hear how much turn {turn} of this week has weighed on you.")
+        parts.append(rng.choice(popular))
+        parts.extend(rng.sample(STOCK_LINES, 3))
+        log.append((" ".join(parts), rng.choice(languages)))
+    return log
+
+
+def _service() -> tuple[TranslationService, _StubProvider]:
+    svc = TranslationService()
+    provider = _StubProvider()
+    svc.translator = provider
+    svc.googletrans_available = True
+    svc.enabled = True
+    svc.memory = TranslationMemory()
+    return svc, provider
+
+
+async def _legacy(log) -> dict:
+    """Previous behaviour: whole response to the provider, cached by text[:100]."""
+    provider = _StubProvider()
+    cache: dict[str, str] = {}
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for text, lang in log:
+        start = time.perf_counter()
+        key = f"en:{lang}:{text[:100]}"
+        if key not in cache:
+            result = await loop.run_in_executor(None, provider.translate, text, "en", lang)
+            cache[key] = result.text
+        latencies.append(time.perf_counter() - start)
+    return {"calls": provider.calls, "sentences": provider.sentences,
+            "chars": provider.chars, "latencies": latencies}
+
+
+async def _memory(log, verses, languages, prewarm: bool) -> dict:
+    svc, provider = _service()
+    if prewarm:
+        for lang in languages:
+            await svc.translate_many(verses, lang)
+        provider.calls = provider.sentences = provider.chars = 0
+    latencies = []
+    for text, lang in log:
+        start = time.perf_counter()
+        result = await svc.translate_chat_response(text, lang)
+        assert result["success"]
+        latencies.append(time.perf_counter() - start)
+    return {"calls": provider.calls, "sentences": provider.sentences,
+            "chars": provider.chars, "latencies": latencies}
+
+
+def _pct(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] * 1000
+
+
+async def main(n_responses: int, languages: list[str], unique_share: float) -> None:
+    with open(GITA_VERSES_PATH, encoding="utf-8") as f:
+        verses = [v["english"] for v in json.load(f) if v.get("english")]
+    log = _chat_log(n_responses, languages, verses, unique_share)
+
+    print("=" * 70)
+    print("TRANSLATION MEMORY BENCHMARK")
+    print("=" * 70)
+    print(f"responses={n_responses} languages={','.join(languages)} "
+          f"stub latency={CALL_LATENCY_SECONDS * 1000:.0f} ms/call + "
+          f"{SENTENCE_LATENCY_SECONDS * 1000:.0f} ms/sentence, "
+          f"{unique_share:.0%} of responses carry a unique sentence")
+    print(f"\n{'mode':<22} {'calls':>6} {'sentences':>10} {'chars':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'total s':>8}")
+    runs = [
+        ("whole-response cache", await _legacy(log)),
+        ("memory (cold)", await _memory(log, verses, languages, prewarm=False)),
+        ("memory (verses warm)", await _memory(log, verses, languages, prewarm=True)),
+    ]
+    baseline_calls = runs[0][1]["calls"]
+    for name, stats in runs:
+        lat = stats["latencies"]
+        print(f"{name:<22} {stats['calls']:>6} {stats['sentences']:>10} {stats['chars']:>8} "
+              f"{_pct(lat, 50):>8.1f} {_pct(lat, 95):>8.1f} {sum(lat):>8.2f}")
+    for name, stats in runs[1:]:
+        saved = baseline_calls - stats["calls"]
+        print(f"\n{name}: {saved} provider calls saved "
+              f"({saved / baseline_calls * 100:.0f}% of {baseline_calls})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--responses", type=int, default=400)
+    parser.add_argument("--languages", default="hi,es,ta")
+    parser.add_argument("--unique-share", type=float, default=0.3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.responses, args.languages.split(","), args.unique_share))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Concurrent KIAAN Message Quota Benchmark.
+
+Serves the real /api/chat router against a SQLite database and fires
+bursts of concurrent POST /api/chat/message requests per user, as a user
+double-sending or several open tabs do. The AI provider call (kiaan_core)
+is replaced by a canned reply. Each scenario runs twice: without Redis
+(usage counted in usage_tracking) and with an in-process fakeredis server
+standing in for Redis.
+
+Reports messages/second, p50 / p95 latency and usage_tracking statements
+per message for Sadhak users (300 questions/month), then sends a burst of
+20 messages from a free user (5 questions/month) and counts how many were
+answered: the quota must hold under concurrency. Each user's final usage
+is checked against the number of answered messages.
+
+Only public entry points are used, so the same script can be run against
+an older checkout for comparison.
+
+Usage:
+    python scripts/bench_usage_ledger.py [--users 20] [--burst 10] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_REPLY = {
+    "response": "Breathe, and return to the work in front of you.",
+    "verses_used": [],
+    "validation": {"valid": True, "errors": []},
+    "context": "general",
+    "provider": "bench",
+    "conversational": True,
+}
+
+
+async def _seed(session_maker, n_users: int) -> tuple[list[str], str]:
+    from backend.models import (
+        SubscriptionPlan,
+        SubscriptionStatus,
+        SubscriptionTier,
+        User,
+        UserSubscription,
+    )
+
+    async with session_maker() as db:
+        plans = [
+            SubscriptionPlan(tier=tier, name=tier.value, price_monthly=Decimal("1.00"),
+                             kiaan_questions_monthly=quota, encrypted_journal=True, data_retention_days=30)
+            for tier, quota in ((SubscriptionTier.SADHAK, 300), (SubscriptionTier.FREE, 5))
+        ]
+        users = [User(auth_uid=f"bench-{i}", email=f"bench-{i}@example.com", hashed_password="x")
+                 for i in range(n_users + 1)]
+        db.add_all(plans + users)
+        await db.commit()
+        now = datetime.now(UTC)
+        db.add_all([
+            UserSubscription(user_id=u.id, plan_id=plans[i == n_users].id, status=SubscriptionStatus.ACTIVE,
+                             current_period_start=now, current_period_end=now + timedelta(days=30))
+            for i, u in enumerate(users)
+        ])
+        await db.commit()
+        # The last user is on the free tier
+        return [u.id for u in users[:-1]], users[-1].id
+
+
+async def _run(with_redis: bool, n_users: int, burst: int, rounds: int) -> None:
+    import fakeredis.aioredis
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.cache.redis_cache import RedisCache
+    from backend.deps import get_db
+    from backend.models import (
+        KiaanChatMessage,
+        SubscriptionPlan,
+        UsageTracking,
+        User,
+        UserSubscription,
+    )
+    from backend.routes.chat import router as chat_router
+    from backend.security.jwt import create_access_token
+    from backend.services.entitlement_cache import clear_local_entitlements
+    from backend.services.kiaan_core import kiaan_core
+    from backend.services.subscription_service import get_usage_stats
+
+    cache = RedisCache()
+    if with_redis:
+        cache._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        cache._connected = True
+
+    async def _get_redis_cache():
+        return cache
+
+    clear_local_entitlements()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.sqlite", connect_args={"timeout": 30})
+        async with engine.begin() as conn:
+            for model in (User, SubscriptionPlan, UserSubscription, UsageTracking, KiaanChatMessage):
+                await conn.run_sync(model.__table__.create)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        user_ids, free_user = await _seed(session_maker, n_users)
+
+        usage_statements = 0
+
+        def _count(conn, cursor, statement, *args):
+            nonlocal usage_statements
+            if "usage_tracking" in statement.split("WHERE")[0]:
+                usage_statements += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _count)
+
+        async def _db():
+            async with session_maker() as session:
+                yield session
+
+        app = FastAPI()
+        app.include_router(chat_router)
+        app.dependency_overrides[get_db] = _db
+        tokens = {uid: create_access_token(uid, f"s-{uid}") for uid in [*user_ids, free_user]}
+        answered = dict.fromkeys(tokens, 0)
+        timings = []
+
+        async def send(client, uid):
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/chat/message", json={"message": "I feel stuck at work"},
+                headers={"Authorization": f"Bearer {tokens[uid]}"},
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+            if response.json().get("status") == "success":
+                answered[uid] += 1
+
+        with patch.object(kiaan_core, "get_kiaan_response", AsyncMock(return_value=_REPLY)), \
+                patch("backend.cache.redis_cache.get_redis_cache", _get_redis_cache):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    await asyncio.gather(*(send(client, uid) for uid in user_ids for _ in range(burst)))
+                elapsed = time.perf_counter() - start
+                n_messages = len(timings)
+                usage_per_message = usage_statements / n_messages
+
+                await asyncio.gather(*(send(client, free_user) for _ in range(20)))
+
+            async with session_maker() as db:
+                mismatched = 0
+                for uid in [*user_ids, free_user]:
+                    stats = await get_usage_stats(db, uid)
+                    mismatched += stats["usage_count"] != answered[uid]
+        await engine.dispose()
+
+    timings = timings[:n_messages]
+    timings.sort()
+    label = "ledger (fakeredis)" if with_redis else "database only"
+    print(f"{label:<20} {n_messages / elapsed:>8.1f} {statistics.median(timings):>9.2f} "
+          f"{timings[int(len(timings) * 0.95) - 1]:>9.2f} {usage_per_message:>12.2f} "
+          f"{answered[free_user]:>9}/5 {mismatched:>10}")
+
+
+async def main(n_users: int, burst: int, rounds: int) -> None:
+    from backend.middleware.rate_limiter import limiter
+
+    print("=" * 70)
+    print("CONCURRENT KIAAN MESSAGE QUOTA BENCHMARK")
+    print("=" * 70)
+    print(f"users={n_users}, concurrent messages per user={burst}, rounds={rounds}")
+    print(f"\n{'':<20} {'msg/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'usage SQL/msg':>12} "
+          f"{'free burst':>11} {'mismatched':>10}")
+
+    limiter.enabled = False
+    for with_redis in (False, True):
+        await _run(with_redis, n_users, burst, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.burst, args.rounds))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Verse Application Graph Benchmark.
+
+Seeds a SQLite database with a synthetic graph aggregated from --signals
+feedback events (Zipf-distributed over verses, moods and topics), then
+measures how many record_show/record_signal events per second the graph
+absorbs on the request path and end to end (until they are in the table),
+and the median/p95 latency of recommend() with a few excluded verses.
+When the graph has a top-k table, recommend() is measured both before
+(live scoring) and after refresh_recommendations().
+
+Only the graph's public methods are used, so the same script can be run
+against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_verse_graph.py [--signals 1000000] [--events 20000] [--queries 500]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MOODS = ["anxious", "sad", "angry", "stressed", "lonely", "confused", "hopeful", "grieving",
+         "restless", "jealous", "afraid", "guilty", "numb", "overwhelmed", "calm", "grateful"]
+TOPICS = ["work", "family", "relationship", "academic", "health", "purpose", "money", "friends"]
+VERSES = [f"{c}.{v}" for c in range(1, 19) for v in range(1, 40)]
+
+
+def _zipf_choice(rng: random.Random, items: list, s: float = 1.1):
+    weights = [1 / (i + 1) ** s for i in range(len(items))]
+    return lambda k: rng.choices(items, weights=weights, k=k)
+
+
+def _seed(path: str, n_signals: int) -> int:
+    from sqlalchemy import create_engine
+
+    from backend.models import self_sufficiency
+    from backend.models.self_sufficiency import VerseApplicationEdge
+    from backend.services.kiaan_verse_application_graph import (
+        LEARNING_RATE,
+        VerseApplicationGraph,
+    )
+
+    rng = random.Random(11)
+    moods, topics, verses = _zipf_choice(rng, MOODS), _zipf_choice(rng, TOPICS), _zipf_choice(rng, VERSES, 0.8)
+    edges: dict[tuple, list] = {}
+    signals = zip(
+        moods(n_signals), topics(n_signals), verses(n_signals),
+        (rng.random() for _ in range(n_signals)), strict=True,
+    )
+    for m, t, v, r in signals:
+        e = edges.setdefault((v, m, t), [0.5, 0, 0, 0])
+        positive = r < 0.65
+        e[0] = VerseApplicationGraph._calculate_weight(e[0], positive, LEARNING_RATE)
+        e[1 if positive else 2] += 1
+        e[3] += 1 + (r < 0.5)
+
+    engine = create_engine(f"sqlite:///{path}")
+    VerseApplicationEdge.__table__.create(engine)
+    if hasattr(self_sufficiency, "VerseRecommendation"):
+        self_sufficiency.VerseRecommendation.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(VerseApplicationEdge.__table__.insert(), [
+            {
+                "verse_ref": v, "mood": m, "topic": t, "weight": w, "positive_signals": p,
+                "negative_signals": n, "times_shown": shown,
+                "confidence": VerseApplicationGraph._calculate_confidence(p, n, shown),
+            }
+            for (v, m, t), (w, p, n, shown) in edges.items()
+        ])
+    engine.dispose()
+    return len(edges)
+
+
+async def _recommend_latency(graph, session_maker, n: int) -> tuple[float, float]:
+    """Situations are drawn with the same skew as the feedback traffic."""
+    rng = random.Random(5)
+    moods, topics = _zipf_choice(rng, MOODS)(n), _zipf_choice(rng, TOPICS)(n)
+    timings = []
+    async with session_maker() as db:
+        for mood, topic in zip(moods, topics, strict=True):
+            exclude = rng.sample(VERSES, 3)
+            start = time.perf_counter()
+            await graph.recommend(db, mood, topic, exclude_refs=exclude, limit=3)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def main(n_signals: int, n_events: int, n_queries: int) -> None:
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from backend.services.kiaan_verse_application_graph import VerseApplicationGraph
+
+    print("=" * 70)
+    print("VERSE APPLICATION GRAPH BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = f"{tmp}/graph.sqlite"
+        start = time.perf_counter()
+        n_edges = _seed(db_path, n_signals)
+        print(f"seeded {n_signals:,} signals into {n_edges:,} edges in {time.perf_counter() - start:.1f}s")
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        graph = VerseApplicationGraph()
+
+        rng = random.Random(17)
+        moods, topics, verses = _zipf_choice(rng, MOODS), _zipf_choice(rng, TOPICS), _zipf_choice(rng, VERSES, 0.8)
+        events = list(zip(
+            moods(n_events), topics(n_events), verses(n_events),
+            (rng.random() for _ in range(n_events)), strict=True,
+        ))
+
+        if hasattr(graph, "start"):
+            await graph.start(session_maker)
+        request_path = 0.0
+        end_to_end = time.perf_counter()
+        async with session_maker() as db:
+            for mood, topic, verse, r in events:
+                t = time.perf_counter()
+                if r < 0.5:
+                    await graph.record_show(db, verse, mood, topic)
+                else:
+                    await graph.record_signal(db, verse, mood, topic, r < 0.8)
+                request_path += time.perf_counter() - t
+                await asyncio.sleep(0)  # request boundary: let the flusher run
+        if hasattr(graph, "stop"):
+            await graph.stop()
+        end_to_end = time.perf_counter() - end_to_end
+
+        print(f"\n{'metric':<46} {'value':>14}")
+        print(f"{'events absorbed, request path (events/s)':<46} {n_events / request_path:>14,.0f}")
+        print(f"{'events persisted, end to end (events/s)':<46} {n_events / end_to_end:>14,.0f}")
+
+        median, p95 = await _recommend_latency(graph, session_maker, n_queries)
+        print(f"{'recommend, live scoring (median / p95 ms)':<46} {median:>6.2f} / {p95:>5.2f}")
+        if hasattr(graph, "refresh_recommendations"):
+            async with session_maker() as db:
+                start = time.perf_counter()
+                situations = await graph.refresh_recommendations(db)
+                refresh_s = time.perf_counter() - start
+            print(f"{'full top-k refresh (situations / s)':<46} {situations:>6} / {refresh_s:>5.2f}")
+            median, p95 = await _recommend_latency(graph, session_maker, n_queries)
+            print(f"{'recommend, precomputed top-k (median / p95 ms)':<46} {median:>6.2f} / {p95:>5.2f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--signals", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.signals, args.events, args.queries))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Voice Prosody Benchmark.
+
+Measures the CPU cost per second of audio of the frame-wise prosody
+extractor (voice_prosody) against the previous single-window estimator,
+which ran ``np.correlate(..., mode='full')`` over up to one second of
+audio and returned one pitch value per utterance. Also times streaming
+use (ProsodyTracker fed 100 ms chunks) and checks pitch accuracy on
+synthetic voiced audio with a known contour.
+
+Usage:
+    python scripts/bench_voice_prosody.py [--durations 1,5,30] [--rounds 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from backend.services import voice_prosody as vp
+
+RATE = 16000
+
+
+def _legacy_estimate_pitch(audio: np.ndarray, sample_rate: int) -> float:
+    """The previous WhisperService._estimate_pitch, minus normalisation."""
+    audio_window = audio[:min(len(audio), sample_rate)]
+    correlation = np.correlate(audio_window, audio_window, mode="full")
+    correlation = correlation[len(correlation) // 2:]
+    min_period, max_period = sample_rate // 500, sample_rate // 50
+    peak_idx = np.argmax(correlation[min_period:max_period]) + min_period
+    return sample_rate / peak_idx
+
+
+def _speech_like(seconds: float, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Voiced syllables on a drifting pitch, with pauses; returns (audio, f0 per sample)."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    f0 = 150 + 40 * np.sin(2 * np.pi * 0.3 * t) + 10 * np.sin(2 * np.pi * 1.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllable = 0.5 - 0.5 * np.cos(2 * np.pi * 4 * t)
+    pauses = (np.sin(2 * np.pi * 0.25 * t) > -0.7).astype(float)
+    audio = 0.15 * voiced * syllable * pauses + 0.002 * rng.standard_normal(n)
+    return audio.astype(np.float32), f0
+
+
+def _time(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(durations: list[float], rounds: int) -> None:
+    print("=" * 70)
+    print("VOICE PROSODY BENCHMARK")
+    print("=" * 70)
+    print(f"{RATE} Hz, {vp.FRAME_MS} ms frames / {vp.HOP_MS} ms hop, median of {rounds} rounds")
+    print(f"\n{'audio s':>8} {'legacy ms':>10} {'legacy ms/s':>12} {'frames ms':>10} "
+          f"{'frames ms/s':>12} {'stream ms/s':>12} {'f0 err %':>9}")
+
+    for seconds in durations:
+        audio, f0 = _speech_like(seconds)
+        legacy = _time(lambda audio=audio: _legacy_estimate_pitch(audio, RATE), rounds)
+        framed = _time(lambda audio=audio: vp.extract_prosody(audio, RATE), rounds)
+
+        def _stream(audio=audio):
+            tracker = vp.ProsodyTracker(RATE)
+            for i in range(0, len(audio), RATE // 10):
+                tracker.process(audio[i:i + RATE // 10])
+            return tracker.summary()
+
+        streamed = _time(_stream, rounds)
+
+        frames = vp.ProsodyTracker(RATE)
+        frames.process(audio)
+        contour = frames.frames
+        truth = f0[(contour.times[contour.voiced] * RATE).astype(int)]
+        error = np.median(np.abs(contour.f0_hz[contour.voiced] - truth) / truth) * 100
+
+        print(f"{seconds:>8.0f} {legacy * 1000:>10.2f} {legacy * 1000 / seconds:>12.2f} "
+              f"{framed * 1000:>10.2f} {framed * 1000 / seconds:>12.2f} "
+              f"{streamed * 1000 / seconds:>12.2f} {error:>9.2f}")
+
+    print("\nlegacy: one pitch value from the first second only; "
+          "frames: full contour, pauses, speech rate and tremor")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--durations", default="1,5,30")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main([float(d) for d in args.durations.split(",")], args.rounds)
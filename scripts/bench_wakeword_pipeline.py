@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Wake Word Data Pipeline Benchmark.
+
+Renders training scenarios to log-mel features and reports clips/sec per
+core and end-to-end epoch time for:
+
+- serial, previous augmenter (impulse response and filter designs rebuilt
+  for every clip, ``signal.convolve``)
+- serial, cached impulse responses / filters and FFT convolution
+- the process-pool pipeline at each worker count, writing the sharded
+  feature store
+- replaying the stored epoch from the memory-mapped shards
+
+Audio comes from the offline synthetic speech source, so no TTS calls
+are made. Needs the wake-word training requirements
+(native/ml/training/requirements.txt).
+
+Usage:
+    python scripts/bench_wakeword_pipeline.py [--clips 512] [--workers 1,2,4]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add native ML engine to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "native" / "ml" / "engine"))
+
+import data_pipeline
+import numpy as np
+from audio_synthesizer import AudioAugmenter
+from continuous_learning_engine import (
+    ContinuousLearningConfig,
+    InfiniteScenarioGenerator,
+)
+from scipy import signal
+
+
+class LegacyAugmenter(AudioAugmenter):
+    """Previous behaviour: nothing cached, signal.convolve per clip."""
+
+    def _butter(self, order, cutoff, btype):
+        return signal.butter(order, np.asarray(cutoff) / (self.sample_rate / 2), btype=btype)
+
+    def add_reverb(self, audio, level):
+        self._impulse_responses.clear()
+        reverb = signal.convolve(audio, self.impulse_response(level), mode="same")
+        return (1 - level * 0.5) * audio + level * 0.5 * reverb
+
+
+def _serial(config, payloads, legacy: bool) -> float:
+    data_pipeline._init_worker({
+        "sample_rate": config.sample_rate, "duration": config.duration, "n_mels": config.n_mels,
+        "n_fft": config.n_fft, "hop_length": config.hop_length, "seed": 7,
+    })
+    if legacy:
+        data_pipeline._worker["augmenter"] = LegacyAugmenter(config.sample_rate)
+    start = time.perf_counter()
+    for i in range(0, len(payloads), config.pipeline_chunk_size):
+        data_pipeline.render_chunk(payloads[i:i + config.pipeline_chunk_size])
+    return time.perf_counter() - start
+
+
+async def _pipelined(config, scenarios, store_dir) -> tuple:
+    pipeline = data_pipeline.FeaturePipeline(config)
+    store = data_pipeline.ShardedFeatureStore(store_dir, config.feature_shard_size)
+    # Warm the pool so process start-up is not billed to the epoch
+    await pipeline.process(scenarios[:config.pipeline_chunk_size * pipeline.workers])
+    start = time.perf_counter()
+    result = await pipeline.process(scenarios, store=store)
+    elapsed = time.perf_counter() - start
+    pipeline.close()
+    return elapsed, len(result.ids), store
+
+
+def main(n_clips: int, worker_counts: list) -> None:
+    random.seed(0)
+    config = ContinuousLearningConfig(pipeline_chunk_size=16)
+    scenarios = list(InfiniteScenarioGenerator(config).generate(n_clips))
+    payloads = asyncio.run(data_pipeline.FeaturePipeline(config)._payloads(scenarios))
+
+    print("=" * 70)
+    print("WAKE WORD DATA PIPELINE BENCHMARK")
+    print("=" * 70)
+    print(f"clips={n_clips} x {config.duration:.1f}s chunk={config.pipeline_chunk_size} cpus={os.cpu_count()}")
+    print(f"\n{'mode':<34} {'epoch s':>8} {'clips/s':>9} {'clips/s/core':>13}")
+
+    for name, legacy in [("serial, previous augmenter", True), ("serial, cached IR/filters + FFT", False)]:
+        elapsed = _serial(config, payloads, legacy)
+        print(f"{name:<34} {elapsed:>8.2f} {n_clips / elapsed:>9.1f} {n_clips / elapsed:>13.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = None
+        for workers in worker_counts:
+            config.pipeline_workers = workers
+            elapsed, done, store = asyncio.run(_pipelined(config, scenarios, f"{tmp}/w{workers}"))
+            cores = min(workers, os.cpu_count() or 1)
+            print(f"{f'pool, {workers} workers (+ store)':<34} {elapsed:>8.2f} {done / elapsed:>9.1f} "
+                  f"{done / elapsed / cores:>13.1f}")
+
+        start = time.perf_counter()
+        rows = sum(len(y) for _, y in store.iter_batches(1024))
+        elapsed = time.perf_counter() - start
+        print(f"{'replay epoch from store':<34} {elapsed:>8.2f} {rows / elapsed:>9.0f} {'-':>13}")
+        print(f"\nstore: {len(store.shards)} shard(s), feature shape {store.feature_shape}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clips", type=int, default=512)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+    main(args.clips, [int(w) for w in args.workers.split(",")])
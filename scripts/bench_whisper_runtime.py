@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Whisper Runtime Benchmark.
+
+Runs concurrent transcriptions of short clips on CPU and compares the
+previous runtime (temp file per request, one model per streaming session,
+unbounded ``asyncio.to_thread``) with the shared model registry and the
+bounded inference pool. Reports process RSS, throughput and queue time.
+
+Needs faster-whisper and a model: either network access to download
+``--model`` from the Hugging Face hub, or ``--model-path`` pointing at a
+local CTranslate2 model directory. ``--decode-only`` compares the audio
+decode paths alone and needs neither.
+
+Usage:
+    python scripts/bench_whisper_runtime.py [--model tiny] [--clips 48] [--sessions 4] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import gc
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import psutil
+
+from backend.services import whisper_transcription as wt
+
+
+def _rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1e6
+
+
+def _clip(seconds: float, seed: int) -> bytes:
+    """A few seconds of voiced, speech-like WAV audio (16-bit, 44.1 kHz mono)."""
+    rate = 44100
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voiced = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / rate) / k for k in range(1, 6))
+    envelope = (np.sin(2 * np.pi * 3 * t) > -0.2).astype(float)
+    audio = 0.2 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+def _decode_via_temp_file(audio_data: bytes) -> np.ndarray:
+    from faster_whisper.audio import decode_audio
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        path = f.name
+        f.write(audio_data)
+    try:
+        return decode_audio(path)
+    finally:
+        os.unlink(path)
+
+
+def bench_decode(clips: list[bytes], rounds: int = 5) -> None:
+    print(f"\n{'decode path':<28} {'ms/clip p50':>12}")
+    paths = [("in-memory (decode_audio)", wt.decode_audio)]
+    try:
+        import faster_whisper.audio  # noqa: F401
+
+        paths.insert(0, ("temp file + PyAV", _decode_via_temp_file))
+    except ImportError:
+        pass
+    for name, fn in paths:
+        timings = []
+        for _ in range(rounds):
+            for clip in clips:
+                start = time.perf_counter()
+                fn(clip)
+                timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<28} {statistics.median(timings):>12.2f}")
+
+
+async def _legacy(model_ref: str, clips: list[bytes], sessions: int) -> dict:
+    """One model per streaming session, temp file per request, no queue bound."""
+    from faster_whisper import WhisperModel
+
+    rss_before = _rss_mb()
+    models = [WhisperModel(model_ref, device="cpu", compute_type="int8") for _ in range(sessions)]
+    rss_loaded = _rss_mb()
+
+    def _run(model, clip):
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            path = f.name
+            f.write(clip)
+        try:
+            segments, _ = model.transcribe(path, beam_size=1)
+            return " ".join(s.text for s in segments)
+        finally:
+            os.unlink(path)
+
+    start = time.perf_counter()
+    latencies = []
+
+    async def _one(i, clip):
+        t0 = time.perf_counter()
+        await asyncio.to_thread(_run, models[i % sessions], clip)
+        latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(_one(i, c) for i, c in enumerate(clips)))
+    elapsed = time.perf_counter() - start
+    result = {
+        "rss_models": rss_loaded - rss_before, "rss_peak": _rss_mb(), "elapsed": elapsed,
+        "latencies": latencies, "models": sessions,
+    }
+    models.clear()
+    gc.collect()
+    return result
+
+
+async def _pooled(model_ref: str, clips: list[bytes], sessions: int, concurrency: int) -> dict:
+    rss_before = _rss_mb()
+    pool = wt.WhisperInferencePool(workers=2, queue_size=len(clips))
+    services = [wt.StreamingWhisperService(model_ref).service for _ in range(sessions)]
+    for service in services:
+        service.pool = pool
+        service.device, service.compute_type = "cpu", "int8"
+        assert await service.load_model()
+    rss_loaded = _rss_mb()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def _one(i, clip):
+        async with semaphore:
+            t0 = time.perf_counter()
+            await services[i % sessions].transcribe(
+                clip, wt.TranscriptionConfig(language=wt.TranscriptionLanguage.ENGLISH,
+                                             word_timestamps=False, vad_filter=False),
+            )
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(i, c) for i, c in enumerate(clips)))
+    elapsed = time.perf_counter() - start
+    return {
+        "rss_models": rss_loaded - rss_before, "rss_peak": _rss_mb(), "elapsed": elapsed,
+        "latencies": latencies, "models": len(wt.loaded_whisper_models()),
+        "pool": pool.get_metrics(),
+    }
+
+
+async def main(args) -> int:
+    clips = [_clip(args.clip_seconds, i) for i in range(args.clips)]
+    print("=" * 70)
+    print("WHISPER RUNTIME BENCHMARK")
+    print("=" * 70)
+    print(f"clips={args.clips} x {args.clip_seconds:.1f}s sessions={args.sessions} "
+          f"concurrency={args.concurrency} cpus={os.cpu_count()}")
+
+    bench_decode(clips[:8])
+    if args.decode_only:
+        return 0
+
+    model_ref = args.model_path or args.model
+    try:
+        from faster_whisper import WhisperModel
+
+        WhisperModel(model_ref, device="cpu", compute_type="int8")
+    except Exception as e:
+        print(f"\nCannot load Whisper model '{model_ref}': {type(e).__name__}: {e}")
+        print("Pass --model-path to a local CTranslate2 model, or run with network access.")
+        return 1
+    gc.collect()
+
+    print(f"\n{'runtime':<26} {'models':>6} {'model RSS':>10} {'peak RSS':>9} "
+          f"{'clips/s':>8} {'p50 s':>6} {'p95 s':>6}")
+    runs = [
+        ("per-session models", await _legacy(model_ref, clips, args.sessions)),
+        ("registry + bounded pool", await _pooled(model_ref, clips, args.sessions, args.concurrency)),
+    ]
+    for name, r in runs:
+        lat = sorted(r["latencies"])
+        print(f"{name:<26} {r['models']:>6} {r['rss_models']:>7.0f} MB {r['rss_peak']:>6.0f} MB "
+              f"{len(clips) / r['elapsed']:>8.2f} {lat[len(lat) // 2]:>6.2f} "
+              f"{lat[int(len(lat) * 0.95) - 1]:>6.2f}")
+    pool = runs[1][1]["pool"]
+    print(f"\npool: workers={pool['workers']} avg queue {pool['avg_queue_ms']} ms, "
+          f"p95 queue {pool['p95_queue_ms']} ms, avg inference {pool['avg_inference_ms']} ms, "
+          f"peak depth {pool['peak_depth']}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--clips", type=int, default=48)
+    parser.add_argument("--clip-seconds", type=float, default=3.0)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--decode-only", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
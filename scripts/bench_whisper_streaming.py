@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Streaming Whisper Benchmark.
+
+Plays recorded audio fixtures through StreamingWhisperService in
+simulated real time (100 ms chunks) and reports partial latency and the
+word error rate of the streamed transcript against the batch path
+(``WhisperService.transcribe`` on the whole file), alongside the old
+fixed-window behaviour (2 s buffer, transcribe and discard).
+
+Latency is measured on a virtual clock: a chunk is available at its
+stream position, and each transcription advances the clock by the time it
+actually took, so a slow model shows up as lag.
+
+Needs faster-whisper and a model (``--model`` from the Hugging Face hub,
+or ``--model-path`` to a local CTranslate2 model directory).
+
+Usage:
+    python scripts/bench_whisper_streaming.py [--fixtures backend/static/audio] [--model tiny]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from backend.services import whisper_transcription as wt
+
+CHUNK_SECONDS = 0.1
+
+
+def word_error_rate(reference: list[str], hypothesis: list[str]) -> float:
+    """Levenshtein distance over words, divided by the reference length."""
+    if not reference:
+        return float(bool(hypothesis))
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i] + [0] * len(hypothesis)
+        for j, hyp in enumerate(hypothesis, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref != hyp))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def _words(text: str) -> list[str]:
+    return ["".join(c for c in w.lower() if c.isalnum()) for w in text.split() if any(c.isalnum() for c in w)]
+
+
+async def _streaming(service_kwargs: dict, audio: np.ndarray) -> dict:
+    stream = wt.StreamingWhisperService(**service_kwargs)
+    step = int(CHUNK_SECONDS * wt.WHISPER_SAMPLE_RATE)
+    clock = 0.0
+    partial_lags, finals, final_lags = [], [], []
+    for i in range(0, len(audio), step):
+        position = (i + step) / wt.WHISPER_SAMPLE_RATE
+        clock = max(clock, position)
+        start = time.perf_counter()
+        updates = await stream.feed(audio[i:i + step])
+        clock += time.perf_counter() - start
+        for update in updates:
+            if update.is_final:
+                finals.append(update.committed)
+                final_lags.append(clock - update.stream_seconds)
+            else:
+                partial_lags.append(clock - position + CHUNK_SECONDS)
+    start = time.perf_counter()
+    final = await stream.flush()
+    if final is not None:
+        finals.append(final.committed)
+        final_lags.append(time.perf_counter() - start)
+    return {"text": " ".join(finals), "partial_lags": partial_lags, "final_lags": final_lags}
+
+
+async def _fixed_window(service: wt.WhisperService, audio: np.ndarray) -> dict:
+    """Previous StreamingWhisperService: 2 s buffers transcribed from scratch."""
+    window = 2 * wt.WHISPER_SAMPLE_RATE
+    texts, lags = [], []
+    for i in range(0, len(audio), window):
+        start = time.perf_counter()
+        result = await service.transcribe_samples(audio[i:i + window])
+        # A partial only appears once the 2 s buffer has filled
+        lags.append(2.0 + time.perf_counter() - start)
+        texts.append(result.text)
+    return {"text": " ".join(texts), "partial_lags": lags, "final_lags": lags}
+
+
+async def main(args) -> int:
+    fixtures = sorted(p for p in Path(args.fixtures).iterdir()
+                      if p.suffix.lower() in {".wav", ".mp3", ".ogg", ".webm", ".m4a", ".opus"})
+    model_ref = args.model_path or args.model
+    service = wt.get_whisper_service(model_ref)
+    service.device, service.compute_type = "cpu", "int8"
+    if not await service.load_model():
+        print(f"Cannot load Whisper model '{model_ref}'. "
+              "Pass --model-path to a local CTranslate2 model, or run with network access.")
+        return 1
+
+    print("=" * 70)
+    print("STREAMING WHISPER BENCHMARK")
+    print("=" * 70)
+    print(f"model={model_ref} fixtures={len(fixtures)} chunk={CHUNK_SECONDS * 1000:.0f} ms")
+    print(f"\n{'fixture':<24} {'mode':<13} {'WER vs batch':>12} {'partial p50':>12} "
+          f"{'partial p95':>12} {'final p50':>10}")
+
+    totals: dict[str, list[float]] = {"streaming": [], "fixed-2s": []}
+    for path in fixtures:
+        audio = wt.decode_audio(path.read_bytes())
+        reference = _words((await service.transcribe_samples(audio)).text)
+        runs = {
+            "streaming": await _streaming({"model_size": model_ref}, audio),
+            "fixed-2s": await _fixed_window(service, audio),
+        }
+        for mode, run in runs.items():
+            wer = word_error_rate(reference, _words(run["text"]))
+            totals[mode].append(wer)
+            lags = sorted(run["partial_lags"]) or [float("nan")]
+            print(f"{path.name[:24]:<24} {mode:<13} {wer:>12.2%} "
+                  f"{statistics.median(lags):>10.2f} s {lags[int(len(lags) * 0.95) - 1]:>10.2f} s "
+                  f"{statistics.median(run['final_lags'] or [float('nan')]):>8.2f} s")
+
+    print()
+    for mode, wers in totals.items():
+        if wers:
+            print(f"mean WER vs batch ({mode}): {statistics.mean(wers):.2%}")
+    print(f"inference pool: {wt.get_inference_metrics()}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixtures", default=str(Path(__file__).parent.parent / "backend" / "static" / "audio"))
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--model-path", default=None)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    sys.exit(asyncio.run(main(args)))
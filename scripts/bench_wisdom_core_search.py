@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+WisdomCore Search Latency Benchmark.
+
+Seeds a SQLite database with the 701 verses and a batch of synthetic,
+validated learned-wisdom rows, then reports median and p95 latency of
+WisdomCore.search (with and without learned wisdom), get_for_enemy,
+get_by_theme and get_by_domain. Deduplication cost is measured separately
+on the search candidate lists.
+
+Only WisdomCore's public entry points (plus _deduplicate_results) are used,
+so the same script can be run against an older checkout for comparison.
+
+Usage:
+    python scripts/bench_wisdom_core_search.py [--learned 500] [--repeat 30]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+QUERIES = [
+    "I feel anxious about my exam results", "my partner gets angry at me", "how do I let go of attachment",
+    "grief after losing my father", "stress at work and deadlines", "I am jealous of my friend",
+    "finding my duty and purpose", "peace of mind and meditation",
+]
+
+
+def _seed(path: str, n_learned: int) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.models import ContentSourceType, LearnedWisdom, ValidationStatus
+    from backend.models.wisdom import GitaVerse
+
+    verses = json.loads((Path(__file__).parent.parent / "data" / "gita" / "gita_verses_complete.json").read_text())
+    engine = create_engine(f"sqlite:///{path}")
+    GitaVerse.__table__.create(engine)
+    LearnedWisdom.__table__.create(engine)
+    rng = random.Random(7)
+    words = " ".join(v["english"] for v in verses).lower().split()
+    themes = sorted({v["theme"] for v in verses})
+    with engine.begin() as conn:
+        conn.execute(GitaVerse.__table__.insert(), [
+            {
+                "chapter": v["chapter"], "verse": v["verse"], "sanskrit": v["sanskrit"],
+                "transliteration": v["transliteration"], "hindi": v["hindi"], "english": v["english"],
+                "principle": v["principle"], "theme": v["theme"],
+                "mental_health_applications": v["mental_health_applications"],
+                "primary_domain": (v["mental_health_applications"] or [None])[0],
+                "secondary_domains": v["mental_health_applications"][1:3],
+            }
+            for v in verses
+        ])
+        if n_learned:
+            conn.execute(LearnedWisdom.__table__.insert(), [
+                {
+                    "content": " ".join(rng.choices(words, k=40)), "content_hash": f"{i:064x}",
+                    "source_type": ContentSourceType.MANUAL, "source_name": "bench", "language": "en",
+                    "themes": rng.sample(themes, 2), "keywords": rng.sample(words, 4),
+                    "shad_ripu_tags": rng.sample(["kama", "krodha", "lobha", "moha", "mada", "matsarya"], 1),
+                    "quality_score": rng.random(), "validation_status": ValidationStatus.VALIDATED,
+                }
+                for i in range(n_learned)
+            ])
+    engine.dispose()
+
+
+async def _time(fn, args, repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        for a in args:
+            start = time.perf_counter()
+            await fn(a)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def main(n_learned: int, repeat: int) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from backend.services.wisdom_core import WisdomCore
+
+    print("=" * 70)
+    print("WISDOMCORE SEARCH LATENCY BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = f"{tmp}/wisdom.sqlite"
+        _seed(db_path, n_learned)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        core = WisdomCore()
+
+        async with AsyncSession(engine) as db:
+            await core.search(db, QUERIES[0])  # warm the verse cache
+
+            candidates = []
+            for q in QUERIES:
+                original = core._deduplicate_results
+                core._deduplicate_results = lambda results, *_: candidates.append(list(results)) or results
+                await core.search(db, q, include_learned=False)
+                core._deduplicate_results = original
+
+            async def dedup(results):
+                core._deduplicate_results(results)
+
+            rows = [
+                ("search, Gita only", lambda q: core.search(db, q, include_learned=False), QUERIES),
+                (f"search, Gita + {n_learned} learned", lambda q: core.search(db, q), QUERIES),
+                ("get_for_enemy", lambda e: core.get_for_enemy(db, e, include_learned=False),
+                 ["kama", "krodha", "lobha", "moha", "mada", "matsarya"]),
+                ("get_by_theme", lambda t: core.get_by_theme(db, t, include_learned=False),
+                 ["equanimity", "duty", "devotion", "self"]),
+                ("get_by_domain", lambda d: core.get_by_domain(db, d, include_learned=False),
+                 ["anxiety", "depression", "stress", "grief"]),
+                ("_deduplicate_results (20 candidates)", dedup, candidates),
+            ]
+            print(f"learned rows={n_learned}, repeat={repeat}")
+            print(f"\n{'operation':<44} {'median ms':>12} {'p95 ms':>12}")
+            for label, fn, args in rows:
+                median, p95 = await _time(fn, args, repeat)
+                print(f"{label:<44} {median:>12.3f} {p95:>12.3f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learned", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.learned, args.repeat))
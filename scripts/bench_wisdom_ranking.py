@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Wisdom Effectiveness Ranking Benchmark.
+
+Seeds wisdom_effectiveness in a SQLite database with --rows deliveries
+(12 moods x 700 verses, ~80% with a recorded outcome) and times
+DynamicWisdomCorpus._get_effectiveness_scores() with its cache cleared
+before every call, i.e. the cost of each cache miss. When the rollup
+table exists it is backfilled with rebuild_effectiveness_rollups() first
+and the backfill time is reported.
+
+_get_effectiveness_scores() has the same signature in older checkouts, so
+the same script can be run against one for comparison.
+
+Usage:
+    python scripts/bench_wisdom_ranking.py [--rows 1000000] [--queries 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_MOODS = (
+    "anxious", "sad", "angry", "confused", "lonely", "overwhelmed",
+    "fearful", "frustrated", "stressed", "guilty", "hurt", "jealous",
+)
+_VERSES = 700
+
+_SEED = f"""
+WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < :rows)
+INSERT INTO wisdom_effectiveness (
+    user_id, session_id, verse_ref, mood_at_delivery, phase_at_delivery, effectiveness, delivered_at)
+SELECT 'user-' || (i % 5000), 'sess-' || i, '2.' || ((i * 7919) % {_VERSES}),
+       CASE i % {len(_MOODS)} {" ".join(f"WHEN {k} THEN '{m}'" for k, m in enumerate(_MOODS))} END,
+       'guide', CASE WHEN i % 5 = 0 THEN NULL ELSE ((i * 2654435761) % 1000) / 1000.0 END,
+       CURRENT_TIMESTAMP
+FROM n
+"""
+
+
+async def main(n_rows: int, n_queries: int) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from backend.models import wisdom
+    from backend.services.dynamic_wisdom_corpus import DynamicWisdomCorpus
+
+    print("=" * 70)
+    print("WISDOM EFFECTIVENESS RANKING BENCHMARK")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/wisdom.sqlite")
+        tables = [wisdom.WisdomEffectiveness.__table__]
+        rollup = getattr(wisdom, "WisdomEffectivenessRollup", None)
+        if rollup is not None:
+            tables.append(rollup.__table__)
+        async with engine.begin() as conn:
+            for table in tables:
+                await conn.run_sync(table.create)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        corpus = DynamicWisdomCorpus()
+
+        start = time.perf_counter()
+        async with session_maker() as db:
+            await db.execute(text(_SEED), {"rows": n_rows})
+            await db.commit()
+        print(f"rows={n_rows} seeded in {time.perf_counter() - start:.1f}s")
+
+        if hasattr(corpus, "rebuild_effectiveness_rollups"):
+            async with session_maker() as db:
+                start = time.perf_counter()
+                stats = await corpus.rebuild_effectiveness_rollups(db)
+            print(f"rollup backfill: {stats['rows']} rows in {time.perf_counter() - start:.1f}s")
+
+        timings = []
+        async with session_maker() as db:
+            for q in range(n_queries):
+                corpus._effectiveness_cache.clear()
+                start = time.perf_counter()
+                scores = await corpus._get_effectiveness_scores(db, _MOODS[q % len(_MOODS)])
+                timings.append((time.perf_counter() - start) * 1000)
+        await engine.dispose()
+
+    timings.sort()
+    print(f"\nranking cache miss ({len(scores)} candidates)")
+    print(f"{'p50 ms':>10} {'p95 ms':>10}")
+    print(f"{statistics.median(timings):>10.3f} {timings[int(len(timings) * 0.95) - 1]:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.queries))
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import os
 import sqlite3
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
@@ -12,6 +13,10 @@ from typing import Iterable
 import tiktoken
 from openai import OpenAI
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.relationship_compass_rag import write_embedding_matrix
+
 DATA_ROOT = Path("data")
 GITA_SOURCE = DATA_ROOT / "gita" / "gita_verses_complete.json"
 INDEX_DIR = DATA_ROOT / "relationship_compass"
@@ -258,6 +263,9 @@ def main() -> None:
     try:
         init_db(conn)
         save_chunks(conn, chunks)
+        # Store embeddings as one memory-mappable matrix rather than JSON text
+        write_embedding_matrix(conn, INDEX_PATH)
+        conn.execute("VACUUM")
     finally:
         conn.close()
 
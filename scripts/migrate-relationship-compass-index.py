@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Migrate a Relationship Compass index to the binary embedding format.
+
+Moves the per-chunk JSON text embeddings of gita_index.sqlite into one
+normalized float32 (or float16) matrix, gita_index.embeddings.npy, which
+RelationshipCompassIndex.load memory-maps instead of parsing JSON.
+Keyword-only indexes have no embeddings and are left unchanged.
+
+Usage:
+    python scripts/migrate-relationship-compass-index.py [--index PATH] [--float16] [--keep-json]
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.relationship_compass_rag import INDEX_PATH, write_embedding_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", type=Path, default=INDEX_PATH)
+    parser.add_argument("--float16", action="store_true", help="store the matrix as float16 (half the size)")
+    parser.add_argument("--keep-json", action="store_true", help="keep the JSON embedding column populated")
+    args = parser.parse_args()
+
+    if not args.index.exists():
+        raise SystemExit(f"Index not found: {args.index}")
+
+    conn = sqlite3.connect(args.index)
+    try:
+        rows = write_embedding_matrix(
+            conn, args.index, dtype="float16" if args.float16 else "float32", keep_json=args.keep_json
+        )
+        if rows and not args.keep_json:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    if rows:
+        print(f"Migrated {rows} embeddings from {args.index}")
+    else:
+        print(f"No embeddings in {args.index} (keyword index); nothing to migrate")
+
+
+if __name__ == "__main__":
+    main()
@@ -186,6 +186,23 @@ def _disable_security_middleware():
     CSRFMiddleware.dispatch = _orig_csrf_dispatch
 
 
+@pytest.fixture(autouse=True)
+def _clear_auth_caches():
+    """Forget cached principals and entitlement snapshots between tests.
+
+    Tests reuse fixed user ids and token session ids against fresh databases,
+    so a principal or plan cached by one test must not answer for the next.
+    """
+    from backend.security.principal_cache import principal_cache
+    from backend.services.entitlement_cache import clear_local_entitlements
+
+    principal_cache.clear()
+    clear_local_entitlements()
+    yield
+    principal_cache.clear()
+    clear_local_entitlements()
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an event loop for the entire test session."""
@@ -219,6 +236,7 @@ def test_db() -> AsyncGenerator[AsyncSession, None]:
             models.User.__table__,
             models.GitaVerse.__table__,
             models.Mood.__table__,
+            models.UserMoodStats.__table__,
             models.JournalEntry.__table__,
             models.WisdomJourney.__table__,
             models.JourneyStep.__table__,
@@ -274,6 +292,18 @@ def test_db() -> AsyncGenerator[AsyncSession, None]:
                 if hasattr(cls, "__table__") and cls.__table__ not in tables_to_create:
                     tables_to_create.append(cls.__table__)
 
+        # Add notification tables
+        for cls_name in [
+            "NotificationTemplate",
+            "Notification",
+            "NotificationPreference",
+            "PushSubscription",
+        ]:
+            if hasattr(models, cls_name):
+                cls = getattr(models, cls_name)
+                if hasattr(cls, "__table__") and cls.__table__ not in tables_to_create:
+                    tables_to_create.append(cls.__table__)
+
         # Add compliance / GDPR tables
         for cls_name in [
             "UserConsent",
@@ -358,6 +388,34 @@ def test_db() -> AsyncGenerator[AsyncSession, None]:
         asyncio.run(teardown_db())
 
 
+@pytest.fixture(scope="function")
+def sqlite_session_maker(tmp_path):
+    """
+    Factory for session makers bound to a SQLite file under tmp_path.
+
+    ``await sqlite_session_maker(*tables, name="test.sqlite")`` creates the
+    given models (or Table objects) and returns an async_sessionmaker; its
+    engine is ``session_maker.kw["bind"]``. Engines are disposed on teardown.
+    """
+    engines = []
+
+    async def make(*tables, name: str = "test.sqlite") -> async_sessionmaker:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}")
+        engines.append(engine)
+        async with engine.begin() as conn:
+            for table in tables:
+                await conn.run_sync(getattr(table, "__table__", table).create)
+        return async_sessionmaker(engine, expire_on_commit=False)
+
+    yield make
+
+    async def teardown():
+        for engine in engines:
+            await engine.dispose()
+
+    asyncio.run(teardown())
+
+
 @pytest.fixture(scope="function")
 def test_client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """
@@ -0,0 +1,126 @@
+"""Tests for streaming admin exports and background export jobs.
+
+Covers:
+
+- stream_export() renders CSV, a JSON array and NDJSON (optionally gzipped)
+  chunk by chunk from the server-side cursor, with one row per user and
+  the subscription tier / status from the outer join.
+- CSV analytics exports leave out the nested distributions.
+- A background job writes the same bytes to disk and records its state;
+  only valid job ids resolve, and expired jobs are purged.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from backend.models import (
+    KiaanUsageAnalytics,
+    SubscriptionPlan,
+    SubscriptionStatus,
+    SubscriptionTier,
+    User,
+    UserSubscription,
+)
+from backend.services import admin_export_service
+from backend.services.admin_export_service import (
+    ExportJobs,
+    analytics_export,
+    stream_export,
+    users_export,
+)
+
+
+async def _seeded(sqlite_session_maker, n_users=7):
+    session_maker = await sqlite_session_maker(User, SubscriptionPlan, UserSubscription, KiaanUsageAnalytics)
+    now = datetime.now(UTC)
+    async with session_maker() as db:
+        plan = SubscriptionPlan(tier=SubscriptionTier.BHAKTA, name="bhakta", price_monthly=Decimal("1.00"),
+                                kiaan_questions_monthly=5, encrypted_journal=True, data_retention_days=30)
+        db.add(plan)
+        await db.flush()
+        for i in range(n_users):
+            db.add(User(id=f"u{i}", auth_uid=f"auth-{i}", email=f"u{i}@example.com",
+                        created_at=now - timedelta(minutes=i)))
+        for i in range(0, n_users, 2):
+            db.add(UserSubscription(user_id=f"u{i}", plan_id=plan.id, status=SubscriptionStatus.ACTIVE,
+                                    current_period_start=now, current_period_end=now + timedelta(days=30)))
+        db.add(KiaanUsageAnalytics(date=now, total_questions=3, unique_users=2,
+                                   topic_distribution={"anxiety": 2}, questions_by_tier={"free": 3}))
+        await db.commit()
+    return session_maker
+
+
+async def _collect(spec, fmt, compress, session_maker):
+    stats = {}
+    chunks = [c async for c in stream_export(spec, fmt, compress, session_maker, stats)]
+    body = b"".join(chunks)
+    return (gzip.decompress(body) if compress else body).decode(), len(chunks), stats
+
+
+@pytest.mark.asyncio
+async def test_stream_formats(sqlite_session_maker):
+    session_maker = await _seeded(sqlite_session_maker)
+    spec = users_export()
+    with patch.object(admin_export_service, "EXPORT_CHUNK_ROWS", 3):
+        text, n_chunks, stats = await _collect(spec, "csv", False, session_maker)
+        as_json, _, _ = await _collect(spec, "json", True, session_maker)
+        as_ndjson, _, _ = await _collect(spec, "ndjson", False, session_maker)
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert stats["rows"] == 7 and n_chunks == 1 + 3  # header + ceil(7 / 3)
+    assert [r["id"] for r in rows] == [f"u{i}" for i in range(7)]
+    assert rows[0]["subscription_tier"] == "bhakta" and rows[0]["subscription_status"] == "active"
+    assert rows[1]["subscription_tier"] == ""
+
+    records = json.loads(as_json)
+    assert records == [json.loads(line) for line in as_ndjson.splitlines()]
+    assert records[2] == {
+        "id": "u2", "email": "u2@example.com", "auth_uid": "auth-2", "locale": "en",
+        "created_at": records[2]["created_at"], "subscription_tier": "bhakta",
+        "subscription_status": "active",
+    }
+    assert json.loads((await _collect(users_export(False), "json", False, session_maker))[0])[0].keys() == {
+        "id", "email", "auth_uid", "locale", "created_at",
+    }
+
+
+@pytest.mark.asyncio
+async def test_analytics_csv_leaves_out_nested_fields(sqlite_session_maker):
+    session_maker = await _seeded(sqlite_session_maker)
+    text, _, _ = await _collect(analytics_export(), "csv", False, session_maker)
+    (row,) = csv.DictReader(io.StringIO(text))
+    assert list(row) == ["date", "total_questions", "unique_users", "avg_response_time_ms", "satisfaction_avg"]
+    records = json.loads((await _collect(analytics_export(), "json", False, session_maker))[0])
+    assert records[0]["topic_distribution"] == {"anxiety": 2}
+
+
+@pytest.mark.asyncio
+async def test_background_job_writes_file(tmp_path, sqlite_session_maker):
+    session_maker = await _seeded(sqlite_session_maker)
+    jobs = ExportJobs(directory=str(tmp_path / "exports"))
+    job = jobs.start(users_export(), "ndjson", True, "admin-1", session_maker)
+    assert job["state"] == "queued" and job["filename"].endswith(".ndjson.gz")
+    await jobs.wait(job["job_id"])
+
+    done = jobs.get(job["job_id"])
+    assert done["state"] == "done" and done["rows"] == 7
+    with open(jobs.file_path(done), "rb") as f:
+        data = f.read()
+    assert done["bytes"] == len(data)
+    assert len(gzip.decompress(data).decode().splitlines()) == 7
+    assert jobs.get("../" + job["job_id"]) is None and jobs.get("0" * 32) is None
+
+    done["finished_at"] = time.time() - 25 * 3600
+    jobs._write_meta(done)
+    assert jobs.purge_expired() == 1
+    assert jobs.get(job["job_id"]) is None
@@ -0,0 +1,172 @@
+"""Tests for keyset pagination, batched user details and the quota aggregate.
+
+Covers:
+
+- keyset_page() walks a list page by page with cursors, visiting every row
+  exactly once even when sort values tie, and rejects malformed cursors;
+  list_users still honours ``page`` when no cursor is sent, returns a null
+  ``page`` when one is, and reads the email order from idx_users_email_id.
+- cached_count() reuses a total for the same filters only.
+- load_user_details() loads a page of users' subscriptions and latest KIAAN
+  usage in two queries.
+- get_kiaan_quota_usage() reports the same figures from one grouped query.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event, func, select
+
+from backend.models import (
+    SubscriptionPlan,
+    SubscriptionStatus,
+    SubscriptionTier,
+    UsageTracking,
+    User,
+    UserProfile,
+    UserSubscription,
+)
+from backend.routes.admin import kiaan_analytics, users
+from backend.services import admin_pagination
+from backend.services.admin_pagination import InvalidCursor, cached_count, keyset_page
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+PERIOD = NOW.replace(day=1, hour=0, minute=0, second=0)
+
+
+@pytest.fixture
+async def db(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(User, UserProfile, SubscriptionPlan, UserSubscription, UsageTracking)
+    admin_pagination._count_cache.clear()
+    async with session_maker() as session:
+        plan = SubscriptionPlan(tier=SubscriptionTier.SADHAK, name="sadhak", price_monthly=Decimal("1.00"),
+                                kiaan_questions_monthly=300, encrypted_journal=True, data_retention_days=30)
+        session.add(plan)
+        await session.flush()
+        for i in range(25):
+            # Pairs of users share a timestamp so the id tie-breaker matters
+            session.add(User(id=f"u{i:02d}", auth_uid=f"auth-{i}", email=None if i % 5 == 0 else f"{i:02d}@x.io",
+                             created_at=NOW - timedelta(minutes=i // 2)))
+        session.add(UserSubscription(user_id="u01", plan_id=plan.id, status=SubscriptionStatus.ACTIVE,
+                                     current_period_start=PERIOD, current_period_end=PERIOD + timedelta(days=30)))
+        usage = [("u01", PERIOD - timedelta(days=31), 4, 5), ("u01", PERIOD, 120, 300),
+                 ("u02", PERIOD, 5, 5), ("u03", PERIOD, 2, 5), ("u04", PERIOD, 9, -1)]
+        for user_id, start, used, limit in usage:
+            session.add(UsageTracking(user_id=user_id, feature="kiaan_questions", period_start=start,
+                                      period_end=start + timedelta(days=30), usage_count=used, usage_limit=limit))
+        await session.commit()
+        yield session
+
+
+async def _walk(db, keys, descending, page_size=4):
+    seen, cursor = [], None
+    while True:
+        page, cursor = await keyset_page(db, select(User), keys, page_size, cursor=cursor, descending=descending)
+        seen.extend(u.id for u in page)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.asyncio
+async def test_cursor_walk_visits_every_row_once(db):
+    by_created = await _walk(db, [User.created_at, User.id], descending=True)
+    expected = [u.id for u in sorted(
+        (await db.execute(select(User))).scalars(), key=lambda u: (u.created_at, u.id), reverse=True)]
+    assert by_created == expected
+
+    by_email = await _walk(db, [func.coalesce(User.email, ""), User.id], descending=False, page_size=3)
+    assert len(by_email) == len(set(by_email)) == 25
+    assert by_email[:5] == ["u00", "u05", "u10", "u15", "u20"]  # NULL emails first
+
+    for bad in ("not-base64!", "WzFd"):  # garbage, and "[1]" with one key missing
+        with pytest.raises(InvalidCursor):
+            await keyset_page(db, select(User), [User.created_at, User.id], 4, cursor=bad)
+
+    result = await users.list_users(
+        request=MagicMock(), page=3, page_size=10, cursor=None, search=None, suspended=None,
+        has_subscription=None, include_details=False, sort_by="created_at", sort_order="desc",
+        admin=None, _=None, db=db,
+    )
+    assert [u.id for u in result.users] == expected[20:] and result.next_cursor is None
+    assert result.total == 25 and result.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_email_order_uses_index_and_cursor_pages_have_no_number(db):
+    async def list_by_email(page=1, cursor=None):
+        return await users.list_users(
+            request=MagicMock(), page=page, page_size=10, cursor=cursor, search=None, suspended=None,
+            has_subscription=None, include_details=False, sort_by="email", sort_order="asc",
+            admin=None, _=None, db=db,
+        )
+
+    first = await list_by_email()
+    assert first.page == 1 and [u.id for u in first.users][:5] == ["u00", "u05", "u10", "u15", "u20"]
+
+    statements = []
+    listener = lambda *args: statements.append((args[2], args[3]))  # noqa: E731
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    second = await list_by_email(page=3, cursor=first.next_cursor)  # page is ignored
+    event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+    assert second.page is None and second.users[0].id == "u07" and second.total_pages == 3
+
+    statement, params = next(s for s in statements if "ORDER BY coalesce" in s[0])
+    conn = await db.connection()
+    plan = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params)).all()
+    assert any("idx_users_email_id" in row[-1] for row in plan)
+
+
+@pytest.mark.asyncio
+async def test_cached_count_is_per_filter(db):
+    everyone = select(func.count(User.id))
+    named = select(func.count(User.id)).where(User.email.is_not(None))
+    assert await cached_count(db, everyone) == 25
+    assert await cached_count(db, named) == 20
+
+    db.add(User(id="late", auth_uid="auth-late", email="late@x.io"))
+    await db.flush()
+    assert await cached_count(db, everyone) == 25  # still cached
+    admin_pagination._count_cache.clear()
+    assert await cached_count(db, everyone) == 26
+
+
+@pytest.mark.asyncio
+async def test_batched_details_and_list_page(db):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    details = await users.load_user_details(db, ["u01", "u02", "u09"])
+    event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 2
+    assert details["u01"] == {
+        "subscription_tier": "sadhak", "subscription_status": "active",
+        "subscription_started_at": details["u01"]["subscription_started_at"],
+        "kiaan_questions_used": 120, "kiaan_questions_limit": 300,
+    }
+    assert details["u02"]["subscription_tier"] is None and details["u02"]["kiaan_questions_used"] == 5
+    assert details["u09"]["kiaan_questions_used"] == 0 and details["u09"]["kiaan_questions_limit"] == 20
+
+    page = await users.list_users(
+        request=MagicMock(), page=1, page_size=2, cursor=None, search="auth-", suspended=None,
+        has_subscription=None, include_details=True, sort_by="created_at", sort_order="desc",
+        admin=None, _=None, db=db,
+    )
+    assert [u.id for u in page.users] == ["u01", "u00"]
+    assert page.users[0].kiaan_questions_used == 120 and page.users[1].kiaan_questions_used == 0
+
+
+@pytest.mark.asyncio
+async def test_quota_usage_from_one_grouped_query(db):
+    out = await kiaan_analytics.get_kiaan_quota_usage(request=MagicMock(), admin=SimpleNamespace(), _=None, db=db)
+    assert out.total_users_with_quota == 4
+    assert out.users_at_quota_limit == 2  # u02 at 5/5 and u04 on the unlimited plan
+    assert out.avg_usage_percentage == round((40.0 + 100.0 + 40.0) / 3, 2)
+    assert out.usage_by_tier["free"] == {"users": 2, "total_questions": 7, "limit_per_user": 5}
+    assert out.usage_by_tier["sadhak"] == {"users": 1, "total_questions": 120, "limit_per_user": 300}
+    assert out.usage_by_tier["bhakta"]["users"] == 0 and out.usage_by_tier["siddha"]["users"] == 1
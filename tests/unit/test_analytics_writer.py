@@ -0,0 +1,120 @@
+"""Tests for SimpleAnalytics' buffered event writer and rollups.
+
+Covers:
+
+- Without a running writer, track_event() writes on the caller's session
+  and the daily / hourly rollups match the raw events.
+- With the writer running, track_event() only queues; the queue is written
+  in batches of ANALYTICS_FLUSH_EVENTS and a full queue drops events.
+- A batch that cannot be written goes to the spill file and is replayed
+  once the database is back.
+- rebuild_rollups() reproduces the incrementally maintained rollups.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.analytics import simple_tracker
+from backend.analytics.simple_tracker import (
+    AnalyticsWriter,
+    SimpleAnalytics,
+    write_events,
+)
+from backend.models.analytics import AnalyticsEvent, AnalyticsEventRollup
+
+
+async def _event_count(session_maker) -> int:
+    async with session_maker() as db:
+        return (await db.execute(select(func.count()).select_from(AnalyticsEvent))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_direct_writes_and_rollups(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(AnalyticsEvent, AnalyticsEventRollup)
+    async with session_maker() as db:
+        for event_type in ("chat", "chat", "mood"):
+            await SimpleAnalytics.track_event(db, event_type, "u1", {"n": 1})
+        daily = await SimpleAnalytics.get_daily_stats(db)
+        hourly = await SimpleAnalytics.get_hourly_stats(db)
+        stored = (await db.execute(select(AnalyticsEvent))).scalars().all()
+
+    today = datetime.now(UTC).date()
+    assert [(s.date, s.event_type, s.count) for s in daily] == [(today, "chat", 2), (today, "mood", 1)]
+    assert [(s.event_type, s.count) for s in hourly] == [("chat", 2), ("mood", 1)]
+    assert stored[0].event_metadata == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_running_writer_batches_queued_events(tmp_path, sqlite_session_maker):
+    session_maker = await sqlite_session_maker(AnalyticsEvent, AnalyticsEventRollup)
+    writer = AnalyticsWriter(spill_path=str(tmp_path / "spill.jsonl"), max_queue=1100, batch_size=500)
+    with patch.object(simple_tracker, "_writer", writer):
+        await writer.start(session_maker)
+        for i in range(1200):
+            await SimpleAnalytics.track_event(None, f"e{i % 3}", f"u{i}")
+        assert writer.status["queued"] == 1100 and writer.status["dropped"] == 100
+        await writer.stop()
+
+    assert writer.status["batches"] == 3 and writer.status["written"] == 1100
+    assert await _event_count(session_maker) == 1100
+    async with session_maker() as db:
+        daily = await SimpleAnalytics.get_daily_stats(db)
+    assert sum(s.count for s in daily) == 1100
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_spill_and_replay(tmp_path, sqlite_session_maker):
+    spill = tmp_path / "spill.jsonl"
+    down = await sqlite_session_maker(name="down.sqlite")
+    writer = AnalyticsWriter(spill_path=str(spill), batch_size=4)
+    writer._session_maker = down
+    for i in range(10):
+        writer.enqueue(simple_tracker._event("chat", f"u{i}", {"i": i}))
+    await writer.flush()
+    assert writer.status["spilled"] == 4 and writer.status["queued"] == 6
+    writer._queue.clear()
+    writer.enqueue(simple_tracker._event("mood", None, None))
+    await writer.flush()
+    assert len(spill.read_text().splitlines()) == 5
+
+    session_maker = await sqlite_session_maker(AnalyticsEvent, AnalyticsEventRollup)
+    writer._session_maker = session_maker
+    assert await writer.replay_spill() == 5
+    assert not writer.status["spill_pending"]
+    assert await _event_count(session_maker) == 5
+    async with session_maker() as db:
+        events = (await db.execute(select(AnalyticsEvent).order_by(AnalyticsEvent.id))).scalars().all()
+    assert events[0].event_metadata == {"i": 0} and events[-1].event_type == "mood"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental_rollups(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(AnalyticsEvent, AnalyticsEventRollup)
+    start = datetime(2026, 5, 1, 22, 30, tzinfo=UTC)
+    events = [
+        {"event_type": f"e{i % 2}", "user_id": None, "metadata": None,
+         "created_at": start + timedelta(minutes=17 * i)}
+        for i in range(40)
+    ]
+    async with session_maker() as db:
+        for i in range(0, 40, 7):
+            await write_events(db, events[i:i + 7])
+        await db.commit()
+        select_rollups = select(
+            AnalyticsEventRollup.granularity, AnalyticsEventRollup.bucket_start,
+            AnalyticsEventRollup.event_type, AnalyticsEventRollup.count,
+        )
+        incremental = set((await db.execute(select_rollups)).all())
+        assert await SimpleAnalytics.rebuild_rollups(db) == 40
+        assert set((await db.execute(select_rollups)).all()) == incremental
+
+    days = Counter()
+    for e in events:
+        days[e["created_at"].date(), e["event_type"]] += 1
+    assert {(b.date(), t): n for g, b, t, n in incremental if g == "day"} == days
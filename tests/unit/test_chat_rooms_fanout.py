@@ -0,0 +1,163 @@
+"""Tests for chat room WebSocket fan-out.
+
+Covers:
+
+- A slow client does not delay delivery to the rest of the room.
+- Payloads are serialized once per broadcast and match ``send_json``.
+- Clients whose send queue overflows are disconnected and closed.
+- One ``chat:room:*`` pattern subscription relays other instances'
+  messages to local rooms and skips this instance's own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from backend.cache.redis_cache import RedisCache
+from backend.routes import chat_rooms
+from backend.routes.chat_rooms import DistributedConnectionManager
+
+# ---------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------
+
+
+class _FakeSocket:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.frames: list[str] = []
+        self.closed_with: int | None = None
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_text(self, text: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+def _manager(redis=None) -> DistributedConnectionManager:
+    manager = DistributedConnectionManager()
+
+    async def _get_redis():
+        return redis
+
+    manager._get_redis = _get_redis  # type: ignore[method-assign]
+    return manager
+
+
+def _fake_redis_cache() -> RedisCache:
+    import fakeredis.aioredis
+
+    cache = RedisCache()
+    cache._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache._connected = True
+    return cache
+
+
+async def _settle(rounds: int = 5) -> None:
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------
+# local fan-out
+# ---------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_room():
+    manager = _manager()
+    fast = [_FakeSocket() for _ in range(20)]
+    slow = _FakeSocket(delay=5.0)
+    for i, ws in enumerate([slow, *fast]):
+        await manager.connect("room-1", ws, f"user-{i}")
+
+    await asyncio.wait_for(manager.broadcast("room-1", {"type": "message", "content": "hi"}), 0.5)
+    await _settle()
+
+    assert all(ws.frames == ['{"type":"message","content":"hi"}'] for ws in fast)
+    assert slow.frames == []
+    for ws in [slow, *fast]:
+        manager.disconnect("room-1", ws)
+
+
+@pytest.mark.asyncio
+async def test_payload_serialized_once_per_broadcast(monkeypatch):
+    manager = _manager()
+    sockets = [_FakeSocket() for _ in range(10)]
+    for i, ws in enumerate(sockets):
+        await manager.connect("room-1", ws, f"user-{i}")
+
+    calls = []
+    original = chat_rooms._encode
+    monkeypatch.setattr(chat_rooms, "_encode", lambda p: calls.append(p) or original(p))
+
+    await manager.broadcast("room-1", {"type": "message", "content": "नमस्ते"})
+    await _settle()
+
+    assert len(calls) == 1
+    assert {ws.frames[0] for ws in sockets} == {
+        json.dumps({"type": "message", "content": "नमस्ते"}, separators=(",", ":"), ensure_ascii=False)
+    }
+
+
+@pytest.mark.asyncio
+async def test_overflowing_client_is_dropped(monkeypatch):
+    monkeypatch.setattr(chat_rooms, "WS_SEND_QUEUE_SIZE", 2)
+    manager = _manager()
+    stuck = _FakeSocket(delay=60.0)
+    healthy = _FakeSocket()
+    await manager.connect("room-1", stuck, "stuck")
+    await manager.connect("room-1", healthy, "healthy")
+
+    for i in range(5):
+        await manager.broadcast("room-1", {"n": i})
+        await _settle()
+
+    assert stuck not in manager.rooms["room-1"]
+    assert stuck not in manager.user_lookup
+    assert stuck.closed_with == chat_rooms.WS_CLOSE_SLOW_CONSUMER
+    assert [json.loads(f)["n"] for f in healthy.frames] == [0, 1, 2, 3, 4]
+    manager.disconnect("room-1", healthy)
+
+
+# ---------------------------------------------------------------------
+# Redis relay
+# ---------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_single_pattern_subscription_relays_remote_messages():
+    redis = _fake_redis_cache()
+    manager = _manager(redis)
+    in_a, in_b = _FakeSocket(), _FakeSocket()
+    await manager.connect("room-a", in_a, "user-a")
+    await manager.connect("room-b", in_b, "user-b")
+    await asyncio.sleep(0.05)
+
+    assert manager._listener is not None
+    numsub = await redis._client.execute_command("PUBSUB", "NUMPAT")
+    assert numsub == 1
+
+    remote = json.dumps({"instance_id": "other", "payload": {"type": "message", "content": "remote"}})
+    await redis.publish("chat:room:room-a", remote)
+    await redis.publish("chat:room:room-nobody", remote)
+    # Own-instance echo is skipped (already delivered locally)
+    await manager.broadcast("room-b", {"type": "message", "content": "local"})
+    await asyncio.sleep(0.05)
+
+    assert [json.loads(f)["content"] for f in in_a.frames] == ["remote"]
+    assert [json.loads(f)["content"] for f in in_b.frames] == ["local"]
+
+    manager.disconnect("room-a", in_a)
+    manager.disconnect("room-b", in_b)
+    assert manager._listener is None
+    await _settle()
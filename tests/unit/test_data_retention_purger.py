@@ -0,0 +1,215 @@
+"""Tests for the batched, resumable data retention purge.
+
+Covers:
+
+- purge_expired_chat_messages() deletes expired soft-deleted messages in
+  bounded key-range batches, keeps recent and active ones, removes only
+  old sessions with no messages left, and records a completed checkpoint.
+- A run interrupted between batches releases its lease and resumes after
+  its last committed key with its original cutoff; a policy leased by
+  another worker is skipped, while the lease's own worker reclaims it.
+- RetentionPurger.stop() mid-pass releases the lease, and an immediate
+  restart finishes the pass from the checkpoint.
+- purge_expired_data() applies the journal blob, voice analytics and
+  episodic memory windows, and skips a policy whose window is 0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.models import (
+    EncryptedBlob,
+    KiaanChatMessage,
+    KiaanChatSession,
+    RetentionCheckpoint,
+    VoiceAnalytics,
+)
+from backend.services import data_retention
+from backend.services.data_retention import (
+    purge_expired_chat_messages,
+    purge_expired_data,
+)
+from backend.services.kiaan_deep_memory import (
+    EmotionalValence,
+    EpisodicEntry,
+    EpisodicMemory,
+)
+
+NOW = datetime.datetime.now(datetime.UTC)
+
+
+def _days_ago(days: float) -> datetime.datetime:
+    return NOW - datetime.timedelta(days=days)
+
+
+@pytest.fixture
+async def db(sqlite_session_maker, monkeypatch):
+    monkeypatch.setattr(data_retention, "RETENTION_BATCH_SIZE", 4)
+    monkeypatch.setattr(data_retention, "RETENTION_BATCH_SLEEP_MS", 0)
+    session_maker = await sqlite_session_maker(
+        KiaanChatMessage, KiaanChatSession, EncryptedBlob, VoiceAnalytics, RetentionCheckpoint,
+    )
+    async with session_maker() as session:
+        # s-old-orphan and s-old-kept start long ago; only the first loses all its messages
+        for session_id, started in (("s-old-orphan", 200), ("s-old-kept", 200), ("s-new-orphan", 1)):
+            session.add(KiaanChatSession(id=session_id, started_at=_days_ago(started)))
+        for i in range(10):  # expired: soft-deleted 100+ days ago
+            session.add(_message(f"m-expired-{i:02d}", "s-old-orphan", deleted_days=100 + i))
+        session.add(_message("m-recent-delete", "s-old-kept", deleted_days=5))
+        session.add(_message("m-active", "s-old-kept", deleted_days=None))
+        await session.commit()
+        yield session
+
+
+def _message(message_id: str, session_id: str, deleted_days: float | None) -> KiaanChatMessage:
+    return KiaanChatMessage(
+        id=message_id, session_id=session_id, user_message="q", kiaan_response="a",
+        created_at=_days_ago(300),
+        deleted_at=None if deleted_days is None else _days_ago(deleted_days),
+    )
+
+
+async def _ids(db, model) -> list:
+    return sorted((await db.execute(select(model.id))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_chat_purge_in_batches_with_anti_join(db):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    result = await purge_expired_chat_messages(db)
+    event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+
+    assert result["purged_messages"] == 10 and result["purged_sessions"] == 1
+    assert result["retention_days"] == 90
+    assert await _ids(db, KiaanChatMessage) == ["m-active", "m-recent-delete"]
+    assert await _ids(db, KiaanChatSession) == ["s-new-orphan", "s-old-kept"]
+
+    deletes = [s for s in statements if s.startswith("DELETE FROM kiaan_chat_messages")]
+    assert len(deletes) == 3  # 10 rows in batches of 4
+    assert all("BETWEEN" in s for s in deletes)
+    session_delete = next(s for s in statements if s.startswith("DELETE FROM kiaan_chat_sessions"))
+    assert "NOT (EXISTS" in session_delete and " IN (" not in session_delete
+
+    checkpoint = await db.get(RetentionCheckpoint, "chat_messages")
+    assert checkpoint.purged == 10 and checkpoint.last_key == "m-expired-09"
+    assert checkpoint.completed_at is not None and checkpoint.lease_expires_at is None
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(db, monkeypatch):
+    batches = 0
+
+    async def interrupt_after_two(_seconds):
+        nonlocal batches
+        batches += 1
+        if batches == 2:
+            raise RuntimeError("worker restarted")
+
+    monkeypatch.setattr(data_retention.asyncio, "sleep", interrupt_after_two)
+    first = await purge_expired_data(db, policies=["chat_messages"])
+    assert "worker restarted" in first["chat_messages"]["error"]
+    assert len(await _ids(db, KiaanChatMessage)) == 4  # two batches of 4 committed
+
+    checkpoint = await db.get(RetentionCheckpoint, "chat_messages")
+    await db.refresh(checkpoint)
+    assert checkpoint.last_key == "m-expired-07" and checkpoint.completed_at is None
+    assert checkpoint.lease_expires_at is None and checkpoint.lease_owner is None
+    started_cutoff = checkpoint.cutoff
+
+    # Another worker holds the lease until it expires
+    checkpoint.lease_owner = "other-host:1"
+    checkpoint.lease_expires_at = NOW + datetime.timedelta(minutes=5)
+    await db.commit()
+    assert (await purge_expired_data(db, policies=["chat_messages"]))["chat_messages"] == {
+        "skipped": "purge already running on another worker"
+    }
+    # A lease this worker still holds (e.g. from before a crash) is reclaimed at once
+    checkpoint.lease_owner = data_retention.RETENTION_WORKER_ID
+    await db.commit()
+
+    second = (await purge_expired_data(db, policies=["chat_messages"]))["chat_messages"]
+    assert second["resumed"] is True and second["purged"] == 10 and second["batches"] == 1
+    assert second["cutoff"] == data_retention._as_utc(started_cutoff).isoformat()
+    assert await _ids(db, KiaanChatMessage) == ["m-active", "m-recent-delete"]
+
+    third = (await purge_expired_data(db, policies=["chat_messages"]))["chat_messages"]
+    assert third["resumed"] is False and third["purged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stopping_the_purger_mid_pass_releases_the_lease(db, monkeypatch):
+    for name in ("JOURNAL_BLOB_RETENTION_DAYS", "VOICE_ANALYTICS_RETENTION_DAYS",
+                 "EPISODIC_MEMORY_RETENTION_DAYS"):
+        monkeypatch.setenv(name, "0")
+    monkeypatch.setattr(data_retention, "RETENTION_CLEANUP_ENABLED", True)
+    monkeypatch.setattr(data_retention, "RETENTION_INITIAL_DELAY_SECONDS", 0)
+    monkeypatch.setattr(data_retention, "RETENTION_BATCH_SLEEP_MS", 60_000)
+    purger = data_retention.RetentionPurger()
+    session_maker = async_sessionmaker(db.bind, expire_on_commit=False)
+
+    async def checkpoint():
+        db.expire_all()
+        return await db.get(RetentionCheckpoint, "chat_messages")
+
+    await purger.start(session_maker)
+    while (await checkpoint()) is None or (await checkpoint()).last_key is None:
+        await asyncio.sleep(0.01)
+    await purger.stop()  # cancelled while sleeping after the first batch
+
+    stopped = await checkpoint()
+    assert stopped.last_key == "m-expired-03" and stopped.completed_at is None
+    assert stopped.lease_expires_at is None and stopped.lease_owner is None
+
+    monkeypatch.setattr(data_retention, "RETENTION_BATCH_SLEEP_MS", 0)
+    await purger.start(session_maker)
+    while purger.status["last_run"] is None:
+        await asyncio.sleep(0.01)
+    await purger.stop()
+
+    result = purger.status["last_results"]["chat_messages"]
+    assert result["resumed"] is True and result["purged"] == 10
+    assert await _ids(db, KiaanChatMessage) == ["m-active", "m-recent-delete"]
+
+
+@pytest.mark.asyncio
+async def test_blob_voice_and_episodic_policies(db, tmp_path, monkeypatch):
+    monkeypatch.setenv("JOURNAL_BLOB_RETENTION_DAYS", "30")
+    monkeypatch.setenv("VOICE_ANALYTICS_RETENTION_DAYS", "0")
+    for i, deleted in enumerate((40, 35, 10, None)):
+        db.add(EncryptedBlob(id=i + 1, user_id="u1", blob_json="{}",
+                             deleted_at=None if deleted is None else _days_ago(deleted)))
+    db.add(VoiceAnalytics(analytics_date=(NOW - datetime.timedelta(days=1000)).date()))
+    await db.commit()
+
+    memory = EpisodicMemory(db_path=tmp_path / "episodic.db")
+    await memory.initialize()
+    for days in (400, 380, 10):
+        await memory.store(EpisodicEntry(
+            id=str(uuid.uuid4()), user_id="u1", timestamp=_days_ago(days), query="q",
+            response_summary="a", emotional_valence=EmotionalValence.NEUTRAL,
+            consciousness_level=3, gita_verses_shared=[], themes=[],
+        ))
+
+    results = await purge_expired_data(
+        db, policies=["journal_blobs", "voice_analytics", "episodic_memory"],
+        episodic_db_path=tmp_path / "episodic.db",
+    )
+    assert results["journal_blobs"]["purged"] == 2
+    assert await _ids(db, EncryptedBlob) == [3, 4]
+    assert results["voice_analytics"] == {"skipped": "retention disabled"}
+    assert len(await _ids(db, VoiceAnalytics)) == 1
+    assert results["episodic_memory"]["purged"] == 2
+    reloaded = EpisodicMemory(db_path=tmp_path / "episodic.db")  # fresh cache, reads the file
+    assert [e.timestamp for e in await reloaded.recall("u1", include_decayed=True)] == [_days_ago(10)]
+
+    missing = await purge_expired_data(db, policies=["episodic_memory"], episodic_db_path=tmp_path / "none.db")
+    assert missing["episodic_memory"] == {"skipped": "no episodic memory store"}
@@ -234,7 +234,7 @@ class TestDynamicCorpusSingleton:
         from backend.services.dynamic_wisdom_corpus import DynamicWisdomCorpus
         corpus = DynamicWisdomCorpus()
         assert len(corpus._effectiveness_cache) == 0
-        assert corpus._cache_timestamp == 0
+        assert len(corpus._cache_loaded_at) == 0
 
 
 class TestEffectivenessWeightedSelection:
@@ -274,7 +274,7 @@ class TestEffectivenessWeightedSelection:
             ("2.47", 0.8),
             ("2.48", 0.7),
         ]
-        corpus._cache_timestamp = 999999999999  # Far future to prevent refresh
+        corpus._cache_loaded_at["anxious"] = 999999999999  # Far future to prevent refresh
 
         # Mock DB (won't be called since cache is fresh)
         mock_db = AsyncMock()
@@ -339,18 +339,18 @@ class TestWisdomEffectivenessModel:
 class TestCacheInvalidation:
     """Tests for cache behavior in DynamicWisdomCorpus."""
 
-    def test_cache_invalidates_on_zero_timestamp(self):
-        """Setting cache_timestamp to 0 should force a refresh on next query."""
+    def test_stale_mood_timestamp_is_expired(self):
+        """A mood loaded longer than the TTL ago should be considered stale."""
         from backend.services.dynamic_wisdom_corpus import DynamicWisdomCorpus, _EFFECTIVENESS_CACHE_TTL
         import time
 
         corpus = DynamicWisdomCorpus()
         corpus._effectiveness_cache["anxious"] = [("2.47", 0.8)]
         # Set timestamp far in the past so (now - timestamp) > TTL
-        corpus._cache_timestamp = time.monotonic() - _EFFECTIVENESS_CACHE_TTL - 10
+        corpus._cache_loaded_at["anxious"] = time.monotonic() - _EFFECTIVENESS_CACHE_TTL - 10
 
         # Cache should be considered stale
-        elapsed = time.monotonic() - corpus._cache_timestamp
+        elapsed = time.monotonic() - corpus._cache_loaded_at["anxious"]
         assert elapsed > _EFFECTIVENESS_CACHE_TTL
 
     def test_fresh_cache_is_used(self):
@@ -360,7 +360,7 @@ class TestCacheInvalidation:
 
         corpus = DynamicWisdomCorpus()
         corpus._effectiveness_cache["anxious"] = [("2.47", 0.8)]
-        corpus._cache_timestamp = time.monotonic()  # Just now
+        corpus._cache_loaded_at["anxious"] = time.monotonic()  # Just now
 
         mock_db = AsyncMock()
 
@@ -512,6 +512,7 @@ class TestBatchBuffer:
         mock_session = AsyncMock()
         mock_session.commit = AsyncMock()
         mock_session.add_all = MagicMock()
+        mock_session.get_bind = MagicMock()
         mock_session_cm = AsyncMock()
         mock_session_cm.__aenter__.return_value = mock_session
         mock_session_cm.__aexit__.return_value = None
@@ -525,8 +526,8 @@ class TestBatchBuffer:
         assert len(self.corpus._delivery_buffer) == 0
         assert self.corpus._metrics["deliveries_flushed"] == 3
         assert self.corpus._metrics["buffer_flushes"] == 1
-        # Bulk insert path
-        mock_session.add_all.assert_called_once()
+        # Multi-row insert path
+        mock_session.execute.assert_awaited()
         mock_session.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -550,6 +551,7 @@ class TestBatchBuffer:
         mock_session = AsyncMock()
         mock_session.commit = AsyncMock(side_effect=Exception("DB down"))
         mock_session.add_all = MagicMock()
+        mock_session.get_bind = MagicMock()
         mock_session_cm = AsyncMock()
         mock_session_cm.__aenter__.return_value = mock_session
         mock_session_cm.__aexit__.return_value = None
@@ -0,0 +1,192 @@
+"""Tests for the entitlement snapshots behind the feature-access gates.
+
+Covers:
+
+- Stacked gates in one request compute one snapshot, and the snapshot
+  agrees with get_user_tier for active, lapsed and developer users.
+- upgrade_subscription() / update_subscription_status() invalidate the
+  snapshot, so the next request sees the new tier.
+- SubscriptionRequired lets developers through before loading a snapshot.
+- Redis snapshots are stamped with the user's version: a version bump from
+  another instance makes them stale; a valid one is reused without a load.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from backend.middleware.feature_access import (
+    FeatureRequired,
+    JournalAccessRequired,
+    KiaanQuotaRequired,
+    SubscriptionRequired,
+)
+from backend.models import (
+    SubscriptionPlan,
+    SubscriptionStatus,
+    SubscriptionTier,
+    User,
+    UserSubscription,
+)
+from backend.services import entitlement_cache
+from backend.services.entitlement_cache import (
+    Entitlements,
+    clear_local_entitlements,
+    get_entitlements,
+)
+from backend.services.subscription_service import (
+    get_user_tier,
+    update_subscription_status,
+    upgrade_subscription,
+)
+
+
+class FakeRedis:
+    """The slice of RedisCache the entitlement cache uses."""
+
+    is_connected = True
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get_client(self):
+        return self
+
+    async def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    async def set(self, key, value, expire_seconds=None):
+        self.data[key] = value
+        return True
+
+    async def incr(self, key, expire_seconds=None):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+        return True
+
+
+async def _plans(db):
+    plans = {
+        tier: SubscriptionPlan(tier=tier, name=tier.value, price_monthly=Decimal("1.00"), kiaan_questions_monthly=5,
+                               encrypted_journal=tier != SubscriptionTier.FREE, data_retention_days=30)
+        for tier in SubscriptionTier
+    }
+    db.add_all(plans.values())
+    await db.commit()
+    return plans
+
+
+async def _user(db, plan, status=SubscriptionStatus.ACTIVE):
+    user = User(auth_uid=f"ent-{plan.tier.value}-{status.value}",
+                email=f"{plan.tier.value}-{status.value}@example.com", hashed_password="x")
+    db.add(user)
+    await db.commit()
+    now = datetime.now(UTC)
+    db.add(UserSubscription(user_id=user.id, plan_id=plan.id, status=status,
+                            current_period_start=now, current_period_end=now + timedelta(days=30)))
+    await db.commit()
+    return user.id
+
+
+def _request(user_id):
+    return SimpleNamespace(state=SimpleNamespace(user_id=user_id), headers={}, cookies={})
+
+
+@pytest.mark.asyncio
+async def test_stacked_gates_share_one_snapshot(test_db):
+    user_id = await _user(test_db, (await _plans(test_db))[SubscriptionTier.BHAKTA])
+    request = _request(user_id)
+
+    with patch.object(entitlement_cache, "_load", wraps=entitlement_cache._load) as load:
+        assert (await KiaanQuotaRequired()(request, test_db))[0] == user_id
+        assert await JournalAccessRequired()(request, test_db) == user_id
+        assert await SubscriptionRequired()(request, test_db) == user_id
+        with pytest.raises(HTTPException) as exc:
+            await FeatureRequired("kiaan_agent")(request, test_db)
+        assert exc.value.detail["tier"] == "bhakta"
+        # A later request is served from the in-process snapshot
+        await JournalAccessRequired()(_request(user_id), test_db)
+    assert load.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_tier_matches_get_user_tier(test_db):
+    plans = await _plans(test_db)
+    for tier, status in (
+        (SubscriptionTier.SADHAK, SubscriptionStatus.ACTIVE),
+        (SubscriptionTier.SADHAK, SubscriptionStatus.PAST_DUE),
+        (SubscriptionTier.BHAKTA, SubscriptionStatus.TRIALING),
+    ):
+        user_id = await _user(test_db, plans[tier], status)
+        snapshot = await get_entitlements(test_db, user_id)
+        assert snapshot.tier == await get_user_tier(test_db, user_id)
+        assert snapshot.status == status
+
+    with patch("backend.middleware.feature_access.DEVELOPER_EMAILS", {"sadhak-active@example.com"}):
+        clear_local_entitlements()
+        developer_id = (await test_db.execute(
+            User.__table__.select().where(User.email == "sadhak-active@example.com")
+        )).first().id
+        snapshot = await get_entitlements(test_db, developer_id)
+        assert snapshot.is_developer and snapshot.tier == SubscriptionTier.SIDDHA
+
+
+@pytest.mark.asyncio
+async def test_plan_changes_invalidate_the_snapshot(test_db):
+    plans = await _plans(test_db)
+    user_id = await _user(test_db, plans[SubscriptionTier.FREE])
+    with pytest.raises(HTTPException):
+        await JournalAccessRequired()(_request(user_id), test_db)
+
+    await upgrade_subscription(test_db, user_id, plans[SubscriptionTier.SIDDHA].id)
+    assert await JournalAccessRequired()(_request(user_id), test_db) == user_id
+
+    await update_subscription_status(test_db, user_id, SubscriptionStatus.PAST_DUE)
+    with pytest.raises(HTTPException) as exc:
+        await SubscriptionRequired()(_request(user_id), test_db)
+    assert exc.value.status_code == 402
+
+
+@pytest.mark.asyncio
+async def test_developers_bypass_subscription_required_before_the_snapshot(test_db):
+    user_id = await _user(test_db, (await _plans(test_db))[SubscriptionTier.FREE], SubscriptionStatus.PAST_DUE)
+    with (
+        patch("backend.middleware.feature_access.DEVELOPER_EMAILS", {"free-past_due@example.com"}),
+        patch("backend.middleware.feature_access.get_entitlements", side_effect=AssertionError),
+    ):
+        assert await SubscriptionRequired()(_request(user_id), test_db) == user_id
+
+
+@pytest.mark.asyncio
+async def test_redis_snapshots_are_fenced_by_version(test_db):
+    user_id = await _user(test_db, (await _plans(test_db))[SubscriptionTier.BHAKTA])
+    redis = FakeRedis()
+
+    async def _fake_redis():
+        return redis
+
+    with patch.object(entitlement_cache, "_redis", _fake_redis), \
+            patch.object(entitlement_cache, "_load", wraps=entitlement_cache._load) as load:
+        first = await get_entitlements(test_db, user_id)
+        assert Entitlements.from_json(redis.data[f"entitlements:{user_id}"]) == first
+
+        # Another instance: empty local cache, valid Redis snapshot
+        clear_local_entitlements()
+        assert await get_entitlements(test_db, user_id) == first
+        assert load.call_count == 1
+
+        # A plan change elsewhere bumps the version; the old snapshot is stale
+        await redis.incr(f"entitlements:version:{user_id}")
+        clear_local_entitlements()
+        second = await get_entitlements(test_db, user_id)
+        assert load.call_count == 2
+        assert second.version == first.version + 1
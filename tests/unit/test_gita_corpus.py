@@ -0,0 +1,186 @@
+"""Tests for the shared, read-only Gita verse corpus.
+
+Covers:
+
+- Verse rows are read-only, expose fields as keys and attributes, store
+  lists as tuples and survive pickling.
+- The retrieval service, the wisdom filter and the enricher share one corpus
+  object instead of holding their own copies.
+- search_gita_verses and GitaWisdomFilter._search_verses rank exactly as the
+  previous per-verse lowercase loops did.
+- The database corpus keeps its epoch when a refresh finds the same content,
+  bumps it on a change, and WisdomKnowledgeBase rebuilds only on a new epoch.
+"""
+
+from __future__ import annotations
+
+import pickle
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services import gita_corpus, gita_wisdom_retrieval
+from backend.services.gita_corpus import GitaCorpus, get_db_gita_corpus, get_gita_corpus
+from backend.services.gita_service import GitaService
+from backend.services.gita_wisdom_auto_enricher import OpenSourceGitaFetcher
+from backend.services.gita_wisdom_filter import GitaWisdomFilter, WisdomTool
+from backend.services.wisdom_kb import WisdomKnowledgeBase
+
+QUERIES = [
+    "I feel anxious about my exam results",
+    "my partner gets angry and jealous",
+    "how do I let go of attachment to outcomes",
+    "grief and loss of my father",
+    "peace meditation discipline",
+]
+
+
+def _legacy_search(query: str, tool: str, limit: int = 8) -> list[tuple[int, int]]:
+    """The previous search_gita_verses scoring loop."""
+    query_lower = query.lower()
+    if tool == "viyoga":
+        keyword_map = gita_wisdom_retrieval.VIYOGA_KEYWORDS
+    elif tool == "relationship_compass":
+        keyword_map = gita_wisdom_retrieval.RELATIONSHIP_KEYWORDS
+    else:
+        keyword_map = {**gita_wisdom_retrieval.VIYOGA_KEYWORDS, **gita_wisdom_retrieval.RELATIONSHIP_KEYWORDS}
+    expanded = set(query_lower.split())
+    for category, keywords in keyword_map.items():
+        for keyword in keywords:
+            if keyword in query_lower:
+                expanded.add(category)
+                expanded.update(keywords)
+
+    scored = []
+    for verse in get_gita_corpus().verses:
+        score = 0.0
+        for app in verse.get("mental_health_applications", []):
+            if app.lower() in expanded or any(k in app.lower() for k in expanded):
+                score += 3.0
+        if any(k in verse.get("theme", "").lower() for k in expanded):
+            score += 2.0
+        for field, weight in (("principle", 1.5), ("english", 0.5), ("hindi", 0.3)):
+            text = verse.get(field, "").lower()
+            for word in expanded:
+                if len(word) > 3 and word in text:
+                    score += weight
+        chapter = verse.get("chapter", 0)
+        if tool == "viyoga":
+            score *= 1.4 if chapter in [2, 3, 5, 18] else 1.2 if chapter == 6 else 1
+        elif tool == "relationship_compass":
+            score *= 1.4 if chapter in [12, 16] else 1.2 if chapter in [2, 18] else 1
+        elif chapter in [2, 6, 12, 18]:
+            score *= 1.3
+        if score > 0:
+            scored.append((score, verse))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [(v["chapter"], v["verse"]) for _, v in scored[:limit]]
+
+
+def _rows(english_suffix: str = "") -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i, chapter=2, verse=i, sanskrit="s", transliteration="t", hindi="h",
+            english=f"Verse {i} about peace{english_suffix}", word_meanings={"yoga": "union"},
+            principle="Equanimity", theme="inner_peace", mental_health_applications=["anxiety_management"],
+            primary_domain="anxiety", secondary_domains=["stress"],
+        )
+        for i in range(1, 4)
+    ]
+
+
+@pytest.fixture
+def fresh_db_corpus(monkeypatch):
+    monkeypatch.setattr(gita_corpus, "_db_corpus", None)
+    monkeypatch.setattr(gita_corpus, "_db_loaded_at", 0.0)
+    yield
+    WisdomKnowledgeBase().clear_cache()
+
+
+def test_verse_rows_are_read_only_and_picklable():
+    corpus = GitaCorpus(
+        [{"chapter": 2, "verse": 47, "english": "Act", "mental_health_applications": ["anxiety"]}], source="test"
+    )
+    verse = corpus.get(2, 47)
+
+    assert verse["english"] == verse.english == "Act"
+    assert verse.mental_health_applications == ("anxiety",)
+    assert corpus.by_ref["BG 2.47"] is verse
+    with pytest.raises(TypeError):
+        verse["english"] = "changed"
+    with pytest.raises(TypeError):
+        verse.update(english="changed")
+    with pytest.raises(AttributeError):
+        corpus.english = ()
+    with pytest.raises(ValueError):
+        corpus.chapters[0] = 3
+    assert pickle.loads(pickle.dumps(verse)) == verse
+
+
+@pytest.mark.asyncio
+async def test_services_share_one_corpus():
+    corpus = get_gita_corpus()
+    fetcher = OpenSourceGitaFetcher()
+    await fetcher.load_local_corpus()
+
+    assert len(corpus) == 701
+    assert gita_wisdom_retrieval.GITA_VERSES is corpus.verses
+    assert GitaWisdomFilter()._verses is corpus.verses
+    assert fetcher.get_verse_context(2, 47) is corpus.by_ref["2.47"]
+    # Interned: the same theme string is one object across verses
+    themes = [v["theme"] for v in corpus.verses if v["theme"] == corpus.verses[0]["theme"]]
+    assert len(themes) > 1 and all(t is themes[0] for t in themes)
+
+
+@pytest.mark.parametrize("tool", ["viyoga", "relationship_compass", "general"])
+def test_search_matches_previous_scoring(tool):
+    for query in QUERIES:
+        found = [(v["chapter"], v["verse"]) for v in gita_wisdom_retrieval.search_gita_verses(query, tool=tool)]
+        assert found == _legacy_search(query, tool)
+
+
+def test_filter_search_matches_previous_scoring():
+    wisdom_filter = GitaWisdomFilter()
+    for query in QUERIES:
+        teaching = wisdom_filter._tool_teachings[WisdomTool.GENERAL]
+        expanded = set(query.lower().split()) | set(teaching["keywords"]) | {c.lower() for c in teaching["concepts"]}
+        scored = []
+        for verse in get_gita_corpus().verses:
+            score = 2.0 * sum(any(k in app.lower() for k in expanded) for app in verse["mental_health_applications"])
+            score += 1.5 if any(k in verse["theme"].lower() for k in expanded) else 0
+            score += sum(0.5 for w in expanded if len(w) > 3 and w in verse["english"].lower())
+            score += sum(0.3 for w in expanded if len(w) > 3 and w in verse["principle"].lower())
+            if score > 0:
+                scored.append((score, verse))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        expected = [f"BG {v['chapter']}.{v['verse']}" for _, v in scored[:3]]
+        assert [r["reference"] for r in wisdom_filter._search_verses(query, WisdomTool.GENERAL)] == expected
+
+
+@pytest.mark.asyncio
+async def test_db_corpus_epoch_and_knowledge_base_rebuild(fresh_db_corpus):
+    db = AsyncMock()
+    kb = WisdomKnowledgeBase()
+    kb.clear_cache()
+    with patch.object(GitaService, "get_all_verses_with_tags", new_callable=AsyncMock) as mock_get_all:
+        mock_get_all.return_value = _rows()
+        first = await kb.get_all_verses(db)
+        corpus = await get_db_gita_corpus(db)
+        assert mock_get_all.call_count == 1  # second call served within the TTL
+        assert first[0]["mental_health_applications"] == ("anxiety_management",)
+        assert "peace" in kb._keyword_index
+
+        # Same content after invalidation: same corpus object, same epoch, same KB list
+        gita_corpus.invalidate_db_gita_corpus()
+        assert await get_db_gita_corpus(db) is corpus
+        assert await kb.get_all_verses(db) is first
+
+        # Changed content: new epoch, KB rebuilds
+        mock_get_all.return_value = _rows(english_suffix=" and serenity")
+        gita_corpus.invalidate_db_gita_corpus()
+        changed = await get_db_gita_corpus(db)
+        assert changed.epoch > corpus.epoch
+        rebuilt = await kb.get_all_verses(db)
+        assert rebuilt is not first
+        assert "serenity" in kb._keyword_index
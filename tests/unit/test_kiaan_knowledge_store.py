@@ -0,0 +1,169 @@
+"""Tests for the indexed, journaled KnowledgeStore.
+
+Covers:
+
+- Indexed chapter/theme/enemy lookups and search_wisdom return exactly what
+  the previous full scans returned, in the same order, for both backends.
+- Inserts and batched usage counters survive a reopen via the journal,
+  a torn final journal line is skipped, and replaying a journal over an
+  already-compacted snapshot does not double count.
+- The journal is compacted into the snapshot once it outgrows it.
+- Legacy indented snapshots load, and the SQLite backend imports them.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime
+
+import pytest
+
+from backend.services import kiaan_learning_engine as kle
+from backend.services.kiaan_learning_engine import (
+    ContentType,
+    KnowledgeStore,
+    LearnedWisdom,
+)
+
+WORDS = [
+    "karma", "dharma", "yoga", "detachment", "anger", "krodha", "peace", "duty",
+    "surrender", "wisdom", "equanimity", "arjuna", "krishna", "mind", "desire",
+]
+THEMES = ["inner peace", "selfless action", "anger management", "devotion", "duty"]
+
+
+def _wisdom(i: int, rng: random.Random, status: str = "validated") -> LearnedWisdom:
+    return LearnedWisdom(
+        id=f"w{i:05d}",
+        content=" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))).capitalize() + ".",
+        source_type=ContentType.TEXT,
+        source_url="https://vedabase.io/en/library/bg/",
+        source_name="Vedabase",
+        language=rng.choice(["en", "hi"]),
+        chapter_refs=rng.sample(range(1, 19), rng.randint(0, 2)),
+        verse_refs=[(2, 47)],
+        themes=rng.sample(THEMES, rng.randint(0, 2)),
+        shad_ripu_tags=rng.sample(kle.SHAD_RIPU, rng.randint(0, 2)),
+        keywords=rng.sample(WORDS, 2),
+        quality_score=rng.random(),
+        validation_status=status,
+        learned_at=datetime(2026, 1, 1),
+    )
+
+
+def _scan_search(items, query, limit):
+    """The previous linear search_wisdom."""
+    query_lower = query.lower()
+    results = []
+    for w in items:
+        if w.validation_status != "validated":
+            continue
+        score = 5 * (query_lower in w.content.lower())
+        score += sum(2 for k in w.keywords if query_lower in k.lower())
+        score += sum(3 for t in w.themes if query_lower in t.lower())
+        if score > 0:
+            results.append((w, score))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return [w.id for w, _ in results[:limit]]
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(3)
+    return [_wisdom(i, rng, "validated" if i % 5 else "pending") for i in range(400)]
+
+
+def _ids(items):
+    return [w.id for w in items]
+
+
+@pytest.mark.parametrize("backend", ["journal", "sqlite"])
+def test_indexed_lookups_match_full_scan(tmp_path, corpus, backend):
+    store = KnowledgeStore(str(tmp_path), backend=backend)
+    for w in corpus:
+        store.add_wisdom(w)
+
+    validated = [w for w in corpus if w.validation_status == "validated"]
+    for chapter in (1, 7, 18):
+        assert _ids(store.get_wisdom_by_chapter(chapter)) == [w.id for w in validated if chapter in w.chapter_refs]
+    for theme in ("peace", "DUTY", "action", ""):
+        assert _ids(store.get_wisdom_by_theme(theme)) == [
+            w.id for w in validated if any(theme.lower() in t.lower() for t in w.themes)
+        ]
+    for enemy in kle.SHAD_RIPU:
+        assert _ids(store.get_wisdom_by_shad_ripu(enemy)) == [w.id for w in validated if enemy in w.shad_ripu_tags]
+
+    queries = ["karma", "arm", "Anger", "peace duty", "yoga wis", "ma d", "krishna.", "  ", "", "zzz", "inner"]
+    for query in queries:
+        for limit in (3, 50):
+            assert _ids(store.search_wisdom(query, limit)) == _scan_search(corpus, query, limit), query
+    store.close()
+
+
+def test_journal_persists_inserts_and_batched_usage(tmp_path, corpus, monkeypatch):
+    monkeypatch.setattr(kle, "KNOWLEDGE_USAGE_FLUSH_SIZE", 3)
+    monkeypatch.setattr(kle, "KNOWLEDGE_USAGE_FLUSH_SECONDS", 3600)
+    store = KnowledgeStore(str(tmp_path))
+    for w in corpus[:10]:
+        store.add_wisdom(w)
+    assert not store.add_wisdom(corpus[0])
+
+    journal = tmp_path / "learned_wisdom.journal"
+    lines_after_inserts = len(journal.read_text().splitlines())
+    assert lines_after_inserts == 10
+
+    for _ in range(2):
+        store.record_usage("w00001")
+    assert len(journal.read_text().splitlines()) == lines_after_inserts  # still buffered
+    store.record_usage("w00002")
+    store.record_usage("w00003")  # third dirty item triggers the flush
+    assert len(journal.read_text().splitlines()) == lines_after_inserts + 3
+
+    store.record_usage("w00004")
+    store.close()
+
+    reopened = KnowledgeStore(str(tmp_path))
+    counts = {w.id: w.usage_count for w in reopened._wisdom_cache.values()}
+    assert counts["w00001"] == 2 and counts["w00003"] == 1 and counts["w00004"] == 1
+    assert reopened._wisdom_cache["w00001"].last_used is not None
+    assert _ids(reopened.search_wisdom("karma", 100)) == _scan_search(corpus[:10], "karma", 100)
+
+
+def test_compaction_and_idempotent_replay(tmp_path, corpus, monkeypatch):
+    monkeypatch.setattr(kle, "KNOWLEDGE_COMPACT_MIN_ENTRIES", 20)
+    store = KnowledgeStore(str(tmp_path))
+    for w in corpus[:19]:
+        store.add_wisdom(w)
+    journal = tmp_path / "learned_wisdom.journal"
+    saved_journal = journal.read_text()
+    store.record_usage("w00002")
+    store.flush()  # 20th journal entry -> next write compacts
+    store.add_wisdom(corpus[19])
+    assert journal.read_text() == ""
+    assert len(json.loads((tmp_path / "learned_wisdom.json").read_text())) == 20
+    store.close()
+
+    # Crash between snapshot rename and journal truncate: stale journal replays
+    journal.write_text(saved_journal + '{"op": "usage", "id": "w00002", "usage_count": 1, "last_')
+    reopened = KnowledgeStore(str(tmp_path))
+    assert len(reopened._wisdom_cache) == 20
+    assert reopened._wisdom_cache["w00002"].usage_count == 1
+
+
+def test_legacy_snapshot_loads_and_sqlite_imports_it(tmp_path, corpus):
+    legacy = [kle._wisdom_to_dict(w) for w in corpus[:25]]
+    legacy[0]["extra_metadata"] = legacy[0].pop("metadata")
+    (tmp_path / "learned_wisdom.json").write_text(json.dumps(legacy, indent=2))
+
+    assert len(KnowledgeStore(str(tmp_path))._wisdom_cache) == 25
+
+    store = KnowledgeStore(str(tmp_path), backend="sqlite")
+    assert list(store._wisdom_cache) == [w.id for w in corpus[:25]]
+    store.record_usage("w00007")
+    store.close()
+
+    reopened = KnowledgeStore(str(tmp_path), backend="sqlite")
+    assert reopened._wisdom_cache["w00007"].usage_count == 1
+    assert _ids(reopened.search_wisdom("dharma", 100)) == _scan_search(corpus[:25], "dharma", 100)
+    reopened.close()
@@ -0,0 +1,133 @@
+"""Tests for the queued logging pipeline and the indexed log ring.
+
+Covers:
+
+- LogRing keeps its level and logger indexes in step with eviction and
+  pages through one level, one logger, both, or a search, newest first.
+- SamplingFilter keeps 1 in N DEBUG/INFO records for a logger and its
+  children, never samples warnings, and keeps exact counts when several
+  threads log at once.
+- install_log_handler() runs the root handlers on the listener thread,
+  freezes mutable %-arguments at call time, and stop_log_pipeline() writes
+  out what is queued and restores the handlers; a full queue drops INFO
+  records instead of blocking.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+
+from backend.services import log_pipeline
+from backend.services.log_pipeline import (
+    LogRing,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    parse_sample_rates,
+)
+
+
+def test_ring_indexes_follow_eviction():
+    ring = LogRing(capacity=10)
+    for i in range(25):
+        ring.append(1000.0 + i, "ERROR" if i % 3 == 0 else "INFO", f"app.{i % 2}", f"message {i}")
+
+    assert len(ring) == 10
+    assert ring.counts_by_level() == {"DEBUG": 0, "INFO": 6, "WARNING": 0, "ERROR": 4, "CRITICAL": 0}
+
+    logs, total = ring.query(limit=3)
+    assert total == 10 and [e["message"] for e in logs] == ["message 24", "message 23", "message 22"]
+
+    logs, total = ring.query(level="ERROR", offset=1, limit=2)
+    assert total == 4 and [e["message"] for e in logs] == ["message 21", "message 18"]
+
+    logs, total = ring.query(logger_name="app.1")
+    assert total == 5 and all(int(e["message"].split()[1]) % 2 for e in logs)
+
+    logs, total = ring.query(level="ERROR", logger_name="app.0", search="MESSAGE 1")
+    assert total == 1 and logs[0]["message"] == "message 18"
+    assert logs[0]["timestamp"].startswith("1970-01-01T00:16:58")
+
+    assert ring.query(logger_name="app.9") == ([], 0)
+    ring.clear()
+    assert ring.query() == ([], 0)
+
+
+def test_sampling_filter():
+    sampler = SamplingFilter(parse_sample_rates("chatty:0.25, muted:0, bad:x"))
+    assert sampler.rates == {"chatty": 0.25, "muted": 0.0}
+
+    def kept(name, level, n):
+        return sum(sampler.filter(logging.LogRecord(name, level, __file__, 1, "m", None, None)) for _ in range(n))
+
+    assert kept("chatty.child", logging.INFO, 20) == 5
+    assert kept("chatty", logging.WARNING, 5) == 5
+    assert kept("chattybox", logging.DEBUG, 5) == 5  # not a child of "chatty"
+    assert kept("muted", logging.INFO, 5) == 0
+    assert sampler.sampled_out == 20
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(kept("chatty", logging.INFO, 4000)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(results) == 8000 and sampler.sampled_out == 20 + 24000
+
+
+class _ThreadRecorder(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    def emit(self, record):
+        self.seen.append((threading.current_thread().name, record.getMessage()))
+
+
+def test_pipeline_moves_handlers_to_listener_thread():
+    was_running = log_pipeline.pipeline_status()["running"]
+    log_pipeline.stop_log_pipeline()  # installed when backend.main was imported
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    for handler in saved:
+        root.removeHandler(handler)
+    recorder = _ThreadRecorder()
+    root.addHandler(recorder)
+    log_ring_before = len(log_pipeline.log_ring)
+    try:
+        log_pipeline.install_log_handler()
+        log_pipeline.install_log_handler()  # second call is a no-op
+        assert root.handlers == [log_pipeline._queue_handler]
+
+        items = ["a"]
+        logging.getLogger("pipeline.test").warning("items=%s n=%d", items, 3)
+        items.append("b")
+        log_pipeline.stop_log_pipeline()
+        assert root.handlers == [recorder]
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved:
+            root.addHandler(handler)
+        if was_running:
+            log_pipeline.install_log_handler()
+
+    assert recorder.seen == [(recorder.seen[0][0], "items=['a'] n=3")]
+    assert recorder.seen[0][0] != threading.current_thread().name
+    assert len(log_pipeline.log_ring) == min(log_ring_before + 1, log_pipeline.LOG_RING_CAPACITY)
+    logs, _ = log_pipeline.log_ring.query(logger_name="pipeline.test", limit=1)
+    assert logs[0]["level"] == "WARNING" and logs[0]["message"] == "items=['a'] n=3"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(2))
+    for i in range(5):
+        handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "n=%d", (i,), None))
+    assert handler.dropped == 3 and handler.queue.qsize() == 2
+    assert handler.queue.get().args == (0,)  # plain arguments are formatted later
+
+    handler.queue.get()
+    handler.handle(logging.LogRecord("x", logging.ERROR, __file__, 1, "kept", None, None))
+    assert handler.queue.qsize() == 1 and handler.dropped == 3
@@ -0,0 +1,281 @@
+"""Tests for the vectorized mood analytics and rolling per-user statistics.
+
+Covers:
+
+- The NumPy ``AnalyticsMLService`` matches straightforward pure-Python
+  reference computations (moving averages, regression slope, IQR anomalies,
+  weekly patterns).
+- ``MoodRollingStats.update`` (incremental) and ``from_points`` (batch)
+  produce the same summary.
+- The ``*_from_stats`` service methods agree with the history-based ones.
+- Mood logging keeps ``user_mood_stats`` current and the nightly rebuild
+  repairs it, removing summaries whose moods were all deleted.
+- The trend analysis endpoint analyzes only the requested window.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Mood, User
+from backend.services.analytics_ml_service import AnalyticsMLService, MoodDataPoint
+from backend.services.mood_rolling_stats import (
+    MoodRollingStats,
+    load_mood_stats,
+    rebuild_mood_stats_once,
+    record_mood_in_stats,
+)
+
+# ---------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------
+
+_TAGS = [["work", "Stress"], ["gratitude"], [], ["family"], ["work"]]
+
+
+def _history(n: int, seed: int = 7) -> list[MoodDataPoint]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, 8, 0)
+    points = []
+    for i in range(n):
+        score = round(min(10.0, max(1.0, 5.5 + 0.03 * i + rng.gauss(0, 1.2))), 1)
+        if i in (12, 40):
+            score = 1.0
+        points.append(MoodDataPoint(
+            date=start + timedelta(days=i, hours=rng.randint(0, 10)),
+            score=score,
+            tags=_TAGS[i % len(_TAGS)],
+        ))
+    return points
+
+
+def _reference_slope(scores: list[float]) -> float:
+    n = len(scores)
+    x_mean = (n - 1) / 2
+    y_mean = statistics.mean(scores)
+    num = sum((i - x_mean) * (y - y_mean) for i, y in enumerate(scores))
+    den = sum((i - x_mean) ** 2 for i in range(n))
+    return num / den
+
+
+def _stats_for(points: list[MoodDataPoint]) -> MoodRollingStats:
+    stats = MoodRollingStats()
+    for p in points:
+        stats.update(p.score, p.date, p.tags)
+    return stats
+
+
+# ---------------------------------------------------------------------
+# vectorized service parity
+# ---------------------------------------------------------------------
+
+def test_moving_average_matches_reference():
+    service = AnalyticsMLService()
+    scores = [p.score for p in _history(40)]
+
+    expected = [statistics.mean(scores[i:i + 7]) for i in range(len(scores) - 6)]
+    assert service._moving_average(scores, 7) == pytest.approx(expected)
+    assert service._moving_average(scores[:5], 7) == pytest.approx([statistics.mean(scores[:5])])
+
+
+def test_trend_volatility_and_anomalies_match_reference():
+    service = AnalyticsMLService()
+    points = _history(60)
+    scores = [p.score for p in points]
+
+    analysis = service.analyze_mood_trends(points)
+
+    slope = _reference_slope(scores)
+    assert analysis.trend_direction == ("improving" if slope > 0 else "declining")
+    assert analysis.trend_strength == pytest.approx(min(1.0, abs(slope) / 0.1))
+    assert analysis.volatility == pytest.approx(statistics.stdev(scores))
+    assert analysis.moving_avg_7d == pytest.approx(statistics.mean(scores[-7:]))
+    assert analysis.moving_avg_30d == pytest.approx(statistics.mean(scores[-30:]))
+
+    ordered = sorted(scores)
+    q1, q3 = ordered[len(ordered) // 4], ordered[(3 * len(ordered)) // 4]
+    lower = q1 - 1.5 * (q3 - q1)
+    assert [a["score"] for a in analysis.anomalies] == [s for s in scores if s < lower]
+    assert all(a["type"] == "unusually_low" for a in analysis.anomalies)
+
+
+def test_detect_patterns_keeps_first_appearance_order():
+    service = AnalyticsMLService()
+    points = _history(30)
+
+    patterns = service.detect_patterns(points)
+
+    expected_days = []
+    for p in points:
+        name = p.date.strftime("%A")
+        if name not in expected_days:
+            expected_days.append(name)
+    assert list(patterns["weekly"]) == expected_days
+    tags = {t["tag"]: t for t in patterns["tag_correlations"]}
+    assert tags["stress"]["count"] == 6
+    assert tags["work"]["count"] == 12
+
+
+# ---------------------------------------------------------------------
+# incremental vs batch summaries
+# ---------------------------------------------------------------------
+
+def test_incremental_update_matches_batch_rebuild():
+    points = _history(75)
+    incremental = MoodRollingStats.from_points(
+        [p.date for p in points[:50]], [p.score for p in points[:50]], [p.tags for p in points[:50]]
+    )
+    for p in points[50:]:
+        incremental.update(p.score, p.date, p.tags)
+    batch = MoodRollingStats.from_points(
+        [p.date for p in points], [p.score for p in points], [p.tags for p in points]
+    )
+
+    assert incremental.count == batch.count
+    assert incremental.stdev == pytest.approx(batch.stdev)
+    assert incremental.slope == pytest.approx(batch.slope)
+    assert incremental.ewma == pytest.approx(batch.ewma)
+    assert incremental.recent == pytest.approx(batch.recent)
+    assert incremental.weekday_counts == batch.weekday_counts
+    assert incremental.weekday_order == batch.weekday_order
+    assert incremental.tag_counts == batch.tag_counts
+    assert incremental.low_count == batch.low_count
+
+
+def test_from_dict_rejects_other_schema_versions():
+    stats = _stats_for(_history(10))
+    assert MoodRollingStats.from_dict(stats.to_dict()) == stats
+    assert MoodRollingStats.from_dict({**stats.to_dict(), "version": 0}) is None
+
+
+def test_service_from_stats_agrees_with_history():
+    service = AnalyticsMLService()
+    points = _history(45)
+    stats = MoodRollingStats.from_points(
+        [p.date for p in points], [p.score for p in points], [p.tags for p in points]
+    )
+
+    history = service.analyze_mood_trends(points)
+    summary = service.analyze_mood_trends_from_stats(stats)
+    assert summary.trend_direction == history.trend_direction
+    assert summary.trend_strength == pytest.approx(history.trend_strength)
+    assert summary.moving_avg_7d == pytest.approx(history.moving_avg_7d)
+    assert summary.volatility == pytest.approx(history.volatility)
+    assert summary.anomalies == history.anomalies
+
+    from_stats = service.predict_mood_from_stats(stats)
+    from_history = service.predict_mood(points)
+    assert [p.date for p in from_stats] == [p.date for p in from_history]
+    assert [p.predicted_score for p in from_stats] == pytest.approx(
+        [p.predicted_score for p in from_history]
+    )
+    assert [p.confidence_high for p in from_stats] == pytest.approx(
+        [p.confidence_high for p in from_history]
+    )
+    risk_from_stats = service.calculate_risk_score_from_stats(stats)
+    risk_from_history = service.calculate_risk_score(points)
+    assert risk_from_stats["level"] == risk_from_history["level"]
+    assert risk_from_stats["score"] == pytest.approx(risk_from_history["score"])
+    assert service.detect_patterns_from_stats(stats) == service.detect_patterns(points)
+
+
+def test_from_stats_requires_minimum_history():
+    service = AnalyticsMLService()
+    stats = _stats_for(_history(3))
+
+    assert service.predict_mood_from_stats(stats) == []
+    assert service.calculate_risk_score_from_stats(stats)["level"] == "insufficient_data"
+    assert service.analyze_mood_trends_from_stats(stats).trend_direction == "stable"
+
+
+# ---------------------------------------------------------------------
+# persistence
+# ---------------------------------------------------------------------
+
+async def _log_mood(db: AsyncSession, user_id: str, point: MoodDataPoint) -> None:
+    await db.execute(
+        insert(Mood).values(
+            user_id=user_id,
+            score=int(point.score),
+            tags={"tags": point.tags} if point.tags else None,
+            at=point.date,
+        )
+    )
+    await record_mood_in_stats(db, user_id, int(point.score), point.date, point.tags)
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_logging_moods_maintains_user_summary(test_db: AsyncSession):
+    test_db.add(User(id="mood-user", auth_uid="auth-mood-user", email="m@example.com"))
+    await test_db.commit()
+
+    points = _history(20)
+    for point in points:
+        await _log_mood(test_db, "mood-user", point)
+
+    stats = await load_mood_stats(test_db, "mood-user")
+    assert stats.count == 20
+    assert stats.mean == pytest.approx(statistics.mean(int(p.score) for p in points))
+    assert stats.last_datetime == points[-1].date
+
+    # An out-of-order (offline-synced) mood triggers a rebuild from moods.
+    backdated = MoodDataPoint(date=points[0].date - timedelta(days=1), score=9.0, tags=[])
+    await _log_mood(test_db, "mood-user", backdated)
+    stats = await load_mood_stats(test_db, "mood-user")
+    assert stats.count == 21
+    assert stats.recent[-1] == int(points[-1].score)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_once_recomputes_every_user(test_db: AsyncSession):
+    from tests.unit.test_privacy_scheduler import _session_maker_from
+
+    for uid in ("u-a", "u-b", "u-c"):
+        test_db.add(User(id=uid, auth_uid=f"auth-{uid}", email=f"{uid}@example.com"))
+    await test_db.commit()
+    for i, uid in enumerate(("u-a", "u-b", "u-c")):
+        for point in _history(8 + i, seed=i):
+            await test_db.execute(
+                insert(Mood).values(user_id=uid, score=int(point.score), at=point.date)
+            )
+    await test_db.commit()
+
+    # u-gone had a summary, but every one of its moods was soft-deleted since
+    test_db.add(User(id="u-gone", auth_uid="auth-u-gone", email="u-gone@example.com"))
+    await test_db.commit()
+    await _log_mood(test_db, "u-gone", _history(1)[0])
+    await test_db.execute(update(Mood).where(Mood.user_id == "u-gone").values(deleted_at=datetime.now()))
+    await test_db.commit()
+
+    result = await rebuild_mood_stats_once(_session_maker_from(test_db), chunk_size=2)
+
+    assert result == {"users": 4, "moods": 27, "removed": 1, "chunks": 2, "failed_chunks": 0}
+    assert (await load_mood_stats(test_db, "u-c")).count == 10
+    assert await load_mood_stats(test_db, "u-gone") is None
+
+
+@pytest.mark.asyncio
+async def test_trend_analysis_reads_only_the_requested_window(test_db: AsyncSession):
+    from backend.routes.analytics_dashboard import get_advanced_trend_analysis
+
+    test_db.add(User(id="trend-user", auth_uid="auth-trend-user", email="t@example.com"))
+    await test_db.commit()
+    now = datetime.now().astimezone()
+    old = [MoodDataPoint(date=now - timedelta(days=200 - i), score=10.0 - i // 4, tags=[]) for i in range(36)]
+    recent = [MoodDataPoint(date=now - timedelta(days=29 - i), score=3.0 + i // 5, tags=[]) for i in range(30)]
+    for point in old + recent:
+        await _log_mood(test_db, "trend-user", point)
+
+    result = await get_advanced_trend_analysis(lookback_days=30, user_id="trend-user", db=test_db)
+    expected = AnalyticsMLService().analyze_mood_trends(recent, 30)
+    assert result["trend"]["direction"] == expected.trend_direction == "improving"
+    assert result["moving_averages"]["30_day"] == pytest.approx(statistics.mean(p.score for p in recent))
+    assert result["volatility"]["score"] == pytest.approx(expected.volatility)
+    assert result["analysis_period"]["days"] == 30
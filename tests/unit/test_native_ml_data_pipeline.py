@@ -0,0 +1,130 @@
+"""Tests for the wake word feature pipeline in native/ml/engine.
+
+Covers:
+
+- ShardedFeatureStore appends across shard boundaries, persists its index
+  on flush, and reopens to the same rows; iter_batches() visits every row
+  exactly once, shuffled or in order, and rejects a mismatched shape.
+- MelFeatureExtractor gives (time, mels) for one clip and
+  (clips, time, mels) for a batch, standardised per clip, with
+  1 + (samples - n_fft) // hop frames when center=False.
+- render_chunk() turns payloads into fixed-size features and drops a
+  payload that fails to render; FeaturePipeline.process() renders
+  scenarios in worker processes and appends them to a store.
+
+The module imports no TensorFlow, only NumPy/SciPy/librosa.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+pytest.importorskip("soundfile")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "native" / "ml" / "engine"))
+
+import data_pipeline  # noqa: E402
+from audio_synthesizer import MelFeatureExtractor  # noqa: E402
+from data_pipeline import FeaturePipeline, ShardedFeatureStore, render_chunk  # noqa: E402
+
+SETTINGS = {"sample_rate": 16000, "duration": 0.5, "n_mels": 40, "n_fft": 512, "hop_length": 160, "seed": 7}
+FRAMES = 1 + (8000 - 512) // 160
+
+
+def _rows(start: int, n: int):
+    features = np.arange(start, start + n, dtype=np.float32)[:, None, None] * np.ones((1, 3, 2), np.float32)
+    return features, (np.arange(start, start + n) % 2).astype(np.int8), np.full(n, 0.5, np.float32)
+
+
+def test_store_round_trip_and_reopen(tmp_path):
+    store = ShardedFeatureStore(str(tmp_path), shard_size=4)
+    store.append(*_rows(0, 6))
+    store.append(*_rows(6, 5))
+    store.flush()
+    assert len(store) == 11 and [s["count"] for s in store.shards] == [4, 4, 3]
+
+    with pytest.raises(ValueError):
+        store.append(np.zeros((1, 2, 2), np.float32), np.zeros(1, np.int8), np.zeros(1, np.float32))
+
+    reopened = ShardedFeatureStore(str(tmp_path), shard_size=99)
+    assert reopened.shard_size == 4 and reopened.feature_shape == (3, 2) and len(reopened) == 11
+    features, labels, difficulty = reopened.read_shard(2)
+    assert features[:, 0, 0].tolist() == [8.0, 9.0, 10.0] and labels.tolist() == [0, 1, 0]
+
+    # Appending after a reopen fills the partial shard first
+    reopened.append(*_rows(11, 2))
+    reopened.flush()
+    assert [s["count"] for s in ShardedFeatureStore(str(tmp_path)).shards] == [4, 4, 4, 1]
+
+    ordered = [f[:, 0, 0].tolist() for f, _ in reopened.iter_batches(3, shuffle=False)]
+    assert ordered == [[0, 1, 2], [3], [4, 5, 6], [7], [8, 9, 10], [11], [12]]
+    seen = [v for f, labels in reopened.iter_batches(3, seed=1) for v in f[:, 0, 0].tolist()]
+    assert sorted(seen) == list(range(13))
+    batches = list(reopened.iter_batches(3, seed=1))
+    assert all(((f[:, 0, 0].astype(int) % 2) == labels).all() for f, labels in batches)
+
+
+def test_mel_feature_shapes():
+    extractor = MelFeatureExtractor(16000, 40, 512, 160, center=False)
+    rng = np.random.default_rng(0)
+    clip = rng.standard_normal(8000).astype(np.float32)
+
+    single = extractor.extract(clip)
+    batch = extractor.extract(np.stack([clip, 0.1 * clip, rng.standard_normal(8000).astype(np.float32)]))
+    assert single.shape == (FRAMES, 40) and batch.shape == (3, FRAMES, 40)
+    assert single.dtype == batch.dtype == np.float32
+    np.testing.assert_allclose(batch[0], single, atol=1e-4)
+    np.testing.assert_allclose(batch[1], single, atol=1e-3)  # scale-invariant per clip
+    np.testing.assert_allclose(batch.mean(axis=(1, 2)), 0, atol=1e-4)
+
+    centered = MelFeatureExtractor(16000, 40, 512, 160).extract(clip)
+    assert centered.shape == (1 + 8000 // 160, 40)
+
+
+def _payload(i: int, **overrides) -> dict:
+    payload = {
+        "id": f"s{i}", "text": "hey kiaan", "voice_id": f"voice-{i % 3}", "is_wake_word": i % 2,
+        "difficulty": 0.25, "background_noise_type": "white", "snr_db": 20.0, "reverb_level": 0.0,
+        "pitch_shift": 0.0, "speed_factor": 1.0, "volume": 1.0, "distance_meters": 0.3,
+        "microphone_type": "phone_builtin", "clean_path": None,
+    }
+    return {**payload, **overrides}
+
+
+def test_render_chunk_shapes_and_failures(tmp_path):
+    data_pipeline._init_worker(SETTINGS)
+    chunk = render_chunk([_payload(0), _payload(1, clean_path=str(tmp_path / "missing.wav")), _payload(2)])
+    assert chunk.ids == ["s0", "s2"]
+    assert chunk.features.shape == (2, FRAMES, 40) and chunk.labels.tolist() == [0, 0]
+
+    empty = render_chunk([_payload(3, clean_path=str(tmp_path / "missing.wav"))])
+    assert empty.features.shape == (0, FRAMES, 40) and empty.ids == []
+
+
+@pytest.mark.asyncio
+async def test_pipeline_process_appends_to_store(tmp_path):
+    config = SimpleNamespace(
+        pipeline_workers=2, pipeline_chunk_size=3, pipeline_prefetch=0, audio_source="synthetic",
+        sample_rate=16000, duration=0.5, n_mels=40, n_fft=512, hop_length=160,
+    )
+    scenarios = [
+        SimpleNamespace(voice=SimpleNamespace(id=p.pop("voice_id")), **p)
+        for p in (_payload(i) for i in range(8))
+    ]
+    store = ShardedFeatureStore(str(tmp_path), shard_size=5)
+    pipeline = FeaturePipeline(config)
+    try:
+        result = await pipeline.process(scenarios, store=store)
+    finally:
+        pipeline.close()
+
+    assert sorted(result.ids) == [f"s{i}" for i in range(8)]
+    assert result.features.shape == (8, FRAMES, 40)
+    assert pipeline.stats["chunks"] == 3 and pipeline.stats["failed"] == 0
+    assert len(ShardedFeatureStore(str(tmp_path))) == 8
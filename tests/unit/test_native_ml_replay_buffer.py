@@ -0,0 +1,115 @@
+"""Tests for the sum-tree prioritized replay buffer in native/ml/engine.
+
+Covers:
+
+- SumTree keeps the total, the minimum and prefix-sum lookups consistent
+  with its leaves across single, batched and duplicate-index updates.
+- PrioritizedReplayBuffer samples slots in proportion to priority ** alpha,
+  update_priorities() shifts later samples, a full buffer evicts its
+  lowest-priority slot, and importance-sampling weights are at most 1.
+
+continuous_learning_engine imports TensorFlow at module level; it is
+stubbed in sys.modules while the module loads, since neither structure
+touches it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("librosa")
+pytest.importorskip("soundfile")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "native" / "ml" / "engine"))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    tf = MagicMock()
+    stubs = {"tensorflow": tf, "tensorflow.keras": tf.keras, "tensorflow.keras.layers": tf.keras.layers}
+    with patch.dict(sys.modules, stubs):
+        sys.modules.pop("continuous_learning_engine", None)
+        module = importlib.import_module("continuous_learning_engine")
+    sys.modules.pop("continuous_learning_engine", None)
+    return module
+
+
+def _buffer(engine, tmp_path, size, alpha=1.0, beta=0.4):
+    config = engine.ContinuousLearningConfig(
+        replay_buffer_size=size, priority_alpha=alpha, priority_beta=beta, data_dir=str(tmp_path),
+    )
+    return engine.PrioritizedReplayBuffer(config)
+
+
+def test_sum_tree_total_min_and_find(engine):
+    rng = np.random.default_rng(0)
+    tree = engine.SumTree(13)  # not a power of two
+    leaves = np.zeros(13)
+    for _ in range(20):
+        indices = rng.integers(0, 13, size=rng.integers(1, 6))
+        values = rng.uniform(0.1, 5.0, size=indices.size)
+        tree.update(indices, values)
+        for i, v in zip(indices, values, strict=True):
+            leaves[i] = v  # duplicate indices: the last write wins
+        assert tree.total == pytest.approx(leaves.sum())
+        written = leaves[leaves > 0]
+        assert tree.min == pytest.approx(written.min())
+        np.testing.assert_allclose(tree.leaves(np.arange(13)), leaves)
+
+    cumulative = np.cumsum(leaves)
+    targets = rng.uniform(0, tree.total, size=200)
+    np.testing.assert_array_equal(tree.find(targets), np.searchsorted(cumulative, targets, side="right"))
+    assert tree.argmin() == int(np.flatnonzero(leaves == written.min())[0])
+
+
+def test_sampling_follows_priority_and_updates(engine, tmp_path):
+    np.random.seed(1)
+    buffer = _buffer(engine, tmp_path, size=4)
+    buffer.add_batch(np.eye(4, dtype=np.float32), np.array([0, 1, 0, 1]), np.array([1.0, 2.0, 3.0, 4.0]))
+
+    counts = np.bincount(np.concatenate([buffer.sample_batch(4).indices for _ in range(5000)]), minlength=4)
+    np.testing.assert_allclose(counts / counts.sum(), [0.1, 0.2, 0.3, 0.4], atol=0.02)
+
+    buffer.update_priorities([0, 3], [50.0, 0.5])
+    counts = np.bincount(np.concatenate([buffer.sample_batch(4).indices for _ in range(2000)]), minlength=4)
+    assert counts[0] / counts.sum() == pytest.approx(50 / 55.5, abs=0.02)
+    assert counts[0] > counts[1] > counts[3]
+
+    buffer.update_priorities([7], [100.0])  # slots beyond the filled size are ignored
+    assert buffer.tree.total == pytest.approx(55.5 + 4 * 1e-6, rel=1e-6)
+
+
+def test_full_buffer_evicts_lowest_priority(engine, tmp_path):
+    buffer = _buffer(engine, tmp_path, size=3)
+    for i, priority in enumerate((2.0, 0.5, 3.0)):
+        assert buffer.add(np.full(2, i, np.float32), False, priority) == i
+    assert len(buffer) == 3
+
+    assert buffer.add(np.full(2, 9, np.float32), True, 4.0) == 1  # replaces priority 0.5
+    assert len(buffer) == 3 and buffer.features[1].tolist() == [9.0, 9.0] and buffer.labels[1] == 1.0
+    slots = buffer.add_batch(np.full((2, 2), 7, np.float32), np.array([0, 0]), np.array([5.0, 6.0]))
+    assert slots.tolist() == [0, 2]  # then priority 2.0, then 3.0
+    assert buffer.tree.min == pytest.approx(4.0, rel=1e-5)
+
+
+def test_importance_weights_are_normalized(engine, tmp_path):
+    np.random.seed(2)
+    buffer = _buffer(engine, tmp_path, size=64, alpha=0.6, beta=0.4)
+    priorities = np.random.uniform(0.01, 10.0, size=64)
+    buffer.add_batch(np.random.rand(64, 3).astype(np.float32), np.zeros(64), priorities)
+
+    batch = buffer.sample_batch(32)
+    assert batch.weights.shape == (32,) and batch.weights.dtype == np.float32
+    assert np.all(batch.weights > 0) and np.all(batch.weights <= 1.0 + 1e-6)
+    probabilities = buffer.tree.leaves(batch.indices) / buffer.tree.total
+    expected = (probabilities / (buffer.tree.min / buffer.tree.total)) ** -0.4
+    np.testing.assert_allclose(batch.weights, expected, rtol=1e-5)
+
+    buffer.update_priorities(np.arange(64), np.full(64, 2.5))
+    np.testing.assert_allclose(buffer.sample_batch(8, beta=1.0).weights, 1.0, rtol=1e-5)
@@ -0,0 +1,188 @@
+"""Tests for bulk notification campaigns.
+
+Covers:
+
+- Preference toggles and quiet hours are applied in SQL, with the same
+  outcome ``dispatch_notification`` gives for each user.
+- Inbox rows are created for every eligible user; statuses reflect tickets.
+- Tokens are packed into 100-message Expo batches; DeviceNotRegistered
+  tokens are deactivated in bulk.
+- Batches are retried on 429/5xx against a local stub of the Expo API.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Notification, NotificationPreference, PushSubscription, User
+from backend.services import expo_push, notification_campaign
+from backend.services.notification_campaign import run_notification_campaign
+from backend.services.notification_dispatcher import _is_in_quiet_hours
+from tests.unit.test_privacy_scheduler import _session_maker_from
+
+# ---------------------------------------------------------------------
+# helpers
+# ---------------------------------------------------------------------
+
+
+class _ExpoStub:
+    """In-process HTTP stub of the Expo push endpoint."""
+
+    def __init__(self, unregistered: set[str] = frozenset(), fail_first: int = 0) -> None:
+        self.unregistered = unregistered
+        self.fail_first = fail_first
+        self.batches: list[list[dict]] = []
+        self.calls = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            return httpx.Response(503, text="try later")
+        messages = json.loads(request.content)
+        self.batches.append(messages)
+        tickets = [
+            {"status": "error", "message": "gone", "details": {"error": "DeviceNotRegistered"}}
+            if m["to"] in self.unregistered
+            else {"status": "ok", "id": f"ticket-{m['to']}"}
+            for m in messages
+        ]
+        return httpx.Response(200, json={"data": tickets})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+async def _mk_user(db: AsyncSession, uid: str, tokens: int = 1, **prefs) -> None:
+    db.add(User(id=uid, auth_uid=f"auth-{uid}", email=f"{uid}@example.com"))
+    if prefs:
+        db.add(NotificationPreference(user_id=uid, **prefs))
+    for i in range(tokens):
+        db.add(PushSubscription(user_id=uid, endpoint=f"ExponentPushToken[{uid}-{i}]"))
+
+
+def _hour_offset(hours: int) -> int:
+    return (datetime.datetime.now(datetime.UTC).hour + hours) % 24
+
+
+async def _statuses(db: AsyncSession) -> dict[str, str]:
+    rows = (await db.execute(select(Notification.user_id, Notification.status))).all()
+    return {row.user_id: row.status for row in rows}
+
+
+# ---------------------------------------------------------------------
+# tests
+# ---------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_preferences_and_quiet_hours_filter_in_sql(test_db: AsyncSession):
+    await _mk_user(test_db, "a-no-prefs")
+    await _mk_user(test_db, "b-push-off", push_enabled=False)
+    await _mk_user(test_db, "c-category-off", daily_checkin_reminder=False)
+    quiet_ranges = {
+        "q-now": (_hour_offset(-1), _hour_offset(2)),
+        "q-later": (_hour_offset(2), _hour_offset(4)),
+        "q-overnight": (22, 6),
+        "q-office": (8, 17),
+        "q-empty": (5, 5),
+    }
+    for uid, (start, end) in quiet_ranges.items():
+        await _mk_user(test_db, uid, quiet_hours_start=start, quiet_hours_end=end)
+    await test_db.commit()
+
+    stub = _ExpoStub()
+    async with stub.client() as client:
+        result = await run_notification_campaign(
+            _session_maker_from(test_db), "daily_verse", "Verse", "BG 2.47",
+            data={"type": "daily_verse"}, client=client,
+        )
+
+    # Same decision dispatch_notification makes per user
+    expected = ["a-no-prefs"] + [
+        uid for uid, (start, end) in quiet_ranges.items()
+        if not _is_in_quiet_hours(start, end)
+    ]
+    assert "q-now" not in expected and "q-later" in expected
+    assert sorted(await _statuses(test_db)) == sorted(expected)
+    assert result.users == len(expected) and result.tickets_ok == len(expected)
+
+    # Streak reminders ignore the daily check-in toggle
+    async with stub.client() as client:
+        result = await run_notification_campaign(
+            _session_maker_from(test_db), "streak", "Streak", "Keep going", client=client,
+        )
+    assert result.users == len(expected) + 1
+
+
+@pytest.mark.asyncio
+async def test_batches_of_100_and_invalid_tokens_deactivated(test_db: AsyncSession):
+    for i in range(130):
+        await _mk_user(test_db, f"user-{i:03d}", tokens=2)
+    await _mk_user(test_db, "user-inbox-only", tokens=0)
+    await test_db.commit()
+
+    dead = {"ExponentPushToken[user-005-0]", "ExponentPushToken[user-005-1]",
+            "ExponentPushToken[user-100-1]"}
+    stub = _ExpoStub(unregistered=dead)
+    async with stub.client() as client:
+        result = await run_notification_campaign(
+            _session_maker_from(test_db), "daily_verse", "Verse", "BG 2.47",
+            chunk_size=50, concurrency=4, client=client,
+        )
+
+    assert result.users == 131 and result.chunks == 3
+    assert result.tokens == 260
+    assert all(len(batch) <= 100 for batch in stub.batches)
+    assert result.tokens_deactivated == 3
+    inactive = (
+        await test_db.execute(
+            select(PushSubscription.endpoint).where(PushSubscription.is_active.is_(False))
+        )
+    ).scalars().all()
+    assert set(inactive) == dead
+
+    statuses = await _statuses(test_db)
+    assert statuses["user-005"] == "failed"
+    assert statuses["user-100"] == "sent"
+    assert statuses["user-inbox-only"] == "sent"
+
+
+@pytest.mark.asyncio
+async def test_transient_expo_errors_are_retried(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(expo_push, "EXPO_RETRY_BASE_DELAY", 0.0)
+    await _mk_user(test_db, "retry-user")
+    await test_db.commit()
+
+    stub = _ExpoStub(fail_first=2)
+    async with stub.client() as client:
+        result = await run_notification_campaign(
+            _session_maker_from(test_db), "sakha", "Insight", "Hello", client=client,
+        )
+
+    assert stub.calls == 3
+    assert result.tickets_ok == 1 and result.failed_batches == 0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_mark_notifications_failed(test_db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(expo_push, "EXPO_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(notification_campaign, "send_expo_batch",
+                        lambda client, batch: expo_push.send_expo_batch(client, batch, max_retries=1))
+    await _mk_user(test_db, "down-user")
+    await test_db.commit()
+
+    stub = _ExpoStub(fail_first=10)
+    async with stub.client() as client:
+        result = await run_notification_campaign(
+            _session_maker_from(test_db), "sakha", "Insight", "Hello", client=client,
+        )
+
+    assert stub.calls == 2
+    assert result.failed_batches == 1
+    assert (await _statuses(test_db)) == {"down-user": "failed"}
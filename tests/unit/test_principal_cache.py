@@ -0,0 +1,147 @@
+"""Tests for the authenticated-principal cache behind get_current_user.
+
+Covers:
+
+- A second request with the same token is answered without touching the
+  users table; several auth dependencies in one request share one lookup.
+- Deleted and unverified users keep their 401 / 403 responses.
+- invalidate_principal() drops every session of the user, and a lookup that
+  started before the invalidation does not write its stale result back.
+- Entries expire after the TTL and the cache stays within max_entries.
+"""
+
+from __future__ import annotations
+
+import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, update
+
+from backend.deps import get_current_user, get_current_user_object
+from backend.models import User
+from backend.security.jwt import create_access_token
+from backend.security.principal_cache import (
+    Principal,
+    PrincipalCache,
+    invalidate_principal,
+    principal_cache,
+)
+
+
+async def _session(sqlite_session_maker):
+    db = (await sqlite_session_maker(User))()
+    for user_id, verified in (("u-verified", True), ("u-unverified", False)):
+        db.add(User(
+            id=user_id, auth_uid=user_id, email=f"{user_id}@example.com",
+            hashed_password="x", email_verified=verified,
+        ))
+    await db.commit()
+
+    queries: list[str] = []
+    event.listen(
+        db.bind.sync_engine, "before_cursor_execute",
+        lambda *args: queries.append(args[2]),
+    )
+    return db, queries
+
+
+def _request(user_id: str, session_id: str = "s1"):
+    token = create_access_token(user_id, session_id)
+    return SimpleNamespace(headers={"Authorization": f"Bearer {token}"}, cookies={}, state=SimpleNamespace())
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_are_served_from_cache(sqlite_session_maker):
+    db, queries = await _session(sqlite_session_maker)
+
+    assert await get_current_user(_request("u-verified"), db) == "u-verified"
+    assert len(queries) == 1
+
+    request = _request("u-verified")
+    assert await get_current_user(request, db) == "u-verified"
+    assert await get_current_user(request, db) == "u-verified"
+    assert len(queries) == 1
+    assert request.state.principal_memo[1] == Principal("u-verified", True, True)
+
+    # A cold lookup loads the row once for both dependencies
+    principal_cache.clear()
+    db.expunge_all()
+    request = _request("u-verified")
+    await get_current_user(request, db)
+    user = await get_current_user_object(request, db)
+    assert user.email == "u-verified@example.com"
+    assert len(queries) == 2
+
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_deleted_and_unverified_users_are_rejected(sqlite_session_maker):
+    db, _ = await _session(sqlite_session_maker)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(_request("u-missing"), db)
+    assert exc.value.status_code == 401
+
+    with patch("backend.deps.settings.REQUIRE_EMAIL_VERIFICATION", True):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(_request("u-unverified"), db)
+        assert exc.value.status_code == 403
+        # Served from cache the second time, same answer
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(_request("u-unverified"), db)
+        assert exc.value.status_code == 403
+
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_applies_suspension_immediately(sqlite_session_maker):
+    db, queries = await _session(sqlite_session_maker)
+
+    await get_current_user(_request("u-verified", "s1"), db)
+    await get_current_user(_request("u-verified", "s2"), db)
+    await db.execute(
+        update(User).where(User.id == "u-verified").values(deleted_at=datetime.datetime.now(datetime.UTC))
+    )
+    await db.commit()
+
+    # Still cached until invalidated
+    assert await get_current_user(_request("u-verified", "s1"), db) == "u-verified"
+
+    await invalidate_principal("u-verified")
+    for sid in ("s1", "s2"):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(_request("u-verified", sid), db)
+        assert exc.value.status_code == 401
+
+    await db.close()
+
+
+def test_lookup_started_before_invalidation_is_not_stored():
+    cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+    generation = cache.generation("u1")
+    cache.invalidate("u1")  # e.g. suspended while the row was being read
+    cache.put("s1", Principal("u1", True, True), generation)
+    assert cache.get("u1", "s1") is None
+
+    cache.put("s1", Principal("u1", False, True), cache.generation("u1"))
+    assert cache.get("u1", "s1") == Principal("u1", False, True)
+
+
+def test_entries_expire_and_stay_bounded():
+    cache = PrincipalCache(ttl_seconds=30, max_entries=3)
+    with patch("backend.security.principal_cache.time.monotonic", return_value=100.0):
+        for n in range(5):
+            cache.put("s", Principal(f"u{n}", True, True), 0)
+        assert len(cache) == 3
+        assert cache.get("u0", "s") is None
+        assert cache.get("u4", "s") is not None
+
+    with patch("backend.security.principal_cache.time.monotonic", return_value=131.0):
+        assert cache.get("u4", "s") is None
+    assert len(cache) == 2
+    assert cache._by_user.keys() == {"u2", "u3"}
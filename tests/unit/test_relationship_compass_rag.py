@@ -0,0 +1,132 @@
+"""Tests for Relationship Compass index loading and retrieval.
+
+Covers:
+
+- Embedding search over the normalized matrix returns the same ranking
+  and scores as per-chunk cosine similarity, before and after migrating
+  the index to the binary .npy format (float32 and float16).
+- The BM25 keyword index ranks matching chunks first, matches prefixes and
+  only returns chunks that match.
+- One OpenAI client is reused across queries.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from backend.services import relationship_compass_rag as rag
+
+DIM = 24
+
+
+def _make_index(path, n=60, seed=0, missing=(3, 17)):
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE gita_chunks (
+            chunk_id TEXT PRIMARY KEY, chapter TEXT, verse TEXT, source_file TEXT, tags TEXT,
+            language TEXT, chunk_type TEXT, text TEXT, commentary TEXT, embedding TEXT, keywords TEXT
+        );
+        """
+    )
+    conn.execute("INSERT INTO metadata VALUES ('model', 'test-embedding')")
+    vectors = {}
+    for i in range(n):
+        vector = [] if i in missing else rng.standard_normal(DIM).tolist()
+        vectors[f"c{i}"] = np.array(vector, dtype=np.float32)
+        text = "Krishna speaks of anger and forgiveness" if i == 7 else f"Verse {i} on duty and action"
+        conn.execute(
+            "INSERT INTO gita_chunks VALUES (?, ?, ?, '', ?, 'en', 'verse', ?, '', ?, ?)",
+            (f"c{i}", str(1 + i % 18), str(i), json.dumps(["emotional_regulation"] if i == 9 else ["duty"]),
+             text, json.dumps(vector), json.dumps(["krodha"] if i == 7 else ["karma"])),
+        )
+    conn.commit()
+    conn.close()
+    return vectors
+
+
+def _brute_force(vectors, query, k):
+    scored = [(cid, rag.cosine_similarity(query, v)) for cid, v in vectors.items() if v.size]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:k]
+
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    path = tmp_path / "gita_index.sqlite"
+    monkeypatch.setattr(rag, "INDEX_PATH", path)
+    monkeypatch.setattr(rag, "_cached_index", None)
+    return path
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 1e-5), ("float16", 2e-3)])
+def test_matrix_search_matches_cosine_before_and_after_migration(index_path, dtype, tolerance):
+    vectors = _make_index(index_path)
+    query = np.random.default_rng(1).standard_normal(DIM).astype(np.float32)
+    expected = _brute_force(vectors, query, 10)
+
+    legacy = rag.RelationshipCompassIndex.load()
+    found = legacy.search_embeddings(query, 10)
+    assert [c.chunk_id for c, _ in found] == [cid for cid, _ in expected]
+    assert np.allclose([s for _, s in found], [s for _, s in expected], atol=1e-5)
+
+    conn = sqlite3.connect(index_path)
+    assert rag.write_embedding_matrix(conn, index_path, dtype=dtype) == 58
+    assert conn.execute("SELECT COUNT(*) FROM gita_chunks WHERE embedding IS NOT NULL").fetchone()[0] == 0
+    conn.close()
+    assert (index_path.parent / "gita_index.embeddings.npy").exists()
+
+    migrated = rag.RelationshipCompassIndex.load()
+    assert migrated.matrix.shape == (58, DIM)
+    found = migrated.search_embeddings(query, 10)
+    assert [c.chunk_id for c, _ in found][:5] == [cid for cid, _ in expected][:5]
+    assert np.allclose([s for _, s in found], [s for _, s in expected], atol=tolerance)
+    assert migrated.chunks[3].embedding.size == 0
+    assert np.allclose(migrated.chunks[5].embedding, vectors["c5"] / np.linalg.norm(vectors["c5"]), atol=tolerance)
+
+
+def test_keyword_index_ranks_matches_and_prefixes(index_path):
+    _make_index(index_path)
+    index = rag.RelationshipCompassIndex.load()
+
+    top = index.search_keywords({"anger", "forgiveness"}, 5)
+    assert [c.chunk_id for c, _ in top] == ["c7"]
+
+    # "emotion" prefixes the "emotional" tag token
+    assert [c.chunk_id for c, _ in index.search_keywords({"emotion"}, 5)] == ["c9"]
+    assert index.search_keywords({"nonexistent"}, 5) == []
+
+    result = rag.retrieve_chunks_keyword("anger krodha", "family", k=3)
+    assert result.strategy == "keywords"
+    assert result.chunks[0].chunk_id == "c7"
+    assert 0.3 <= result.confidence <= 1.0
+
+
+def test_embed_query_reuses_one_client(monkeypatch):
+    created = []
+
+    class FakeEmbeddings:
+        def create(self, model, input):
+            item = type("Item", (), {"embedding": [1.0, 0.0]})
+            return type("Response", (), {"data": [item]})
+
+    class FakeOpenAI:
+        def __init__(self, api_key):
+            created.append(api_key)
+            self.embeddings = FakeEmbeddings()
+
+    monkeypatch.setattr(rag, "OpenAI", FakeOpenAI)
+    monkeypatch.setattr(rag, "_openai_client", None)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    for _ in range(3):
+        assert rag.embed_query("anger", "m").tolist() == [1.0, 0.0]
+    assert created == ["sk-test"]
+
+    monkeypatch.delenv("OPENAI_API_KEY")
+    assert rag.embed_query("anger", "m") is None
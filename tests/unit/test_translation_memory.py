@@ -0,0 +1,142 @@
+"""Tests for the sentence-level translation memory.
+
+Covers:
+
+- Segmentation round-trips and key normalization.
+- ``translate_many`` dedupes sentences across texts and sends all misses
+  in one provider call; repeated sentences never reach the provider again.
+- The SQLite store persists translations across service instances.
+- Verse pre-warming makes chat responses quoting a verse provider-free.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend.services.translation_memory import (
+    SQLiteTranslationStore,
+    TranslationMemory,
+    memory_key,
+    segment_text,
+)
+from backend.services.translation_service import TranslationService
+
+
+class _Item:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class _StubTranslator:
+    """googletrans-shaped provider: a str gives one item, a list gives a list."""
+
+    def __init__(self) -> None:
+        self.calls: list[str | list[str]] = []
+
+    def translate(self, text, src="en", dest="es"):
+        self.calls.append(text)
+        if isinstance(text, list):
+            return [_Item(f"[{dest}] {t}") for t in text]
+        return _Item(f"[{dest}] {text}")
+
+
+def _service(memory: TranslationMemory | None = None) -> tuple[TranslationService, _StubTranslator]:
+    svc = TranslationService()
+    stub = _StubTranslator()
+    svc.translator = stub
+    svc.googletrans_available = True
+    svc.enabled = True
+    if memory is not None:
+        svc.memory = memory
+    return svc, stub
+
+
+def test_segment_round_trip_and_normalized_keys():
+    text = "  Breathe slowly.  You are safe!\n\nAre you ready? यह सत्य है। Next"
+    segments = segment_text(text)
+    assert "".join(s + sep for s, sep in segments) == text
+    assert [s.strip() for s, _ in segments] == [
+        "Breathe slowly.", "You are safe!", "Are you ready?", "यह सत्य है।", "Next",
+    ]
+    assert memory_key("You  are\tsafe!", "en", "hi") == memory_key("You are safe!", "en", "hi")
+    assert memory_key("You are safe!", "en", "hi") != memory_key("You are safe!", "en", "ta")
+
+
+@pytest.mark.asyncio
+async def test_translate_many_batches_misses_into_one_call():
+    svc, stub = _service()
+    texts = [
+        "Take a breath. You are not alone.",
+        "You are not alone. Let us reflect.",
+        "Take a breath.",
+        "",
+    ]
+
+    results = await svc.translate_many(texts, "es")
+
+    assert len(stub.calls) == 1
+    assert sorted(stub.calls[0]) == ["Let us reflect.", "Take a breath.", "You are not alone."]
+    assert results[0]["translated_text"] == "[es] Take a breath. [es] You are not alone."
+    assert results[1]["translated_text"] == "[es] You are not alone. [es] Let us reflect."
+    assert all(r["success"] for r in results[:3])
+    assert results[3]["error"] == "Empty text provided"
+
+    # A new response built from known sentences needs no provider call
+    result = await svc.translate_chat_response("Let us reflect.\n\nTake a breath.", "es")
+    assert result["translated_text"] == "[es] Let us reflect.\n\n[es] Take a breath."
+    assert len(stub.calls) == 1
+    assert svc.get_cache_stats()["provider_sentences"] == 3
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_fails_every_text_without_caching():
+    svc, stub = _service()
+
+    def _fail(*args, **kwargs):
+        raise RuntimeError("quota exceeded")
+
+    stub.translate = _fail
+
+    results = await svc.translate_many(["One.", "Two."], "fr")
+
+    assert [r["success"] for r in results] == [False, False]
+    assert [r["translated_text"] for r in results] == ["One.", "Two."]
+    assert svc.memory.stats()["lru_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_memory_survives_new_service_instance(tmp_path):
+    path = tmp_path / "tm.sqlite3"
+    first, first_stub = _service(TranslationMemory(SQLiteTranslationStore(path)))
+    await first.translate_text("Peace begins within. Act without attachment.", "hi")
+    assert len(first_stub.calls) == 1
+
+    second, second_stub = _service(TranslationMemory(SQLiteTranslationStore(path)))
+    result = await second.translate_text("Act without attachment.", "hi")
+    assert result["translated_text"] == "[hi] Act without attachment."
+    assert second_stub.calls == []
+    assert await second.memory.store.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_verses_covers_quoted_verses(tmp_path):
+    corpus = tmp_path / "verses.json"
+    corpus.write_text(json.dumps([
+        {"chapter": 2, "verse": 47, "english": "You have a right to your actions. Never to their fruits."},
+        {"chapter": 2, "verse": 48, "english": "Perform your duty with equanimity."},
+        {"chapter": 2, "verse": 49, "english": ""},
+    ]))
+    svc, stub = _service()
+
+    summary = await svc.prewarm_verses(languages=["hi", "ta"], verses_path=corpus)
+
+    assert summary["verses"] == 2
+    assert summary["languages"]["hi"] == {"translated": 2, "provider_calls": 1}
+    assert len(stub.calls) == 2
+
+    reply = "Remember BG 2.47. You have a right to your actions. Never to their fruits."
+    result = await svc.translate_chat_response(reply, "ta")
+    assert stub.calls[-1] == "Remember BG 2.47."
+    assert result["translated_text"].endswith("[ta] You have a right to your actions. [ta] Never to their fruits.")
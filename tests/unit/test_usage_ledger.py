@@ -0,0 +1,178 @@
+"""Tests for the Redis usage ledger behind KIAAN and voice quotas.
+
+Covers:
+
+- Several workers (ledgers on separate clients, one Redis) racing for the
+  last questions: exactly ``limit`` reservations are granted; released and
+  expired reservations stop counting.
+- A missing ledger hash is seeded from usage_tracking, and reconcile()
+  writes counts back (updating and inserting rows) without rolling back a
+  larger database count.
+- subscription_service: reserve/increment go through the ledger, and
+  increments made while Redis is down are merged in once it is back.
+- Voice turns: reserve_turn / arecord_minutes count actual minutes against
+  the daily cap across workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+
+import fakeredis
+import fakeredis.aioredis
+
+from backend.models import SubscriptionTier, UsageTracking
+from backend.services import subscription_service, usage_ledger
+from backend.services.subscription_service import (
+    _get_current_period,
+    check_kiaan_quota,
+    increment_kiaan_usage,
+    release_kiaan_reservation,
+    reserve_kiaan_question,
+)
+from backend.services.usage_ledger import UsageLedger, UsagePeriod
+from backend.services.voice.quota_service import VoiceQuotaService
+
+
+def _worker(server: fakeredis.FakeServer | None) -> UsageLedger:
+    """A ledger as one worker process sees it (None = Redis down)."""
+    ledger = UsageLedger()
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True) if server else None
+
+    async def _client():
+        return client
+
+    ledger._client = _client  # type: ignore[method-assign]
+    return ledger
+
+
+def _period() -> UsagePeriod:
+    return UsagePeriod(*_get_current_period())
+
+
+@pytest.mark.asyncio
+async def test_limit_holds_across_workers():
+    server = fakeredis.FakeServer()
+    workers = [_worker(server) for _ in range(4)]
+    period = _period()
+
+    reservations = await asyncio.gather(*(
+        workers[i % 4].reserve(None, "kiaan_questions", "u1", period, 1, 5) for i in range(20)
+    ))
+    granted = [r for r in reservations if r.granted]
+    assert len(granted) == 5
+
+    for r in granted[:3]:
+        await workers[0].commit(None, r)
+    for r in granted[3:]:
+        await workers[1].release(r)
+    assert await workers[2].usage(None, "kiaan_questions", "u1", period, 5) == (3, 0)
+
+    again = await asyncio.gather(*(
+        workers[i % 4].reserve(None, "kiaan_questions", "u1", period, 1, 5) for i in range(6)
+    ))
+    assert sum(r.granted for r in again) == 2
+
+    # Unlimited (-1) never denies
+    assert (await workers[3].reserve(None, "kiaan_questions", "u2", period, 1, -1)).granted
+
+
+@pytest.mark.asyncio
+async def test_expired_reservations_stop_counting():
+    ledger = _worker(fakeredis.FakeServer())
+    with patch.object(usage_ledger, "USAGE_RESERVATION_TTL_SECONDS", 0):
+        first = await ledger.reserve(None, "kiaan_questions", "u1", _period(), 1, 1)
+    second = await ledger.reserve(None, "kiaan_questions", "u1", _period(), 1, 1)
+    assert first.granted and second.granted
+    assert (await ledger.reserve(None, "kiaan_questions", "u1", _period(), 1, 1)).granted is False
+
+
+@pytest.mark.asyncio
+async def test_seed_and_reconcile(test_db):
+    period = _period()
+    test_db.add(UsageTracking(user_id="u1", feature="kiaan_questions", period_start=period.start,
+                              period_end=period.end, usage_count=4, usage_limit=5))
+    await test_db.commit()
+    ledger = _worker(fakeredis.FakeServer())
+
+    reservation = await ledger.reserve(test_db, "kiaan_questions", "u1", period, 1, 5)
+    assert reservation.granted and reservation.used == 4
+    assert not (await ledger.reserve(test_db, "kiaan_questions", "u1", period, 1, 5)).granted
+    assert await ledger.commit(test_db, reservation) == 5
+    assert await ledger.add(test_db, "kiaan_questions", "u2", period, 2) == 2
+
+    assert await ledger.reconcile(test_db) == 2
+    rows = {r.user_id: r for r in (await test_db.execute(select(UsageTracking))).scalars()}
+    assert rows["u1"].usage_count == 5
+    assert rows["u2"].usage_count == 2 and rows["u2"].period_end.day == period.end.day
+    assert await ledger.reconcile(test_db) == 0
+
+    # A larger database count wins and is copied back into the ledger
+    rows["u1"].usage_count = 9
+    await test_db.commit()
+    await ledger.add(test_db, "kiaan_questions", "u1", period, 1)
+    await ledger.reconcile(test_db)
+    await test_db.refresh(rows["u1"])
+    assert rows["u1"].usage_count == 9
+    assert await ledger.peek("kiaan_questions", "u1", period) == 9
+
+
+@pytest.mark.asyncio
+async def test_subscription_service_uses_the_ledger(test_db):
+    server = fakeredis.FakeServer()
+    ledger = _worker(server)
+    with patch.object(subscription_service, "get_usage_ledger", lambda: ledger):
+        holds = [await reserve_kiaan_question(test_db, "u1", SubscriptionTier.FREE) for _ in range(6)]
+        assert [h[0] for h in holds] == [True] * 5 + [False]
+        assert holds[-1][3] is None
+
+        await increment_kiaan_usage(test_db, "u1", holds[0][3])
+        for hold in holds[1:5]:
+            await release_kiaan_reservation(hold[3])
+        assert await check_kiaan_quota(test_db, "u1", SubscriptionTier.FREE) == (True, 1, 5)
+
+        # Redis goes away: the database path counts, and the ledger catches up
+        ledger._client = _worker(None)._client  # type: ignore[method-assign]
+        assert (await reserve_kiaan_question(test_db, "u1", SubscriptionTier.FREE))[3] is None
+        for _ in range(3):
+            await increment_kiaan_usage(test_db, "u1")
+        assert await check_kiaan_quota(test_db, "u1", SubscriptionTier.FREE) == (True, 3, 5)
+
+        ledger._client = _worker(server)._client  # type: ignore[method-assign]
+        await ledger.reconcile(test_db)
+        assert await check_kiaan_quota(test_db, "u1", SubscriptionTier.FREE) == (True, 3, 5)
+        await increment_kiaan_usage(test_db, "u1")
+        await ledger.reconcile(test_db)
+
+        # Unlimited tiers never touch the ledger
+        with patch.object(ledger, "usage", side_effect=AssertionError):
+            assert await check_kiaan_quota(test_db, "u1", SubscriptionTier.SIDDHA) == (True, 0, -1)
+    row = (await test_db.execute(select(UsageTracking))).scalars().one()
+    assert row.usage_count == 4
+
+
+@pytest.mark.asyncio
+async def test_voice_turns_share_the_daily_cap():
+    server = fakeredis.FakeServer()
+    workers = [_worker(server), _worker(server)]
+    services = [VoiceQuotaService(), VoiceQuotaService()]
+
+    async def turn(i: int, minutes: float):
+        with patch("backend.services.voice.quota_service.get_usage_ledger", lambda: workers[i]):
+            reservation = await services[i].reserve_turn(user_id="v1", tier="bhakta")
+            if reservation is None or not reservation.granted:
+                return None
+            return await services[i].arecord_minutes(user_id="v1", minutes=minutes, reservation=reservation)
+
+    assert await turn(0, 20.2) == 21
+    assert await turn(1, 8.5) == 30
+    assert await turn(0, 0.1) is None
+    with patch("backend.services.voice.quota_service.get_usage_ledger", lambda: workers[1]):
+        evaluation = await services[1].aevaluate(user_id="v1", tier="bhakta")
+    assert evaluation.minutes_used_today == 30 and not evaluation.can_start_session
@@ -0,0 +1,163 @@
+"""Tests for the verse application graph's write-behind buffer and top-k table.
+
+Covers:
+
+- Without a running flusher, events are written immediately; weights and
+  confidence equal one-at-a-time updates.
+- Buffered events coalesce per edge and flush as one UPSERT; signals are
+  replayed in arrival order. A failed flush puts the events back.
+- refresh_recommendations() + recommend() return the live ranking, honour
+  exclude_refs and fall back to the mood-only ranking.
+- decay_stale_edges() pulls stale weights toward 0.5 in one statement.
+"""
+
+from __future__ import annotations
+
+import datetime
+import random
+
+import pytest
+from sqlalchemy import select, update
+
+from backend.models.self_sufficiency import VerseApplicationEdge, VerseRecommendation
+from backend.services.kiaan_verse_application_graph import (
+    LEARNING_RATE,
+    VerseApplicationGraph,
+)
+
+
+async def _session(sqlite_session_maker):
+    return (await sqlite_session_maker(VerseApplicationEdge, VerseRecommendation))()
+
+
+async def _edge(db, verse_ref, mood="anxious", topic="work"):
+    result = await db.execute(
+        select(VerseApplicationEdge).where(
+            VerseApplicationEdge.verse_ref == verse_ref,
+            VerseApplicationEdge.mood == mood,
+            VerseApplicationEdge.topic == topic,
+        ).execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+def _expected_weight(signals):
+    weight = 0.5
+    for positive in signals:
+        weight = VerseApplicationGraph._calculate_weight(weight, positive, LEARNING_RATE)
+    return weight
+
+
+@pytest.mark.asyncio
+async def test_write_through_matches_sequential_updates(sqlite_session_maker):
+    db = await _session(sqlite_session_maker)
+    graph = VerseApplicationGraph()
+
+    await graph.record_show(db, "2.47", "anxious", "work")
+    for positive in (True, True, False):
+        await graph.record_signal(db, "2.47", "anxious", "work", positive)
+
+    edge = await _edge(db, "2.47")
+    assert edge.times_shown == 1
+    assert (edge.positive_signals, edge.negative_signals) == (2, 1)
+    assert edge.weight == _expected_weight([True, True, False])
+    assert edge.confidence == VerseApplicationGraph._calculate_confidence(2, 1, 1)
+    assert len(graph._buffer) == 0
+
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_buffered_events_coalesce_and_survive_failed_flush(sqlite_session_maker):
+    db = await _session(sqlite_session_maker)
+    graph = VerseApplicationGraph()
+    graph._running = True  # write-behind mode without the background task
+
+    rng = random.Random(3)
+    events = [(f"2.{rng.randint(1, 5)}", rng.random() < 0.3, rng.random() < 0.6) for _ in range(300)]
+    for verse_ref, is_show, positive in events:
+        if is_show:
+            await graph.record_show(db, verse_ref, "anxious", "work")
+        else:
+            await graph.record_signal(db, verse_ref, "anxious", "work", positive)
+    assert len(graph._buffer) == 5
+    assert (await db.execute(select(VerseApplicationEdge))).first() is None
+
+    class FailingSession:
+        async def execute(self, *args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        async def rollback(self):
+            pass
+
+        def get_bind(self):
+            return db.get_bind()
+
+    with pytest.raises(RuntimeError):
+        await graph.flush(FailingSession())
+    assert len(graph._buffer) == 5
+
+    assert await graph.flush(db) == 5
+    for n in range(1, 6):
+        ref = f"2.{n}"
+        signals = [positive for v, is_show, positive in events if v == ref and not is_show]
+        edge = await _edge(db, ref)
+        assert edge.times_shown == sum(1 for v, is_show, _ in events if v == ref and is_show)
+        assert edge.positive_signals == sum(signals)
+        assert edge.weight == _expected_weight(signals)
+    assert graph.status["events_flushed"] == 300
+
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_precomputed_recommendations_match_live_ranking(sqlite_session_maker):
+    db = await _session(sqlite_session_maker)
+    graph = VerseApplicationGraph()
+    graph._running = True
+
+    rng = random.Random(5)
+    for _ in range(2000):
+        topic = rng.choice(["work", "family"])
+        ref = f"{rng.randint(1, 18)}.{rng.randint(1, 10)}"
+        if rng.random() < 0.4:
+            await graph.record_show(db, ref, "anxious", topic)
+        else:
+            await graph.record_signal(db, ref, "anxious", topic, rng.random() < 0.7)
+    await graph.flush(db)
+
+    live = await graph.recommend(db, "anxious", "work", exclude_refs=["2.3"], limit=8)
+    assert await graph.refresh_recommendations(db, graph._dirty_situations) == 3
+
+    precomputed = await graph.recommend(db, "anxious", "work", exclude_refs=["2.3"], limit=8)
+    assert precomputed == live
+    assert "2.3" not in {r["verse_ref"] for r in precomputed}
+
+    # No edges for this topic: mood-only ranking from the "*" row set
+    fallback = await graph.recommend(db, "anxious", "health", limit=3)
+    assert len(fallback) == 3
+    assert fallback[0]["composite_score"] >= fallback[-1]["composite_score"]
+
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_decay_moves_stale_weights_toward_neutral(sqlite_session_maker):
+    db = await _session(sqlite_session_maker)
+    graph = VerseApplicationGraph()
+
+    for ref, weight in (("1.1", 0.9), ("1.2", 0.2), ("1.3", 0.51), ("1.4", 0.5)):
+        await graph.record_show(db, ref, "sad", "loss")
+        await db.execute(
+            update(VerseApplicationEdge)
+            .where(VerseApplicationEdge.verse_ref == ref)
+            .values(weight=weight, updated_at=datetime.datetime(2020, 1, 1))
+        )
+    await db.commit()
+
+    assert await graph.decay_stale_edges(db, days_since_update=30) == 3
+    weights = [(await _edge(db, ref, "sad", "loss")).weight for ref in ("1.1", "1.2", "1.3", "1.4")]
+    assert weights == pytest.approx([0.75, 0.35, 0.5, 0.5])
+    assert ("sad", "*") in graph._dirty_situations
+
+    await db.close()
@@ -0,0 +1,146 @@
+"""Tests for frame-wise prosody extraction.
+
+Covers:
+
+- YIN recovers the pitch of synthetic tones across the speaking range and
+  reports noise as unvoiced.
+- Chunked (streaming) processing yields the same contour and summary as
+  one-shot processing.
+- Pauses, syllable rate and vibrato are measured on synthetic speech-like
+  signals.
+- MultiModalEmotionService and WhisperService use the real features.
+"""
+
+from __future__ import annotations
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from backend.services import voice_prosody as vp
+from backend.services.voice_learning.multimodal_emotion import MultiModalEmotionService
+from backend.services.whisper_transcription import WhisperService
+
+RATE = 16000
+
+
+def _tone(freq: float, seconds: float = 1.0, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    # A couple of harmonics, like a voiced vowel
+    wave_ = np.sin(2 * np.pi * freq * t) + 0.5 * np.sin(4 * np.pi * freq * t) + 0.25 * np.sin(6 * np.pi * freq * t)
+    return (amplitude * wave_ / 1.75).astype(np.float32)
+
+
+def _syllables(count: int, pause_after: int | None = None) -> np.ndarray:
+    """150 ms Hann-shaped voiced syllables separated by 100 ms gaps."""
+    parts = []
+    n = int(0.15 * RATE)
+    for k in range(count):
+        parts.append(np.hanning(n) * _tone(140, 0.15, 0.4))
+        parts.append(np.zeros(int(0.1 * RATE)))
+        if k == pause_after:
+            parts.append(np.zeros(int(0.5 * RATE)))
+    return np.concatenate(parts).astype(np.float32)
+
+
+def _wav_bytes(audio: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("freq", [75.0, 110.0, 180.0, 260.0, 440.0])
+def test_yin_recovers_tone_pitch(freq):
+    summary = vp.extract_prosody(_tone(freq), RATE)
+
+    assert summary.pitch_mean_hz == pytest.approx(freq, rel=0.01)
+    assert summary.pitch_std_hz < 1.0
+    assert summary.voiced_ratio > 0.95
+
+
+def test_noise_and_silence_are_unvoiced():
+    noise = np.random.default_rng(0).normal(0, 0.1, RATE).astype(np.float32)
+    assert vp.extract_prosody(noise, RATE).voiced_ratio < 0.05
+
+    silence = vp.extract_prosody(np.zeros(RATE, dtype=np.float32), RATE)
+    assert silence.voice_activity_ratio == 0.0 and silence.pitch_mean_hz == 0.0
+
+
+def test_streaming_chunks_match_one_shot():
+    # Gliding pitch so every frame differs
+    t = np.arange(2 * RATE) / RATE
+    f0 = 120 + 60 * t
+    audio = (0.3 * np.sin(2 * np.pi * np.cumsum(f0) / RATE)).astype(np.float32)
+    audio = np.concatenate([audio, np.zeros(RATE // 2, dtype=np.float32), audio[:RATE]])
+
+    tracker = vp.ProsodyTracker(RATE)
+    emitted = 0
+    rng = np.random.default_rng(1)
+    position = 0
+    while position < len(audio):
+        size = int(rng.integers(50, 3000))
+        emitted += len(tracker.process(audio[position:position + size]))
+        position += size
+    streamed = tracker.summary()
+    one_shot = vp.extract_prosody(audio, RATE)
+
+    assert emitted == len(one_shot.contour)
+    np.testing.assert_allclose(streamed.contour, one_shot.contour)
+    assert streamed.pitch_mean_hz == pytest.approx(one_shot.pitch_mean_hz)
+    assert streamed.pause_count == one_shot.pause_count == 1
+    # The contour follows the glide
+    voiced = np.array(one_shot.contour[:150])
+    assert voiced[10] < voiced[100] < voiced[140]
+
+
+def test_pauses_and_syllable_rate():
+    summary = vp.extract_prosody(_syllables(12, pause_after=5), RATE)
+
+    assert summary.pause_count == 1
+    assert summary.pause_duration_avg == pytest.approx(0.6, abs=0.08)
+    # 12 syllables over ~2.9 s of speaking time
+    assert summary.syllables_per_second == pytest.approx(12 / 2.9, rel=0.15)
+    assert summary.pause_ratio == pytest.approx(0.6 / 3.5, abs=0.05)
+
+
+def test_vibrato_is_reported_as_tremor():
+    t = np.arange(2 * RATE) / RATE
+    f0 = 150 * 2 ** (50 / 1200 * np.sin(2 * np.pi * 6 * t))  # ±50 cents at 6 Hz
+    audio = (0.3 * np.sin(2 * np.pi * np.cumsum(f0) / RATE)).astype(np.float32)
+
+    summary = vp.extract_prosody(audio, RATE)
+    assert summary.tremor_hz == pytest.approx(6.0, abs=0.5)
+    assert vp.extract_prosody(_tone(150, 2.0), RATE).tremor_hz is None
+
+
+def test_multimodal_emotion_uses_measured_features():
+    service = MultiModalEmotionService()
+    audio = np.concatenate([_tone(210, 1.0), _syllables(6)])
+
+    from_wav = service.extract_acoustic_features(_wav_bytes(audio))
+    from_pcm = service.extract_acoustic_features((audio * 32767).astype(np.int16).tobytes())
+
+    assert from_wav.pitch_mean == pytest.approx(from_pcm.pitch_mean, rel=0.01)
+    assert 140 < from_wav.pitch_mean < 210
+    assert from_wav.pitch_range[1] == pytest.approx(210, rel=0.02)
+    assert from_wav.voice_quality_score > 0.8
+
+    # Same audio, same answer (the old placeholder hashed the bytes)
+    assert service.extract_acoustic_features(_wav_bytes(audio)) == from_wav
+
+    silent = service.extract_acoustic_features(bytes(RATE))
+    assert silent.pitch_mean == 150.0 and not silent.tremor_detected
+
+
+def test_whisper_voice_features_keep_their_keys():
+    features = WhisperService("tiny")._extract_voice_features(_syllables(8), RATE)
+
+    assert {"energy", "pitch_mean", "pitch_var", "voice_activity_ratio", "duration"} <= set(features)
+    assert features["pitch_hz"] == pytest.approx(140, rel=0.02)
+    assert 0 <= features["pitch_mean"] <= 1 and features["speech_rate"] > 0
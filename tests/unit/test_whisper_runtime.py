@@ -0,0 +1,156 @@
+"""Tests for the Whisper transcription runtime.
+
+Covers:
+
+- WAV bytes decode in memory to 16 kHz mono float32 (no temp files).
+- The model registry loads one model per (size, device, compute type),
+  shared by WhisperService and every StreamingWhisperService.
+- The bounded inference pool rejects work beyond its capacity and records
+  queue time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import sys
+import tempfile
+import threading
+import types
+import wave
+
+import numpy as np
+import pytest
+
+from backend.services import whisper_transcription as wt
+
+
+def _wav_bytes(seconds: float, rate: int = 44100, channels: int = 2, freq: float = 220.0) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (0.3 * np.sin(2 * np.pi * freq * t) * 32767).astype(np.int16)
+    frames = np.repeat(tone[:, None], channels, axis=1).tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buf.getvalue()
+
+
+class _FakeSegment:
+    def __init__(self, text: str, end: float) -> None:
+        self.start, self.end, self.text, self.words = 0.0, end, text, None
+
+
+class _FakeFasterWhisperModel:
+    instances: list[_FakeFasterWhisperModel] = []
+
+    def __init__(self, size, device, compute_type):
+        self.key = (size, device, compute_type)
+        self.inputs: list[np.ndarray] = []
+        _FakeFasterWhisperModel.instances.append(self)
+
+    def transcribe(self, audio, **kwargs):
+        self.inputs.append(audio)
+        duration = len(audio) / wt.WHISPER_SAMPLE_RATE
+        return iter([_FakeSegment(" namaste dharma karma", duration)]), types.SimpleNamespace(language="hi")
+
+
+@pytest.fixture
+def fake_faster_whisper(monkeypatch):
+    _FakeFasterWhisperModel.instances = []
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = _FakeFasterWhisperModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    monkeypatch.setattr(wt, "_model_registry", {})
+    monkeypatch.setattr(wt, "_services_by_size", {})
+    return _FakeFasterWhisperModel
+
+
+def test_decode_wav_in_memory_resamples_to_mono_16k(monkeypatch):
+    def _no_temp_files(*args, **kwargs):
+        raise AssertionError("decode_audio must not touch the filesystem")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", _no_temp_files)
+
+    audio = wt.decode_audio(_wav_bytes(1.5))
+
+    assert audio.dtype == np.float32 and audio.ndim == 1
+    assert len(audio) == 24000
+    assert 0.28 < np.abs(audio).max() < 0.32
+
+    with pytest.raises(ValueError):
+        wt.decode_audio(b"")
+
+
+@pytest.mark.asyncio
+async def test_registry_loads_each_model_once(fake_faster_whisper):
+    services = [wt.WhisperService("tiny") for _ in range(4)]
+    results = await asyncio.gather(*(s.load_model() for s in services))
+    streaming = [wt.StreamingWhisperService("tiny") for _ in range(3)]
+    await asyncio.gather(*(s.service.load_model() for s in streaming))
+    await wt.WhisperService("base").load_model()
+
+    assert all(results)
+    assert len({id(s.model) for s in services}) == 1
+    assert streaming[0].service is streaming[1].service
+    assert [m.key[0] for m in fake_faster_whisper.instances] == ["tiny", "base"]
+    assert len(wt.loaded_whisper_models()) == 2
+
+
+@pytest.mark.asyncio
+async def test_transcribe_passes_decoded_array_to_model(fake_faster_whisper):
+    service = wt.WhisperService("tiny", pool=wt.WhisperInferencePool(workers=1, queue_size=1))
+
+    result = await service.transcribe(_wav_bytes(2.0, rate=16000, channels=1))
+
+    model = fake_faster_whisper.instances[0]
+    assert isinstance(model.inputs[0], np.ndarray) and model.inputs[0].dtype == np.float32
+    assert result.text == "namaste dharma karma"
+    assert result.language == "hi" and result.is_sanskrit
+    assert result.duration_seconds == pytest.approx(2.0)
+    assert result.voice_features["duration"] == pytest.approx(2.0)
+    assert service.pool.get_metrics()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_beyond_capacity_and_tracks_queue_time():
+    pool = wt.WhisperInferencePool(workers=1, queue_size=1)
+    release = threading.Event()
+
+    def _blocking(value):
+        release.wait(5)
+        return value
+
+    running = asyncio.ensure_future(pool.run(_blocking, "first"))
+    queued = asyncio.ensure_future(pool.run(_blocking, "second"))
+    await asyncio.sleep(0.05)
+    assert pool.depth == 2
+
+    with pytest.raises(wt.WhisperQueueFull):
+        await pool.run(_blocking, "third")
+
+    release.set()
+    assert await asyncio.gather(running, queued) == ["first", "second"]
+
+    metrics = pool.get_metrics()
+    assert metrics["rejected"] == 1 and metrics["completed"] == 2
+    assert metrics["peak_depth"] == 2 and metrics["depth"] == 0
+    assert metrics["max_queue_ms"] >= 40
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_keeps_its_slot_until_the_thread_finishes():
+    pool = wt.WhisperInferencePool(workers=1, queue_size=0)
+    release = threading.Event()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run(release.wait, 5, timeout=0.05)
+    with pytest.raises(wt.WhisperQueueFull):
+        await pool.run(lambda: None)
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert await pool.run(lambda: "ok") == "ok"
+    assert pool.get_metrics()["timed_out"] == 1
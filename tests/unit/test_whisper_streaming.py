@@ -0,0 +1,233 @@
+"""Tests for streaming Whisper transcription.
+
+Covers:
+
+- The PCM ring buffer wraps without losing samples and the energy VAD
+  cuts on pauses.
+- Overlapping windows with local agreement: partials arrive before the
+  utterance ends, committed text never changes, and the final text matches
+  the batch transcription with no words duplicated across windows.
+- WhisperSTTProvider follows the STTProvider contract (partials, then
+  exactly one final).
+
+Audio is synthetic: each "word" is a tone burst whose frequency names it,
+and the fake model recognises bursts the way Whisper would recognise
+words - including mishearing a word that is cut off at the window edge.
+"""
+
+from __future__ import annotations
+
+import base64
+import importlib.util
+import itertools
+import sys
+import types
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from backend.services import whisper_transcription as wt
+from backend.services.voice import stt_router
+
+RATE = wt.WHISPER_SAMPLE_RATE
+PHRASE = [
+    "peace", "begins", "within", "act", "without", "attachment",
+    "to", "the", "fruits", "of", "action", "always",
+]
+VOCAB = {300 + 60 * i: w for i, w in enumerate(PHRASE)}
+WORD_SECONDS, GAP_SECONDS = 0.4, 0.15
+
+
+def _speech(words: list[str]) -> np.ndarray:
+    freq_of = {w: f for f, w in VOCAB.items()}
+    parts = []
+    for word in words:
+        t = np.arange(int(WORD_SECONDS * RATE)) / RATE
+        parts.append(0.3 * np.sin(2 * np.pi * freq_of[word] * t))
+        parts.append(np.zeros(int(GAP_SECONDS * RATE)))
+    return np.concatenate(parts).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+@dataclass
+class _Word:
+    word: str
+    start: float
+    end: float
+    probability: float = 0.9
+
+
+@dataclass
+class _Segment:
+    start: float
+    end: float
+    text: str
+    words: list
+
+
+class _ToneWordModel:
+    """Recognises tone bursts as words; a burst cut short is misheard."""
+
+    longest_window = 0.0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def transcribe(self, audio, **kwargs):
+        _ToneWordModel.longest_window = max(_ToneWordModel.longest_window, len(audio) / RATE)
+        frame = RATE // 100
+        n = len(audio) // frame
+        voiced = np.mean(audio[: n * frame].reshape(n, frame) ** 2, axis=1) > 1e-3
+        words = []
+        i = 0
+        while i < n:
+            if not voiced[i]:
+                i += 1
+                continue
+            j = i
+            while j < n and voiced[j]:
+                j += 1
+            burst = audio[i * frame:j * frame]
+            duration = len(burst) / RATE
+            crossings = np.count_nonzero(np.diff(np.signbit(burst).astype(np.int8)))
+            freq = crossings / 2 / duration
+            nearest = min(VOCAB, key=lambda f: abs(f - freq))
+            text = VOCAB[nearest] if duration >= WORD_SECONDS - 0.05 else "uh"
+            words.append(_Word(f" {text}", i / 100, j / 100))
+            i = j
+        text = "".join(w.word for w in words)
+        segments = [_Segment(0.0, len(audio) / RATE, text, words)] if words else []
+        return iter(segments), types.SimpleNamespace(language="en")
+
+
+@pytest.fixture
+def tone_model(monkeypatch):
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = _ToneWordModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    monkeypatch.setattr(wt, "_model_registry", {})
+    monkeypatch.setattr(wt, "_services_by_size", {})
+    _ToneWordModel.longest_window = 0.0
+    return _ToneWordModel
+
+
+async def _stream(service: wt.StreamingWhisperService, audio: np.ndarray, chunk_seconds: float = 0.1):
+    updates = []
+    step = int(chunk_seconds * RATE)
+    for i in range(0, len(audio), step):
+        for update in await service.feed(audio[i:i + step]):
+            updates.append((i / RATE, update))
+    final = await service.flush()
+    if final is not None:
+        updates.append((len(audio) / RATE, final))
+    return updates
+
+
+def test_ring_buffer_wraps_and_reads_absolute_ranges():
+    ring = wt.PcmRingBuffer(10)
+    ring.write(np.arange(7, dtype=np.float32))
+    ring.write(np.arange(7, 15, dtype=np.float32))
+    assert ring.start == 5 and ring.end == 15
+    assert ring.read(8, 13).tolist() == [8, 9, 10, 11, 12]
+    assert ring.read(0, 7).tolist() == [5, 6]  # clipped to what is held
+    ring.write(np.arange(15, 40, dtype=np.float32))  # larger than capacity
+    assert ring.read(ring.start, ring.end).tolist() == list(range(30, 40))
+
+
+def test_vad_reports_speech_onset_and_pause():
+    vad = wt.EnergyVAD(pause_ms=300)
+    audio = np.concatenate([_silence(0.5), _speech(["peace", "begins"]), _silence(0.6)])
+    events = vad.process(audio)
+    assert [kind for kind, _ in events] == ["speech", "pause"]
+    speech_at, pause_at = (pos / RATE for _, pos in events)
+    assert speech_at == pytest.approx(0.5, abs=0.05)
+    assert pause_at == pytest.approx(0.5 + 2 * (WORD_SECONDS + GAP_SECONDS) - GAP_SECONDS, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_partials_stabilise_and_finals_match_batch(tone_model):
+    first, second = PHRASE[:6], PHRASE[6:11]
+    audio = np.concatenate([_silence(0.3), _speech(first), _silence(1.0), _speech(second), _silence(0.2)])
+
+    service = wt.StreamingWhisperService("tiny", step_seconds=0.5)
+    updates = await _stream(service, audio)
+
+    finals = [u.committed for _, u in updates if u.is_final]
+    assert finals == [" ".join(first), " ".join(second)]
+
+    # Committed text only ever grows within an utterance
+    committed = [u.committed for _, u in updates if not u.is_final]
+    for before, after in itertools.pairwise(committed):
+        assert after.startswith(before) or not before or after == ""
+    assert all("uh" not in u.committed.split() for _, u in updates)
+
+    # First word shows up as a partial long before the utterance ends
+    first_seen = next(t for t, u in updates if "peace" in u.text)
+    assert first_seen < 0.3 + len(first) * (WORD_SECONDS + GAP_SECONDS) / 2
+
+    batch = await service.service.transcribe_samples(audio, wt.TranscriptionConfig())
+    assert batch.text.split() == first + second
+
+
+@pytest.mark.asyncio
+async def test_long_utterance_windows_do_not_duplicate_words(tone_model):
+    words = PHRASE + PHRASE[:3]
+    audio = np.concatenate([_silence(0.2), _speech(words), _silence(0.8)])
+
+    service = wt.StreamingWhisperService("tiny", step_seconds=0.5, max_window_seconds=2.0)
+    updates = await _stream(service, audio)
+
+    assert [u.committed for _, u in updates if u.is_final] == [" ".join(words)]
+    # Windows were capped: no single transcription covered the whole utterance
+    assert tone_model.longest_window <= 2.0 + 0.5 + 0.1
+    assert len(audio) / RATE > 8
+
+
+@pytest.mark.asyncio
+async def test_whisper_stt_provider_contract(tone_model, monkeypatch):
+    class _PcmDecoder:
+        """Test decoder: chunks carry float32 PCM instead of Opus."""
+
+        def decode(self, packet: bytes) -> np.ndarray:
+            return np.frombuffer(packet, dtype=np.float32)
+
+    audio = np.concatenate([_speech(PHRASE[:3]), _silence(0.8), _speech(PHRASE[3:6])])
+    provider = stt_router.WhisperSTTProvider(decoder_factory=_PcmDecoder)
+    await provider.start_session(session_id="s1", lang_hint="en")
+
+    partials = []
+    step = RATE // 10
+    seq = 0
+    for seq, i in enumerate(range(0, len(audio), step)):
+        chunk = base64.b64encode(audio[i:i + step].tobytes()).decode()
+        partials += [r async for r in provider.feed_audio_chunk(seq=seq, opus_b64=chunk)]
+    finals = [r async for r in provider.end_of_speech()]
+    await provider.close()
+
+    assert partials and not any(r.is_final for r in partials)
+    assert "peace begins within" in partials[-1].text
+    assert len(finals) == 1 and finals[0].is_final
+    assert finals[0].text == "peace begins within act without attachment"
+    assert finals[0].seq == seq + 1
+
+    # Without an open session end_of_speech still ends the turn with an empty final
+    for idle in (provider, stt_router.WhisperSTTProvider(decoder_factory=_PcmDecoder)):
+        empty = [r async for r in idle.end_of_speech()]
+        assert len(empty) == 1 and empty[0].is_final and empty[0].text == ""
+
+
+def test_router_picks_whisper_only_when_opted_in(monkeypatch):
+    monkeypatch.delenv("KIAAN_VOICE_MOCK_PROVIDERS", raising=False)
+    monkeypatch.delenv("KIAAN_SARVAM_API_KEY", raising=False)
+    monkeypatch.setattr(importlib.util, "find_spec", lambda _name: object())
+    monkeypatch.setattr(stt_router, "_WHISPER_STT_ENABLED", False)
+    assert stt_router.STTRouter().decide("en").provider_name == "mock"
+
+    monkeypatch.setattr(stt_router, "_WHISPER_STT_ENABLED", True)
+    provider, decision = stt_router.STTRouter().build_provider("hi")
+    assert decision.provider_name == "whisper-local"
+    assert isinstance(provider, stt_router.WhisperSTTProvider)
@@ -0,0 +1,159 @@
+"""Tests for WisdomCore's vectorized retrieval.
+
+Covers:
+
+- Sparse-feature scores equal _score_gita_verse / _score_learned_wisdom for
+  every row, and search returns the verses the per-verse loop ranked first.
+- MinHash-screened deduplication keeps exactly what the pairwise
+  SequenceMatcher loop kept.
+- get_for_enemy, get_by_theme and get_by_domain return the same verses,
+  scores and reasons as the previous loops.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend.services.gita_corpus import GITA_VERSES_PATH, GitaCorpus
+from backend.services.wisdom_core import SHAD_RIPU_THEMES, WisdomCore, WisdomResult
+from backend.services.wisdom_features import (
+    LearnedFeatures,
+    deduplicate_texts,
+    get_gita_features,
+)
+
+QUERIES = [
+    "I feel anxious about my exam results",
+    "anger and jealousy toward my brother",
+    "let go of attachment to the fruits of action",
+    "peace",
+    "the self is eternal",
+    "duty",
+]
+
+
+@pytest.fixture(scope="module")
+def corpus() -> GitaCorpus:
+    rows = json.loads(GITA_VERSES_PATH.read_text(encoding="utf-8"))
+    for row in rows:
+        apps = row["mental_health_applications"] or [None]
+        row["primary_domain"] = apps[0]
+        row["secondary_domains"] = apps[1:3]
+    return GitaCorpus(rows, source="test")
+
+
+@pytest.fixture
+def core(corpus):
+    with patch("backend.services.wisdom_core.get_db_gita_corpus", new=AsyncMock(return_value=corpus)):
+        yield WisdomCore()
+
+
+def _keywords(query: str) -> set[str]:
+    return {w for w in query.lower().split() if len(w) > 2}
+
+
+def test_gita_feature_scores_match_scalar_scoring(core, corpus):
+    features = get_gita_features(corpus)
+    for query in QUERIES:
+        kws = _keywords(query)
+        scores = features.score(query.lower(), kws, 5.0, 2.0, 3.0, 2.5)
+        expected = [core._score_gita_verse(v, query, kws)[0] for v in corpus.verses]
+        assert scores.tolist() == expected
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_like_the_per_verse_loop(core, corpus):
+    for query in QUERIES:
+        kws = _keywords(query)
+        scored = [(core._score_gita_verse(v, query, kws), v) for v in corpus.verses]
+        scored = [(s, reasons, v) for (s, reasons), v in scored if s > 0]
+        scored.sort(key=lambda x: x[0], reverse=True)
+
+        results = await core._search_gita_verses(AsyncMock(), query, kws, 20)
+
+        assert [(r.id, r.score, r.match_reasons) for r in results] == [
+            (f"gita_{v.chapter}_{v.verse}", s, reasons) for s, reasons, v in scored[:20]
+        ]
+
+
+def test_learned_feature_scores_match_scalar_scoring(core):
+    items = [
+        SimpleNamespace(
+            content="Anger clouds judgement; return to the breath.", themes=["Anger", "breath"],
+            keywords=["anger", "calm", "judge"], shad_ripu_tags=["krodha"], quality_score=0.75,
+        ),
+        SimpleNamespace(
+            content="Peace grows from letting go of attachment.", themes=["peace"], keywords=None,
+            shad_ripu_tags=["moha", "lobha"], quality_score=0.5,
+        ),
+        SimpleNamespace(content="Unrelated text", themes=None, keywords=["x"], shad_ripu_tags=None, quality_score=0.0),
+    ]
+    features = LearnedFeatures(items)
+    for query in QUERIES + ["krodha and moha", "judgement"]:
+        kws = _keywords(query)
+        scores = features.score(query.lower(), kws, 5.0, 2.0, 3.0, 2.5, 1.0)
+        assert scores.tolist() == [core._score_learned_wisdom(item, query, kws)[0] for item in items]
+
+
+def test_deduplicate_matches_pairwise_sequence_matcher(corpus):
+    texts = [v.english[:200].lower() for v in corpus.verses[:60]]
+    texts += [t.replace("the ", "a ", 2) for t in texts[:20]]  # near-duplicates
+    texts += [t[5:] + " indeed" for t in texts[10:30]]
+
+    expected: list[int] = []
+    for i, text in enumerate(texts):
+        if not any(difflib.SequenceMatcher(None, text, texts[j]).ratio() > 0.85 for j in expected):
+            expected.append(i)
+
+    assert deduplicate_texts(texts, 0.85) == expected
+    assert len(expected) < len(texts)
+
+
+def test_deduplicate_results_keeps_first_of_near_duplicates(core):
+    results = [
+        WisdomResult(id=str(i), content=content, source="gita_verse", score=1.0)
+        for i, content in enumerate(["You have a right to action alone.", "You have a right to action alone!", "Be calm."])
+    ]
+    assert [r.id for r in core._deduplicate_results(results)] == ["0", "2"]
+
+
+@pytest.mark.asyncio
+async def test_enemy_theme_and_domain_match_previous_loops(core, corpus):
+    db = AsyncMock()
+    for enemy, themes in SHAD_RIPU_THEMES.items():
+        expected = []
+        for verse in corpus.verses:
+            score, reasons = 0.0, []
+            theme_text = verse.theme.lower().replace("_", " ")
+            if any(t in theme_text for t in themes):
+                score += 3.0
+                reasons.append(f"theme:{verse.theme}")
+            if any(t in verse.principle.lower() for t in themes):
+                score += 2.0
+                reasons.append(f"principle:{verse.principle}")
+            for t in themes[:5]:
+                if t in verse.english.lower():
+                    score += 1.0
+                    reasons.append(f"content_theme:{t}")
+            if score > 0:
+                expected.append((f"gita_{verse.chapter}_{verse.verse}", score, reasons))
+        expected.sort(key=lambda x: x[1], reverse=True)
+
+        results = await core.get_for_enemy(db, enemy, limit=10, include_learned=False)
+        assert [(r.id, r.score, r.match_reasons) for r in results] == expected[:10]
+
+    theme = corpus.verses[0].theme.lower()
+    results = await core.get_by_theme(db, theme, limit=5, include_learned=False)
+    assert [r.id for r in results] == [
+        f"gita_{v.chapter}_{v.verse}" for v in corpus.verses if theme in v.theme.lower()
+    ][:5]
+
+    results = await core.get_by_domain(db, "anxiety", limit=5, include_learned=False)
+    direct = [v for v in corpus.verses if v.primary_domain == "anxiety" or "anxiety" in v.secondary_domains][:5]
+    assert [r.id for r in results[: len(direct)]] == [f"gita_{v.chapter}_{v.verse}" for v in direct]
+    assert all(r.match_reasons[0].startswith(("domain:", "domain_theme:")) for r in results)
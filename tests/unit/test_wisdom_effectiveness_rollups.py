@@ -0,0 +1,123 @@
+"""Tests for DynamicWisdomCorpus' incremental effectiveness rollups.
+
+Covers:
+
+- Flushed deliveries and recorded outcomes keep wisdom_effectiveness_rollups
+  equal to a GROUP BY over wisdom_effectiveness, and ranking reads it.
+- Recording an outcome expires only that mood's cached ranking.
+- rebuild_effectiveness_rollups() reproduces the incremental rollups, and
+  overwrites a rollup row written between its delete and insert.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, func, select
+
+from backend.models.wisdom import WisdomEffectiveness, WisdomEffectivenessRollup
+from backend.services.dynamic_wisdom_corpus import (
+    MIN_RECORDS_FOR_LEARNING,
+    DynamicWisdomCorpus,
+)
+
+_ROLLUP_COLUMNS = (
+    WisdomEffectivenessRollup.mood,
+    WisdomEffectivenessRollup.verse_ref,
+    WisdomEffectivenessRollup.deliveries,
+    WisdomEffectivenessRollup.outcome_count,
+    WisdomEffectivenessRollup.avg_effectiveness,
+)
+
+
+async def _deliver_and_resolve(corpus, session_maker, mood, verse_ref, n, mood_after):
+    """Deliver verse_ref n times in mood, resolving each with mood_after."""
+    with patch("backend.deps.SessionLocal", session_maker):
+        for i in range(n):
+            session_id = f"{mood}-{verse_ref}-{i}"
+            await corpus.record_wisdom_delivery(
+                None, "u1", session_id, verse_ref, None, mood, 0.5, "guide",
+            )
+            async with session_maker() as db:
+                await corpus.record_wisdom_outcome(db, "u1", session_id, mood_after)
+                await db.commit()
+
+
+async def _rollups(db):
+    rows = (await db.execute(select(*_ROLLUP_COLUMNS))).all()
+    return {(m, v): (d, n, round(a, 6) if a is not None else None) for m, v, d, n, a in rows}
+
+
+@pytest.mark.asyncio
+async def test_rollups_track_deliveries_and_outcomes(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(WisdomEffectiveness, WisdomEffectivenessRollup)
+    corpus = DynamicWisdomCorpus()
+    await _deliver_and_resolve(corpus, session_maker, "anxious", "2.47", 3, "peaceful")
+    await _deliver_and_resolve(corpus, session_maker, "anxious", "2.48", 4, "anxious")
+    await _deliver_and_resolve(corpus, session_maker, "sad", "2.14", 2, "happy")
+    with patch("backend.deps.SessionLocal", session_maker):
+        await corpus.record_wisdom_delivery(None, "u2", "open", "2.47", None, "anxious", 0.5, "guide")
+        await corpus._flush_buffer()
+
+    WE = WisdomEffectiveness
+    async with session_maker() as db:
+        expected = (await db.execute(
+            select(WE.mood_at_delivery, WE.verse_ref, func.count(), func.count(WE.effectiveness),
+                   func.avg(WE.effectiveness))
+            .group_by(WE.mood_at_delivery, WE.verse_ref)
+        )).all()
+        assert await _rollups(db) == {(m, v): (d, n, round(a, 6)) for m, v, d, n, a in expected}
+        assert (await _rollups(db))[("anxious", "2.47")][:2] == (4, 3)
+
+        scores = await corpus._get_effectiveness_scores(db, "anxious")
+    assert MIN_RECORDS_FOR_LEARNING <= 3
+    assert [ref for ref, _ in scores] == ["2.47", "2.48"]
+
+
+@pytest.mark.asyncio
+async def test_outcome_expires_only_its_mood(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(WisdomEffectiveness, WisdomEffectivenessRollup)
+    corpus = DynamicWisdomCorpus()
+    await _deliver_and_resolve(corpus, session_maker, "anxious", "2.47", 3, "peaceful")
+    await _deliver_and_resolve(corpus, session_maker, "sad", "2.14", 3, "happy")
+    async with session_maker() as db:
+        assert await corpus._get_effectiveness_scores(db, "anxious")
+        assert await corpus._get_effectiveness_scores(db, "sad")
+
+    await _deliver_and_resolve(corpus, session_maker, "anxious", "2.48", 3, "peaceful")
+    assert "anxious" not in corpus._cache_loaded_at
+    assert "sad" in corpus._cache_loaded_at
+
+    misses = corpus._metrics["cache_misses"]
+    async with session_maker() as db:
+        anxious = await corpus._get_effectiveness_scores(db, "anxious")
+        await corpus._get_effectiveness_scores(db, "sad")
+    assert {ref for ref, _ in anxious} == {"2.47", "2.48"}
+    assert corpus._metrics["cache_misses"] == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental_rollups(sqlite_session_maker):
+    session_maker = await sqlite_session_maker(WisdomEffectiveness, WisdomEffectivenessRollup)
+    corpus = DynamicWisdomCorpus()
+    await _deliver_and_resolve(corpus, session_maker, "anxious", "2.47", 3, "peaceful")
+    await _deliver_and_resolve(corpus, session_maker, "angry", "2.63", 2, "calm")
+    async with session_maker() as db:
+        incremental = await _rollups(db)
+        await db.execute(WisdomEffectivenessRollup.__table__.delete())
+        await db.commit()
+
+        def concurrent_flush(conn, cursor, statement, *args):
+            # A flush landing right after the rebuild cleared the mood
+            if statement.startswith("DELETE FROM wisdom_effectiveness_rollups"):
+                cursor.execute(
+                    "INSERT INTO wisdom_effectiveness_rollups (mood, verse_ref, deliveries, "
+                    "outcome_count, effectiveness_sum) VALUES ('anxious', '2.47', 1, 0, 0.0)"
+                )
+
+        event.listen(db.bind.sync_engine, "after_cursor_execute", concurrent_flush)
+        stats = await corpus.rebuild_effectiveness_rollups(db)
+        event.remove(db.bind.sync_engine, "after_cursor_execute", concurrent_flush)
+        assert stats == {"moods": 2, "rows": 2}
+        assert await _rollups(db) == incremental